@@ -155,6 +155,7 @@ class ContractAgent:
                             "contract_id": {"type": "integer", "description": "Specific contract ID to update (optional - will use most recent if not provided)"},
                             "user_response": {"type": "string", "description": "User's response to contract selection prompt (e.g., '1', '2', '108', 'Contract 108', 'all', 'for both')"},
                             "update_all": {"type": "boolean", "description": "Whether to update all contracts for the client (set to true when user says 'all', 'both', 'for all', etc.)"},
+                            "dry_run": {"type": "boolean", "description": "With update_all, preview the per-contract changes for confirmation without applying them"},
                             "start_date": {"type": "string", "description": "New start date in YYYY-MM-DD format"},
                             "end_date": {"type": "string", "description": "New end date in YYYY-MM-DD format"},
                             "contract_type": {"type": "string", "description": "New contract type: Fixed, Hourly, or Retainer"},
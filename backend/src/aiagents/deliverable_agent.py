@@ -28,46 +28,46 @@ class DeliverableAgent:
         
         self.tools = self._get_tool_schemas()
     
-    def _smart_create_deliverable_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _smart_create_deliverable_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for smart_create_deliverable_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
         context = kwargs.pop('context', None)
         params = SmartDeliverableParams(**kwargs)
-        result = smart_create_deliverable_tool(params, context, db)
+        result = await smart_create_deliverable_tool(params, context)
         return {
             "success": result.success,
             "message": result.message,
             "data": result.data
         }
     
-    def _get_deliverables_by_client_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _get_deliverables_by_client_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for get_deliverables_by_client_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
         client_name = kwargs.get("client_name")
-        result = get_deliverables_by_client_tool(client_name, db)
+        result = await get_deliverables_by_client_tool(client_name)
         return {
             "success": result.success,
             "message": result.message,
             "data": result.data
         }
     
-    def _get_deliverables_by_contract_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _get_deliverables_by_contract_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for get_deliverables_by_contract_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
         client_name = kwargs.get("client_name")
         contract_id = kwargs.get("contract_id")
-        result = get_deliverables_by_contract_tool(client_name, contract_id, db)
+        result = await get_deliverables_by_contract_tool(client_name, contract_id)
         return {
             "success": result.success,
             "message": result.message,
             "data": result.data
         }
     
-    def _search_deliverables_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _search_deliverables_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for search_deliverables_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
         search_term = kwargs.get("search_term")
-        result = search_deliverables_tool(search_term, db)
+        result = await search_deliverables_tool(search_term)
         return {
             "success": result.success,
             "message": result.message,
@@ -309,7 +309,7 @@ class DeliverableAgent:
             
             # Dynamically call the appropriate tool function
             if function_name in self.tool_functions:
-                return self.tool_functions[function_name](**function_args)
+                return await self.tool_functions[function_name](**function_args)
             else:
                 return {
                     "success": False,
@@ -1,12 +1,38 @@
 """
 Context extraction and saving mechanism for agent conversations.
 This module processes agent responses and extracts context information to save to state['data'].
+
+Extraction from a user message is memoized: the agent node, the short-circuit
+checks and the tool executor all ask for the same turn's context, so each
+(message, state version) pair is computed once and the fuzzy client lookup
+(a database query) runs once per message text. Client change events that
+create, rename or delete a client drop the memo.
+
+Date expressions in the message ("last quarter", "between March and May") are
+resolved by the shared date resolver into state['data']['date_range'], which
+reaches tools through their context.
 """
 
+import os
 import re
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from contextvars import ContextVar
 from typing import Dict, Any, Optional
 from ..graph.state import AgentState
 from .fuzzy_client_matcher import fuzzy_matcher
+from src.aiagents.tools.date_expressions import date_resolver
+from src.aiagents.performance.change_events import CLIENT, ChangeEvent, change_events
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Fields of state['data'] that extract_context_from_user_message reads
+EXTRACTION_STATE_FIELDS = ('current_client', 'user_operation', 'original_user_request', 'date_range')
+
+_turn_stats_var: ContextVar[Optional[Dict[str, int]]] = ContextVar("context_extraction_turn_stats", default=None)
 
 
 class ContextExtractor:
@@ -55,44 +81,154 @@ class ContextExtractor:
         ]
         
         # Note: Removed billing_date_patterns - let LLM handle date extraction for better flexibility
-    
+
+        # Memo of extraction results; entries also expire so clients changed by other processes are picked up
+        self.memo_ttl_seconds = float(os.getenv("CONTEXT_MEMO_TTL_SECONDS", "300"))
+        self.memo_max_entries = int(os.getenv("CONTEXT_MEMO_MAX_ENTRIES", "2048"))
+        self._memo: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._stats = self._new_stats()
+
+    # ------------------------------------------------------------------
+    # Memoization
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        return {
+            "extractions": 0,
+            "memo_hits": 0,
+            "client_lookups": 0,
+            "client_lookups_saved": 0,
+            "contract_id_hits": 0,
+        }
+
+    @staticmethod
+    def _message_key(text: str) -> str:
+        return hashlib.sha1((text or '').encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def state_version(existing_state: Optional[Dict[str, Any]]) -> str:
+        """Fingerprint of the state fields that can change what a message extracts to."""
+        relevant = {field: (existing_state or {}).get(field) for field in EXTRACTION_STATE_FIELDS}
+        return hashlib.sha1(json.dumps(relevant, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _memo_get(self, key: tuple):
+        entry = self._memo.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._memo[key]
+            return None
+        self._memo.move_to_end(key)
+        return value
+
+    def _memo_put(self, key: tuple, value: Any):
+        self._memo[key] = (time.monotonic() + self.memo_ttl_seconds, value)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_max_entries:
+            self._memo.popitem(last=False)
+
+    def _count(self, name: str):
+        self._stats[name] += 1
+        turn_stats = _turn_stats_var.get()
+        if turn_stats is not None:
+            turn_stats[name] += 1
+
+    def start_turn(self) -> Dict[str, int]:
+        """Start per-turn counters for the current request; returns the live counter dict."""
+        turn_stats = self._new_stats()
+        _turn_stats_var.set(turn_stats)
+        return turn_stats
+
+    def get_turn_stats(self) -> Optional[Dict[str, int]]:
+        turn_stats = _turn_stats_var.get()
+        return dict(turn_stats) if turn_stats is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self._stats["extractions"] + self._stats["memo_hits"]
+        return {
+            **self._stats,
+            "memo_entries": len(self._memo),
+            "memo_hit_rate": self._stats["memo_hits"] / requests if requests else 0.0,
+        }
+
+    def clear_memo(self):
+        """Drop memoized results (e.g. after clients were renamed or deleted)."""
+        self._memo.clear()
+
+    def on_client_change(self, event: ChangeEvent):
+        """Change event subscriber: memoized client matches go stale when client names change."""
+        if event.touches({"client_name"}):
+            self.clear_memo()
+
     async def extract_context_from_user_message(self, user_message: str, existing_state: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Extract context from user message."""
-       
+        """
+        Extract context from user message.
+
+        Results are memoized by (message hash, state version). The result is
+        also stored under the version the state has once it is applied, so the
+        tool executor re-reading the same turn gets it without recomputing.
+        """
+        message_key = self._message_key(user_message)
+        # Relative dates resolve differently tomorrow
+        today = date_resolver.today()
+        key = ("result", message_key, self.state_version(existing_state), today)
+        cached = self._memo_get(key)
+        if cached is not None:
+            self._count("memo_hits")
+            return dict(cached)
+
+        self._count("extractions")
+        context = await self._extract_context_uncached(user_message, existing_state, today)
+        self._memo_put(key, context)
+
+        # Once applied, re-extracting the same message only repeats what it supplied
+        applied_state = {**(existing_state or {}), **{field: context[field] for field in EXTRACTION_STATE_FIELDS if field in context}}
+        settled_context = {
+            field: value for field, value in context.items()
+            if not (field in ('current_contract_id', 'current_workflow', 'date_range') and value is None)
+        }
+        self._memo_put(("result", message_key, self.state_version(applied_state), today), settled_context)
+        return dict(context)
+
+    async def _extract_context_uncached(self, user_message: str, existing_state: Dict[str, Any] = None,
+                                        today=None) -> Dict[str, Any]:
         context = {}
 
         # Extract client name first to check for client switching
         client_name = await self._extract_client_name(user_message)
         if client_name == "PRESERVE_EXISTING":
             # Don't update client context - preserve existing
-            print(f"🔍 DEBUG: Preserving existing client context")
+            logger.debug("🔍 DEBUG: Preserving existing client context")
             # Don't add current_client to context
         elif client_name is not None:  # None means "all clients", empty string means no client found
             context['current_client'] = client_name
-            print(f"🔍 DEBUG: Extracted client name: {client_name}")
+            logger.debug("🔍 DEBUG: Extracted client name: %s", client_name)
             
             # Check if client is switching - if so, clear contract ID from previous client
             if existing_state and 'current_client' in existing_state:
                 previous_client = existing_state.get('current_client', '')
                 if previous_client and previous_client.lower() != client_name.lower():
-                    print(f"🔍 DEBUG: Client switching from '{previous_client}' to '{client_name}' - clearing contract ID")
-                    context['current_contract_id'] = None  # Clear contract ID when switching clients
+                    logger.debug("🔍 DEBUG: Client switching from '%s' to '%s' - clearing contract ID", previous_client, client_name)
+                    # Clear the previous client's contract ID, but keep one given in this same message
+                    context['current_contract_id'] = self._extract_contract_id(user_message)
         elif client_name is None:  # "all clients" case
             context['current_client'] = None  # Explicitly set to None for "all clients"
-            print(f"🔍 DEBUG: Detected 'all clients' case - setting current_client to None")
+            logger.debug("🔍 DEBUG: Detected 'all clients' case - setting current_client to None")
             # Clear contract ID when switching to "all clients"
             if existing_state and 'current_client' in existing_state:
                 previous_client = existing_state.get('current_client', '')
                 if previous_client:
-                    print(f"🔍 DEBUG: Switching from specific client '{previous_client}' to 'all clients' - clearing contract ID")
+                    logger.debug("🔍 DEBUG: Switching from specific client '%s' to 'all clients' - clearing contract ID", previous_client)
                     context['current_contract_id'] = None
         else:
             # No client name extracted - preserve existing client context for responses like "all"
             if existing_state and 'current_client' in existing_state:
                 context['current_client'] = existing_state['current_client']
-                print(f"🔍 DEBUG: No client name extracted - preserving existing client context: {context['current_client']}")
+                logger.debug("🔍 DEBUG: No client name extracted - preserving existing client context: %s", context['current_client'])
             else:
-                print(f"🔍 DEBUG: No client name extracted and no existing client context")
+                logger.debug("🔍 DEBUG: No client name extracted and no existing client context")
 
         # Extract contract ID only if no client switching occurred
         contract_id = None
@@ -110,38 +246,47 @@ class ContextExtractor:
 
         # Check if this is a new operation request (not just a contract ID response)
         is_new_operation = self._is_new_operation_request(user_message)
-        print(f"🔍 DEBUG: Is new operation request: {is_new_operation} for message: '{user_message}'")
+        logger.debug("🔍 DEBUG: Is new operation request: %s for message: '%s'", is_new_operation, user_message)
+
+        # Relative date range named in the message; a new operation without one drops the previous range
+        date_range = date_resolver.find(user_message, today)
+        if date_range:
+            context['date_range'] = date_range.to_dict()
+            logger.debug("🔍 DEBUG: Extracted date range: %s", context['date_range'])
+        elif is_new_operation and existing_state and existing_state.get('date_range'):
+            context['date_range'] = None
 
         if is_new_operation:
             context['user_operation'] = self._extract_operation_type(user_message)
             context['original_user_request'] = user_message
-            print(f"🔍 DEBUG: Detected new user operation: {context['user_operation']}")
+            logger.debug("🔍 DEBUG: Detected new user operation: %s", context['user_operation'])
             
             
             # CRITICAL: If this is a completely different operation type, clear workflow context
             if existing_state and 'user_operation' in existing_state:
                 previous_operation = existing_state.get('user_operation', '')
                 if previous_operation and previous_operation != context['user_operation']:
-                    print(f"🔍 DEBUG: Operation switching from '{previous_operation}' to '{context['user_operation']}' - clearing workflow context")
-                    context['current_workflow'] = None  # Clear workflow when switching operations
-                    context['current_contract_id'] = None  # Clear contract ID when switching operations
+                    logger.debug("🔍 DEBUG: Operation switching from '%s' to '%s' - clearing workflow context", previous_operation, context['user_operation'])
+                    # Clear workflow and contract ID when switching operations, unless this message supplies them
+                    context['current_workflow'] = workflow
+                    context['current_contract_id'] = context.get('current_contract_id')
         else:
             # If it's just a contract ID or a response like "all", check if we have a pending operation from previous context
             # FIXED: Also check for "all" responses that should preserve operation context
             is_response_like_all = any(phrase in user_message.lower() for phrase in ['all', 'both', 'for all', 'for both', 'every', 'each'])
             if (contract_id and not is_new_operation) or (not is_new_operation and not contract_id) or is_response_like_all:
-                print(f"🔍 DEBUG: Response provided without operation - will preserve existing operation context")
+                logger.debug("🔍 DEBUG: Response provided without operation - will preserve existing operation context")
                 # Don't extract user_operation, let the existing one be preserved
                 # CRITICAL: Also preserve the original_user_request from existing state
                 if existing_state and 'original_user_request' in existing_state:
                     context['original_user_request'] = existing_state['original_user_request']
-                    print(f"🔍 DEBUG: Preserved original_user_request: {context['original_user_request']}")
+                    logger.debug("🔍 DEBUG: Preserved original_user_request: %s", context['original_user_request'])
                 # Also preserve user_operation from existing state
                 if existing_state and 'user_operation' in existing_state:
                     context['user_operation'] = existing_state['user_operation']
-                    print(f"🔍 DEBUG: Preserved user_operation: {context['user_operation']}")
+                    logger.debug("🔍 DEBUG: Preserved user_operation: %s", context['user_operation'])
             else:
-                print(f"🔍 DEBUG: Not a new operation request (skipping user_operation extraction)")
+                logger.debug("🔍 DEBUG: Not a new operation request (skipping user_operation extraction)")
 
         return context
     
@@ -176,42 +321,51 @@ class ContextExtractor:
     
     async def _extract_client_name(self, text: str) -> Optional[str]:
         """Extract client name from text using fuzzy database matching."""
-        print(f"🔍 DEBUG: _extract_client_name called with text: '{text}'")
+        logger.debug("🔍 DEBUG: _extract_client_name called with text: '%s'", text)
         
         # TODO: CONFIRMATION FIX - Check for confirmation responses first
         text_lower = text.lower()
         confirmation_words = ['yes', 'no', 'y', 'n', 'ok', 'okay', 'confirm', 'cancel', 'proceed', 'go ahead', 'sure', 'alright']
         if text_lower in confirmation_words:
-            print(f"🔍 DEBUG: Confirmation word detected: '{text_lower}' - preserving existing client context")
+            logger.debug("🔍 DEBUG: Confirmation word detected: '%s' - preserving existing client context", text_lower)
             return "PRESERVE_EXISTING"  # Special value to indicate we should preserve existing client
         
         # Check for "all clients" case first (but not just "all" by itself)
         if any(phrase in text_lower for phrase in ['all clients', 'every client', 'each client']):
-            print(f"🔍 DEBUG: _extract_client_name - detected 'all clients' case for text: {text}")
+            logger.debug("🔍 DEBUG: _extract_client_name - detected 'all clients' case for text: %s", text)
             return None  # None means all clients
         
         # Check if it's just "all" by itself - this should preserve existing client context
         if text_lower.strip() == 'all':
-            print(f"🔍 DEBUG: Detected standalone 'all' - preserving existing client context")
+            logger.debug("🔍 DEBUG: Detected standalone 'all' - preserving existing client context")
             return "PRESERVE_EXISTING"  # Special value to indicate we should preserve existing client
         
         # If it's just a number (contract ID), don't extract client - preserve existing context
         if text.strip().isdigit():
-            print(f"🔍 DEBUG: Detected contract ID '{text}' - not extracting client to preserve existing context")
+            logger.debug("🔍 DEBUG: Detected contract ID '%s' - not extracting client to preserve existing context", text)
             return "PRESERVE_EXISTING"  # Special value to indicate we should preserve existing client
         
+        # The client lookup depends only on the text, so it is shared across state versions
+        memo_key = ("client", self._message_key(text))
+        cached = self._memo_get(memo_key)
+        if cached is not None:
+            self._count("client_lookups_saved")
+            return cached[0]
+
         # Use fuzzy matcher to find the best client match
         try:
+            self._count("client_lookups")
             best_client = await fuzzy_matcher.find_best_client_match(text)
-            
-            if best_client:
-                print(f"🔍 DEBUG: Found client: '{best_client.client_name}'")
-                return best_client.client_name
+            client_name = best_client.client_name if best_client else None
+            self._memo_put(memo_key, (client_name,))
+
+            if client_name:
+                logger.debug("🔍 DEBUG: Found client: '%s'", client_name)
             else:
-                print(f"🔍 DEBUG: No client found")
-                return None
+                logger.debug("🔍 DEBUG: No client found")
+            return client_name
         except Exception as e:
-            print(f"🔍 DEBUG: Error in fuzzy client matching: {e}")
+            logger.debug("🔍 DEBUG: Error in fuzzy client matching: %s", e)
             # No fallback patterns - let the fuzzy matcher handle all cases
             return None
     
@@ -225,21 +379,31 @@ class ContextExtractor:
     
     def _extract_contract_id(self, text: str) -> Optional[str]:
         """Extract contract ID from text."""
-        print(f"🔍 DEBUG: Extracting contract ID from: '{text}'")
+        memo_key = ("contract_id", self._message_key(text))
+        cached = self._memo_get(memo_key)
+        if cached is not None:
+            self._count("contract_id_hits")
+            return cached[0]
+        extracted_id = self._match_contract_id(text)
+        self._memo_put(memo_key, (extracted_id,))
+        return extracted_id
+
+    def _match_contract_id(self, text: str) -> Optional[str]:
+        logger.debug("🔍 DEBUG: Extracting contract ID from: '%s'", text)
         
         # Skip extraction if the text contains "contract with [client]" pattern
         # This prevents false matches like "contract with InnovateTech Solutions"
         if re.search(r'contract\s+with\s+[a-zA-Z]', text, re.IGNORECASE):
-            print(f"🔍 DEBUG: Skipping contract ID extraction - detected 'contract with [client]' pattern")
+            logger.debug("🔍 DEBUG: Skipping contract ID extraction - detected 'contract with [client]' pattern")
             return None
         
         for i, pattern in enumerate(self.contract_id_patterns):
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 extracted_id = match.group(1).strip()
-                print(f"🔍 DEBUG: Pattern {i} matched: '{pattern}' -> extracted: '{extracted_id}'")
+                logger.debug("🔍 DEBUG: Pattern %s matched: '%s' -> extracted: '%s'", i, pattern, extracted_id)
                 return extracted_id
-        print(f"🔍 DEBUG: No contract ID patterns matched")
+        logger.debug("🔍 DEBUG: No contract ID patterns matched")
         return None
     
     def _is_new_operation_request(self, text: str) -> bool:
@@ -265,13 +429,13 @@ class ContextExtractor:
     def _extract_operation_type(self, text: str) -> str:
         """Extract the specific tool operation from the user message."""
         text_lower = text.lower()
-        print(f"🔍 DEBUG: _extract_operation_type - text: '{text}'")
-        print(f"🔍 DEBUG: _extract_operation_type - text_lower: '{text_lower}'")
+        logger.debug("🔍 DEBUG: _extract_operation_type - text: '%s'", text)
+        logger.debug("🔍 DEBUG: _extract_operation_type - text_lower: '%s'", text_lower)
         
         # Check for UPDATE operations FIRST (highest priority)
         # This handles ALL contract updates, including billing frequency, billing dates, amounts, etc.
         if ('update' in text_lower or 'change' in text_lower or 'modify' in text_lower or 'set' in text_lower) and 'contract' in text_lower and not ('employee' in text_lower or 'for employee' in text_lower):
-            print(f"🔍 DEBUG: _extract_operation_type - detected update_contract (generic contract update)")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected update_contract (generic contract update)")
             return 'update_contract'
         
         # Billing-specific QUERY operations (check these after updates)
@@ -280,10 +444,10 @@ class ContextExtractor:
         has_contract = 'contract' in text_lower
         has_create = 'create' in text_lower or 'new' in text_lower
         
-        print(f"🔍 DEBUG: _extract_operation_type - has_billing: {has_billing}, has_contract: {has_contract}, has_create: {has_create}")
+        logger.debug("🔍 DEBUG: _extract_operation_type - has_billing: %s, has_contract: %s, has_create: %s", has_billing, has_contract, has_create)
         
         if has_billing and has_contract and not has_create:
-            print(f"🔍 DEBUG: _extract_operation_type - detected billing operation")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected billing operation")
             # Check for specific billing query patterns
             if ('not set' in text_lower or 'null' in text_lower or 'no billing' in text_lower or 
                 'no next billing' in text_lower or 'billing prompt date not set' in text_lower):
@@ -291,7 +455,7 @@ class ContextExtractor:
             else:
                 return 'get_contracts_for_next_month_billing'
         elif 'amount' in text_lower and ('more than' in text_lower or 'greater than' in text_lower) and 'contract' in text_lower:
-            print(f"🔍 DEBUG: _extract_operation_type - detected get_contracts_by_amount for text: {text}")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected get_contracts_by_amount for text: %s", text)
             return 'get_contracts_by_amount'
         elif ('document' in text_lower or 'file' in text_lower) and 'contract' in text_lower and ('uploaded' in text_lower or 'have' in text_lower):
             return 'get_contracts_with_documents'
@@ -300,30 +464,30 @@ class ContextExtractor:
         
         # Employee creation operations (check these FIRST to avoid conflicts with document upload)
         elif ('create' in text_lower or 'add' in text_lower) and ('employee' in text_lower or 'staff' in text_lower or 'worker' in text_lower or 'personnel' in text_lower):
-            print(f"🔍 DEBUG: _extract_operation_type - detected create_employee")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected create_employee")
             return 'create_employee'
         # Employee document upload operations (check these AFTER employee creation to avoid conflicts)
         elif 'upload' in text_lower and ('employee' in text_lower or 'staff' in text_lower or 'worker' in text_lower or 'personnel' in text_lower):
-            print(f"🔍 DEBUG: _extract_operation_type - detected upload_employee_document")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected upload_employee_document")
             return 'upload_employee_document'
         elif 'upload' in text_lower and 'contract' in text_lower and ('employee' in text_lower or 'for employee' in text_lower):
             # Contract document for employee - this is employee document upload
-            print(f"🔍 DEBUG: _extract_operation_type - detected upload_employee_document (contract document for employee)")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected upload_employee_document (contract document for employee)")
             return 'upload_employee_document'
         # Contract operations (check these FIRST to avoid conflicts with employee operations)
         elif ('create' in text_lower or 'add' in text_lower) and 'contract' in text_lower:
-            print(f"🔍 DEBUG: _extract_operation_type - detected create_contract")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected create_contract")
             return 'create_contract'
         # Employee document deletion operations (check these FIRST to avoid conflicts with contract operations)
         elif 'delete' in text_lower and ('nda' in text_lower or 'contract' in text_lower) and ('employee' in text_lower or 'staff' in text_lower or 'worker' in text_lower or 'personnel' in text_lower) and ('for employee' in text_lower or 'for staff' in text_lower or 'for worker' in text_lower or 'for personnel' in text_lower):
             # Delete employee document (NDA or contract)
-            print(f"🔍 DEBUG: _extract_operation_type - detected delete_employee_document")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected delete_employee_document")
             return 'delete_employee_document'
         elif 'delete' in text_lower and 'contract' in text_lower:
-            print(f"🔍 DEBUG: _extract_operation_type - detected delete_contract")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected delete_contract")
             return 'delete_contract'
         elif ('create' in text_lower or 'add' in text_lower) and 'contract' in text_lower:
-            print(f"🔍 DEBUG: _extract_operation_type - detected create_contract")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected create_contract")
             return 'create_contract'
         elif 'upload' in text_lower and 'contract' in text_lower:
             return 'upload_contract_document'
@@ -332,18 +496,18 @@ class ContextExtractor:
         
         # Employee operations (check these after contract operations, before client operations)
         elif ('update' in text_lower or 'change' in text_lower or 'modify' in text_lower or 'set' in text_lower) and ('employee' in text_lower or 'staff' in text_lower or 'worker' in text_lower or 'personnel' in text_lower):
-            print(f"🔍 DEBUG: _extract_operation_type - detected update_employee")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected update_employee")
             return 'update_employee'
         elif 'delete' in text_lower and ('employee' in text_lower or 'staff' in text_lower or 'worker' in text_lower or 'personnel' in text_lower) and not ('document' in text_lower or 'nda' in text_lower or 'contract' in text_lower):
             # Delete entire employee record (not a document)
-            print(f"🔍 DEBUG: _extract_operation_type - detected delete_employee")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected delete_employee")
             return 'delete_employee'
         elif ('show' in text_lower or 'get' in text_lower or 'list' in text_lower) and ('employee' in text_lower or 'staff' in text_lower or 'worker' in text_lower or 'personnel' in text_lower):
-            print(f"🔍 DEBUG: _extract_operation_type - detected search_employees")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected search_employees")
             return 'search_employees'
         elif 'upload' in text_lower and 'nda' in text_lower and not ('client' in text_lower or 'sangard' in text_lower or 'acme' in text_lower) and not ('contract' in text_lower or 'blake' in text_lower or 'international' in text_lower):
             # NDA document upload without client - likely employee document
-            print(f"🔍 DEBUG: _extract_operation_type - detected upload_employee_document (NDA document without client)")
+            logger.debug("🔍 DEBUG: _extract_operation_type - detected upload_employee_document (NDA document without client)")
             return 'upload_employee_document'
         
         # Client operations (check these after contract and employee operations)
@@ -373,17 +537,17 @@ class ContextExtractor:
     
     def update_state_with_context(self, state: AgentState, context: Dict[str, Any]) -> AgentState:
         """Update state with extracted context."""
-        print(f"🔍 DEBUG: update_state_with_context called with context: {context}")
-        print(f"🔍 DEBUG: Current state data before update: {state.get('data', {})}")
+        logger.debug("🔍 DEBUG: update_state_with_context called with context: %s", context)
+        logger.debug("🔍 DEBUG: Current state data before update: %s", state.get('data', {}))
         
         if not context:
-            print(f"🔍 DEBUG: No context provided, returning state unchanged")
+            logger.debug("🔍 DEBUG: No context provided, returning state unchanged")
             return state
         
         # Initialize data if it doesn't exist
         if 'data' not in state:
             state['data'] = {}
-            print(f"🔍 DEBUG: Initialized empty data in state")
+            logger.debug("🔍 DEBUG: Initialized empty data in state")
         
         # Update state with context
         for key, value in context.items():
@@ -391,39 +555,39 @@ class ContextExtractor:
             if key == 'user_operation':
                 # Always update user_operation if it's provided in context
                 state['data'][key] = value
-                print(f"🔍 DEBUG: Updated user operation: {value}")
+                logger.debug("🔍 DEBUG: Updated user operation: %s", value)
             elif key == 'original_user_request':
                 # Always update original_user_request if it's provided in context
                 state['data'][key] = value
-                print(f"🔍 DEBUG: Updated original user request: {value}")
+                logger.debug("🔍 DEBUG: Updated original user request: %s", value)
             else:
                 # For other context (client, contract_id, workflow), always update
-                # Special handling for contract_id - if None, remove it from state
-                if key == 'current_contract_id' and value is None:
-                    if 'current_contract_id' in state['data']:
-                        del state['data']['current_contract_id']
-                        print(f"🔍 DEBUG: Cleared contract ID due to client switching")
+                # Special handling for contract_id and date_range - if None, remove them from state
+                if key in ('current_contract_id', 'date_range') and value is None:
+                    if key in state['data']:
+                        del state['data'][key]
+                        logger.debug("🔍 DEBUG: Cleared %s from state", key)
                 else:
                     state['data'][key] = value
-                    print(f"🔍 DEBUG: Saved context {key} = {value}")
+                    logger.debug("🔍 DEBUG: Saved context %s = %s", key, value)
         
         # Preserve existing user_operation if not provided in new context
         if 'user_operation' not in context and 'user_operation' in state['data']:
-            print(f"🔍 DEBUG: Preserving existing user operation: {state['data']['user_operation']}")
+            logger.debug("🔍 DEBUG: Preserving existing user operation: %s", state['data']['user_operation'])
         elif 'user_operation' not in context:
-            print(f"🔍 DEBUG: No user_operation in context and none in state to preserve")
+            logger.debug("🔍 DEBUG: No user_operation in context and none in state to preserve")
         else:
-            print(f"🔍 DEBUG: user_operation provided in context: {context['user_operation']}")
+            logger.debug("🔍 DEBUG: user_operation provided in context: %s", context['user_operation'])
         
         # Preserve existing original_user_request if not provided in new context
         if 'original_user_request' not in context and 'original_user_request' in state['data']:
-            print(f"🔍 DEBUG: Preserving existing original user request: {state['data']['original_user_request']}")
+            logger.debug("🔍 DEBUG: Preserving existing original user request: %s", state['data']['original_user_request'])
         elif 'original_user_request' not in context:
-            print(f"🔍 DEBUG: No original_user_request in context and none in state to preserve")
+            logger.debug("🔍 DEBUG: No original_user_request in context and none in state to preserve")
         else:
-            print(f"🔍 DEBUG: original_user_request provided in context: {context['original_user_request']}")
+            logger.debug("🔍 DEBUG: original_user_request provided in context: %s", context['original_user_request'])
         
-        print(f"🔍 DEBUG: Final state data after update: {state.get('data', {})}")
+        logger.debug("🔍 DEBUG: Final state data after update: %s", state.get('data', {}))
         return state
     
     def get_context_for_tool_call(self, state: AgentState, tool_name: str) -> Dict[str, Any]:
@@ -447,3 +611,4 @@ class ContextExtractor:
 
 # Global instance
 context_extractor = ContextExtractor()
+change_events.subscribe(context_extractor.on_client_change, (CLIENT,))
@@ -0,0 +1,349 @@
+"""
+Deterministic dispatch rules that bypass the LLM for well-specified requests.
+
+Many requests are fully determined by the message and the context extracted
+from it ("show contracts for Acme", "details of employee 42"). Rules map the
+operation, extracted entities and message shape to a tool invocation so they
+are served without model calls:
+- Declarative rules: agents, operations, message pattern, required entities,
+  tool arguments and a response template
+- First matching rule wins; rules are evaluated in order
+- TOOL_CALL rules emit a synthesized tool call for the tool executor, which
+  formats the result exactly as for model-issued calls
+- DIRECT rules run through EnhancedAgentNodeExecutor._execute_direct_tool_call
+  (the original upload and contract-ID short-circuits)
+- Message-pattern rules also pick the agent, so the router skips its LLM call;
+  rules serving any agent route to the agent named by their route entity
+  ("show more" goes back to the agent whose listing it continues)
+- Per-rule hit rates
+"""
+
+import os
+import re
+import json
+import uuid
+from enum import Enum
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .context_extractor import context_extractor
+from ..tools.result_paging import SHOW_MORE_PATTERN
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+class DispatchMode(Enum):
+    TOOL_CALL = "tool_call"
+    DIRECT = "direct"
+
+
+@dataclass
+class DispatchContext:
+    """What a rule can look at"""
+    state: Dict[str, Any]
+    agent_name: str
+    message: str
+    normalized_message: str
+    entities: Dict[str, Any]
+    has_file_info: bool
+    fresh_intent: bool
+
+
+@dataclass
+class DispatchRule:
+    name: str
+    # None: the tool mapped to the operation by _execute_direct_tool_call
+    tool: Optional[str]
+    mode: DispatchMode = DispatchMode.TOOL_CALL
+    agents: Tuple[str, ...] = ()
+    operations: Tuple[str, ...] = ()
+    # Full match against the normalized message; named groups become entities
+    pattern: Optional[str] = None
+    requires: Tuple[str, ...] = ()
+    # Tool argument -> entity name
+    arguments: Dict[str, str] = field(default_factory=dict)
+    response_template: str = ""
+    # The operation must have been extracted from this turn's message
+    fresh_intent: bool = True
+    # True requires an uploaded file, False rules one out, None ignores it
+    file_upload: Optional[bool] = False
+    condition: Optional[Callable[[DispatchContext], bool]] = None
+    # Entity naming the agent to route to, for rules that serve any agent
+    route_entity: Optional[str] = None
+
+    def __post_init__(self):
+        self.compiled_pattern = re.compile(self.pattern) if self.pattern else None
+
+
+@dataclass
+class DispatchMatch:
+    rule: DispatchRule
+    arguments: Dict[str, Any]
+    response: str
+
+    def to_message(self) -> Dict[str, Any]:
+        """Agent message carrying the rule's tool call, as the LLM would have produced it"""
+        return {
+            "type": "ai",
+            "content": self.response,
+            "role": "assistant",
+            "tool_calls": [{
+                "id": f"call_{self.rule.name}_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": self.rule.tool, "arguments": json.dumps(self.arguments)},
+            }],
+        }
+
+
+def normalize_message(message: str) -> str:
+    return re.sub(r"\s+", " ", message.lower()).strip().rstrip("?.!").strip()
+
+
+def _is_contract_id_reply(ctx: DispatchContext) -> bool:
+    """A bare contract ID answering the contract list from the previous turn"""
+    data = ctx.state.get('data', {})
+    if 'current_contract_id' not in data:
+        return False
+    # The ID came from an earlier message if the current one doesn't yield it
+    extracted_id = context_extractor._extract_contract_id(ctx.message)
+    return (ctx.message.isdigit() and extracted_id != data.get('current_contract_id')
+            and len(ctx.state.get('messages', [])) > 1)
+
+
+def _name_words(name: str) -> List[str]:
+    return re.findall(r"[\w&]+", (name or "").lower())
+
+
+def _names_current_client(ctx: DispatchContext) -> bool:
+    """The message names exactly the resolved client, with nothing left over
+    ("for Acme and Globex", "for Acme from last month" need the LLM)"""
+    client_words = _name_words(ctx.entities.get('current_client'))
+    tail_words = _name_words(ctx.entities.get('client_phrase'))
+    if tail_words[:1] == ["the"] and client_words[:1] != ["the"]:
+        tail_words = tail_words[1:]
+    return bool(client_words) and tail_words == client_words
+
+
+_SHOW = r"(?:show|get|list|display|view|find)(?: me)?(?: all)?(?: the)?(?: my)?"
+_DETAILS = r"(?:details|info|information|profile) (?:of|for|on)"
+
+DISPATCH_RULES: List[DispatchRule] = [
+    # Uploads with a file attached and a known client (with or without a contract selected)
+    DispatchRule(
+        name="contract_document_upload",
+        tool="upload_contract_document",
+        mode=DispatchMode.DIRECT,
+        operations=("upload_contract_document",),
+        requires=("current_client",),
+        fresh_intent=False,
+        file_upload=True,
+    ),
+    # A bare contract ID answering "which contract?" for an update/delete/upload
+    DispatchRule(
+        name="contract_id_reply",
+        tool=None,
+        mode=DispatchMode.DIRECT,
+        operations=("update_contract", "delete_contract", "upload_contract_document"),
+        requires=("current_client",),
+        fresh_intent=False,
+        file_upload=None,
+        condition=_is_contract_id_reply,
+    ),
+    # "show more" / "next page" after a paged listing: resume from the stored cursor
+    DispatchRule(
+        name="show_more_results",
+        tool="show_more_results",
+        pattern=SHOW_MORE_PATTERN,
+        requires=("result_cursor",),
+        arguments={"cursor": "result_cursor"},
+        response_template="Fetching the next page.",
+        fresh_intent=False,
+        route_entity="result_cursor_agent",
+    ),
+    DispatchRule(
+        name="contract_details_by_id",
+        tool="get_contract_details",
+        agents=("contract_agent",),
+        pattern=rf"(?:{_SHOW} (?:{_DETAILS} )?|{_DETAILS} )contract (?:#|id |number )?(?P<contract_id>\d+)(?: details)?",
+        arguments={"contract_id": "contract_id"},
+        response_template="Fetching details for contract {contract_id}.",
+        fresh_intent=False,
+    ),
+    DispatchRule(
+        name="employee_details_by_id",
+        tool="get_employee_details",
+        agents=("employee_agent",),
+        pattern=rf"(?:{_SHOW} (?:{_DETAILS} )?|{_DETAILS} )employee (?:#|id |number )?(?P<employee_id>\d+)(?: details)?",
+        arguments={"employee_id": "employee_id"},
+        response_template="Fetching details for employee {employee_id}.",
+        fresh_intent=False,
+    ),
+    DispatchRule(
+        name="contracts_by_client",
+        tool="get_client_contracts",
+        agents=("contract_agent",),
+        operations=("get_contracts_by_client",),
+        pattern=rf"{_SHOW} contracts? (?:for|of) (?!(?:the )?(?:employee|staff)\b)(?P<client_phrase>[\w&.,' -]+)",
+        requires=("current_client",),
+        arguments={"client_name": "current_client"},
+        response_template="Fetching contracts for {current_client}.",
+        condition=_names_current_client,
+    ),
+    DispatchRule(
+        name="client_details",
+        tool="get_client_details",
+        agents=("client_agent",),
+        operations=("get_client_details",),
+        pattern=rf"{_SHOW} (?:client )?(?:details|info|information) (?:for|of|about|on) (?P<client_phrase>[\w&.,' -]+)",
+        requires=("current_client",),
+        arguments={"client_name": "current_client"},
+        response_template="Fetching details for {current_client}.",
+        condition=_names_current_client,
+    ),
+    DispatchRule(
+        name="contracts_with_null_billing",
+        tool="get_contracts_with_null_billing",
+        agents=("contract_agent",),
+        operations=("get_contracts_with_null_billing",),
+        pattern=rf"{_SHOW} contracts (?:with|having|that have|without) (?:no |null |missing |a null |an empty )?billing(?: prompt)? dates?(?: (?:not set|set to null|missing))?",
+        response_template="Fetching contracts without a billing date.",
+    ),
+    DispatchRule(
+        name="contracts_billing_next_month",
+        tool="get_contracts_for_next_month_billing",
+        agents=("contract_agent",),
+        operations=("get_contracts_for_next_month_billing",),
+        pattern=rf"{_SHOW} contracts (?:with billing (?:prompt )?dates? |due for billing |to bill |for billing )?(?:in |for )?next month(?:'s billing)?",
+        response_template="Fetching contracts billing next month.",
+    ),
+    DispatchRule(
+        name="all_clients",
+        tool="get_all_clients",
+        agents=("client_agent",),
+        pattern=rf"{_SHOW} clients",
+        response_template="Fetching all clients.",
+        fresh_intent=False,
+    ),
+    DispatchRule(
+        name="all_employees",
+        tool="get_all_employees",
+        agents=("employee_agent",),
+        pattern=rf"{_SHOW} (?:employees|staff)",
+        response_template="Fetching all employees.",
+        fresh_intent=False,
+    ),
+]
+
+
+class DispatchEngine:
+    """Evaluates dispatch rules against the agent state"""
+
+    def __init__(self, rules: Optional[List[DispatchRule]] = None, enabled: Optional[bool] = None):
+        self.rules = list(DISPATCH_RULES if rules is None else rules)
+        # DIRECT rules are the original short-circuits and always apply
+        self.enabled = enabled if enabled is not None else os.getenv("AGENT_DETERMINISTIC_DISPATCH", "true").lower() in ("1", "true", "yes")
+        self._stats = {"checks": 0, "hits": 0, "routes": 0}
+        self._rule_hits: Dict[str, int] = {rule.name: 0 for rule in self.rules}
+
+    def _active_rules(self) -> List[DispatchRule]:
+        return [rule for rule in self.rules if self.enabled or rule.mode is DispatchMode.DIRECT]
+
+    def _context(self, state: Dict[str, Any], agent_name: str) -> DispatchContext:
+        data = state.get('data', {}) or {}
+        messages = state.get('messages', [])
+        message = ""
+        if messages:
+            last_message = messages[-1]
+            if isinstance(last_message, dict):
+                message = (last_message.get('content') or '').strip()
+            elif hasattr(last_message, 'content'):
+                message = (last_message.content or '').strip()
+
+        return DispatchContext(
+            state=state,
+            agent_name=agent_name,
+            message=message,
+            normalized_message=normalize_message(message),
+            entities=dict(data),
+            has_file_info=bool(state.get('context', {}).get('file_info')),
+            fresh_intent=(data.get('original_user_request') or '').strip() == message,
+        )
+
+    def _evaluate(self, rule: DispatchRule, ctx: DispatchContext) -> Optional[DispatchMatch]:
+        if rule.agents and ctx.agent_name not in rule.agents:
+            return None
+        if rule.operations and ctx.entities.get('user_operation') not in rule.operations:
+            return None
+        if rule.fresh_intent and rule.operations and not ctx.fresh_intent:
+            return None
+        if rule.file_upload is not None and rule.file_upload != ctx.has_file_info:
+            return None
+
+        entities = ctx.entities
+        if rule.compiled_pattern:
+            match = rule.compiled_pattern.fullmatch(ctx.normalized_message)
+            if not match:
+                return None
+            entities = {**entities, **{
+                key: int(value) if value.isdigit() else value
+                for key, value in match.groupdict().items() if value is not None
+            }}
+
+        if any(entities.get(entity) in (None, "") for entity in rule.requires):
+            return None
+        # Conditions see the entities captured from the message too
+        if rule.condition and not rule.condition(replace(ctx, entities=entities)):
+            return None
+
+        arguments = {arg: entities[entity] for arg, entity in rule.arguments.items()}
+        response = rule.response_template.format(**entities) if rule.response_template else ""
+        return DispatchMatch(rule, arguments, response)
+
+    def match(self, state: Dict[str, Any], agent_name: str) -> Optional[DispatchMatch]:
+        """The first rule that fully determines this request, if any."""
+        ctx = self._context(state, agent_name)
+        self._stats["checks"] += 1
+
+        for rule in self._active_rules():
+            dispatch = self._evaluate(rule, ctx)
+            if dispatch:
+                self._stats["hits"] += 1
+                self._rule_hits[rule.name] = self._rule_hits.get(rule.name, 0) + 1
+                logger.debug("⚡ DISPATCH: Rule '%s' -> %s %s (no LLM call)", rule.name, rule.tool or 'operation tool', dispatch.arguments)
+                return dispatch
+
+        logger.debug("🔍 DEBUG: No dispatch rule matched for %s - letting LLM handle the request", agent_name)
+        return None
+
+    def route(self, user_message: str, data: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Agent for a message whose shape (and, for route-entity rules, ``data``) identifies a dispatch rule."""
+        if not self.enabled:
+            return None
+        normalized = normalize_message(user_message)
+        data = data or {}
+        for rule in self.rules:
+            if not (rule.compiled_pattern and rule.compiled_pattern.fullmatch(normalized)):
+                continue
+            agent = rule.agents[0] if len(rule.agents) == 1 else None
+            if rule.route_entity and all(data.get(entity) not in (None, "") for entity in rule.requires):
+                agent = data.get(rule.route_entity)
+            if agent:
+                self._stats["routes"] += 1
+                return agent
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        checks = self._stats["checks"]
+        return {
+            **self._stats,
+            "hit_rate": self._stats["hits"] / checks if checks else 0.0,
+            "rules": {
+                name: {"hits": hits, "hit_rate": hits / checks if checks else 0.0}
+                for name, hits in self._rule_hits.items()
+            },
+        }
+
+
+# Global dispatch engine
+dispatch_engine = DispatchEngine()
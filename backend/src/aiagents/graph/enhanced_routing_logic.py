@@ -7,6 +7,9 @@ classified and routed to the appropriate specialized agent.
 
 from typing import Dict, List, Tuple, Any
 import re
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class EnhancedRoutingLogic:
@@ -167,14 +170,14 @@ class EnhancedRoutingLogic:
         Returns:
             Dict containing agent_name, confidence, reasoning, and operation_type
         """
-        print(f"🔍 ENHANCED ROUTING: classify_request called with user_message='{user_message}', context={context}")
+        logger.debug("🔍 ENHANCED ROUTING: classify_request called with user_message='%s', context=%s", user_message, context)
         message_lower = user_message.lower()
 
         # EARLY special-case: explicit client details phrasing → client_agent
         if ("client" in message_lower) and (
             "show details" in message_lower or "client details" in message_lower or "details" in message_lower
         ):
-            print("🔍 ENHANCED ROUTING: Early match for client details → client_agent")
+            logger.debug("🔍 ENHANCED ROUTING: Early match for client details → client_agent")
             return {
                 "agent_name": "client_agent",
                 "confidence": "high",
@@ -187,7 +190,7 @@ class EnhancedRoutingLogic:
         if self._is_confirmation_response(user_message, context):
             current_agent = context.get('current_agent')
             if current_agent:
-                print(f"🔍 ENHANCED ROUTING: Confirmation response detected, routing to {current_agent}")
+                logger.debug("🔍 ENHANCED ROUTING: Confirmation response detected, routing to %s", current_agent)
                 return {
                     "agent_name": current_agent,
                     "confidence": "high",
@@ -198,14 +201,14 @@ class EnhancedRoutingLogic:
 
         # Step 1: Identify operation type
         operation_type = self._identify_operation_type(message_lower)
-        print(f"🔍 ENHANCED ROUTING: operation_type='{operation_type}'")
+        logger.debug("🔍 ENHANCED ROUTING: operation_type='%s'", operation_type)
 
         # Special-case: client detail queries should go to client_agent
         if (
             ("client" in message_lower or "clients" in message_lower)
             and any(kw in message_lower for kw in ["show details", "details", "get details", "client details"]) 
         ):
-            print("🔍 ENHANCED ROUTING: Detected client details request → routing to client_agent")
+            logger.debug("🔍 ENHANCED ROUTING: Detected client details request → routing to client_agent")
             return {
                 "agent_name": "client_agent",
                 "confidence": "high",
@@ -216,7 +219,7 @@ class EnhancedRoutingLogic:
 
         # Step 2: Check for contract operations (high priority)
         if any(keyword in user_message.lower() for keyword in ['create a new contract', 'create contract', 'new contract', 'contract for', 'billing', 'invoice']):
-            print(f"🔍 ENHANCED ROUTING: Contract operation detected, routing to contract_agent")
+            logger.debug("🔍 ENHANCED ROUTING: Contract operation detected, routing to contract_agent")
             return {
                 "agent_name": "contract_agent",
                 "confidence": "high",
@@ -227,7 +230,7 @@ class EnhancedRoutingLogic:
         
         # Step 3: Check for employee document uploads (special case)
         if self._is_employee_document_upload(user_message, context):
-            print(f"🔍 ENHANCED ROUTING: Employee document upload detected, routing to employee_agent")
+            logger.debug("🔍 ENHANCED ROUTING: Employee document upload detected, routing to employee_agent")
             return {
                 "agent_name": "employee_agent",
                 "confidence": "high",
@@ -238,7 +241,7 @@ class EnhancedRoutingLogic:
         
         # Step 4: Check for contract ID responses (special case)
         if self._is_contract_id_response(user_message, context):
-            print(f"🔍 ENHANCED ROUTING: Contract ID response detected, routing to contract_agent")
+            logger.debug("🔍 ENHANCED ROUTING: Contract ID response detected, routing to contract_agent")
             return {
                 "agent_name": "contract_agent",
                 "confidence": "high",
@@ -249,7 +252,7 @@ class EnhancedRoutingLogic:
         
         # Step 4.5: Check for "all" responses to contract operations (special case)
         if self._is_all_response_to_contract_operation(user_message, context):
-            print(f"🔍 ENHANCED ROUTING: 'All' response to contract operation detected, routing to contract_agent")
+            logger.debug("🔍 ENHANCED ROUTING: 'All' response to contract operation detected, routing to contract_agent")
             return {
                 "agent_name": "contract_agent",
                 "confidence": "high",
@@ -489,73 +492,73 @@ class EnhancedRoutingLogic:
 
     def _is_confirmation_response(self, user_message: str, context: Dict[str, Any] = None) -> bool:
         """Check if the user message is a confirmation response (yes/no)."""
-        print(f"🔍 CONFIRMATION CHECK: user_message='{user_message}', context={context}")
+        logger.debug("🔍 CONFIRMATION CHECK: user_message='%s', context=%s", user_message, context)
         
         # Check for confirmation words
         confirmation_words = ['yes', 'no', 'y', 'n', 'ok', 'okay', 'confirm', 'cancel', 'proceed', 'go ahead', 'sure', 'alright']
         message_lower = user_message.lower().strip()
         
-        print(f"🔍 CONFIRMATION CHECK: message_lower='{message_lower}', in confirmation_words={message_lower in confirmation_words}")
+        logger.debug("🔍 CONFIRMATION CHECK: message_lower='%s', in confirmation_words=%s", message_lower, message_lower in confirmation_words)
         
         if message_lower in confirmation_words:
-            print(f"🔍 CONFIRMATION CHECK: Confirmation word detected: '{message_lower}'")
+            logger.debug("🔍 CONFIRMATION CHECK: Confirmation word detected: '%s'", message_lower)
             # Check if we have an active workflow that needs confirmation
             current_workflow = context.get('current_workflow') if context else None
             user_operation = context.get('user_operation') if context else None
             
-            print(f"🔍 CONFIRMATION CHECK: current_workflow='{current_workflow}', user_operation='{user_operation}'")
+            logger.debug("🔍 CONFIRMATION CHECK: current_workflow='%s', user_operation='%s'", current_workflow, user_operation)
             
             # If we have an active workflow, this is likely a confirmation
             if current_workflow or user_operation:
-                print(f"🔍 CONFIRMATION CHECK: Active workflow/operation found, returning True")
+                logger.debug("🔍 CONFIRMATION CHECK: Active workflow/operation found, returning True")
                 return True
             else:
-                print(f"🔍 CONFIRMATION CHECK: No active workflow/operation found")
+                logger.debug("🔍 CONFIRMATION CHECK: No active workflow/operation found")
         else:
-            print(f"🔍 CONFIRMATION CHECK: Message '{message_lower}' not in confirmation words: {confirmation_words}")
+            logger.debug("🔍 CONFIRMATION CHECK: Message '%s' not in confirmation words: %s", message_lower, confirmation_words)
         
-        print(f"🔍 CONFIRMATION CHECK: Not a confirmation response, returning False")
+        logger.debug("🔍 CONFIRMATION CHECK: Not a confirmation response, returning False")
         return False
 
     def _is_contract_id_response(self, user_message: str, context: Dict[str, Any] = None) -> bool:
         """Check if the user message is a contract ID response that should be routed to contract agent."""
-        print(f"🔍 CONTRACT ID CHECK: user_message='{user_message}', context={context}")
+        logger.debug("🔍 CONTRACT ID CHECK: user_message='%s', context=%s", user_message, context)
         
         # Check if message is just a number (potential contract ID)
         if not user_message.strip().isdigit():
-            print(f"🔍 CONTRACT ID CHECK: Not a digit, returning False")
+            logger.debug("🔍 CONTRACT ID CHECK: Not a digit, returning False")
             return False
 
         # If we have context indicating a pending contract operation, route to contract agent
         if context:
             context_str = str(context)
-            print(f"🔍 CONTRACT ID CHECK: Context available, checking for contract operations")
+            logger.debug("🔍 CONTRACT ID CHECK: Context available, checking for contract operations")
             
             # Check for file upload context (indicates document upload operation)
             if isinstance(context, dict):
                 if context.get('file_info') or 'file_info' in context_str:
-                    print(f"🔍 CONTRACT ID CHECK: File info found, returning True")
+                    logger.debug("🔍 CONTRACT ID CHECK: File info found, returning True")
                     return True
 
                 # Check for pending contract operations
                 user_operation = context.get('user_operation', '')
-                print(f"🔍 CONTRACT ID CHECK: user_operation='{user_operation}'")
+                logger.debug("🔍 CONTRACT ID CHECK: user_operation='%s'", user_operation)
                 if any(op in user_operation.lower() for op in ['contract', 'upload_contract_document']):
-                    print(f"🔍 CONTRACT ID CHECK: Contract operation found, returning True")
+                    logger.debug("🔍 CONTRACT ID CHECK: Contract operation found, returning True")
                     return True
 
                 # Check for contract-related context
                 if context.get('current_contract_id') or 'contract' in context_str.lower():
-                    print(f"🔍 CONTRACT ID CHECK: Contract context found, returning True")
+                    logger.debug("🔍 CONTRACT ID CHECK: Contract context found, returning True")
                     return True
             else:
                 # Handle string context
                 if 'file_info' in context_str:
-                    print(f"🔍 CONTRACT ID CHECK: File info in string context, returning True")
+                    logger.debug("🔍 CONTRACT ID CHECK: File info in string context, returning True")
                     return True
                 
                 if 'contract' in context_str.lower():
-                    print(f"🔍 CONTRACT ID CHECK: Contract in string context, returning True")
+                    logger.debug("🔍 CONTRACT ID CHECK: Contract in string context, returning True")
                     return True
             
             # Check for operation state in string context
@@ -573,39 +576,39 @@ class EnhancedRoutingLogic:
 
     def _is_all_response_to_contract_operation(self, user_message: str, context: Dict[str, Any] = None) -> bool:
         """Check if the user message is an 'all' response to a contract operation."""
-        print(f"🔍 ALL RESPONSE CHECK: user_message='{user_message}', context={context}")
+        logger.debug("🔍 ALL RESPONSE CHECK: user_message='%s', context=%s", user_message, context)
         
         # Check if message is "all" (case insensitive)
         if user_message.lower().strip() != 'all':
-            print(f"🔍 ALL RESPONSE CHECK: Not 'all', returning False")
+            logger.debug("🔍 ALL RESPONSE CHECK: Not 'all', returning False")
             return False
 
         # If we have context indicating a pending contract operation, route to contract agent
         if context:
             context_str = str(context)
-            print(f"🔍 ALL RESPONSE CHECK: Context available, checking for contract operations")
+            logger.debug("🔍 ALL RESPONSE CHECK: Context available, checking for contract operations")
             
             # Check for pending contract operations
             if isinstance(context, dict):
                 user_operation = context.get('user_operation', '')
-                print(f"🔍 ALL RESPONSE CHECK: user_operation='{user_operation}'")
+                logger.debug("🔍 ALL RESPONSE CHECK: user_operation='%s'", user_operation)
                 if any(op in user_operation.lower() for op in ['update_contract', 'delete_contract', 'create_contract']):
-                    print(f"🔍 ALL RESPONSE CHECK: Contract operation found, returning True")
+                    logger.debug("🔍 ALL RESPONSE CHECK: Contract operation found, returning True")
                     return True
 
                 # Check for contract-related context
                 if context.get('current_contract_id') or 'contract' in context_str.lower():
-                    print(f"🔍 ALL RESPONSE CHECK: Contract context found, returning True")
+                    logger.debug("🔍 ALL RESPONSE CHECK: Contract context found, returning True")
                     return True
             else:
                 # Handle string context
                 if 'contract' in context_str.lower():
-                    print(f"🔍 ALL RESPONSE CHECK: Contract in string context, returning True")
+                    logger.debug("🔍 ALL RESPONSE CHECK: Contract in string context, returning True")
                     return True
             
             # Check for operation state in string context
             if 'update_contract' in context_str or 'delete_contract' in context_str or 'create_contract' in context_str:
-                print(f"🔍 ALL RESPONSE CHECK: Contract operation in string context, returning True")
+                logger.debug("🔍 ALL RESPONSE CHECK: Contract operation in string context, returning True")
                 return True
 
         # Also check state data for contract operations
@@ -613,51 +616,51 @@ class EnhancedRoutingLogic:
             state_data = context['data']
             user_operation = state_data.get('user_operation', '')
             if any(op in user_operation.lower() for op in ['update_contract', 'delete_contract', 'create_contract']):
-                print(f"🔍 ALL RESPONSE CHECK: Contract operation in state data, returning True")
+                logger.debug("🔍 ALL RESPONSE CHECK: Contract operation in state data, returning True")
                 return True
 
-        print(f"🔍 ALL RESPONSE CHECK: No contract operation found, returning False")
+        logger.debug("🔍 ALL RESPONSE CHECK: No contract operation found, returning False")
         return False
 
     def _is_employee_document_upload(self, user_message: str, context: Dict[str, Any] = None) -> bool:
         """Check if this is an employee document upload operation."""
         message_lower = user_message.lower()
-        print(f"🔍 EMPLOYEE DOCUMENT CHECK: Checking message='{user_message}', context={context}")
+        logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: Checking message='%s', context=%s", user_message, context)
         
         # Check for file upload context
         if context and isinstance(context, dict):
             if context.get('file_info'):
-                print(f"🔍 EMPLOYEE DOCUMENT CHECK: File info found, checking for employee context")
+                logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: File info found, checking for employee context")
                 
                 # Check if this is an employee operation - prioritize current message over context
                 user_operation = context.get('user_operation', '')
-                print(f"🔍 EMPLOYEE DOCUMENT CHECK: user_operation='{user_operation}'")
+                logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: user_operation='%s'", user_operation)
                 
                 # First check if the current message indicates an employee operation
                 if ('employee' in message_lower or 'staff' in message_lower or 'worker' in message_lower or 'personnel' in message_lower):
-                    print(f"🔍 EMPLOYEE DOCUMENT CHECK: Current message indicates employee operation")
+                    logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: Current message indicates employee operation")
                     return True
                 
                 # Only check context if current message doesn't clearly indicate a different operation
                 if not ('client' in message_lower or 'contract' in message_lower or 'delete' in message_lower):
                     if 'employee' in user_operation.lower() or 'upload_employee_document' in user_operation.lower():
-                        print(f"🔍 EMPLOYEE DOCUMENT CHECK: Employee operation detected from context")
+                        logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: Employee operation detected from context")
                         return True
                 
                 # Generic logic: Check for explicit employee context indicators
                 # Priority 1: Explicit employee keywords
                 if 'employee' in message_lower or 'staff' in message_lower or 'worker' in message_lower or 'personnel' in message_lower:
-                    print(f"🔍 EMPLOYEE DOCUMENT CHECK: Explicit employee keyword detected")
+                    logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: Explicit employee keyword detected")
                     return True
                 
                 # Priority 2: Check if this is clearly a client operation (explicit client mention)
                 if 'client' in message_lower:
-                    print(f"🔍 EMPLOYEE DOCUMENT CHECK: Client mentioned - NOT an employee operation")
+                    logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: Client mentioned - NOT an employee operation")
                     return False
                 
                 # Priority 3: Check for employee document patterns (NDA without client context)
                 if 'nda' in message_lower and 'document' in message_lower and 'client' not in message_lower:
-                    print(f"🔍 EMPLOYEE DOCUMENT CHECK: NDA document without client context - likely employee")
+                    logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: NDA document without client context - likely employee")
                     return True
                 
                 # Priority 4: Check for person-like names (first name + last name pattern)
@@ -671,14 +674,14 @@ class EnhancedRoutingLogic:
                     company_indicators = ['llc', 'inc', 'corp', 'ltd', 'co', 'company', 'solutions', 'systems', 'group', 'international']
                     for match in person_matches:
                         if not any(indicator in match.lower() for indicator in company_indicators):
-                            print(f"🔍 EMPLOYEE DOCUMENT CHECK: Person name pattern detected: {match}")
+                            logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: Person name pattern detected: %s", match)
                             return True
             else:
-                print(f"🔍 EMPLOYEE DOCUMENT CHECK: No file_info found in context")
+                logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: No file_info found in context")
         else:
-            print(f"🔍 EMPLOYEE DOCUMENT CHECK: No context or context is not dict")
+            logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: No context or context is not dict")
         
-        print(f"🔍 EMPLOYEE DOCUMENT CHECK: Returning False")
+        logger.debug("🔍 EMPLOYEE DOCUMENT CHECK: Returning False")
         return False
 
     def _select_best_agent(self, scores: Dict[str, float]) -> Tuple[str, str]:
@@ -789,17 +792,16 @@ def test_enhanced_routing():
         "Change details for Acme Corporation"
     ]
     
-    print("=== Enhanced Routing Logic Test Results ===\n")
+    logger.debug("=== Enhanced Routing Logic Test Results ===")
     
     for i, test_message in enumerate(test_cases, 1):
         result = router.classify_request(test_message)
-        print(f"{i}. Message: '{test_message}'")
-        print(f"   → Agent: {result['agent_name']}")
-        print(f"   → Confidence: {result['confidence']}")
-        print(f"   → Reasoning: {result['reasoning']}")
-        print(f"   → Operation: {result['operation_type']}")
-        print(f"   → Scores: {result['scores']}")
-        print()
+        logger.debug("%s. Message: '%s'", i, test_message)
+        logger.debug("   → Agent: %s", result['agent_name'])
+        logger.debug("   → Confidence: %s", result['confidence'])
+        logger.debug("   → Reasoning: %s", result['reasoning'])
+        logger.debug("   → Operation: %s", result['operation_type'])
+        logger.debug("   → Scores: %s", result['scores'])
 
 if __name__ == "__main__":
     test_enhanced_routing()
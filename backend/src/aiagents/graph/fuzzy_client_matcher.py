@@ -1,21 +1,30 @@
 """
 Fuzzy client name matcher that uses database queries instead of regex patterns.
 This approach is more robust and handles various user phrasings.
+
+Candidate names are resolved against the in-process client name index; the
+database is only queried when the index cannot be loaded.
 """
 
 import re
 from typing import Optional, List, Dict, Any
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.core.database import get_ai_db
 from src.database.core.models import Client
+from src.aiagents.performance.client_name_index import client_name_index
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class FuzzyClientMatcher:
-    """Fuzzy client name matcher using database LIKE queries."""
+    """Fuzzy client name matcher backed by the client name index, with database LIKE queries as fallback."""
     
-    def __init__(self):
+    def __init__(self, name_index=None):
+        self.name_index = name_index or client_name_index
+
         # Simple patterns to extract potential client names
         self.client_extraction_patterns = [
             r"client\s+['\"]?([A-Za-z][A-Za-z\s&]{2,30})(?:\s+with|\s*$)['\"]?",
@@ -82,52 +91,55 @@ class FuzzyClientMatcher:
         return list(set(potential_names))  # Remove duplicates
     
     async def find_matching_clients(self, potential_names: List[str]) -> List[Client]:
-        """Find matching clients in the database using LIKE queries."""
+        """
+        Find matching clients, best match first.
+
+        Results come from the client name index (``IndexedClient`` objects with
+        ``client_id``/``client_name``); a miss re-checks the clients table
+        version before it is trusted. Full ``Client`` rows are only returned by
+        the SQL fallback when the index is unavailable.
+        """
         if not potential_names:
             return []
-        
+
+        if await self.name_index.ensure_fresh():
+            matches = self.name_index.match(potential_names)
+            if matches:
+                return matches
+            # A miss may be a client created by another worker since the last check
+            if await self.name_index.ensure_fresh(force=True):
+                return self.name_index.match(potential_names)
+
+        return await self._find_matching_clients_sql(potential_names)
+
+    async def _find_matching_clients_sql(self, potential_names: List[str]) -> List[Client]:
+        """Find matching clients in the database with one LIKE query for all candidate names."""
         try:
             async with get_ai_db() as session:
+                names_lower = [name.lower() for name in potential_names]
+                # '%name%' also covers the 'name%' and '%name' patterns
+                result = await session.execute(
+                    select(Client).where(or_(*[
+                        func.lower(Client.client_name).like(f"%{name}%") for name in names_lower
+                    ]))
+                )
+                rows = result.scalars().all()
+
                 matching_clients = []
-                
-                for name in potential_names:
-                    # Create search patterns
-                    search_patterns = [
-                        f"%{name}%",  # Contains the name
-                        f"{name}%",   # Starts with the name
-                        f"%{name}",   # Ends with the name
-                    ]
-                    
-                    # Try exact match first
-                    try:
-                        exact_match = await session.execute(
-                            select(Client).where(func.lower(Client.client_name) == name.lower())
-                        )
-                        exact_clients = exact_match.scalars().all()
-                        if exact_clients:
-                            matching_clients.extend(exact_clients)
-                            continue
-                    except Exception as e:
-                        print(f"🔍 DEBUG: Exact match failed for '{name}': {e}")
-                    
-                    # Try LIKE queries
-                    for pattern in search_patterns:
-                        try:
-                            like_match = await session.execute(
-                                select(Client).where(
-                                    func.lower(Client.client_name).like(pattern.lower())
-                                )
-                            )
-                            clients = like_match.scalars().all()
-                            matching_clients.extend(clients)
-                        except Exception as e:
-                            print(f"🔍 DEBUG: LIKE query failed for pattern '{pattern}': {e}")
-                
-                # Remove duplicates and return
+                for name in names_lower:
+                    # An exact match for a name hides its partial matches
+                    exact_clients = [client for client in rows if client.client_name.lower() == name]
+                    matching_clients.extend(exact_clients or [client for client in rows if name in client.client_name.lower()])
+
+                # Remove duplicates and rank: exact > starts with > contains
                 unique_clients = list({client.client_id: client for client in matching_clients}.values())
-                return unique_clients
+                return sorted(unique_clients, key=lambda client: (
+                    client.client_name.lower() not in names_lower,
+                    not any(client.client_name.lower().startswith(name) for name in names_lower),
+                    len(client.client_name)
+                ))
         except Exception as e:
-            print(f"🔍 DEBUG: Database error in find_matching_clients: {e}")
+            logger.debug("🔍 DEBUG: Database error in find_matching_clients: %s", e)
             return []
     
     async def find_best_client_match(self, text: str) -> Optional[Client]:
@@ -142,23 +154,7 @@ class FuzzyClientMatcher:
         if not matching_clients:
             return None
         
-        # If only one match, return it
-        if len(matching_clients) == 1:
-            return matching_clients[0]
-        
-        # If multiple matches, try to find the best one
-        # Priority: exact match > starts with > contains
-        for name in potential_names:
-            for client in matching_clients:
-                client_name_lower = client.client_name.lower()
-                name_lower = name.lower()
-                
-                if client_name_lower == name_lower:
-                    return client
-                elif client_name_lower.startswith(name_lower):
-                    return client
-        
-        # If no exact or starts-with match, return the first one
+        # Matches are ranked best first (exact > alias > starts with > contains > similar)
         return matching_clients[0]
     
     def get_client_suggestions(self, matching_clients: List[Client]) -> str:
@@ -6,15 +6,23 @@ OpenAI Agents SDK agents while maintaining backward compatibility.
 """
 
 from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableLambda
 from typing import Dict, Any
 import traceback
 from .state import AgentState
-from .router import router
-from .nodes import contract_agent_node, employee_agent_node, client_agent_node, deliverable_agent_node, time_agent_node, user_agent_node
+from .router import master_router_node
+from .nodes import (
+    contract_agent_node, employee_agent_node, client_agent_node, deliverable_agent_node, time_agent_node, user_agent_node,
+    run_node_sync
+)
 from .tools import tool_executor_node
 from .agents_sdk_integration import create_hybrid_workflow_node, initialize_hybrid_system
 # Import the hybrid orchestrator
 from .agents_sdk_integration import get_hybrid_orchestrator
+from src.aiagents.memory.checkpointer import graph_checkpointer
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 # Greeting node function
 def greeting_node(state: AgentState) -> Dict:
@@ -40,30 +48,37 @@ def greeting_node(state: AgentState) -> Dict:
         }]}
 
     except Exception as e:
-        print(f"Error in greeting node: {e}")
+        logger.error("Error in greeting node: %s", e)
         return {"messages": [{
             "type": "ai",
             "content": "Hello! How can I help you today?",
             "role": "assistant"
         }]}
 
+def async_node(node, name: str) -> RunnableLambda:
+    """
+    Register a coroutine node natively for ``ainvoke``/``astream``, with a
+    sync facade so scripts can still drive the graph with ``invoke``.
+    """
+    return RunnableLambda(lambda state: run_node_sync(node, state), afunc=node, name=name)
+
 # This is the enhanced definition of our agentic application graph with SDK integration.
 workflow = StateGraph(AgentState)
 
 # 1. Add the nodes to the graph
-workflow.add_node("router", router)
+workflow.add_node("router", async_node(master_router_node, "router"))
 workflow.add_node("greeting", greeting_node)
-workflow.add_node("client_agent", client_agent_node)
-workflow.add_node("contract_agent", contract_agent_node)
-workflow.add_node("employee_agent", employee_agent_node)
-workflow.add_node("deliverable_agent", deliverable_agent_node)
-workflow.add_node("time_agent", time_agent_node)
-workflow.add_node("user_agent", user_agent_node)
-workflow.add_node("tool_executor", tool_executor_node)
+workflow.add_node("client_agent", async_node(client_agent_node, "client_agent"))
+workflow.add_node("contract_agent", async_node(contract_agent_node, "contract_agent"))
+workflow.add_node("employee_agent", async_node(employee_agent_node, "employee_agent"))
+workflow.add_node("deliverable_agent", async_node(deliverable_agent_node, "deliverable_agent"))
+workflow.add_node("time_agent", async_node(time_agent_node, "time_agent"))
+workflow.add_node("user_agent", async_node(user_agent_node, "user_agent"))
+workflow.add_node("tool_executor", async_node(tool_executor_node, "tool_executor"))
 
 # Add hybrid workflow node for SDK integration
 hybrid_node = create_hybrid_workflow_node()
-workflow.add_node("hybrid_agent", hybrid_node)
+workflow.add_node("hybrid_agent", async_node(hybrid_node, "hybrid_agent"))
 
 # 2. Set the entry point
 workflow.set_entry_point("router")
@@ -73,8 +88,8 @@ workflow.set_entry_point("router")
 # Enhanced routing with SDK preference
 def enhanced_router(state: AgentState) -> str:
     """Enhanced router that considers SDK availability"""
-    print(f"🔍 DEBUG: enhanced_router called with state keys: {list(state.keys()) if isinstance(state, dict) else 'Not a dict'}")
-    print(f"🔍 DEBUG: enhanced_router state: {state}")
+    logger.debug("🔍 DEBUG: enhanced_router called with state keys: %s", list(state.keys()) if isinstance(state, dict) else 'Not a dict')
+    logger.debug("🔍 DEBUG: enhanced_router state: %s", state)
 
     try:
         # 🔧 CRITICAL FIX: Check for employee operations first and bypass everything else
@@ -82,15 +97,15 @@ def enhanced_router(state: AgentState) -> str:
             last_message = state['messages'][-1]
             if isinstance(last_message, dict) and 'content' in last_message:
                 message_content = last_message['content'].lower()
-                print(f"🔍 DEBUG: enhanced_router - checking message: '{message_content}'")
-                print(f"🔍 DEBUG: enhanced_router - checking for amount filtering patterns...")
+                logger.debug("🔍 DEBUG: enhanced_router - checking message: '%s'", message_content)
+                logger.debug("🔍 DEBUG: enhanced_router - checking for amount filtering patterns...")
                 if 'amount' in message_content and ('more than' in message_content or 'greater than' in message_content) and 'contract' in message_content:
-                    print(f"🔍 DEBUG: enhanced_router - DETECTED AMOUNT FILTERING PATTERN!")
+                    logger.debug("🔍 DEBUG: enhanced_router - DETECTED AMOUNT FILTERING PATTERN!")
                 
                 # Check for employee document deletion patterns specifically
                 if ('delete' in message_content and 'document' in message_content and 
                     any(word in message_content for word in ['employee', 'staff', 'worker', 'personnel'])):
-                    print(f"🔍 DEBUG: enhanced_router - DETECTED EMPLOYEE DOCUMENT DELETION, forcing employee_agent")
+                    logger.debug("🔍 DEBUG: enhanced_router - DETECTED EMPLOYEE DOCUMENT DELETION, forcing employee_agent")
                     state['current_agent'] = 'employee_agent'
                     if 'data' not in state:
                         state['data'] = {}
@@ -116,7 +131,7 @@ def enhanced_router(state: AgentState) -> str:
                         'employee' in message_content or 'staff' in message_content or 'worker' in message_content or 'personnel' in message_content
                     )
                 ):
-                    print(f"🔍 DEBUG: enhanced_router - DETECTED EMPLOYEE OPERATION, forcing employee_agent")
+                    logger.debug("🔍 DEBUG: enhanced_router - DETECTED EMPLOYEE OPERATION, forcing employee_agent")
                     # Force employee agent and update state
                     state['current_agent'] = 'employee_agent'
                     if 'data' not in state:
@@ -139,35 +154,23 @@ def enhanced_router(state: AgentState) -> str:
             )
             
             if not is_new_user_message:
-                print(f"🔍 DEBUG: enhanced_router - routing already completed for tool result, skipping")
+                logger.debug("🔍 DEBUG: enhanced_router - routing already completed for tool result, skipping")
                 # CRITICAL FIX: Check top-level current_agent first, then data.current_agent
                 current_agent = state.get('current_agent') or state.get('data', {}).get('current_agent', 'client_agent')
-                print(f"🔍 DEBUG: enhanced_router - returning current_agent: {current_agent}")
-                print(f"🔍 DEBUG: enhanced_router - state data: {state.get('data', {})}")
+                logger.debug("🔍 DEBUG: enhanced_router - returning current_agent: %s", current_agent)
+                logger.debug("🔍 DEBUG: enhanced_router - state data: %s", state.get('data', {}))
                 return current_agent
             else:
-                print(f"🔍 DEBUG: enhanced_router - new user message detected, re-evaluating routing")
+                logger.debug("🔍 DEBUG: enhanced_router - new user message detected, using this turn's routing")
                 # Reset routing state for new user message
                 if 'routing_completed' in state.get('data', {}):
                     del state['data']['routing_completed']
-                if 'current_agent' in state:
-                    del state['current_agent']
-        
-        # 🔧 FIX: Check if sync router has already made a decision (top-level current_agent)
-        if state.get('current_agent') and state['current_agent'] != 'router':
-            print(f"🔍 DEBUG: enhanced_router - sync router already decided: {state['current_agent']}")
-            # Mark routing as completed and return the sync router's decision
-            if 'data' not in state:
-                state['data'] = {}
-            state['data']['routing_completed'] = True
-            state['data']['current_agent'] = state['current_agent']
-            return state['current_agent']
-        
+
         # Mark routing as completed to prevent loops
         if 'data' not in state:
             state['data'] = {}
         state['data']['routing_completed'] = True
-        
+
         orchestrator = get_hybrid_orchestrator()
         agent_status = orchestrator.get_agent_status()
 
@@ -178,26 +181,19 @@ def enhanced_router(state: AgentState) -> str:
         #     state['data']['current_agent'] = 'hybrid_agent'
         #     return "hybrid_agent"
 
-        # Use original routing
-        print(f"🔍 DEBUG: enhanced_router - using original router")
-        router_result = router(state)
-        print(f"🔍 DEBUG: enhanced_router - router result: {router_result}")
-
-        # The router returns a dict with current_agent, extract the agent name
-        if isinstance(router_result, dict) and "current_agent" in router_result:
-            agent_name = router_result["current_agent"]
-            print(f"🔍 DEBUG: enhanced_router - extracted agent name: {agent_name}")
-            state['data']['current_agent'] = agent_name
-            return agent_name
-        else:
-            print(f"🔍 DEBUG: enhanced_router - router result is not a dict or missing current_agent, returning client_agent")
-            state['data']['current_agent'] = 'client_agent'
-            return "client_agent"
+        # The router node already decided for this message (it runs before this edge)
+        agent_name = state.get('current_agent')
+        if not agent_name or agent_name == 'router':
+            logger.debug("🔍 DEBUG: enhanced_router - router made no decision, returning client_agent")
+            agent_name = 'client_agent'
+        logger.debug("🔍 DEBUG: enhanced_router - router decided: %s", agent_name)
+        state['data']['current_agent'] = agent_name
+        return agent_name
 
     except Exception as e:
-        print(f"❌ enhanced_router error: {e}")
+        logger.error("❌ enhanced_router error: %s", e)
         
-        print(f"❌ enhanced_router traceback: {traceback.format_exc()}")
+        logger.error("❌ enhanced_router traceback:", exc_info=True)
         state['data']['current_agent'] = 'client_agent'
         return "client_agent"
 
@@ -242,8 +238,8 @@ def after_agent_execution(state: AgentState) -> str:
     # 🚀 PHASE 2 OPTIMIZATION: Enhanced agent execution logic to prevent unnecessary iterations
     # TODO: If agents stop calling tools when needed, revert these optimizations
 
-    print(f"🔍 DEBUG: after_agent_execution - state['data'] = {state.get('data', {})}")
-    print(f"🔍 DEBUG: after_agent_execution - user_operation = {state.get('data', {}).get('user_operation', 'NOT_FOUND')}")
+    logger.debug("🔍 DEBUG: after_agent_execution - state['data'] = %s", state.get('data', {}))
+    logger.debug("🔍 DEBUG: after_agent_execution - user_operation = %s", state.get('data', {}).get('user_operation', 'NOT_FOUND'))
 
     last_message = state['messages'][-1]
 
@@ -255,7 +251,7 @@ def after_agent_execution(state: AgentState) -> str:
             "ok", "okay", "got it", "understood", "sure"
         ]
         if any(response in content for response in simple_responses) and len(content) < 100:
-            print(f"🛑 Early termination: Simple response detected, no tools needed")
+            logger.debug("🛑 Early termination: Simple response detected, no tools needed")
             return END
 
     # 🚀 OPTIMIZATION: Check if we've already executed tools in this conversation
@@ -268,7 +264,7 @@ def after_agent_execution(state: AgentState) -> str:
 
         # If we've already made multiple tool calls, be more conservative
         if tool_call_count >= 2:
-            print(f"🛑 Early termination: Multiple tool calls already executed ({tool_call_count})")
+            logger.debug("🛑 Early termination: Multiple tool calls already executed (%s)", tool_call_count)
             return END
 
     # Original logic: check for tool calls
@@ -279,18 +275,18 @@ def after_agent_execution(state: AgentState) -> str:
     elif isinstance(last_message, dict) and last_message.get('tool_calls'):
         has_tool_calls = True
     
-    print(f"🔍 DEBUG: Tool call detection - has_tool_calls: {has_tool_calls}")
-    print(f"🔍 DEBUG: Tool call detection - last_message type: {type(last_message)}")
+    logger.debug("🔍 DEBUG: Tool call detection - has_tool_calls: %s", has_tool_calls)
+    logger.debug("🔍 DEBUG: Tool call detection - last_message type: %s", type(last_message))
     if isinstance(last_message, dict):
-        print(f"🔍 DEBUG: Tool call detection - dict keys: {list(last_message.keys())}")
+        logger.debug("🔍 DEBUG: Tool call detection - dict keys: %s", list(last_message.keys()))
         if 'tool_calls' in last_message:
-            print(f"🔍 DEBUG: Tool call detection - tool_calls count: {len(last_message['tool_calls'])}")
+            logger.debug("🔍 DEBUG: Tool call detection - tool_calls count: %s", len(last_message['tool_calls']))
     
     if has_tool_calls:
-        print(f"🔍 DEBUG: Routing to tool_executor")
+        logger.debug("🔍 DEBUG: Routing to tool_executor")
         return "tool_executor"
     else:
-        print(f"🔍 DEBUG: No tool calls detected, ending workflow")
+        logger.debug("🔍 DEBUG: No tool calls detected, ending workflow")
         return END
 
 # This function decides what to do after tool execution
@@ -299,8 +295,8 @@ def after_tool_execution(state: AgentState) -> str:
     # 🚀 PERFORMANCE OPTIMIZATION: Track execution flow for contract search optimization
     # REVERT: If infinite loop issues persist, revert to original logic
 
-    print(f"🔍 DEBUG: after_tool_execution - state['data'] = {state.get('data', {})}")
-    print(f"🔍 DEBUG: after_tool_execution - user_operation = {state.get('data', {}).get('user_operation', 'NOT_FOUND')}")
+    logger.debug("🔍 DEBUG: after_tool_execution - state['data'] = %s", state.get('data', {}))
+    logger.debug("🔍 DEBUG: after_tool_execution - user_operation = %s", state.get('data', {}).get('user_operation', 'NOT_FOUND'))
 
     # LOOP PREVENTION: Track tool execution cycles to prevent infinite loops
     if 'tool_execution_count' not in state.get('data', {}):
@@ -309,7 +305,7 @@ def after_tool_execution(state: AgentState) -> str:
 
     # If we've executed too many tools in this conversation, end it
     if state['data']['tool_execution_count'] > 5:
-        print(f"🛑 LOOP PREVENTION: Ending conversation after {state['data']['tool_execution_count']} tool executions")
+        logger.debug("🛑 LOOP PREVENTION: Ending conversation after %s tool executions", state['data']['tool_execution_count'])
         return END
 
     # Check if the last tool result indicates completion
@@ -324,91 +320,91 @@ def after_tool_execution(state: AgentState) -> str:
             # Tool result messages are stored as dicts with 'content' key
             content = last_message.get('content', '').lower()
         
-        print(f"🔍 DEBUG: after_tool_execution - last message content: {content[:200]}...")
+        logger.debug("🔍 DEBUG: after_tool_execution - last message content: %s...", content[:200])
     
     # Check for successful tool execution using the stored success status
     last_tool_success = state.get('data', {}).get('last_tool_success')
-    print(f"🔍 DEBUG: after_tool_execution - last_tool_success: {last_tool_success}")
+    logger.debug("🔍 DEBUG: after_tool_execution - last_tool_success: %s", last_tool_success)
     
     if last_tool_success is True:
-        print("🛑 LOOP PREVENTION: Tool execution completed successfully, clearing context")
+        logger.debug("🛑 LOOP PREVENTION: Tool execution completed successfully, clearing context")
         # Clear operation context after successful operations to prevent interference with next request
         if 'current_contract_id' in state.get('data', {}):
             del state['data']['current_contract_id']
-            print("🔍 DEBUG: Cleared current_contract_id after successful operation")
+            logger.debug("🔍 DEBUG: Cleared current_contract_id after successful operation")
         if 'user_operation' in state.get('data', {}):
             del state['data']['user_operation']
-            print("🔍 DEBUG: Cleared user_operation after successful operation")
+            logger.debug("🔍 DEBUG: Cleared user_operation after successful operation")
         if 'original_user_request' in state.get('data', {}):
             del state['data']['original_user_request']
-            print("🔍 DEBUG: Cleared original_user_request after successful operation")
+            logger.debug("🔍 DEBUG: Cleared original_user_request after successful operation")
         if 'current_workflow' in state.get('data', {}):
             del state['data']['current_workflow']
-            print("🔍 DEBUG: Cleared current_workflow after successful operation")
+            logger.debug("🔍 DEBUG: Cleared current_workflow after successful operation")
         if 'current_client' in state.get('data', {}):
             del state['data']['current_client']
-            print("🔍 DEBUG: Cleared current_client after successful operation")
+            logger.debug("🔍 DEBUG: Cleared current_client after successful operation")
         # CRITICAL FIX: Reset agent routing state for next request
         if 'current_agent' in state:
             del state['current_agent']
-            print("🔍 DEBUG: Cleared current_agent after successful operation")
+            logger.debug("🔍 DEBUG: Cleared current_agent after successful operation")
         if 'routing_completed' in state.get('data', {}):
             del state['data']['routing_completed']
-            print("🔍 DEBUG: Cleared routing_completed after successful operation")
+            logger.debug("🔍 DEBUG: Cleared routing_completed after successful operation")
         # Clear the success status to prevent repeated clearing
         if 'last_tool_success' in state.get('data', {}):
             del state['data']['last_tool_success']
-            print("🔍 DEBUG: Cleared last_tool_success status")
+            logger.debug("🔍 DEBUG: Cleared last_tool_success status")
         return END
     
     # Fallback: Check message content for success keywords (for backward compatibility)
     if content:
         # Special check for create_client_and_contract success
         if 'successfully created client' in content and 'contract' in content:
-            print("🛑 LOOP PREVENTION: create_client_and_contract completed successfully, ending conversation")
+            logger.debug("🛑 LOOP PREVENTION: create_client_and_contract completed successfully, ending conversation")
             # Clear operation context after successful operations
             if 'current_contract_id' in state.get('data', {}):
                 del state['data']['current_contract_id']
-                print("🔍 DEBUG: Cleared current_contract_id after successful create_client_and_contract")
+                logger.debug("🔍 DEBUG: Cleared current_contract_id after successful create_client_and_contract")
             if 'user_operation' in state.get('data', {}):
                 del state['data']['user_operation']
-                print("🔍 DEBUG: Cleared user_operation after successful create_client_and_contract")
+                logger.debug("🔍 DEBUG: Cleared user_operation after successful create_client_and_contract")
             if 'original_user_request' in state.get('data', {}):
                 del state['data']['original_user_request']
-                print("🔍 DEBUG: Cleared original_user_request after successful create_client_and_contract")
+                logger.debug("🔍 DEBUG: Cleared original_user_request after successful create_client_and_contract")
             if 'current_workflow' in state.get('data', {}):
                 del state['data']['current_workflow']
-                print("🔍 DEBUG: Cleared current_workflow after successful create_client_and_contract")
+                logger.debug("🔍 DEBUG: Cleared current_workflow after successful create_client_and_contract")
             return END
             
         # TODO: CONFIRMATION FIX - Check for confirmation responses and clear context after successful operations
         # If tool result indicates success or completion, end conversation
         success_keywords = ['successfully', 'completed', 'updated', 'created', 'uploaded', 'deleted', 'removed', 'added']
         if any(keyword in content for keyword in success_keywords):
-            print("🛑 LOOP PREVENTION: Tool execution completed successfully (fallback detection), ending conversation")
+            logger.debug("🛑 LOOP PREVENTION: Tool execution completed successfully (fallback detection), ending conversation")
             # Clear operation context after successful operations to prevent interference with next request
             if 'current_contract_id' in state.get('data', {}):
                 del state['data']['current_contract_id']
-                print("🔍 DEBUG: Cleared current_contract_id after successful operation")
+                logger.debug("🔍 DEBUG: Cleared current_contract_id after successful operation")
             if 'user_operation' in state.get('data', {}):
                 del state['data']['user_operation']
-                print("🔍 DEBUG: Cleared user_operation after successful operation")
+                logger.debug("🔍 DEBUG: Cleared user_operation after successful operation")
             if 'original_user_request' in state.get('data', {}):
                 del state['data']['original_user_request']
-                print("🔍 DEBUG: Cleared original_user_request after successful operation")
+                logger.debug("🔍 DEBUG: Cleared original_user_request after successful operation")
             if 'current_workflow' in state.get('data', {}):
                 del state['data']['current_workflow']
-                print("🔍 DEBUG: Cleared current_workflow after successful operation")
+                logger.debug("🔍 DEBUG: Cleared current_workflow after successful operation")
             if 'current_client' in state.get('data', {}):
                 del state['data']['current_client']
-                print("🔍 DEBUG: Cleared current_client after successful operation")
+                logger.debug("🔍 DEBUG: Cleared current_client after successful operation")
             # CRITICAL FIX: Reset agent routing state for next request
             if 'current_agent' in state:
                 del state['current_agent']
-                print("🔍 DEBUG: Cleared current_agent after successful operation")
+                logger.debug("🔍 DEBUG: Cleared current_agent after successful operation")
             if 'routing_completed' in state.get('data', {}):
                 del state['data']['routing_completed']
-                print("🔍 DEBUG: Cleared routing_completed after successful operation")
+                logger.debug("🔍 DEBUG: Cleared routing_completed after successful operation")
             return END
             
         # TODO: CONFIRMATION FIX - Also clear context when user confirms an operation (yes/no responses)
@@ -422,19 +418,19 @@ def after_tool_execution(state: AgentState) -> str:
                 current_workflow = state.get('data', {}).get('current_workflow')
                 user_operation = state.get('data', {}).get('user_operation')
                 
-                print(f"🔍 DEBUG WORKFLOW: User said '{content_lower}', current_workflow='{current_workflow}', user_operation='{user_operation}'")
+                logger.debug("🔍 DEBUG WORKFLOW: User said '%s', current_workflow='%s', user_operation='%s'", content_lower, current_workflow, user_operation)
                 
                 # If this is a confirmation for an upload operation, clear context after processing
                 if current_workflow == 'upload' and user_operation == 'upload_contract_document':
-                    print("🛑 LOOP PREVENTION: User confirmed upload operation, will clear context after processing")
+                    logger.debug("🛑 LOOP PREVENTION: User confirmed upload operation, will clear context after processing")
                     # Don't clear context immediately - let the agent process the confirmation first
                     # The context will be cleared when the actual upload completes
                 else:
-                    print(f"🔍 DEBUG WORKFLOW: Not an upload confirmation - workflow='{current_workflow}', operation='{user_operation}'")
+                    logger.debug("🔍 DEBUG WORKFLOW: Not an upload confirmation - workflow='%s', operation='%s'", current_workflow, user_operation)
 
     # CRITICAL FIX: After tool execution, end the workflow
     # The tool results are already formatted and ready for the user
-    print("🔍 DEBUG: Tool execution completed, ending workflow")
+    logger.debug("🔍 DEBUG: Tool execution completed, ending workflow")
     return END
 
 # After any agent runs, we check if we need to run tools
@@ -481,23 +477,27 @@ workflow.add_conditional_edges(
 # 4. Compile the graph into a runnable application
 app = workflow.compile()
 
+# Chat turns run on a thread: every step is checkpointed and a failed run
+# resumes from the last completed step
+persistent_app = workflow.compile(checkpointer=graph_checkpointer)
+
 async def initialize_hybrid_workflow():
     """Initialize the hybrid workflow with SDK integration"""
-    print("🚀 Initializing Hybrid Workflow with OpenAI Agents SDK...")
-    print("🔍 DEBUG: Hybrid workflow initialization starting")
+    logger.debug("🚀 Initializing Hybrid Workflow with OpenAI Agents SDK...")
+    logger.debug("🔍 DEBUG: Hybrid workflow initialization starting")
 
     # Initialize SDK agents
     sdk_initialized = await initialize_hybrid_system()
 
     if sdk_initialized:
-        print("✅ OpenAI Agents SDK integration enabled")
+        logger.debug("✅ OpenAI Agents SDK integration enabled")
     else:
-        print("⚠️ OpenAI Agents SDK not available, using fallback mode")
+        logger.warning("⚠️ OpenAI Agents SDK not available, using fallback mode")
 
-    print("✅ Hybrid workflow compiled successfully!")
+    logger.debug("✅ Hybrid workflow compiled successfully!")
     return app
 
-print("✅ Hybrid workflow graph structure compiled successfully!")
+logger.debug("✅ Hybrid workflow graph structure compiled successfully!")
 
 # Export the initialization function
-__all__ = ['app', 'initialize_hybrid_workflow']
+__all__ = ['app', 'persistent_app', 'initialize_hybrid_workflow']
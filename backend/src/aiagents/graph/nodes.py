@@ -4,7 +4,7 @@ import json
 import time
 import asyncio
 import re
-from openai import OpenAI
+from src.aiagents.services.llm_client import llm_client
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import hashlib
@@ -12,11 +12,16 @@ import traceback
    
 from .state import AgentState
 from .context_extractor import context_extractor
+from .tool_selection import tool_selector
+from .dispatch_rules import dispatch_engine, DispatchMode
+from .prefetch import context_prefetcher
 from ..memory.conversation_memory import ConversationMemoryManager
 from ..memory.context_manager import ContextManager
+from ..memory.context_window import context_window_manager
 from ..orchestration.dynamic_prompts import get_dynamic_instructions, PromptTemplate
 from ..orchestration.parallel_executor import ParallelAgentExecutor, ExecutionPlan, ExecutionMode
 from ..performance.intelligent_cache import get_cached, set_cached
+from ..performance.change_events import CLIENT, CONTRACT, EMPLOYEE, DependentKeyIndex, change_events
 
 # Import agent classes to get their tool schemas
 from ..contract_agent import ContractAgent
@@ -39,6 +44,19 @@ from src.database.core.database import get_ai_db
 from src.database.core.models import Contract, Client
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Entity types an agent's cached responses are read from; a change event for
+# one of them evicts the responses (other agents' responses expire by TTL)
+AGENT_RESPONSE_DEPENDENCIES = {
+    "client_agent": (CLIENT, CONTRACT),
+    "contract_agent": (CONTRACT, CLIENT),
+    "employee_agent": (EMPLOYEE,),
+}
+agent_response_keys = DependentKeyIndex()
+change_events.subscribe(agent_response_keys.evict)
 
 class EnhancedAgentNodeExecutor:
     """
@@ -53,12 +71,10 @@ class EnhancedAgentNodeExecutor:
     """
 
     def __init__(self, model: str = "gpt-4o-mini"):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-        else:
-            self.client = None
-            print("Warning: OpenAI API key not found. Agent executor will use fallback mode.")
+        # Shared pooled async client - completions no longer block the event loop
+        self.client = llm_client
+        if not self.client.available:
+            logger.warning("Warning: OpenAI API key not found. Agent executor will use fallback mode.")
         self.model = model
         self.memory_manager = ConversationMemoryManager()
         self.context_manager = ContextManager()
@@ -93,7 +109,7 @@ class EnhancedAgentNodeExecutor:
         if not hasattr(self, '_invocation_count'):
             self._invocation_count = 0
         self._invocation_count += 1
-        print(f"🔍 DEBUG: {agent_name} invocation #{self._invocation_count}")
+        logger.debug("🔍 DEBUG: %s invocation #%s", agent_name, self._invocation_count)
 
         try:
             # 🚀 PERFORMANCE OPTIMIZATION: Track agent execution for contract search optimization
@@ -104,7 +120,7 @@ class EnhancedAgentNodeExecutor:
             # Check cache for recent similar requests (optional optimization)
             cached_response = await get_cached(cache_key)
             if cached_response and self._is_cache_valid(cached_response, state):
-                print(f"⚡ Cache hit for {agent_name}")
+                logger.debug("⚡ Cache hit for %s", agent_name)
                 return cached_response
 
             # Prepare messages with basic structure first (without system prompt)
@@ -112,59 +128,72 @@ class EnhancedAgentNodeExecutor:
                 state, ""  # Empty system prompt for now
             )
 
+            # Context, reference data and prompt inputs prefetched while routing ran
+            prefetch = await context_prefetcher.claim(state, agent_name)
+
             # Always extract context from user messages to preserve conversation context
             # This ensures the agent knows what operation to perform
             # CRITICAL: This must happen BEFORE prompt generation so the agent sees the updated context
             await self._extract_and_save_context(state, prepared_messages, None)
 
-            # Get dynamic, context-aware instructions AFTER context extraction
-            system_prompt = await self._get_dynamic_instructions(
-                agent_name, state, execution_context
-            )
-            
-            # Update prepared messages with the system prompt
-            prepared_messages = await self._prepare_messages_optimized(
-                state, system_prompt
-            )
-
-            print(f"🚀 Invoking {agent_name} with Phase 2 dynamic context...")
-
             # If we have a contract ID but no client name, look up the contract to get the client name
             if (state.get('data', {}).get('current_contract_id') and
                 not state.get('data', {}).get('current_client')):
-                await self._lookup_contract_and_save_client_name(state)
+                if not (prefetch and prefetch.apply_contract_client(state)):
+                    await self._lookup_contract_and_save_client_name(state)
 
-            # SHORT-CIRCUIT: If we have all context needed, bypass LLM and call tool directly
-            print(f"🔍 DEBUG: About to check short-circuit for agent: {agent_name}")
-            print(f"🔍 DEBUG: State data before short-circuit: {state.get('data', {})}")
-            if await self._should_short_circuit(state, agent_name):
-                print(f"🔍 DEBUG: Short-circuit triggered, calling direct tool execution")
+            # DETERMINISTIC DISPATCH: If the request is fully determined by its context, bypass the LLM
+            logger.debug("🔍 DEBUG: State data before dispatch: %s", state.get('data', {}))
+            dispatch = dispatch_engine.match(state, agent_name)
+            if dispatch and dispatch.rule.mode is DispatchMode.DIRECT:
                 return await self._execute_direct_tool_call(state, agent_name)
+            elif dispatch:
+                # The tool executor runs and formats the call like a model-issued one
+                return {"messages": [dispatch.to_message()]}
             else:
-                print(f"🔍 DEBUG: Short-circuit NOT triggered, proceeding with LLM")
+                # Get dynamic, context-aware instructions AFTER context extraction
+                system_prompt = await self._get_dynamic_instructions(
+                    agent_name, state, execution_context
+                )
+
+                # Update prepared messages with the system prompt
+                prepared_messages = await self._prepare_messages_optimized(
+                    state, system_prompt
+                )
+
+                logger.debug("🚀 Invoking %s with Phase 2 dynamic context...", agent_name)
+
+                # Send only the tools relevant to this turn's operation
+                tool_selection = tool_selector.select(agent_instance.tools, state, agent_name)
 
                 # Execute with performance monitoring
                 response = await self._execute_with_monitoring(
-                    prepared_messages, agent_instance.tools, agent_name
+                    prepared_messages, tool_selection.tools, agent_name
                 )
 
                 response_message = response.choices[0].message
-                print(f"🔍 DEBUG: OpenAI API response received")
-                print(f"🔍 DEBUG: OpenAI response message type: {type(response_message)}")
-                print(f"🔍 DEBUG: OpenAI response has tool_calls: {hasattr(response_message, 'tool_calls') and response_message.tool_calls}")
-                print(f"🔍 DEBUG: OpenAI response content preview: {getattr(response_message, 'content', 'No content')[:100] if getattr(response_message, 'content', None) else 'None'}")
+                if tool_selector.needs_full_set(tool_selection, response_message):
+                    response = await self._execute_with_monitoring(
+                        prepared_messages, agent_instance.tools, agent_name
+                    )
+                    response_message = response.choices[0].message
+                logger.debug("🔍 DEBUG: OpenAI API response received")
+                logger.debug("🔍 DEBUG: OpenAI response message type: %s", type(response_message))
+                logger.debug("🔍 DEBUG: OpenAI response has tool_calls: %s", hasattr(response_message, 'tool_calls') and response_message.tool_calls)
+                logger.debug("🔍 DEBUG: OpenAI response content preview: %s", getattr(response_message, 'content', 'No content')[:100] if getattr(response_message, 'content', None) else 'None')
 
                 # DEBUG: Show current state after context extraction
-                print(f"🔍 DEBUG: State after context extraction:")
-                print(f"🔍 DEBUG: state['data'] = {state.get('data', {})}")
+                logger.debug("🔍 DEBUG: State after context extraction:")
+                logger.debug("🔍 DEBUG: state['data'] = %s", state.get('data', {}))
 
             # TODO: DEBUG - Debug tool calls to track recursion issue
             if hasattr(response_message, 'tool_calls') and response_message.tool_calls:
-                print(f"🔍 DEBUG: Agent made {len(response_message.tool_calls)} tool calls:")
-                for i, tool_call in enumerate(response_message.tool_calls):
-                    print(f"🔍 DEBUG: Tool call {i}: {tool_call.function.name} with args: {tool_call.function.arguments}")
+                logger.debug("🔍 DEBUG: Agent made %s tool calls:", len(response_message.tool_calls))
+                if logger.debug_enabled:
+                    for i, tool_call in enumerate(response_message.tool_calls):
+                        logger.debug("🔍 DEBUG: Tool call %s: %s with args: %s", i, tool_call.function.name, tool_call.function.arguments)
             else:
-                print(f"🔍 DEBUG: Agent made no tool calls, response: {response_message.content[:100]}...")
+                logger.debug("🔍 DEBUG: Agent made no tool calls, response: %s...", response_message.content[:100])
 
             # Prepare result with serializable message
             if hasattr(response_message, 'content'):
@@ -192,7 +221,7 @@ class EnhancedAgentNodeExecutor:
                         }
                     } for tc in response_message.tool_calls
                 ]
-                print(f"🔍 DEBUG: Stored {len(serializable_message['tool_calls'])} tool calls in serializable message")
+                logger.debug("🔍 DEBUG: Stored %s tool calls in serializable message", len(serializable_message['tool_calls']))
                 
                 # 🔧 FIX: Let the tool executor handle sequential execution
                 # The tool executor will automatically execute upload_contract_document after create_contract
@@ -213,31 +242,32 @@ class EnhancedAgentNodeExecutor:
                     )
                 except Exception as e:
                     # If async update fails, create task as fallback
-                    print(f"Sync memory update failed, using async task: {e}")
+                    logger.error("Sync memory update failed, using async task: %s", e)
                     asyncio.create_task(self._update_memory_async(
                         state, response_message, agent_name, processing_time
                     ))
 
-            print(f"🔍 DEBUG: Final serializable message: {serializable_message}")
+            logger.debug("🔍 DEBUG: Final serializable message: %s", serializable_message)
 
             result = {"messages": [serializable_message]}
-            print(f"🔍 DEBUG: Agent invoke returning - result = {result}")
-            print(f"🔍 DEBUG: Agent invoke returning - state['data'] = {state.get('data', {})}")
-            print(f"🔍 DEBUG: Agent invoke returning - user_operation = {state.get('data', {}).get('user_operation', 'NOT_FOUND')}")
+            logger.debug("🔍 DEBUG: Agent invoke returning - result = %s", result)
+            logger.debug("🔍 DEBUG: Agent invoke returning - state['data'] = %s", state.get('data', {}))
+            logger.debug("🔍 DEBUG: Agent invoke returning - user_operation = %s", state.get('data', {}).get('user_operation', 'NOT_FOUND'))
 
             # Cache successful responses (with TTL based on content type)
             if processing_time < 1.0:  # Only cache fast responses
                 cache_ttl = self._determine_cache_ttl(serializable_message["content"])
                 await set_cached(cache_key, result, cache_ttl)
+                agent_response_keys.track(cache_key, AGENT_RESPONSE_DEPENDENCIES.get(agent_name, ()))
 
-            print(f"🔍 DEBUG: Agent invoke returning - state['data'] = {state.get('data', {})}")
-            print(f"🔍 DEBUG: Agent invoke returning - user_operation = {state.get('data', {}).get('user_operation', 'NOT_FOUND')}")
+            logger.debug("🔍 DEBUG: Agent invoke returning - state['data'] = %s", state.get('data', {}))
+            logger.debug("🔍 DEBUG: Agent invoke returning - user_operation = %s", state.get('data', {}).get('user_operation', 'NOT_FOUND'))
             return result
 
         except Exception as e:
             # Only print error if it's not the expected fallback mode message
             if "OpenAI client not available" not in str(e):
-                print(f"Error in Phase 2 agent execution: {e}")
+                logger.error("Error in Phase 2 agent execution: %s", e)
 
             # Fallback to basic execution with error tracking
             processing_time = time.perf_counter() - start_time
@@ -249,7 +279,7 @@ class EnhancedAgentNodeExecutor:
                 tools = getattr(agent_instance, 'tools', [])
                 return await self.basic_invoke(state, instructions, tools)
             except Exception as fallback_error:
-                print(f"Fallback execution also failed: {fallback_error}")
+                logger.error("Fallback execution also failed: %s", fallback_error)
                 # Return minimal response to prevent complete failure
                 return {"messages": [{"role": "assistant", "content": f"I encountered an error processing your request. Error: {str(e)}"}]}
 
@@ -264,7 +294,7 @@ class EnhancedAgentNodeExecutor:
 
         Performance target: Reduce total execution time by 60-80% for parallel tasks
         """
-        print(f"🔄 Executing parallel workflow with {len(execution_plan.agents)} agents...")
+        logger.debug("🔄 Executing parallel workflow with %s agents...", len(execution_plan.agents))
 
         # Execute using the parallel executor
         results = await self.parallel_executor.execute_parallel(
@@ -310,7 +340,7 @@ class EnhancedAgentNodeExecutor:
             )
             return dynamic_instructions
         except Exception as e:
-            print(f"Error generating dynamic instructions: {e}")
+            logger.error("Error generating dynamic instructions: %s", e)
             # Fallback to basic template
             return f"You are Core, a {agent_name.replace('_', ' ')} specialist."
 
@@ -342,8 +372,8 @@ class EnhancedAgentNodeExecutor:
                 else:
                     context_info.append(f"FILE_DATA_AVAILABLE: {'Yes' if file_info.get('file_data') else 'No'}")
 
-                print(f"🔍 DEBUG: File info in context: {file_info.get('filename')}")
-                print(f"🔍 DEBUG: File ref_id in context: {file_info.get('file_ref_id')}")
+                logger.debug("🔍 DEBUG: File info in context: %s", file_info.get('filename'))
+                logger.debug("🔍 DEBUG: File ref_id in context: %s", file_info.get('file_ref_id'))
 
             if context_info:
                 context_message = "\n\nContext information:\n" + "\n".join(context_info)
@@ -362,17 +392,17 @@ class EnhancedAgentNodeExecutor:
         original_user_message = None
         if 'context' in state and 'original_message' in state['context']:
             original_user_message = state['context']['original_message']
-            print(f"🔍 DEBUG: Found original message in context: {original_user_message[:100]}...")
+            logger.debug("🔍 DEBUG: Found original message in context: %s...", original_user_message[:100])
 
         # If we have an original user message, include it first
         if original_user_message:
             prepared_messages.append({"role": "user", "content": original_user_message})
-            print(f"🔍 DEBUG: Added original user message: {original_user_message[:100]}...")
+            logger.debug("🔍 DEBUG: Added original user message: %s...", original_user_message[:100])
 
         # Process messages and ensure we capture both user messages and tool results
-        print(f"🔍 DEBUG: Processing {len(messages)} messages")
+        logger.debug("🔍 DEBUG: Processing %s messages", len(messages))
         for i, msg in enumerate(messages):
-            print(f"🔍 DEBUG: Raw message {i}: type={type(msg)}, hasattr(type)={hasattr(msg, 'type')}, hasattr(content)={hasattr(msg, 'content')}")
+            logger.debug("🔍 DEBUG: Raw message %s: type=%s, hasattr(type)=%s, hasattr(content)=%s", i, type(msg), hasattr(msg, 'type'), hasattr(msg, 'content'))
             if hasattr(msg, 'type') and hasattr(msg, 'content'):
                 # Map message types to OpenAI roles
                 msg_type = getattr(msg, 'type', 'user')
@@ -382,24 +412,24 @@ class EnhancedAgentNodeExecutor:
                     role = 'assistant'
                 elif msg_type == 'tool':
                     # Skip tool messages to avoid malformed structure
-                    print(f"🔍 DEBUG: Skipping tool message {i}")
+                    logger.debug("🔍 DEBUG: Skipping tool message %s", i)
                     continue
                 else:
                     # Default to user for unknown types
                     role = 'user'
 
                 prepared_messages.append({"role": role, "content": msg.content})
-                print(f"🔍 DEBUG: Message {i}: {role} (was {msg_type}) - {msg.content[:100]}...")
+                logger.debug("🔍 DEBUG: Message %s: %s (was %s) - %s...", i, role, msg_type, msg.content[:100])
             elif isinstance(msg, dict):
                 # Handle dictionary messages
-                print(f"🔍 DEBUG: Dict message {i}: keys={list(msg.keys())}")
+                logger.debug("🔍 DEBUG: Dict message %s: keys=%s", i, list(msg.keys()))
 
                 # Check if this is a tool result (has success/message structure)
                 if 'success' in msg and 'message' in msg:
                     # This is a tool result - include it as a user message so agent can see the result
                     content = f"Previous tool result: {msg.get('message', str(msg))}"
                     prepared_messages.append({"role": "user", "content": content})
-                    print(f"🔍 DEBUG: Message {i}: user (tool result) - {content[:100]}...")
+                    logger.debug("🔍 DEBUG: Message %s: user (tool result) - %s...", i, content[:100])
                 # Check if this is an OpenAI tool call message (has tool_call_id, role, name)
                 elif 'tool_call_id' in msg and 'role' in msg and 'name' in msg:
                     # This is an OpenAI tool call result - include the content as a tool result
@@ -407,9 +437,9 @@ class EnhancedAgentNodeExecutor:
                     if content and content.strip():
                         tool_result_content = f"Tool '{msg.get('name', 'unknown')}' result: {content}"
                         prepared_messages.append({"role": "user", "content": tool_result_content})
-                        print(f"🔍 DEBUG: Message {i}: user (OpenAI tool result) - {tool_result_content[:100]}...")
+                        logger.debug("🔍 DEBUG: Message %s: user (OpenAI tool result) - %s...", i, tool_result_content[:100])
                     else:
-                        print(f"🔍 DEBUG: Skipping empty OpenAI tool message {i}")
+                        logger.debug("🔍 DEBUG: Skipping empty OpenAI tool message %s", i)
                 else:
                     # Regular dictionary message
                     role = msg.get('role', 'user')
@@ -420,23 +450,27 @@ class EnhancedAgentNodeExecutor:
                     # Skip tool messages to avoid malformed structure
                     if role != 'tool':
                         prepared_messages.append({"role": role, "content": content})
-                        print(f"🔍 DEBUG: Message {i}: {role} - {content[:100]}...")
+                        logger.debug("🔍 DEBUG: Message %s: %s - %s...", i, role, content[:100])
                     else:
-                        print(f"🔍 DEBUG: Skipping tool message {i}")
+                        logger.debug("🔍 DEBUG: Skipping tool message %s", i)
             else:
                 # Fallback for other message types - treat as user message
                 prepared_messages.append({"role": "user", "content": str(msg)})
-                print(f"🔍 DEBUG: Message {i}: user (fallback) - {str(msg)[:100]}...")
+                logger.debug("🔍 DEBUG: Message %s: user (fallback) - %s...", i, str(msg)[:100])
+
+        # Keep the prompt within the token budget - older turns are carried by the rolling summary
+        conversation_summary = (state.get('memory') or {}).get('context_summary', '')
+        prepared_messages = context_window_manager.fit_messages(prepared_messages, summary=conversation_summary)
 
-        print(f"🔍 DEBUG: Final prepared messages count: {len(prepared_messages)}")
-        print(f"🔍 DEBUG: System prompt preview: {full_system_prompt[:200]}...")
+        logger.debug("🔍 DEBUG: Final prepared messages count: %s", len(prepared_messages))
+        logger.debug("🔍 DEBUG: System prompt preview: %s...", full_system_prompt[:200])
         # Show actual user messages
         user_messages = [msg for msg in prepared_messages if msg.get('role') == 'user']
         if user_messages:
-            print(f"🔍 DEBUG: Found {len(user_messages)} user messages")
-            print(f"🔍 DEBUG: Last user message content: {user_messages[-1]['content'][:200]}...")
+            logger.debug("🔍 DEBUG: Found %s user messages", len(user_messages))
+            logger.debug("🔍 DEBUG: Last user message content: %s...", user_messages[-1]['content'][:200])
         else:
-            print(f"🔍 DEBUG: No user messages found in prepared_messages")
+            logger.debug("🔍 DEBUG: No user messages found in prepared_messages")
 
         return prepared_messages
 
@@ -451,17 +485,18 @@ class EnhancedAgentNodeExecutor:
         execution_start = time.perf_counter()
 
         # Check if client is available
-        if self.client is None:
+        if self.client is None or not self.client.available:
             raise Exception("OpenAI client not available - using fallback mode")
 
         try:
             # 🚀 PHASE 1 OPTIMIZATION: Reduced timeout and optimized parameters for faster responses
             # TODO: If performance degrades, revert timeout to 30.0 and temperature to 0.1
-            response = self.client.chat.completions.create(
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=prepared_messages,
                 tools=tools,
                 tool_choice="auto",
+                usage_tag=agent_name,
                 temperature=0.3,  # Balanced: creative enough for variations, deterministic enough for tools
                 timeout=15.0,     # 🚀 OPTIMIZATION: Balanced timeout - sufficient for formatting, faster failure detection
                 max_tokens=2000   # 🚀 OPTIMIZATION: Increased to 2000 to handle multiple contract listings without truncation
@@ -471,13 +506,13 @@ class EnhancedAgentNodeExecutor:
 
             # Log slow executions for optimization
             if execution_time > 2.0:
-                print(f"⚠️ Slow OpenAI execution for {agent_name}: {execution_time:.2f}s")
+                logger.warning("⚠️ Slow OpenAI execution for %s: %.2fs", agent_name, execution_time)
 
             return response
 
         except Exception as e:
             execution_time = time.perf_counter() - execution_start
-            print(f"❌ OpenAI execution failed for {agent_name} after {execution_time:.2f}s: {e}")
+            logger.error("❌ OpenAI execution failed for %s after %.2fs: %s", agent_name, execution_time, e)
             raise
 
     async def _update_performance_metrics(
@@ -531,7 +566,7 @@ class EnhancedAgentNodeExecutor:
                 }
             )
         except Exception as e:
-            print(f"Error updating memory for {agent_name}: {e}")
+            logger.error("Error updating memory for %s: %s", agent_name, e)
 
     def _generate_cache_key(self, state: AgentState, agent_name: str) -> str:
         """Generate cache key for response caching."""
@@ -610,8 +645,8 @@ class EnhancedAgentNodeExecutor:
         messages = state['messages']
 
         # Check if we have an OpenAI client
-        if self.client is None:
-            print("⚠️ No OpenAI client available, using fallback tool selection")
+        if self.client is None or not self.client.available:
+            logger.warning("⚠️ No OpenAI client available, using fallback tool selection")
             return await self._fallback_tool_execution(state, system_prompt, tools)
 
         prepared_messages = [
@@ -638,7 +673,7 @@ class EnhancedAgentNodeExecutor:
         try:
             # 🚀 PHASE 1 OPTIMIZATION: Reduced timeout and optimized parameters for faster responses
             # TODO: If performance degrades, revert timeout to 30.0 and temperature to 0.1
-            response = self.client.chat.completions.create(
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=prepared_messages,
                 tools=tools,
@@ -652,7 +687,7 @@ class EnhancedAgentNodeExecutor:
 
             return {"messages": [response_message]}
         except Exception as e:
-            print(f"⚠️ OpenAI API call failed: {e}, using fallback tool selection")
+            logger.warning("⚠️ OpenAI API call failed: %s, using fallback tool selection", e)
             return await self._fallback_tool_execution(state, system_prompt, tools)
 
     async def _extract_and_save_context(
@@ -663,14 +698,14 @@ class EnhancedAgentNodeExecutor:
     ):
         """Extract context from user messages and agent response, then save to state['data']."""
         try:
-            print(f"🔍 DEBUG: Starting context extraction...")
+            logger.debug("🔍 DEBUG: Starting context extraction...")
 
             # Defensive check: ensure state is not None
             if state is None:
-                print(f"🔍 DEBUG: State is None, skipping context extraction")
+                logger.debug("🔍 DEBUG: State is None, skipping context extraction")
                 return
 
-            print(f"🔍 DEBUG: Prepared messages count: {len(prepared_messages) if prepared_messages else 0}")
+            logger.debug("🔍 DEBUG: Prepared messages count: %s", len(prepared_messages) if prepared_messages else 0)
 
             # Extract context from user messages
             user_context = {}
@@ -682,137 +717,46 @@ class EnhancedAgentNodeExecutor:
                         # Skip tool results that might be formatted as user messages
                         content = msg['content']
                         if content.startswith("Tool '") and "result:" in content:
-                            print(f"🔍 DEBUG: Skipping tool result message: {content[:100]}...")
+                            logger.debug("🔍 DEBUG: Skipping tool result message: %s...", content[:100])
                             continue
 
-                        print(f"🔍 DEBUG: Processing user message {i}: {content[:100]}...")
+                        logger.debug("🔍 DEBUG: Processing user message %s: %s...", i, content[:100])
                         # Defensive: ensure state has data dict
                         existing_data = state.get('data', {}) if isinstance(state, dict) else {}
-                        print(f"🔍 DEBUG: Existing data before context extraction: {existing_data}")
+                        logger.debug("🔍 DEBUG: Existing data before context extraction: %s", existing_data)
                         user_msg_context = await context_extractor.extract_context_from_user_message(content, existing_data)
-                        print(f"🔍 DEBUG: Extracted from user message: {user_msg_context}")
+                        logger.debug("🔍 DEBUG: Extracted from user message: %s", user_msg_context)
                         user_context.update(user_msg_context)
-                        print(f"🔍 DEBUG: Updated user_context: {user_context}")
+                        logger.debug("🔍 DEBUG: Updated user_context: %s", user_context)
                         has_new_user_message = True
 
             # Only extract context from agent response if there was a new user message and response_message exists
             agent_context = {}
             if has_new_user_message and response_message and hasattr(response_message, 'content') and response_message.content:
-                print(f"🔍 DEBUG: Processing agent response: {response_message.content[:100]}...")
+                logger.debug("🔍 DEBUG: Processing agent response: %s...", response_message.content[:100])
                 agent_context = context_extractor.extract_context_from_agent_response(response_message.content)
-                print(f"🔍 DEBUG: Extracted from agent response: {agent_context}")
+                logger.debug("🔍 DEBUG: Extracted from agent response: %s", agent_context)
             elif not has_new_user_message:
-                print(f"🔍 DEBUG: No new user message, skipping context extraction to preserve existing context")
+                logger.debug("🔍 DEBUG: No new user message, skipping context extraction to preserve existing context")
                 existing_data = state.get('data', {}) if isinstance(state, dict) else {}
-                print(f"🔍 DEBUG: Preserving existing context: {existing_data}")
+                logger.debug("🔍 DEBUG: Preserving existing context: %s", existing_data)
                 return
 
             # Combine all context
             all_context = {**user_context, **agent_context}
-            print(f"🔍 DEBUG: Combined context: {all_context}")
+            logger.debug("🔍 DEBUG: Combined context: %s", all_context)
 
             # Update state with context
             if all_context:
-                print(f"🔍 DEBUG: State data before context update: {state.get('data', {})}")
+                logger.debug("🔍 DEBUG: State data before context update: %s", state.get('data', {}))
                 context_extractor.update_state_with_context(state, all_context)
-                print(f"🔍 DEBUG: State data after context update: {state.get('data', {})}")
-                print(f"🔍 DEBUG: Context extraction completed: {list(all_context.keys())}")
+                logger.debug("🔍 DEBUG: State data after context update: %s", state.get('data', {}))
+                logger.debug("🔍 DEBUG: Context extraction completed: %s", list(all_context.keys()))
             else:
-                print(f"🔍 DEBUG: No context extracted from messages")
+                logger.debug("🔍 DEBUG: No context extracted from messages")
 
         except Exception as e:
-            print(f"🔍 DEBUG: Error in context extraction: {e}")
-
-    async def _should_short_circuit(self, state: AgentState, agent_name: str) -> bool:
-        """Check if we should bypass LLM and call tool directly."""
-        data = state.get('data', {})
-
-        # Check if we have the required context for direct tool execution
-        has_user_operation = 'user_operation' in data
-        has_client = 'current_client' in data and data.get('current_client') is not None
-        has_contract_id = 'current_contract_id' in data
-        has_file_info = 'context' in state and state['context'].get('file_info')
-        user_operation = data.get('user_operation')
-
-        print(f"🔍 DEBUG: Short-circuit check - user_operation: {has_user_operation} ({user_operation}), client: {has_client}, contract_id: {has_contract_id}, file_info: {has_file_info}")
-        print(f"🔍 DEBUG: Full state data: {data}")
-        print(f"🔍 DEBUG: current_client value: {data.get('current_client')}")
-        print(f"🔍 DEBUG: current_client is None: {data.get('current_client') is None}")
-        if has_contract_id:
-            print(f"🔍 DEBUG: Contract ID being used for short-circuit: {data.get('current_contract_id')}")
-            print(f"🔍 DEBUG: Contract ID source - checking if it came from context extraction...")
-        
-        # Check if contract_id was extracted from the current message
-        messages = state.get('messages', [])
-        if messages:
-            last_message = messages[-1]
-            if isinstance(last_message, dict):
-                last_content = last_message.get('content', '').strip()
-            elif hasattr(last_message, 'content'):
-                last_content = last_message.content.strip()
-            else:
-                last_content = ''
-            print(f"🔍 DEBUG: Last message content: '{last_content}'")
-            
-            # Check if contract ID was extracted from this message
-            if has_contract_id:
-                
-                extracted_id = context_extractor._extract_contract_id(last_content)
-                print(f"🔍 DEBUG: Contract ID extracted from current message: {extracted_id}")
-                if extracted_id == data.get('current_contract_id'):
-                    print(f"🔍 DEBUG: Contract ID came from current message - this should NOT short-circuit")
-                else:
-                    print(f"🔍 DEBUG: Contract ID did NOT come from current message - might be from previous state")
-
-        # Short-circuit for file uploads when file_info exists AND no contract_id is specified yet
-        # This prevents short-circuiting during contract selection responses
-        print(f"🔍 DEBUG: Checking file upload short-circuit: has_user_operation={has_user_operation}, has_client={has_client}, has_file_info={has_file_info}, not has_contract_id={not has_contract_id}, user_operation={user_operation}")
-        if (has_user_operation and has_client and has_file_info and not has_contract_id and
-            user_operation == 'upload_contract_document'):
-            print(f"🔍 DEBUG: Short-circuiting for initial file upload - calling upload_contract_document directly")
-            return True
-        
-        # Short-circuit for file uploads when contract_id is provided (user selected contract)
-        if (has_user_operation and has_client and has_file_info and has_contract_id and
-            user_operation == 'upload_contract_document'):
-            print(f"🔍 DEBUG: Short-circuiting for contract ID upload - calling upload_contract_document directly")
-            return True
-        else:
-            print(f"🔍 DEBUG: File upload short-circuit conditions NOT met")
-
-        # Only short-circuit for simple cases: contract ID responses after a clear operation request
-        # This allows the LLM to handle complex field extraction and natural language variations
-        if (has_user_operation and has_client and has_contract_id and
-            user_operation in ['update_contract', 'delete_contract', 'upload_contract_document']):
-
-            # Check if this is a simple contract ID response (just a number)
-            messages = state.get('messages', [])
-            if messages:
-                last_message = messages[-1]
-                # Handle both dict and object message formats
-                if isinstance(last_message, dict):
-                    last_content = last_message.get('content', '').strip()
-                elif hasattr(last_message, 'content'):
-                    last_content = last_message.content.strip()
-                else:
-                    last_content = ''
-                
-                # Check if contract ID was extracted from the current message
-                extracted_id = context_extractor._extract_contract_id(last_content)
-                
-                # Only short-circuit if:
-                # 1. The last message is just a contract ID (simple number)
-                # 2. AND the contract ID was NOT extracted from the current message (meaning it's from previous state)
-                # 3. AND this is a response to a contract list (not an initial request)
-                if last_content.isdigit() and extracted_id != data.get('current_contract_id') and len(messages) > 1:
-                    print(f"🔍 DEBUG: Short-circuiting LLM call - direct tool execution")
-                    return True
-                else:
-                    print(f"🔍 DEBUG: Not short-circuiting - contract ID came from current message or this is initial request")
-                    return False
-
-        print(f"🔍 DEBUG: Short-circuit conditions NOT met - letting LLM handle the request")
-        return False
+            logger.debug("🔍 DEBUG: Error in context extraction: %s", e)
 
     async def _execute_direct_tool_call(self, state: AgentState, agent_name: str) -> Dict:
         """Execute tool directly without LLM when we have all context."""
@@ -822,7 +766,7 @@ class EnhancedAgentNodeExecutor:
         contract_id = data.get('current_contract_id')
         original_request = data.get('original_user_request', '')
 
-        print(f"🔍 DEBUG: Direct tool execution - {user_operation} for {client_name} with contract {contract_id}")
+        logger.debug("🔍 DEBUG: Direct tool execution - %s for %s with contract %s", user_operation, client_name, contract_id)
 
         # Map user operation to tool function
         tool_mapping = {
@@ -834,7 +778,7 @@ class EnhancedAgentNodeExecutor:
 
         tool_name = tool_mapping.get(user_operation)
         if not tool_name:
-            print(f"🔍 DEBUG: No tool mapping for {user_operation}")
+            logger.debug("🔍 DEBUG: No tool mapping for %s", user_operation)
             return {"messages": [{"role": "assistant", "content": f"I don't know how to handle {user_operation} operation."}]}
 
         
@@ -848,7 +792,7 @@ class EnhancedAgentNodeExecutor:
 
         tool_function = tool_functions.get(tool_name)
         if not tool_function:
-            print(f"🔍 DEBUG: Tool function not found: {tool_name}")
+            logger.debug("🔍 DEBUG: Tool function not found: %s", tool_name)
             return {"messages": [{"role": "assistant", "content": f"Tool function {tool_name} not found."}]}
 
         try:
@@ -882,10 +826,10 @@ class EnhancedAgentNodeExecutor:
                 file_info = context_info.get('file_info', {})
                 
                 if not file_info:
-                    print(f"🔍 DEBUG: No file_info found in context for upload")
+                    logger.debug("🔍 DEBUG: No file_info found in context for upload")
                     return {"messages": [{"role": "assistant", "content": "❌ No file data found for upload. Please try uploading the file again."}]}
                 
-                print(f"🔍 DEBUG: File info extracted - filename: {file_info.get('filename')}, size: {file_info.get('file_size')}")
+                logger.debug("🔍 DEBUG: File info extracted - filename: %s, size: %s", file_info.get('filename'), file_info.get('file_size'))
                 
                 # Handle file reference (optimized approach)
                 if file_info.get('file_ref_id'):
@@ -901,9 +845,9 @@ class EnhancedAgentNodeExecutor:
                             file_size=cached_file['file_size'],
                             mime_type=cached_file['mime_type']
                         )
-                        print(f"🔍 DEBUG: Using cached file data - filename: {cached_file['filename']}, size: {cached_file['file_size']}")
+                        logger.debug("🔍 DEBUG: Using cached file data - filename: %s, size: %s", cached_file['filename'], cached_file['file_size'])
                     else:
-                        print(f"🔍 DEBUG: File not found in cache, ref_id: {file_info['file_ref_id']}")
+                        logger.debug("🔍 DEBUG: File not found in cache, ref_id: %s", file_info['file_ref_id'])
                         return {"messages": [{"role": "assistant", "content": "❌ File data not found. Please try uploading the file again."}]}
                 else:
                     # Fallback to old approach
@@ -921,16 +865,16 @@ class EnhancedAgentNodeExecutor:
 
             # Call the tool directly
             if user_operation == 'upload_contract_document':
-                print(f"🔍 DEBUG: Calling {tool_name} with params: client_name='{params.client_name}' contract_id={params.contract_id} file_data='{params.file_data[:50]}...' filename='{params.filename}' file_size={params.file_size} mime_type='{params.mime_type}'")
+                logger.debug("🔍 DEBUG: Calling %s with params: client_name='%s' contract_id=%s file_data='%s...' filename='%s' file_size=%s mime_type='%s'", tool_name, params.client_name, params.contract_id, params.file_data[:50], params.filename, params.file_size, params.mime_type)
             else:
-                print(f"🔍 DEBUG: Calling {tool_name} with params: {params}")
+                logger.debug("🔍 DEBUG: Calling %s with params: %s", tool_name, params)
             # TODO: CONFIRMATION FIX - Build proper context with messages for all tools
             tool_context = {
                 **state.get('context', {}),
                 'messages': state.get('messages', []),
                 'current_workflow': state.get('data', {}).get('current_workflow')
             }
-            print(f"🔍 DEBUG CONTEXT: Tool context has {len(tool_context.get('messages', []))} messages")
+            logger.debug("🔍 DEBUG CONTEXT: Tool context has %s messages", len(tool_context.get('messages', [])))
             
             if user_operation == 'update_contract':
                 result = await tool_function(params, context)
@@ -948,33 +892,33 @@ class EnhancedAgentNodeExecutor:
                 response_content = str(result)
                 result_data = None
 
-            print(f"🔍 DIRECT TOOL: Tool result content: {response_content[:100]}...")
+            logger.debug("🔍 DIRECT TOOL: Tool result content: %s...", response_content[:100])
             if result_data:
-                print(f"🔍 DIRECT TOOL: Tool result data keys: {list(result_data.keys()) if isinstance(result_data, dict) else 'Not a dict'}")
+                logger.debug("🔍 DIRECT TOOL: Tool result data keys: %s", list(result_data.keys()) if isinstance(result_data, dict) else 'Not a dict')
 
             # Include structured data if available - use same format as regular agent execution
             message = {"type": "ai", "content": response_content, "role": "assistant"}
             if result_data:
                 message["data"] = result_data
-                print(f"🔍 DIRECT TOOL: Added data to message, total message keys: {list(message.keys())}")
+                logger.debug("🔍 DIRECT TOOL: Added data to message, total message keys: %s", list(message.keys()))
                 
                 # TODO: CONFIRMATION FIX - Store current_workflow from tool result data if present
                 if isinstance(result_data, dict) and 'current_workflow' in result_data:
                     if 'data' not in state:
                         state['data'] = {}
                     state['data']['current_workflow'] = result_data['current_workflow']
-                    print(f"🔍 DIRECT TOOL: Stored current_workflow: {result_data['current_workflow']}")
+                    logger.debug("🔍 DIRECT TOOL: Stored current_workflow: %s", result_data['current_workflow'])
             else:
-                print(f"🔍 DIRECT TOOL: No data to add, message keys: {list(message.keys())}")
+                logger.debug("🔍 DIRECT TOOL: No data to add, message keys: %s", list(message.keys()))
 
-            print(f"🔍 DIRECT TOOL: Final message type: {type(message)}")
-            print(f"🔍 DIRECT TOOL: Final message content type: {type(message.get('content'))}")
-            print(f"🔍 DIRECT TOOL: Final message content length: {len(str(message.get('content', '')))}")
+            logger.debug("🔍 DIRECT TOOL: Final message type: %s", type(message))
+            logger.debug("🔍 DIRECT TOOL: Final message content type: %s", type(message.get('content')))
+            logger.debug("🔍 DIRECT TOOL: Final message content length: %s", len(str(message.get('content', ''))))
 
             return {"messages": [message]}
 
         except Exception as e:
-            print(f"🔍 DEBUG: Error in direct tool execution: {e}")
+            logger.debug("🔍 DEBUG: Error in direct tool execution: %s", e)
             return {"messages": [{"role": "assistant", "content": f"Error executing {user_operation}: {str(e)}"}]}
 
     async def _lookup_contract_and_save_client_name(self, state: AgentState):
@@ -984,7 +928,7 @@ class EnhancedAgentNodeExecutor:
             if not contract_id:
                 return
 
-            print(f"🔍 DEBUG: Looking up contract {contract_id} to get client name")
+            logger.debug("🔍 DEBUG: Looking up contract %s to get client name", contract_id)
 
             # Import here to avoid circular imports
             
@@ -1002,18 +946,18 @@ class EnhancedAgentNodeExecutor:
 
                 if contract and contract.client:
                     client_name = contract.client.client_name
-                    print(f"🔍 DEBUG: Found client name for contract {contract_id}: {client_name}")
+                    logger.debug("🔍 DEBUG: Found client name for contract %s: %s", contract_id, client_name)
 
                     # Save client name in state
                     if 'data' not in state:
                         state['data'] = {}
                     state['data']['current_client'] = client_name
-                    print(f"🔍 DEBUG: Saved client name in context: {client_name}")
+                    logger.debug("🔍 DEBUG: Saved client name in context: %s", client_name)
                 else:
-                    print(f"🔍 DEBUG: Contract {contract_id} not found or has no client")
+                    logger.debug("🔍 DEBUG: Contract %s not found or has no client", contract_id)
 
         except Exception as e:
-            print(f"🔍 DEBUG: Error looking up contract {contract_id}: {e}")
+            logger.debug("🔍 DEBUG: Error looking up contract %s: %s", contract_id, e)
 
 
 # --- Agent Node Definitions ---
@@ -1028,166 +972,103 @@ time_agent_instance = TimeTrackerAgent()
 user_agent_instance = UserAgent()
 
 
-# Sync wrapper functions for compatibility
-def contract_agent_node_sync(state: AgentState) -> Dict:
-    """Sync wrapper for contract agent node."""
-    print("--- Running Enhanced Contract Agent Node (Sync) ---")
-    result = asyncio.run(enhanced_executor.invoke(state, contract_agent_instance, "contract_agent"))
-    print(f"🔍 DEBUG: Sync contract agent result type: {type(result)}")
-    print(f"🔍 DEBUG: Sync contract agent result keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-    if isinstance(result, dict) and 'messages' in result and result['messages']:
-        print(f"🔍 DEBUG: Sync contract agent message content: {result['messages'][0].get('content', 'No content')}")
-    return result
-
-def employee_agent_node_sync(state: AgentState) -> Dict:
-    """Sync wrapper for employee agent node."""
-    print("--- Running Enhanced Employee Agent Node (Sync) ---")
-
-    result = asyncio.run(enhanced_executor.invoke(state, employee_agent_instance, "employee_agent"))
-
-    return result
-
-def client_agent_node_sync(state: AgentState) -> Dict:
-    """Sync wrapper for client agent node."""
-    print("--- Running Enhanced Client Agent Node (Sync) ---")
-    return asyncio.run(enhanced_executor.invoke(state, client_agent_instance, "client_agent"))
-
-def deliverable_agent_node_sync(state: AgentState) -> Dict:
-    """Sync wrapper for deliverable agent node."""
-    print("--- Running Enhanced Deliverable Agent Node (Sync) ---")
-    return asyncio.run(enhanced_executor.invoke(state, deliverable_agent_instance, "deliverable_agent"))
-
-def time_agent_node_sync(state: AgentState) -> Dict:
-    """Sync wrapper for time agent node."""
-    print("--- Running Enhanced Time Agent Node (Sync) ---")
-    return asyncio.run(enhanced_executor.invoke(state, time_agent_instance, "time_agent"))
-
-def user_agent_node_sync(state: AgentState) -> Dict:
-    """Sync wrapper for user agent node."""
-    print("--- Running Enhanced User Agent Node (Sync) ---")
-    return asyncio.run(enhanced_executor.invoke(state, user_agent_instance, "user_agent"))
-
-# Async versions
-async def contract_agent_node_async(state: AgentState) -> Dict:
+# Agent nodes are native coroutines: under ``agent_app.ainvoke`` they run on the
+# request's event loop, so pooled async DB/HTTP connections are reused instead
+# of spinning up a fresh loop in a worker thread for every step.
+async def contract_agent_node(state: AgentState) -> Dict:
     """
     Enhanced contract agent node with memory integration.
     """
-    print("--- Running Enhanced Contract Agent Node ---")
+    logger.debug("--- Running Enhanced Contract Agent Node ---")
     return await enhanced_executor.invoke(state, contract_agent_instance, "contract_agent")
 
-async def employee_agent_node_async(state: AgentState) -> Dict:
+async def employee_agent_node(state: AgentState) -> Dict:
     """
     Enhanced employee agent node with memory integration.
     """
-    print("--- Running Enhanced Employee Agent Node ---")
+    logger.debug("--- Running Enhanced Employee Agent Node ---")
 
     result = await enhanced_executor.invoke(state, employee_agent_instance, "employee_agent")
 
     return result
 
-async def client_agent_node_async(state: AgentState) -> Dict:
+async def client_agent_node(state: AgentState) -> Dict:
     """
     Enhanced client agent node with memory integration.
     """
-    print("--- Running Enhanced Client Agent Node ---")
-    print(f"🔍 DEBUG: Client Agent - state keys: {list(state.keys()) if isinstance(state, dict) else 'Not a dict'}")
-    print(f"🔍 DEBUG: Client Agent - data: {state.get('data', {})}")
-    print(f"🔍 DEBUG: Client Agent - context: {state.get('context', {})}")
+    logger.debug("--- Running Enhanced Client Agent Node ---")
+    logger.debug("🔍 DEBUG: Client Agent - state keys: %s", list(state.keys()) if isinstance(state, dict) else 'Not a dict')
+    logger.debug("🔍 DEBUG: Client Agent - data: %s", state.get('data', {}))
+    logger.debug("🔍 DEBUG: Client Agent - context: %s", state.get('context', {}))
 
     try:
         result = await enhanced_executor.invoke(state, client_agent_instance, "client_agent")
-        print(f"🔍 DEBUG: Client Agent - execution completed successfully")
+        logger.debug("🔍 DEBUG: Client Agent - execution completed successfully")
         return result
     except Exception as e:
-        print(f"❌ Client Agent - execution failed: {e}")
+        logger.error("❌ Client Agent - execution failed: %s", e)
         
-        print(f"❌ Client Agent - full traceback: {traceback.format_exc()}")
+        logger.error("❌ Client Agent - full traceback:", exc_info=True)
         raise
 
-async def deliverable_agent_node_async(state: AgentState) -> Dict:
+async def deliverable_agent_node(state: AgentState) -> Dict:
     """
     Enhanced deliverable agent node with memory integration.
     """
-    print("--- Running Enhanced Deliverable Agent Node ---")
+    logger.debug("--- Running Enhanced Deliverable Agent Node ---")
     return await enhanced_executor.invoke(state, deliverable_agent_instance, "deliverable_agent")
 
-async def time_agent_node_async(state: AgentState) -> Dict:
+async def time_agent_node(state: AgentState) -> Dict:
     """
     Enhanced time agent node with memory integration.
     """
-    print("--- Running Enhanced Time Agent Node ---")
+    logger.debug("--- Running Enhanced Time Agent Node ---")
     return await enhanced_executor.invoke(state, time_agent_instance, "time_agent")
 
-async def user_agent_node_async(state: AgentState) -> Dict:
+async def user_agent_node(state: AgentState) -> Dict:
     """
     Enhanced user agent node with memory integration.
     """
-    print("--- Running Enhanced User Agent Node ---")
+    logger.debug("--- Running Enhanced User Agent Node ---")
     return await enhanced_executor.invoke(state, user_agent_instance, "user_agent")
 
-# Hybrid functions that work with both sync and async calls
-def contract_agent_node(state: AgentState) -> Dict:
-    """Hybrid contract agent node that works with both sync and async calls."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return contract_agent_node_sync(state)
-        else:
-            return asyncio.run(contract_agent_node_async(state))
-    except RuntimeError:
-        return contract_agent_node_sync(state)
 
-def employee_agent_node(state: AgentState) -> Dict:
-    """Hybrid employee agent node that works with both sync and async calls."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return employee_agent_node_sync(state)
-        else:
-            return asyncio.run(employee_agent_node_async(state))
-    except RuntimeError:
-        return employee_agent_node_sync(state)
+# Sync facade for scripts and sync tests that drive the graph with ``invoke``
+def run_node_sync(node, state: AgentState) -> Dict:
+    """
+    Run an async node from synchronous code.
 
-def client_agent_node(state: AgentState) -> Dict:
-    """Hybrid client agent node that works with both sync and async calls."""
+    Only valid when no event loop is running in this thread; async callers
+    must ``await`` the node (or use ``agent_app.ainvoke``) instead.
+    """
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return client_agent_node_sync(state)
-        else:
-            return asyncio.run(client_agent_node_async(state))
+        asyncio.get_running_loop()
     except RuntimeError:
-        return client_agent_node_sync(state)
+        return asyncio.run(node(state))
+    raise RuntimeError(
+        f"{getattr(node, '__name__', node)} was called synchronously inside a running event loop; await it instead"
+    )
 
-def deliverable_agent_node(state: AgentState) -> Dict:
-    """Hybrid deliverable agent node that works with both sync and async calls."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return deliverable_agent_node_sync(state)
-        else:
-            return asyncio.run(deliverable_agent_node_async(state))
-    except RuntimeError:
-        return deliverable_agent_node_sync(state)
+def contract_agent_node_sync(state: AgentState) -> Dict:
+    """Sync wrapper for contract agent node."""
+    return run_node_sync(contract_agent_node, state)
 
-def time_agent_node(state: AgentState) -> Dict:
-    """Hybrid time agent node that works with both sync and async calls."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return time_agent_node_sync(state)
-        else:
-            return asyncio.run(time_agent_node_async(state))
-    except RuntimeError:
-        return time_agent_node_sync(state)
+def employee_agent_node_sync(state: AgentState) -> Dict:
+    """Sync wrapper for employee agent node."""
+    return run_node_sync(employee_agent_node, state)
 
-def user_agent_node(state: AgentState) -> Dict:
-    """Hybrid user agent node that works with both sync and async calls."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return user_agent_node_sync(state)
-        else:
-            return asyncio.run(user_agent_node_async(state))
-    except RuntimeError:
-        return user_agent_node_sync(state)
+def client_agent_node_sync(state: AgentState) -> Dict:
+    """Sync wrapper for client agent node."""
+    return run_node_sync(client_agent_node, state)
+
+def deliverable_agent_node_sync(state: AgentState) -> Dict:
+    """Sync wrapper for deliverable agent node."""
+    return run_node_sync(deliverable_agent_node, state)
+
+def time_agent_node_sync(state: AgentState) -> Dict:
+    """Sync wrapper for time agent node."""
+    return run_node_sync(time_agent_node, state)
+
+def user_agent_node_sync(state: AgentState) -> Dict:
+    """Sync wrapper for user agent node."""
+    return run_node_sync(user_agent_node, state)
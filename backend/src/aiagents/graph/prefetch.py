@@ -0,0 +1,257 @@
+"""
+Speculative prefetch of an agent's context while routing completes.
+
+A turn used to run routing, context extraction (with the fuzzy client lookup),
+the contract -> client lookup and prompt preparation strictly in sequence. The
+keyword pre-score usually names the target agent with high confidence in
+microseconds, so that agent's dependencies are started as soon as the turn
+arrives and overlap with routing, graph setup and checkpoint writes:
+- Prediction from the dispatch rules' message shapes, then the enhanced
+  routing logic's high-confidence keyword classification
+- Context extraction for the turn's message (warms the extractor memo, so the
+  agent node's own extraction is a memo hit)
+- Contract -> client reference lookup when the message selects a contract
+  without naming the client
+- Prompt template: the agent's static prefix and the cached user context
+- The router resolves the prediction: a different agent (or a greeting)
+  cancels the prefetch and its in-flight work is discarded
+- Latency saved per turn: the prefetched work's serial cost minus the time the
+  agent still spent waiting for it
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .context_extractor import context_extractor
+from .dispatch_rules import dispatch_engine
+from .enhanced_routing_logic import EnhancedRoutingLogic
+from ..orchestration.dynamic_prompts import dynamic_prompt_generator, PromptTemplate
+from src.database.core.database import get_ai_db
+from src.database.core.models import Contract, Client
+from sqlalchemy import select
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Agents whose dependencies can be prefetched (greetings and fallbacks have none)
+PREFETCH_AGENTS = frozenset(template.value for template in PromptTemplate)
+
+
+def _last_user_message(state: Dict[str, Any]) -> Optional[str]:
+    messages = state.get('messages') or []
+    if not messages:
+        return None
+    last_message = messages[-1]
+    if isinstance(last_message, dict):
+        if last_message.get('tool_call_id') or last_message.get('role') not in (None, 'user', 'human'):
+            return None
+        return last_message.get('content') or None
+    if getattr(last_message, 'type', 'human') != 'human':
+        return None
+    return getattr(last_message, 'content', None) or None
+
+
+async def _contract_client_name(contract_id: str) -> Optional[str]:
+    async with get_ai_db() as session:
+        result = await session.execute(
+            select(Client.client_name)
+            .join(Contract, Contract.client_id == Client.client_id)
+            .filter(Contract.contract_id == int(contract_id))
+        )
+        return result.scalar_one_or_none()
+
+
+@dataclass
+class AgentPrefetch:
+    """In-flight prefetch of one turn's dependencies for a predicted agent"""
+    key: str
+    agent_name: str
+    started_at: float
+    tasks: Dict[str, asyncio.Task] = field(default_factory=dict)
+    durations: Dict[str, float] = field(default_factory=dict)
+    # contract_id -> client name (None when the contract has no client)
+    contract_clients: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    def cancel(self):
+        """Cancel unfinished work."""
+        for task in self.tasks.values():
+            task.cancel()
+
+    def apply_contract_client(self, state: Dict[str, Any]) -> bool:
+        """Fill in the client for the state's contract if it was prefetched."""
+        contract_id = str(state.get('data', {}).get('current_contract_id'))
+        if contract_id not in self.contract_clients:
+            return False
+        client_name = self.contract_clients[contract_id]
+        if client_name:
+            state['data']['current_client'] = client_name
+            logger.debug("⚡ PREFETCH: Used prefetched client '%s' for contract %s", client_name, contract_id)
+        return True
+
+
+class ContextPrefetcher:
+    """Starts, resolves and hands over speculative agent prefetches"""
+
+    def __init__(self, enabled: Optional[bool] = None, ttl_seconds: Optional[float] = None):
+        self.enabled = enabled if enabled is not None else os.getenv("AGENT_CONTEXT_PREFETCH", "true").lower() in ("1", "true", "yes")
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("AGENT_PREFETCH_TTL_SECONDS", "30"))
+        self.routing_logic = EnhancedRoutingLogic()
+        self._pending: Dict[str, AgentPrefetch] = {}
+        self._stats = {
+            "started": 0,
+            "hits": 0,
+            "mispredicted": 0,
+            "expired": 0,
+            "tasks_cancelled": 0,
+            "latency_saved_ms": 0.0,
+        }
+
+    @staticmethod
+    def _turn_key(state: Dict[str, Any], message: str) -> str:
+        context = state.get('context') or {}
+        message_hash = hashlib.sha1(message.encode('utf-8')).hexdigest()[:16]
+        return f"{context.get('session_id', 'unknown')}:{context.get('user_id', 'unknown')}:{message_hash}"
+
+    def predict_agent(self, message: str, state: Dict[str, Any]) -> Optional[str]:
+        """The agent the keyword pre-score is confident about, if any."""
+        agent_name = dispatch_engine.route(message, state.get('data'))
+        if agent_name:
+            return agent_name
+        try:
+            context = {**(state.get('context') or {}), **(state.get('data') or {})}
+            result = self.routing_logic.classify_request(message, context)
+        except Exception as e:
+            logger.debug("🔍 DEBUG: Prefetch pre-score failed: %s", e)
+            return None
+        if result.get("confidence") == "high" and result.get("agent_name") in PREFETCH_AGENTS:
+            return result["agent_name"]
+        return None
+
+    def start(self, state: Dict[str, Any], agent_name: Optional[str] = None) -> Optional[AgentPrefetch]:
+        """
+        Start prefetching this turn's dependencies for ``agent_name`` (predicted
+        from the message when not given). Must be called on the event loop.
+        """
+        if not self.enabled or not state:
+            return None
+        message = _last_user_message(state)
+        if not message:
+            return None
+        self._expire()
+
+        key = self._turn_key(state, message)
+        existing = self._pending.get(key)
+        if existing:
+            return existing
+
+        agent_name = agent_name or self.predict_agent(message, state)
+        if agent_name not in PREFETCH_AGENTS:
+            return None
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+        prefetch = AgentPrefetch(key=key, agent_name=agent_name, started_at=time.perf_counter())
+        # Snapshot what extraction reads: the graph mutates state['data'] in place
+        data = dict(state.get('data') or {})
+        user_id = (state.get('context') or {}).get('user_id', 'unknown')
+        prefetch.tasks["context"] = loop.create_task(self._timed(prefetch, "context", self._prefetch_context(prefetch, message, data)))
+        prefetch.tasks["prompt"] = loop.create_task(self._timed(prefetch, "prompt", dynamic_prompt_generator.prefetch(PromptTemplate(agent_name), user_id)))
+        self._pending[key] = prefetch
+        self._stats["started"] += 1
+        logger.debug("⚡ PREFETCH: Started for %s while routing completes", agent_name)
+        return prefetch
+
+    @staticmethod
+    async def _timed(prefetch: AgentPrefetch, name: str, coro):
+        started = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            prefetch.durations[name] = time.perf_counter() - started
+
+    async def _prefetch_context(self, prefetch: AgentPrefetch, message: str, data: Dict[str, Any]):
+        context = await context_extractor.extract_context_from_user_message(message, data)
+
+        # The agent looks up the client of a contract selected without one
+        projected = {'data': dict(data)}
+        context_extractor.update_state_with_context(projected, context)
+        contract_id = projected['data'].get('current_contract_id')
+        if contract_id and not projected['data'].get('current_client'):
+            prefetch.contract_clients[str(contract_id)] = await _contract_client_name(contract_id)
+        return context
+
+    def _discard(self, prefetch: AgentPrefetch, reason: str):
+        unfinished = sum(1 for task in prefetch.tasks.values() if not task.done())
+        self._stats[reason] += 1
+        self._stats["tasks_cancelled"] += unfinished
+        prefetch.cancel()
+        logger.debug("🗑️ PREFETCH: Discarded %s prefetch (%s, %s tasks cancelled)", prefetch.agent_name, reason, unfinished)
+
+    def _expire(self):
+        now = time.perf_counter()
+        for key, prefetch in list(self._pending.items()):
+            if now - prefetch.started_at > self.ttl_seconds:
+                self._pending.pop(key, None)
+                self._discard(prefetch, "expired")
+
+    def resolve(self, state: Dict[str, Any], agent_name: str):
+        """
+        Routing picked ``agent_name``: cancel the turn's prefetch if it was for
+        another agent. Must be called on the event loop, like the router node.
+        """
+        message = _last_user_message(state) if state else None
+        if not message:
+            return
+        key = self._turn_key(state, message)
+        prefetch = self._pending.get(key)
+        if prefetch and prefetch.agent_name != agent_name:
+            self._pending.pop(key, None)
+            self._discard(prefetch, "mispredicted")
+
+    async def claim(self, state: Dict[str, Any], agent_name: str) -> Optional[AgentPrefetch]:
+        """
+        Hand the turn's prefetch to the agent that runs it, waiting for any
+        work still in flight. A prefetch for another agent is discarded.
+        """
+        message = _last_user_message(state) if state else None
+        if not message:
+            return None
+        prefetch = self._pending.pop(self._turn_key(state, message), None)
+        if prefetch is None:
+            return None
+        if prefetch.agent_name != agent_name:
+            self._discard(prefetch, "mispredicted")
+            return None
+
+        wait_started = time.perf_counter()
+        results = await asyncio.gather(*prefetch.tasks.values(), return_exceptions=True)
+        waited = time.perf_counter() - wait_started
+        for name, result in zip(prefetch.tasks, results):
+            if isinstance(result, BaseException):
+                logger.debug("🔍 DEBUG: Prefetch %s failed, agent will load it itself: %s", name, result)
+
+        saved_ms = max(0.0, sum(prefetch.durations.values()) - waited) * 1000
+        self._stats["hits"] += 1
+        self._stats["latency_saved_ms"] += saved_ms
+        logger.debug("⚡ PREFETCH: %s claimed its prefetch, %.1fms saved", agent_name, saved_ms)
+        return prefetch
+
+    def get_stats(self) -> Dict[str, Any]:
+        resolved = self._stats["hits"] + self._stats["mispredicted"]
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "hit_rate": self._stats["hits"] / resolved if resolved else 0.0,
+            "avg_latency_saved_ms": self._stats["latency_saved_ms"] / self._stats["hits"] if self._stats["hits"] else 0.0,
+        }
+
+
+# Global context prefetcher
+context_prefetcher = ContextPrefetcher()
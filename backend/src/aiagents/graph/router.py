@@ -1,6 +1,6 @@
 import os
 import json
-from openai import OpenAI
+from src.aiagents.services.llm_client import llm_client
 from typing import Dict, List, Optional
 from datetime import datetime
 
@@ -10,19 +10,24 @@ from ..memory.context_manager import ContextManager
 # ENHANCEMENT: Import enhanced routing logic for better agent classification
 # REVERT: Remove this import if enhanced routing causes issues
 from .enhanced_routing_logic import EnhancedRoutingLogic
+from .dispatch_rules import dispatch_engine
+from .prefetch import context_prefetcher
+from .nodes import run_node_sync
+from ..tools.result_paging import is_show_more_request
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class IntelligentRouter:
     """Enhanced router using OpenAI function calling for intelligent agent selection"""
     
     def __init__(self, model: str = "gpt-4o-mini"):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-        else:
+        # Shared pooled async client (same pool as the agent executor)
+        self.client = llm_client
+        if not self.client.available:
             # For testing environments without API key
-            self.client = None
-            print("Warning: OpenAI API key not found. Router will use fallback mode.")
+            logger.warning("Warning: OpenAI API key not found. Router will use fallback mode.")
         self.model = model
         self.context_manager = ContextManager()
         
@@ -89,10 +94,20 @@ class IntelligentRouter:
     
     async def call_llm_for_routing(self, user_message: str, state: AgentState) -> Dict:
         """Use OpenAI function calling to determine the best routing decision"""
+        context = None
         try:
+            # Requests a dispatch rule fully determines don't need the model to pick the agent
+            dispatch_agent = dispatch_engine.route(user_message, state.get('data'))
+            if dispatch_agent:
+                logger.debug("⚡ Router: Dispatch rule routes to %s (no LLM call)", dispatch_agent)
+                return {
+                    "function": "route_to_agent",
+                    "arguments": {"agent_name": dispatch_agent, "reasoning": "Matched a deterministic dispatch rule"}
+                }
+
             # If no OpenAI client available, use fallback routing
-            if self.client is None:
-                print("Using fallback routing (no OpenAI API key)")
+            if self.client is None or not self.client.available:
+                logger.warning("Using fallback routing (no OpenAI API key)")
                 return self.fallback_routing(user_message, context)
             
             # Get enhanced context for routing decision
@@ -149,11 +164,12 @@ If the request is a simple greeting, use handle_greeting.
             
             # 🚀 PHASE 1 OPTIMIZATION: Reduced timeout and optimized parameters for faster responses
             # TODO: If performance degrades, revert timeout and max_tokens settings
-            response = self.client.chat.completions.create(
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=messages,
                 tools=self.get_routing_functions(),
                 tool_choice="auto",
+                usage_tag="router",
                 temperature=0.3,     # Balanced: creative enough for variations, deterministic enough for routing
                 timeout=10.0,        # 🚀 OPTIMIZATION: Added 10s timeout for faster failure detection
                 max_tokens=200       # 🚀 OPTIMIZATION: Reduced to 200 for faster routing decisions
@@ -184,7 +200,7 @@ If the request is a simple greeting, use handle_greeting.
                 }
                 
         except Exception as e:
-            print(f"Error in LLM routing: {e}")
+            logger.error("Error in LLM routing: %s", e)
             # Fallback to simple keyword-based routing
             return self.fallback_routing(user_message, context)
     
@@ -216,7 +232,7 @@ If the request is a simple greeting, use handle_greeting.
                 }
                 
         except Exception as e:
-            print(f"Error in enhanced routing, falling back to simple routing: {e}")
+            logger.warning("Error in enhanced routing, falling back to simple routing: %s", e)
             # FALLBACK: Original simple routing logic if enhanced routing fails
             return self._simple_fallback_routing(user_message)
     
@@ -277,64 +293,13 @@ If the request is a simple greeting, use handle_greeting.
 intelligent_router = IntelligentRouter()
 
 
-def master_router_node_sync(state: AgentState) -> Dict:
-    """
-    Synchronous version of the router for compatibility with sync tests.
-    """
-    try:
-        # Get the last user message
-        user_message = ""
-        if state['messages'] and isinstance(state['messages'][-1], dict):
-            user_message = state['messages'][-1].get('content', '')
-        elif state['messages'] and hasattr(state['messages'][-1], 'content'):
-            user_message = state['messages'][-1].content
-        
-        if not user_message:
-            return {"current_agent": "client_agent"}
-        
-        # Use fallback routing for sync calls with context
-        # Combine both context and data for enhanced routing logic
-        context = state.get('context', {})
-        data = state.get('data', {})
-        combined_context = {**context, **data}
-        routing_decision = intelligent_router.fallback_routing(user_message, combined_context)
-        
-        function_name = routing_decision["function"]
-        arguments = routing_decision["arguments"]
-        
-        print(f"🧠 Sync Router: {arguments.get('reasoning', 'Routing decision made')}")
-        
-        if function_name == "route_to_agent":
-            agent_name = arguments["agent_name"]
-            reasoning = arguments["reasoning"]
-            
-            # Check if this is a handoff situation
-            if state.get('current_agent') and state['current_agent'] != "router" and state['current_agent'] != agent_name:
-                # Update state for handoff
-                update_state_for_handoff(state, agent_name, reasoning)
-                print(f"🔄 Agent Handoff: {state.get('previous_agent', 'unknown')} → {agent_name}")
-            
-            # CRITICAL FIX: Directly update the state instead of relying on LangGraph merge
-            state['current_agent'] = agent_name
-            if 'data' not in state:
-                state['data'] = {}
-            state['data']['current_agent'] = agent_name
-            print(f"🔍 DEBUG: Sync router - directly updated state current_agent to: {agent_name}")
-            print(f"🔍 DEBUG: Sync router - state['current_agent'] = {state.get('current_agent')}")
-            print(f"🔍 DEBUG: Sync router - state['data']['current_agent'] = {state.get('data', {}).get('current_agent')}")
-            
-            return {"current_agent": agent_name}
-            
-        elif function_name == "handle_greeting":
-            return {"current_agent": "greeting"}
-        
-        else:
-            return {"current_agent": "client_agent"}
-            
-    except Exception as e:
-        print(f"Error in sync router: {e}")
-        # Fallback to simple routing
-        return {"current_agent": "client_agent"}
+def _forget_stale_result_cursor(state: AgentState, user_message: str):
+    """The previous listing's cursor only carries into a turn that asks for more of it."""
+    data = state.get('data') or {}
+    if 'result_cursor' in data and not is_show_more_request(user_message):
+        data.pop('result_cursor', None)
+        data.pop('result_cursor_agent', None)
+        logger.debug("📄 Router: cleared result cursor (not a show-more request)")
 
 
 async def master_router_node(state: AgentState) -> Dict:
@@ -352,14 +317,20 @@ async def master_router_node(state: AgentState) -> Dict:
         
         if not user_message:
             return {"current_agent": "client_agent"}
+
+        _forget_stale_result_cursor(state, user_message)
         
+        # Prefetch the likely agent's context while the LLM makes the final call
+        context_prefetcher.start(state)
+
         # Get routing decision from LLM
         routing_decision = await intelligent_router.call_llm_for_routing(user_message, state)
         
         function_name = routing_decision["function"]
         arguments = routing_decision["arguments"]
         
-        print(f"🧠 Intelligent Router: {arguments.get('reasoning', 'Routing decision made')}")
+        logger.debug("🧠 Intelligent Router: %s", arguments.get('reasoning', 'Routing decision made'))
+        context_prefetcher.resolve(state, arguments.get("agent_name") if function_name == "route_to_agent" else "greeting")
         
         if function_name == "route_to_agent":
             agent_name = arguments["agent_name"]
@@ -369,7 +340,7 @@ async def master_router_node(state: AgentState) -> Dict:
             if state.get('current_agent') and state['current_agent'] != "router" and state['current_agent'] != agent_name:
                 # Update state for handoff
                 update_state_for_handoff(state, agent_name, reasoning)
-                print(f"🔄 Agent Handoff: {state.get('previous_agent', 'unknown')} → {agent_name}")
+                logger.debug("🔄 Agent Handoff: %s → %s", state.get('previous_agent', 'unknown'), agent_name)
             
             return {"current_agent": agent_name}
             
@@ -380,35 +351,11 @@ async def master_router_node(state: AgentState) -> Dict:
             return {"current_agent": "client_agent"}
             
     except Exception as e:
-        print(f"Error in master router: {e}")
+        logger.error("Error in master router: %s", e)
         # Fallback to simple routing
         return {"current_agent": "client_agent"}
 
 
-# Hybrid router that works with both sync and async
-def router(state: AgentState) -> Dict:
-    """
-    Hybrid router function that works with both sync and async calls.
-    LangGraph will use this as the main router.
-    """
-    import asyncio
-
-    print(f"🧠 Sync Router: Processing message routing...")
-    print(f"🔍 DEBUG: Router called with state keys: {list(state.keys()) if isinstance(state, dict) else 'Not a dict'}")
-
-    try:
-        # Try to get the current event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # We're in an async context, but LangGraph is calling us synchronously
-            # Use the sync version
-            print("🔍 DEBUG: Using sync router version")
-            return master_router_node_sync(state)
-        else:
-            # We can run async
-            print("🔍 DEBUG: Using async router version")
-            return asyncio.run(master_router_node(state))
-    except RuntimeError:
-        # No event loop, use sync version
-        print("🔍 DEBUG: No event loop, using sync version")
-        return master_router_node_sync(state)
+def master_router_node_sync(state: AgentState) -> Dict:
+    """Sync wrapper for the router node."""
+    return run_node_sync(master_router_node, state)
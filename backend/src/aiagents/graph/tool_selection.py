@@ -0,0 +1,176 @@
+"""
+Intent-scoped tool selection for agent LLM calls.
+
+Agents expose dozens of tool schemas; most requests need two or three of them.
+Using the operation the context extractor already identified for this turn
+(state['data']['user_operation']), only the tools relevant to that operation
+are sent to the model:
+- Scopes per operation, intersected with the agent's own tools
+- Full tool set whenever the intent is unknown, generic or carried over from
+  an earlier turn
+- A ``request_all_tools`` escape hatch plus a retry with the full set when
+  the model asks for a tool that was not sent
+- Token accounting of schema tokens sent vs. the full set
+"""
+
+import os
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from src.aiagents.memory.context_window import count_tokens
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+REQUEST_ALL_TOOLS = "request_all_tools"
+
+REQUEST_ALL_TOOLS_SCHEMA = {
+    "type": "function",
+    "function": {
+        "name": REQUEST_ALL_TOOLS,
+        "description": "Call this only if none of the other available tools can handle the user's request; the full tool list will be provided.",
+        "parameters": {"type": "object", "properties": {}},
+    },
+}
+
+# Tools relevant to each operation from ContextExtractor._extract_operation_type,
+# including the lookups the agent typically needs on the way (e.g. listing a
+# client's contracts to find the contract id to update)
+OPERATION_TOOL_SCOPES: Dict[str, Set[str]] = {
+    # Contracts
+    "update_contract": {"update_contract", "update_contract_by_id", "get_client_contracts", "get_contract_details", "search_contracts"},
+    "delete_contract": {"delete_contract", "delete_contract_document", "get_client_contracts", "get_contract_details"},
+    "create_contract": {"create_contract", "create_client_and_contract", "search_clients", "get_client_details", "upload_contract_document"},
+    "upload_contract_document": {"upload_contract_document", "manage_contract_document", "get_client_contracts"},
+    "get_contracts_by_client": {"get_client_contracts", "get_contract_details", "get_client_details", "search_contracts"},
+    "get_contracts_with_documents": {"get_contracts_with_documents", "get_client_contracts", "get_contract_details"},
+    "get_contracts_for_next_month_billing": {"get_contracts_for_next_month_billing", "get_contracts_with_null_billing", "get_contract_details"},
+    "get_contracts_with_null_billing": {"get_contracts_with_null_billing", "get_contracts_for_next_month_billing", "get_contract_details"},
+    "get_contracts_by_amount": {"get_contracts_by_amount", "get_contract_details", "get_client_contracts"},
+    # Employees
+    "create_employee": {"create_employee", "create_employee_from_details", "upload_employee_document", "search_profiles_by_name"},
+    "update_employee": {"update_employee", "update_employee_from_details", "search_employees", "get_employee_details"},
+    "delete_employee": {"delete_employee", "search_employees", "get_employee_details"},
+    "search_employees": {"search_employees", "get_employee_details", "get_all_employees", "get_employees_by_committed_hours", "search_profiles_by_name"},
+    "upload_employee_document": {"upload_employee_document", "search_employees", "get_employee_details", "get_employee_document"},
+    "delete_employee_document": {"delete_employee_document", "search_employees", "get_employee_details", "get_employee_document"},
+    # Clients
+    "update_client": {"update_client", "get_client_details", "search_clients"},
+    "create_client": {"create_client", "create_client_and_contract", "search_clients"},
+    "delete_client": {"delete_client", "get_client_details", "search_clients"},
+    "get_client_details": {"get_client_details", "search_clients", "get_client_contracts", "get_all_clients", "get_all_clients_with_contracts"},
+}
+
+
+def tool_name(tool: Dict[str, Any]) -> str:
+    return tool.get("function", {}).get("name", "")
+
+
+@dataclass
+class ToolSelection:
+    tools: List[Dict[str, Any]]
+    scoped: bool
+    operation: Optional[str]
+    full_tokens: int
+    sent_tokens: int
+
+    @property
+    def names(self) -> Set[str]:
+        return {tool_name(tool) for tool in self.tools}
+
+
+class ToolSelector:
+    """Chooses the tool schemas to send with an agent's completion request."""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = enabled if enabled is not None else os.getenv("AGENT_TOOL_SCOPING", "true").lower() in ("1", "true", "yes")
+        self._schema_tokens: Dict[str, int] = {}
+        self._stats = {
+            "selections": 0,
+            "scoped": 0,
+            "full_schema_tokens": 0,
+            "sent_schema_tokens": 0,
+            "fallbacks": 0,
+        }
+
+    def _tokens(self, tools: List[Dict[str, Any]]) -> int:
+        total = 0
+        for tool in tools:
+            name = tool_name(tool)
+            if name not in self._schema_tokens:
+                self._schema_tokens[name] = count_tokens(json.dumps(tool, separators=(",", ":")))
+            total += self._schema_tokens[name]
+        return total
+
+    @staticmethod
+    def current_operation(state: Dict[str, Any]) -> Optional[str]:
+        """The operation identified from this turn's user message, if any."""
+        data = state.get("data") or {}
+        operation = data.get("user_operation")
+        if not operation:
+            return None
+
+        last_user_message = ""
+        for message in reversed(state.get("messages") or []):
+            role = message.get("role") if isinstance(message, dict) else getattr(message, "type", None)
+            if role in ("user", "human"):
+                last_user_message = message.get("content", "") if isinstance(message, dict) else getattr(message, "content", "")
+                break
+
+        # Carried over from an earlier turn (e.g. the user just answered with a
+        # contract id) - the model may need anything, so don't scope
+        if data.get("original_user_request") != last_user_message:
+            return None
+        return operation
+
+    def select(self, tools: List[Dict[str, Any]], state: Dict[str, Any], agent_name: str = "") -> ToolSelection:
+        full_tokens = self._tokens(tools)
+        self._stats["selections"] += 1
+        self._stats["full_schema_tokens"] += full_tokens
+
+        operation = self.current_operation(state) if self.enabled else None
+        scope = OPERATION_TOOL_SCOPES.get(operation) if operation else None
+        scoped_tools = [tool for tool in tools if tool_name(tool) in scope] if scope else []
+
+        if not scoped_tools or len(scoped_tools) == len(tools):
+            self._stats["sent_schema_tokens"] += full_tokens
+            return ToolSelection(tools, False, operation, full_tokens, full_tokens)
+
+        scoped_tools.append(REQUEST_ALL_TOOLS_SCHEMA)
+        sent_tokens = self._tokens(scoped_tools)
+        self._stats["scoped"] += 1
+        self._stats["sent_schema_tokens"] += sent_tokens
+        logger.debug(
+            "🧰 TOOL SELECTION: %s sending %s of %s tools for %s (%s -> %s schema tokens)",
+            agent_name, len(scoped_tools) - 1, len(tools), operation, full_tokens, sent_tokens
+        )
+        return ToolSelection(scoped_tools, True, operation, full_tokens, sent_tokens)
+
+    def needs_full_set(self, selection: ToolSelection, response_message: Any) -> bool:
+        """True if the model asked for more tools or called one that was not sent."""
+        if not selection.scoped:
+            return False
+        requested = {
+            tool_call.function.name
+            for tool_call in (getattr(response_message, "tool_calls", None) or [])
+        }
+        if REQUEST_ALL_TOOLS in requested or not requested.issubset(selection.names):
+            self._stats["fallbacks"] += 1
+            logger.debug("🧰 TOOL SELECTION: Retrying with full tool set (requested %s, sent %s)", sorted(requested), sorted(selection.names))
+            return True
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        selections = self._stats["selections"]
+        saved = self._stats["full_schema_tokens"] - self._stats["sent_schema_tokens"]
+        return {
+            **self._stats,
+            "schema_tokens_saved": saved,
+            "scoped_rate": self._stats["scoped"] / selections if selections else 0.0,
+            "avg_tokens_saved_per_call": saved / selections if selections else 0.0,
+        }
+
+
+# Global tool selector
+tool_selector = ToolSelector()
@@ -1,7 +1,8 @@
 
+import os
 import json
 from sre_parse import ANY
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import re
 from datetime import datetime
 from sqlalchemy import select
@@ -29,9 +30,23 @@ from  src.aiagents.tools.client_tools import (
 from src.aiagents.tools.employee_tools import (
     create_employee_tool, update_employee_tool, search_employees_tool,
     get_employee_details_tool, get_all_employees_tool, get_employees_by_committed_hours_tool, search_profiles_by_name_tool,
-    delete_employee_tool, CreateEmployeeParams, UpdateEmployeeParams, DeleteEmployeeParams
+    delete_employee_tool, CreateEmployeeParams, UpdateEmployeeParams, DeleteEmployeeParams,
+    format_employee_list_item
 )
+from src.aiagents.tools.time_tools import (
+    smart_create_time_entry_tool, search_projects_tool, get_timesheet_tool, SmartTimeEntryParams, timesheet_period,
+    requested_period
+)
+from src.aiagents.tools.deliverable_tools import (
+    smart_create_deliverable_tool, get_deliverables_by_client_tool, get_deliverables_by_contract_tool,
+    search_deliverables_tool, SmartDeliverableParams
+)
+from src.aiagents.tools.result_paging import ListRenderer, show_more_results
+from src.aiagents.tools.date_expressions import date_resolver
 from src.database.core.models import Employee
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 # ... import other tools for other agents as they are integrated
 
 # --- Tool Wrappers (migrated from ContractAgent) ---
@@ -92,14 +107,14 @@ async def _smart_create_contract_wrapper(**kwargs) -> Dict[str, Any]:
             kwargs['contract_type'] = 'Fixed'  # Default fallback
     
     params = SmartContractParams(**kwargs)
-    print(f"🔍 DEBUG: _smart_create_contract_wrapper - creating contract for client: {kwargs.get('client_name')}")
+    logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - creating contract for client: %s", kwargs.get('client_name'))
     result = await smart_create_contract_tool(params, context)
-    print(f"🔍 DEBUG: _smart_create_contract_wrapper - base tool result: success={getattr(result, 'success', None)}")
+    logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - base tool result: success=%s", getattr(result, 'success', None))
     
     # If successful, enhance the response with comprehensive details
     if result and getattr(result, 'success', False) and getattr(result, 'data', None):
         contract_data = result.data
-        print(f"🔍 DEBUG: _smart_create_contract_wrapper - contract_data keys: {list(contract_data.keys())}")
+        logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - contract_data keys: %s", list(contract_data.keys()))
         
         # Get additional client information for context
         try:
@@ -110,7 +125,7 @@ async def _smart_create_contract_wrapper(**kwargs) -> Dict[str, Any]:
                     # Sometimes contract_id is nested or typed as str in base tool
                     nested_id = (contract_data.get('contract', {}) or {}).get('contract_id')
                     contract_id = nested_id or contract_id
-                print(f"🔍 DEBUG: _smart_create_contract_wrapper - resolved contract_id: {contract_id}")
+                logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - resolved contract_id: %s", contract_id)
                 if contract_id:
                 # Fetch contract
                     contract_stmt = select(Contract).where(Contract.contract_id == contract_id)
@@ -163,7 +178,7 @@ async def _smart_create_contract_wrapper(**kwargs) -> Dict[str, Any]:
                             }
                         }
                         
-                        print(f"🔍 DEBUG: _smart_create_contract_wrapper - returning enhanced payload with contract_id={contract.contract_id}")
+                        logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - returning enhanced payload with contract_id=%s", contract.contract_id)
                         return {
                             "success": True,
                             "message": f"✅ Successfully created contract for '{client.client_name}'. Contract ID: {contract.contract_id}",
@@ -171,14 +186,14 @@ async def _smart_create_contract_wrapper(**kwargs) -> Dict[str, Any]:
                         }
         except Exception as e:
             # If enhancement fails, fall back to original response but log the error
-            print(f"Warning: Could not enhance contract response: {str(e)}")
+            logger.warning("Warning: Could not enhance contract response: %s", str(e))
     # Check if the failure is due to client not found and retry with create_client_and_contract
     if result and not getattr(result, 'success', False):
         result_dict = result.model_dump() if hasattr(result, 'model_dump') else result
         message = result_dict.get('message', '') if isinstance(result_dict, dict) else str(result_dict)
         
         if 'not found' in message.lower() and 'client' in message.lower():
-            print(f"🔍 DEBUG: _smart_create_contract_wrapper - Client not found, retrying with create_client and smart_create_contract")
+            logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - Client not found, retrying with create_client and smart_create_contract")
             try:
                 # First create the client
                 client_params = CreateClientParams(
@@ -206,21 +221,21 @@ async def _smart_create_contract_wrapper(**kwargs) -> Dict[str, Any]:
                 )
                 
                 retry_result = await smart_create_contract_tool(contract_params, context)
-                print(f"🔍 DEBUG: _smart_create_contract_wrapper - retry result: success={getattr(retry_result, 'success', None)}")
+                logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - retry result: success=%s", getattr(retry_result, 'success', None))
                 return retry_result.model_dump() if hasattr(retry_result, 'model_dump') else retry_result
                 
             except Exception as e:
-                print(f"🔍 DEBUG: _smart_create_contract_wrapper - retry failed: {str(e)}")
+                logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - retry failed: %s", str(e))
                 # Fall through to original error
     
     # Return original response if enhancement fails or if not successful
     try:
         fallback = result.model_dump()
-        print(f"🔍 DEBUG: _smart_create_contract_wrapper - returning fallback payload (not enhanced)")
+        logger.debug("🔍 DEBUG: _smart_create_contract_wrapper - returning fallback payload (not enhanced)")
         return fallback
     except Exception:
         # Last resort
-        print("❌ DEBUG: _smart_create_contract_wrapper - no valid result to return, returning error")
+        logger.debug("❌ DEBUG: _smart_create_contract_wrapper - no valid result to return, returning error")
         return {"success": False, "message": "Failed to create contract", "data": None}
 
 async def _get_contracts_by_client_wrapper(**kwargs) -> Dict[str, Any]:
@@ -247,45 +262,45 @@ async def _update_contract_wrapper(**kwargs) -> Dict[str, Any]:
     
     # Extract field from original user request if available
     if context and context.get('original_user_request'):
-        print(f"🔍 FIELD EXTRACTION: Original user request: {context['original_user_request']}")
-        print(f"🔍 FIELD EXTRACTION: Context keys: {list(context.keys())}")
-        print(f"🔍 FIELD EXTRACTION: Current kwargs before extraction: {kwargs}")
+        logger.debug("🔍 FIELD EXTRACTION: Original user request: %s", context['original_user_request'])
+        logger.debug("🔍 FIELD EXTRACTION: Context keys: %s", list(context.keys()))
+        logger.debug("🔍 FIELD EXTRACTION: Current kwargs before extraction: %s", kwargs)
         
         # Import the field extraction function
         from src.aiagents.agents_sdk.tool_definitions import _extract_field_from_request
-        print(f"🔍 FIELD EXTRACTION: About to call _extract_field_from_request...")
+        logger.debug("🔍 FIELD EXTRACTION: About to call _extract_field_from_request...")
         extracted_field = _extract_field_from_request(context['original_user_request'])
-        print(f"🔍 FIELD EXTRACTION: _extract_field_from_request returned: {extracted_field}")
+        logger.debug("🔍 FIELD EXTRACTION: _extract_field_from_request returned: %s", extracted_field)
         
         if extracted_field:
-            print(f"🔍 FIELD EXTRACTION: Extracted field: {extracted_field}")
-            print(f"🔍 FIELD EXTRACTION: kwargs before update: {kwargs}")
+            logger.debug("🔍 FIELD EXTRACTION: Extracted field: %s", extracted_field)
+            logger.debug("🔍 FIELD EXTRACTION: kwargs before update: %s", kwargs)
             # Update kwargs with extracted field
             kwargs.update(extracted_field)
-            print(f"🔍 FIELD EXTRACTION: kwargs after update: {kwargs}")
-            print(f"🔍 FIELD EXTRACTION: Updated kwargs with extracted field: {extracted_field}")
+            logger.debug("🔍 FIELD EXTRACTION: kwargs after update: %s", kwargs)
+            logger.debug("🔍 FIELD EXTRACTION: Updated kwargs with extracted field: %s", extracted_field)
         else:
-            print(f"🔍 FIELD EXTRACTION: No field extracted from request")
+            logger.debug("🔍 FIELD EXTRACTION: No field extracted from request")
     else:
-        print(f"🔍 FIELD EXTRACTION: No original_user_request in context")
-        print(f"🔍 FIELD EXTRACTION: Context: {context}")
+        logger.debug("🔍 FIELD EXTRACTION: No original_user_request in context")
+        logger.debug("🔍 FIELD EXTRACTION: Context: %s", context)
     
     # CRITICAL: Add contract_id from context if available
     if 'current_contract_id' in context and context['current_contract_id']:
         kwargs['contract_id'] = int(context['current_contract_id'])
-        print(f"🔍 FIELD EXTRACTION: Added contract_id from context: {kwargs['contract_id']}")
+        logger.debug("🔍 FIELD EXTRACTION: Added contract_id from context: %s", kwargs['contract_id'])
     
-    print(f"🔍 FIELD EXTRACTION: Final kwargs for UpdateContractParams: {kwargs}")
+    logger.debug("🔍 FIELD EXTRACTION: Final kwargs for UpdateContractParams: %s", kwargs)
     try:
         params = UpdateContractParams(**kwargs)
-        print(f"🔍 FIELD EXTRACTION: Created UpdateContractParams successfully: {params}")
-        print(f"🔍 FIELD EXTRACTION: About to call update_contract_tool...")
+        logger.debug("🔍 FIELD EXTRACTION: Created UpdateContractParams successfully: %s", params)
+        logger.debug("🔍 FIELD EXTRACTION: About to call update_contract_tool...")
         result = await update_contract_tool(params, context)
-        print(f"🔍 FIELD EXTRACTION: update_contract_tool returned: {result}")
+        logger.debug("🔍 FIELD EXTRACTION: update_contract_tool returned: %s", result)
         return result.model_dump()
     except Exception as e:
-        print(f"🔍 FIELD EXTRACTION: ERROR creating UpdateContractParams or calling tool: {e}")
-        print(f"🔍 FIELD EXTRACTION: kwargs that caused error: {kwargs}")
+        logger.error("🔍 FIELD EXTRACTION: ERROR creating UpdateContractParams or calling tool: %s", e)
+        logger.error("🔍 FIELD EXTRACTION: kwargs that caused error: %s", kwargs)
         raise
 
 async def _get_contracts_for_next_month_billing_wrapper(**kwargs) -> Dict[str, Any]:
@@ -293,8 +308,7 @@ async def _get_contracts_for_next_month_billing_wrapper(**kwargs) -> Dict[str, A
     context = kwargs.pop('context', None)
     client_name = kwargs.pop('client_name', None)
     if context is None:
-        from datetime import date
-        context = {'today': date.today()}
+        context = {'today': date_resolver.today()}
     result = await get_contracts_for_next_month_billing_tool(client_name=client_name, context=context)
     return result.model_dump()
 
@@ -355,7 +369,7 @@ async def _upload_contract_document_wrapper(**kwargs) -> Dict[str, Any]:
     kwargs.pop('db', None)
     context = kwargs.pop('context', None)
     
-    print(f"🔍 DEBUG: upload_contract_document_wrapper - context has file_info: {context and 'file_info' in context}")
+    logger.debug("🔍 DEBUG: upload_contract_document_wrapper - context has file_info: %s", context and 'file_info' in context)
 
     # ENHANCED PARAMETER HANDLING: Better file data replacement and validation
     file_info = (context or {}).get('file_info')
@@ -398,9 +412,9 @@ async def _upload_contract_document_wrapper(**kwargs) -> Dict[str, Any]:
                     kwargs['filename'] = cached_file['filename']
                     kwargs['file_size'] = cached_file['file_size']
                     kwargs['mime_type'] = cached_file['mime_type']
-                    print(f"🔍 DEBUG: Tool wrapper - Fetched file from cache: {len(kwargs['file_data'])} chars, size: {kwargs['file_size']}")
+                    logger.debug("🔍 DEBUG: Tool wrapper - Fetched file from cache: %s chars, size: %s", len(kwargs['file_data']), kwargs['file_size'])
             else:
-                print(f"🔍 DEBUG: Tool wrapper - File not found in cache, ref_id: {file_info['file_ref_id']}")
+                logger.debug("🔍 DEBUG: Tool wrapper - File not found in cache, ref_id: %s", file_info['file_ref_id'])
                 return {
                     "success": False,
                     "message": "❌ File data not found. Please try uploading the file again.",
@@ -413,7 +427,7 @@ async def _upload_contract_document_wrapper(**kwargs) -> Dict[str, Any]:
                 kwargs['filename'] = file_info.get('filename', kwargs.get('filename'))
                 kwargs['file_size'] = file_info.get('file_size', kwargs.get('file_size'))
                 kwargs['mime_type'] = file_info.get('mime_type', kwargs.get('mime_type'))
-                print(f"🔍 DEBUG: Tool wrapper - Using direct file data: {len(kwargs['file_data'])} chars, size: {kwargs['file_size']}")
+                logger.debug("🔍 DEBUG: Tool wrapper - Using direct file data: %s chars, size: %s", len(kwargs['file_data']), kwargs['file_size'])
 
     # Ensure required params
     required_params = ['client_name']
@@ -477,7 +491,7 @@ async def _delete_client_wrapper(**kwargs) -> Dict[str, Any]:
     # Handle parameter mapping for tool corrections
     if 'employee_name' in kwargs and 'client_name' not in kwargs:
         kwargs['client_name'] = kwargs.pop('employee_name')
-        print(f"🔍 DEBUG: Parameter mapping - employee_name -> client_name: {kwargs['client_name']}")
+        logger.debug("🔍 DEBUG: Parameter mapping - employee_name -> client_name: %s", kwargs['client_name'])
     
     params = DeleteClientParams(**kwargs)
     result = await delete_client_tool(params)
@@ -509,11 +523,11 @@ async def _create_client_and_contract_wrapper(**kwargs) -> Dict[str, Any]:
                     kwargs['filename'] = cached_file['filename']
                     kwargs['file_size'] = cached_file['file_size']
                     kwargs['mime_type'] = cached_file['mime_type']
-                    print(f"🔍 DEBUG: create_client_and_contract - Fetched file from cache: {len(kwargs['file_data'])} chars, size: {kwargs['file_size']}")
+                    logger.debug("🔍 DEBUG: create_client_and_contract - Fetched file from cache: %s chars, size: %s", len(kwargs['file_data']), kwargs['file_size'])
                 else:
-                    print(f"🔍 DEBUG: create_client_and_contract - Using provided file data: {len(kwargs.get('file_data', ''))} chars")
+                    logger.debug("🔍 DEBUG: create_client_and_contract - Using provided file data: %s chars", len(kwargs.get('file_data', '')))
             else:
-                print(f"🔍 DEBUG: create_client_and_contract - File not found in cache, ref_id: {file_info['file_ref_id']}")
+                logger.debug("🔍 DEBUG: create_client_and_contract - File not found in cache, ref_id: %s", file_info['file_ref_id'])
                 return {
                     "success": False,
                     "message": "❌ File data not found. Please try uploading the file again.",
@@ -526,11 +540,11 @@ async def _create_client_and_contract_wrapper(**kwargs) -> Dict[str, Any]:
                 kwargs['filename'] = file_info.get('filename', kwargs.get('filename'))
                 kwargs['file_size'] = file_info.get('file_size', kwargs.get('file_size'))
                 kwargs['mime_type'] = file_info.get('mime_type', kwargs.get('mime_type'))
-                print(f"🔍 DEBUG: create_client_and_contract - Replaced placeholder with real file data: {len(kwargs['file_data'])} chars, size: {kwargs['file_size']}")
+                logger.debug("🔍 DEBUG: create_client_and_contract - Replaced placeholder with real file data: %s chars, size: %s", len(kwargs['file_data']), kwargs['file_size'])
             else:
-                print(f"🔍 DEBUG: create_client_and_contract - Using provided file data: {len(kwargs.get('file_data', ''))} chars")
+                logger.debug("🔍 DEBUG: create_client_and_contract - Using provided file data: %s chars", len(kwargs.get('file_data', '')))
     else:
-        print(f"🔍 DEBUG: create_client_and_contract - No file_info in context")
+        logger.debug("🔍 DEBUG: create_client_and_contract - No file_info in context")
     
     try:
         # First create the client
@@ -973,9 +987,9 @@ async def _create_employee_from_details_wrapper(**kwargs) -> Dict[str, Any]:
     kwargs.pop('db', None)
     context = kwargs.pop('context', None)
     
-    print(f"🔍 DEBUG: create_employee_from_details_wrapper called with kwargs: {list(kwargs.keys())}")
-    print(f"🔍 DEBUG: create_employee_from_details_wrapper - nda_document_data: {str(kwargs.get('nda_document_data', 'None'))[:50]}...")
-    print(f"🔍 DEBUG: create_employee_from_details_wrapper - context present: {context is not None}")
+    logger.debug("🔍 DEBUG: create_employee_from_details_wrapper called with kwargs: %s", list(kwargs.keys()))
+    logger.debug("🔍 DEBUG: create_employee_from_details_wrapper - nda_document_data: %s...", str(kwargs.get('nda_document_data', 'None'))[:50])
+    logger.debug("🔍 DEBUG: create_employee_from_details_wrapper - context present: %s", context is not None)
     
     try:
         # First search for the employee profile by name
@@ -1073,13 +1087,13 @@ async def _create_employee_from_details_wrapper(**kwargs) -> Dict[str, Any]:
         
         if context and 'file_info' in context and (has_nda_placeholder or has_contract_placeholder):
             file_info = context['file_info']
-            print(f"🔍 DEBUG: create_employee_from_details - file_info keys: {list(file_info.keys())}")
-            print(f"🔍 DEBUG: create_employee_from_details - file_data present: {'file_data' in file_info}")
-            print(f"🔍 DEBUG: create_employee_from_details - file_ref_id present: {'file_ref_id' in file_info}")
+            logger.debug("🔍 DEBUG: create_employee_from_details - file_info keys: %s", list(file_info.keys()))
+            logger.debug("🔍 DEBUG: create_employee_from_details - file_data present: %s", 'file_data' in file_info)
+            logger.debug("🔍 DEBUG: create_employee_from_details - file_ref_id present: %s", 'file_ref_id' in file_info)
             
             # Replace NDA document placeholders
             if has_nda_placeholder:
-                print(f"🔍 DEBUG: create_employee_from_details - Replacing NDA document placeholder")
+                logger.debug("🔍 DEBUG: create_employee_from_details - Replacing NDA document placeholder")
                 
                 # Check if we have a file reference (optimized approach)
                 if file_info.get('file_ref_id'):
@@ -1092,9 +1106,9 @@ async def _create_employee_from_details_wrapper(**kwargs) -> Dict[str, Any]:
                         kwargs['nda_document_filename'] = cached_file['filename']
                         kwargs['nda_document_size'] = cached_file['file_size']
                         kwargs['nda_document_mime_type'] = cached_file['mime_type']
-                        print(f"🔍 DEBUG: create_employee_from_details - Fetched file from cache: {len(kwargs['nda_document_data'])} chars, size: {kwargs['nda_document_size']}")
+                        logger.debug("🔍 DEBUG: create_employee_from_details - Fetched file from cache: %s chars, size: %s", len(kwargs['nda_document_data']), kwargs['nda_document_size'])
                     else:
-                        print(f"🔍 DEBUG: create_employee_from_details - File not found in cache, ref_id: {file_info['file_ref_id']}")
+                        logger.debug("🔍 DEBUG: create_employee_from_details - File not found in cache, ref_id: %s", file_info['file_ref_id'])
                         return {
                             "success": False,
                             "message": "❌ File data not found. Please try uploading the file again.",
@@ -1106,11 +1120,11 @@ async def _create_employee_from_details_wrapper(**kwargs) -> Dict[str, Any]:
                     kwargs['nda_document_filename'] = file_info.get('filename', kwargs.get('nda_document_filename'))
                     kwargs['nda_document_size'] = file_info.get('file_size', kwargs.get('nda_document_size'))
                     kwargs['nda_document_mime_type'] = file_info.get('mime_type', kwargs.get('nda_document_mime_type'))
-                    print(f"🔍 DEBUG: create_employee_from_details - Using direct file data: {len(kwargs['nda_document_data']) if kwargs['nda_document_data'] else 0} chars")
+                    logger.debug("🔍 DEBUG: create_employee_from_details - Using direct file data: %s chars", len(kwargs['nda_document_data']) if kwargs['nda_document_data'] else 0)
                 
-                print(f"🔍 DEBUG: create_employee_from_details - NDA document data length: {len(kwargs['nda_document_data']) if kwargs['nda_document_data'] else 0}")
+                logger.debug("🔍 DEBUG: create_employee_from_details - NDA document data length: %s", len(kwargs['nda_document_data']) if kwargs['nda_document_data'] else 0)
             else:
-                print(f"🔍 DEBUG: create_employee_from_details - NDA document data not placeholder: {str(kwargs.get('nda_document_data', 'None'))[:50]}...")
+                logger.debug("🔍 DEBUG: create_employee_from_details - NDA document data not placeholder: %s...", str(kwargs.get('nda_document_data', 'None'))[:50])
             
             # Replace contract document placeholders
             if has_contract_placeholder:
@@ -1125,9 +1139,9 @@ async def _create_employee_from_details_wrapper(**kwargs) -> Dict[str, Any]:
                         kwargs['contract_document_filename'] = cached_file['filename']
                         kwargs['contract_document_size'] = cached_file['file_size']
                         kwargs['contract_document_mime_type'] = cached_file['mime_type']
-                        print(f"🔍 DEBUG: create_employee_from_details - Fetched contract file from cache: {len(kwargs['contract_document_data'])} chars, size: {kwargs['contract_document_size']}")
+                        logger.debug("🔍 DEBUG: create_employee_from_details - Fetched contract file from cache: %s chars, size: %s", len(kwargs['contract_document_data']), kwargs['contract_document_size'])
                     else:
-                        print(f"🔍 DEBUG: create_employee_from_details - Contract file not found in cache, ref_id: {file_info['file_ref_id']}")
+                        logger.debug("🔍 DEBUG: create_employee_from_details - Contract file not found in cache, ref_id: %s", file_info['file_ref_id'])
                         return {
                             "success": False,
                             "message": "❌ File data not found. Please try uploading the file again.",
@@ -1139,7 +1153,7 @@ async def _create_employee_from_details_wrapper(**kwargs) -> Dict[str, Any]:
                     kwargs['contract_document_filename'] = file_info.get('filename', kwargs.get('contract_document_filename'))
                     kwargs['contract_document_size'] = file_info.get('file_size', kwargs.get('contract_document_size'))
                     kwargs['contract_document_mime_type'] = file_info.get('mime_type', kwargs.get('contract_document_mime_type'))
-                    print(f"🔍 DEBUG: create_employee_from_details - Using direct contract file data: {len(kwargs['contract_document_data']) if kwargs['contract_document_data'] else 0} chars")
+                    logger.debug("🔍 DEBUG: create_employee_from_details - Using direct contract file data: %s chars", len(kwargs['contract_document_data']) if kwargs['contract_document_data'] else 0)
         
         # Create employee using the existing create_employee tool
         # TODO: OPTIMIZATION - Pass employee_name instead of profile_id to eliminate nested session
@@ -1220,9 +1234,9 @@ async def _upload_employee_document_wrapper(**kwargs) -> dict:
                         filename = cached_file['filename']
                         file_size = cached_file['file_size']
                         mime_type = cached_file['mime_type']
-                        print(f"🔍 DEBUG: Tool wrapper - Fetched file from cache: {len(file_data)} chars, size: {file_size}")
+                        logger.debug("🔍 DEBUG: Tool wrapper - Fetched file from cache: %s chars, size: %s", len(file_data), file_size)
                     else:
-                        print(f"🔍 DEBUG: Tool wrapper - File not found in cache, ref_id: {file_info['file_ref_id']}")
+                        logger.debug("🔍 DEBUG: Tool wrapper - File not found in cache, ref_id: %s", file_info['file_ref_id'])
                         return {
                             "success": False,
                             "message": "❌ File data not found. Please try uploading the file again.",
@@ -1234,9 +1248,9 @@ async def _upload_employee_document_wrapper(**kwargs) -> dict:
                     filename = file_info.get('filename', filename)
                     file_size = file_info.get('file_size', file_size)
                     mime_type = file_info.get('mime_type', mime_type)
-                    print(f"🔍 DEBUG: Tool wrapper - Using direct file data from context: {len(file_data)} chars, size: {file_size}")
+                    logger.debug("🔍 DEBUG: Tool wrapper - Using direct file data from context: %s chars, size: %s", len(file_data), file_size)
             else:
-                print(f"🔍 DEBUG: Tool wrapper - No file_info in context, using placeholder data")
+                logger.debug("🔍 DEBUG: Tool wrapper - No file_info in context, using placeholder data")
         
         # TODO: If this name validation causes issues with legitimate uploads, remove this section
         # Additional validation: ensure employee_name is not a filename
@@ -1353,6 +1367,82 @@ async def _get_employee_document_wrapper(**kwargs) -> dict:
             "data": None
         }
 
+async def _log_time_for_project_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for logging time against a project by name"""
+    kwargs.pop('db', None)
+    context = kwargs.pop('context', None)
+    params = SmartTimeEntryParams(**kwargs)
+    result = await smart_create_time_entry_tool(params, context)
+    return result.model_dump()
+
+async def _search_projects_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for searching projects/deliverables"""
+    kwargs.pop('db', None)
+    result = await search_projects_tool(kwargs.get("search_term", ""))
+    return result.model_dump()
+
+async def _get_timesheet_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for an employee's timesheet totals, defaulting to the current week"""
+    kwargs.pop('db', None)
+    context = kwargs.pop('context', None)
+    start_date, end_date = timesheet_period(
+        kwargs.get("start_date"), kwargs.get("end_date"), requested_period(kwargs.get("period"), context)
+    )
+    result = await get_timesheet_tool(kwargs.get("employee_id", 1), start_date, end_date)
+    return result.model_dump()
+
+async def _create_deliverable_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for creating a deliverable by client name"""
+    kwargs.pop('db', None)
+    context = kwargs.pop('context', None)
+    params = SmartDeliverableParams(**kwargs)
+    result = await smart_create_deliverable_tool(params, context)
+    return result.model_dump()
+
+async def _get_client_deliverables_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for all deliverables of a client"""
+    kwargs.pop('db', None)
+    result = await get_deliverables_by_client_tool(kwargs.get("client_name"))
+    return result.model_dump()
+
+async def _get_contract_deliverables_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for the deliverables of one contract"""
+    kwargs.pop('db', None)
+    result = await get_deliverables_by_contract_tool(kwargs.get("client_name"), kwargs.get("contract_id"))
+    return result.model_dump()
+
+async def _search_deliverables_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for searching deliverables"""
+    kwargs.pop('db', None)
+    result = await search_deliverables_tool(kwargs.get("search_term", ""))
+    return result.model_dump()
+
+async def _show_more_results_wrapper(**kwargs) -> Dict[str, Any]:
+    """Wrapper for the next page of the previous listing"""
+    kwargs.pop('db', None)
+    context = kwargs.pop('context', None) or {}
+    cursor = kwargs.get("cursor") or context.get("result_cursor")
+    return await show_more_results(cursor)
+
+
+def _result_cursor_updates(state: AgentState, cursor: Optional[str]) -> Dict[str, Any]:
+    """state['data'] updates that remember the listing cursor and the agent that produced it (or forget both)."""
+    if not cursor:
+        return {'result_cursor': None, 'result_cursor_agent': None}
+    agent = state.get('current_agent') or state.get('data', {}).get('current_agent')
+    logger.debug("📄 Tool executor - storing result cursor for %s", agent)
+    return {'result_cursor': cursor, 'result_cursor_agent': agent}
+
+
+def _apply_data_updates(state: AgentState, updates: Dict[str, Any]):
+    """Apply a tool call's state['data'] updates; None removes the key."""
+    data = state.setdefault('data', {})
+    for key, value in updates.items():
+        if value is None:
+            data.pop(key, None)
+        else:
+            data[key] = value
+
 # --- Central Tool Registry ---
 TOOL_REGISTRY = {
     "create_client": _create_client_wrapper,
@@ -1398,10 +1488,224 @@ TOOL_REGISTRY = {
     "delete_employee_document": _delete_employee_document_wrapper,
     "get_employee_document": _get_employee_document_wrapper,
 
+    # Time tracking tools
+    "log_time_for_project": _log_time_for_project_wrapper,
+    "search_projects": _search_projects_wrapper,
+    "get_timesheet": _get_timesheet_wrapper,
+
+    # Deliverable tools
+    "create_deliverable": _create_deliverable_wrapper,
+    "get_client_deliverables": _get_client_deliverables_wrapper,
+    "get_contract_deliverables": _get_contract_deliverables_wrapper,
+    "search_deliverables": _search_deliverables_wrapper,
+
+    # Paged listings
+    "show_more_results": _show_more_results_wrapper,
     
     # Other tools will be registered here
 }
 
+# --- Background handoff for long-running tools ---
+# These tools can take long enough (storage uploads, bulk updates, full
+# listings with signed URLs) to hold the chat request open. They run on the
+# background job queue; if they don't finish within the inline budget the
+# assistant replies with a job id the client can poll at /api/jobs/{id}.
+LONG_RUNNING_TOOLS = {
+    "upload_contract_document",
+    "upload_employee_document",
+    "create_client_and_contract",
+    "get_all_clients_with_contracts",
+    "get_contracts_with_documents",
+}
+
+# Tools that mutate data are never retried automatically
+RETRYABLE_LONG_RUNNING_TOOLS = {
+    "get_all_clients_with_contracts",
+    "get_contracts_with_documents",
+}
+
+INLINE_TOOL_BUDGET_SECONDS = float(os.getenv("AGENT_INLINE_TOOL_BUDGET_SECONDS", "8"))
+
+
+def _is_long_running_tool(tool_name: str, args: Dict[str, Any]) -> bool:
+    if tool_name in LONG_RUNNING_TOOLS:
+        return True
+    # A dry run only previews the bulk update, so the confirmation prompt comes back inline
+    return tool_name == "update_contract" and args.get("update_all") is True and not args.get("dry_run")
+
+
+async def _execute_tool(tool_name: str, tool_function, args: Dict[str, Any], state: AgentState,
+                        data_updates: Optional[Dict[str, Any]] = None):
+    """
+    Run a tool, handing long-running ones to the background job queue.
+
+    Returns the tool output, or an in-progress result carrying the job id
+    when the job is still running after the inline budget. The job is
+    recorded under ``background_job`` in ``data_updates`` if given, else
+    directly in state['data'].
+    """
+    if not _is_long_running_tool(tool_name, args):
+        return await tool_function(**args)
+
+    from src.aiagents.orchestration.job_queue import job_queue, JobPriority, JobStatus
+
+    context = state.get('context', {}) or {}
+    job = await job_queue.submit(
+        tool_name,
+        lambda: tool_function(**args),
+        user_id=str(context.get('user_id')) if context.get('user_id') is not None else None,
+        session_id=context.get('session_id'),
+        priority=JobPriority.HIGH if tool_name.startswith("upload_") else JobPriority.NORMAL,
+        max_retries=1 if tool_name in RETRYABLE_LONG_RUNNING_TOOLS else 0,
+        metadata={"tool": tool_name}
+    )
+
+    job = await job_queue.wait(job.job_id, timeout=INLINE_TOOL_BUDGET_SECONDS)
+    if job.status == JobStatus.SUCCEEDED:
+        return job.result
+    if job.status in (JobStatus.FAILED, JobStatus.CANCELLED):
+        return {"success": False, "message": f"❌ {tool_name} {job.status.value}: {job.error}"}
+
+    logger.debug("⏳ TOOL: %s handed off to background job %s", tool_name, job.job_id)
+    target = data_updates if data_updates is not None else state.setdefault('data', {})
+    target['background_job'] = {"job_id": job.job_id, "tool": tool_name}
+    return {
+        "success": True,
+        "message": (
+            f"⏳ This is taking a while, so I'm finishing it in the background (job id `{job.job_id}`). "
+            f"You can check progress at /api/jobs/{job.job_id} — I'll have the result there once it's done."
+        ),
+        "data": {"job_id": job.job_id, "status": job.status.value, "tool": tool_name}
+    }
+
+
+# --- Concurrent execution of read-only tool calls ---
+# Calls to these tools have no side effects, so consecutive ones in a single
+# model turn run concurrently. Anything not listed is treated as mutating: it
+# runs alone, in order, after the reads planned before it have finished.
+READ_ONLY_TOOLS = {
+    "search_clients",
+    "get_all_clients",
+    "get_all_clients_with_contracts",
+    "get_client_details",
+    "analyze_contract",
+    "get_client_contracts",
+    "get_all_contracts",
+    "get_contract_details",
+    "get_contracts_by_billing_date",
+    "search_contracts",
+    "get_contracts_for_next_month_billing",
+    "get_contracts_with_null_billing",
+    "get_contracts_by_amount",
+    "get_contracts_with_documents",
+    "search_employees",
+    "get_employee_details",
+    "get_all_employees",
+    "get_employees_by_committed_hours",
+    "search_profiles_by_name",
+    "get_employee_document",
+    "search_projects",
+    "get_timesheet",
+    "get_client_deliverables",
+    "get_contract_deliverables",
+    "search_deliverables",
+    "show_more_results",
+}
+
+READ_TOOL_CONCURRENCY = int(os.getenv("AGENT_READ_TOOL_CONCURRENCY", "4"))
+READ_TOOL_TIMEOUT_SECONDS = float(os.getenv("AGENT_READ_TOOL_TIMEOUT_SECONDS", "30"))
+
+# Per-tool overrides; long-running tools hand off to the job queue after
+# INLINE_TOOL_BUDGET_SECONDS, so these only bound the inline part
+READ_TOOL_TIMEOUTS = {
+    "get_all_clients_with_contracts": 60.0,
+    "get_contracts_with_documents": 60.0,
+}
+
+
+def _plan_tool_call(tool_call_id: str, tool_name: str, arguments_str: str, state: AgentState) -> Dict[str, Any]:
+    """Correct the tool choice for a call and classify it as read-only or mutating."""
+    validated_tool_name = tool_name
+    validation_error = None
+    if tool_name in TOOL_REGISTRY:
+        try:
+            # Validate and correct tool selection
+            logger.debug("🔍 DEBUG: Tool executor - BEFORE correction: tool_name=%s, arguments=%s", tool_name, arguments_str)
+            validated_tool_name = validate_and_correct_tool(tool_name, state, arguments_str)
+            logger.debug("🔍 DEBUG: Tool executor - AFTER correction: validated_tool_name=%s", validated_tool_name)
+        except Exception as e:
+            validation_error = e
+
+    return {
+        "tool_call_id": tool_call_id,
+        "tool_name": tool_name,
+        "arguments_str": arguments_str,
+        "validated_tool_name": validated_tool_name,
+        "validation_error": validation_error,
+        "read_only": validation_error is None and tool_name in READ_ONLY_TOOLS and validated_tool_name in READ_ONLY_TOOLS,
+    }
+
+
+async def _run_read_only_tool_call(
+    planned_call: Dict[str, Any],
+    state: AgentState,
+    context: Dict[str, Any],
+    semaphore: asyncio.Semaphore
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    tool_name = planned_call["validated_tool_name"]
+    timeout = READ_TOOL_TIMEOUTS.get(tool_name, READ_TOOL_TIMEOUT_SECONDS)
+    async with semaphore:
+        try:
+            return await asyncio.wait_for(_run_tool_call(planned_call, state, context), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("⏱️ Tool executor - %s timed out after %.0fs", tool_name, timeout)
+            return {
+                "tool_call_id": planned_call["tool_call_id"],
+                "role": "tool",
+                "name": tool_name,
+                "content": json.dumps({"error": f"Tool '{tool_name}' timed out after {timeout:.0f}s", "tool_name": tool_name}),
+            }, {}
+
+
+async def _run_planned_tool_calls(planned_calls: List[Dict[str, Any]], state: AgentState, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Execute planned calls: runs of consecutive read-only calls go concurrently
+    (bounded by READ_TOOL_CONCURRENCY), mutating calls one at a time in order.
+    Results keep the order of the original tool calls, and so do the
+    state['data'] updates each call returns: a run of reads applies them
+    after its gather, a write right after it finishes.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(planned_calls)
+    semaphore = asyncio.Semaphore(READ_TOOL_CONCURRENCY)
+    pending_reads: List[int] = []
+
+    async def flush_reads():
+        if not pending_reads:
+            return
+        if len(pending_reads) > 1:
+            logger.debug("⚡ Tool executor - running %s read-only calls concurrently", len(pending_reads))
+        outputs = await asyncio.gather(*[
+            _run_read_only_tool_call(planned_calls[index], state, context, semaphore)
+            for index in pending_reads
+        ])
+        for index, (output, data_updates) in zip(pending_reads, outputs):
+            results[index] = output
+            _apply_data_updates(state, data_updates)
+        pending_reads.clear()
+
+    for index, planned_call in enumerate(planned_calls):
+        if planned_call["read_only"]:
+            pending_reads.append(index)
+            continue
+        # Writes see the effects of every call planned before them
+        await flush_reads()
+        results[index], data_updates = await _run_tool_call(planned_call, state, context)
+        _apply_data_updates(state, data_updates)
+    await flush_reads()
+
+    return [result for result in results if result is not None]
+
+
 async def tool_executor_node(state: AgentState) -> Dict:
     """
     Executes tools requested by an agent. This node is the central tool handler for the entire graph.
@@ -1421,32 +1725,33 @@ async def tool_executor_node(state: AgentState) -> Dict:
     # CRITICAL: Extract context from the last user message before tool execution
     # This ensures we have the latest client information for tool correction
     try:
-        from .context_extractor import ContextExtractor
-        context_extractor = ContextExtractor()
-        
+        # Shared extractor: the agent node already extracted this turn, so this is a memo hit
+        from .context_extractor import context_extractor
+
         # Find the last user message
         user_messages = [msg for msg in state['messages'] if isinstance(msg, dict) and msg.get('role') == 'user']
         if user_messages:
             last_user_message = user_messages[-1].get('content', '')
             if last_user_message:
-                print(f"🔍 DEBUG: Tool executor - extracting context from: {last_user_message}")
+                logger.debug("🔍 DEBUG: Tool executor - extracting context from: %s", last_user_message)
                 existing_data = state.get('data', {})
                 user_context = await context_extractor.extract_context_from_user_message(last_user_message, existing_data)
                 if user_context:
-                    print(f"🔍 DEBUG: Tool executor - extracted context: {user_context}")
+                    logger.debug("🔍 DEBUG: Tool executor - extracted context: %s", user_context)
                     context_extractor.update_state_with_context(state, user_context)
-                    print(f"🔍 DEBUG: Tool executor - updated state data: {state.get('data', {})}")
+                    logger.debug("🔍 DEBUG: Tool executor - updated state data: %s", state.get('data', {}))
     except Exception as e:
-        print(f"🔍 DEBUG: Tool executor - context extraction failed: {e}")
+        logger.debug("🔍 DEBUG: Tool executor - context extraction failed: %s", e)
 
     # The database session should be in the state's data payload, but context is in state.context
     #db_session = state.get('data', {}).get('database')
     context = state.get('context', {})
 
-    results = []
+    # Plan the calls in order: parse, apply the update_all dedupe, correct the tool choice
+    planned_calls = []
     update_all_used = False  # Track if update_all=true has been used
     
-    for i, tool_call in enumerate(tool_calls):
+    for tool_call in tool_calls:
         
         # Handle both dict and object tool calls
         if isinstance(tool_call, dict):
@@ -1458,7 +1763,7 @@ async def tool_executor_node(state: AgentState) -> Dict:
             tool_call_id = tool_call.id
             arguments_str = tool_call.function.arguments
             
-        print(f"🔍 TOOL: {tool_name}")
+        logger.debug("🔍 TOOL: %s", tool_name)
         
         # Skip redundant individual contract calls if update_all=true was already used
         if tool_name == 'update_contract':
@@ -1468,272 +1773,239 @@ async def tool_executor_node(state: AgentState) -> Dict:
             elif update_all_used and 'contract_id' in args:
                 continue
 
-        if tool_name not in TOOL_REGISTRY:
-            print(f"🔍 DEBUG: Tool executor - tool {tool_name} not in registry")
-            result_content = json.dumps({"error": f"Tool '{tool_name}' not found in registry."})
-        else:
-            try:
-                # Validate and correct tool selection
-                print(f"🔍 DEBUG: Tool executor - BEFORE correction: tool_name={tool_name}, arguments={arguments_str}")
-                validated_tool_name = validate_and_correct_tool(tool_name, state, arguments_str)
-                print(f"🔍 DEBUG: Tool executor - AFTER correction: validated_tool_name={validated_tool_name}")
-                if validated_tool_name != tool_name:
-                    print(f"🔍 DEBUG: Tool corrected from {tool_name} to {validated_tool_name}")
-                    tool_name = validated_tool_name
-                else:
-                    print(f"🔍 DEBUG: No tool correction needed")
+        planned_calls.append(_plan_tool_call(tool_call_id, tool_name, arguments_str, state))
 
-                tool_function = TOOL_REGISTRY[tool_name]
-                args = json.loads(arguments_str)
+    # Any call other than show_more_results moves on from the previous listing
+    if any(call["validated_tool_name"] != "show_more_results" for call in planned_calls):
+        _apply_data_updates(state, _result_cursor_updates(state, None))
 
+    results = await _run_planned_tool_calls(planned_calls, state, context)
 
-                # TODO: CONFIRMATION FIX - Enhance context with extracted context from state['data'] and messages
-                enhanced_context = context.copy() if context else {}
-                if 'data' in state and state['data']:
-                    enhanced_context.update(state['data'])
-                
-                # Add conversation messages for confirmation detection
-                enhanced_context['messages'] = state.get('messages', [])
-                print(f"🔍 DEBUG: Tool executor - enhanced context has {len(enhanced_context.get('messages', []))} messages")
-
-                args['context'] = enhanced_context
-
-                output = await tool_function(**args)
-
-                # Handle JSON serialization with Decimal support
-                def json_serializer(obj):
-                    if hasattr(obj, '__dict__'):
-                        return obj.__dict__
-                    elif hasattr(obj, '_asdict__'):  # namedtuple
-                        return obj._asdict()
-                    elif hasattr(obj, 'isoformat'):  # datetime
-                        return obj.isoformat()
-                    elif str(type(obj)) == "<class 'decimal.Decimal'>":
-                        return float(obj)
-                    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-                # Format the response as a user-friendly message instead of raw JSON
-                if isinstance(output, dict) and 'message' in output:
-                    result_content = output['message']
-                    
-                    # If there's data, include it in the result content
-                    if 'data' in output and output['data']:
-                        # For employee lists, format the data nicely
-                        if 'employees' in output['data']:
-                            employees = output['data']['employees']
-                            if employees:
-                                # Build a concise header. If min_hours present, reflect it and show count
-                                try:
-                                    min_hours = output.get('data', {}).get('min_hours')
-                                except Exception:
-                                    min_hours = None
-                                count_text = f" ({len(employees)} found)" if isinstance(employees, list) else ""
-                                header_text = (
-                                    f"**Employees with committed hours {min_hours} or more{count_text}:**\n" if min_hours is not None
-                                    else "**Employee Details:**\n"
-                                )
-                                # Override any previous message to avoid duplicate headers
-                                result_content = header_text
-                                for i, emp in enumerate(employees, 1):
-                                    # Robust name fallback chain
-                                    profile = emp.get('profile') or {}
-                                    name = (
-                                        emp.get('employee_name')
-                                        or profile.get('full_name')
-                                        or (f"{profile.get('first_name', '').strip()} {profile.get('last_name', '').strip()}".strip() if profile else None)
-                                        or emp.get('name')
-                                        or 'N/A'
-                                    )
-                                    if name in ('N/A', 'Unknown'):
-                                        try:
-                                            print(f"🔍 DEBUG: Missing employee_name. Profile first='{profile.get('first_name')}', last='{profile.get('last_name')}', full_name='{profile.get('full_name')}', raw_name_field='{emp.get('name')}'")
-                                        except Exception:
-                                            pass
-                                    result_content += f"{i}. **{name}** (ID: {emp.get('employee_id', 'N/A')})\n"
-                                    result_content += f"   - Employee Number: {emp.get('employee_number', 'N/A')}\n"
-                                    result_content += f"   - Job Title: {emp.get('job_title', 'N/A')}\n"
-                                    result_content += f"   - Department: {emp.get('department', 'N/A')}\n"
-                                    result_content += f"   - Employment Type: {emp.get('employment_type', 'N/A')}\n"
-                                    result_content += f"   - Status: {emp.get('full_time_part_time', 'N/A')}\n"
-                                    # Include committed hours explicitly
-                                    result_content += f"   - Committed Hours: {emp.get('committed_hours', 'N/A')}\n"
-                                    result_content += f"   - Rate: {emp.get('rate', 'N/A')} {emp.get('currency', 'USD')}\n"
-                                    result_content += f"   - Hire Date: {emp.get('hire_date', 'N/A')}\n"
-                                    
-                                    # Add profile information
-                                    if emp.get('profile'):
-                                        profile = emp['profile']
-                                        result_content += f"   - Email: {profile.get('email', 'N/A')}\n"
-                                        result_content += f"   - Phone: {profile.get('phone', 'N/A')}\n"
-                                    
-                                    # Add document information (compact spacing)
-                                    result_content += f"   - **Documents:**\n"
-                                    
-                                    # NDA Document (compact one-line)
-                                    nda_doc = emp.get('nda_document', {})
-                                    if nda_doc.get('has_document'):
-                                        filename = nda_doc.get('filename', 'N/A')
-                                        download_url = nda_doc.get('download_url')
-                                        uploaded = nda_doc.get('uploaded_at')
-                                        link_text = f"[{filename}]({download_url})" if download_url else filename
-                                        if uploaded:
-                                            result_content += f"     - NDA Document: {link_text} — Uploaded: {uploaded}\n"
-                                        else:
-                                            result_content += f"     - NDA Document: {link_text}\n"
-                                    else:
-                                        result_content += f"     - NDA Document: Not uploaded\n"
-                                    
-                                    # Contract Document (compact one-line)
-                                    contract_doc = emp.get('contract_document', {})
-                                    if contract_doc.get('has_document'):
-                                        filename = contract_doc.get('filename', 'N/A')
-                                        download_url = contract_doc.get('download_url')
-                                        uploaded = contract_doc.get('uploaded_at')
-                                        link_text = f"[{filename}]({download_url})" if download_url else filename
-                                        if uploaded:
-                                            result_content += f"     - Contract Document: {link_text} — Uploaded: {uploaded}\n"
-                                        else:
-                                            result_content += f"     - Contract Document: {link_text}\n"
-                                    else:
-                                        result_content += f"     - Contract Document: Not uploaded\n"
-                                    # Add a newline only between employees, not after the last one
-                                    if i < len(employees):
-                                        result_content += "\n"
-                    
-                    print(f"🔍 DEBUG: Tool executor - formatted message length: {len(result_content)}")
-                    print(f"🔍 DEBUG: Tool executor - message preview: {result_content[:200]}...")
-                    
-                    # Store current_workflow from tool result data if present
-                    if 'data' in output and isinstance(output['data'], dict) and 'current_workflow' in output['data']:
-                        state['data']['current_workflow'] = output['data']['current_workflow']
-                        print(f"🔍 DEBUG: Tool executor - stored current_workflow: {output['data']['current_workflow']}")
+    logger.debug("🔍 DEBUG: Tool executor - returning %s results", len(results))
+    return {"messages": results}
+
+
+async def _run_tool_call(planned_call: Dict[str, Any], state: AgentState,
+                         context: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Execute one planned tool call. Returns its tool message and the
+    state['data'] updates it makes; the caller applies those in call order.
+    """
+    tool_call_id = planned_call["tool_call_id"]
+    tool_name = planned_call["tool_name"]
+    arguments_str = planned_call["arguments_str"]
+    validated_tool_name = planned_call["validated_tool_name"]
+    validation_error = planned_call["validation_error"]
+    data_updates: Dict[str, Any] = {}
+
+    if tool_name not in TOOL_REGISTRY:
+        logger.debug("🔍 DEBUG: Tool executor - tool %s not in registry", tool_name)
+        result_content = json.dumps({"error": f"Tool '{tool_name}' not found in registry."})
+    else:
+        try:
+            # Tool selection was validated and corrected when the call was planned
+            if validation_error is not None:
+                raise validation_error
+            if validated_tool_name != tool_name:
+                logger.debug("🔍 DEBUG: Tool corrected from %s to %s", tool_name, validated_tool_name)
+                tool_name = validated_tool_name
+            else:
+                logger.debug("🔍 DEBUG: No tool correction needed")
+
+            tool_function = TOOL_REGISTRY[tool_name]
+            args = json.loads(arguments_str)
+
+
+            # TODO: CONFIRMATION FIX - Enhance context with extracted context from state['data'] and messages
+            enhanced_context = context.copy() if context else {}
+            if 'data' in state and state['data']:
+                enhanced_context.update(state['data'])
+
+            # Add conversation messages for confirmation detection
+            enhanced_context['messages'] = state.get('messages', [])
+            logger.debug("🔍 DEBUG: Tool executor - enhanced context has %s messages", len(enhanced_context.get('messages', [])))
+
+            args['context'] = enhanced_context
+
+            output = await _execute_tool(tool_name, tool_function, args, state, data_updates)
+
+            # Handle JSON serialization with Decimal support
+            def json_serializer(obj):
+                if hasattr(obj, '__dict__'):
+                    return obj.__dict__
+                elif hasattr(obj, '_asdict__'):  # namedtuple
+                    return obj._asdict()
+                elif hasattr(obj, 'isoformat'):  # datetime
+                    return obj.isoformat()
+                elif str(type(obj)) == "<class 'decimal.Decimal'>":
+                    return float(obj)
+                raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+            # Format the response as a user-friendly message instead of raw JSON
+            if isinstance(output, dict) and 'message' in output:
+                result_content = output['message']
+
+                # If there's data, include it in the result content
+                # (paged listings arrive already rendered, one page at a time)
+                if 'data' in output and output['data'] and 'page' not in output['data']:
+                    # For employee lists, format the data nicely
+                    if 'employees' in output['data']:
+                        employees = output['data']['employees']
+                        if employees:
+                            # Build a concise header. If min_hours present, reflect it and show count
+                            try:
+                                min_hours = output.get('data', {}).get('min_hours')
+                            except Exception:
+                                min_hours = None
+                            count_text = f" ({len(employees)} found)" if isinstance(employees, list) else ""
+                            header_text = (
+                                f"**Employees with committed hours {min_hours} or more{count_text}:**\n" if min_hours is not None
+                                else "**Employee Details:**\n"
+                            )
+                            # Override any previous message to avoid duplicate headers
+                            rendered = ListRenderer(max_items=len(employees), separator="\n\n").render(
+                                employees, format_employee_list_item
+                            )
+                            result_content = header_text + rendered.text + "\n"
+                            if rendered.rendered < len(employees):
+                                result_content += f"\n_...and {len(employees) - rendered.rendered} more employees not shown; narrow the request to see them._\n"
+
+                logger.debug("🔍 DEBUG: Tool executor - formatted message length: %s", len(result_content))
+                logger.debug("🔍 DEBUG: Tool executor - message preview: %s...", result_content[:200])
+
+                # Store current_workflow from tool result data if present
+                if 'data' in output and isinstance(output['data'], dict) and 'current_workflow' in output['data']:
+                    data_updates['current_workflow'] = output['data']['current_workflow']
+                    logger.debug("🔍 DEBUG: Tool executor - storing current_workflow: %s", output['data']['current_workflow'])
+
+                # Paged listings: keep the cursor so "show more" resumes where this page ended
+                if isinstance(output.get('data'), dict) and 'cursor' in output['data']:
+                    data_updates.update(_result_cursor_updates(state, output['data']['cursor']))
+            else:
+                result_content = json.dumps(output, default=json_serializer)
+                logger.debug("🔍 DEBUG: Tool executor - result content length: %s", len(result_content))
+
+            # 🔧 FIX: Check if we need to execute upload_contract_document after create_contract
+            has_file_info = bool(state.get('context', {}).get('file_info'))
+            original_request = state.get('data', {}).get('original_user_request', '')
+            user_wants_upload = 'upload' in original_request.lower()
+            logger.debug("🔧 FIX: Sequential execution check - tool: %s, has_file: %s, wants_upload: %s", tool_name, has_file_info, user_wants_upload)
+
+            if (tool_name == "create_contract" and 
+                has_file_info and
+                user_wants_upload):
+
+                logger.debug("🔧 FIX: Executing upload_contract_document after create_contract")
+
+                # Extract client name and contract ID from the create_contract result
+                client_name = args.get('client_name', 'Unknown')
+
+                # Get contract ID directly from the tool output data
+                contract_id = None
+                if hasattr(output, 'data') and output.data is not None:
+                    # Check multiple possible locations for contract_id
+                    data = output.data
+                    contract_id = (
+                        data.get('contract_id') or  # Direct contract_id
+                        data.get('contract', {}).get('contract_id') or  # Nested in contract
+                        data.get('operation') == 'create_contract' and data.get('contract', {}).get('contract_id')
+                    )
+                    logger.debug("🔧 FIX: Found contract ID %s from tool output data", contract_id)
+                elif isinstance(output, dict) and 'data' in output and output['data'] is not None:
+                    # Fallback for dict outputs
+                    data = output['data']
+                    contract_id = (
+                        data.get('contract_id') or  # Direct contract_id
+                        data.get('contract', {}).get('contract_id') or  # Nested in contract
+                        data.get('operation') == 'create_contract' and data.get('contract', {}).get('contract_id')
+                    )
+                    logger.debug("🔧 FIX: Found contract ID %s from tool output data (dict)", contract_id)
                 else:
-                    result_content = json.dumps(output, default=json_serializer)
-                    print(f"🔍 DEBUG: Tool executor - result content length: {len(result_content)}")
-                
-                # 🔧 FIX: Check if we need to execute upload_contract_document after create_contract
-                has_file_info = bool(state.get('context', {}).get('file_info'))
-                original_request = state.get('data', {}).get('original_user_request', '')
-                user_wants_upload = 'upload' in original_request.lower()
-                print(f"🔧 FIX: Sequential execution check - tool: {tool_name}, has_file: {has_file_info}, wants_upload: {user_wants_upload}")
-                
-                if (tool_name == "create_contract" and 
-                    has_file_info and
-                    user_wants_upload):
-                    
-                    print("🔧 FIX: Executing upload_contract_document after create_contract")
-                    
-                    # Extract client name and contract ID from the create_contract result
-                    client_name = args.get('client_name', 'Unknown')
-                    
-                    # Get contract ID directly from the tool output data
-                    contract_id = None
-                    if hasattr(output, 'data') and output.data is not None:
-                        # Check multiple possible locations for contract_id
-                        data = output.data
-                        contract_id = (
-                            data.get('contract_id') or  # Direct contract_id
-                            data.get('contract', {}).get('contract_id') or  # Nested in contract
-                            data.get('operation') == 'create_contract' and data.get('contract', {}).get('contract_id')
-                        )
-                        print(f"🔧 FIX: Found contract ID {contract_id} from tool output data")
-                    elif isinstance(output, dict) and 'data' in output and output['data'] is not None:
-                        # Fallback for dict outputs
-                        data = output['data']
-                        contract_id = (
-                            data.get('contract_id') or  # Direct contract_id
-                            data.get('contract', {}).get('contract_id') or  # Nested in contract
-                            data.get('operation') == 'create_contract' and data.get('contract', {}).get('contract_id')
-                        )
-                        print(f"🔧 FIX: Found contract ID {contract_id} from tool output data (dict)")
-                    else:
-                        print(f"🔧 FIX: No contract ID found in tool output data (output={output})")
-                    
-                    if contract_id:
-                        # Execute upload_contract_document with contract ID and actual file data
-                        file_info = state.get('context', {}).get('file_info', {})
-                        
-                        # Handle file reference (optimized approach)
-                        if file_info.get('file_ref_id'):
-                            from src.aiagents.services.file_cache import file_cache
-                            cached_file = file_cache.get_file(file_info['file_ref_id'])
-                            
-                            if cached_file:
-                                upload_args = {
-                                    'client_name': client_name,
-                                    'contract_id': int(contract_id),
-                                    'file_data': cached_file['file_data'],
-                                    'filename': cached_file['filename'],
-                                    'file_size': cached_file['file_size'],
-                                    'mime_type': cached_file['mime_type'],
-                                    'context': enhanced_context
-                                }
-                            else:
-                                print(f"🔧 FIX: File not found in cache, ref_id: {file_info['file_ref_id']}")
-                                result_content = f"{result_content}\n\nNote: File data not found - please try uploading again."
-                                continue
-                        else:
-                            # Fallback to old approach
+                    logger.debug("🔧 FIX: No contract ID found in tool output data (output=%s)", output)
+
+                if contract_id:
+                    # Execute upload_contract_document with contract ID and actual file data
+                    file_info = state.get('context', {}).get('file_info', {})
+
+                    # Handle file reference (optimized approach)
+                    if file_info.get('file_ref_id'):
+                        from src.aiagents.services.file_cache import file_cache
+                        cached_file = file_cache.get_file(file_info['file_ref_id'])
+
+                        if cached_file:
                             upload_args = {
                                 'client_name': client_name,
                                 'contract_id': int(contract_id),
-                                'file_data': file_info.get('file_data', ''),
-                                'filename': file_info.get('filename', ''),
-                                'file_size': file_info.get('file_size', 0),
-                                'mime_type': file_info.get('mime_type', ''),
+                                'file_data': cached_file['file_data'],
+                                'filename': cached_file['filename'],
+                                'file_size': cached_file['file_size'],
+                                'mime_type': cached_file['mime_type'],
                                 'context': enhanced_context
                             }
-                        
-                        print(f"🔧 FIX: Upload args - client: {client_name}, contract_id: {contract_id}, filename: {file_info.get('filename', '')}")
-                        
-                        try:
-                            upload_tool = TOOL_REGISTRY['upload_contract_document']
-                            upload_output = await upload_tool(**upload_args)
-                            
-                            # Combine the results
-                            if isinstance(upload_output, dict) and 'message' in upload_output:
-                                upload_message = upload_output['message']
-                                result_content = f"{result_content}\n\n{upload_message}"
-                                print(f"🔧 FIX: Combined result: {result_content[:200]}...")
-                            else:
-                                result_content = f"{result_content}\n\nDocument uploaded successfully."
-                                print(f"🔧 FIX: Added upload confirmation")
-                                
-                        except Exception as e:
-                            print(f"🔧 FIX: Upload failed: {e}")
-                            result_content = f"{result_content}\n\nNote: Document upload failed - {str(e)}"
+                        else:
+                            logger.debug("🔧 FIX: File not found in cache, ref_id: %s", file_info['file_ref_id'])
+                            result_content = f"{result_content}\n\nNote: File data not found - please try uploading again."
+                            # No tool message for this call (unchanged behaviour)
+                            return None, data_updates
                     else:
-                        print(f"🔧 FIX: Could not extract contract ID from tool output data")
-                        result_content = f"{result_content}\n\nNote: Could not upload document - contract ID not found in tool output"
+                        # Fallback to old approach
+                        upload_args = {
+                            'client_name': client_name,
+                            'contract_id': int(contract_id),
+                            'file_data': file_info.get('file_data', ''),
+                            'filename': file_info.get('filename', ''),
+                            'file_size': file_info.get('file_size', 0),
+                            'mime_type': file_info.get('mime_type', ''),
+                            'context': enhanced_context
+                        }
 
-            except Exception as e:
-                print(f"❌ Tool executor - error calling {tool_name}: {e}")
-                import traceback
-                print(f"❌ Tool executor - full traceback: {traceback.format_exc()}")
-                
-                # Handle JSON serialization with Decimal support for error cases too
-                def json_serializer(obj):
-                    if hasattr(obj, '__dict__'):
-                        return obj.__dict__
-                    elif hasattr(obj, '_asdict'):  # namedtuple
-                        return obj._asdict()
-                    elif hasattr(obj, 'isoformat'):  # datetime
-                        return obj.isoformat()
-                    elif str(type(obj)) == "<class 'decimal.Decimal'>":
-                        return float(obj)
-                    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-                
-                result_content = json.dumps({"error": str(e), "tool_name": tool_name}, default=json_serializer)
+                    logger.debug("🔧 FIX: Upload args - client: %s, contract_id: %s, filename: %s", client_name, contract_id, file_info.get('filename', ''))
 
-        results.append({
-            "tool_call_id": tool_call_id,
-            "role": "tool",
-            "name": tool_name,
-            "content": result_content,
-        })
+                    try:
+                        upload_tool = TOOL_REGISTRY['upload_contract_document']
+                        upload_output = await upload_tool(**upload_args)
+
+                        # Combine the results
+                        if isinstance(upload_output, dict) and 'message' in upload_output:
+                            upload_message = upload_output['message']
+                            result_content = f"{result_content}\n\n{upload_message}"
+                            logger.debug("🔧 FIX: Combined result: %s...", result_content[:200])
+                        else:
+                            result_content = f"{result_content}\n\nDocument uploaded successfully."
+                            logger.debug("🔧 FIX: Added upload confirmation")
 
-    print(f"🔍 DEBUG: Tool executor - returning {len(results)} results")
-    return {"messages": results}
+                    except Exception as e:
+                        logger.error("🔧 FIX: Upload failed: %s", e)
+                        result_content = f"{result_content}\n\nNote: Document upload failed - {str(e)}"
+                else:
+                    logger.debug("🔧 FIX: Could not extract contract ID from tool output data")
+                    result_content = f"{result_content}\n\nNote: Could not upload document - contract ID not found in tool output"
+
+        except Exception as e:
+            logger.error("❌ Tool executor - error calling %s: %s", tool_name, e)
+            import traceback
+            logger.error("❌ Tool executor - full traceback:", exc_info=True)
+
+            # Handle JSON serialization with Decimal support for error cases too
+            def json_serializer(obj):
+                if hasattr(obj, '__dict__'):
+                    return obj.__dict__
+                elif hasattr(obj, '_asdict'):  # namedtuple
+                    return obj._asdict()
+                elif hasattr(obj, 'isoformat'):  # datetime
+                    return obj.isoformat()
+                elif str(type(obj)) == "<class 'decimal.Decimal'>":
+                    return float(obj)
+                raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+            result_content = json.dumps({"error": str(e), "tool_name": tool_name}, default=json_serializer)
+
+    return {
+        "tool_call_id": tool_call_id,
+        "role": "tool",
+        "name": tool_name,
+        "content": result_content,
+    }, data_updates
 
 def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments: str = None) -> str:
     """Validate and correct tool selection based on current workflow."""
@@ -1750,17 +2022,17 @@ def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments:
         'delete_employee_document': ['delete_employee_document', 'search_employees', 'get_employee_details'],
         'delete_contract': ['delete_contract', 'delete_contract_document'],
         'delete_client': ['delete_client'],
-        'create': ['create_contract', 'create_client_and_contract', 'create_client', 'upload_contract_document', 'create_employee', 'create_employee_from_details'],
+        'create': ['create_contract', 'create_client_and_contract', 'create_client', 'upload_contract_document', 'create_employee', 'create_employee_from_details', 'create_deliverable', 'log_time_for_project'],
         'create_employee': ['create_employee', 'create_employee_from_details', 'upload_employee_document'],
         'create_contract': ['create_contract', 'create_client_and_contract'],
         'create_client': ['create_client'],
         'upload': ['get_client_contracts', 'upload_contract_document', 'upload_employee_document'],
         'upload_employee_document': ['upload_employee_document', 'search_employees', 'get_employee_details'],
         'upload_contract_document': ['upload_contract_document', 'get_client_contracts'],
-        'show': ['get_contracts_by_client', 'get_client_details', 'get_contract_details', 'search_employees', 'get_employee_details', 'get_all_employees', 'get_employees_by_committed_hours', 'search_profiles_by_name'],
+        'show': ['get_contracts_by_client', 'get_client_details', 'get_contract_details', 'search_employees', 'get_employee_details', 'get_all_employees', 'get_employees_by_committed_hours', 'search_profiles_by_name', 'get_client_deliverables', 'get_contract_deliverables', 'get_timesheet'],
         'search_employees': ['search_employees', 'get_employee_details', 'get_all_employees', 'get_employees_by_committed_hours'],
         'get_employees_by_committed_hours': ['get_employees_by_committed_hours', 'get_employee_details'],
-        'search': ['search_contracts', 'search_clients', 'search_employees', 'search_profiles_by_name'],
+        'search': ['search_contracts', 'search_clients', 'search_employees', 'search_profiles_by_name', 'search_deliverables', 'search_projects'],
         'get_contracts_by_amount': ['get_contracts_by_amount', 'get_contract_details', 'get_client_contracts']
     }
 
@@ -1772,25 +2044,29 @@ def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments:
         fallback_workflow = current_workflow.split('_')[0]
         allowed_tools = ALLOWED_TOOLS.get(fallback_workflow, [])
 
-    print(f"🔍 DEBUG: Tool validation - tool: {tool_name}, workflow: {current_workflow}, allowed: {allowed_tools}")
-    print(f"🔍 DEBUG: Tool validation - state data: {state.get('data', {})}")
+    logger.debug("🔍 DEBUG: Tool validation - tool: %s, workflow: %s, allowed: %s", tool_name, current_workflow, allowed_tools)
+    logger.debug("🔍 DEBUG: Tool validation - state data: %s", state.get('data', {}))
+
+    # Paging continues whichever listing came before, so it is never corrected
+    if tool_name == "show_more_results":
+        return tool_name
 
     # Note: create_contract tool will automatically retry with create_client_and_contract if client doesn't exist
 
     # PRIORITY TOOL CORRECTIONS: These should happen regardless of allowed tools list
     # Special case: if agent calls get_contract_details but should get contracts by amount
     if tool_name == "get_contract_details" and current_workflow == "get_contracts_by_amount":
-        print(f"🔍 DEBUG: Tool corrected from {tool_name} to get_contracts_by_amount (priority correction)")
+        logger.debug("🔍 DEBUG: Tool corrected from %s to get_contracts_by_amount (priority correction)", tool_name)
         return "get_contracts_by_amount"
     
     # Special case: if agent calls get_all_clients_with_contracts but should get contracts by amount
     if tool_name == "get_all_clients_with_contracts" and current_workflow == "get_contracts_by_amount":
-        print(f"🔍 DEBUG: Tool corrected from {tool_name} to get_contracts_by_amount (priority correction)")
+        logger.debug("🔍 DEBUG: Tool corrected from %s to get_contracts_by_amount (priority correction)", tool_name)
         return "get_contracts_by_amount"
     
     # Special case: if agent calls get_all_clients_with_contracts for any contract operation
     if tool_name == "get_all_clients_with_contracts" and 'contract' in current_workflow:
-        print(f"🔍 DEBUG: Tool corrected from {tool_name} to get_contracts_by_amount (contract operation correction)")
+        logger.debug("🔍 DEBUG: Tool corrected from %s to get_contracts_by_amount (contract operation correction)", tool_name)
         return "get_contracts_by_amount"
     
     # Special case: if agent calls get_all_clients_with_contracts and user message contains amount filtering
@@ -1798,8 +2074,8 @@ def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments:
     user_messages = [msg for msg in state.get('messages', []) if isinstance(msg, dict) and msg.get('role') == 'user']
     user_message = user_messages[-1].get('content', '') if user_messages else ''
     if tool_name == "get_all_clients_with_contracts" and user_message and 'amount' in user_message.lower() and ('more than' in user_message.lower() or 'greater than' in user_message.lower()):
-        print(f"🔍 DEBUG: Tool corrected from {tool_name} to get_contracts_by_amount (amount filtering correction)")
-        print(f"🔍 DEBUG: User message: {user_message}")
+        logger.debug("🔍 DEBUG: Tool corrected from %s to get_contracts_by_amount (amount filtering correction)", tool_name)
+        logger.debug("🔍 DEBUG: User message: %s", user_message)
         return "get_contracts_by_amount"
 
     # If tool is not in allowed list, correct it
@@ -1827,7 +2103,7 @@ def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments:
             corrected_tool = "create_employee_from_details"
         else:
             corrected_tool = allowed_tools[0]  # Use first allowed tool
-        print(f"🔍 DEBUG: Tool corrected from {tool_name} to {corrected_tool}")
+        logger.debug("🔍 DEBUG: Tool corrected from %s to %s", tool_name, corrected_tool)
         return corrected_tool
      
     
@@ -1836,7 +2112,7 @@ def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments:
     
     # CRITICAL: Check if agent is calling update_contract with employee parameters
     if tool_name == "update_contract" and state.get("data", {}).get("employee_name"):
-        print(f"🔍 DEBUG: Agent calling update_contract with employee_name - correcting to upload_employee_document")
+        logger.debug("🔍 DEBUG: Agent calling update_contract with employee_name - correcting to upload_employee_document")
         return "upload_employee_document"
     
     # CRITICAL: Check if agent is calling delete_contract with employee parameters
@@ -1845,7 +2121,7 @@ def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments:
         state.get("data", {}).get("current_workflow") == "delete_employee_document" or
         state.get("data", {}).get("employee_name")
     ):
-        print(f"🔍 DEBUG: Tool correction - delete_contract with employee parameters, correcting to delete_employee_document")
+        logger.debug("🔍 DEBUG: Tool correction - delete_contract with employee parameters, correcting to delete_employee_document")
         return "delete_employee_document"
     
     if tool_name == "update_contract" and not (state.get("data", {}).get("client_name") or state.get("data", {}).get("current_client")):
@@ -1853,29 +2129,29 @@ def validate_and_correct_tool(tool_name: str, state: AgentState, tool_arguments:
         user_operation = state.get("data", {}).get("user_operation", "")
         if user_operation and user_operation.startswith("update"):
             # This is a response to an update request, don't switch to search
-            print(f"🔍 DEBUG: Parameter correction - preserving {tool_name} for update operation response")
+            logger.debug("🔍 DEBUG: Parameter correction - preserving %s for update operation response", tool_name)
             return tool_name
         else:
             # If updating contract but no client specified, switch to search mode
-            print(f"🔍 DEBUG: Parameter correction - switching {tool_name} to search_contracts due to missing client_name")
-            print(f"🔍 DEBUG: State data for debugging: {state.get('data', {})}")
+            logger.debug("🔍 DEBUG: Parameter correction - switching %s to search_contracts due to missing client_name", tool_name)
+            logger.debug("🔍 DEBUG: State data for debugging: %s", state.get('data', {}))
             return "search_contracts"
     
     if tool_name == "upload_contract_document" and not state.get("data", {}).get("file_info"):
         # If uploading document but no file info, this could cause issues
-        print(f"🔍 DEBUG: Parameter correction - upload_contract_document missing file_info")
+        logger.debug("🔍 DEBUG: Parameter correction - upload_contract_document missing file_info")
         # Let it proceed but log the issue
     
     # WORKFLOW CONSISTENCY: Ensure tool selection matches user intent
     user_intent = state.get("data", {}).get("user_operation", "")
     if user_intent.startswith("create") and tool_name.startswith("update"):
         corrected_tool = "create_contract" if "contract" in user_intent else "create_client"
-        print(f"🔍 DEBUG: Workflow correction - changing {tool_name} to {corrected_tool} for {user_intent}")
+        logger.debug("🔍 DEBUG: Workflow correction - changing %s to %s for %s", tool_name, corrected_tool, user_intent)
         return corrected_tool
     
     if user_intent.startswith("update") and tool_name.startswith("create"):
         corrected_tool = "update_contract" if "contract" in user_intent else "update_client"
-        print(f"🔍 DEBUG: Workflow correction - changing {tool_name} to {corrected_tool} for {user_intent}")
+        logger.debug("🔍 DEBUG: Workflow correction - changing %s to %s for %s", tool_name, corrected_tool, user_intent)
         return corrected_tool
     
     return tool_name
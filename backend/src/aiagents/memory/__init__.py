@@ -5,8 +5,21 @@ Integrates with existing Redis session management.
 
 from .conversation_memory import ConversationMemoryManager
 from .context_manager import ContextManager
+from .context_window import ContextWindowManager, context_window_manager, count_tokens
+from .state_store import ConversationStateStore, ConversationTurn, SessionBusyError, conversation_state_store
+from .checkpointer import DeltaCheckpointSaver, graph_checkpointer, conversation_thread_id
 
 __all__ = [
     'ConversationMemoryManager',
-    'ContextManager'
+    'ContextManager',
+    'ContextWindowManager',
+    'context_window_manager',
+    'count_tokens',
+    'ConversationStateStore',
+    'ConversationTurn',
+    'SessionBusyError',
+    'conversation_state_store',
+    'DeltaCheckpointSaver',
+    'graph_checkpointer',
+    'conversation_thread_id'
 ]
@@ -0,0 +1,845 @@
+"""
+Persistent LangGraph checkpointer for chat conversations.
+
+Chat turns used to load the whole ``conversation_state`` from Redis, run the
+graph, then serialize and write everything back; a failed run was retried
+from scratch with a minimal state. The compiled workflow now checkpoints
+every step instead:
+- Per-step deltas keyed by thread id: a step only stores blobs for the
+  channels it changed; unchanged channels point at earlier blobs
+- ``data`` and ``context`` are mutated in place by nodes and routing edges,
+  so they are content-addressed and stored whenever their content changes
+- Pending writes of the successful tasks in a failed step are kept, so
+  ``ainvoke(None, config)`` resumes at the failed node
+- Writing merged values as a new checkpoint without running a node, for
+  turns that ran concurrently on one conversation (see state_store.py)
+- Retention: when a turn starts, only the latest GRAPH_CHECKPOINTS_PER_THREAD
+  checkpoints of the thread are kept, with their writes and the blobs they
+  still reference (the running turn's steps are never pruned)
+- Redis (default when REDIS_URL is set) and Postgres storage, with an
+  in-memory fallback for development and tests that evicts whole threads
+  idle for GRAPH_CHECKPOINT_TTL_SECONDS, or least recently used beyond
+  GRAPH_CHECKPOINT_MEMORY_THREADS
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    copy_checkpoint,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from sqlalchemy import text
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+from src.database.core.database import get_ai_db
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# (serializer type, payload) as produced by serde.dumps_typed
+TypedValue = Tuple[str, bytes]
+
+# Channels the graph mutates in place (state['data'][...] = ...) without
+# returning them from the node, so their version doesn't change
+MUTABLE_CHANNELS = ("data", "context")
+
+# Checkpoints kept per thread and namespace (older ones are pruned when a turn starts)
+CHECKPOINTS_PER_THREAD = int(os.getenv("GRAPH_CHECKPOINTS_PER_THREAD", "20"))
+
+# Runs as one Redis command, so no put on the thread lands between reading the
+# kept checkpoints' blob refs and deleting the blobs nothing references.
+# KEYS: index, blobs; ARGV: keep, checkpoint key prefix, writes key prefix
+PRUNE_SCRIPT = """
+local ids = redis.call('ZREVRANGEBYLEX', KEYS[1], '+', '-')
+local keep = tonumber(ARGV[1])
+if #ids <= keep then
+    return 0
+end
+local referenced = {}
+for i = 1, keep do
+    local raw = redis.call('HGET', ARGV[2] .. ids[i], 'blob_refs')
+    if raw then
+        for channel, blob_key in pairs(cjson.decode(raw)) do
+            referenced[channel .. '\\0' .. blob_key] = true
+        end
+    end
+end
+for i = keep + 1, #ids do
+    redis.call('ZREM', KEYS[1], ids[i])
+    redis.call('DEL', ARGV[2] .. ids[i], ARGV[3] .. ids[i])
+end
+for _, field in ipairs(redis.call('HKEYS', KEYS[2])) do
+    if not referenced[field] then
+        redis.call('HDEL', KEYS[2], field)
+    end
+end
+return #ids - keep
+"""
+
+
+@dataclass
+class StoredCheckpoint:
+    checkpoint_id: str
+    parent_checkpoint_id: Optional[str]
+    checkpoint: TypedValue
+    metadata: TypedValue
+    # Channel -> key of the blob holding its value at this checkpoint
+    blob_refs: Dict[str, str]
+
+
+@dataclass
+class StoredWrite:
+    task_id: str
+    idx: int
+    channel: str
+    value: TypedValue
+    task_path: str = ""
+
+
+def conversation_thread_id(session_id: str, user_id: str) -> str:
+    """Checkpoint thread for a chat session."""
+    return f"{session_id}:{user_id}"
+
+
+class CheckpointStorage:
+    """Storage backend for DeltaCheckpointSaver."""
+
+    name = "base"
+
+    async def put_checkpoint(self, thread_id: str, checkpoint_ns: str, record: StoredCheckpoint,
+                             blobs: Dict[Tuple[str, str], TypedValue]) -> None:
+        """Store new blobs (keyed by channel and blob key) and then the checkpoint."""
+        raise NotImplementedError
+
+    async def get_checkpoint(self, thread_id: str, checkpoint_ns: str,
+                             checkpoint_id: Optional[str] = None) -> Optional[StoredCheckpoint]:
+        """The given checkpoint, or the latest one if no id is given."""
+        raise NotImplementedError
+
+    async def list_checkpoints(self, thread_id: str, checkpoint_ns: str,
+                               before: Optional[str] = None) -> List[StoredCheckpoint]:
+        """Checkpoints newest first, optionally only those older than ``before``."""
+        raise NotImplementedError
+
+    async def namespaces(self, thread_id: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(thread_id, checkpoint_ns) pairs for one thread, or for all threads."""
+        raise NotImplementedError
+
+    async def get_blobs(self, thread_id: str, checkpoint_ns: str,
+                        blob_refs: Dict[str, str]) -> Dict[str, TypedValue]:
+        raise NotImplementedError
+
+    async def put_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str,
+                         writes: List[StoredWrite]) -> None:
+        """Store task writes; regular writes (idx >= 0) are never overwritten."""
+        raise NotImplementedError
+
+    async def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[StoredWrite]:
+        raise NotImplementedError
+
+    async def delete_thread(self, thread_id: str) -> None:
+        raise NotImplementedError
+
+    async def prune(self, thread_id: str, checkpoint_ns: str, keep: int) -> int:
+        """
+        Delete all but the newest ``keep`` checkpoints, their writes and the
+        blobs no kept checkpoint references. Returns the checkpoints deleted.
+        """
+        raise NotImplementedError
+
+
+class MemoryCheckpointStorage(CheckpointStorage):
+    """
+    Process-local storage (development, tests, Redis unavailable). Like the
+    Redis keys, a thread is dropped ``ttl_seconds`` after its last checkpoint;
+    beyond ``max_threads`` the least recently checkpointed one goes first.
+    """
+
+    name = "memory"
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_threads: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_threads = max_threads
+        self._checkpoints: Dict[Tuple[str, str], Dict[str, StoredCheckpoint]] = defaultdict(dict)
+        # (channel, blob key) -> blob, per thread and namespace
+        self._blobs: Dict[Tuple[str, str], Dict[Tuple[str, str], TypedValue]] = defaultdict(dict)
+        self._writes: Dict[Tuple[str, str, str], Dict[Tuple[str, int], StoredWrite]] = defaultdict(dict)
+        # Thread -> time of its last checkpoint, least recent first
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+
+    def _touch(self, thread_id: str):
+        """Mark the thread as just used and evict expired or surplus threads."""
+        now = time.monotonic()
+        self._last_used[thread_id] = now
+        self._last_used.move_to_end(thread_id)
+        for oldest, last_used in list(self._last_used.items()):
+            expired = self.ttl_seconds is not None and now - last_used > self.ttl_seconds
+            surplus = self.max_threads is not None and len(self._last_used) > self.max_threads
+            if oldest == thread_id or not (expired or surplus):
+                break
+            self._drop_thread(oldest)
+            logger.debug("🧹 CHECKPOINT: Evicted thread %s (%s)", oldest, "expired" if expired else "least recently used")
+
+    def _drop_thread(self, thread_id: str):
+        self._last_used.pop(thread_id, None)
+        for store in (self._checkpoints, self._blobs, self._writes):
+            for key in [key for key in store if key[0] == thread_id]:
+                del store[key]
+
+    async def put_checkpoint(self, thread_id, checkpoint_ns, record, blobs):
+        self._touch(thread_id)
+        stored_blobs = self._blobs[(thread_id, checkpoint_ns)]
+        for key, value in blobs.items():
+            stored_blobs.setdefault(key, value)
+        self._checkpoints[(thread_id, checkpoint_ns)][record.checkpoint_id] = record
+
+    async def get_checkpoint(self, thread_id, checkpoint_ns, checkpoint_id=None):
+        checkpoints = self._checkpoints.get((thread_id, checkpoint_ns))
+        if not checkpoints:
+            return None
+        return checkpoints.get(checkpoint_id or max(checkpoints))
+
+    async def list_checkpoints(self, thread_id, checkpoint_ns, before=None):
+        checkpoints = self._checkpoints.get((thread_id, checkpoint_ns), {})
+        return [
+            checkpoints[checkpoint_id]
+            for checkpoint_id in sorted(checkpoints, reverse=True)
+            if before is None or checkpoint_id < before
+        ]
+
+    async def namespaces(self, thread_id=None):
+        return [key for key in self._checkpoints if thread_id is None or key[0] == thread_id]
+
+    async def get_blobs(self, thread_id, checkpoint_ns, blob_refs):
+        stored_blobs = self._blobs.get((thread_id, checkpoint_ns), {})
+        return {
+            channel: stored_blobs[(channel, blob_key)]
+            for channel, blob_key in blob_refs.items()
+            if (channel, blob_key) in stored_blobs
+        }
+
+    async def put_writes(self, thread_id, checkpoint_ns, checkpoint_id, writes):
+        stored = self._writes[(thread_id, checkpoint_ns, checkpoint_id)]
+        for write in writes:
+            key = (write.task_id, write.idx)
+            if write.idx >= 0 and key in stored:
+                continue
+            stored[key] = write
+
+    async def get_writes(self, thread_id, checkpoint_ns, checkpoint_id):
+        return list(self._writes.get((thread_id, checkpoint_ns, checkpoint_id), {}).values())
+
+    async def delete_thread(self, thread_id):
+        self._drop_thread(thread_id)
+
+    async def prune(self, thread_id, checkpoint_ns, keep):
+        checkpoints = self._checkpoints.get((thread_id, checkpoint_ns), {})
+        stale = sorted(checkpoints, reverse=True)[keep:]
+        if not stale:
+            return 0
+        for checkpoint_id in stale:
+            del checkpoints[checkpoint_id]
+            self._writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        referenced = {
+            (channel, blob_key)
+            for record in checkpoints.values()
+            for channel, blob_key in record.blob_refs.items()
+        }
+        stored_blobs = self._blobs.get((thread_id, checkpoint_ns), {})
+        for key in [key for key in stored_blobs if key not in referenced]:
+            del stored_blobs[key]
+        return len(stale)
+
+
+def _pack(value: TypedValue) -> bytes:
+    return value[0].encode() + b"\x00" + value[1]
+
+
+def _unpack(raw: bytes) -> TypedValue:
+    type_, _, payload = raw.partition(b"\x00")
+    return type_.decode(), payload
+
+
+class RedisCheckpointStorage(CheckpointStorage):
+    """
+    Redis storage. Per thread and namespace:
+    - ``{prefix}:index:{thread}:{ns}``: sorted set of checkpoint ids (lexical order)
+    - ``{prefix}:checkpoint:{thread}:{ns}:{id}``: hash with the checkpoint record
+    - ``{prefix}:blobs:{thread}:{ns}``: hash of channel blobs, written once per key
+    - ``{prefix}:writes:{thread}:{ns}:{id}``: hash of pending task writes
+    - ``{prefix}:ns:{thread}``: set of namespaces
+    Every key expires ``ttl_seconds`` after the thread's last checkpoint.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl_seconds: int, prefix: str = "graph:ckpt"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._prune_script = client.register_script(PRUNE_SCRIPT)
+
+    def _key(self, kind: str, *parts: str) -> str:
+        return ":".join((self.prefix, kind, *parts))
+
+    def _record(self, checkpoint_id: str, raw: Dict[bytes, bytes]) -> Optional[StoredCheckpoint]:
+        if not raw:
+            return None
+        return StoredCheckpoint(
+            checkpoint_id=checkpoint_id,
+            parent_checkpoint_id=raw[b"parent"].decode() or None,
+            checkpoint=_unpack(raw[b"checkpoint"]),
+            metadata=_unpack(raw[b"metadata"]),
+            blob_refs=json.loads(raw[b"blob_refs"]),
+        )
+
+    async def put_checkpoint(self, thread_id, checkpoint_ns, record, blobs):
+        blobs_key = self._key("blobs", thread_id, checkpoint_ns)
+        checkpoint_key = self._key("checkpoint", thread_id, checkpoint_ns, record.checkpoint_id)
+        index_key = self._key("index", thread_id, checkpoint_ns)
+        ns_key = self._key("ns", thread_id)
+
+        pipe = self.client.pipeline(transaction=True)
+        for (channel, blob_key), value in blobs.items():
+            pipe.hsetnx(blobs_key, f"{channel}\x00{blob_key}", _pack(value))
+        pipe.hset(checkpoint_key, mapping={
+            "parent": record.parent_checkpoint_id or "",
+            "checkpoint": _pack(record.checkpoint),
+            "metadata": _pack(record.metadata),
+            "blob_refs": json.dumps(record.blob_refs),
+        })
+        pipe.zadd(index_key, {record.checkpoint_id: 0})
+        pipe.sadd(ns_key, checkpoint_ns)
+        for key in (blobs_key, checkpoint_key, index_key, ns_key):
+            pipe.expire(key, self.ttl_seconds)
+        await pipe.execute()
+
+    async def get_checkpoint(self, thread_id, checkpoint_ns, checkpoint_id=None):
+        if checkpoint_id is None:
+            latest = await self.client.zrevrangebylex(self._key("index", thread_id, checkpoint_ns), "+", "-", start=0, num=1)
+            if not latest:
+                return None
+            checkpoint_id = latest[0].decode()
+        raw = await self.client.hgetall(self._key("checkpoint", thread_id, checkpoint_ns, checkpoint_id))
+        return self._record(checkpoint_id, raw)
+
+    async def list_checkpoints(self, thread_id, checkpoint_ns, before=None):
+        index_key = self._key("index", thread_id, checkpoint_ns)
+        checkpoint_ids = [
+            checkpoint_id.decode()
+            for checkpoint_id in await self.client.zrevrangebylex(index_key, f"({before}" if before else "+", "-")
+        ]
+        pipe = self.client.pipeline(transaction=False)
+        for checkpoint_id in checkpoint_ids:
+            pipe.hgetall(self._key("checkpoint", thread_id, checkpoint_ns, checkpoint_id))
+        records = [self._record(checkpoint_id, raw) for checkpoint_id, raw in zip(checkpoint_ids, await pipe.execute())]
+        return [record for record in records if record]
+
+    async def namespaces(self, thread_id=None):
+        if thread_id is not None:
+            return [(thread_id, ns.decode()) for ns in await self.client.smembers(self._key("ns", thread_id))]
+        ns_prefix = self._key("ns", "")
+        pairs = []
+        async for key in self.client.scan_iter(match=f"{ns_prefix}*"):
+            thread = key.decode()[len(ns_prefix):]
+            pairs.extend(await self.namespaces(thread))
+        return pairs
+
+    async def get_blobs(self, thread_id, checkpoint_ns, blob_refs):
+        if not blob_refs:
+            return {}
+        channels = list(blob_refs)
+        raw_values = await self.client.hmget(
+            self._key("blobs", thread_id, checkpoint_ns),
+            [f"{channel}\x00{blob_refs[channel]}" for channel in channels]
+        )
+        return {channel: _unpack(raw) for channel, raw in zip(channels, raw_values) if raw is not None}
+
+    async def put_writes(self, thread_id, checkpoint_ns, checkpoint_id, writes):
+        writes_key = self._key("writes", thread_id, checkpoint_ns, checkpoint_id)
+        pipe = self.client.pipeline(transaction=True)
+        for write in writes:
+            field = f"{write.task_id}\x00{write.idx}"
+            header = json.dumps([write.channel, write.task_path]).encode()
+            value = header + b"\x00" + _pack(write.value)
+            if write.idx >= 0:
+                pipe.hsetnx(writes_key, field, value)
+            else:
+                pipe.hset(writes_key, field, value)
+        pipe.expire(writes_key, self.ttl_seconds)
+        await pipe.execute()
+
+    async def get_writes(self, thread_id, checkpoint_ns, checkpoint_id):
+        raw = await self.client.hgetall(self._key("writes", thread_id, checkpoint_ns, checkpoint_id))
+        writes = []
+        for field, value in raw.items():
+            task_id, _, idx = field.decode().rpartition("\x00")
+            header, _, packed = value.partition(b"\x00")
+            channel, task_path = json.loads(header)
+            writes.append(StoredWrite(task_id, int(idx), channel, _unpack(packed), task_path))
+        return writes
+
+    async def delete_thread(self, thread_id):
+        keys = [self._key("ns", thread_id)]
+        for _, checkpoint_ns in await self.namespaces(thread_id):
+            index_key = self._key("index", thread_id, checkpoint_ns)
+            for checkpoint_id in await self.client.zrange(index_key, 0, -1):
+                keys.append(self._key("checkpoint", thread_id, checkpoint_ns, checkpoint_id.decode()))
+                keys.append(self._key("writes", thread_id, checkpoint_ns, checkpoint_id.decode()))
+            keys.extend([index_key, self._key("blobs", thread_id, checkpoint_ns)])
+        await self.client.delete(*keys)
+
+    async def prune(self, thread_id, checkpoint_ns, keep):
+        # Atomic (PRUNE_SCRIPT): a concurrent put may reuse a blob the kept checkpoints don't reference yet
+        return int(await self._prune_script(
+            keys=[self._key("index", thread_id, checkpoint_ns), self._key("blobs", thread_id, checkpoint_ns)],
+            args=[keep, self._key("checkpoint", thread_id, checkpoint_ns, ""), self._key("writes", thread_id, checkpoint_ns, "")]
+        ))
+
+
+class PostgresCheckpointStorage(CheckpointStorage):
+    """
+    Postgres storage in the agent_checkpoints, agent_checkpoint_blobs and
+    agent_checkpoint_writes tables (src/database/SQLScripts/agent_checkpoints.sql).
+    """
+
+    name = "postgres"
+
+    _RECORD_COLUMNS = "checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint, metadata_type, metadata, blob_refs"
+
+    @staticmethod
+    def _record(row) -> StoredCheckpoint:
+        return StoredCheckpoint(
+            checkpoint_id=row.checkpoint_id,
+            parent_checkpoint_id=row.parent_checkpoint_id,
+            checkpoint=(row.checkpoint_type, bytes(row.checkpoint)),
+            metadata=(row.metadata_type, bytes(row.metadata)),
+            blob_refs=json.loads(row.blob_refs),
+        )
+
+    async def put_checkpoint(self, thread_id, checkpoint_ns, record, blobs):
+        async with get_ai_db() as session:
+            if blobs:
+                await session.execute(text("""
+                    INSERT INTO agent_checkpoint_blobs (thread_id, checkpoint_ns, channel, blob_key, type, blob)
+                    VALUES (:thread_id, :checkpoint_ns, :channel, :blob_key, :type, :blob)
+                    ON CONFLICT (thread_id, checkpoint_ns, channel, blob_key) DO NOTHING
+                """), [
+                    {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "channel": channel,
+                     "blob_key": blob_key, "type": value[0], "blob": value[1]}
+                    for (channel, blob_key), value in blobs.items()
+                ])
+            await session.execute(text("""
+                INSERT INTO agent_checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                                               checkpoint_type, checkpoint, metadata_type, metadata, blob_refs)
+                VALUES (:thread_id, :checkpoint_ns, :checkpoint_id, :parent_checkpoint_id,
+                        :checkpoint_type, :checkpoint, :metadata_type, :metadata, :blob_refs)
+                ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id) DO UPDATE SET
+                    checkpoint_type = EXCLUDED.checkpoint_type, checkpoint = EXCLUDED.checkpoint,
+                    metadata_type = EXCLUDED.metadata_type, metadata = EXCLUDED.metadata,
+                    blob_refs = EXCLUDED.blob_refs
+            """), {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": record.checkpoint_id, "parent_checkpoint_id": record.parent_checkpoint_id,
+                "checkpoint_type": record.checkpoint[0], "checkpoint": record.checkpoint[1],
+                "metadata_type": record.metadata[0], "metadata": record.metadata[1],
+                "blob_refs": json.dumps(record.blob_refs),
+            })
+
+    async def get_checkpoint(self, thread_id, checkpoint_ns, checkpoint_id=None):
+        condition = "AND checkpoint_id = :checkpoint_id" if checkpoint_id else ""
+        async with get_ai_db() as session:
+            result = await session.execute(text(f"""
+                SELECT {self._RECORD_COLUMNS} FROM agent_checkpoints
+                WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns {condition}
+                ORDER BY checkpoint_id DESC LIMIT 1
+            """), {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id})
+            row = result.first()
+        return self._record(row) if row else None
+
+    async def list_checkpoints(self, thread_id, checkpoint_ns, before=None):
+        condition = "AND checkpoint_id < :before" if before else ""
+        async with get_ai_db() as session:
+            result = await session.execute(text(f"""
+                SELECT {self._RECORD_COLUMNS} FROM agent_checkpoints
+                WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns {condition}
+                ORDER BY checkpoint_id DESC
+            """), {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "before": before})
+            return [self._record(row) for row in result]
+
+    async def namespaces(self, thread_id=None):
+        condition = "WHERE thread_id = :thread_id" if thread_id is not None else ""
+        async with get_ai_db() as session:
+            result = await session.execute(text(
+                f"SELECT DISTINCT thread_id, checkpoint_ns FROM agent_checkpoints {condition}"
+            ), {"thread_id": thread_id})
+            return [(row.thread_id, row.checkpoint_ns) for row in result]
+
+    async def get_blobs(self, thread_id, checkpoint_ns, blob_refs):
+        if not blob_refs:
+            return {}
+        async with get_ai_db() as session:
+            result = await session.execute(text("""
+                SELECT b.channel, b.type, b.blob
+                FROM agent_checkpoint_blobs b
+                JOIN unnest(CAST(:channels AS text[]), CAST(:blob_keys AS text[])) AS r(channel, blob_key)
+                  ON b.channel = r.channel AND b.blob_key = r.blob_key
+                WHERE b.thread_id = :thread_id AND b.checkpoint_ns = :checkpoint_ns
+            """), {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                "channels": list(blob_refs), "blob_keys": list(blob_refs.values()),
+            })
+            return {row.channel: (row.type, bytes(row.blob)) for row in result}
+
+    async def put_writes(self, thread_id, checkpoint_ns, checkpoint_id, writes):
+        if not writes:
+            return
+        params = [
+            {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id,
+             "task_id": write.task_id, "idx": write.idx, "channel": write.channel,
+             "type": write.value[0], "blob": write.value[1], "task_path": write.task_path}
+            for write in writes
+        ]
+        insert = """
+            INSERT INTO agent_checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx,
+                                                 channel, type, blob, task_path)
+            VALUES (:thread_id, :checkpoint_ns, :checkpoint_id, :task_id, :idx, :channel, :type, :blob, :task_path)
+            ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+        """
+        regular = [p for p in params if p["idx"] >= 0]
+        special = [p for p in params if p["idx"] < 0]
+        async with get_ai_db() as session:
+            if regular:
+                await session.execute(text(insert + " DO NOTHING"), regular)
+            if special:
+                await session.execute(text(
+                    insert + " DO UPDATE SET channel = EXCLUDED.channel, type = EXCLUDED.type, blob = EXCLUDED.blob"
+                ), special)
+
+    async def get_writes(self, thread_id, checkpoint_ns, checkpoint_id):
+        async with get_ai_db() as session:
+            result = await session.execute(text("""
+                SELECT task_id, idx, channel, type, blob, task_path FROM agent_checkpoint_writes
+                WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns AND checkpoint_id = :checkpoint_id
+            """), {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id})
+            return [
+                StoredWrite(row.task_id, row.idx, row.channel, (row.type, bytes(row.blob)), row.task_path)
+                for row in result
+            ]
+
+    async def delete_thread(self, thread_id):
+        async with get_ai_db() as session:
+            for table in ("agent_checkpoint_writes", "agent_checkpoint_blobs", "agent_checkpoints"):
+                await session.execute(text(f"DELETE FROM {table} WHERE thread_id = :thread_id"), {"thread_id": thread_id})
+
+    async def prune(self, thread_id, checkpoint_ns, keep):
+        params = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "keep": keep}
+        async with get_ai_db() as session:
+            result = await session.execute(text("""
+                WITH stale AS (
+                    SELECT checkpoint_id FROM agent_checkpoints
+                    WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns
+                    ORDER BY checkpoint_id DESC OFFSET :keep
+                ), deleted_writes AS (
+                    DELETE FROM agent_checkpoint_writes
+                    WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns
+                      AND checkpoint_id IN (SELECT checkpoint_id FROM stale)
+                )
+                DELETE FROM agent_checkpoints
+                WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns
+                  AND checkpoint_id IN (SELECT checkpoint_id FROM stale)
+            """), params)
+            if not result.rowcount:
+                return 0
+            await session.execute(text("""
+                DELETE FROM agent_checkpoint_blobs b
+                WHERE b.thread_id = :thread_id AND b.checkpoint_ns = :checkpoint_ns
+                  AND NOT EXISTS (
+                      SELECT 1 FROM agent_checkpoints c,
+                           jsonb_each_text(CAST(c.blob_refs AS jsonb)) AS r(channel, blob_key)
+                      WHERE c.thread_id = b.thread_id AND c.checkpoint_ns = b.checkpoint_ns
+                        AND r.channel = b.channel AND r.blob_key = b.blob_key
+                  )
+            """), params)
+            return result.rowcount
+
+
+class DeltaCheckpointSaver(BaseCheckpointSaver[str]):
+    """LangGraph checkpoint saver that writes only what each step changed."""
+
+    def __init__(
+        self,
+        storage: CheckpointStorage,
+        mutable_channels: Sequence[str] = MUTABLE_CHANNELS,
+        max_cached_threads: int = 1024,
+        max_checkpoints_per_thread: int = CHECKPOINTS_PER_THREAD
+    ):
+        # Pickle fallback for tool results that aren't msgpack-serializable
+        super().__init__(serde=JsonPlusSerializer(pickle_fallback=True))
+        self.storage = storage
+        self.mutable_channels = frozenset(mutable_channels)
+        self.max_cached_threads = max_cached_threads
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        # Latest (checkpoint id, blob refs) per thread, to skip rewriting unchanged mutable channels
+        self._latest_refs: "OrderedDict[Tuple[str, str], Tuple[str, Dict[str, str]]]" = OrderedDict()
+        self._stats = {
+            "checkpoints": 0,
+            "blobs_written": 0,
+            "blob_bytes_written": 0,
+            "channels_unchanged": 0,
+            "writes": 0,
+            "loads": 0,
+            "checkpoints_pruned": 0,
+        }
+
+    def _blob_key(self, channel: str, version: Any, value: Any) -> Tuple[str, Optional[TypedValue]]:
+        if channel in self.mutable_channels:
+            typed = self.serde.dumps_typed(value)
+            digest = hashlib.blake2b(typed[0].encode() + typed[1], digest_size=16).hexdigest()
+            return f"content.{digest}", typed
+        return str(version), None
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_checkpoint_id = config["configurable"].get("checkpoint_id")
+
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        cached_id, cached_refs = self._latest_refs.get((thread_id, checkpoint_ns), (None, {}))
+        parent_refs = cached_refs if cached_id == parent_checkpoint_id else {}
+
+        blob_refs: Dict[str, str] = {}
+        blobs: Dict[Tuple[str, str], TypedValue] = {}
+        for channel, version in c["channel_versions"].items():
+            if channel not in values:
+                continue
+            blob_key, typed = self._blob_key(channel, version, values[channel])
+            blob_refs[channel] = blob_key
+            if typed is not None:
+                if parent_refs.get(channel) != blob_key:
+                    blobs[(channel, blob_key)] = typed
+            elif channel in new_versions:
+                blobs[(channel, blob_key)] = self.serde.dumps_typed(values[channel])
+
+        record = StoredCheckpoint(
+            checkpoint_id=checkpoint["id"],
+            parent_checkpoint_id=parent_checkpoint_id,
+            checkpoint=self.serde.dumps_typed(c),
+            metadata=self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+            blob_refs=blob_refs,
+        )
+        await self.storage.put_checkpoint(thread_id, checkpoint_ns, record, blobs)
+        if metadata.get("source") == "input" and self.max_checkpoints_per_thread > 0:
+            # A new turn: the previous turns' steps are no longer needed for a resume
+            self._stats["checkpoints_pruned"] += await self.storage.prune(
+                thread_id, checkpoint_ns, self.max_checkpoints_per_thread
+            )
+
+        self._latest_refs[(thread_id, checkpoint_ns)] = (checkpoint["id"], blob_refs)
+        self._latest_refs.move_to_end((thread_id, checkpoint_ns))
+        while len(self._latest_refs) > self.max_cached_threads:
+            self._latest_refs.popitem(last=False)
+
+        self._stats["checkpoints"] += 1
+        self._stats["blobs_written"] += len(blobs)
+        self._stats["blob_bytes_written"] += sum(len(value[1]) for value in blobs.values())
+        self._stats["channels_unchanged"] += len(blob_refs) - len(blobs)
+        logger.debug("💾 CHECKPOINT: %s step %s stored %s of %s channels (%s)",
+                     thread_id, metadata.get("step"), len(blobs), len(blob_refs),
+                     ", ".join(channel for channel, _ in blobs) or "none")
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_values(self, config: RunnableConfig, values: Dict[str, Any]) -> RunnableConfig:
+        """
+        Store a checkpoint after the one ``config`` points at, with ``values``
+        replacing its channels. No node runs and none is scheduled.
+        """
+        parent = await self.aget_tuple(config)
+        if parent is None:
+            raise ValueError(f"No checkpoint to write values after: {config['configurable']}")
+
+        step = parent.metadata.get("step", -1) + 1
+        checkpoint = copy_checkpoint(parent.checkpoint)
+        checkpoint["id"] = str(uuid6(clock_seq=step))
+        checkpoint["ts"] = datetime.now(timezone.utc).isoformat()
+        new_versions: ChannelVersions = {}
+        for channel, value in values.items():
+            new_versions[channel] = self.get_next_version(checkpoint["channel_versions"].get(channel), None)
+            checkpoint["channel_versions"][channel] = new_versions[channel]
+            checkpoint["channel_values"][channel] = value
+        checkpoint["updated_channels"] = list(new_versions)
+
+        return await self.aput(parent.config | {"metadata": config.get("metadata", {})}, checkpoint,
+                               {"source": "update", "step": step, "parents": {}}, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        stored = [
+            StoredWrite(task_id, WRITES_IDX_MAP.get(channel, idx), channel, self.serde.dumps_typed(value), task_path)
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        await self.storage.put_writes(
+            config["configurable"]["thread_id"],
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"],
+            stored
+        )
+        self._stats["writes"] += len(stored)
+
+    async def _to_tuple(self, thread_id: str, checkpoint_ns: str, record: StoredCheckpoint,
+                        metadata: Optional[CheckpointMetadata] = None) -> CheckpointTuple:
+        blobs = await self.storage.get_blobs(thread_id, checkpoint_ns, record.blob_refs)
+        writes = await self.storage.get_writes(thread_id, checkpoint_ns, record.checkpoint_id)
+        writes.sort(key=lambda write: writes_sort_key(write.task_path, write.task_id, write.idx))
+        self._stats["loads"] += 1
+
+        checkpoint = self.serde.loads_typed(record.checkpoint)
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": record.checkpoint_id,
+            }},
+            checkpoint={
+                **checkpoint,
+                "channel_values": {channel: self.serde.loads_typed(value) for channel, value in blobs.items()},
+            },
+            metadata=metadata if metadata is not None else self.serde.loads_typed(record.metadata),
+            pending_writes=[(write.task_id, write.channel, self.serde.loads_typed(write.value)) for write in writes],
+            parent_config=(
+                {"configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": record.parent_checkpoint_id,
+                }}
+                if record.parent_checkpoint_id
+                else None
+            ),
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        record = await self.storage.get_checkpoint(thread_id, checkpoint_ns, get_checkpoint_id(config))
+        if record is None:
+            return None
+        return await self._to_tuple(thread_id, checkpoint_ns, record)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        configurable = (config or {}).get("configurable", {})
+        checkpoint_id = get_checkpoint_id(config) if config else None
+        before_id = get_checkpoint_id(before) if before else None
+
+        for thread_id, checkpoint_ns in await self.storage.namespaces(configurable.get("thread_id")):
+            if "checkpoint_ns" in configurable and checkpoint_ns != configurable["checkpoint_ns"]:
+                continue
+            for record in await self.storage.list_checkpoints(thread_id, checkpoint_ns, before_id):
+                if checkpoint_id and record.checkpoint_id != checkpoint_id:
+                    continue
+                metadata = self.serde.loads_typed(record.metadata)
+                if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+                if limit is not None:
+                    if limit <= 0:
+                        return
+                    limit -= 1
+                yield await self._to_tuple(thread_id, checkpoint_ns, record, metadata)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.storage.delete_thread(thread_id)
+        for key in [key for key in self._latest_refs if key[0] == thread_id]:
+            del self._latest_refs[key]
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        checkpoints = self._stats["checkpoints"]
+        return {
+            "backend": self.storage.name,
+            **self._stats,
+            "avg_blobs_per_checkpoint": self._stats["blobs_written"] / checkpoints if checkpoints else 0.0,
+        }
+
+
+def create_graph_checkpointer() -> DeltaCheckpointSaver:
+    """Checkpointer for the backend selected by GRAPH_CHECKPOINTER (redis, postgres or memory)."""
+    redis_url = os.getenv("REDIS_URL")
+    backend = os.getenv("GRAPH_CHECKPOINTER", "redis" if redis_url else "memory").lower()
+    ttl_seconds = int(os.getenv("GRAPH_CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600)))
+    storage: CheckpointStorage = None
+
+    if backend == "redis":
+        if REDIS_AVAILABLE and redis_url:
+            try:
+                storage = RedisCheckpointStorage(redis.from_url(redis_url), ttl_seconds=ttl_seconds)
+            except Exception as e:
+                logger.warning("Warning: Checkpoint Redis unavailable, using in-memory checkpoints: %s", e)
+        else:
+            logger.warning("Warning: REDIS_URL not set, using in-memory graph checkpoints")
+    elif backend == "postgres":
+        storage = PostgresCheckpointStorage()
+
+    return DeltaCheckpointSaver(storage or MemoryCheckpointStorage(
+        ttl_seconds=ttl_seconds, max_threads=int(os.getenv("GRAPH_CHECKPOINT_MEMORY_THREADS", "1000"))
+    ))
+
+
+# Global graph checkpointer
+graph_checkpointer = create_graph_checkpointer()
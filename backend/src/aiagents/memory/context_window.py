@@ -0,0 +1,385 @@
+"""
+Token-budgeted conversation window with rolling summarization.
+
+Keeps prompt size bounded no matter how long a conversation runs:
+- Local token counting (tiktoken when installed, character heuristic otherwise)
+- System prompt + most recent turns kept within a configurable budget; the
+  history always keeps a minimum share, so a large system prompt cannot crowd
+  out the current request
+- Older turns folded into a rolling summary computed off the request path
+- Summary cached in the session and reused on subsequent requests
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+from src.auth.session_manager import SessionManager
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+# Per-message framing overhead used by the chat completions format
+MESSAGE_TOKEN_OVERHEAD = 4
+SUMMARY_HEADER = "Earlier conversation summary:"
+
+
+def _load_encoding():
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
+
+_ENCODING = _load_encoding()
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Count tokens for a piece of text without calling the API."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    # ~4 characters per token for English text with the OpenAI tokenizers
+    return (len(text) + 3) // 4
+
+
+def _message_text(message: Any) -> str:
+    if isinstance(message, dict):
+        content = message.get("content", "")
+    else:
+        content = getattr(message, "content", str(message))
+    if content is None:
+        return ""
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+def _message_role(message: Any) -> str:
+    if isinstance(message, dict):
+        role = message.get("role") or message.get("type") or "user"
+    else:
+        role = getattr(message, "type", "user")
+    return {"human": "user", "ai": "assistant"}.get(role, role)
+
+
+def count_message_tokens(message: Any) -> int:
+    return count_tokens(_message_text(message)) + MESSAGE_TOKEN_OVERHEAD
+
+
+def message_fingerprint(message: Any) -> str:
+    raw = f"{_message_role(message)}|{_message_text(message)}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+class ContextWindowManager:
+    """
+    Keeps the prompt sent to the model within a fixed token budget.
+
+    The system prompt is always kept, followed by the newest turns that fit
+    in what the system prompt leaves of the budget (never less than
+    ``min_history_tokens``). The newest user message is always kept.
+    Turns that fall out of the window are folded into a rolling summary by a
+    background task; the summary is stored next to the chat session and the
+    folded turns are dropped from the conversation state on the next request.
+    """
+
+    def __init__(
+        self,
+        max_prompt_tokens: Optional[int] = None,
+        summary_max_tokens: Optional[int] = None,
+        max_message_tokens: Optional[int] = None,
+        min_history_tokens: Optional[int] = None,
+        recent_share: float = 0.6,
+        min_recent_messages: int = 4,
+        summarizer: Optional[Callable[[str, List[Dict[str, Any]]], Awaitable[str]]] = None
+    ):
+        # Sized from the real agent prompts: the client, contract and employee
+        # system prompts alone are 5.5k-6.3k tokens
+        self.max_prompt_tokens = max_prompt_tokens or int(os.getenv("CHAT_CONTEXT_MAX_TOKENS", "10000"))
+        self.min_history_tokens = min_history_tokens or int(
+            os.getenv("CHAT_CONTEXT_MIN_HISTORY_TOKENS", str(self.max_prompt_tokens // 3))
+        )
+        self.summary_max_tokens = summary_max_tokens or int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "500"))
+        self.max_message_tokens = max_message_tokens or int(os.getenv("CHAT_MESSAGE_MAX_TOKENS", "1500"))
+        self.recent_share = recent_share
+        self.min_recent_messages = min_recent_messages
+        self.summarizer = summarizer
+        self.session_manager = SessionManager()
+
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "windows_built": 0,
+            "messages_dropped": 0,
+            "messages_clipped": 0,
+            "summaries_scheduled": 0,
+            "summaries_stored": 0,
+            "messages_folded": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Prompt window
+    # ------------------------------------------------------------------
+
+    def fit_messages(
+        self,
+        prepared_messages: List[Dict[str, str]],
+        summary: str = ""
+    ) -> List[Dict[str, str]]:
+        """
+        Trim prepared OpenAI messages to the token budget.
+
+        Keeps the leading system message and as many of the newest messages
+        as fit. The newest user message and the newest message are always
+        kept (clipped if they alone exceed the history budget).
+        """
+        if not prepared_messages:
+            return prepared_messages
+
+        self._stats["windows_built"] += 1
+
+        system_message = None
+        history = list(prepared_messages)
+        if history[0].get("role") == "system":
+            system_message = dict(history.pop(0))
+
+        if system_message is not None and summary and summary not in system_message["content"]:
+            system_message["content"] += f"\n\n{SUMMARY_HEADER}\n{self._clip_text(summary, self.summary_max_tokens)}"
+
+        used = count_message_tokens(system_message) if system_message else 0
+        remaining = max(self.max_prompt_tokens - used, self.min_history_tokens)
+
+        # The request being answered is reserved before older turns compete for the budget
+        latest_user = next((i for i in range(len(history) - 1, -1, -1) if history[i].get("role") == "user"), None)
+        kept: Dict[int, Dict[str, str]] = {}
+        if latest_user is not None:
+            kept[latest_user] = self._fit_to(self._clip_message(history[latest_user]), remaining)
+            remaining -= count_message_tokens(kept[latest_user])
+
+        for index in range(len(history) - 1, -1, -1):
+            if index in kept:
+                continue
+            message = self._clip_message(history[index])
+            cost = count_message_tokens(message)
+            if cost > remaining:
+                if index == len(history) - 1 and remaining > MESSAGE_TOKEN_OVERHEAD:
+                    # Never drop the newest turn - clip it to what is left
+                    kept[index] = self._fit_to(message, remaining)
+                break
+            kept[index] = message
+            remaining -= cost
+
+        dropped = len(history) - len(kept)
+        if dropped:
+            self._stats["messages_dropped"] += dropped
+            logger.debug("🪟 CONTEXT WINDOW: Dropped %s older messages to stay within %s tokens", dropped, self.max_prompt_tokens)
+
+        window = [system_message] if system_message is not None else []
+        window.extend(kept[index] for index in sorted(kept))
+        return window
+
+    def _fit_to(self, message: Dict[str, str], max_tokens: int) -> Dict[str, str]:
+        """Clip a message so it costs at most ``max_tokens`` including framing."""
+        if count_message_tokens(message) <= max_tokens:
+            return message
+        self._stats["messages_clipped"] += 1
+        clipped = dict(message)
+        # One token of room for the ellipsis _clip_text appends
+        clipped["content"] = self._clip_text(message.get("content") or "", max_tokens - MESSAGE_TOKEN_OVERHEAD - 1)
+        return clipped
+
+    def _clip_message(self, message: Dict[str, str]) -> Dict[str, str]:
+        content = message.get("content") or ""
+        if count_tokens(content) <= self.max_message_tokens:
+            return message
+        self._stats["messages_clipped"] += 1
+        clipped = dict(message)
+        clipped["content"] = self._clip_text(content, self.max_message_tokens)
+        return clipped
+
+    @staticmethod
+    def _clip_text(text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        if count_tokens(text) <= max_tokens:
+            return text
+        if _ENCODING is not None:
+            return _ENCODING.decode(_ENCODING.encode(text)[:max_tokens]) + " …"
+        return text[:max_tokens * 4] + " …"
+
+    # ------------------------------------------------------------------
+    # Rolling summary
+    # ------------------------------------------------------------------
+
+    def plan_fold(self, messages: List[Any]) -> int:
+        """
+        Return how many leading messages should be folded into the summary.
+
+        Folding starts once the history no longer fits the prompt budget; the
+        newest turns (up to ``recent_share`` of the budget) stay verbatim and
+        the boundary is moved forward to a user turn so tool results are never
+        separated from the request that produced them.
+        """
+        total = sum(count_message_tokens(m) for m in messages)
+        if total <= self.max_prompt_tokens or len(messages) <= self.min_recent_messages:
+            return 0
+
+        recent_budget = int(self.max_prompt_tokens * self.recent_share)
+        tail_tokens = 0
+        boundary = len(messages)
+        for index in range(len(messages) - 1, -1, -1):
+            cost = count_message_tokens(messages[index])
+            in_minimum = len(messages) - index <= self.min_recent_messages
+            if not in_minimum and tail_tokens + cost > recent_budget:
+                break
+            tail_tokens += cost
+            boundary = index
+
+        while 0 < boundary < len(messages) and _message_role(messages[boundary]) != "user":
+            boundary += 1
+
+        return boundary if boundary < len(messages) else 0
+
+    async def build_summary(self, previous_summary: str, folded: List[Any]) -> str:
+        """Merge folded turns into the rolling summary."""
+        if self.summarizer is not None:
+            try:
+                summary = await self.summarizer(previous_summary, folded)
+                return self._clip_summary(summary)
+            except Exception as e:
+                logger.warning("⚠️ CONTEXT WINDOW: Custom summarizer failed, using extractive summary: %s", e)
+
+        lines = [line for line in (previous_summary or "").split("\n") if line.strip()]
+        for message in folded:
+            text = " ".join(_message_text(message).split())
+            if not text:
+                continue
+            role = _message_role(message)
+            if role == "tool":
+                label = f"Tool {message.get('name', 'result')}" if isinstance(message, dict) else "Tool"
+            else:
+                label = "User" if role == "user" else "Assistant"
+            if len(text) > 200:
+                text = text[:197] + "..."
+            lines.append(f"- {label}: {text}")
+        return self._clip_summary("\n".join(lines))
+
+    def _clip_summary(self, summary: str) -> str:
+        # Keep the newest lines when the summary outgrows its budget
+        lines = summary.split("\n")
+        while len(lines) > 1 and count_tokens("\n".join(lines)) > self.summary_max_tokens:
+            lines.pop(0)
+        return self._clip_text("\n".join(lines), self.summary_max_tokens)
+
+    def schedule_summarization(self, session_id: str, user_id: str, state: Dict[str, Any]) -> Optional[asyncio.Task]:
+        """
+        Fold older turns into the rolling summary in the background.
+
+        Called after the graph has produced its response so the summary work
+        never adds latency to the current request.
+        """
+        messages = state.get("messages") or []
+        fold_count = self.plan_fold(messages)
+        if not fold_count:
+            return None
+
+        key = f"{session_id}:{user_id}"
+        pending = self._pending.get(key)
+        if pending is not None and not pending.done():
+            return None
+
+        folded = [dict(m) if isinstance(m, dict) else m for m in messages[:fold_count]]
+        previous_summary = (state.get("memory") or {}).get("context_summary", "")
+        fingerprint = message_fingerprint(messages[fold_count - 1])
+
+        task = asyncio.create_task(
+            self._summarize_and_store(session_id, user_id, previous_summary, folded, fingerprint)
+        )
+        self._pending[key] = task
+        task.add_done_callback(lambda _t: self._pending.pop(key, None))
+        self._stats["summaries_scheduled"] += 1
+        return task
+
+    async def _summarize_and_store(
+        self,
+        session_id: str,
+        user_id: str,
+        previous_summary: str,
+        folded: List[Any],
+        fingerprint: str
+    ):
+        try:
+            summary = await self.build_summary(previous_summary, folded)
+            await self.session_manager.store_chat_summary(session_id, user_id, {
+                "summary": summary,
+                "folded_count": len(folded),
+                "boundary_fingerprint": fingerprint,
+                "updated_at": datetime.now().isoformat()
+            })
+            self._stats["summaries_stored"] += 1
+            logger.debug("🪟 CONTEXT WINDOW: Folded %s messages into rolling summary for session %s", len(folded), session_id)
+        except Exception as e:
+            logger.warning("⚠️ CONTEXT WINDOW: Failed to store rolling summary: %s", e)
+
+    async def apply_cached_summary(self, session_id: str, user_id: str, state: Dict[str, Any]) -> int:
+        """
+        Apply the cached rolling summary to a loaded conversation state.
+
+        Drops the folded messages and moves the summary into
+        ``state['memory']['context_summary']``. The record is only applied
+        when its boundary fingerprint still matches, so it is safe to call
+        on every request. Returns the number of messages removed.
+        """
+        record = await self.session_manager.get_chat_summary(session_id, user_id)
+        if not record:
+            return 0
+
+        memory = state.setdefault("memory", {})
+        if memory.get("context_summary") == record.get("summary"):
+            # Already applied on an earlier request
+            return 0
+
+        messages = state.get("messages") or []
+        fold_count = record.get("folded_count", 0)
+        if not 0 < fold_count <= len(messages):
+            return 0
+        if message_fingerprint(messages[fold_count - 1]) != record.get("boundary_fingerprint"):
+            return 0
+
+        state["messages"] = messages[fold_count:]
+        memory["context_summary"] = record.get("summary", "")
+        self._stats["messages_folded"] += fold_count
+        return fold_count
+
+    async def wait_for_pending(self):
+        """Wait for in-flight summary tasks (used by tests and shutdown)."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending.values()), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "tokenizer": "tiktoken" if _ENCODING is not None else "heuristic",
+            "pending_summaries": len(self._pending),
+        }
+
+
+# Global context window manager
+context_window_manager = ContextWindowManager()
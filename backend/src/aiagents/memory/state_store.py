@@ -0,0 +1,242 @@
+"""
+Versioned conversation state with optimistic concurrency control.
+
+Overlapping requests on the same chat session used to overwrite each other's
+turns. This store provides:
+- Per-session in-flight guard: concurrent turns queue (up to a timeout) and
+  are rejected after that, both within a worker and across workers; it fails
+  closed when Redis cannot be reached
+- Versioned compare-and-set of the conversation's head: each turn runs on a
+  branch of the checkpoint thread off the committed head checkpoint and
+  commits its last checkpoint only if the head's version is unchanged (Lua
+  script on Redis)
+- Merge-on-conflict for the append-only message list, so a turn that ran
+  alongside another (guard expired mid-turn) never drops either's messages
+- Loading the ``conversation_state`` stored before the graph was checkpointed
+"""
+
+import os
+import time
+import uuid
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+from src.auth.session_manager import SessionManager
+from src.aiagents.memory.checkpointer import DeltaCheckpointSaver, conversation_thread_id, graph_checkpointer
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+class SessionBusyError(Exception):
+    """Raised when another turn for the same session is still in flight."""
+
+
+@dataclass
+class ConversationTurn:
+    """One chat turn: a branch of the conversation's checkpoint thread."""
+    session_id: str
+    user_id: str
+    turn_id: str
+    # Committed checkpoint the turn branches from (None: latest of the thread) and the head version it had
+    base_checkpoint_id: Optional[str]
+    base_version: int
+    # Messages in the state the turn started from; the ones after are the turn's own
+    base_message_count: int = 0
+
+    @property
+    def thread_id(self) -> str:
+        return conversation_thread_id(self.session_id, self.user_id)
+
+    def config(self, checkpoint_id: Optional[str] = None) -> Dict[str, Any]:
+        """Graph config on the turn's branch, at ``checkpoint_id`` (default: the turn's base)."""
+        configurable = {"thread_id": self.thread_id}
+        checkpoint_id = checkpoint_id or self.base_checkpoint_id
+        if checkpoint_id:
+            configurable["checkpoint_id"] = checkpoint_id
+        # Tags every checkpoint the turn writes, see turn_tip()
+        return {"configurable": configurable, "metadata": {"turn_id": self.turn_id}}
+
+    def branch_from(self, snapshot) -> bool:
+        """
+        Branch from a loaded state snapshot: the committed head, or the latest
+        checkpoint of a thread from before heads were committed. Returns False
+        for a step of another turn that has not committed yet.
+        """
+        if self.base_checkpoint_id is None and snapshot.metadata.get("turn_id"):
+            return False
+        self.base_checkpoint_id = snapshot.config["configurable"]["checkpoint_id"]
+        return True
+
+
+class ConversationStateStore:
+    """Serializes chat turns per session and commits them with version checks."""
+
+    def __init__(
+        self,
+        wait_timeout_seconds: Optional[float] = None,
+        lock_ttl_seconds: Optional[float] = None,
+        max_merge_retries: int = 3,
+        poll_interval_seconds: float = 0.05,
+        checkpointer: Optional[DeltaCheckpointSaver] = None
+    ):
+        self.session_manager = SessionManager()
+        self.checkpointer = checkpointer or graph_checkpointer
+        self.wait_timeout_seconds = wait_timeout_seconds if wait_timeout_seconds is not None else float(os.getenv("CHAT_TURN_WAIT_SECONDS", "30"))
+        self.lock_ttl_seconds = lock_ttl_seconds if lock_ttl_seconds is not None else float(os.getenv("CHAT_TURN_LOCK_TTL_SECONDS", "120"))
+        self.max_merge_retries = max_merge_retries
+        self.poll_interval_seconds = poll_interval_seconds
+
+        # In-process queue per session so waiting turns don't spin on Redis
+        self._local_locks: Dict[str, asyncio.Lock] = {}
+        self._local_waiters: Dict[str, int] = {}
+
+        self._stats = {
+            "turns": 0,
+            "turns_queued": 0,
+            "turns_rejected": 0,
+            "writes": 0,
+            "write_conflicts": 0,
+            "merges": 0,
+        }
+
+    @asynccontextmanager
+    async def session_turn(self, session_id: str, user_id: str):
+        """
+        Hold the in-flight guard for one chat turn.
+
+        Raises SessionBusyError if the session is still busy (or Redis is
+        unreachable) after ``wait_timeout_seconds``. The guard only queues
+        turns; commit() is what keeps a turn that outlives its lock from
+        overwriting another.
+        """
+        key = f"{session_id}:{user_id}"
+        local_lock = self._local_locks.setdefault(key, asyncio.Lock())
+        self._local_waiters[key] = self._local_waiters.get(key, 0) + 1
+        deadline = time.monotonic() + self.wait_timeout_seconds
+        try:
+            if local_lock.locked():
+                self._stats["turns_queued"] += 1
+            try:
+                await asyncio.wait_for(local_lock.acquire(), timeout=self.wait_timeout_seconds)
+            except asyncio.TimeoutError:
+                self._stats["turns_rejected"] += 1
+                raise SessionBusyError(f"Session {session_id} is busy with another message")
+
+            try:
+                token = uuid.uuid4().hex
+                ttl_ms = int(self.lock_ttl_seconds * 1000)
+                while not await self.session_manager.acquire_chat_lock(session_id, user_id, token, ttl_ms):
+                    # Held by another worker
+                    if time.monotonic() >= deadline:
+                        self._stats["turns_rejected"] += 1
+                        raise SessionBusyError(f"Session {session_id} is busy with another message")
+                    await asyncio.sleep(self.poll_interval_seconds)
+
+                self._stats["turns"] += 1
+                try:
+                    yield
+                finally:
+                    await self.session_manager.release_chat_lock(session_id, user_id, token)
+            finally:
+                local_lock.release()
+        finally:
+            self._local_waiters[key] -= 1
+            if self._local_waiters[key] <= 0:
+                self._local_waiters.pop(key, None)
+                self._local_locks.pop(key, None)
+
+    async def begin_turn(self, session_id: str, user_id: str) -> ConversationTurn:
+        """Start a turn branching from the conversation's committed head."""
+        head_id, version = await self.session_manager.get_chat_head(session_id, user_id)
+        return ConversationTurn(session_id, user_id, uuid.uuid4().hex, head_id, version)
+
+    async def load(self, session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """The ``conversation_state`` stored before the graph was checkpointed, or None."""
+        chat_data = await self.session_manager.get_chat_session(session_id, user_id)
+        if chat_data and "conversation_state" in chat_data:
+            return chat_data["conversation_state"]
+        return None
+
+    async def turn_tip(self, turn: ConversationTurn) -> Optional[str]:
+        """Id of the last checkpoint the turn wrote, or None."""
+        async for checkpoint in self.checkpointer.alist(
+            {"configurable": {"thread_id": turn.thread_id}}, filter={"turn_id": turn.turn_id}, limit=1
+        ):
+            return checkpoint.config["configurable"]["checkpoint_id"]
+        return None
+
+    async def commit(self, turn: ConversationTurn, state: Dict[str, Any]) -> Optional[int]:
+        """
+        Make the turn's last checkpoint (holding ``state``) the conversation's
+        head if no other turn committed since the turn began.
+
+        On conflict this turn's new messages (everything after
+        ``base_message_count``) are appended to the latest head's, written as a
+        new checkpoint after it, and committed in turn. Returns the new
+        version, or None if all retries conflicted.
+        """
+        checkpoint_id = await self.turn_tip(turn)
+        if checkpoint_id is None:
+            logger.warning("⚠️ STATE STORE: Turn %s on session %s wrote no checkpoint", turn.turn_id, turn.session_id)
+            return None
+
+        base_version = turn.base_version
+        base_message_count = turn.base_message_count
+        for _ in range(self.max_merge_retries + 1):
+            new_version = await self.session_manager.set_chat_head_if_version(
+                turn.session_id, turn.user_id, checkpoint_id, base_version
+            )
+            if new_version is not None:
+                self._stats["writes"] += 1
+                return new_version
+
+            self._stats["write_conflicts"] += 1
+            head_id, head_version = await self.session_manager.get_chat_head(turn.session_id, turn.user_id)
+            head = await self.checkpointer.aget_tuple(turn.config(head_id)) if head_id else None
+            latest_state = head.checkpoint["channel_values"] if head else None
+            state = self.merge(latest_state, state, base_message_count)
+            if head:
+                merged_config = await self.checkpointer.aput_values(turn.config(head_id), state)
+                checkpoint_id = merged_config["configurable"]["checkpoint_id"]
+            logger.debug("🔀 STATE STORE: Version conflict on session %s (expected %s, found %s) - merged turn", turn.session_id, base_version, head_version)
+
+            base_message_count = len((latest_state or {}).get("messages", []))
+            base_version = head_version
+
+        logger.warning("⚠️ STATE STORE: Giving up on session %s after %s merge retries", turn.session_id, self.max_merge_retries)
+        return None
+
+    def merge(
+        self,
+        latest_state: Optional[Dict[str, Any]],
+        our_state: Dict[str, Any],
+        base_message_count: int
+    ) -> Dict[str, Any]:
+        """Append this turn's messages to the latest stored state; other fields come from this turn."""
+        if not latest_state:
+            return our_state
+
+        self._stats["merges"] += 1
+        our_messages = our_state.get("messages", [])
+        merged = dict(our_state)
+        merged["messages"] = list(latest_state.get("messages", [])) + list(our_messages[base_message_count:])
+
+        latest_context = latest_state.get("context") or {}
+        our_context = dict(our_state.get("context") or {})
+        # This turn happened after the latest stored one
+        our_context["interaction_count"] = max(
+            latest_context.get("interaction_count", 0) + 1,
+            our_context.get("interaction_count", 0)
+        )
+        merged["context"] = our_context
+        return merged
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "active_sessions": len(self._local_locks)}
+
+
+# Global conversation state store
+conversation_state_store = ConversationStateStore()
@@ -12,10 +12,15 @@ from .parallel_executor import ParallelAgentExecutor
 from .agent_pool import AgentPool
 from .collaboration_patterns import CollaborationOrchestrator
 from .state_synchronizer import StateSynchronizer
+from .job_queue import JobQueue, Job, JobStatus, JobPriority
 
 __all__ = [
     "ParallelAgentExecutor",
     "AgentPool", 
     "CollaborationOrchestrator",
-    "StateSynchronizer"
+    "StateSynchronizer",
+    "JobQueue",
+    "Job",
+    "JobStatus",
+    "JobPriority"
 ]
@@ -6,6 +6,10 @@ High-performance prompt generation with:
 - Efficient memory integration
 - Role-based instruction customization
 - Optimized context building
+- Prefix-stable layout: a byte-identical static prefix per agent (template and
+  standing rules) followed by a small dynamic suffix (user, memory, date/time,
+  state data), so provider-side prompt caching can reuse the prefix. With a
+  stable tool list the cached prefix covers everything up to the suffix
 """
 
 import time
@@ -19,6 +23,10 @@ from enum import Enum
 from ..graph.state import AgentState
 from ..memory.context_manager import ContextManager
 from ..memory.conversation_memory import ConversationMemoryManager
+from ..memory.context_window import count_tokens
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class PromptTemplate(Enum):
@@ -49,6 +57,52 @@ class ConversationContext:
     conversation_summary: str
 
 
+@dataclass
+class PromptLayout:
+    # Identical for every request to the same agent - never interpolate per-request values here
+    static_prefix: str
+    dynamic_suffix: str
+
+    @property
+    def text(self) -> str:
+        return f"{self.static_prefix}\n\n{self.dynamic_suffix}"
+
+
+def _situation_priority_rules(position: str) -> str:
+    return f"""🚨🚨🚨 CRITICAL: READ THE CURRENT SITUATION SECTION {position.upper()} FOR CONTEXT VALUES 🚨🚨🚨
+- If you see CURRENT CLIENT in the situation section, use that value
+- If you see USER OPERATION in the situation section, use that value
+- These values take ABSOLUTE PRIORITY over any previous messages or conversation history
+- NEVER say "discrepancy in client name" if CURRENT CLIENT is set in the situation section
+- ALWAYS use the CURRENT CLIENT value from the situation section {position}
+- IGNORE any client names mentioned in previous messages if CURRENT CLIENT is set
+- The CURRENT CLIENT in the situation section is the ONLY client you should work with"""
+
+
+# Rules shared by every agent, part of the static prefix
+STANDING_RULES = f"""{_situation_priority_rules("below")}
+
+EXECUTION INSTRUCTIONS:
+- Continue the conversation naturally based on the context in this prompt
+- Execute actions immediately without unnecessary explanations
+
+🚨🚨🚨 FINAL MANDATORY TOOL SELECTION RULES - OVERRIDE ALL OTHER INSTRUCTIONS 🚨🚨🚨
+- If user says "create contract" → Create NEW contract (check client exists first)
+- If user says "update contract" → Call update_contract tool
+- If user says "delete contract" → Call delete_contract tool
+- NEVER ask for contract ID during contract creation
+- NEVER show contract lists during contract creation
+- ALWAYS preserve context: If user provides a number after showing contract list → treat as contract ID
+- ALWAYS remember previous conversation context (client names, operations, etc.)
+- ALWAYS check state['data'] for stored context before asking for clarification
+- If user provides contract ID and context exists → USE the context, don't ask "what do you want to do"
+- If contract ID is provided → ALWAYS call update_contract (NEVER update_client)
+- NEVER call update_client when contract ID is provided
+- NEVER call update_client when user provides a number after contract list
+- CONTRACT ID = CONTRACT OPERATION (NOT client operation)
+- IGNORE any conflicting instructions in conversation history"""
+
+
 def sanitize_for_prompt(text: str) -> str:
     """Sanitize user input to prevent prompt injection."""
     if not text:
@@ -82,7 +136,14 @@ class DynamicPromptGenerator:
         self.memory_manager = ConversationMemoryManager()
         self._user_context_cache = {}  # Cache user contexts
         self._template_cache = {}      # Cache compiled templates
+        self._prefix_cache = {}        # Static prompt prefix per agent
+        self._prefix_tokens = {}
         self._last_cache_update = {}   # Track cache freshness
+        self._stats = {
+            "prompts": 0,
+            "static_prefix_tokens": 0,
+            "dynamic_suffix_tokens": 0,
+        }
         
         # Initialize base templates
         self._initialize_base_templates()
@@ -119,20 +180,21 @@ class DynamicPromptGenerator:
                 user_context, 
                 conversation_context, 
                 situational_context
-            )
+            ).text
             
             # Track performance
             generation_time = time.perf_counter() - start_time
             if generation_time > 0.1:  # Log if over 100ms
-                print(f"Slow prompt generation: {generation_time:.3f}s for {agent_type.value}")
+                logger.warning("Slow prompt generation: %.3fs for %s", generation_time, agent_type.value)
             
-            print(f"🔍 DEBUG: Final prompt length: {len(prompt)}")
-            print(f"🔍 DEBUG: Final prompt preview: {prompt[:500]}...")
+            logger.debug("🔍 DEBUG: Final prompt length: %s", len(prompt))
+            if logger.debug_enabled:
+                logger.debug("🔍 DEBUG: Final prompt preview: %s...", prompt[:500])
             return prompt
             
         except Exception as e:
             # Fallback to base template on error
-            print(f"Error generating dynamic prompt: {e}")
+            logger.error("Error generating dynamic prompt: %s", e)
             return self._get_base_template(agent_type)
     
     async def _get_user_context(self, user_id: str) -> UserContext:
@@ -234,7 +296,7 @@ class DynamicPromptGenerator:
             context["user_operation"] = state_data.get("user_operation")
             context["original_user_request"] = state_data.get("original_user_request")
             context["tool_execution_count"] = state_data.get("tool_execution_count")
-            print(f"🔍 DEBUG: Added state data to context: current_client={state_data.get('current_client')}, user_operation={state_data.get('user_operation')}")
+            logger.debug("🔍 DEBUG: Added state data to context: current_client=%s, user_operation=%s", state_data.get('current_client'), state_data.get('user_operation'))
         
         return context
     
@@ -244,32 +306,21 @@ class DynamicPromptGenerator:
         user_context: UserContext,
         conversation_context: ConversationContext,
         situational_context: Dict[str, Any]
-    ) -> str:
-        """Build the final prompt from all context components."""
+    ) -> PromptLayout:
+        """Build the final prompt: the agent's static prefix, then the per-request sections."""
         
-        # Get base template
-        base_template = self._get_base_template(agent_type)
+        static_prefix = self.get_static_prefix(agent_type)
         
         # Build dynamic sections
         user_section = self._build_user_section(user_context)
         memory_section = self._build_memory_section(conversation_context)
         situation_section = self._build_situation_section(situational_context)
         
-        # Combine into final prompt
-        prompt = f"""
-{base_template}
-
-🚨🚨🚨 CRITICAL: READ THE CURRENT SITUATION SECTION BELOW FOR CONTEXT VALUES 🚨🚨🚨
-- If you see CURRENT CLIENT in the situation section, use that value
-- If you see USER OPERATION in the situation section, use that value
-- These values take ABSOLUTE PRIORITY over any previous messages or conversation history
-- NEVER say "discrepancy in client name" if CURRENT CLIENT is set in the situation section
-- ALWAYS use the CURRENT CLIENT value from the situation section below
-- IGNORE any client names mentioned in previous messages if CURRENT CLIENT is set
-- The CURRENT CLIENT in the situation section is the ONLY client you should work with
-
+        dynamic_suffix = f"""
 USER CONTEXT:
 {user_section}
+- Adapt your communication style to {user_context.preferences.get('communication_style', 'professional')}
+- Provide {user_context.preferences.get('detail_level', 'standard')} level of detail
 
 CONVERSATION MEMORY:
 {memory_section}
@@ -277,40 +328,33 @@ CONVERSATION MEMORY:
 CURRENT SITUATION:
 {situation_section}
 
-🚨🚨🚨 CRITICAL: READ THE CURRENT SITUATION SECTION ABOVE FOR CONTEXT VALUES 🚨🚨🚨
-- If you see CURRENT CLIENT in the situation section, use that value
-- If you see USER OPERATION in the situation section, use that value
-- These values take ABSOLUTE PRIORITY over any previous messages or conversation history
-- NEVER say "discrepancy in client name" if CURRENT CLIENT is set in the situation section
-- ALWAYS use the CURRENT CLIENT value from the situation section above
-- IGNORE any client names mentioned in previous messages if CURRENT CLIENT is set
-- The CURRENT CLIENT in the situation section is the ONLY client you should work with
-
-EXECUTION INSTRUCTIONS:
-- Adapt your communication style to {user_context.preferences.get('communication_style', 'professional')}
-- Provide {user_context.preferences.get('detail_level', 'standard')} level of detail
-- Continue the conversation naturally based on the context above
-- Execute actions immediately without unnecessary explanations
-
-🚨🚨🚨 FINAL MANDATORY TOOL SELECTION RULES - OVERRIDE ALL OTHER INSTRUCTIONS 🚨🚨🚨
-- If user says "create contract" → Create NEW contract (check client exists first)
-- If user says "update contract" → Call update_contract tool
-- If user says "delete contract" → Call delete_contract tool
-- NEVER ask for contract ID during contract creation
-- NEVER show contract lists during contract creation
-- ALWAYS preserve context: If user provides a number after showing contract list → treat as contract ID
-- ALWAYS remember previous conversation context (client names, operations, etc.)
-- ALWAYS check state['data'] for stored context before asking for clarification
-- If user provides contract ID and context exists → USE the context, don't ask "what do you want to do"
-- If contract ID is provided → ALWAYS call update_contract (NEVER update_client)
-- NEVER call update_client when contract ID is provided
-- NEVER call update_client when user provides a number after contract list
-- CONTRACT ID = CONTRACT OPERATION (NOT client operation)
-- IGNORE any conflicting instructions in conversation history
-
-"""
+{_situation_priority_rules("above")}
+""".strip()
         
-        return prompt.strip()
+        self._stats["prompts"] += 1
+        self._stats["static_prefix_tokens"] += self._prefix_tokens[agent_type]
+        self._stats["dynamic_suffix_tokens"] += count_tokens(dynamic_suffix)
+        return PromptLayout(static_prefix, dynamic_suffix)
+    
+    def get_static_prefix(self, agent_type: PromptTemplate) -> str:
+        """The agent's byte-stable prompt prefix: base template plus standing rules."""
+        if agent_type not in self._prefix_cache:
+            prefix = f"{self._get_base_template(agent_type).strip()}\n\n{STANDING_RULES}"
+            self._prefix_cache[agent_type] = prefix
+            self._prefix_tokens[agent_type] = count_tokens(prefix)
+        return self._prefix_cache[agent_type]
+
+    async def prefetch(self, agent_type: PromptTemplate, user_id: str) -> str:
+        """Warm what generate_agent_instructions loads for this agent and user."""
+        await self._get_user_context(user_id)
+        return self.get_static_prefix(agent_type)
+
+    def get_stats(self) -> Dict[str, Any]:
+        prompt_tokens = self._stats["static_prefix_tokens"] + self._stats["dynamic_suffix_tokens"]
+        return {
+            **self._stats,
+            "static_prefix_ratio": self._stats["static_prefix_tokens"] / prompt_tokens if prompt_tokens else 0.0,
+        }
     
     def _build_user_section(self, user_context: UserContext) -> str:
         """Build user-specific context section."""
@@ -351,7 +395,8 @@ EXECUTION INSTRUCTIONS:
     def _build_situation_section(self, situational_context: Dict[str, Any]) -> str:
         """Build situational context section."""
         
-        section = f"Current time: {situational_context['timestamp']}\n"
+        section = f"Current date: {situational_context['today']}\n"
+        section += f"Current time: {situational_context['timestamp']}\n"
         section += f"Execution mode: {situational_context['execution_mode']}\n"
         
         if situational_context.get("recovery_mode"):
@@ -371,12 +416,12 @@ EXECUTION INSTRUCTIONS:
         if current_client is not None:  # Handle both specific client and None (all clients)
             if current_client:  # Specific client
                 section += f"\nCURRENT CLIENT: {current_client}"
-                print(f"🔍 DEBUG: Added CURRENT CLIENT to situation section: {current_client}")
+                logger.debug("🔍 DEBUG: Added CURRENT CLIENT to situation section: %s", current_client)
                 # Add explicit instruction for this specific client
                 section += f"\n🚨 CRITICAL: You MUST work with {current_client} ONLY. Do NOT use any other client names from conversation history."
             else:  # None means "all clients"
                 section += f"\nCURRENT CLIENT: ALL CLIENTS"
-                print(f"🔍 DEBUG: Added CURRENT CLIENT to situation section: ALL CLIENTS")
+                logger.debug("🔍 DEBUG: Added CURRENT CLIENT to situation section: ALL CLIENTS")
                 # Add explicit instruction for all clients
                 section += f"\n🚨 CRITICAL: You MUST work with ALL CLIENTS. Do NOT filter by any specific client name."
         if situational_context.get("current_workflow"):
@@ -385,13 +430,13 @@ EXECUTION INSTRUCTIONS:
             section += f"\nCURRENT CONTRACT ID: {situational_context['current_contract_id']}"
         if situational_context.get("user_operation"):
             section += f"\nUSER OPERATION: {situational_context['user_operation']}"
-            print(f"🔍 DEBUG: Added USER OPERATION to situation section: {situational_context['user_operation']}")
+            logger.debug("🔍 DEBUG: Added USER OPERATION to situation section: %s", situational_context['user_operation'])
         if situational_context.get("original_user_request"):
             section += f"\nORIGINAL REQUEST: {situational_context['original_user_request']}"
         if situational_context.get("tool_execution_count"):
             section += f"\nTOOL EXECUTION COUNT: {situational_context['tool_execution_count']}"
         
-        print(f"🔍 DEBUG: Final situation section: {section}")
+        logger.debug("🔍 DEBUG: Final situation section: %s", section)
         
         return section.strip()
     
@@ -420,11 +465,8 @@ EXECUTION INSTRUCTIONS:
     def _initialize_base_templates(self):
         """Initialize base templates for each agent type."""
         
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        
         self._template_cache[PromptTemplate.CLIENT_AGENT] = f"""
 You are Core, a specialist assistant focused on client management.
-Current date: {current_date}
 
 🔥🔥🔥 CRITICAL: CHECK USER OPERATION FIRST! 🔥🔥🔥
 BEFORE calling ANY tool, ALWAYS check the "USER OPERATION" in the CURRENT SITUATION section below.
@@ -782,7 +824,7 @@ IF USER SAYS "YES" AND ALL ABOVE ARE TRUE → CALL UPLOAD TOOL IMMEDIATELY!
 """
         
         self._template_cache[PromptTemplate.CONTRACT_AGENT] = f"""
-You are Core, an expert assistant for contract management. Current date: {current_date}
+You are Core, an expert assistant for contract management.
 
 🚨🚨🚨 CRITICAL: CLIENT CONTEXT PRIORITY 🚨🚨🚨
 - ALWAYS use the CURRENT CLIENT from the situation section above
@@ -1211,7 +1253,6 @@ Always use stored context before asking for clarification
         
         self._template_cache[PromptTemplate.EMPLOYEE_AGENT] = f"""
 You are Core, a human resources and employee management specialist.
-Current date: {current_date}
 
 🚨🚨🚨 EMPLOYEE AGENT - CRITICAL RULES 🚨🚨🚨
 - You ONLY handle EMPLOYEE operations - NEVER call contract tools
@@ -1532,7 +1573,6 @@ EXECUTION STYLE:
         # Add other agent templates...
         self._template_cache[PromptTemplate.DELIVERABLE_AGENT] = f"""
 You are Core, a project management assistant for deliverables.
-Current date: {current_date}
 
 CORE RESPONSIBILITIES:
 - Managing project deliverables
@@ -1555,7 +1595,6 @@ EXECUTION STYLE:
         
         self._template_cache[PromptTemplate.TIME_AGENT] = f"""
 You are Core, a time and productivity management specialist.
-Current date: {current_date}
 
 CORE RESPONSIBILITIES:
 - Logging time entries
@@ -1578,7 +1617,6 @@ EXECUTION STYLE:
         
         self._template_cache[PromptTemplate.USER_AGENT] = f"""
 You are Core, a user account management specialist.
-Current date: {current_date}
 
 CORE RESPONSIBILITIES:
 - Creating user accounts
@@ -1616,13 +1654,13 @@ async def get_dynamic_instructions(
     """
     Convenience function to get dynamic instructions for an agent.
     """
-    print(f"🔍 DEBUG: Generating dynamic instructions for {agent_type}")
-    print(f"🔍 DEBUG: State data: {state.get('data', {})}")
+    logger.debug("🔍 DEBUG: Generating dynamic instructions for %s", agent_type)
+    logger.debug("🔍 DEBUG: State data: %s", state.get('data', {}))
     
     instructions = await dynamic_prompt_generator.generate_agent_instructions(
         agent_type, state, execution_context
     )
     
-    print(f"🔍 DEBUG: Generated instructions length: {len(instructions)} characters")
+    logger.debug("🔍 DEBUG: Generated instructions length: %s characters", len(instructions))
     
     return instructions
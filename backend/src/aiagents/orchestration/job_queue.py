@@ -0,0 +1,361 @@
+"""
+Background Job Queue for Long-Running Agent Operations
+
+Lets the chat layer hand off slow tool executions instead of holding the HTTP
+request open:
+- Bounded worker concurrency with priorities (lower value runs first)
+- Retries with exponential backoff for transient failures
+- Cancellation of queued and running jobs
+- Finished jobs are dropped from memory after AGENT_JOB_RETENTION_SECONDS
+- Status/result mirrored to Redis (when REDIS_URL is set) so any API worker
+  can answer /api/jobs/{id}; execution itself stays in the submitting process
+"""
+
+import os
+import time
+import uuid
+import json
+import asyncio
+from enum import Enum, IntEnum
+from dataclasses import dataclass, field, asdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_final(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobPriority(IntEnum):
+    HIGH = 0
+    NORMAL = 5
+    LOW = 10
+
+
+@dataclass
+class Job:
+    job_id: str
+    name: str
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
+    priority: int = JobPriority.NORMAL
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_retries: int = 0
+    timeout: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["status"] = self.status.value
+        data["priority"] = int(self.priority)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        data = dict(data)
+        data["status"] = JobStatus(data["status"])
+        return cls(**data)
+
+
+class JobQueue:
+    """
+    In-process priority job queue with optional Redis-backed status.
+
+    Workers are started lazily on the running event loop the first time a
+    job is submitted (or explicitly via ``start()`` at application startup).
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        retry_backoff_seconds: float = 0.5,
+        result_ttl_seconds: int = 24 * 3600,
+        use_redis: bool = True,
+        finished_ttl_seconds: Optional[float] = None
+    ):
+        self.max_workers = max_workers or int(os.getenv("AGENT_JOB_WORKERS", "4"))
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        # How long this process keeps finished jobs; Redis keeps them for result_ttl_seconds
+        self.finished_ttl_seconds = (
+            finished_ttl_seconds if finished_ttl_seconds is not None
+            else float(os.getenv("AGENT_JOB_RETENTION_SECONDS", "3600"))
+        )
+
+        self._jobs: Dict[str, Job] = {}
+        self._funcs: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._running_tasks: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: set = set()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: list = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sequence = 0
+
+        self._redis_client = None
+        if use_redis and REDIS_AVAILABLE and os.getenv("REDIS_URL"):
+            try:
+                self._redis_client = redis.from_url(os.getenv("REDIS_URL"), decode_responses=True)
+            except Exception as e:
+                logger.warning("Warning: Job queue Redis unavailable, using in-memory status only: %s", e)
+                self._redis_client = None
+
+        self._stats = {
+            "submitted": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "retries": 0,
+            "evicted": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start worker tasks on the current event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+        # Re-queue jobs that were waiting on a previous loop (tests, reloads)
+        for job in self._jobs.values():
+            if job.status == JobStatus.QUEUED and job.job_id in self._funcs:
+                self._enqueue(job)
+                self._done_events[job.job_id] = asyncio.Event()
+
+    async def stop(self):
+        """Cancel workers; queued jobs stay queued."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def submit(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        priority: int = JobPriority.NORMAL,
+        max_retries: int = 0,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Job:
+        """Queue a coroutine factory and return its Job immediately."""
+        await self.start()
+        self._evict_finished()
+
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            name=name,
+            user_id=user_id,
+            session_id=session_id,
+            priority=int(priority),
+            max_retries=max_retries,
+            timeout=timeout,
+            metadata=metadata or {}
+        )
+        self._jobs[job.job_id] = job
+        self._funcs[job.job_id] = func
+        self._done_events[job.job_id] = asyncio.Event()
+        self._enqueue(job)
+        self._stats["submitted"] += 1
+        await self._persist(job)
+        logger.debug("📥 JOB QUEUE: Submitted %s as job %s (priority %s)", name, job.job_id, job.priority)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Return the job from this worker or, failing that, from Redis."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        if self._redis_client is None:
+            return None
+        try:
+            raw = await self._redis_client.get(self._key(job_id))
+            return Job.from_dict(json.loads(raw)) if raw else None
+        except Exception as e:
+            logger.warning("⚠️ JOB QUEUE: Failed to read job %s from Redis: %s", job_id, e)
+            return None
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Wait until the job is finished or the timeout expires; returns the job either way."""
+        event = self._done_events.get(job_id)
+        if event is not None and not event.is_set():
+            try:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return await self.get(job_id)
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if it already finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status.is_final:
+            return False
+
+        running_task = self._running_tasks.get(job_id)
+        if running_task is not None:
+            self._cancel_requested.add(job_id)
+            running_task.cancel()
+        else:
+            # Queued - the worker skips it when it is dequeued
+            await self._finish(job, JobStatus.CANCELLED, error="Cancelled before start")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "queued": sum(1 for job in self._jobs.values() if job.status == JobStatus.QUEUED),
+            "running": len(self._running_tasks),
+            "max_workers": self.max_workers,
+            "redis_backed": self._redis_client is not None,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _evict_finished(self):
+        cutoff = time.time() - self.finished_ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status.is_final and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._done_events.pop(job_id, None)
+        self._stats["evicted"] += len(expired)
+
+    def _enqueue(self, job: Job):
+        self._sequence += 1
+        self._queue.put_nowait((job.priority, self._sequence, job.job_id))
+
+    async def _worker(self, worker_index: int):
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != JobStatus.QUEUED:
+                    continue
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("❌ JOB QUEUE: Worker %s error on job %s: %s", worker_index, job_id, e)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        func = self._funcs[job.job_id]
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        await self._persist(job)
+
+        while True:
+            job.attempts += 1
+            task = asyncio.create_task(func())
+            self._running_tasks[job.job_id] = task
+            try:
+                if job.timeout:
+                    result = await asyncio.wait_for(task, timeout=job.timeout)
+                else:
+                    result = await task
+                await self._finish(job, JobStatus.SUCCEEDED, result=result)
+                return
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    # The worker itself is being stopped
+                    await self._finish(job, JobStatus.FAILED, error="Interrupted: job queue stopped")
+                    raise
+                if job.job_id in self._cancel_requested:
+                    await self._finish(job, JobStatus.CANCELLED, error="Cancelled while running")
+                else:
+                    await self._finish(job, JobStatus.FAILED, error="Job was cancelled internally")
+                return
+            except Exception as e:
+                error = "Timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                if job.attempts > job.max_retries:
+                    await self._finish(job, JobStatus.FAILED, error=error)
+                    return
+                self._stats["retries"] += 1
+                delay = self.retry_backoff_seconds * (2 ** (job.attempts - 1))
+                logger.warning("🔁 JOB QUEUE: Job %s failed (%s), retrying in %.1fs", job.job_id, error, delay)
+            finally:
+                self._running_tasks.pop(job.job_id, None)
+
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                await self._finish(job, JobStatus.FAILED, error="Interrupted: job queue stopped")
+                raise
+            if job.status.is_final:
+                # Cancelled during the backoff
+                return
+
+    async def _finish(self, job: Job, status: JobStatus, result: Any = None, error: Optional[str] = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        self._stats[status.value] += 1
+        self._funcs.pop(job.job_id, None)
+        self._cancel_requested.discard(job.job_id)
+        event = self._done_events.get(job.job_id)
+        if event is not None:
+            event.set()
+        await self._persist(job)
+        logger.debug("📤 JOB QUEUE: Job %s (%s) %s", job.job_id, job.name, status.value)
+
+    def _key(self, job_id: str) -> str:
+        return f"consultease:job:{job_id}"
+
+    async def _persist(self, job: Job):
+        if self._redis_client is None:
+            return
+        try:
+            await self._redis_client.setex(
+                self._key(job.job_id),
+                self.result_ttl_seconds,
+                json.dumps(job.to_dict(), default=str)
+            )
+        except Exception as e:
+            logger.warning("⚠️ JOB QUEUE: Failed to persist job %s: %s", job.job_id, e)
+
+
+# Global job queue
+job_queue = JobQueue()
@@ -6,16 +6,19 @@ High-performance components for minimal latency:
 - Performance metrics collection
 - Automatic optimization engine
 - Resource usage monitoring
+- In-process client name index
 """
 
 from .intelligent_cache import IntelligentCache, CacheManager
 from .metrics_collector import MetricsCollector, PerformanceTracker
 from .optimization_engine import OptimizationEngine
+from .client_name_index import ClientNameIndex
 
 __all__ = [
     "IntelligentCache",
     "CacheManager", 
     "MetricsCollector",
     "PerformanceTracker",
-    "OptimizationEngine"
+    "OptimizationEngine",
+    "ClientNameIndex"
 ]
@@ -27,6 +27,9 @@ from .employee_cache import (
     get_cached_profile_by_name
 )
 from .metrics_collector import record_timer, increment_counter
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 def cache_employee_result(
@@ -80,11 +83,11 @@ def cache_employee_result(
                                 increment_counter("employee_result_cached", 1)
                             except Exception as cache_error:
                                 # Log cache error but don't fail the operation
-                                print(f"Cache error (non-blocking): {cache_error}")
+                                logger.warning("Cache error (non-blocking): %s", cache_error)
                                 increment_counter("employee_result_cache_errors", 1)
                         else:
                             # Log when we can't cache due to missing keys
-                            print(f"Cannot cache employee data: missing employee_id and profile_id")
+                            logger.debug("Cannot cache employee data: missing employee_id and profile_id")
                             increment_counter("employee_result_cache_skipped", 1)
                 
                 return result
@@ -93,7 +96,7 @@ def cache_employee_result(
                 duration = (datetime.now() - start_time).total_seconds()
                 record_timer("cache_employee_result_decorator_error", duration)
                 increment_counter("employee_result_cache_errors", 1)
-                print(f"Error in cache_employee_result decorator: {e}")
+                logger.error("Error in cache_employee_result decorator: %s", e)
                 return await func(*args, **kwargs)  # Return original result on error
         
         return wrapper
@@ -173,7 +176,7 @@ def cache_search_results(
                             record_timer("cache_search_results_miss", duration)
                             increment_counter("search_cache_misses", 1)
                         except Exception as cache_error:
-                            print(f"Cache error (non-blocking): {cache_error}")
+                            logger.warning("Cache error (non-blocking): %s", cache_error)
                             increment_counter("search_cache_errors", 1)
                 
                 return result
@@ -182,7 +185,7 @@ def cache_search_results(
                 duration = (datetime.now() - start_time).total_seconds()
                 record_timer("cache_search_results_error", duration)
                 increment_counter("search_cache_errors", 1)
-                print(f"Error in cache_search_results decorator: {e}")
+                logger.error("Error in cache_search_results decorator: %s", e)
                 return await func(*args, **kwargs)  # Return original result on error
         
         return wrapper
@@ -233,7 +236,7 @@ def invalidate_cache_on_update(
                         increment_counter("cache_invalidations", 1)
                     else:
                         # Log when we can't invalidate due to missing employee_id
-                        print(f"Cannot invalidate cache: missing employee_id for {func.__name__}")
+                        logger.debug("Cannot invalidate cache: missing employee_id for %s", func.__name__)
                         increment_counter("cache_invalidation_skipped", 1)
                 
                 return result
@@ -242,7 +245,7 @@ def invalidate_cache_on_update(
                 duration = (datetime.now() - start_time).total_seconds()
                 record_timer("invalidate_cache_on_update_error", duration)
                 increment_counter("cache_invalidation_errors", 1)
-                print(f"Error in invalidate_cache_on_update decorator: {e}")
+                logger.error("Error in invalidate_cache_on_update decorator: %s", e)
                 return await func(*args, **kwargs)  # Return original result on error
         
         return wrapper
@@ -296,7 +299,7 @@ def cache_profile_lookup(cache_ttl: Optional[int] = None):
                             record_timer("cache_profile_lookup_miss", duration)
                             increment_counter("profile_cache_misses", 1)
                         except Exception as cache_error:
-                            print(f"Cache error (non-blocking): {cache_error}")
+                            logger.warning("Cache error (non-blocking): %s", cache_error)
                             increment_counter("profile_cache_errors", 1)
                 
                 return result
@@ -305,7 +308,7 @@ def cache_profile_lookup(cache_ttl: Optional[int] = None):
                 duration = (datetime.now() - start_time).total_seconds()
                 record_timer("cache_profile_lookup_error", duration)
                 increment_counter("profile_cache_errors", 1)
-                print(f"Error in cache_profile_lookup decorator: {e}")
+                logger.error("Error in cache_profile_lookup decorator: %s", e)
                 return await func(*args, **kwargs)  # Return original result on error
         
         return wrapper
@@ -368,7 +371,7 @@ def cache_employee_lookup(cache_ttl: Optional[int] = None):
                             record_timer("cache_employee_lookup_miss", duration)
                             increment_counter("employee_lookup_cache_misses", 1)
                         except Exception as cache_error:
-                            print(f"Cache error (non-blocking): {cache_error}")
+                            logger.warning("Cache error (non-blocking): %s", cache_error)
                             increment_counter("employee_lookup_cache_errors", 1)
                 
                 return result
@@ -377,7 +380,7 @@ def cache_employee_lookup(cache_ttl: Optional[int] = None):
                 duration = (datetime.now() - start_time).total_seconds()
                 record_timer("cache_employee_lookup_error", duration)
                 increment_counter("employee_lookup_cache_errors", 1)
-                print(f"Error in cache_employee_lookup decorator: {e}")
+                logger.error("Error in cache_employee_lookup decorator: %s", e)
                 return await func(*args, **kwargs)  # Return original result on error
         
         return wrapper
@@ -0,0 +1,173 @@
+"""
+Post-Commit Change Events
+
+Write-through invalidation for the in-process read caches:
+- Mutating tools and API routes publish a ChangeEvent (entity type, id,
+  action, changed fields) after their transaction commits
+- Each cache subscribes for the entity types it reads and evicts only the
+  entries a change can affect (an employee's keys, contract searches when a
+  searched field changes, agent responses that read the entity type)
+- Subscriber failures are logged and counted, never raised into the write
+- DependentKeyIndex tracks which IntelligentCache keys were read from which
+  entity types, for caches whose keys cannot be derived from an entity id
+
+Events only reach this process; the caches keep TTLs for writes made elsewhere.
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .intelligent_cache import cache_manager
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Entity types
+CLIENT = "client"
+CONTRACT = "contract"
+EMPLOYEE = "employee"
+
+# Actions
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Columns written by document uploads and deletes
+CONTRACT_DOCUMENT_FIELDS = (
+    "document_filename", "document_file_path", "document_bucket_name",
+    "document_file_size", "document_mime_type", "document_uploaded_at",
+)
+
+
+def employee_document_fields(document_type: str) -> Tuple[str, ...]:
+    """Columns written for an employee's "nda" or "contract" document"""
+    prefix = f"{document_type}_document"
+    return (f"{prefix}_filename", f"{prefix}_file_path", f"{prefix}_file_size",
+            f"{prefix}_mime_type", f"{prefix}_uploaded_at")
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One committed write to one entity"""
+    entity_type: str
+    entity_id: Any
+    action: str = UPDATED
+    # Columns the write changed; empty means unknown (treated as every column)
+    changed_fields: FrozenSet[str] = frozenset()
+    # Extra keys subscribers need to find dependent entries
+    # (client_name, client_id of a contract, profile_id, previous values, ...)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        object.__setattr__(self, "changed_fields", frozenset(self.changed_fields or ()))
+
+    def touches(self, fields: Iterable[str]) -> bool:
+        """Whether the write can affect a value read from ``fields``.
+
+        Creates and deletes always do, as do updates of unknown fields.
+        """
+        if self.action != UPDATED or not self.changed_fields:
+            return True
+        return not self.changed_fields.isdisjoint(fields)
+
+
+ChangeHandler = Callable[[ChangeEvent], Union[None, Awaitable[None]]]
+
+
+class ChangeEventBus:
+    """
+    Delivers committed changes to cache subscribers, in subscription order.
+
+    ``publish`` must only be called after the write's commit succeeded, so a
+    rolled-back write never evicts anything and a reader cannot re-cache the
+    old row after the eviction.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Tuple[Optional[FrozenSet[str]], ChangeHandler]] = []
+        self._stats = {"published": 0, "deliveries": 0, "errors": 0}
+
+    def subscribe(self, handler: ChangeHandler, entity_types: Optional[Iterable[str]] = None) -> ChangeHandler:
+        """Call ``handler`` (sync or async) for events of ``entity_types`` (all types if None)."""
+        types = frozenset(entity_types) if entity_types is not None else None
+        self._subscribers.append((types, handler))
+        return handler
+
+    def unsubscribe(self, handler: ChangeHandler):
+        self._subscribers = [(types, h) for types, h in self._subscribers if h is not handler]
+
+    async def publish(self, event: ChangeEvent):
+        self._stats["published"] += 1
+        logger.debug("📣 %s %s %s (fields: %s)", event.entity_type, event.entity_id, event.action,
+                     ", ".join(sorted(event.changed_fields)) or "all")
+        for types, handler in list(self._subscribers):
+            if types is not None and event.entity_type not in types:
+                continue
+            try:
+                result = handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                self._stats["deliveries"] += 1
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error("❌ Change event subscriber %s failed for %s %s: %s",
+                             getattr(handler, "__qualname__", handler), event.entity_type, event.entity_id, e)
+
+    async def emit(self, entity_type: str, entity_id: Any, action: str = UPDATED,
+                   changed_fields: Iterable[str] = (), **attributes):
+        """Shorthand for ``publish(ChangeEvent(...))``."""
+        await self.publish(ChangeEvent(entity_type, entity_id, action, frozenset(changed_fields), attributes))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "subscribers": len(self._subscribers)}
+
+
+class DependentKeyIndex:
+    """
+    IntelligentCache keys grouped by the entity types their values were read from.
+
+    For caches keyed by something other than an entity (a hashed prompt, a
+    search query): ``track`` each key as it is stored, and every change to one
+    of its entity types deletes it. Keys never tracked are left to their TTL.
+    """
+
+    def __init__(self, cache_name: str = "default", max_keys: int = 4096):
+        self.cache_name = cache_name
+        self.max_keys = max_keys
+        # key -> entity types, oldest first
+        self._keys: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+        self._stats = {"tracked": 0, "evicted": 0}
+
+    def track(self, key: str, entity_types: Iterable[str]):
+        types = frozenset(entity_types)
+        if not types:
+            return
+        self._keys[key] = types
+        self._keys.move_to_end(key)
+        self._stats["tracked"] += 1
+        while len(self._keys) > self.max_keys:
+            # Forgotten keys fall back to their TTL
+            self._keys.popitem(last=False)
+
+    def keys_for(self, entity_type: str) -> List[str]:
+        return [key for key, types in self._keys.items() if entity_type in types]
+
+    async def evict(self, event: ChangeEvent) -> int:
+        keys = self.keys_for(event.entity_type)
+        if not keys:
+            return 0
+        cache = cache_manager.get_cache(self.cache_name)
+        for key in keys:
+            await cache.delete(key)
+            del self._keys[key]
+        self._stats["evicted"] += len(keys)
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "keys": len(self._keys)}
+
+
+# Global instance
+change_events = ChangeEventBus()
@@ -0,0 +1,376 @@
+"""
+In-Process Client Name Index
+
+Answers "which client does this name refer to" without touching the database:
+- Normalized full names and derived aliases ("Acme Corp" -> "acme", "&" -> "and")
+- Token index for whole-word matches
+- Trigram index for substring (LIKE '%name%') and typo-tolerant similarity matches
+- Freshness via client change events plus a cheap version query
+  (row count, max id, max updated_at) against the clients table
+- The index is swapped atomically on reload; readers never see a partial build
+"""
+
+import os
+import re
+import time
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func
+
+from src.services.logging_service import get_logger
+from .change_events import CLIENT, DELETED, ChangeEvent, change_events
+
+logger = get_logger(__name__)
+
+# Trailing words dropped to form the short alias of a company name
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company",
+    "llc", "llp", "lp", "ltd", "limited", "plc", "gmbh",
+}
+
+# Match tiers, best first
+EXACT_SCORE = 1.0
+ALIAS_SCORE = 0.95
+PREFIX_SCORE = 0.9
+TOKEN_SCORE = 0.8
+SUBSTRING_SCORE = 0.7
+SIMILARITY_WEIGHT = 0.6
+
+
+@dataclass(frozen=True)
+class IndexedClient:
+    """Lightweight stand-in for a Client row (id and name only)."""
+    client_id: int
+    client_name: str
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, drop punctuation (keeping '&') and collapse whitespace."""
+    return " ".join(re.sub(r"[^0-9a-z&]+", " ", (name or "").lower()).split())
+
+
+def name_aliases(normalized: str) -> Set[str]:
+    """Alternative spellings a user is likely to type for a normalized name."""
+    aliases = set()
+    tokens = normalized.split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens = tokens[:-1]
+        aliases.add(" ".join(tokens))
+    for alias in list(aliases) + [normalized]:
+        if "&" in alias:
+            aliases.add(" ".join(alias.replace("&", " and ").split()))
+        if " and " in f" {alias} ":
+            aliases.add(" ".join(f" {alias} ".replace(" and ", " & ").split()))
+    aliases.discard(normalized)
+    return aliases
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def padded_trigrams(text: str) -> Set[str]:
+    """Trigrams with word-boundary padding, as used for similarity scoring."""
+    return trigrams(f"  {text} ")
+
+
+class _IndexSnapshot:
+    """Lookup structures for one load of the clients table (patched in place by local notifications)."""
+
+    def __init__(self, rows: Iterable[Tuple[int, str]]):
+        self.clients: Dict[int, IndexedClient] = {}
+        self.normalized: Dict[int, str] = {}
+        self.by_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_alias: Dict[str, List[int]] = defaultdict(list)
+        self.by_token: Dict[str, List[int]] = defaultdict(list)
+        self.by_trigram: Dict[str, List[int]] = defaultdict(list)
+        self.by_padded_trigram: Dict[str, List[int]] = defaultdict(list)
+        self.padded_counts: Dict[int, int] = {}
+
+        for client_id, client_name in rows:
+            self.add(client_id, client_name)
+
+    def add(self, client_id: int, client_name: str):
+        normalized = normalize_name(client_name)
+        if not normalized:
+            return
+        self.clients[client_id] = IndexedClient(client_id, client_name)
+        self.normalized[client_id] = normalized
+        self.by_name[normalized].append(client_id)
+        for alias in name_aliases(normalized):
+            self.by_alias[alias].append(client_id)
+        for token in set(normalized.split()):
+            self.by_token[token].append(client_id)
+        for gram in trigrams(normalized):
+            self.by_trigram[gram].append(client_id)
+        padded = padded_trigrams(normalized)
+        for gram in padded:
+            self.by_padded_trigram[gram].append(client_id)
+        self.padded_counts[client_id] = len(padded)
+
+    def remove(self, client_id: int):
+        # Postings keep the stale id; lookups skip ids that are no longer present
+        self.clients.pop(client_id, None)
+        self.normalized.pop(client_id, None)
+        self.padded_counts.pop(client_id, None)
+
+    def _live(self, ids: Iterable[int]) -> List[int]:
+        return list(dict.fromkeys(client_id for client_id in ids if client_id in self.clients))
+
+    def lookup(self, name: str, min_similarity: float, max_posting_scan: int) -> List[Tuple[float, IndexedClient]]:
+        query = normalize_name(name)
+        if not query:
+            return []
+
+        # Exact name or alias wins outright (same as the old exact-then-LIKE order)
+        # (ids are re-checked against the current name in case the client was renamed)
+        exact = [client_id for client_id in self._live(self.by_name.get(query, ())) if self.normalized[client_id] == query]
+        if exact:
+            return [(EXACT_SCORE, self.clients[client_id]) for client_id in exact]
+        alias = [client_id for client_id in self._live(self.by_alias.get(query, ())) if query in name_aliases(self.normalized[client_id])]
+        if alias:
+            return [(ALIAS_SCORE, self.clients[client_id]) for client_id in alias]
+
+        # Substring: candidates from the rarest trigram, verified against the name
+        query_tokens = set(query.split())
+        query_grams = trigrams(query)
+        if query_grams:
+            postings = [self.by_trigram.get(gram, ()) for gram in query_grams]
+            candidates = min(postings, key=len)
+        else:
+            candidates = self.by_token.get(query, ())
+
+        results: Dict[int, float] = {}
+        for client_id in self._live(candidates):
+            normalized = self.normalized[client_id]
+            if query not in normalized:
+                continue
+            if normalized.startswith(query):
+                results[client_id] = PREFIX_SCORE
+            elif query_tokens.issubset(normalized.split()):
+                results[client_id] = TOKEN_SCORE
+            else:
+                results[client_id] = SUBSTRING_SCORE
+        if results:
+            return [(score, self.clients[client_id]) for client_id, score in results.items()]
+
+        # Typo tolerance: trigram similarity over the rarer grams
+        query_padded = padded_trigrams(query)
+        shared: Dict[int, int] = defaultdict(int)
+        skipped = 0
+        for gram in query_padded:
+            posting = self.by_padded_trigram.get(gram, ())
+            if len(posting) > max_posting_scan:
+                skipped += 1
+                continue
+            for client_id in posting:
+                shared[client_id] += 1
+
+        for client_id, count in shared.items():
+            if client_id not in self.clients:
+                continue
+            # Upper bound, assuming every skipped common gram is shared too
+            upper = count + skipped
+            if upper / (len(query_padded) + self.padded_counts[client_id] - upper) < min_similarity:
+                continue
+            # Exact similarity for the few survivors (postings may hold a renamed client's old grams)
+            name_padded = padded_trigrams(self.normalized[client_id])
+            common = len(query_padded & name_padded)
+            similarity = common / len(query_padded | name_padded)
+            if similarity >= min_similarity:
+                results[client_id] = SIMILARITY_WEIGHT * similarity
+        return [(score, self.clients[client_id]) for client_id, score in results.items()]
+
+
+class ClientNameIndex:
+    """
+    Process-wide client name index with version-checked freshness.
+
+    ``ensure_fresh()`` loads the index on first use and re-checks the table
+    version at most every ``refresh_interval_seconds``; a miss forces a
+    version check (throttled by ``min_check_interval_seconds``) so newly
+    created clients are found without waiting for the interval.
+    """
+
+    def __init__(
+        self,
+        refresh_interval_seconds: Optional[float] = None,
+        min_check_interval_seconds: float = 1.0,
+        min_similarity: float = 0.5,
+        max_posting_scan: int = 5000,
+        enabled: Optional[bool] = None
+    ):
+        self.refresh_interval_seconds = refresh_interval_seconds if refresh_interval_seconds is not None else float(os.getenv("CLIENT_INDEX_REFRESH_SECONDS", "30"))
+        self.min_check_interval_seconds = min_check_interval_seconds
+        self.min_similarity = min_similarity
+        self.max_posting_scan = max_posting_scan
+        self.enabled = enabled if enabled is not None else os.getenv("CLIENT_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._version: Optional[Tuple[Any, ...]] = None
+        self._last_check = 0.0
+        self._lock = asyncio.Lock()
+
+        self._stats = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "version_checks": 0,
+            "notifications": 0,
+            "load_errors": 0,
+        }
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    # ------------------------------------------------------------------
+    # Loading and freshness
+    # ------------------------------------------------------------------
+
+    def build(self, rows: Iterable[Tuple[int, str]], version: Optional[Tuple[Any, ...]] = None):
+        """Replace the index with ``(client_id, client_name)`` rows."""
+        start = time.perf_counter()
+        snapshot = _IndexSnapshot(rows)
+        self._snapshot = snapshot
+        self._version = version
+        self._last_check = time.monotonic()
+        self._stats["loads"] += 1
+        logger.debug("📇 CLIENT INDEX: Indexed %s clients in %.0fms", len(snapshot.clients), (time.perf_counter() - start) * 1000)
+
+    async def _read_version(self, session) -> Tuple[Any, ...]:
+        from src.database.core.models import Client
+
+        self._stats["version_checks"] += 1
+        result = await session.execute(
+            select(func.count(Client.client_id), func.max(Client.client_id), func.max(Client.updated_at))
+        )
+        return tuple(result.one())
+
+    async def load(self) -> bool:
+        """Read every client name from the database and rebuild."""
+        from src.database.core.database import get_ai_db
+        from src.database.core.models import Client
+
+        try:
+            async with get_ai_db() as session:
+                version = await self._read_version(session)
+                result = await session.execute(select(Client.client_id, Client.client_name))
+                self.build(result.all(), version)
+            return True
+        except Exception as e:
+            self._stats["load_errors"] += 1
+            logger.warning("⚠️ CLIENT INDEX: Load failed: %s", e)
+            return False
+
+    async def ensure_fresh(self, force: bool = False) -> bool:
+        """
+        Load or refresh the index if needed; returns whether a usable index exists.
+        """
+        if not self.enabled:
+            return False
+
+        interval = self.min_check_interval_seconds if force else self.refresh_interval_seconds
+        if self._snapshot is not None and time.monotonic() - self._last_check < interval:
+            return True
+
+        async with self._lock:
+            # Another coroutine may have refreshed while we waited
+            if self._snapshot is not None and time.monotonic() - self._last_check < interval:
+                return True
+            if self._snapshot is None:
+                return await self.load()
+
+            from src.database.core.database import get_ai_db
+            try:
+                async with get_ai_db() as session:
+                    version = await self._read_version(session)
+                self._last_check = time.monotonic()
+                if version != self._version:
+                    logger.debug("📇 CLIENT INDEX: Clients table changed (%s -> %s), reloading", self._version, version)
+                    return await self.load()
+            except Exception as e:
+                self._stats["load_errors"] += 1
+                logger.warning("⚠️ CLIENT INDEX: Version check failed, serving current index: %s", e)
+            return True
+
+    # ------------------------------------------------------------------
+    # Change notifications (writes made by this process)
+    # ------------------------------------------------------------------
+
+    def upsert(self, client_id: int, client_name: str):
+        if self._snapshot is None:
+            return
+        self._stats["notifications"] += 1
+        self._snapshot.remove(client_id)
+        self._snapshot.add(client_id, client_name)
+
+    def remove(self, client_id: int):
+        if self._snapshot is None:
+            return
+        self._stats["notifications"] += 1
+        self._snapshot.remove(client_id)
+
+    def invalidate(self):
+        """Force a version check on the next lookup."""
+        self._last_check = 0.0
+
+    def on_change(self, event: ChangeEvent):
+        """Change event subscriber for clients."""
+        if event.action == DELETED:
+            self.remove(event.entity_id)
+        elif not event.touches({"client_name"}):
+            return
+        elif event.attributes.get("client_name"):
+            self.upsert(event.entity_id, event.attributes["client_name"])
+        else:
+            self.invalidate()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def match(self, names: Iterable[str]) -> List[IndexedClient]:
+        """
+        Clients matching any of the candidate names, best match first.
+
+        Returns [] on a miss (or when the index is not loaded).
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+
+        self._stats["lookups"] += 1
+        best: Dict[int, float] = {}
+        for name in names:
+            for score, client in snapshot.lookup(name, self.min_similarity, self.max_posting_scan):
+                if score > best.get(client.client_id, 0.0):
+                    best[client.client_id] = score
+
+        if not best:
+            self._stats["misses"] += 1
+            return []
+        self._stats["hits"] += 1
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (-item[1], len(snapshot.clients[item[0]].client_name), item[0])
+        )
+        return [snapshot.clients[client_id] for client_id, _ in ranked]
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["lookups"]
+        return {
+            **self._stats,
+            "clients": len(self._snapshot.clients) if self._snapshot else 0,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            "version": [str(part) for part in self._version] if self._version else None,
+        }
+
+
+# Global client name index
+client_name_index = ClientNameIndex()
+change_events.subscribe(client_name_index.on_change, (CLIENT,))
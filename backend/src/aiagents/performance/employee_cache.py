@@ -5,16 +5,22 @@ Extends the intelligent cache system for Employee CRUD operations:
 - Employee search result caching
 - Profile lookup caching
 - Employee CRUD operation caching
-- Cache invalidation strategies
+- Cache invalidation strategies: employee change events evict the changed
+  employee's keys and every cached search/list, so the TTLs can be long
 """
 
 import hashlib
 import json
+import os
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timedelta
 
 from .intelligent_cache import IntelligentCache, CacheLevel, cache_manager
 from .metrics_collector import metrics_collector, record_timer, increment_counter
+from .change_events import EMPLOYEE, ChangeEvent, change_events
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class EmployeeCacheKeys:
@@ -68,9 +74,11 @@ class EmployeeCacheManager:
     
     def __init__(self):
         self.cache = cache_manager.get_cache("employee")
-        self.default_ttl = 300  # 5 minutes
-        self.search_ttl = 180   # 3 minutes for search results
-        self.profile_ttl = 600  # 10 minutes for profiles
+        self.default_ttl = int(os.getenv("EMPLOYEE_CACHE_TTL_SECONDS", "300"))           # 5 minutes
+        self.search_ttl = int(os.getenv("EMPLOYEE_SEARCH_CACHE_TTL_SECONDS", "180"))     # 3 minutes for search results
+        self.profile_ttl = int(os.getenv("EMPLOYEE_PROFILE_CACHE_TTL_SECONDS", "600"))   # 10 minutes for profiles
+        # Search/list keys are query hashes; remembered so a change can evict them
+        self._list_keys: set = set()
     
     async def cache_employee(self, employee_data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
         """Cache employee data with multiple keys for different access patterns"""
@@ -108,7 +116,7 @@ class EmployeeCacheManager:
                 
                 return True
             elif not employee_id:
-                print(f"Cannot cache employee data: missing both employee_id and profile_id")
+                logger.debug("Cannot cache employee data: missing both employee_id and profile_id")
                 return False
             
             effective_ttl = ttl or self.default_ttl
@@ -146,7 +154,7 @@ class EmployeeCacheManager:
             return True
             
         except Exception as e:
-            print(f"Error caching employee: {e}")
+            logger.error("Error caching employee: %s", e)
             increment_counter("employee_cache_errors", 1)
             return False
     
@@ -168,7 +176,7 @@ class EmployeeCacheManager:
             return result
             
         except Exception as e:
-            print(f"Error getting employee from cache: {e}")
+            logger.error("Error getting employee from cache: %s", e)
             increment_counter("employee_cache_errors", 1)
             return None
     
@@ -190,7 +198,7 @@ class EmployeeCacheManager:
             return result
             
         except Exception as e:
-            print(f"Error getting employee from cache: {e}")
+            logger.error("Error getting employee from cache: %s", e)
             increment_counter("employee_cache_errors", 1)
             return None
     
@@ -212,7 +220,7 @@ class EmployeeCacheManager:
             return result
             
         except Exception as e:
-            print(f"Error getting employee from cache: {e}")
+            logger.error("Error getting employee from cache: %s", e)
             increment_counter("employee_cache_errors", 1)
             return None
     
@@ -227,12 +235,9 @@ class EmployeeCacheManager:
             
             effective_ttl = ttl or self.search_ttl
             
-            await self.cache.set(
-                EmployeeCacheKeys.employee_search(query_hash),
-                results,
-                effective_ttl,
-                CacheLevel.L1_MEMORY
-            )
+            key = EmployeeCacheKeys.employee_search(query_hash)
+            await self.cache.set(key, results, effective_ttl, CacheLevel.L1_MEMORY)
+            self._list_keys.add(key)
             
             duration = (datetime.now() - start_time).total_seconds()
             record_timer("employee_search_cache_set", duration)
@@ -241,7 +246,7 @@ class EmployeeCacheManager:
             return True
             
         except Exception as e:
-            print(f"Error caching employee search: {e}")
+            logger.error("Error caching employee search: %s", e)
             increment_counter("employee_cache_errors", 1)
             return False
     
@@ -267,7 +272,7 @@ class EmployeeCacheManager:
             return result
             
         except Exception as e:
-            print(f"Error getting employee search from cache: {e}")
+            logger.error("Error getting employee search from cache: %s", e)
             increment_counter("employee_cache_errors", 1)
             return None
     
@@ -308,7 +313,7 @@ class EmployeeCacheManager:
             return True
             
         except Exception as e:
-            print(f"Error caching profile: {e}")
+            logger.error("Error caching profile: %s", e)
             increment_counter("employee_cache_errors", 1)
             return False
     
@@ -330,7 +335,7 @@ class EmployeeCacheManager:
             return result
             
         except Exception as e:
-            print(f"Error getting profile from cache: {e}")
+            logger.error("Error getting profile from cache: %s", e)
             increment_counter("employee_cache_errors", 1)
             return None
     
@@ -345,12 +350,10 @@ class EmployeeCacheManager:
             if employee_number:
                 keys_to_delete.append(EmployeeCacheKeys.employee_by_number(employee_number))
             
-            # Also invalidate search caches and lists
-            keys_to_delete.extend([
-                EmployeeCacheKeys.all_employees(),
-                # Note: We could be more specific about which search caches to invalidate
-                # but for simplicity, we'll let them expire naturally
-            ])
+            # Also invalidate search caches and lists; any of them may contain the employee
+            keys_to_delete.append(EmployeeCacheKeys.all_employees())
+            keys_to_delete.extend(self._list_keys)
+            self._list_keys.clear()
             
             for key in keys_to_delete:
                 await self.cache.delete(key)
@@ -359,7 +362,7 @@ class EmployeeCacheManager:
             return True
             
         except Exception as e:
-            print(f"Error invalidating employee cache: {e}")
+            logger.error("Error invalidating employee cache: %s", e)
             increment_counter("employee_cache_errors", 1)
             return False
     
@@ -367,10 +370,8 @@ class EmployeeCacheManager:
         """Invalidate all employee-related caches"""
         try:
             # This is a broad invalidation - in production, you might want to be more selective
-            keys_to_delete = [
-                EmployeeCacheKeys.all_employees(),
-                # Add other broad cache keys as needed
-            ]
+            keys_to_delete = [EmployeeCacheKeys.all_employees(), *self._list_keys]
+            self._list_keys.clear()
             
             for key in keys_to_delete:
                 await self.cache.delete(key)
@@ -379,10 +380,18 @@ class EmployeeCacheManager:
             return True
             
         except Exception as e:
-            print(f"Error invalidating all employee caches: {e}")
+            logger.error("Error invalidating all employee caches: %s", e)
             increment_counter("employee_cache_errors", 1)
             return False
     
+    async def on_change(self, event: ChangeEvent):
+        """Change event subscriber: evict the employee's keys (old and new number) and all searches"""
+        attributes = event.attributes
+        await self.invalidate_employee(str(event.entity_id), attributes.get("profile_id"), attributes.get("employee_number"))
+        previous_number = attributes.get("previous_employee_number")
+        if previous_number and previous_number != attributes.get("employee_number"):
+            await self.cache.delete(EmployeeCacheKeys.employee_by_number(previous_number))
+    
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get employee cache statistics"""
         try:
@@ -398,12 +407,13 @@ class EmployeeCacheManager:
             }
             
         except Exception as e:
-            print(f"Error getting cache stats: {e}")
+            logger.error("Error getting cache stats: %s", e)
             return {}
 
 
 # Global employee cache manager instance
 employee_cache_manager = EmployeeCacheManager()
+change_events.subscribe(employee_cache_manager.on_change, (EMPLOYEE,))
 
 
 # Convenience functions for easy integration
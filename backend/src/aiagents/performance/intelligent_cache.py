@@ -24,9 +24,12 @@ try:
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
-    print("Warning: redis package not available. L2 cache will be disabled.")
+    logger.warning("Warning: redis package not available. L2 cache will be disabled.")
 
 from ..cache_manager import SimpleCache  # Existing cache for compatibility
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class CacheLevel(Enum):
@@ -174,7 +177,7 @@ class IntelligentCache:
                         
                         return cached_data
                 except Exception as e:
-                    print(f"Redis cache error: {e}")
+                    logger.error("Redis cache error: %s", e)
             
             # Cache miss
             self.stats.misses += 1
@@ -186,7 +189,7 @@ class IntelligentCache:
             return default
             
         except Exception as e:
-            print(f"Cache get error: {e}")
+            logger.error("Cache get error: %s", e)
             return default
     
     async def set(
@@ -216,13 +219,13 @@ class IntelligentCache:
                 try:
                     await self._set_in_redis(key, value, effective_ttl)
                 except Exception as e:
-                    print(f"Redis set error: {e}")
+                    logger.error("Redis set error: %s", e)
                     return False
             
             return True
             
         except Exception as e:
-            print(f"Cache set error: {e}")
+            logger.error("Cache set error: %s", e)
             return False
     
     async def delete(self, key: str) -> bool:
@@ -237,12 +240,12 @@ class IntelligentCache:
                 try:
                     await self._delete_from_redis(key)
                 except Exception as e:
-                    print(f"Redis delete error: {e}")
+                    logger.error("Redis delete error: %s", e)
             
             return True
             
         except Exception as e:
-            print(f"Cache delete error: {e}")
+            logger.error("Cache delete error: %s", e)
             return False
     
     async def clear(self) -> bool:
@@ -259,7 +262,7 @@ class IntelligentCache:
                     # This would clear all keys with our prefix
                     pass  # Implementation depends on Redis setup
                 except Exception as e:
-                    print(f"Redis clear error: {e}")
+                    logger.error("Redis clear error: %s", e)
             
             # Reset stats
             self.stats = CacheStats()
@@ -267,7 +270,7 @@ class IntelligentCache:
             return True
             
         except Exception as e:
-            print(f"Cache clear error: {e}")
+            logger.error("Cache clear error: %s", e)
             return False
     
     async def _set_in_l1(self, key: str, value: Any, ttl: int) -> bool:
@@ -435,11 +438,11 @@ class IntelligentCache:
             redis_url = os.getenv("REDIS_URL")
             if redis_url:
                 self._redis_client = redis.from_url(redis_url, decode_responses=True)
-                print("✅ Redis L2 cache initialized successfully")
+                logger.debug("✅ Redis L2 cache initialized successfully")
             else:
-                print("Warning: REDIS_URL not found in environment variables")
+                logger.warning("Warning: REDIS_URL not found in environment variables")
         except Exception as e:
-            print(f"Warning: Failed to initialize Redis client: {e}")
+            logger.warning("Warning: Failed to initialize Redis client: %s", e)
             self._redis_client = None
     
     async def _get_from_redis(self, key: str) -> Any:
@@ -459,10 +462,10 @@ class IntelligentCache:
             return None
             
         except Exception as e:
-            print(f"Redis get error for key {key}: {e}")
+            logger.error("Redis get error for key %s: %s", key, e)
             # Disable Redis client on connection errors to prevent repeated failures
             if "closed" in str(e).lower() or "connection" in str(e).lower():
-                print("Disabling Redis client due to connection issues")
+                logger.debug("Disabling Redis client due to connection issues")
                 self._redis_client = None
             return None
     
@@ -482,10 +485,10 @@ class IntelligentCache:
             await self._redis_client.setex(prefixed_key, ttl, serialized_value)
             
         except Exception as e:
-            print(f"Redis set error for key {key}: {e}")
+            logger.error("Redis set error for key %s: %s", key, e)
             # Disable Redis client on connection errors to prevent repeated failures
             if "closed" in str(e).lower() or "connection" in str(e).lower():
-                print("Disabling Redis client due to connection issues")
+                logger.debug("Disabling Redis client due to connection issues")
                 self._redis_client = None
     
     async def _delete_from_redis(self, key: str):
@@ -499,10 +502,10 @@ class IntelligentCache:
             await self._redis_client.delete(prefixed_key)
             
         except Exception as e:
-            print(f"Redis delete error for key {key}: {e}")
+            logger.error("Redis delete error for key %s: %s", key, e)
             # Disable Redis client on connection errors to prevent repeated failures
             if "closed" in str(e).lower() or "connection" in str(e).lower():
-                print("Disabling Redis client due to connection issues")
+                logger.debug("Disabling Redis client due to connection issues")
                 self._redis_client = None
     
     async def _promote_to_l1(self, key: str, value: Any):
@@ -528,12 +531,12 @@ class IntelligentCache:
         if stats.hit_rate < 0.7:  # Low hit rate
             if self.policy != CachePolicy.ADAPTIVE:
                 self.policy = CachePolicy.ADAPTIVE
-                print("Switched to adaptive cache policy due to low hit rate")
+                logger.debug("Switched to adaptive cache policy due to low hit rate")
         
         # Adjust TTL based on access patterns
         if stats.avg_response_time > 0.01:  # Over 10ms average
             self.default_ttl = min(self.default_ttl * 1.2, 3600)  # Increase TTL
-            print(f"Increased default TTL to {self.default_ttl}s")
+            logger.debug("Increased default TTL to %ss", self.default_ttl)
 
 
 class CacheManager:
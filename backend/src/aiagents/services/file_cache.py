@@ -4,22 +4,58 @@ File Cache Service for optimizing file uploads in agent workflows.
 This service stores file data temporarily and provides references that can be passed
 through the agent workflow instead of the actual file data, significantly reducing
 memory usage and processing time.
+
+Chat uploads are streamed to a spool file on disk in fixed-size chunks (hashed and
+size-checked while reading), so peak memory per upload is a single chunk buffer.
+Tools receive a ``file_ref:<ref_id>`` reference and stream the file from disk to
+storage when they run.
 """
 
+import os
 import uuid
 import time
-from typing import Dict, Optional, Any
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional, Any, BinaryIO
 from datetime import datetime, timedelta
 import threading
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+FILE_REF_PREFIX = "file_ref:"
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+@dataclass
+class CachedFileHandle:
+    """Reference to a spooled upload on disk - opened only when the tool uploads it."""
+    ref_id: str
+    file_path: str
+    filename: str
+    content_type: str
+    file_size: int
+    sha256: str
+
+    def open(self) -> BinaryIO:
+        return open(self.file_path, 'rb')
 
 
 class FileCacheService:
     """Service for caching file data with automatic cleanup."""
     
-    def __init__(self, default_ttl_minutes: int = 30):
+    def __init__(self, default_ttl_minutes: int = 30, spool_dir: Optional[str] = None):
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._default_ttl = default_ttl_minutes * 60  # Convert to seconds
         self._lock = threading.Lock()
+        self._spool_dir = spool_dir or os.path.join(tempfile.gettempdir(), "consultease_uploads")
     
     def store_file(self, file_data: str, filename: str, file_size: int, mime_type: str) -> str:
         """
@@ -48,9 +84,111 @@ class FileCacheService:
                 'expires_at': time.time() + self._default_ttl
             }
             
-            print(f"🔍 DEBUG: File cached with ref_id: {ref_id}, size: {file_size} bytes")
+            logger.debug("🔍 DEBUG: File cached with ref_id: %s, size: %s bytes", ref_id, file_size)
             return ref_id
     
+    async def spool_upload(
+        self,
+        upload,
+        max_size_bytes: Optional[int] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+    ) -> str:
+        """
+        Stream an uploaded file to disk and return a reference ID.
+        
+        The body is read in ``chunk_size`` pieces, hashed and size-checked as it
+        is written, so the whole file is never held in memory.
+        
+        Args:
+            upload: FastAPI UploadFile (or any object with async ``read(size)``)
+            max_size_bytes: Maximum accepted size, defaults to MAX_UPLOAD_BYTES
+            chunk_size: Read buffer size in bytes
+            
+        Returns:
+            str: Reference ID that can be used to retrieve the file
+            
+        Raises:
+            FileTooLargeError: If the upload exceeds the size limit
+        """
+        limit = max_size_bytes or MAX_UPLOAD_BYTES
+        filename = getattr(upload, 'filename', None) or "upload"
+        mime_type = getattr(upload, 'content_type', None) or "application/octet-stream"
+        extension = os.path.splitext(filename)[1]
+
+        os.makedirs(self._spool_dir, exist_ok=True)
+        fd, spool_path = tempfile.mkstemp(dir=self._spool_dir, suffix=extension)
+        hasher = hashlib.sha256()
+        file_size = 0
+        try:
+            with os.fdopen(fd, 'wb') as spool:
+                while True:
+                    chunk = await upload.read(chunk_size)
+                    if not chunk:
+                        break
+                    file_size += len(chunk)
+                    if file_size > limit:
+                        raise FileTooLargeError(
+                            f"File '{filename}' exceeds the maximum upload size of {limit // (1024 * 1024)} MB"
+                        )
+                    hasher.update(chunk)
+                    spool.write(chunk)
+        except BaseException:
+            self._unlink(spool_path)
+            raise
+
+        with self._lock:
+            ref_id = str(uuid.uuid4())
+            self._cache[ref_id] = {
+                # Tools receive a reference instead of the file content
+                'file_data': f"{FILE_REF_PREFIX}{ref_id}",
+                'file_path': spool_path,
+                'sha256': hasher.hexdigest(),
+                'filename': filename,
+                'file_size': file_size,
+                'mime_type': mime_type,
+                'created_at': time.time(),
+                'expires_at': time.time() + self._default_ttl
+            }
+
+        logger.debug("🔍 DEBUG: File spooled with ref_id: %s, size: %s bytes, sha256: %s", ref_id, file_size, hasher.hexdigest()[:12])
+        return ref_id
+
+    def get_file_handle(self, file_reference: Optional[str]) -> Optional[CachedFileHandle]:
+        """
+        Resolve a ``file_ref:<ref_id>`` reference (or bare ref_id) to a spooled file.
+        
+        Returns None for base64 payloads and for entries that are not on disk.
+        """
+        if not file_reference or not isinstance(file_reference, str):
+            return None
+        ref_id = file_reference[len(FILE_REF_PREFIX):] if file_reference.startswith(FILE_REF_PREFIX) else file_reference
+        if len(ref_id) != 36:
+            return None
+
+        file_info = self.get_file(ref_id)
+        if not file_info or not file_info.get('file_path'):
+            return None
+
+        return CachedFileHandle(
+            ref_id=ref_id,
+            file_path=file_info['file_path'],
+            filename=file_info['filename'],
+            content_type=file_info['mime_type'],
+            file_size=file_info['file_size'],
+            sha256=file_info.get('sha256', '')
+        )
+
+    @staticmethod
+    def _unlink(path: Optional[str]):
+        if not path:
+            return
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug("🔍 DEBUG: Failed to remove spooled file %s: %s", path, e)
+
     def get_file(self, ref_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve file data by reference ID.
@@ -63,7 +201,7 @@ class FileCacheService:
         """
         with self._lock:
             if ref_id not in self._cache:
-                print(f"🔍 DEBUG: File ref_id {ref_id} not found in cache")
+                logger.debug("🔍 DEBUG: File ref_id %s not found in cache", ref_id)
                 return None
             
             file_info = self._cache[ref_id]
@@ -71,10 +209,11 @@ class FileCacheService:
             # Check if expired
             if time.time() > file_info['expires_at']:
                 del self._cache[ref_id]
-                print(f"🔍 DEBUG: File ref_id {ref_id} expired and removed")
+                self._unlink(file_info.get('file_path'))
+                logger.debug("🔍 DEBUG: File ref_id %s expired and removed", ref_id)
                 return None
             
-            print(f"🔍 DEBUG: File retrieved from cache: {ref_id}, size: {file_info['file_size']} bytes")
+            logger.debug("🔍 DEBUG: File retrieved from cache: %s, size: %s bytes", ref_id, file_info['file_size'])
             return file_info
     
     def remove_file(self, ref_id: str) -> bool:
@@ -89,8 +228,9 @@ class FileCacheService:
         """
         with self._lock:
             if ref_id in self._cache:
-                del self._cache[ref_id]
-                print(f"🔍 DEBUG: File ref_id {ref_id} removed from cache")
+                file_info = self._cache.pop(ref_id)
+                self._unlink(file_info.get('file_path'))
+                logger.debug("🔍 DEBUG: File ref_id %s removed from cache", ref_id)
                 return True
             return False
     
@@ -109,10 +249,11 @@ class FileCacheService:
             ]
             
             for ref_id in expired_keys:
-                del self._cache[ref_id]
+                file_info = self._cache.pop(ref_id)
+                self._unlink(file_info.get('file_path'))
             
             if expired_keys:
-                print(f"🔍 DEBUG: Cleaned up {len(expired_keys)} expired files")
+                logger.debug("🔍 DEBUG: Cleaned up %s expired files", len(expired_keys))
             
             return len(expired_keys)
     
@@ -131,8 +272,11 @@ class FileCacheService:
                 if current_time <= file_info['expires_at']
             )
             
+            spooled_files = sum(1 for file_info in self._cache.values() if file_info.get('file_path'))
+            
             return {
                 'active_files': active_files,
+                'spooled_files': spooled_files,
                 'expired_files': expired_files,
                 'total_size_bytes': total_size,
                 'total_size_mb': round(total_size / (1024 * 1024), 2)
@@ -151,9 +295,9 @@ def cleanup_worker():
             time.sleep(300)  # Run every 5 minutes
             expired_count = file_cache.cleanup_expired()
             if expired_count > 0:
-                print(f"🔍 DEBUG: Cleaned up {expired_count} expired files from cache")
+                logger.debug("🔍 DEBUG: Cleaned up %s expired files from cache", expired_count)
         except Exception as e:
-            print(f"🔍 DEBUG: Error in cleanup worker: {e}")
+            logger.debug("🔍 DEBUG: Error in cleanup worker: %s", e)
 
 # Start cleanup thread in daemon mode
 cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
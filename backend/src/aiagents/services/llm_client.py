@@ -0,0 +1,309 @@
+"""
+Shared async LLM client for agent execution and routing.
+
+- One pooled ``AsyncOpenAI`` client per process (HTTP keep-alive, bounded
+  connection pool), so completions never block the event loop
+- Per-call deadlines derived from the request's remaining budget
+- Cancellation propagates to the in-flight HTTP call (e.g. client disconnect)
+- Pluggable backend: ``FakeLLMBackend`` serves scripted completions offline
+  for tests and throughput benchmarks
+- Prompt-cache accounting: cached vs. total prompt tokens from the usage
+  data, overall and per caller
+"""
+
+import os
+import time
+import json
+import uuid
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+request_deadline_var: ContextVar[Optional[float]] = ContextVar("llm_request_deadline", default=None)
+
+# Provider prompt caching applies to prompts of at least this many tokens, in blocks of PROMPT_CACHE_BLOCK_TOKENS
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_BLOCK_TOKENS = 128
+
+
+class LLMDeadlineExceeded(Exception):
+    """Raised when the request's budget is exhausted before or during an LLM call."""
+
+
+@contextmanager
+def request_deadline(budget_seconds: float):
+    """Bound every LLM call made in this context by a shared request budget."""
+    token = request_deadline_var.set(time.monotonic() + budget_seconds)
+    try:
+        yield
+    finally:
+        request_deadline_var.reset(token)
+
+
+def start_request_budget(budget_seconds: float):
+    """Start the budget for the current request unless one is already running."""
+    if request_deadline_var.get() is None:
+        request_deadline_var.set(time.monotonic() + budget_seconds)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current request's budget, or None if unbounded."""
+    deadline = request_deadline_var.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class OpenAIBackend:
+    """AsyncOpenAI over a pooled, keep-alive httpx client."""
+
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry_seconds: float = 60.0,
+        max_retries: Optional[int] = None
+    ):
+        self.api_key = api_key
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=max_keepalive_connections or int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=keepalive_expiry_seconds
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "1"))
+        self._client: Optional[AsyncOpenAI] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        # Created lazily so the pool is opened on the serving event loop
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=self.max_retries,
+                http_client=httpx.AsyncClient(limits=self.limits, timeout=httpx.Timeout(30.0, connect=5.0))
+            )
+        return self._client
+
+    async def create(self, **kwargs) -> ChatCompletion:
+        return await self.client.chat.completions.create(**kwargs)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class FakeLLMBackend:
+    """
+    Offline backend returning scripted completions.
+
+    ``responder`` receives the request kwargs and returns either a string
+    (assistant content) or a message dict (may include ``tool_calls``).
+    The default echoes the last user message.
+
+    Usage is reported like the provider does; with ``prompt_cache`` the
+    prompt prefix shared with an earlier request counts as cached tokens.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        latency_seconds: float = 0.0,
+        prompt_cache: bool = False
+    ):
+        self.responder = responder
+        self.latency_seconds = latency_seconds
+        self.prompt_cache = prompt_cache
+        self.calls: List[Dict[str, Any]] = []
+        self._cached_prompts: List[str] = []
+
+    def _usage(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        from src.aiagents.memory.context_window import count_tokens
+
+        # Tools precede the messages in the provider's prompt
+        prompt = json.dumps(kwargs.get("tools") or [], sort_keys=True) + json.dumps(kwargs.get("messages") or [])
+        prompt_tokens = count_tokens(prompt)
+        cached_tokens = 0
+        if self.prompt_cache:
+            shared = max((len(os.path.commonprefix([prompt, earlier])) for earlier in self._cached_prompts), default=0)
+            shared_tokens = count_tokens(prompt[:shared])
+            if shared_tokens >= PROMPT_CACHE_MIN_TOKENS:
+                cached_tokens = shared_tokens - shared_tokens % PROMPT_CACHE_BLOCK_TOKENS
+            self._cached_prompts.append(prompt)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 1,
+            "total_tokens": prompt_tokens + 1,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+
+    async def create(self, **kwargs) -> ChatCompletion:
+        self.calls.append(kwargs)
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        if self.responder is not None:
+            reply = self.responder(kwargs)
+        else:
+            user_messages = [m for m in kwargs.get("messages", []) if m.get("role") == "user"]
+            reply = f"echo: {user_messages[-1]['content']}" if user_messages else "ok"
+
+        message = {"role": "assistant", "content": reply} if isinstance(reply, str) else {"role": "assistant", **reply}
+        for tool_call in message.get("tool_calls") or []:
+            tool_call.setdefault("id", f"call_{uuid.uuid4().hex[:12]}")
+            tool_call.setdefault("type", "function")
+            if not isinstance(tool_call["function"].get("arguments"), str):
+                tool_call["function"]["arguments"] = json.dumps(tool_call["function"].get("arguments", {}))
+
+        return ChatCompletion.model_validate({
+            "id": f"fake-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": kwargs.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+                "message": message,
+            }],
+            "usage": self._usage(kwargs),
+        })
+
+    async def aclose(self):
+        pass
+
+
+class LLMClient:
+    """Process-wide entry point for chat completions."""
+
+    def __init__(
+        self,
+        backend: Any = None,
+        default_timeout_seconds: float = 15.0,
+        min_call_seconds: Optional[float] = None
+    ):
+        if backend is None and os.getenv("OPENAI_API_KEY"):
+            backend = OpenAIBackend(os.getenv("OPENAI_API_KEY"))
+        self.backend = backend
+        self.default_timeout_seconds = default_timeout_seconds
+        self.min_call_seconds = min_call_seconds if min_call_seconds is not None else float(os.getenv("LLM_MIN_CALL_SECONDS", "1.0"))
+
+        self._in_flight = 0
+        self._stats = {
+            "calls": 0,
+            "completed": 0,
+            "timeouts": 0,
+            "deadline_rejections": 0,
+            "cancelled": 0,
+            "errors": 0,
+            "peak_in_flight": 0,
+            "total_latency_ms": 0.0,
+            "prompt_tokens": 0,
+            "cached_prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+        self._usage_by_tag: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def set_backend(self, backend: Any):
+        """Swap the backend (e.g. ``FakeLLMBackend`` in tests)."""
+        self.backend = backend
+
+    async def chat_completion(self, timeout: Optional[float] = None, usage_tag: Optional[str] = None, **kwargs) -> ChatCompletion:
+        """
+        Create a chat completion without blocking the event loop.
+
+        The call timeout is the smaller of ``timeout`` and the request's
+        remaining budget; LLMDeadlineExceeded is raised when that is too short
+        to be worth starting, or when the call overruns it. Token usage is
+        also accounted under ``usage_tag`` (e.g. the agent name).
+        """
+        if self.backend is None:
+            raise RuntimeError("No LLM backend configured")
+
+        call_timeout = timeout or self.default_timeout_seconds
+        remaining = remaining_budget()
+        if remaining is not None:
+            if remaining < self.min_call_seconds:
+                self._stats["deadline_rejections"] += 1
+                raise LLMDeadlineExceeded(f"Only {max(remaining, 0):.2f}s left in request budget")
+            call_timeout = min(call_timeout, remaining)
+
+        self._stats["calls"] += 1
+        self._in_flight += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                self.backend.create(timeout=call_timeout, **kwargs),
+                timeout=call_timeout
+            )
+            self._stats["completed"] += 1
+            self._record_usage(response, usage_tag)
+            return response
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise LLMDeadlineExceeded(f"LLM call exceeded {call_timeout:.2f}s")
+        except asyncio.CancelledError:
+            self._stats["cancelled"] += 1
+            logger.debug("🛑 LLM CLIENT: Call cancelled after %.0fms", (time.perf_counter() - start) * 1000)
+            raise
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._stats["total_latency_ms"] += (time.perf_counter() - start) * 1000
+
+    def _record_usage(self, response: Any, usage_tag: Optional[str]):
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        counts = {
+            "prompt_tokens": usage.prompt_tokens or 0,
+            "cached_prompt_tokens": getattr(details, "cached_tokens", None) or 0,
+            "completion_tokens": usage.completion_tokens or 0,
+        }
+        targets = [self._stats]
+        if usage_tag:
+            targets.append(self._usage_by_tag.setdefault(usage_tag, dict.fromkeys(counts, 0)))
+        for target in targets:
+            for key, value in counts.items():
+                target[key] += value
+
+    @staticmethod
+    def _cached_ratio(counts: Dict[str, Any]) -> float:
+        return counts["cached_prompt_tokens"] / counts["prompt_tokens"] if counts["prompt_tokens"] else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        completed = self._stats["completed"]
+        return {
+            **self._stats,
+            "in_flight": self._in_flight,
+            "avg_latency_ms": self._stats["total_latency_ms"] / completed if completed else 0.0,
+            "cached_token_ratio": self._cached_ratio(self._stats),
+            "usage_by_tag": {
+                tag: {**counts, "cached_token_ratio": self._cached_ratio(counts)}
+                for tag, counts in self._usage_by_tag.items()
+            },
+            "backend": type(self.backend).__name__ if self.backend else None,
+        }
+
+    async def aclose(self):
+        if self.backend is not None and hasattr(self.backend, "aclose"):
+            await self.backend.aclose()
+
+
+# Global LLM client shared by the agent executor and router
+llm_client = LLMClient()
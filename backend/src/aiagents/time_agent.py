@@ -2,7 +2,7 @@ from openai import OpenAI
 
 from src.aiagents.tools.time_tools import (
     create_time_entry_tool, get_timesheet_tool, CreateTimeEntryParams,
-    search_projects_tool, smart_create_time_entry_tool, SmartTimeEntryParams
+    search_projects_tool, smart_create_time_entry_tool, SmartTimeEntryParams, timesheet_period, requested_period
 )
 from src.aiagents.tools.contract_tools import ContractToolResult
 from src.aiagents.guardrails.input_guardrails import input_sanitization_guardrail
@@ -32,37 +32,39 @@ class TimeTrackerAgent:
         
         self.tools = self._get_tool_schemas()
     
-    def _smart_create_time_entry_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _smart_create_time_entry_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for smart_create_time_entry_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
+        context = kwargs.pop('context', None)
         
         # Convert hours to Decimal if needed
         if 'hours_worked' in kwargs and not isinstance(kwargs['hours_worked'], Decimal):
             kwargs['hours_worked'] = Decimal(str(kwargs['hours_worked']))
         
         params = SmartTimeEntryParams(**kwargs)
-        result = smart_create_time_entry_tool(params, db)
+        result = await smart_create_time_entry_tool(params, context)
         return {
             "success": result.success,
             "message": result.message,
             "data": result.data
         }
     
-    def _search_projects_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _search_projects_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for search_projects_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
         search_term = kwargs.get("search_term", "")
         
-        result = search_projects_tool(search_term, db)
+        result = await search_projects_tool(search_term)
         return {
             "success": result.success,
             "message": result.message,
             "data": result.data
         }
     
-    def _create_time_entry_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _create_time_entry_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for create_time_entry_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
+        context = kwargs.pop('context', None)
         
         # Set defaults for required fields if not provided
         kwargs.setdefault('employee_id', 1)
@@ -80,39 +82,30 @@ class TimeTrackerAgent:
             kwargs['hours_worked'] = Decimal(str(kwargs['hours_worked']))
         
         params = CreateTimeEntryParams(**kwargs)
-        result = create_time_entry_tool(params, db)
+        result = await create_time_entry_tool(params, context)
         return {
             "success": result.success,
             "message": result.message,
             "data": result.data
         }
     
-    def _get_timesheet_wrapper(self, **kwargs) -> Dict[str, Any]:
+    async def _get_timesheet_wrapper(self, **kwargs) -> Dict[str, Any]:
         """Wrapper for get_timesheet_tool"""
-        db = kwargs.pop('db', None)
+        kwargs.pop('db', None)
+        context = kwargs.pop('context', None)
         
         # Set defaults
         kwargs.setdefault('employee_id', 1)
         
-        # Handle date parameters
-        if 'start_date' in kwargs and isinstance(kwargs['start_date'], str):
-            kwargs['start_date'] = date.fromisoformat(kwargs['start_date'])
-        if 'end_date' in kwargs and isinstance(kwargs['end_date'], str):
-            kwargs['end_date'] = date.fromisoformat(kwargs['end_date'])
-        
-        # Default to current week if no dates provided
-        if 'start_date' not in kwargs or 'end_date' not in kwargs:
-            today = date.today()
-            start_date = today - timedelta(days=today.weekday())
-            end_date = start_date + timedelta(days=6)
-            kwargs.setdefault('start_date', start_date)
-            kwargs.setdefault('end_date', end_date)
+        # Missing dates come from the period (or the one the user's message named), else the current week
+        start_date, end_date = timesheet_period(
+            kwargs.get('start_date'), kwargs.get('end_date'), requested_period(kwargs.get('period'), context)
+        )
         
-        result = get_timesheet_tool(
+        result = await get_timesheet_tool(
             employee_id=kwargs['employee_id'],
-            start_date=kwargs['start_date'],
-            end_date=kwargs['end_date'],
-            db=db
+            start_date=start_date,
+            end_date=end_date
         )
         return {
             "success": result.success,
@@ -199,6 +192,10 @@ class TimeTrackerAgent:
                             "end_date": {
                                 "type": "string",
                                 "description": "End date for timesheet in YYYY-MM-DD format"
+                            },
+                            "period": {
+                                "type": "string",
+                                "description": "Relative period instead of dates, e.g. 'last week', 'this month', 'Q1 2025', 'between March and May'"
                             }
                         },
                         "required": []
@@ -328,7 +325,7 @@ class TimeTrackerAgent:
             
             # Dynamically call the appropriate tool function
             if function_name in self.tool_functions:
-                return self.tool_functions[function_name](**function_args)
+                return await self.tool_functions[function_name](**function_args)
             else:
                 return {
                     "success": False,
@@ -6,7 +6,12 @@ from src.database.core.models import Client, User
 from src.database.api.clients import get_client_by_name
 from datetime import datetime
 from src.database.core.database import get_ai_db
+from src.services.storage_service import CONTRACT_DOCUMENTS_BUCKET, get_storage_service
 import uuid
+from src.aiagents.performance.change_events import CLIENT, change_events
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 
 
@@ -27,9 +32,9 @@ class UpdateClientParams(BaseModel):
 async def update_client_tool(params: UpdateClientParams, context: Dict[str, Any] = None) -> ClientToolResult:
     """Tool for updating existing client information"""
     try:
-        print(f"🔍 DEBUG: Update CLIENT tool called (this should NOT be called for contract operations)")
-        print(f"🔍 DEBUG: Params: {params}")
-        print(f"🔍 DEBUG: Context: {context}")
+        logger.debug("🔍 DEBUG: Update CLIENT tool called (this should NOT be called for contract operations)")
+        logger.debug("🔍 DEBUG: Params: %s", params)
+        logger.debug("🔍 DEBUG: Context: %s", context)
         
         async with get_ai_db() as session:
         
@@ -91,6 +96,7 @@ async def update_client_tool(params: UpdateClientParams, context: Dict[str, Any]
             
             await session.commit()
             await session.refresh(client)
+            await change_events.emit(CLIENT, client.client_id, changed_fields=update_fields, client_name=client.client_name)
             
             # Build user-friendly success message
             def get_friendly_field_name(field):
@@ -165,6 +171,10 @@ async def get_client_details_tool(client_name: str) -> ClientToolResult:
             # Format detailed contract information
             if contracts:
                 contract_details = f"\n\n**Contract Details ({len(contracts)} contracts):**\n"
+                # One signing request for every document of the client
+                document_urls = await get_storage_service().create_signed_urls(
+                    CONTRACT_DOCUMENTS_BUCKET, [contract.document_file_path for contract in contracts if contract.document_filename]
+                )
                 for i, contract in enumerate(contracts, 1):
                     amount = f"${contract.original_amount:,.2f}" if contract.original_amount else "Not set"
                     current_amount = f"${contract.current_amount:,.2f}" if contract.current_amount else "Not set"
@@ -177,15 +187,12 @@ async def get_client_details_tool(client_name: str) -> ClientToolResult:
                     notes = contract.notes or "None"
                     
                     if contract.document_filename:
-                        # Get the actual download URL from storage service
-                        try:
-                            from src.services.storage_service import SupabaseStorageService
-                            storage_service = SupabaseStorageService()
-                            download_url = storage_service.get_document_url(contract.document_file_path)
+                        download_url = document_urls.get(contract.document_file_path)
+                        if download_url:
                             # Use only the filename as display text, hide the long URL
                             document_info = f"📄 [{contract.document_filename}]({download_url})"
-                        except Exception as e:
-                            print(f"🔍 DEBUG: Failed to get download URL for contract {contract.contract_id}: {e}")
+                        else:
+                            logger.debug("🔍 DEBUG: No signed download URL for contract %s", contract.contract_id)
                             # Fallback to API endpoint
                             document_url = f"/api/contracts/{contract.contract_id}/document"
                             document_info = f"📄 [{contract.document_filename}]({document_url})"
@@ -0,0 +1,239 @@
+"""
+Set-based bulk updates of a client's contracts.
+
+update_contract with update_all used to load every contract of the client and
+then apply the changes row by row. The bulk path instead:
+- Turns the requested field changes into one UPDATE ... FROM ... RETURNING
+  statement scoped by client_id (optionally narrowed to contract ids)
+- Sets the audit fields in the same statement: updated_at from the database
+  clock, updated_by from the authenticated user
+- Reads the "before" values from a locked snapshot of the same rows, so the
+  per-field before/after diff comes back from that single round trip
+- Offers a dry run that selects the current values and reports what would
+  change, for confirmation prompts
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.core.models import Contract
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+@dataclass(frozen=True)
+class ContractField:
+    name: str
+    # Label used in user-facing messages
+    label: str
+    parse: Callable[[Any], Any] = _keep
+    # Whether an empty value ("" / 0) still counts as a change
+    allow_empty: bool = False
+
+
+# Updatable contract fields, in the order they are reported
+CONTRACT_UPDATE_FIELDS = (
+    ContractField("start_date", "start date", _parse_date),
+    ContractField("end_date", "end date", _parse_date),
+    ContractField("contract_type", "contract type"),
+    ContractField("original_amount", "contract amount", allow_empty=True),
+    ContractField("current_amount", "current amount", allow_empty=True),
+    ContractField("billing_frequency", "billing frequency"),
+    ContractField("billing_prompt_next_date", "billing date", _parse_date),
+    ContractField("status", "status"),
+    ContractField("termination_date", "end date", _parse_date),
+    ContractField("amendments", "amendments"),
+    ContractField("notes", "notes"),
+)
+
+# Messages for dates that don't parse, matching the single-contract path
+DATE_FORMAT_ERRORS = {
+    "start_date": "❌ Invalid start date format. Please use YYYY-MM-DD format.",
+    "end_date": "❌ Invalid end date format. Please use YYYY-MM-DD format.",
+    "billing_prompt_next_date": "❌ Invalid billing prompt date format. Please use YYYY-MM-DD format.",
+    "termination_date": "❌ Invalid termination date format. Please use YYYY-MM-DD format.",
+}
+
+
+def friendly_field_name(name: str) -> str:
+    for spec in CONTRACT_UPDATE_FIELDS:
+        if spec.name == name:
+            return spec.label
+    return name.replace('_', ' ')
+
+
+def join_field_names(names: List[str]) -> str:
+    """"a", "a and b" or "a, b, and c" """
+    friendly = [friendly_field_name(name) for name in names]
+    if len(friendly) <= 2:
+        return " and ".join(friendly)
+    return f"{', '.join(friendly[:-1])}, and {friendly[-1]}"
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _display_value(value: Any) -> str:
+    if value is None or value == "":
+        return "not set"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"${value:,.2f}"
+    return str(value)
+
+
+@dataclass
+class ContractChanges:
+    """Column values requested for a contract update"""
+    values: Dict[str, Any]
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.values)
+
+    @classmethod
+    def from_params(cls, params: Any) -> "ContractChanges":
+        """
+        Collect the provided fields of ``params`` (an UpdateContractParams).
+
+        Raises ValueError with a user-facing message when a date doesn't parse.
+        """
+        values = {}
+        for spec in CONTRACT_UPDATE_FIELDS:
+            value = getattr(params, spec.name, None)
+            if value is None or (not value and not spec.allow_empty):
+                continue
+            try:
+                values[spec.name] = spec.parse(value)
+            except ValueError:
+                raise ValueError(DATE_FORMAT_ERRORS[spec.name])
+        return cls(values)
+
+
+@dataclass
+class ContractDiff:
+    contract_id: int
+    # field -> {"before": ..., "after": ...}, only for values that differ
+    changes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    updated_at: Optional[str] = None
+
+    def describe(self) -> str:
+        if not self.changes:
+            return f"- Contract {self.contract_id}: no changes"
+        parts = [
+            f"{friendly_field_name(name)} {_display_value(change['before'])} → {_display_value(change['after'])}"
+            for name, change in self.changes.items()
+        ]
+        return f"- Contract {self.contract_id}: " + "; ".join(parts)
+
+    def to_dict(self, fields: List[str]) -> Dict[str, Any]:
+        data = {"contract_id": self.contract_id, "updated_fields": fields, "changes": self.changes}
+        if self.updated_at:
+            data["updated_at"] = self.updated_at
+        return data
+
+
+@dataclass
+class BulkUpdateResult:
+    fields: List[str]
+    contracts: List[ContractDiff]
+    dry_run: bool = False
+
+    @property
+    def changed(self) -> List[ContractDiff]:
+        return [diff for diff in self.contracts if diff.changes]
+
+    def describe(self) -> str:
+        return "\n".join(diff.describe() for diff in self.contracts)
+
+
+def _diff(contract_id: int, fields: List[str], before: Dict[str, Any], after: Dict[str, Any]) -> ContractDiff:
+    changes = {}
+    for name in fields:
+        old, new = _json_value(before[name]), _json_value(after[name])
+        if old != new:
+            changes[name] = {"before": old, "after": new}
+    return ContractDiff(contract_id, changes)
+
+
+def _scope(client_id: int, contract_ids: Optional[List[int]]):
+    criteria = [Contract.client_id == client_id]
+    if contract_ids:
+        criteria.append(Contract.contract_id.in_(contract_ids))
+    return criteria
+
+
+def build_bulk_update(client_id: int, changes: ContractChanges, user_id: Any,
+                      contract_ids: Optional[List[int]] = None):
+    """
+    UPDATE contracts ... FROM (locked snapshot) ... RETURNING before and after values.
+
+    The snapshot subquery is evaluated before the SET, so its columns carry the
+    previous values of the same rows.
+    """
+    columns = [getattr(Contract, name) for name in changes.fields]
+    before = (
+        select(Contract.contract_id, *columns)
+        .where(*_scope(client_id, contract_ids))
+        .with_for_update()
+        .subquery("before")
+    )
+    return (
+        update(Contract)
+        .where(Contract.contract_id == before.c.contract_id)
+        .values(**changes.values, updated_by=user_id, updated_at=func.now())
+        .returning(
+            Contract.contract_id,
+            Contract.updated_at,
+            *[before.c[name].label(f"before_{name}") for name in changes.fields],
+            *columns,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def bulk_update_contracts(session: AsyncSession, client_id: int, changes: ContractChanges, user_id: Any,
+                                contract_ids: Optional[List[int]] = None, dry_run: bool = False) -> BulkUpdateResult:
+    """
+    Apply ``changes`` to the client's contracts in one statement, or preview them with ``dry_run``.
+
+    The caller owns the transaction; nothing is committed here.
+    """
+    fields = changes.fields
+    if dry_run:
+        rows = (await session.execute(
+            select(Contract.contract_id, *[getattr(Contract, name) for name in fields])
+            .where(*_scope(client_id, contract_ids))
+            .order_by(Contract.contract_id)
+        )).all()
+        diffs = [_diff(row.contract_id, fields, row._mapping, changes.values) for row in rows]
+        return BulkUpdateResult(fields, diffs, dry_run=True)
+
+    rows = (await session.execute(build_bulk_update(client_id, changes, user_id, contract_ids))).all()
+    diffs = []
+    for row in sorted(rows, key=lambda r: r.contract_id):
+        mapping = row._mapping
+        before = {name: mapping[f"before_{name}"] for name in fields}
+        diff = _diff(row.contract_id, fields, before, mapping)
+        diff.updated_at = _json_value(row.updated_at)
+        diffs.append(diff)
+    logger.info("📝 Bulk-updated %s contracts of client %s (%s)", len(diffs), client_id, ", ".join(fields))
+    return BulkUpdateResult(fields, diffs)
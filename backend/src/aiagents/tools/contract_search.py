@@ -0,0 +1,330 @@
+"""
+Planned contract search for search_contracts_tool.
+
+Contract searches used to OR/AND ``ilike('%...%')`` predicates over status,
+billing frequency, contract type and client name, which no B-tree index can
+answer, so every agent contract search scanned the contracts table. Searches
+are now planned from the parameters:
+- Enum-like fields (status, billing frequency, contract type) are normalized
+  through their vocabularies ("ongoing" -> active, "one time" -> one-time) and
+  matched exactly on lower(column), answered by expression indexes
+- Composite indexes serve the common combinations: client + status and
+  status + next billing date (see SQLScripts/contract_search.sql)
+- Trigram matching (ilike) only for free text: client names, and values
+  outside a field's vocabulary
+- Results are cached per normalized plan; entries carry the contract data
+  version and are ignored once a change event touches a searched or listed
+  contract field, or a client's name
+- EXPLAIN helpers that report which indexes a search is served by
+"""
+
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import contains_eager
+
+from src.database.core.models import Client, Contract
+from src.services.logging_service import get_logger
+from src.aiagents.tools.date_expressions import date_resolver
+from src.aiagents.performance.change_events import CLIENT, CONTRACT, CREATED, ChangeEvent, change_events
+
+logger = get_logger(__name__)
+
+CONTRACT_SEARCH_INDEXES = (
+    "idx_contracts_client_status",
+    "idx_contracts_status_billing_date",
+    "idx_contracts_billing_date",
+    "idx_contracts_billing_frequency",
+    "idx_contracts_contract_type",
+    "idx_contracts_created_at",
+    "idx_clients_name_trgm",
+)
+
+# Contract columns a search filters on or lists; changes to other columns
+# (documents, notes, amendments) leave cached results valid
+CONTRACT_SEARCH_FIELDS = frozenset({
+    "client_id", "status", "contract_type", "billing_frequency", "original_amount",
+    "start_date", "end_date", "billing_prompt_next_date", "created_at",
+})
+
+_SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def normalize_value(value: str) -> str:
+    """Lookup form of a field value: lower case, "-"/"_" as spaces"""
+    return _SEPARATORS.sub(" ", (value or "").lower()).strip()
+
+
+@dataclass(frozen=True)
+class EnumField:
+    """A contract column with a small vocabulary of values"""
+    name: str
+    label: str
+    # Canonical value -> lower-case spellings stored for it
+    values: Dict[str, Tuple[str, ...]]
+    # Other words users say for a canonical value
+    synonyms: Dict[str, str] = field(default_factory=dict)
+
+    @cached_property
+    def lookup(self) -> Dict[str, str]:
+        table = {normalize_value(word): canonical for word, canonical in self.synonyms.items()}
+        for canonical, spellings in self.values.items():
+            table.update({normalize_value(spelling): canonical for spelling in (canonical, *spellings)})
+        return table
+
+    @property
+    def column(self):
+        return getattr(Contract, self.name)
+
+    def canonical(self, value: str) -> Optional[str]:
+        return self.lookup.get(normalize_value(value))
+
+    def condition(self, canonical: str):
+        """Exact match on lower(column), served by the column's expression index"""
+        spellings = self.values[canonical]
+        column = func.lower(self.column)
+        return column == spellings[0] if len(spellings) == 1 else column.in_(spellings)
+
+
+STATUS_FIELD = EnumField(
+    "status", "status",
+    values={"draft": ("draft",), "active": ("active",), "completed": ("completed",), "terminated": ("terminated",)},
+    synonyms={"ongoing": "active", "current": "active", "in progress": "active",
+              "complete": "completed", "finished": "completed", "terminate": "terminated"},
+)
+BILLING_FREQUENCY_FIELD = EnumField(
+    "billing_frequency", "billing frequency",
+    values={
+        "monthly": ("monthly",),
+        "weekly": ("weekly",),
+        "bi-weekly": ("bi-weekly", "biweekly"),
+        "quarterly": ("quarterly",),
+        "annually": ("annually", "annual", "yearly"),
+        "one-time": ("one-time", "one time", "onetime"),
+        "milestone": ("milestone",),
+    },
+    synonyms={"month": "monthly", "week": "weekly", "fortnightly": "bi-weekly", "quarter": "quarterly",
+              "year": "annually", "once": "one-time", "single": "one-time"},
+)
+CONTRACT_TYPE_FIELD = EnumField(
+    "contract_type", "contract type",
+    values={
+        "fixed": ("fixed", "fixed price", "fixed-price", "fixed fee"),
+        "hourly": ("hourly",),
+        "retainer": ("retainer",),
+        "time & material": ("time & material", "time & materials", "time and material", "time and materials", "t&m"),
+    },
+    synonyms={"hour": "hourly", "time and materials": "time & material", "t and m": "time & material"},
+)
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class ContractSearchPlan:
+    """Predicates for one contract search and what they are expected to be served by"""
+    conditions: List[Any] = field(default_factory=list)
+    # User-facing descriptions of the filters, in order
+    filters: List[str] = field(default_factory=list)
+    # Normalized parameters; equal keys mean equal results for the same data version
+    key: Tuple[Any, ...] = ()
+    # Indexes that can answer the predicates
+    indexes: List[str] = field(default_factory=list)
+    # Fields matched as free text (trigram) rather than exactly
+    free_text: List[str] = field(default_factory=list)
+
+    def add(self, condition, description: str, key: Tuple[Any, ...], index: Optional[str] = None):
+        self.conditions.append(condition)
+        self.filters.append(description)
+        self.key += (key,)
+        if index and index not in self.indexes:
+            self.indexes.append(index)
+
+    def statement(self, limit: int):
+        """The planned search, newest first, with the total match count on every row"""
+        return (
+            select(Contract, func.count().over().label("total"))
+            .join(Contract.client)
+            .options(contains_eager(Contract.client))
+            .where(*self.conditions)
+            .order_by(Contract.created_at.desc())
+            .limit(limit)
+        )
+
+
+def _plan_enum(plan: ContractSearchPlan, enum_field: EnumField, value: str, index: Optional[str]):
+    canonical = enum_field.canonical(value)
+    if canonical is None:
+        # Outside the vocabulary: substring match as before
+        plan.add(enum_field.column.ilike(f"%{value}%"), f"{enum_field.label} is '{value}'",
+                 (enum_field.name, "text", value.lower()))
+        plan.free_text.append(enum_field.name)
+        return None
+    label = "ongoing" if enum_field is STATUS_FIELD and canonical == "active" else canonical
+    plan.add(enum_field.condition(canonical), f"{enum_field.label} is '{label}'", (enum_field.name, canonical), index)
+    return canonical
+
+
+def plan_contract_search(params: Any, today: Optional[date] = None) -> ContractSearchPlan:
+    """Plan a search from ``params`` (a SearchContractsParams)."""
+    plan = ContractSearchPlan()
+    client_name = (params.client_name or "").strip()
+    if client_name:
+        plan.add(Client.client_name.ilike(f"%{client_name}%"), f"client name matching '{params.client_name}'",
+                 ("client_name", client_name.lower()), "idx_clients_name_trgm")
+        plan.free_text.append("client_name")
+
+    status = None
+    if params.status:
+        status = _plan_enum(plan, STATUS_FIELD, params.status,
+                            "idx_contracts_client_status" if client_name else "idx_contracts_status_billing_date")
+
+    if params.billing_date_next_month:
+        today = today or date_resolver.today()
+        end_of_next_month = date_resolver.resolve("next month", today).end
+        plan.add(
+            Contract.billing_prompt_next_date.between(today, end_of_next_month),
+            f"billing date is from {today} to {end_of_next_month}",
+            ("billing_date", today, end_of_next_month),
+            "idx_contracts_status_billing_date" if status else "idx_contracts_billing_date",
+        )
+
+    if params.billing_date_is_null:
+        plan.add(Contract.billing_prompt_next_date.is_(None), "billing date is not set", ("billing_date", None),
+                 "idx_contracts_billing_date")
+
+    if params.billing_frequency:
+        _plan_enum(plan, BILLING_FREQUENCY_FIELD, params.billing_frequency, "idx_contracts_billing_frequency")
+
+    if params.contract_type:
+        _plan_enum(plan, CONTRACT_TYPE_FIELD, params.contract_type, "idx_contracts_contract_type")
+
+    if params.min_amount is not None:
+        plan.add(Contract.original_amount >= params.min_amount, f"amount greater than ${params.min_amount:,.2f}",
+                 ("min_amount", params.min_amount))
+
+    if params.max_amount is not None:
+        plan.add(Contract.original_amount <= params.max_amount, f"amount less than ${params.max_amount:,.2f}",
+                 ("max_amount", params.max_amount))
+
+    start_from = _parse_date(params.start_date_from)
+    if start_from:
+        plan.add(Contract.start_date >= start_from, f"start date >= {params.start_date_from}", ("start_from", start_from))
+
+    start_to = _parse_date(params.start_date_to)
+    if start_to:
+        plan.add(Contract.start_date <= start_to, f"start date <= {params.start_date_to}", ("start_to", start_to))
+
+    if not plan.indexes:
+        # Nothing selective: newest contracts first, read in index order
+        plan.indexes.append("idx_contracts_created_at")
+    return plan
+
+
+class ContractSearchCache:
+    """
+    Contract search results keyed by plan.
+
+    Every entry records the contract data version it was read at; ``invalidate``
+    (called for change events that can alter a search result) bumps the
+    version, so older entries are never served again. Entries also expire
+    after a TTL to pick up writes made outside this process.
+    """
+
+    def __init__(self, ttl_seconds: float = None, max_entries: int = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("CONTRACT_SEARCH_CACHE_TTL_SECONDS", "60"))
+        self.max_entries = max_entries or int(os.getenv("CONTRACT_SEARCH_CACHE_MAX_ENTRIES", "256"))
+        self.version = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0}
+
+    def get(self, key: tuple) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, expires_at, value = entry
+            if version == self.version and expires_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return value
+            del self._entries[key]
+            self._stats["stale"] += 1
+        self._stats["misses"] += 1
+        return None
+
+    def put(self, key: tuple, value: Any, version: int):
+        """Store a result read at ``version``; dropped if the data changed while it was read."""
+        if version != self.version or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def on_change(self, event: ChangeEvent):
+        """Change event subscriber: invalidate when the write can alter a search result."""
+        if event.entity_type == CONTRACT:
+            affected = event.touches(CONTRACT_SEARCH_FIELDS)
+        else:
+            # A new client has no contracts yet; renames and deletes show up in results
+            affected = event.action != CREATED and event.touches({"client_name"})
+        if affected:
+            self.invalidate(f"{event.entity_type} {event.entity_id} {event.action}")
+
+    def invalidate(self, reason: str = ""):
+        self.version += 1
+        self._stats["invalidations"] += 1
+        logger.debug("🗂️ Contract search cache invalidated (version %s): %s", self.version, reason)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "version": self.version,
+            "entries": len(self._entries),
+            "hit_rate": self._stats["hits"] / requests if requests else 0.0,
+        }
+
+
+def summarize_plan(plan_lines: List[str], expected_indexes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Which contract search indexes an EXPLAIN plan uses and whether it scans contracts sequentially."""
+    plan = "\n".join(plan_lines)
+    indexes_used = [index for index in CONTRACT_SEARCH_INDEXES if re.search(rf"\b{index}\b", plan)]
+    seq_scan = bool(re.search(r"Seq Scan on contracts\b", plan))
+    expected_used = not expected_indexes or any(index in indexes_used for index in expected_indexes)
+    return {
+        "indexes_used": indexes_used,
+        "seq_scan": seq_scan,
+        "uses_search_indexes": bool(indexes_used) and expected_used and not seq_scan,
+        "plan": plan_lines,
+    }
+
+
+async def explain_search(session, stmt, expected_indexes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """EXPLAIN a contract search statement and summarize its index usage."""
+    connection = await session.connection()
+    sql = stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    result = await connection.exec_driver_sql(f"EXPLAIN {sql}")
+    summary = summarize_plan([row[0] for row in result.all()], expected_indexes)
+    if not summary["uses_search_indexes"]:
+        logger.warning("⚠️ Contract search is not using its indexes: %s", summary["plan"])
+    return summary
+
+
+# Global instance
+contract_search_cache = ContractSearchCache()
+change_events.subscribe(contract_search_cache.on_change, (CONTRACT, CLIENT))
@@ -2,9 +2,8 @@ from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, and_, func, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, aliased
 from datetime import date, timedelta, datetime
-from dateutil.relativedelta import relativedelta
 from decimal import Decimal
 from src.database.core.database import get_db
 from src.database.core.models import Client, Contract, ClientContact
@@ -13,11 +12,65 @@ from src.database.api.clients import create_client_internal, get_client_by_name
 from src.database.api.contracts import create_contract_internal
 from src.database.api.client_contacts import create_client_contact
 from src.database.core.database import get_ai_db
+import os
 import re
-from src.services.storage_service import SupabaseStorageService
+from src.services.storage_service import CONTRACT_DOCUMENTS_BUCKET, get_storage_service
 from datetime import datetime
 import base64
 from io import BytesIO
+from src.aiagents.services.file_cache import file_cache
+from src.aiagents.tools.result_paging import PagedListing, RESULT_SNAPSHOT_LIMIT, result_pager
+from src.aiagents.tools.contract_bulk_update import ContractChanges, bulk_update_contracts, join_field_names
+from src.aiagents.tools.date_expressions import date_resolver
+from src.aiagents.tools.contract_search import contract_search_cache, plan_contract_search
+from src.aiagents.performance.change_events import CLIENT, CONTRACT, CONTRACT_DOCUMENT_FIELDS, DELETED, change_events
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Server-side bounds for the listing tools; rows past a limit are summarized as "N more"
+LISTING_LIMIT = int(os.getenv("AGENT_LISTING_LIMIT", "50"))
+CONTRACTS_PER_CLIENT_LIMIT = int(os.getenv("AGENT_CONTRACTS_PER_CLIENT_LIMIT", "10"))
+
+
+def _more_line(shown: int, total: int, noun: str, indent: str = "") -> str:
+    """'N more' summary for the rows a listing limit left out."""
+    if total <= shown:
+        return ""
+    return f"{indent}_...and {total - shown} more {noun} not shown._\n"
+
+
+def _contract_list_item(number: int, contract: Dict[str, Any]) -> str:
+    amount = f"${contract['original_amount']:,.2f}" if contract.get("original_amount") is not None else "N/A"
+    lines = [
+        f"**{number}. Contract ID {contract['contract_id']}** - {contract['client_name']}",
+        f"- **Type:** {contract.get('contract_type') or 'N/A'} | **Status:** {contract.get('status') or 'N/A'} | **Amount:** {amount}",
+        f"- **Next Billing:** {contract.get('billing_prompt_next_date') or 'Not set'}",
+    ]
+    if contract.get("document_filename"):
+        lines.append(f"- **Document:** {contract['document_filename']}")
+    return "\n".join(lines)
+
+
+def _client_list_item(number: int, client: Dict[str, Any]) -> str:
+    lines = [
+        f"**{number}. {client['client_name']}**",
+        f"- **Industry:** {client['industry'] or 'Not specified'}",
+        f"- **Primary Contact:** {client['primary_contact_name'] or 'Not specified'}",
+        f"- **Email:** {client['primary_contact_email'] or 'Not specified'}",
+        f"- **Company Size:** {client['company_size'] or 'Not specified'}",
+    ]
+    if client['created_at']:
+        try:
+            created_date = datetime.fromisoformat(client['created_at'].replace('Z', '+00:00'))
+            lines.append(f"- **Created:** {created_date.strftime('%B %d, %Y')}")
+        except ValueError:
+            lines.append(f"- **Created:** {client['created_at']}")
+    return "\n".join(lines)
+
+
+result_pager.register(PagedListing("contracts", "contracts", "contracts", _contract_list_item, separator="\n\n"))
+result_pager.register(PagedListing("clients", "clients", "clients", _client_list_item, separator="\n\n"))
 
 class CreateClientParams(BaseModel):
     client_name: str
@@ -72,6 +125,7 @@ class UpdateContractParams(BaseModel):
     termination_date: Optional[str] = None  # Add termination_date field
     amendments: Optional[str] = None  # Add amendments field
     notes: Optional[str] = None
+    dry_run: Optional[bool] = False  # Preview the update_all changes without applying them
 
 async def update_specific_contract(contract: Contract, params: UpdateContractParams, session) -> ContractToolResult:
     """Update a specific contract with the provided parameters"""
@@ -118,6 +172,7 @@ async def update_specific_contract(contract: Contract, params: UpdateContractPar
         contract.updated_at = datetime.utcnow()
         
         await session.commit()
+        await change_events.emit(CONTRACT, contract.contract_id, changed_fields=updated_fields, client_id=contract.client_id)
         
         # Build user-friendly success message
         def get_friendly_field_name(field):
@@ -176,6 +231,63 @@ async def update_specific_contract(contract: Contract, params: UpdateContractPar
             message=f"❌ Error updating contract: {str(e)}"
         )
 
+def _selects_all_contracts(user_response: Optional[str]) -> bool:
+    """Whether the user's answer to the contract selection prompt means every contract"""
+    if not user_response or not user_response.strip():
+        return False
+    user_input = user_response.strip().lower()
+    return any(phrase in user_input for phrase in ["all", "both", "for all", "for both", "every", "each"])
+
+async def update_all_client_contracts(session, client: Client, params: UpdateContractParams, user_id: str) -> ContractToolResult:
+    """Apply (or with dry_run, preview) the requested changes to every contract of a client in one statement"""
+    try:
+        changes = ContractChanges.from_params(params)
+    except ValueError as e:
+        return ContractToolResult(success=False, message=str(e))
+    
+    if not changes.values:
+        return ContractToolResult(
+            success=False,
+            message=f"❌ No contract fields to update were provided for '{client.client_name}'. Please say what should change."
+        )
+    
+    result = await bulk_update_contracts(session, client.client_id, changes, user_id, dry_run=bool(params.dry_run))
+    if not result.contracts:
+        return ContractToolResult(
+            success=False,
+            message=f"❌ No contracts found for client '{client.client_name}'."
+        )
+    
+    fields_text = join_field_names(result.fields)
+    data = {
+        "contracts_updated": 0 if result.dry_run else len(result.contracts),
+        "contracts_changed": len(result.changed),
+        "client_name": client.client_name,
+        "updated_fields": result.fields,
+        "contracts": [diff.to_dict(result.fields) for diff in result.contracts],
+        "update_all": True,
+        "dry_run": result.dry_run
+    }
+    
+    if result.dry_run:
+        return ContractToolResult(
+            success=False,  # Nothing applied yet; the user has to confirm
+            message=f"🔍 **Preview:** updating {fields_text} on {len(result.contracts)} contracts for '{client.client_name}' "
+                    f"would change {len(result.changed)} of them:\n\n{result.describe()}\n\n"
+                    f"**Please confirm:** Enter 'yes' to apply these changes, or 'no' to cancel.",
+            data=data,
+            requires_confirmation=True
+        )
+    
+    await session.commit()
+    for diff in result.changed:
+        await change_events.emit(CONTRACT, diff.contract_id, changed_fields=result.fields, client_id=client.client_id)
+    return ContractToolResult(
+        success=True,
+        message=f"✅ Successfully updated {len(result.contracts)} contracts for '{client.client_name}'. Updated: {fields_text}.\n\n{result.describe()}",
+        data=data
+    )
+
 async def update_contract_tool(params: UpdateContractParams, context: Dict[str, Any] = None) -> ContractToolResult:
     """Tool for updating existing contracts by client name"""
     try:
@@ -226,6 +338,11 @@ async def update_contract_tool(params: UpdateContractParams, context: Dict[str,
                     message=f"❌ Client '{params.client_name}' not found."
                 )
             
+            # "all" / "both" updates every contract of the client in one statement
+            if params.update_all or _selects_all_contracts(params.user_response):
+                params.update_all = True
+                return await update_all_client_contracts(session, client, params, user_id)
+            
             # Get all contracts for the client
             contracts_result = await session.execute(select(Contract).options(
                 selectinload(Contract.client)
@@ -257,72 +374,62 @@ async def update_contract_tool(params: UpdateContractParams, context: Dict[str,
                 user_input = params.user_response.strip().lower()
                 requested_id = None
                 
-                
-                # Check for "all", "both", "for all", "for both" responses
-                if any(phrase in user_input for phrase in ["all", "both", "for all", "for both", "every", "each"]):
-                    # User wants to update all contracts
-                    params.update_all = True
-                    # Skip individual contract selection logic
-                    contract = None
-                else:
-                    # Parse various formats: "108", "Contract 108", "contract id 108", "id 108", "1", "2", etc.
-                    if user_input.isdigit():
-                        # Check if it's a contract ID or a list number
-                        num = int(user_input)
-                        if num <= len(contracts):
-                            # It's a list number (1-based)
-                            contract = contracts[num - 1]
-                        else:
-                            # It might be a contract ID
-                            for c in contracts:
-                                if c.contract_id == num:
-                                    contract = c
-                                    break
-                            if not contract:
-                                return ContractToolResult(
-                                    success=False,
-                                    message=f"❌ Contract ID {num} not found for client '{client.client_name}'."
-                                )
-                    elif "contract id" in user_input:
-                        parts = user_input.split("contract id")
-                        if len(parts) > 1:
-                            number_part = parts[1].strip()
-                            if number_part.isdigit():
-                                requested_id = int(number_part)
-                    elif "contract" in user_input:
-                        parts = user_input.split("contract")
-                        if len(parts) > 1:
-                            number_part = parts[1].strip()
-                            if number_part.isdigit():
-                                requested_id = int(number_part)
-                    elif "id" in user_input:
-                        parts = user_input.split("id")
-                        if len(parts) > 1:
-                            number_part = parts[1].strip()
-                            if number_part.isdigit():
-                                requested_id = int(number_part)
-                    
-                    if requested_id:
+                # Parse various formats: "108", "Contract 108", "contract id 108", "id 108", "1", "2", etc.
+                if user_input.isdigit():
+                    # Check if it's a contract ID or a list number
+                    num = int(user_input)
+                    if num <= len(contracts):
+                        # It's a list number (1-based)
+                        contract = contracts[num - 1]
+                    else:
+                        # It might be a contract ID
                         for c in contracts:
-                            if c.contract_id == requested_id:
+                            if c.contract_id == num:
                                 contract = c
                                 break
                         if not contract:
                             return ContractToolResult(
                                 success=False,
-                                message=f"❌ Contract ID {requested_id} not found for client '{client.client_name}'."
+                                message=f"❌ Contract ID {num} not found for client '{client.client_name}'."
                             )
+                elif "contract id" in user_input:
+                    parts = user_input.split("contract id")
+                    if len(parts) > 1:
+                        number_part = parts[1].strip()
+                        if number_part.isdigit():
+                            requested_id = int(number_part)
+                elif "contract" in user_input:
+                    parts = user_input.split("contract")
+                    if len(parts) > 1:
+                        number_part = parts[1].strip()
+                        if number_part.isdigit():
+                            requested_id = int(number_part)
+                elif "id" in user_input:
+                    parts = user_input.split("id")
+                    if len(parts) > 1:
+                        number_part = parts[1].strip()
+                        if number_part.isdigit():
+                            requested_id = int(number_part)
                     
-                    if not contract and not params.update_all:
+                if requested_id:
+                    for c in contracts:
+                        if c.contract_id == requested_id:
+                            contract = c
+                            break
+                    if not contract:
                         return ContractToolResult(
                             success=False,
-                            message=f"❌ Could not extract contract ID from '{params.user_response}'. Please provide a valid contract ID number, or say 'all' to update all contracts."
+                            message=f"❌ Contract ID {requested_id} not found for client '{client.client_name}'."
                         )
+                    
+                if not contract:
+                    return ContractToolResult(
+                        success=False,
+                        message=f"❌ Could not extract contract ID from '{params.user_response}'. Please provide a valid contract ID number, or say 'all' to update all contracts."
+                    )
             
-            # Check if user wants to update all contracts
-            if params.update_all:
-                # User wants to update all contracts - proceed with update
-                # contracts_to_update will be set to all contracts below
+            if contract is not None:
+                # Selected from the user's response above
                 pass
             elif len(contracts) == 1:
                 # Only one contract, use it directly
@@ -345,248 +452,31 @@ async def update_contract_tool(params: UpdateContractParams, context: Dict[str,
                            f"\n\nPlease provide the contract ID (e.g., 'update contract {contracts[0].contract_id} for {client.client_name}'), use the contract number, or say 'all' to update all contracts."
                 )
             
-            # Determine which contracts to update
-            contracts_to_update = []
-            if params.update_all:
-                contracts_to_update = contracts
-            else:
-                contracts_to_update = [contract]
-            
-            update_fields = []
-            updated_contracts = []
+            try:
+                changes = ContractChanges.from_params(params)
+            except ValueError as e:
+                return ContractToolResult(success=False, message=str(e))
             
-            # Apply updates to all selected contracts using bulk update to avoid prepared statement conflicts
-            if params.update_all and len(contracts_to_update) > 1:
-                # Use bulk update for multiple contracts to avoid prepared statement conflicts
-                contract_ids = [c.contract_id for c in contracts_to_update]
-                
-                # Build update data dictionary
-                update_data = {"updated_by": user_id}
-                
-                if params.start_date:
-                    try:
-                        update_data["start_date"] = datetime.strptime(params.start_date, "%Y-%m-%d").date()
-                        update_fields.append("start_date")
-                    except ValueError:
-                        return ContractToolResult(
-                            success=False,
-                            message=f"❌ Invalid start date format. Please use YYYY-MM-DD format."
-                        )
-                
-                if params.end_date:
-                    try:
-                        update_data["end_date"] = datetime.strptime(params.end_date, "%Y-%m-%d").date()
-                        update_fields.append("end_date")
-                    except ValueError:
-                        return ContractToolResult(
-                            success=False,
-                            message=f"❌ Invalid end date format. Please use YYYY-MM-DD format."
-                        )
-                
-                if params.contract_type:
-                    update_data["contract_type"] = params.contract_type
-                    update_fields.append("contract_type")
-                
-                if params.original_amount is not None:
-                    update_data["original_amount"] = params.original_amount
-                    update_fields.append("original_amount")
-                
-                if params.current_amount is not None:
-                    update_data["current_amount"] = params.current_amount
-                    update_fields.append("current_amount")
-                
-                if params.billing_frequency:
-                    update_data["billing_frequency"] = params.billing_frequency
-                    update_fields.append("billing_frequency")
-                
-                if params.billing_prompt_next_date:
-                    try:
-                        update_data["billing_prompt_next_date"] = datetime.strptime(params.billing_prompt_next_date, "%Y-%m-%d").date()
-                        update_fields.append("billing_prompt_next_date")
-                    except ValueError:
-                        return ContractToolResult(
-                            success=False,
-                            message=f"❌ Invalid billing prompt date format. Please use YYYY-MM-DD format."
-                        )
-                
-                if params.status:
-                    update_data["status"] = params.status
-                    update_fields.append("status")
-                
-                if params.termination_date:
-                    try:
-                        update_data["termination_date"] = datetime.strptime(params.termination_date, "%Y-%m-%d").date()
-                        update_fields.append("termination_date")
-                    except ValueError:
-                        return ContractToolResult(
-                            success=False,
-                            message=f"❌ Invalid termination date format. Please use YYYY-MM-DD format."
-                        )
-                
-                if params.amendments:
-                    update_data["amendments"] = params.amendments
-                    update_fields.append("amendments")
-                
-                if params.notes:
-                    update_data["notes"] = params.notes
-                    update_fields.append("notes")
-                
-                # Perform bulk update
-                if update_data:
-                    from sqlalchemy import update
-                    stmt = update(Contract).where(Contract.contract_id.in_(contract_ids)).values(**update_data)
-                    await session.execute(stmt)
-                    
-                    # Build updated contracts list for response
-                    for contract_id in contract_ids:
-                        updated_contracts.append({
-                            "contract_id": contract_id,
-                            "updated_fields": update_fields
-                        })
-            else:
-                # Use individual updates for single contract or when update_all is False
-                for contract_to_update in contracts_to_update:
-                    contract_updated_fields = []
-                    
-                    if params.start_date:
-                        try:
-                            contract_to_update.start_date = datetime.strptime(params.start_date, "%Y-%m-%d").date()
-                            contract_updated_fields.append("start_date")
-                        except ValueError:
-                            return ContractToolResult(
-                                success=False,
-                                message=f"❌ Invalid start date format. Please use YYYY-MM-DD format."
-                            )
-                
-                    if params.end_date:
-                        try:
-                            contract_to_update.end_date = datetime.strptime(params.end_date, "%Y-%m-%d").date()
-                            contract_updated_fields.append("end_date")
-                        except ValueError:
-                            return ContractToolResult(
-                                success=False,
-                                message=f"❌ Invalid end date format. Please use YYYY-MM-DD format."
-                            )
-                    
-                    if params.contract_type:
-                        contract_to_update.contract_type = params.contract_type
-                        contract_updated_fields.append("contract_type")
-                    
-                    if params.original_amount is not None:
-                        contract_to_update.original_amount = params.original_amount
-                        contract_updated_fields.append("original_amount")
-                    
-                    if params.current_amount is not None:
-                        contract_to_update.current_amount = params.current_amount
-                        contract_updated_fields.append("current_amount")
-                    
-                    if params.billing_frequency:
-                        contract_to_update.billing_frequency = params.billing_frequency
-                        contract_updated_fields.append("billing_frequency")
-                    
-                    if params.billing_prompt_next_date:
-                        try:
-                            contract_to_update.billing_prompt_next_date = datetime.strptime(params.billing_prompt_next_date, "%Y-%m-%d").date()
-                            contract_updated_fields.append("billing_prompt_next_date")
-                        except ValueError:
-                            return ContractToolResult(
-                                success=False,
-                                message=f"❌ Invalid billing prompt date format. Please use YYYY-MM-DD format."
-                            )
-                    
-                    if params.status:
-                        contract_to_update.status = params.status
-                        contract_updated_fields.append("status")
-                    
-                    if params.termination_date:
-                        try:
-                            contract_to_update.termination_date = datetime.strptime(params.termination_date, "%Y-%m-%d").date()
-                            contract_updated_fields.append("termination_date")
-                        except ValueError:
-                            return ContractToolResult(
-                                success=False,
-                                message=f"❌ Invalid termination date format. Please use YYYY-MM-DD format."
-                            )
-                    
-                    if params.amendments:
-                        contract_to_update.amendments = params.amendments
-                        contract_updated_fields.append("amendments")
-                    
-                    if params.notes:
-                        contract_to_update.notes = params.notes
-                        contract_updated_fields.append("notes")
-                    
-                    contract_to_update.updated_by = user_id
-                    updated_contracts.append({
-                        "contract_id": contract_to_update.contract_id,
-                        "updated_fields": contract_updated_fields
-                    })
-                    
-                    # Track unique update fields across all contracts
-                    for field in contract_updated_fields:
-                        if field not in update_fields:
-                            update_fields.append(field)
+            for field_name, value in changes.values.items():
+                setattr(contract, field_name, value)
+            contract.updated_by = user_id
+            update_fields = changes.fields
             
             await session.commit()
+            await change_events.emit(CONTRACT, contract.contract_id, changed_fields=update_fields, client_id=client.client_id)
+            await session.refresh(contract)
             
-            # Refresh all updated contracts (only needed for individual updates)
-            if not (params.update_all and len(contracts_to_update) > 1):
-                for contract_to_update in contracts_to_update:
-                    await session.refresh(contract_to_update)
-            
-            # Build user-friendly success message
-            def get_friendly_field_name(field):
-                field_mapping = {
-                    'billing_prompt_next_date': 'billing date',
-                    'billing_frequency': 'billing frequency',
-                    'original_amount': 'contract amount',
-                    'current_amount': 'current amount',
-                    'contract_type': 'contract type',
-                    'status': 'status',
-                    'start_date': 'start date',
-                    'end_date': 'end date',
-                    'termination_date': 'end date',
-                    'amendments': 'amendments',
-                    'notes': 'notes'
-                }
-                return field_mapping.get(field, field.replace('_', ' '))
-            
-            if params.update_all:
-                if len(update_fields) == 1:
-                    friendly_field = get_friendly_field_name(update_fields[0])
-                    message = f"✅ Successfully updated {len(contracts_to_update)} contracts for '{client.client_name}'. Updated: {friendly_field}."
-                else:
-                    friendly_fields = [get_friendly_field_name(field) for field in update_fields]
-                    if len(friendly_fields) == 2:
-                        message = f"✅ Successfully updated {len(contracts_to_update)} contracts for '{client.client_name}'. Updated: {friendly_fields[0]} and {friendly_fields[1]}."
-                    else:
-                        last_field = friendly_fields[-1]
-                        other_fields = ', '.join(friendly_fields[:-1])
-                        message = f"✅ Successfully updated {len(contracts_to_update)} contracts for '{client.client_name}'. Updated: {other_fields}, and {last_field}."
-            else:
-                # Include contract ID in single contract update message
-                contract_id = contracts_to_update[0].contract_id if contracts_to_update else "Unknown"
-                if len(update_fields) == 1:
-                    friendly_field = get_friendly_field_name(update_fields[0])
-                    message = f"✅ Successfully updated contract {contract_id} for '{client.client_name}'. Updated: {friendly_field}."
-                else:
-                    friendly_fields = [get_friendly_field_name(field) for field in update_fields]
-                    if len(friendly_fields) == 2:
-                        message = f"✅ Successfully updated contract {contract_id} for '{client.client_name}'. Updated: {friendly_fields[0]} and {friendly_fields[1]}."
-                    else:
-                        last_field = friendly_fields[-1]
-                        other_fields = ', '.join(friendly_fields[:-1])
-                        message = f"✅ Successfully updated contract {contract_id} for '{client.client_name}'. Updated: {other_fields}, and {last_field}."
-            
+            # Include contract ID in single contract update message
+            message = f"✅ Successfully updated contract {contract.contract_id} for '{client.client_name}'. Updated: {join_field_names(update_fields)}."
             
             return ContractToolResult(
                 success=True,
                 message=message,
                 data={
-                    "contracts_updated": len(contracts_to_update),
+                    "contracts_updated": 1,
                     "client_name": client.client_name,
                     "updated_fields": update_fields,
-                    "contracts": updated_contracts,
+                    "contracts": [{"contract_id": contract.contract_id, "updated_fields": update_fields}],
                     "update_all": params.update_all
                 }
             )
@@ -732,6 +622,10 @@ async def upload_contract_document_tool(params: UploadContractDocumentParams, co
                     else:
                         # Ask for clarification - show all contracts for the client
                         contract_list = []
+                        # Sign every existing document's link in one request
+                        document_urls = await get_storage_service().create_signed_urls(
+                            CONTRACT_DOCUMENTS_BUCKET, [c.document_file_path for c in contracts if c.document_filename]
+                        )
                         for i, c in enumerate(contracts, 1):
                             amount = f"${c.original_amount:,.2f}" if c.original_amount else "N/A"
                             status = c.status.lower()
@@ -748,8 +642,7 @@ async def upload_contract_document_tool(params: UploadContractDocumentParams, co
                                 uploaded_date = c.document_uploaded_at.strftime('%B %d, %Y') if c.document_uploaded_at else "N/A"
                                 
                                 # Create download URL for existing document
-                                storage_service = SupabaseStorageService()
-                                download_url = storage_service.get_contract_document_url(c.document_file_path) if c.document_file_path else f"/contracts/{c.contract_id}/document"
+                                download_url = document_urls.get(c.document_file_path) or f"/contracts/{c.contract_id}/document"
                                 
                                 document_info = f" 📄 *Has contract document: [{c.document_filename}]({download_url}) ({file_size_display}, uploaded {uploaded_date})*"
                             
@@ -775,38 +668,38 @@ async def upload_contract_document_tool(params: UploadContractDocumentParams, co
             # TODO: CONFIRMATION FIX - Check if user has confirmed the replacement
             # Also check if the last user message was a confirmation
             is_confirmation = params.user_confirmed
-            print(f"🔍 DEBUG CONFIRMATION: params.user_confirmed = {params.user_confirmed}")
+            logger.debug("🔍 DEBUG CONFIRMATION: params.user_confirmed = %s", params.user_confirmed)
             
             # TODO: CONFIRMATION FIX - If not explicitly confirmed, check if last user message was "yes" or a contract ID
             if not is_confirmation and context:
                 messages = context.get('messages', [])
-                print(f"🔍 DEBUG CONFIRMATION: Found {len(messages)} messages in context")
+                logger.debug("🔍 DEBUG CONFIRMATION: Found %s messages in context", len(messages))
                 if messages:
                     last_message = messages[-1]
-                    print(f"🔍 DEBUG CONFIRMATION: Last message type: {type(last_message)}")
+                    logger.debug("🔍 DEBUG CONFIRMATION: Last message type: %s", type(last_message))
                     if isinstance(last_message, dict) and last_message.get('role') == 'user':
                         content = last_message.get('content', '').lower().strip()
-                        print(f"🔍 DEBUG CONFIRMATION: Last user message content: '{content}'")
+                        logger.debug("🔍 DEBUG CONFIRMATION: Last user message content: '%s'", content)
                         
                         # Check for confirmation words
                         if content in ['yes', 'y', 'ok', 'okay', 'confirm', 'proceed', 'go ahead', 'sure', 'alright']:
                             is_confirmation = True
-                            print(f"🔍 DEBUG CONFIRMATION: ✅ Detected confirmation from last user message: '{content}'")
+                            logger.debug("🔍 DEBUG CONFIRMATION: ✅ Detected confirmation from last user message: '%s'", content)
                         # TODO: CONFIRMATION FIX - Also check if this is a contract ID response in upload workflow
                         elif content.isdigit() and params.contract_id and str(params.contract_id) == content:
                             # This is a contract ID response in an upload workflow - treat as confirmation
                             is_confirmation = True
-                            print(f"🔍 DEBUG CONFIRMATION: ✅ Detected contract ID response as confirmation: '{content}'")
+                            logger.debug("🔍 DEBUG CONFIRMATION: ✅ Detected contract ID response as confirmation: '%s'", content)
                         else:
-                            print(f"🔍 DEBUG CONFIRMATION: ❌ Not a confirmation word or contract ID: '{content}'")
+                            logger.debug("🔍 DEBUG CONFIRMATION: ❌ Not a confirmation word or contract ID: '%s'", content)
                     else:
-                        print(f"🔍 DEBUG CONFIRMATION: Last message is not a user message or not dict")
+                        logger.debug("🔍 DEBUG CONFIRMATION: Last message is not a user message or not dict")
                 else:
-                    print(f"🔍 DEBUG CONFIRMATION: No messages found in context")
+                    logger.debug("🔍 DEBUG CONFIRMATION: No messages found in context")
             else:
-                print(f"🔍 DEBUG CONFIRMATION: is_confirmation already True or no context")
+                logger.debug("🔍 DEBUG CONFIRMATION: is_confirmation already True or no context")
             
-            print(f"🔍 DEBUG CONFIRMATION: Final is_confirmation = {is_confirmation}")
+            logger.debug("🔍 DEBUG CONFIRMATION: Final is_confirmation = %s", is_confirmation)
             
             # Check if contract already has a document
             if contract.document_filename and not is_confirmation:
@@ -818,8 +711,8 @@ async def upload_contract_document_tool(params: UploadContractDocumentParams, co
                     existing_file_size_display = "Unknown"
                 
                 # Create download URL for existing document
-                storage_service = SupabaseStorageService()
-                existing_download_url = storage_service.get_contract_document_url(contract.document_file_path) if contract.document_file_path else f"/contracts/{contract.contract_id}/document"
+                storage_service = get_storage_service()
+                existing_download_url = await storage_service.create_signed_url(CONTRACT_DOCUMENTS_BUCKET, contract.document_file_path) if contract.document_file_path else f"/contracts/{contract.contract_id}/document"
                 
                 existing_message = f"📄 **Contract {contract.contract_id} already has a contract document uploaded:**\n\n- **Filename:** [{contract.document_filename}]({existing_download_url})\n- **File Size:** {existing_file_size_display}\n- **Uploaded At:** {contract.document_uploaded_at.strftime('%B %d, %Y, %I:%M %p') if contract.document_uploaded_at else 'N/A'}\n\n⚠️ **Uploading a new contract document will replace the existing one.**\n\n**Please confirm:** Enter 'yes' to continue and replace the existing contract document, or 'no' to cancel."
                 
@@ -844,66 +737,72 @@ async def upload_contract_document_tool(params: UploadContractDocumentParams, co
             
             # TODO: CONFIRMATION FIX - If user confirmed, proceed with upload
             if is_confirmation:
-                print(f"🔍 DEBUG: User confirmed replacement, proceeding with upload")
+                logger.debug("🔍 DEBUG: User confirmed replacement, proceeding with upload")
             
             # Upload document using storage service
-            storage_service = SupabaseStorageService()
+            storage_service = get_storage_service()
             
-            # Convert base64 to file-like object
-            try:
-                # Validate base64 data before decoding
-                if not params.file_data or len(params.file_data) < 10:
-                    return ContractToolResult(
-                        success=False,
-                        message="❌ File data is empty or too short. Please ensure the file was properly uploaded."
-                    )
-                
-                # Clean up base64 string - remove any whitespace and data URL prefixes
-                file_data_clean = params.file_data
-                if file_data_clean.startswith('data:'):
-                    # Split on comma and take the base64 part
-                    parts = file_data_clean.split(',', 1)
-                    if len(parts) == 2:
-                        file_data_clean = parts[1]
-                    else:
+            # Spooled chat uploads are streamed from disk; legacy base64 payloads are decoded
+            spooled_file = file_cache.get_file_handle(params.file_data)
+            if spooled_file:
+                file_obj = spooled_file
+            else:
+                # Convert base64 to file-like object
+                try:
+                    # Validate base64 data before decoding
+                    if not params.file_data or len(params.file_data) < 10:
                         return ContractToolResult(
                             success=False,
-                            message="❌ Invalid data URL format in file data."
+                            message="❌ File data is empty or too short. Please ensure the file was properly uploaded."
                         )
                 
-                # Remove all whitespace and newlines
-                file_data_clean = ''.join(file_data_clean.split())
+                    # Clean up base64 string - remove any whitespace and data URL prefixes
+                    file_data_clean = params.file_data
+                    if file_data_clean.startswith('data:'):
+                        # Split on comma and take the base64 part
+                        parts = file_data_clean.split(',', 1)
+                        if len(parts) == 2:
+                            file_data_clean = parts[1]
+                        else:
+                            return ContractToolResult(
+                                success=False,
+                                message="❌ Invalid data URL format in file data."
+                            )
                 
-                # Add padding if needed for base64 decoding
-                missing_padding = len(file_data_clean) % 4
-                if missing_padding:
-                    file_data_clean += '=' * (4 - missing_padding)
+                    # Remove all whitespace and newlines
+                    file_data_clean = ''.join(file_data_clean.split())
                 
-                print(f"🔍 DEBUG: Base64 data length: {len(file_data_clean)}")
-                print(f"🔍 DEBUG: Base64 data preview: {file_data_clean[:50]}...")
+                    # Add padding if needed for base64 decoding
+                    missing_padding = len(file_data_clean) % 4
+                    if missing_padding:
+                        file_data_clean += '=' * (4 - missing_padding)
+                
+                    logger.debug("🔍 DEBUG: Base64 data length: %s", len(file_data_clean))
+                    logger.debug("🔍 DEBUG: Base64 data preview: %s...", file_data_clean[:50])
+                
+                    # Try to decode directly instead of regex validation
+                    try:
+                        test_decode = base64.b64decode(file_data_clean, validate=True)
+                        logger.debug("🔍 DEBUG: Base64 decode successful, %s bytes", len(test_decode))
+                    except Exception as e:
+                        logger.debug("🔍 DEBUG: Base64 decode failed: %s", e)
+                        return ContractToolResult(
+                            success=False,
+                            message=f"❌ Invalid base64 format: {str(e)}. Please ensure the file was properly encoded."
+                        )
+                
+                    file_content = base64.b64decode(file_data_clean)
+                    file_obj = BytesIO(file_content)
+                    file_obj.filename = params.filename
+                    file_obj.content_type = params.mime_type
                 
-                # Try to decode directly instead of regex validation
-                try:
-                    test_decode = base64.b64decode(file_data_clean, validate=True)
-                    print(f"🔍 DEBUG: Base64 decode successful, {len(test_decode)} bytes")
                 except Exception as e:
-                    print(f"🔍 DEBUG: Base64 decode failed: {e}")
                     return ContractToolResult(
                         success=False,
-                        message=f"❌ Invalid base64 format: {str(e)}. Please ensure the file was properly encoded."
+                        message=f"❌ Failed to decode file data: {str(e)}. Please ensure the file was properly uploaded and encoded."
                     )
-                
-                file_content = base64.b64decode(file_data_clean)
-                file_obj = BytesIO(file_content)
-                file_obj.filename = params.filename
-                file_obj.content_type = params.mime_type
-                
-            except Exception as e:
-                return ContractToolResult(
-                    success=False,
-                    message=f"❌ Failed to decode file data: {str(e)}. Please ensure the file was properly uploaded and encoded."
-                )
             
+
             # Perform upload
             upload_result = await storage_service.upload_contract_document(file_obj, contract.contract_id)
             
@@ -919,6 +818,7 @@ async def upload_contract_document_tool(params: UploadContractDocumentParams, co
                 # Persist changes
                 session.add(contract)
                 await session.commit()
+                await change_events.emit(CONTRACT, contract.contract_id, changed_fields=CONTRACT_DOCUMENT_FIELDS, client_id=contract.client_id)
                 
                 # Format file size for display
                 if contract.document_file_size and contract.document_file_size > 0:
@@ -930,7 +830,7 @@ async def upload_contract_document_tool(params: UploadContractDocumentParams, co
                 # Create download URL - use signed URL from storage service
                 file_path = upload_result.get("file_path")
                 if file_path:
-                    download_url = storage_service.get_contract_document_url(file_path)
+                    download_url = await storage_service.create_signed_url(CONTRACT_DOCUMENTS_BUCKET, file_path)
                 else:
                     download_url = f"/contracts/{contract.contract_id}/document"
                 
@@ -1195,8 +1095,16 @@ async def get_contracts_by_client_tool(client_name: str, context: Optional[Dict[
             if not client:
                 return ContractToolResult(success=False, message=f"❌ Client '{client_name}' not found.")
             
-            contracts_temp = await session.execute(select(Contract).filter(Contract.client_id == client.client_id))
-            contracts = contracts_temp.scalars().all()
+            # One bounded query; the window count reports contracts past the limit
+            contracts_temp = await session.execute(
+                select(Contract, func.count().over().label("total"))
+                .filter(Contract.client_id == client.client_id)
+                .order_by(Contract.contract_id)
+                .limit(LISTING_LIMIT)
+            )
+            rows = contracts_temp.all()
+            contracts = [contract for contract, _ in rows]
+            total_contracts = rows[0][1] if rows else 0
             contract_list = [
                 {
                     "contract_id": contract.contract_id,
@@ -1243,7 +1151,11 @@ async def get_contracts_by_client_tool(client_name: str, context: Optional[Dict[
 
             # Format detailed contract information
             if contracts:
-                contract_details = f"\n\n**Contract Details ({len(contracts)} contracts):**\n"
+                contract_details = f"\n\n**Contract Details ({total_contracts} contracts):**\n"
+                # One signing request for every document on the page
+                document_urls = await get_storage_service().create_signed_urls(
+                    CONTRACT_DOCUMENTS_BUCKET, [contract.document_file_path for contract in contracts if contract.document_filename]
+                )
                 for i, contract in enumerate(contracts, 1):
                     amount = f"${contract.original_amount:,.2f}" if contract.original_amount else "Not set"
                     current_amount = f"${contract.current_amount:,.2f}" if contract.current_amount else "Not set"
@@ -1255,15 +1167,12 @@ async def get_contracts_by_client_tool(client_name: str, context: Optional[Dict[
                     termination = contract.termination_date.strftime('%B %d, %Y') if contract.termination_date else "Not set"
                     notes = contract.notes or "None"
                     if contract.document_filename:
-                        # Get the actual download URL from storage service
-                        try:
-                            from src.services.storage_service import SupabaseStorageService
-                            storage_service = SupabaseStorageService()
-                            download_url = storage_service.get_document_url(contract.document_file_path)
+                        download_url = document_urls.get(contract.document_file_path)
+                        if download_url:
                             # Use only the filename as display text, hide the long URL
                             document_info = f"📄 [{contract.document_filename}]({download_url})"
-                        except Exception as e:
-                            print(f"🔍 DEBUG: Failed to get download URL for contract {contract.contract_id}: {e}")
+                        else:
+                            logger.debug("🔍 DEBUG: No signed download URL for contract %s", contract.contract_id)
                             # Fallback to API endpoint
                             document_url = f"/api/contracts/{contract.contract_id}/document"
                             document_info = f"📄 [{contract.document_filename}]({document_url})"
@@ -1284,20 +1193,22 @@ async def get_contracts_by_client_tool(client_name: str, context: Optional[Dict[
 - **Contract Document:** {document_info}
 - **Notes:** {notes}
 """
+                contract_details += _more_line(len(contracts), total_contracts, "contracts")
             else:
                 contract_details = "\n\n**No contracts found for this client.**"
             
             full_message = client_info + contract_details
             
-            print(f"🔍 DEBUG: get_contracts_by_client_tool - full message length: {len(full_message)}")
-            print(f"🔍 DEBUG: get_contracts_by_client_tool - message preview: {full_message[:300]}...")
+            logger.debug("🔍 DEBUG: get_contracts_by_client_tool - full message length: %s", len(full_message))
+            logger.debug("🔍 DEBUG: get_contracts_by_client_tool - message preview: %s...", full_message[:300])
             
             return ContractToolResult(
                 success=True,
                 message=full_message,
                 data={
                     "client": client_details,
-                    "contracts": contract_list
+                    "contracts": contract_list,
+                    "total_contracts": total_contracts
                 }
             )
     except Exception as e:
@@ -1305,11 +1216,18 @@ async def get_contracts_by_client_tool(client_name: str, context: Optional[Dict[
     
 
 async def get_all_contracts_tool() -> ContractToolResult:
-    """Tool for getting all contracts across all clients"""
+    """Tool for getting all contracts across all clients, one page at a time"""
     try:
         async with get_ai_db() as session:
-            contracts_temp = await session.execute(select(Contract).join(Client).options(selectinload(Contract.client)).order_by(Contract.created_at.desc()))
-            contracts = contracts_temp.scalars().all()
+            # One bounded query; later pages are served from the cached snapshot
+            contracts_temp = await session.execute(
+                select(Contract, func.count().over().label("total"))
+                .join(Client).options(selectinload(Contract.client))
+                .order_by(Contract.created_at.desc())
+                .limit(RESULT_SNAPSHOT_LIMIT)
+            )
+            rows = contracts_temp.all()
+            total_contracts = rows[0][1] if rows else 0
             contract_list = [
                 {
                     "contract_id": contract.contract_id,
@@ -1323,13 +1241,12 @@ async def get_all_contracts_tool() -> ContractToolResult:
                     "document_file_size": contract.document_file_size,
                     "document_uploaded_at": str(contract.document_uploaded_at) if contract.document_uploaded_at else None,
                     "document_download_url": f"/contracts/{contract.contract_id}/document" if contract.document_filename else None,
-                } for contract in contracts
+                } for contract, _ in rows
             ]
-            return ContractToolResult(
-                success=True,
-                message=f"📋 Found {len(contract_list)} contracts across all clients",
-                data={"contracts": contract_list, "count": len(contract_list)}
-            )
+        page = await result_pager.first_page(
+            "contracts", contract_list, f"📋 Found {total_contracts} contracts across all clients", total_contracts
+        )
+        return ContractToolResult(success=True, message=page.message, data=page.data())
     except Exception as e:
         return ContractToolResult(success=False, message=f"❌ Failed to get all contracts: {str(e)}")
  
@@ -1399,11 +1316,10 @@ async def get_contracts_for_next_month_billing_tool(client_name: str = None, con
             tomorrow = today + timedelta(days=1)
             
             # End of next month for reasonable range
-            start_of_this_month = today.replace(day=1)
-            end_of_next_month = (start_of_this_month + relativedelta(months=2)) - timedelta(days=1)
+            end_of_next_month = date_resolver.resolve("next month", today).end
             
-            print(f"🔍 DEBUG: get_contracts_for_next_month_billing - today: {today}, tomorrow: {tomorrow}, end_of_next_month: {end_of_next_month}")
-            print(f"🔍 DEBUG: get_contracts_for_next_month_billing - client_name: {client_name}")
+            logger.debug("🔍 DEBUG: get_contracts_for_next_month_billing - today: %s, tomorrow: %s, end_of_next_month: %s", today, tomorrow, end_of_next_month)
+            logger.debug("🔍 DEBUG: get_contracts_for_next_month_billing - client_name: %s", client_name)
             
             stmt = (
                     select(Contract)
@@ -1421,7 +1337,7 @@ async def get_contracts_for_next_month_billing_tool(client_name: str = None, con
             if client_name:
                 from sqlalchemy import text
                 stmt = stmt.where(text("lower(client_name) LIKE lower(:client_name)").params(client_name=f"%{client_name}%"))
-                print(f"🔍 DEBUG: get_contracts_for_next_month_billing - filtered by client: {client_name}")
+                logger.debug("🔍 DEBUG: get_contracts_for_next_month_billing - filtered by client: %s", client_name)
             contracts_temp = await session.execute(stmt)
             contracts = contracts_temp.scalars().all()
             # 🔧 ENHANCED OUTPUT: Added more contract details for better billing information
@@ -1681,129 +1597,112 @@ class SearchContractsParams(BaseModel):
 
 async def search_contracts_tool(params: SearchContractsParams, context: Dict[str, Any]) -> ContractToolResult:
     """Flexible tool for searching contracts by client, status, or billing date."""
-    # 🚀 PERFORMANCE OPTIMIZATION: Track contract search execution
+    # 🚀 PERFORMANCE OPTIMIZATION: Planned, index-backed search with cached results
     try:
-        async with get_ai_db() as session:
-        
-            filters_applied = []
-
-            stmt = select(Contract).join(Client).options(selectinload(Contract.client))
-
-            if params.client_name:
-                stmt = stmt.where(Client.client_name.ilike(f"%{params.client_name}%"))
-                filters_applied.append(f"client name matching '{params.client_name}'")
-
-            if params.status:
-                if params.status.lower() in ['ongoing', 'active']:
-                    stmt = stmt.where(Contract.status.ilike('active'))
-                    filters_applied.append("status is 'ongoing'")
-                else:
-                    stmt = stmt.where(Contract.status.ilike(f"%{params.status}%"))
-                    filters_applied.append(f"status is '{params.status}'")
-
-            if params.billing_date_next_month:
-                today = context.get('today', date.today()) if context else date.today()
-                end_of_next_month = (today.replace(day=1) + relativedelta(months=2)) - timedelta(days=1)
-                print(f"🔍 DEBUG: Filtering billing dates - today: {today}, end_of_next_month: {end_of_next_month}")
-                stmt = stmt.where(
-                    Contract.billing_prompt_next_date.isnot(None),
-                    Contract.billing_prompt_next_date >= today,
-                    Contract.billing_prompt_next_date <= end_of_next_month
-                )
-                filters_applied.append(f"billing date is from {today} to {end_of_next_month}")
-
-            if params.billing_date_is_null:
-                stmt = stmt.where(Contract.billing_prompt_next_date.is_(None))
-                filters_applied.append("billing date is not set")
-
-            if params.billing_frequency:
-                stmt = stmt.where(Contract.billing_frequency.ilike(f"%{params.billing_frequency}%"))
-                filters_applied.append(f"billing frequency is '{params.billing_frequency}'")
-
-            if params.contract_type:
-                stmt = stmt.where(Contract.contract_type.ilike(f"%{params.contract_type}%"))
-                filters_applied.append(f"contract type is '{params.contract_type}'")
-
-            if params.min_amount is not None:
-                stmt = stmt.where(Contract.original_amount >= params.min_amount)
-                filters_applied.append(f"amount greater than ${params.min_amount:,.2f}")
-
-            if params.max_amount is not None:
-                stmt = stmt.where(Contract.original_amount <= params.max_amount)
-                filters_applied.append(f"amount less than ${params.max_amount:,.2f}")
-
-            if params.start_date_from:
-                try:
-                    start_date = datetime.strptime(params.start_date_from, "%Y-%m-%d").date()
-                    stmt = stmt.where(Contract.start_date >= start_date)
-                    filters_applied.append(f"start date >= {params.start_date_from}")
-                except ValueError:
-                    pass
-
-            if params.start_date_to:
-                try:
-                    end_date = datetime.strptime(params.start_date_to, "%Y-%m-%d").date()
-                    stmt = stmt.where(Contract.start_date <= end_date)
-                    filters_applied.append(f"start date <= {params.start_date_to}")
-                except ValueError:
-                    pass
-
-            stmt = stmt.order_by(Contract.created_at.desc())
-
-            # Execute the statement
-            result = await session.execute(stmt)
-            contracts = result.scalars().all()
-
-            print(f"🔍 DEBUG: Found {len(contracts)} contracts after filtering")
-            for contract in contracts:
-                print(f"🔍 DEBUG: Contract {contract.contract_id} - billing_date: {contract.billing_prompt_next_date}, client: {contract.client.client_name}")
-
-            contract_list = [
-                {
-                    "contract_id": contract.contract_id,
-                    "client_name": contract.client.client_name,
-                    "status": contract.status,
-                    "contract_type": contract.contract_type,
-                    "billing_frequency": contract.billing_frequency,
-                    "original_amount": float(contract.original_amount) if contract.original_amount else None,
-                    "start_date": str(contract.start_date) if contract.start_date else None,
-                    "end_date": str(contract.end_date) if contract.end_date else None,
-                    "billing_prompt_next_date": str(contract.billing_prompt_next_date) if contract.billing_prompt_next_date else 'Not set',
-                } for contract in contracts
-            ]
-
-            message = f"📋 Found {len(contract_list)} contracts"
-            if filters_applied:
-                message += " where " + " and ".join(filters_applied)
-            message += "."
+        today = (context or {}).get('today') or date_resolver.today()
+        plan = plan_contract_search(params, today)
+        cache_key = plan.key + (RESULT_SNAPSHOT_LIMIT,)
+        cached = contract_search_cache.get(cache_key)
+
+        if cached is None:
+            version = contract_search_cache.version
+            async with get_ai_db() as session:
+                # Execute the statement; later pages are served from the cached snapshot
+                result = await session.execute(plan.statement(RESULT_SNAPSHOT_LIMIT))
+                rows = result.all()
+                contracts = [contract for contract, _ in rows]
+                total_contracts = rows[0][1] if rows else 0
+
+                logger.debug("🔍 DEBUG: Found %s contracts after filtering (indexes: %s, free text: %s)",
+                             len(contracts), plan.indexes, plan.free_text)
+                if logger.debug_enabled:
+                    for contract in contracts:
+                        logger.debug("🔍 DEBUG: Contract %s - billing_date: %s, client: %s", contract.contract_id, contract.billing_prompt_next_date, contract.client.client_name)
+
+                contract_list = [
+                    {
+                        "contract_id": contract.contract_id,
+                        "client_name": contract.client.client_name,
+                        "status": contract.status,
+                        "contract_type": contract.contract_type,
+                        "billing_frequency": contract.billing_frequency,
+                        "original_amount": float(contract.original_amount) if contract.original_amount else None,
+                        "start_date": str(contract.start_date) if contract.start_date else None,
+                        "end_date": str(contract.end_date) if contract.end_date else None,
+                        "billing_prompt_next_date": str(contract.billing_prompt_next_date) if contract.billing_prompt_next_date else 'Not set',
+                    } for contract in contracts
+                ]
+
+                message = f"📋 Found {total_contracts} contracts"
+                if plan.filters:
+                    message += " where " + " and ".join(plan.filters)
+                message += "."
+
+                if not params.billing_date_is_null:
+                    count_stmt = select(func.count()).select_from(Contract).where(
+                        Contract.billing_prompt_next_date.is_(None)
+                    )
+                    count_result = await session.execute(count_stmt)
+                    null_billing_date_count = count_result.scalar()
 
-            if not params.billing_date_is_null:
-                count_stmt = select(func.count()).select_from(Contract).where(
-                    Contract.billing_prompt_next_date.is_(None)
-                )
-                count_result = await session.execute(count_stmt)
-                null_billing_date_count = count_result.scalar()
+                    if null_billing_date_count > 0:
+                        message += f" (Note: {null_billing_date_count} contracts have no billing prompt date set.)"
 
-                if null_billing_date_count > 0:
-                    message += f" (Note: {null_billing_date_count} contracts have no billing prompt date set.)"
+            cached = (contract_list, total_contracts, message)
+            contract_search_cache.put(cache_key, cached, version)
 
-            return ContractToolResult(
-                success=True,
-                message=message,
-                data={"contracts": contract_list, "count": len(contract_list)}
-            )
+        contract_list, total_contracts, message = cached
+        page = await result_pager.first_page("contracts", list(contract_list), message, total_contracts)
+        return ContractToolResult(success=True, message=page.message, data=page.data())
     except Exception as e:
         return ContractToolResult(success=False, message=f"❌ Failed to search contracts: {str(e)}")
     
 
+async def _client_summary(session) -> Dict[str, Any]:
+    """Totals across all clients in one grouped aggregate (no per-client queries)."""
+    contract_counts = (
+        select(Contract.client_id, func.count(Contract.contract_id).label("contract_count"))
+        .group_by(Contract.client_id)
+        .subquery()
+    )
+    has_contact = or_(
+        func.nullif(Client.primary_contact_name, "").isnot(None),
+        func.nullif(Client.primary_contact_email, "").isnot(None),
+    )
+    result = await session.execute(
+        select(
+            Client.industry,
+            func.count(Client.client_id),
+            func.count(Client.client_id).filter(has_contact),
+            func.count(contract_counts.c.client_id),
+            func.coalesce(func.sum(contract_counts.c.contract_count), 0),
+        )
+        .outerjoin(contract_counts, contract_counts.c.client_id == Client.client_id)
+        .group_by(Client.industry)
+    )
+
+    summary = {"total_clients": 0, "has_contacts": 0, "clients_with_contracts": 0, "total_contracts": 0, "industries": []}
+    for industry, clients, with_contact, with_contracts, contracts in result.all():
+        summary["total_clients"] += clients
+        summary["has_contacts"] += with_contact
+        summary["clients_with_contracts"] += with_contracts
+        summary["total_contracts"] += int(contracts)
+        if industry:
+            summary["industries"].append(industry)
+    summary["industries"].sort()
+    return summary
+
+
 async def get_all_clients_tool() -> ContractToolResult:
-    """Tool for getting all clients in the system with basic information"""
+    """Tool for getting all clients in the system with basic information, one page at a time"""
     try:
-        # Get all clients
+        # One bounded client query plus one aggregate for the summary, whatever the client count;
+        # later pages are served from the cached snapshot
         async with get_ai_db() as session:
-            stmt = select(Client).order_by(Client.client_name)
+            stmt = select(Client).order_by(Client.client_name).limit(RESULT_SNAPSHOT_LIMIT)
             result = await session.execute(stmt)
             clients = result.scalars().all()
+            summary = await _client_summary(session)
                 
             client_list = []
             for client in clients:
@@ -1817,46 +1716,36 @@ async def get_all_clients_tool() -> ContractToolResult:
                     "created_at": str(client.created_at) if client.created_at else None
                 })
             
-            # Format rich client information
-            message = f"📋 **All Clients ({len(client_list)} clients):**\n\n"
-            
-            for i, client in enumerate(client_list, 1):
-                message += f"**{i}. {client['client_name']}**\n"
-                message += f"- **Industry:** {client['industry'] or 'Not specified'}\n"
-                message += f"- **Primary Contact:** {client['primary_contact_name'] or 'Not specified'}\n"
-                message += f"- **Email:** {client['primary_contact_email'] or 'Not specified'}\n"
-                message += f"- **Company Size:** {client['company_size'] or 'Not specified'}\n"
-                if client['created_at']:
-                    try:
-                        created_date = datetime.fromisoformat(client['created_at'].replace('Z', '+00:00'))
-                        message += f"- **Created:** {created_date.strftime('%B %d, %Y')}\n"
-                    except:
-                        message += f"- **Created:** {client['created_at']}\n"
-                message += f"\n"
-            
-            # Add summary
-            industries = list(set(c["industry"] for c in client_list if c["industry"]))
-            has_contacts = len([c for c in client_list if c["primary_contact_name"] or c["primary_contact_email"]])
-            
-            message += f"**Summary:**\n"
-            message += f"- **Total Clients:** {len(client_list)}\n"
-            message += f"- **Clients with Contact Info:** {has_contacts}\n"
-            if industries:
-                message += f"- **Industries:** {', '.join(industries)}\n"
+        total_clients = summary["total_clients"]
+        industries = summary["industries"]
+        has_contacts = summary["has_contacts"]
 
-            return ContractToolResult(
-                success=True,
-                message=message,
-                data={
-                    "clients": client_list,
-                    "count": len(client_list),
-                    "summary": {
-                        "total_clients": len(client_list),
-                        "industries": industries,
-                        "has_contacts": has_contacts
-                    }
+        # Format rich client information
+        page = await result_pager.first_page(
+            "clients", client_list, f"📋 **All Clients ({total_clients} clients):**", total_clients
+        )
+
+        # Add summary
+        summary_lines = [
+            "**Summary:**",
+            f"- **Total Clients:** {total_clients}",
+            f"- **Clients with Contact Info:** {has_contacts}",
+        ]
+        if industries:
+            summary_lines.append(f"- **Industries:** {', '.join(industries)}")
+
+        return ContractToolResult(
+            success=True,
+            message=page.message + "\n\n" + "\n".join(summary_lines) + "\n",
+            data={
+                **page.data(),
+                "summary": {
+                    "total_clients": total_clients,
+                    "industries": industries,
+                    "has_contacts": has_contacts
                 }
-            )
+            }
+        )
         
     except Exception as e:
         return ContractToolResult(
@@ -1867,22 +1756,43 @@ async def get_all_clients_tool() -> ContractToolResult:
 async def get_all_clients_with_contracts_tool() -> ContractToolResult:
     """Tool for getting all clients with their contracts - comprehensive view"""
     try:
-        # Get all clients
+        # Three set-based queries whatever the client count: a page of clients,
+        # the first contracts of each of those clients, and the overall summary
         async with get_ai_db() as session:
-            stmt = select(Client).order_by(Client.client_name)
+            stmt = select(Client).order_by(Client.client_name).limit(LISTING_LIMIT)
             result = await session.execute(stmt)
             clients = result.scalars().all()
+
+            contracts_by_client: Dict[int, List[Contract]] = {}
+            contract_totals: Dict[int, int] = {}
+            client_ids = [client.client_id for client in clients]
+            if client_ids:
+                ranked = (
+                    select(
+                        Contract,
+                        func.row_number().over(partition_by=Contract.client_id, order_by=Contract.contract_id).label("position"),
+                        func.count().over(partition_by=Contract.client_id).label("client_total"),
+                    )
+                    .filter(Contract.client_id.in_(client_ids))
+                    .subquery()
+                )
+                ranked_contract = aliased(Contract, ranked)
+                contracts = await session.execute(
+                    select(ranked_contract, ranked.c.client_total)
+                    .filter(ranked.c.position <= CONTRACTS_PER_CLIENT_LIMIT)
+                    .order_by(ranked.c.client_id, ranked.c.position)
+                )
+                for contract, client_total in contracts.all():
+                    contracts_by_client.setdefault(contract.client_id, []).append(contract)
+                    contract_totals[contract.client_id] = client_total
+
+            summary = await _client_summary(session)
             
             clients_with_contracts = []
-            total_contracts = 0
             
             for client in clients:
-                # Get all contracts for this client
-                contracts = await session.execute(select(Contract).filter(Contract.client_id == client.client_id))
-                contracts = contracts.scalars().all()
-                
                 contract_list = []
-                for contract in contracts:
+                for contract in contracts_by_client.get(client.client_id, []):
                     contract_list.append({
                         "contract_id": contract.contract_id,
                         "contract_type": contract.contract_type,
@@ -1895,8 +1805,6 @@ async def get_all_clients_with_contracts_tool() -> ContractToolResult:
                         "created_at": str(contract.created_at) if contract.created_at else None
                     })
                 
-                total_contracts += len(contract_list)
-                
                 clients_with_contracts.append({
                     "client_id": client.client_id,
                     "client_name": client.client_name,
@@ -1906,11 +1814,14 @@ async def get_all_clients_with_contracts_tool() -> ContractToolResult:
                     "company_size": client.company_size,
                     "created_at": str(client.created_at) if client.created_at else None,
                     "contracts": contract_list,
-                    "contract_count": len(contract_list)
+                    "contract_count": contract_totals.get(client.client_id, 0)
                 })
             
+            total_clients = summary["total_clients"]
+            total_contracts = summary["total_contracts"]
+
             # Format rich client information similar to get_contracts_by_client_tool
-            message = f"📋 **All Clients Overview ({len(clients_with_contracts)} clients, {total_contracts} total contracts):**\n\n"
+            message = f"📋 **All Clients Overview ({total_clients} clients, {total_contracts} total contracts):**\n\n"
             
             for i, client in enumerate(clients_with_contracts, 1):
                 message += f"**{i}. {client['client_name']}**\n"
@@ -1926,17 +1837,19 @@ async def get_all_clients_with_contracts_tool() -> ContractToolResult:
                         amount = f"${contract['original_amount']:,.2f}" if contract['original_amount'] else "Not set"
                         status = contract['status'].title() if contract['status'] else "Unknown"
                         message += f"    {j}. Contract {contract['contract_id']} - {contract['contract_type']} ({status}) - {amount}\n"
+                    message += _more_line(len(client['contracts']), client['contract_count'], "contracts", indent="    ")
                 else:
                     message += f"  *No contracts*\n"
                 message += f"\n"
+            message += _more_line(len(clients_with_contracts), total_clients, "clients")
             
             # Add summary
-            clients_with_contracts_count = len([c for c in clients_with_contracts if c["contract_count"] > 0])
-            clients_without_contracts_count = len([c for c in clients_with_contracts if c["contract_count"] == 0])
-            industries = list(set(c["industry"] for c in clients_with_contracts if c["industry"]))
+            clients_with_contracts_count = summary["clients_with_contracts"]
+            clients_without_contracts_count = total_clients - clients_with_contracts_count
+            industries = summary["industries"]
             
             message += f"**Summary:**\n"
-            message += f"- **Total Clients:** {len(clients_with_contracts)}\n"
+            message += f"- **Total Clients:** {total_clients}\n"
             message += f"- **Clients with Contracts:** {clients_with_contracts_count}\n"
             message += f"- **Clients without Contracts:** {clients_without_contracts_count}\n"
             message += f"- **Total Contracts:** {total_contracts}\n"
@@ -1949,7 +1862,7 @@ async def get_all_clients_with_contracts_tool() -> ContractToolResult:
                 data={
                     "clients_with_contracts": clients_with_contracts,
                     "summary": {
-                        "total_clients": len(clients_with_contracts),
+                        "total_clients": total_clients,
                         "total_contracts": total_contracts,
                         "clients_with_contracts": clients_with_contracts_count,
                         "clients_without_contracts": clients_without_contracts_count,
@@ -2139,7 +2052,9 @@ async def delete_contract_document_tool(params: DeleteContractDocumentParams) ->
                 # If multiple contracts with documents, ask user to specify which one
                 if len(contracts) > 1:
                     contract_list = []
-                    storage_service = SupabaseStorageService()
+                    document_urls = await get_storage_service().create_signed_urls(
+                        CONTRACT_DOCUMENTS_BUCKET, [c.document_file_path for c in contracts]
+                    )
                     
                     for i, c in enumerate(contracts, 1):
                         amount = f"${c.original_amount:,.2f}" if c.original_amount else "N/A"
@@ -2148,7 +2063,7 @@ async def delete_contract_document_tool(params: DeleteContractDocumentParams) ->
                         
                         # Add download link for the document
                         if c.document_filename:
-                            download_url = storage_service.get_contract_document_url(c.document_file_path) if c.document_file_path else f"/contracts/{c.contract_id}/document"
+                            download_url = document_urls.get(c.document_file_path) or f"/contracts/{c.contract_id}/document"
                             document_info = f"📄 [Download: {c.document_filename}]({download_url})"
                         else:
                             document_info = "No contract document"
@@ -2163,7 +2078,8 @@ async def delete_contract_document_tool(params: DeleteContractDocumentParams) ->
             
             # Delete documents
             deleted_count = 0
-            storage_service = SupabaseStorageService()
+            cleared_contract_ids = []
+            storage_service = get_storage_service()
             
             for contract in contracts:
                 if contract.document_file_path:
@@ -2179,11 +2095,15 @@ async def delete_contract_document_tool(params: DeleteContractDocumentParams) ->
                             contract.document_uploaded_at = None
                             contract.ocr_extracted_data = None
                             deleted_count += 1
+                            cleared_contract_ids.append(contract.contract_id)
                     except Exception as e:
-                        print(f"Warning: Failed to delete document for contract {contract.contract_id}: {str(e)}")
+                        logger.warning("Warning: Failed to delete document for contract %s: %s", contract.contract_id, str(e))
             
             if deleted_count > 0:
                 await session.commit()
+                for contract_id in cleared_contract_ids:
+                    await change_events.emit(CONTRACT, contract_id, changed_fields=CONTRACT_DOCUMENT_FIELDS + ("ocr_extracted_data",),
+                                             client_id=client.client_id)
                 return ContractToolResult(
                     success=True,
                     message=f"✅ Successfully deleted {deleted_count} contract document(s) for **{client.client_name}**"
@@ -2328,7 +2248,8 @@ async def delete_contract_tool(params: DeleteContractParams, context: Optional[D
             
             # Delete contract(s) and their documents
             deleted_count = 0
-            storage_service = SupabaseStorageService()
+            deleted_contract_ids = []
+            storage_service = get_storage_service()
             
             for contract in contracts:
                 try:
@@ -2337,16 +2258,19 @@ async def delete_contract_tool(params: DeleteContractParams, context: Optional[D
                         try:
                             await storage_service.delete_contract_document(contract.document_file_path)
                         except Exception as e:
-                            print(f"Warning: Failed to delete document for contract {contract.contract_id}: {str(e)}")
+                            logger.warning("Warning: Failed to delete document for contract %s: %s", contract.contract_id, str(e))
                     
                     # Delete contract from database
                     await session.delete(contract)
                     deleted_count += 1
+                    deleted_contract_ids.append(contract.contract_id)
                     
                 except Exception as e:
-                    print(f"Warning: Failed to delete contract {contract.contract_id}: {str(e)}")
+                    logger.warning("Warning: Failed to delete contract %s: %s", contract.contract_id, str(e))
             
             await session.commit()
+            for contract_id in deleted_contract_ids:
+                await change_events.emit(CONTRACT, contract_id, DELETED, client_id=client.client_id)
             
             if deleted_count > 0:
                 # Include contract ID in success message if deleting specific contract
@@ -2381,7 +2305,7 @@ async def delete_client_tool(params: DeleteClientParams) -> ContractToolResult:
                 client = await get_client_by_name(params.client_name, session)
             except Exception as e:
                 # If there's a database error (like multiple results), treat as client not found
-                print(f"Database error in delete_client_tool: {e}")
+                logger.error("Database error in delete_client_tool: %s", e)
                 client = None
             
             if not client:
@@ -2456,8 +2380,9 @@ async def delete_client_tool(params: DeleteClientParams) -> ContractToolResult:
             
             # Proceed with deletion (only reached if user confirmed or skip_confirmation is True)
             deleted_contracts = 0
+            deleted_contract_ids = []
             deleted_documents = 0
-            storage_service = SupabaseStorageService()
+            storage_service = get_storage_service()
             
             # Delete all contracts and their documents
             for contract in contracts:
@@ -2468,14 +2393,15 @@ async def delete_client_tool(params: DeleteClientParams) -> ContractToolResult:
                             await storage_service.delete_contract_document(contract.document_file_path)
                             deleted_documents += 1
                         except Exception as e:
-                            print(f"Warning: Failed to delete document for contract {contract.contract_id}: {str(e)}")
+                            logger.warning("Warning: Failed to delete document for contract %s: %s", contract.contract_id, str(e))
                     
                     # Delete contract from database
                     await session.delete(contract)
                     deleted_contracts += 1
+                    deleted_contract_ids.append(contract.contract_id)
                     
                 except Exception as e:
-                    print(f"Warning: Failed to delete contract {contract.contract_id}: {str(e)}")
+                    logger.warning("Warning: Failed to delete contract %s: %s", contract.contract_id, str(e))
             
             # Delete client contacts
             contacts_result = await session.execute(
@@ -2489,11 +2415,14 @@ async def delete_client_tool(params: DeleteClientParams) -> ContractToolResult:
                     await session.delete(contact)
                     deleted_contacts += 1
                 except Exception as e:
-                    print(f"Warning: Failed to delete contact {contact.contact_id}: {str(e)}")
+                    logger.warning("Warning: Failed to delete contact %s: %s", contact.contact_id, str(e))
             
             # Finally, delete the client
             await session.delete(client)
             await session.commit()
+            for contract_id in deleted_contract_ids:
+                await change_events.emit(CONTRACT, contract_id, DELETED, client_id=client.client_id)
+            await change_events.emit(CLIENT, client.client_id, DELETED)
             
             return ContractToolResult(
                 success=True,
@@ -2511,9 +2440,11 @@ async def get_contracts_with_documents_tool(params: SearchContractsParams, conte
     """Get contracts that have documents uploaded for a specific client or all clients"""
     try:
         async with get_ai_db() as session:
-            # Build query for contracts with documents
-            query = select(Contract).options(
-                selectinload(Contract.client)
+            # Contracts with documents and their client names in one bounded query
+            query = select(
+                Contract, Client.client_name, func.count().over().label("total")
+            ).join(
+                Client, Contract.client_id == Client.client_id
             ).filter(
                 Contract.document_filename.isnot(None),
                 Contract.document_filename != ""
@@ -2530,8 +2461,11 @@ async def get_contracts_with_documents_tool(params: SearchContractsParams, conte
                 query = query.filter(Contract.client_id == client.client_id)
             
             # Execute query
-            result = await session.execute(query.order_by(Contract.created_at.desc()))
-            contracts = result.scalars().all()
+            result = await session.execute(query.order_by(Contract.created_at.desc()).limit(LISTING_LIMIT))
+            rows = result.all()
+            contracts = [contract for contract, _, _ in rows]
+            client_names = {contract.contract_id: client_name for contract, client_name, _ in rows}
+            total_contracts = rows[0][2] if rows else 0
             
             if not contracts:
                 client_msg = f" for client '{params.client_name}'" if params.client_name else ""
@@ -2540,7 +2474,10 @@ async def get_contracts_with_documents_tool(params: SearchContractsParams, conte
                     message=f"📄 No contracts with uploaded documents found{client_msg}."
                 )
             
-            # Format the results
+            # Format the results: every document link of the page signed in one request
+            document_urls = await get_storage_service().create_signed_urls(
+                CONTRACT_DOCUMENTS_BUCKET, [contract.document_file_path for contract in contracts]
+            )
             contract_list = []
             for contract in contracts:
                 # Format file size
@@ -2557,15 +2494,14 @@ async def get_contracts_with_documents_tool(params: SearchContractsParams, conte
                 start_date = contract.start_date.strftime('%B %d, %Y') if contract.start_date else "Not set"
                 uploaded_date = contract.document_uploaded_at.strftime('%B %d, %Y, %I:%M %p') if contract.document_uploaded_at else "N/A"
                 
-                contract_info = f"**Contract ID {contract.contract_id}** - {contract.client.client_name}\n"
+                contract_info = f"**Contract ID {contract.contract_id}** - {client_names[contract.contract_id]}\n"
                 contract_info += f"- **Type:** {contract.contract_type}\n"
                 contract_info += f"- **Status:** {contract.status}\n"
                 contract_info += f"- **Amount:** {amount}\n"
                 contract_info += f"- **Start Date:** {start_date}\n"
                 
                 # Create download URL for document
-                storage_service = SupabaseStorageService()
-                download_url = storage_service.get_contract_document_url(contract.document_file_path) if contract.document_file_path else f"/contracts/{contract.contract_id}/document"
+                download_url = document_urls.get(contract.document_file_path) or f"/contracts/{contract.contract_id}/document"
                 
                 contract_info += f"- **Contract Document:** [{contract.document_filename}]({download_url})\n"
                 contract_info += f"- **File Size:** {file_size_display}\n"
@@ -2576,17 +2512,20 @@ async def get_contracts_with_documents_tool(params: SearchContractsParams, conte
             # Create response message
             client_msg = f" for **{params.client_name}**" if params.client_name else ""
             response_message = f"📄 **Contracts with uploaded contract documents{client_msg}:**\n\n" + "\n\n".join(contract_list)
+            more = _more_line(len(contracts), total_contracts, "contracts with documents")
+            if more:
+                response_message += "\n\n" + more
             
             return ContractToolResult(
                 success=True,
                 message=response_message,
                 data={
-                    "contracts_with_documents": len(contracts),
+                    "contracts_with_documents": total_contracts,
                     "client_name": params.client_name,
                     "contracts": [
                         {
                             "contract_id": contract.contract_id,
-                            "client_name": contract.client.client_name,
+                            "client_name": client_names[contract.contract_id],
                             "contract_type": contract.contract_type,
                             "status": contract.status,
                             "original_amount": float(contract.original_amount) if contract.original_amount else None,
@@ -0,0 +1,379 @@
+"""
+Relative date expressions ("last month", "Q3 2025", "between March and May")
+resolved to date ranges for agent tools and the context extractor.
+
+Tools used to carry their own variants (get_date_range rebuilt a dict of
+lambdas and re-ran its regexes per call, the billing tools and timesheets
+computed month/week windows inline). They now share one resolver:
+- Grammar compiled once at import, rules tried in a fixed order; the phrases
+  get_date_range understood resolve exactly as before
+- Calendar and rolling periods: this/last/next week, month, quarter, year and
+  "last/next N days|weeks|months|years"
+- Quarters (Q1, "Q2 2025", "third quarter of 2024") and fiscal years
+  (FY2025, "next fiscal year", "Q1 FY25"), see FISCAL_YEAR_START_MONTH
+- Weekdays ("next monday"), month names, ISO dates, today/yesterday/tomorrow
+- "between X and Y" / "from X to Y" over any two expressions
+- Injectable ``today``; results cached per (expression, today)
+- ``find`` locates an expression inside a free-text message
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dateutil.relativedelta import relativedelta
+
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Month (1-12) fiscal years start in; a fiscal year is named after the calendar year it ends in
+FISCAL_YEAR_START_MONTH = int(os.getenv("FISCAL_YEAR_START_MONTH", "1"))
+DATE_EXPRESSION_CACHE_SIZE = int(os.getenv("DATE_EXPRESSION_CACHE_SIZE", "1024"))
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9, 'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11, 'dec': 12, 'december': 12
+}
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+ORDINAL_QUARTERS = {'first': 1, '1st': 1, 'second': 2, '2nd': 2, 'third': 3, '3rd': 3, 'fourth': 4, '4th': 4}
+# this/last/next and their synonyms as an offset in periods
+RELATIVE_OFFSETS = {'this': 0, 'current': 0, 'last': -1, 'previous': -1, 'past': -1, 'next': 1, 'coming': 1}
+
+_MONTH = r"(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")"
+_WEEKDAY = r"(" + "|".join(WEEKDAYS) + r")"
+_YEAR = r"(\d{4})"
+_FISCAL = r"(?:fy|fiscal year) ?'?(\d{4}|\d{2})"
+
+# Leading words that don't change the range ("in the last 3 months")
+_FILLER = r"(?:(?:in|during|for|over|within|on) )?(?:the )?"
+_WHITESPACE = re.compile(r"\s+")
+_RANGE_JOINER = re.compile(r"\s+(?:and|to|until|till|through|thru|-)\s+")
+
+
+@dataclass(frozen=True)
+class DateRange:
+    """Inclusive date range an expression resolved to"""
+    start: date
+    end: date
+    expression: str = ""
+
+    def as_tuple(self) -> Tuple[date, date]:
+        return self.start, self.end
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"expression": self.expression, "start_date": self.start.isoformat(), "end_date": self.end.isoformat()}
+
+
+# ----------------------------------------------------------------------
+# Period arithmetic
+# ----------------------------------------------------------------------
+
+def month_range(year: int, month: int) -> Tuple[date, date]:
+    start = date(year, month, 1)
+    return start, start + relativedelta(months=1) - timedelta(days=1)
+
+
+def year_range(year: int) -> Tuple[date, date]:
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def week_start(day: date) -> date:
+    """Monday of the week ``day`` falls in"""
+    return day - timedelta(days=day.weekday())
+
+
+def quarter_range(year: int, quarter: int) -> Tuple[date, date]:
+    start = date(year, 3 * (quarter - 1) + 1, 1)
+    return start, start + relativedelta(months=3) - timedelta(days=1)
+
+
+def fiscal_year_range(fiscal_year: int, start_month: int = None) -> Tuple[date, date]:
+    start_month = start_month or FISCAL_YEAR_START_MONTH
+    start = date(fiscal_year if start_month == 1 else fiscal_year - 1, start_month, 1)
+    return start, start + relativedelta(years=1) - timedelta(days=1)
+
+
+def fiscal_year_of(day: date, start_month: int = None) -> int:
+    start_month = start_month or FISCAL_YEAR_START_MONTH
+    return day.year + 1 if start_month != 1 and day.month >= start_month else day.year
+
+
+def _full_year(value: str) -> int:
+    return int(value) if len(value) == 4 else 2000 + int(value)
+
+
+def _relative_period(today: date, offset: int, unit: str) -> Tuple[date, date]:
+    """The week/month/quarter/year ``offset`` periods from the current one"""
+    if unit == 'week':
+        start = week_start(today) + timedelta(weeks=offset)
+        return start, start + timedelta(days=6)
+    if unit == 'month':
+        anchor = today + relativedelta(months=offset)
+        return month_range(anchor.year, anchor.month)
+    if unit == 'quarter':
+        anchor = date(today.year, 3 * ((today.month - 1) // 3) + 1, 1) + relativedelta(months=3 * offset)
+        return quarter_range(anchor.year, (anchor.month - 1) // 3 + 1)
+    return year_range((today + relativedelta(years=offset)).year)
+
+
+def _last_n(today: date, count: int, unit: str) -> Tuple[date, date]:
+    """The ``count`` complete periods before the current one"""
+    if unit == 'day':
+        return today - timedelta(days=count), today - timedelta(days=1)
+    if unit == 'week':
+        return week_start(today) - timedelta(weeks=count), week_start(today) - timedelta(days=1)
+    if unit == 'month':
+        return ((today - relativedelta(months=count)).replace(day=1),
+                (today - relativedelta(months=1)).replace(day=1) + relativedelta(months=1) - timedelta(days=1))
+    return (today - relativedelta(years=count)).replace(month=1, day=1), (today - relativedelta(years=1)).replace(month=12, day=31)
+
+
+def _next_n(today: date, count: int, unit: str) -> Tuple[date, date]:
+    """From the start of the next period to ``count`` periods from today"""
+    if unit == 'day':
+        return today + timedelta(days=1), today + timedelta(days=count)
+    if unit == 'week':
+        return week_start(today) + timedelta(weeks=1), today + timedelta(weeks=count)
+    if unit == 'month':
+        return (today + relativedelta(months=1)).replace(day=1), today + relativedelta(months=count)
+    return date(today.year + 1, 1, 1), today + relativedelta(years=count)
+
+
+def _unit(word: str) -> str:
+    return word.rstrip('s')
+
+
+# ----------------------------------------------------------------------
+# Grammar
+# ----------------------------------------------------------------------
+
+def _relative(match, today):
+    return _relative_period(today, RELATIVE_OFFSETS[match.group(1)], match.group(2))
+
+
+def _next_year_month(match, today):
+    return month_range(today.year + 1, MONTHS[match.group(1)])
+
+
+def _last_count(match, today):
+    return _last_n(today, int(match.group(1)), _unit(match.group(2)))
+
+
+def _next_count(match, today):
+    return _next_n(today, int(match.group(1)), _unit(match.group(2)))
+
+
+def _named_day(match, today):
+    day = today + timedelta(days={'today': 0, 'yesterday': -1, 'tomorrow': 1}[match.group(1)])
+    return day, day
+
+
+def _iso_date(match, today):
+    day = date.fromisoformat(match.group(1))
+    return day, day
+
+
+def _quarter(match, today):
+    return quarter_range(int(match.group(2) or today.year), int(match.group(1)))
+
+
+def _year_quarter(match, today):
+    return quarter_range(int(match.group(1)), int(match.group(2)))
+
+
+def _ordinal_quarter(match, today):
+    return quarter_range(int(match.group(2) or today.year), ORDINAL_QUARTERS[match.group(1)])
+
+
+def _fiscal_quarter(match, today):
+    start = fiscal_year_range(_full_year(match.group(2)))[0] + relativedelta(months=3 * (int(match.group(1)) - 1))
+    return start, start + relativedelta(months=3) - timedelta(days=1)
+
+
+def _fiscal_year(match, today):
+    return fiscal_year_range(_full_year(match.group(1)))
+
+
+def _relative_fiscal_year(match, today):
+    return fiscal_year_range(fiscal_year_of(today) + RELATIVE_OFFSETS[match.group(1)])
+
+
+def _weekday(match, today):
+    """A weekday of this week; "next"/"last" are the nearest one after/before today"""
+    qualifier, weekday = match.group(1), WEEKDAYS.index(match.group(2))
+    if qualifier in ('next', 'coming'):
+        day = today + timedelta(days=(weekday - today.weekday() - 1) % 7 + 1)
+    elif qualifier in ('last', 'previous', 'past'):
+        day = today - timedelta(days=(today.weekday() - weekday - 1) % 7 + 1)
+    else:
+        day = week_start(today) + timedelta(days=weekday)
+    return day, day
+
+
+def _relative_month_name(match, today):
+    """"next march" is the next March after this month, "last march" the one before it"""
+    qualifier, month = match.group(1), MONTHS[match.group(2)]
+    year = today.year
+    if qualifier in ('next', 'coming') and month <= today.month:
+        year += 1
+    elif qualifier in ('last', 'previous', 'past') and month >= today.month:
+        year -= 1
+    return month_range(year, month)
+
+
+def _month_name(match, today):
+    return month_range(int(match.group(2) or today.year), MONTHS[match.group(1)])
+
+
+def _year(match, today):
+    return year_range(int(match.group(1)))
+
+
+@dataclass(frozen=True)
+class DateRule:
+    name: str
+    pattern: str
+    handler: Callable[[Any, date], Tuple[date, date]]
+    # Legacy get_date_range rules match anywhere in the text; the rest match the whole expression
+    search: bool = False
+    # Pattern used by find() in free text, when it must be stricter than ``pattern``; "" to skip
+    find_pattern: Optional[str] = None
+
+
+# Tried in order; the first four reproduce get_date_range, in its order
+DATE_RULES = (
+    DateRule("relative_period", r"(this|current|last|previous|next|coming) (week|month|quarter|year)", _relative),
+    DateRule("next_year_month", r"next year.*?(jan|january|feb|february|mar|march|apr|april|may|jun|june|jul|july|aug|august|sep|september|oct|october|nov|november|dec|december)",
+             _next_year_month, search=True, find_pattern=r"next year,? in " + _MONTH),
+    DateRule("last_count", r"last (\d+) (months?|years?)", _last_count, search=True),
+    DateRule("next_count_months", r"next (\d+) (months?)", _next_count, search=True),
+    DateRule("last_count_periods", r"(?:last|past|previous) (\d+) (days?|weeks?|months?|years?)", _last_count),
+    DateRule("next_count_periods", r"(?:next|coming) (\d+) (days?|weeks?|months?|years?)", _next_count),
+    DateRule("named_day", r"(today|yesterday|tomorrow)", _named_day),
+    DateRule("iso_date", r"(\d{4}-\d{2}-\d{2})", _iso_date),
+    DateRule("fiscal_quarter", r"q([1-4]) (?:of )?" + _FISCAL, _fiscal_quarter),
+    DateRule("quarter", r"q([1-4])(?: (?:of )?" + _YEAR + r")?", _quarter),
+    DateRule("year_quarter", _YEAR + r" q([1-4])", _year_quarter),
+    DateRule("ordinal_quarter", r"(first|1st|second|2nd|third|3rd|fourth|4th) quarter(?: (?:of )?" + _YEAR + r")?", _ordinal_quarter),
+    DateRule("relative_fiscal_year", r"(this|current|last|previous|next|coming) (?:fy|fiscal year)", _relative_fiscal_year),
+    DateRule("fiscal_year", _FISCAL, _fiscal_year),
+    DateRule("weekday", r"(?:(this|next|coming|last|previous|past) )?" + _WEEKDAY, _weekday),
+    DateRule("relative_month_name", r"(this|next|coming|last|previous|past) " + _MONTH, _relative_month_name),
+    # Bare month names and years are too ambiguous in free text ("may I", contract numbers)
+    DateRule("month_name", _MONTH + r",?(?: (?:of )?" + _YEAR + r")?", _month_name,
+             find_pattern=r"(?:(?:in|during|for) )?" + _MONTH + r",? (?:of )?" + _YEAR + r"|(?:in|during|for) " + _MONTH),
+    DateRule("year", r"(?:year )?" + _YEAR, _year, find_pattern=r"(?:in|during|for) (?:the year )?" + _YEAR),
+)
+
+_COMPILED_RULES = tuple(
+    (rule, re.compile(rule.pattern) if rule.search else re.compile(_FILLER + rule.pattern))
+    for rule in DATE_RULES
+)
+# Month names do count in free text as both ends of a range
+_MONTH_SPAN = r"(?:between|from) " + _MONTH + r"(?:,? " + _YEAR + r")?" + _RANGE_JOINER.pattern + _MONTH + r"(?:,? " + _YEAR + r")?"
+_FIND_PATTERNS = tuple(
+    re.compile(r"(?<![\w-])(?:" + pattern + r")(?![\w-])")
+    for pattern in [rule.find_pattern if rule.find_pattern is not None else rule.pattern for rule in DATE_RULES] + [_MONTH_SPAN]
+    if pattern
+)
+_BETWEEN = re.compile(_FILLER + r"(?:(?:between|from) )?(.+?)" + _RANGE_JOINER.pattern + r"(.+)")
+_BETWEEN_PREFIX = re.compile(r"(?:between|from)\s+$")
+
+
+def normalize_expression(text: str) -> str:
+    return _WHITESPACE.sub(" ", (text or "").lower()).strip(" .,;:!?")
+
+
+class DateExpressionResolver:
+    """Resolves date expressions to ranges, caching results per (expression, today)."""
+
+    def __init__(self, today_provider: Callable[[], date] = date.today, cache_size: int = DATE_EXPRESSION_CACHE_SIZE):
+        self.today_provider = today_provider
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve_uncached)
+        self._finds = 0
+
+    def today(self) -> date:
+        return self.today_provider()
+
+    def resolve(self, text: str, today: date = None) -> Optional[DateRange]:
+        """The range ``text`` refers to relative to ``today``; None if it isn't a date expression."""
+        expression = normalize_expression(text)
+        if not expression:
+            return None
+        return self._resolve_cached(expression, today or self.today())
+
+    def resolve_range(self, text: str, today: date = None) -> Tuple[Optional[date], Optional[date]]:
+        """``resolve`` as a (start, end) tuple, (None, None) when unresolved"""
+        resolved = self.resolve(text, today)
+        return resolved.as_tuple() if resolved else (None, None)
+
+    def _resolve_uncached(self, expression: str, today: date) -> Optional[DateRange]:
+        for rule, pattern in _COMPILED_RULES:
+            match = pattern.search(expression) if rule.search else pattern.fullmatch(expression)
+            if match:
+                try:
+                    start, end = rule.handler(match, today)
+                except (ValueError, OverflowError) as e:
+                    logger.debug("📅 Date expression '%s' (%s) is out of range: %s", expression, rule.name, e)
+                    return None
+                return DateRange(start, end, expression)
+
+        between = _BETWEEN.fullmatch(expression)
+        if between:
+            first, last = self._resolve_cached(between.group(1), today), self._resolve_cached(between.group(2), today)
+            if first and last and first.start <= last.end:
+                return DateRange(first.start, last.end, expression)
+        return None
+
+    def find(self, text: str, today: date = None) -> Optional[DateRange]:
+        """The first date expression in a free-text message, resolved; "between X and Y" spans both."""
+        self._finds += 1
+        message = _WHITESPACE.sub(" ", (text or "").lower())
+        match = self._first_match(message, 0)
+        if match is None:
+            return None
+        start, end = match.span()
+
+        joiner = _RANGE_JOINER.match(message, end)
+        prefix = _BETWEEN_PREFIX.search(message, 0, start)
+        if joiner and prefix:
+            second = self._first_match(message, joiner.end(), anchored=True)
+            if second is not None:
+                span = self.resolve(message[prefix.start():second.end()], today)
+                if span:
+                    return span
+        return self.resolve(message[start:end], today)
+
+    @staticmethod
+    def _first_match(message: str, pos: int, anchored: bool = False):
+        """Earliest (then longest) expression match at or after ``pos``"""
+        best = None
+        for pattern in _FIND_PATTERNS:
+            match = pattern.match(message, pos) if anchored else pattern.search(message, pos)
+            if match and (best is None or (match.start(), -match.end()) < (best.start(), -best.end())):
+                best = match
+        return best
+
+    def get_stats(self) -> Dict[str, Any]:
+        info = self._resolve_cached.cache_info()
+        requests = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "entries": info.currsize,
+            "hit_rate": info.hits / requests if requests else 0.0,
+            "finds": self._finds,
+        }
+
+    def clear_cache(self):
+        self._resolve_cached.cache_clear()
+
+
+# Global instance
+date_resolver = DateExpressionResolver()
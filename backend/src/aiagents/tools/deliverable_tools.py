@@ -1,13 +1,13 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, or_, case, func, literal, distinct
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from decimal import Decimal
-from src.database.core.database import get_db
+from src.database.core.database import get_ai_db
 from src.database.core.models import Client, Contract, Deliverable
-from src.database.core.schemas import DeliverableCreate
-from src.database.api.clients import get_client_by_name
-from src.database.api.deliverables import create_deliverable
+from src.aiagents.tools.result_paging import RESULT_SNAPSHOT_LIMIT
 
 class DeliverableToolResult(BaseModel):
     success: bool
@@ -26,317 +26,367 @@ class SmartDeliverableParams(BaseModel):
     assigned_employee_name: Optional[str] = None
     billing_amount: Optional[Decimal] = None
 
-def smart_create_deliverable_tool(params: SmartDeliverableParams, context: Dict[str, Any] = None, db: Session = None) -> DeliverableToolResult:
+# Contract statuses a new deliverable can be attached to
+OPEN_CONTRACT_STATUSES = ("draft", "active")
+
+
+@asynccontextmanager
+async def use_session(session: Optional[AsyncSession] = None):
+    """Reuse the caller's AsyncSession, or open one for the duration of the tool call"""
+    if session is not None:
+        yield session
+    else:
+        async with get_ai_db() as new_session:
+            yield new_session
+
+
+def _client_name_filter(client_name: str):
+    """
+    Name matching done in the database instead of over every client row:
+    the search inside the name, the name inside the search, or any search
+    word longer than 3 characters inside the name.
+    """
+    search = client_name.lower().strip()
+    conditions = [
+        Client.client_name.ilike(f"%{search}%"),
+        literal(search).contains(func.lower(Client.client_name)),
+    ]
+    conditions += [Client.client_name.ilike(f"%{word}%") for word in search.split() if len(word) > 3 and word != search]
+    return or_(*conditions)
+
+
+async def match_clients(session: AsyncSession, client_name: str) -> List[Any]:
+    """
+    Clients matching ``client_name`` with their contract and deliverable counts, in one query.
+
+    An exact (case-insensitive) match wins over partial matches.
+    """
+    stmt = (
+        select(
+            Client,
+            func.count(distinct(Contract.contract_id)).label("contract_count"),
+            func.count(distinct(Deliverable.deliverable_id)).label("deliverable_count"),
+        )
+        .outerjoin(Contract, Contract.client_id == Client.client_id)
+        .outerjoin(Deliverable, Deliverable.contract_id == Contract.contract_id)
+        .where(_client_name_filter(client_name))
+        .group_by(Client.client_id)
+        .order_by(Client.client_id)
+    )
+    rows = (await session.execute(stmt)).all()
+    search = client_name.lower().strip()
+    exact = [row for row in rows if row[0].client_name.lower() == search]
+    return exact[:1] or rows
+
+
+def _client_options(rows: List[Any], count_label: str) -> str:
+    options = []
+    for i, (client, contract_count, deliverable_count) in enumerate(rows, 1):
+        client_info = f"{i}. **{client.client_name}**"
+        if client.industry:
+            client_info += f" (Industry: {client.industry})"
+        count = contract_count if count_label == "contract" else deliverable_count
+        client_info += f" - {count} {count_label}(s)"
+        options.append(client_info)
+    return "\n".join(options)
+
+
+def _word_filter(search_term: str, *columns):
+    """Any word of ``search_term`` inside any of ``columns`` (case-insensitive)"""
+    words = search_term.lower().split() or [""]
+    return or_(*(column.ilike(f"%{word}%") for word in words for column in columns))
+
+
+async def search_deliverables_with_client_info(session: AsyncSession, search_term: str,
+                                               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Deliverables whose name, description or client name contains any word of
+    ``search_term``, with their client and contract, in one bounded query.
+    """
+    stmt = (
+        select(
+            Deliverable.deliverable_id, Deliverable.name, Deliverable.description, Deliverable.contract_id,
+            Contract.client_id, Client.client_name, Deliverable.status, Deliverable.due_date,
+            Deliverable.billing_basis,
+        )
+        .join(Contract, Deliverable.contract_id == Contract.contract_id)
+        .join(Client, Contract.client_id == Client.client_id)
+        .where(_word_filter(search_term, Client.client_name, Deliverable.name, Deliverable.description))
+        .order_by(Deliverable.deliverable_id)
+        .limit(limit or RESULT_SNAPSHOT_LIMIT)
+    )
+    rows = (await session.execute(stmt)).all()
+    return [
+        {
+            "deliverable_id": row.deliverable_id,
+            "name": row.name,
+            "description": row.description,
+            "contract_id": row.contract_id,
+            "client_id": row.client_id,
+            "client_name": row.client_name,
+            "status": row.status,
+            "due_date": row.due_date,
+            "billing_basis": row.billing_basis,
+        }
+        for row in rows
+    ]
+
+
+def _deliverable_item(deliverable: Deliverable) -> Dict[str, Any]:
+    return {
+        "deliverable_id": deliverable.deliverable_id,
+        "name": deliverable.name,
+        "description": deliverable.description,
+        "status": deliverable.status,
+        "billing_basis": deliverable.billing_basis,
+        "due_date": str(deliverable.due_date) if deliverable.due_date else None,
+        "assigned_employees": deliverable.assigned_employees,
+        "billing_amount": float(deliverable.billing_amount) if deliverable.billing_amount else None
+    }
+
+
+async def smart_create_deliverable_tool(params: SmartDeliverableParams, context: Dict[str, Any] = None,
+                                        session: AsyncSession = None) -> DeliverableToolResult:
     """Smart tool for creating deliverables by client name and contract reference"""
     try:
-        if db is None:
-            db = next(get_db())
-        
         # Extract user_id from context
         if not context or 'user_id' not in context:
             return DeliverableToolResult(
                 success=False,
                 message="❌ User context not available. Please ensure you're authenticated."
             )
-        
+
         user_id = context['user_id']
-        
-        contract = None
-        
-        if params.contract_id:
-            # Use specific contract ID
-            contract = db.query(Contract).filter(Contract.contract_id == params.contract_id).first()
-            if not contract:
-                return DeliverableToolResult(
-                    success=False,
-                    message=f"❌ Contract with ID {params.contract_id} not found."
-                )
-        else:
-            # Find client and their latest active contract
-            # Search for clients that match the client name
-            matching_clients = []
-            
-            all_clients = db.query(Client).all()
-            for client in all_clients:
-                client_name_lower = client.client_name.lower()
-                search_name_lower = params.client_name.lower()
-                
-                # Exact match first
-                if client_name_lower == search_name_lower:
-                    matching_clients = [client]
-                    break
-                
-                # Partial match
-                if (search_name_lower in client_name_lower or 
-                    client_name_lower in search_name_lower or
-                    any(word in client_name_lower for word in search_name_lower.split() if len(word) > 3)):
-                    matching_clients.append(client)
-            
-            if len(matching_clients) == 0:
-                return DeliverableToolResult(
-                    success=False,
-                    message=f"❌ Client '{params.client_name}' not found. Please create the client and contract first."
-                )
-            
-            elif len(matching_clients) > 1:
-                # Multiple clients found - ask user to clarify
-                client_options = []
-                for i, client in enumerate(matching_clients, 1):
-                    # Count contracts for each client
-                    contract_count = db.query(Contract).filter(Contract.client_id == client.client_id).count()
-                    client_info = f"{i}. **{client.client_name}**"
-                    if client.industry:
-                        client_info += f" (Industry: {client.industry})"
-                    client_info += f" - {contract_count} contract(s)"
-                    client_options.append(client_info)
-                
-                return DeliverableToolResult(
-                    success=False,
-                    message=f"🔍 Found multiple clients matching '{params.client_name}'. Please specify which client you meant:\n\n" + 
-                           "\n".join(client_options) + 
-                           f"\n\nPlease rephrase your request with the full client name (e.g., 'Add deliverable \"{params.deliverable_name}\" for [Full Client Name]')."
-                )
-            
-            # Single client found
-            client = matching_clients[0]
-            
-            # Get the most recent active contract for this client
-            contract = db.query(Contract).filter(
-                Contract.client_id == client.client_id,
-                Contract.status.in_(["draft", "active"])
-            ).order_by(Contract.created_at.desc()).first()
-            
-            if not contract:
-                # Check if client has any contracts at all
-                any_contract = db.query(Contract).filter(Contract.client_id == client.client_id).first()
-                if any_contract:
+
+        async with use_session(session) as session:
+            if params.contract_id:
+                # Use specific contract ID
+                row = (await session.execute(
+                    select(Contract, Client.client_name)
+                    .join(Client, Contract.client_id == Client.client_id)
+                    .where(Contract.contract_id == params.contract_id)
+                )).first()
+                if not row:
                     return DeliverableToolResult(
                         success=False,
-                        message=f"❌ Client '{client.client_name}' has contracts but none are active. Please activate a contract or create a new one first."
+                        message=f"❌ Contract with ID {params.contract_id} not found."
                     )
-                else:
+                contract, client_name = row
+            else:
+                # Find client and their latest active contract
+                matching_clients = await match_clients(session, params.client_name)
+
+                if len(matching_clients) == 0:
+                    return DeliverableToolResult(
+                        success=False,
+                        message=f"❌ Client '{params.client_name}' not found. Please create the client and contract first."
+                    )
+
+                elif len(matching_clients) > 1:
+                    # Multiple clients found - ask user to clarify
+                    return DeliverableToolResult(
+                        success=False,
+                        message=f"🔍 Found multiple clients matching '{params.client_name}'. Please specify which client you meant:\n\n" +
+                               _client_options(matching_clients, "contract") +
+                               f"\n\nPlease rephrase your request with the full client name (e.g., 'Add deliverable \"{params.deliverable_name}\" for [Full Client Name]')."
+                    )
+
+                # Single client found
+                client = matching_clients[0][0]
+                client_name = client.client_name
+
+                # The most recent open contract; any other contract only tells us none are open
+                contract = (await session.execute(
+                    select(Contract)
+                    .where(Contract.client_id == client.client_id)
+                    .order_by(
+                        case((Contract.status.in_(OPEN_CONTRACT_STATUSES), 0), else_=1),
+                        Contract.created_at.desc()
+                    )
+                    .limit(1)
+                )).scalars().first()
+
+                if not contract:
                     return DeliverableToolResult(
                         success=False,
                         message=f"❌ No contracts found for client '{client.client_name}'. Please create a contract first before adding deliverables."
                     )
-        
-        # Parse due date
-        due_date_obj = None
-        if params.due_date:
-            try:
-                due_date_obj = date.fromisoformat(params.due_date)
-            except ValueError:
-                pass
-        
-        # Create deliverable using the existing API
-        deliverable_data = DeliverableCreate(
-            contract_id=contract.contract_id,
-            name=params.deliverable_name,
-            description=params.description,
-            assigned_employees=params.assigned_employees or 1,
-            due_date=due_date_obj,
-            billing_basis=params.billing_basis,
-            billing_amount=params.billing_amount,
-            assigned_employee_name=params.assigned_employee_name,
-            status="Not Started"
-        )
-        
-        result = create_deliverable(deliverable_data, db)
-        
-        return DeliverableToolResult(
-            success=True,
-            message=f"✅ Deliverable '{params.deliverable_name}' created successfully for client '{contract.client.client_name}' (Contract ID: {contract.contract_id}, Deliverable ID: {result.deliverable_id})",
-            data={
-                "deliverable_id": result.deliverable_id,
-                "deliverable_name": result.name,
-                "contract_id": contract.contract_id,
-                "client_id": contract.client_id,
-                "client_name": contract.client.client_name,
-                "contract_type": contract.contract_type,
-                "billing_basis": result.billing_basis,
-                "status": result.status,
-                "due_date": str(result.due_date) if result.due_date else None,
-                "assigned_employees": result.assigned_employees,
-                "billing_amount": float(result.billing_amount) if result.billing_amount else None
-            }
-        )
-        
-    except Exception as e:
-        return DeliverableToolResult(
-            success=False,
-            message=f"❌ Failed to create deliverable: {str(e)}"
-        )
+                if contract.status not in OPEN_CONTRACT_STATUSES:
+                    return DeliverableToolResult(
+                        success=False,
+                        message=f"❌ Client '{client.client_name}' has contracts but none are active. Please activate a contract or create a new one first."
+                    )
+
+            # Parse due date
+            due_date_obj = None
+            if params.due_date:
+                try:
+                    due_date_obj = date.fromisoformat(params.due_date)
+                except ValueError:
+                    pass
+
+            result = (await session.execute(
+                insert(Deliverable)
+                .values(
+                    contract_id=contract.contract_id,
+                    name=params.deliverable_name,
+                    description=params.description,
+                    assigned_employees=params.assigned_employees or 1,
+                    due_date=due_date_obj,
+                    billing_basis=params.billing_basis,
+                    billing_amount=params.billing_amount,
+                    assigned_employee_name=params.assigned_employee_name,
+                    client_name=client_name,
+                    status="Not Started",
+                    created_by=user_id,
+                    updated_by=user_id,
+                )
+                .returning(Deliverable)
+            )).scalar_one()
+            await session.commit()
 
-def get_deliverables_by_client_tool(client_name: str, db: Session = None) -> DeliverableToolResult:
-    """Tool for getting all deliverables for a specific client by name"""
-    try:
-        if db is None:
-            db = next(get_db())
-        
-        # Find client by name using the same smart matching
-        matching_clients = []
-        
-        all_clients = db.query(Client).all()
-        for client in all_clients:
-            client_name_lower = client.client_name.lower()
-            search_name_lower = client_name.lower()
-            
-            # Exact match first
-            if client_name_lower == search_name_lower:
-                matching_clients = [client]
-                break
-            
-            # Partial match
-            if (search_name_lower in client_name_lower or 
-                client_name_lower in search_name_lower or
-                any(word in client_name_lower for word in search_name_lower.split() if len(word) > 3)):
-                matching_clients.append(client)
-        
-        if len(matching_clients) == 0:
-            return DeliverableToolResult(
-                success=False,
-                message=f"❌ Client '{client_name}' not found."
-            )
-        
-        elif len(matching_clients) > 1:
-            client_options = []
-            for i, client in enumerate(matching_clients, 1):
-                deliverable_count = db.query(Deliverable).join(Contract).filter(Contract.client_id == client.client_id).count()
-                client_info = f"{i}. **{client.client_name}**"
-                if client.industry:
-                    client_info += f" (Industry: {client.industry})"
-                client_info += f" - {deliverable_count} deliverable(s)"
-                client_options.append(client_info)
-            
             return DeliverableToolResult(
-                success=False,
-                message=f"🔍 Found multiple clients matching '{client_name}'. Please specify which client you meant:\n\n" + 
-                       "\n".join(client_options)
+                success=True,
+                message=f"✅ Deliverable '{params.deliverable_name}' created successfully for client '{client_name}' (Contract ID: {contract.contract_id}, Deliverable ID: {result.deliverable_id})",
+                data={
+                    "deliverable_id": result.deliverable_id,
+                    "deliverable_name": result.name,
+                    "contract_id": contract.contract_id,
+                    "client_id": contract.client_id,
+                    "client_name": client_name,
+                    "contract_type": contract.contract_type,
+                    "billing_basis": result.billing_basis,
+                    "status": result.status,
+                    "due_date": str(result.due_date) if result.due_date else None,
+                    "assigned_employees": result.assigned_employees,
+                    "billing_amount": float(result.billing_amount) if result.billing_amount else None
+                }
             )
-        
-        # Single client found
-        client = matching_clients[0]
-        
-        # Get all deliverables for this client across all contracts
-        deliverables = db.query(Deliverable).join(Contract).filter(Contract.client_id == client.client_id).all()
-        
-        deliverable_list = []
-        for deliverable in deliverables:
-            deliverable_list.append({
-                "deliverable_id": deliverable.deliverable_id,
-                "name": deliverable.name,
-                "description": deliverable.description,
-                "contract_id": deliverable.contract_id,
-                "contract_type": deliverable.contract.contract_type,
-                "status": deliverable.status,
-                "billing_basis": deliverable.billing_basis,
-                "due_date": str(deliverable.due_date) if deliverable.due_date else None,
-                "assigned_employees": deliverable.assigned_employees,
-                "billing_amount": float(deliverable.billing_amount) if deliverable.billing_amount else None
-            })
-        
-        return DeliverableToolResult(
-            success=True,
-            message=f"📋 Found {len(deliverable_list)} deliverables for client '{client.client_name}'",
-            data={
-                "client_name": client.client_name,
-                "deliverables": deliverable_list,
-                "count": len(deliverable_list)
-            }
-        )
-        
+
     except Exception as e:
         return DeliverableToolResult(
             success=False,
-            message=f"❌ Failed to get deliverables: {str(e)}"
+            message=f"❌ Failed to create deliverable: {str(e)}"
         )
 
-def get_deliverables_by_contract_tool(client_name: str, contract_id: Optional[int] = None, db: Session = None) -> DeliverableToolResult:
-    """Tool for getting deliverables for a specific contract by client name and optional contract ID"""
+async def get_deliverables_by_client_tool(client_name: str, session: AsyncSession = None) -> DeliverableToolResult:
+    """Tool for getting all deliverables for a specific client by name"""
     try:
-        if db is None:
-            db = next(get_db())
-        
-        contract = None
-        
-        if contract_id:
-            # Use specific contract ID
-            contract = db.query(Contract).filter(Contract.contract_id == contract_id).first()
-            if not contract:
-                return DeliverableToolResult(
-                    success=False,
-                    message=f"❌ Contract with ID {contract_id} not found."
-                )
-        else:
-            # Find client and their latest contract
-            client = get_client_by_name(client_name, db)
-            if not client:
+        async with use_session(session) as session:
+            # Find client by name using the same smart matching
+            matching_clients = await match_clients(session, client_name)
+
+            if len(matching_clients) == 0:
                 return DeliverableToolResult(
                     success=False,
                     message=f"❌ Client '{client_name}' not found."
                 )
-            
-            # Get the most recent contract for this client
-            contract = db.query(Contract).filter(
-                Contract.client_id == client.client_id
-            ).order_by(Contract.created_at.desc()).first()
-            
-            if not contract:
+
+            elif len(matching_clients) > 1:
                 return DeliverableToolResult(
                     success=False,
-                    message=f"❌ No contracts found for client '{client.client_name}'."
+                    message=f"🔍 Found multiple clients matching '{client_name}'. Please specify which client you meant:\n\n" +
+                           _client_options(matching_clients, "deliverable")
                 )
-        
-        # Get all deliverables for this specific contract
-        deliverables = db.query(Deliverable).filter(Deliverable.contract_id == contract.contract_id).all()
-        
-        deliverable_list = []
-        for deliverable in deliverables:
-            deliverable_list.append({
-                "deliverable_id": deliverable.deliverable_id,
-                "name": deliverable.name,
-                "description": deliverable.description,
-                "status": deliverable.status,
-                "billing_basis": deliverable.billing_basis,
-                "due_date": str(deliverable.due_date) if deliverable.due_date else None,
-                "assigned_employees": deliverable.assigned_employees,
-                "billing_amount": float(deliverable.billing_amount) if deliverable.billing_amount else None
-            })
-        
+
+            # Single client found
+            client = matching_clients[0][0]
+
+            # All deliverables for this client across all contracts, with the contract type
+            rows = (await session.execute(
+                select(Deliverable, Contract.contract_type)
+                .join(Contract, Deliverable.contract_id == Contract.contract_id)
+                .where(Contract.client_id == client.client_id)
+                .order_by(Deliverable.deliverable_id)
+            )).all()
+
+            deliverable_list = []
+            for deliverable, contract_type in rows:
+                item = _deliverable_item(deliverable)
+                item.update({"contract_id": deliverable.contract_id, "contract_type": contract_type})
+                deliverable_list.append(item)
+
+            return DeliverableToolResult(
+                success=True,
+                message=f"📋 Found {len(deliverable_list)} deliverables for client '{client.client_name}'",
+                data={
+                    "client_name": client.client_name,
+                    "deliverables": deliverable_list,
+                    "count": len(deliverable_list)
+                }
+            )
+
+    except Exception as e:
         return DeliverableToolResult(
-            success=True,
-            message=f"📋 Found {len(deliverable_list)} deliverables for contract {contract.contract_id} (Client: {contract.client.client_name})",
-            data={
-                "contract_id": contract.contract_id,
-                "client_name": contract.client.client_name,
-                "contract_type": contract.contract_type,
-                "deliverables": deliverable_list,
-                "count": len(deliverable_list)
-            }
+            success=False,
+            message=f"❌ Failed to get deliverables: {str(e)}"
         )
-        
+
+async def get_deliverables_by_contract_tool(client_name: str, contract_id: Optional[int] = None,
+                                            session: AsyncSession = None) -> DeliverableToolResult:
+    """Tool for getting deliverables for a specific contract by client name and optional contract ID"""
+    try:
+        async with use_session(session) as session:
+            stmt = select(Contract, Client.client_name).join(Client, Contract.client_id == Client.client_id)
+            if contract_id:
+                # Use specific contract ID
+                stmt = stmt.where(Contract.contract_id == contract_id)
+            else:
+                # The most recent contract of the best matching client; exact names first
+                search = client_name.lower().strip()
+                stmt = stmt.where(Client.client_name.ilike(f"%{search}%")).order_by(
+                    case((func.lower(Client.client_name) == search, 0), else_=1),
+                    Client.created_at.desc(),
+                    Contract.created_at.desc()
+                ).limit(1)
+            row = (await session.execute(stmt)).first()
+
+            if not row:
+                if contract_id:
+                    message = f"❌ Contract with ID {contract_id} not found."
+                else:
+                    message = f"❌ No contracts found for client '{client_name}'."
+                return DeliverableToolResult(success=False, message=message)
+            contract, contract_client_name = row
+
+            # Get all deliverables for this specific contract
+            deliverables = (await session.execute(
+                select(Deliverable)
+                .where(Deliverable.contract_id == contract.contract_id)
+                .order_by(Deliverable.deliverable_id)
+            )).scalars().all()
+
+            deliverable_list = [_deliverable_item(deliverable) for deliverable in deliverables]
+
+            return DeliverableToolResult(
+                success=True,
+                message=f"📋 Found {len(deliverable_list)} deliverables for contract {contract.contract_id} (Client: {contract_client_name})",
+                data={
+                    "contract_id": contract.contract_id,
+                    "client_name": contract_client_name,
+                    "contract_type": contract.contract_type,
+                    "deliverables": deliverable_list,
+                    "count": len(deliverable_list)
+                }
+            )
+
     except Exception as e:
         return DeliverableToolResult(
             success=False,
             message=f"❌ Failed to get contract deliverables: {str(e)}"
         )
 
-def search_deliverables_tool(search_term: str, db: Session = None) -> DeliverableToolResult:
+async def search_deliverables_tool(search_term: str, session: AsyncSession = None) -> DeliverableToolResult:
     """Tool for searching deliverables by name, description, or client name"""
     try:
-        if db is None:
-            db = next(get_db())
-        
-        # Use the existing API function for smart search
-        from  src.database.api.deliverables import search_deliverables_with_client_info
-        
-        deliverables = search_deliverables_with_client_info(search_term, db)
-        
+        async with use_session(session) as session:
+            deliverables = await search_deliverables_with_client_info(session, search_term)
+
         # Convert date objects to strings to avoid JSON serialization issues
         for deliverable in deliverables:
             if deliverable.get('due_date') and hasattr(deliverable['due_date'], 'isoformat'):
                 deliverable['due_date'] = deliverable['due_date'].isoformat()
-        
+
         return DeliverableToolResult(
             success=True,
             message=f"🔍 Found {len(deliverables)} deliverables matching '{search_term}'",
@@ -346,7 +396,7 @@ def search_deliverables_tool(search_term: str, db: Session = None) -> Deliverabl
                 "search_term": search_term
             }
         )
-        
+
     except Exception as e:
         return DeliverableToolResult(
             success=False,
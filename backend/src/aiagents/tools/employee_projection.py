@@ -0,0 +1,132 @@
+"""
+Shared employee projection loader for the employee listing tools.
+
+The listing tools used to query each employee's profile separately and build
+a new Supabase client per employee to sign its document links. The loader
+serves them all the same way:
+- Employees and their profiles in one joined query (document metadata lives
+  on the employee row)
+- Document download links signed in one request per bucket, and only for
+  tools that show them
+- The process-wide storage service, so links already signed are served from
+  its signed-URL cache
+- Per-call query and signing-request counts recorded in the metrics collector
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+
+from src.database.core.models import Employee, User
+from src.services.storage_service import EMPLOYEE_CONTRACT_BUCKET, EMPLOYEE_NDA_BUCKET, get_storage_service
+from ..performance.metrics_collector import increment_counter, set_gauge
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+NDA_BUCKET = EMPLOYEE_NDA_BUCKET
+CONTRACT_BUCKET = EMPLOYEE_CONTRACT_BUCKET
+
+
+@dataclass
+class EmployeeProjection:
+    """An employee row with its profile and signed document links"""
+    employee: Employee
+    profile: Optional[User]
+    nda_document_url: Optional[str] = None
+    contract_document_url: Optional[str] = None
+
+    @property
+    def full_name(self) -> str:
+        return self.profile.full_name if self.profile else "Unknown"
+
+    def profile_data(self) -> Dict[str, Any]:
+        profile = self.profile
+        return {
+            "first_name": profile.first_name if profile else None,
+            "last_name": profile.last_name if profile else None,
+            "email": profile.email if profile else None,
+            "full_name": self.full_name,
+        }
+
+    def document_data(self, kind: str) -> Dict[str, Any]:
+        """Metadata and download link of the employee's ``nda`` or ``contract`` document."""
+        emp = self.employee
+        file_path = getattr(emp, f"{kind}_document_file_path")
+        uploaded_at = getattr(emp, f"{kind}_document_uploaded_at")
+        return {
+            "filename": getattr(emp, f"{kind}_document_filename"),
+            "file_size": getattr(emp, f"{kind}_document_file_size"),
+            "mime_type": getattr(emp, f"{kind}_document_mime_type"),
+            "uploaded_at": uploaded_at.isoformat() if uploaded_at else None,
+            "has_document": file_path is not None,
+            "download_url": getattr(self, f"{kind}_document_url") if file_path else None,
+        }
+
+
+class EmployeeProjectionLoader:
+    """Loads employee projections for one tool call and accounts for its round trips"""
+
+    def __init__(self, session, tool_name: str):
+        self.session = session
+        self.tool_name = tool_name
+        self.queries = 0
+        self.storage_requests = 0
+
+    async def load(
+        self,
+        *filters,
+        require_profile: bool = True,
+        order_by=None,
+        limit: Optional[int] = None,
+        search=None
+    ) -> List[EmployeeProjection]:
+        """Employees matching ``filters`` (and ``search``, ranked) with their profiles, in one query."""
+        stmt = select(Employee, User).join(
+            User, Employee.profile_id == User.user_id, isouter=not require_profile
+        )
+        if filters:
+            stmt = stmt.filter(*filters)
+        if search is not None:
+            stmt = search.apply(stmt)
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        self.queries += 1
+        result = await self.session.execute(stmt)
+        return [EmployeeProjection(employee, profile) for employee, profile in result.all()]
+
+    async def resolve_document_links(self, projections: List[EmployeeProjection]):
+        """Sign every NDA and contract document of ``projections`` in one request per bucket."""
+        nda_paths = [p.employee.nda_document_file_path for p in projections if p.employee.nda_document_file_path]
+        contract_paths = [p.employee.contract_document_file_path for p in projections if p.employee.contract_document_file_path]
+        if not nda_paths and not contract_paths:
+            return
+
+        storage_service = get_storage_service()
+        nda_urls: Dict[str, str] = {}
+        contract_urls: Dict[str, str] = {}
+        if nda_paths:
+            self.storage_requests += 1
+            nda_urls = await storage_service.create_signed_urls(NDA_BUCKET, nda_paths)
+        if contract_paths:
+            self.storage_requests += 1
+            contract_urls = await storage_service.create_signed_urls(CONTRACT_BUCKET, contract_paths)
+
+        for projection in projections:
+            emp = projection.employee
+            if emp.nda_document_file_path:
+                projection.nda_document_url = nda_urls.get(emp.nda_document_file_path, '')
+            if emp.contract_document_file_path:
+                projection.contract_document_url = contract_urls.get(emp.contract_document_file_path, '')
+
+    def record_metrics(self):
+        """Publish this call's round trips (latest per tool as gauges, running totals as counters)."""
+        set_gauge(f"{self.tool_name}_db_queries", self.queries)
+        set_gauge(f"{self.tool_name}_storage_requests", self.storage_requests)
+        increment_counter("employee_projection_db_queries", self.queries)
+        increment_counter("employee_projection_storage_requests", self.storage_requests)
+        logger.debug("📊 %s: %s queries, %s storage requests", self.tool_name, self.queries, self.storage_requests)
@@ -0,0 +1,122 @@
+"""
+Indexed employee search for search_employees_tool.
+
+Free-text employee searches used to OR together ``ilike('%term%')`` predicates
+over profile names, job title, department and employee number, which Postgres
+can only answer with a sequential scan, and returned rows unranked. Searches
+go through a search document per employee (``employee_search_documents``,
+kept current by triggers, see SQLScripts/employee_search.sql) once
+EMPLOYEE_FULLTEXT_SEARCH is enabled:
+- Weighted tsvector (names > job title/department > other fields) matched with
+  prefix tsqueries, answered from its GIN index
+- Typo tolerance via trigram word similarity on the flattened text, answered
+  from its GIN trigram index
+- Relevance ranking: ts_rank_cd of the tsquery plus trigram word similarity
+- "starts with" queries match name prefixes only
+- EXPLAIN helpers that report whether a search is served by the indexes
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, literal, literal_column, or_
+
+from src.database.core.models import Employee, EmployeeSearchDocument
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+# Off by default: the search needs the table and indexes from employee_search.sql,
+# so enable it once that script has been applied (ilike matching until then)
+FULLTEXT_SEARCH_ENABLED = os.getenv("EMPLOYEE_FULLTEXT_SEARCH", "false").lower() in ("1", "true", "yes")
+
+# Rendered inline so EXPLAIN can compile searches with literal binds
+TEXT_SEARCH_CONFIG = literal_column("'simple'")
+
+SEARCH_INDEXES = ("idx_employee_search_vector", "idx_employee_search_text_trgm")
+
+_STARTS_WITH = re.compile(
+    r"^(?:employees?\s+)?(?:(?:whose\s+)?names?\s+)?(?:starts?|starting|begins?|beginning)\s+with\s+(.+)$",
+    re.IGNORECASE
+)
+# tsquery syntax characters never reach to_tsquery: only word characters are kept
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class EmployeeSearch:
+    """A parsed free-text employee search"""
+    term: str
+    tokens: tuple
+    prefix_only: bool = False
+
+    @classmethod
+    def parse(cls, search_term: str) -> Optional["EmployeeSearch"]:
+        """Search for ``search_term``; None when it has nothing to match on."""
+        term = (search_term or "").strip()
+        prefix_only = False
+        starts_with = _STARTS_WITH.match(term)
+        if starts_with:
+            term = starts_with.group(1).strip().strip("'\"")
+            prefix_only = True
+        tokens = tuple(token.lower() for token in _TOKEN.findall(term))
+        if not tokens:
+            return None
+        return cls(term=" ".join(tokens), tokens=tokens, prefix_only=prefix_only)
+
+    @property
+    def tsquery_text(self) -> str:
+        # "starts with" restricts the prefix to name lexemes (weight A)
+        suffix = ":*A" if self.prefix_only else ":*"
+        return " & ".join(f"{token}{suffix}" for token in self.tokens)
+
+    def tsquery(self):
+        return func.to_tsquery(TEXT_SEARCH_CONFIG, self.tsquery_text)
+
+    def condition(self):
+        """Indexable match: full-text prefix match, or a close trigram match for typos."""
+        fulltext = EmployeeSearchDocument.search_vector.op("@@")(self.tsquery())
+        if self.prefix_only:
+            return fulltext
+        return or_(fulltext, EmployeeSearchDocument.search_text.op("%>")(self.term))
+
+    def rank(self):
+        rank = func.ts_rank_cd(EmployeeSearchDocument.search_vector, self.tsquery())
+        if self.prefix_only:
+            return rank
+        return rank + func.word_similarity(literal(self.term), EmployeeSearchDocument.search_text)
+
+    def apply(self, stmt):
+        """Restrict an employee select to this search, best matches first."""
+        return (
+            stmt.join(EmployeeSearchDocument, EmployeeSearchDocument.employee_id == Employee.employee_id)
+            .filter(self.condition())
+            .order_by(self.rank().desc(), Employee.employee_id)
+        )
+
+
+def summarize_plan(plan_lines: List[str]) -> Dict[str, Any]:
+    """Which search indexes an EXPLAIN plan uses and whether it scans employee_search_documents sequentially."""
+    plan = "\n".join(plan_lines)
+    indexes_used = [index for index in SEARCH_INDEXES if index in plan]
+    seq_scan = bool(re.search(r"Seq Scan on employee_search_documents", plan))
+    return {
+        "indexes_used": indexes_used,
+        "seq_scan": seq_scan,
+        "uses_search_indexes": bool(indexes_used) and not seq_scan,
+        "plan": plan_lines,
+    }
+
+
+async def explain_search(session, stmt) -> Dict[str, Any]:
+    """EXPLAIN a search statement and summarize its index usage."""
+    # Compiled for the session's driver, so operator escaping matches what it expects
+    connection = await session.connection()
+    sql = stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    result = await connection.exec_driver_sql(f"EXPLAIN {sql}")
+    summary = summarize_plan([row[0] for row in result.all()])
+    if not summary["uses_search_indexes"]:
+        logger.warning("⚠️ Employee search is not using its indexes: %s", summary["plan"])
+    return summary
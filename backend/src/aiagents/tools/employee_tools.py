@@ -3,10 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, and_, func
 from sqlalchemy.exc import IntegrityError
 import re
-import calendar
 import string
 from datetime import datetime, date, timedelta
-from dateutil.relativedelta import relativedelta
 from pydantic import BaseModel
 from src.database.core.database import get_ai_db
 from src.database.core.models import Employee, User
@@ -15,9 +13,14 @@ from datetime import datetime, date
 from decimal import Decimal
 from datetime import datetime
 # Import storage service to get download URL
-from src.services.storage_service import SupabaseStorageService
+from src.services.storage_service import EMPLOYEE_CONTRACT_BUCKET, EMPLOYEE_NDA_BUCKET, get_storage_service
+from .employee_projection import EmployeeProjectionLoader
+from .date_expressions import date_resolver
+from .employee_search import EmployeeSearch, FULLTEXT_SEARCH_ENABLED
+from .result_paging import PagedListing, RESULT_SNAPSHOT_LIMIT, result_pager
 import base64
 from io import BytesIO
+from src.aiagents.services.file_cache import file_cache
                 
 # Import caching functionality
 from ..performance.cache_decorators import (
@@ -38,6 +41,17 @@ from ..performance.employee_cache import (
     get_cached_employee_search,
     get_cached_profile_by_name
 )
+from ..performance.change_events import EMPLOYEE, CREATED, DELETED, UPDATED, change_events, employee_document_fields
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+async def _employee_changed(employee, action: str, changed_fields=(), **attributes):
+    """Publish a committed employee write with the keys its cache entries are stored under"""
+    await change_events.emit(EMPLOYEE, employee.employee_id, action, changed_fields,
+                             profile_id=str(employee.profile_id) if employee.profile_id else None,
+                             employee_number=employee.employee_number, **attributes)
 
 class EmployeeToolResult(BaseModel):
     """Result object for employee tool operations"""
@@ -45,6 +59,53 @@ class EmployeeToolResult(BaseModel):
     message: str
     data: Optional[Dict[str, Any]] = None
 
+
+def _document_line(label: str, document: Optional[Dict[str, Any]]) -> str:
+    document = document or {}
+    if not document.get('has_document'):
+        return f"     - {label}: Not uploaded"
+    filename = document.get('filename', 'N/A')
+    download_url = document.get('download_url')
+    uploaded = document.get('uploaded_at')
+    link_text = f"[{filename}]({download_url})" if download_url else filename
+    if uploaded:
+        return f"     - {label}: {link_text} — Uploaded: {uploaded}"
+    return f"     - {label}: {link_text}"
+
+
+def format_employee_list_item(number: int, emp: Dict[str, Any]) -> str:
+    """One employee of a listing as markdown lines."""
+    # Robust name fallback chain
+    profile = emp.get('profile') or {}
+    name = (
+        emp.get('employee_name')
+        or profile.get('full_name')
+        or (f"{profile.get('first_name', '').strip()} {profile.get('last_name', '').strip()}".strip() if profile else None)
+        or emp.get('name')
+        or 'N/A'
+    )
+    lines = [
+        f"{number}. **{name}** (ID: {emp.get('employee_id', 'N/A')})",
+        f"   - Employee Number: {emp.get('employee_number', 'N/A')}",
+        f"   - Job Title: {emp.get('job_title', 'N/A')}",
+        f"   - Department: {emp.get('department', 'N/A')}",
+        f"   - Employment Type: {emp.get('employment_type', 'N/A')}",
+        f"   - Status: {emp.get('full_time_part_time', 'N/A')}",
+        f"   - Committed Hours: {emp.get('committed_hours', 'N/A')}",
+        f"   - Rate: {emp.get('rate', 'N/A')} {emp.get('currency', 'USD')}",
+        f"   - Hire Date: {emp.get('hire_date', 'N/A')}",
+    ]
+    if profile:
+        lines.append(f"   - Email: {profile.get('email', 'N/A')}")
+        lines.append(f"   - Phone: {profile.get('phone', 'N/A')}")
+    lines.append("   - **Documents:**")
+    lines.append(_document_line("NDA Document", emp.get('nda_document')))
+    lines.append(_document_line("Contract Document", emp.get('contract_document')))
+    return "\n".join(lines)
+
+
+result_pager.register(PagedListing("employees", "employees", "employees", format_employee_list_item, separator="\n\n"))
+
 class CreateEmployeeParams(BaseModel):
     employee_name: Optional[str] = None
     profile_id: Optional[str] = None
@@ -94,85 +155,8 @@ class DeleteEmployeeParams(BaseModel):
     employee_name: Optional[str] = None
 
 def get_date_range(relative_str, today=None):
-    """Get date range for relative date strings"""
-    if today is None:
-        today = datetime.now().date()
-    
-    # Dictionary mapping for simple cases
-    date_handlers = {
-        "this month": lambda: _get_month_range(today),
-        "this year": lambda: _get_year_range(today),
-        "last month": lambda: _get_month_range(today - relativedelta(months=1)),
-        "last year": lambda: _get_year_range(today - relativedelta(years=1)),
-        "next month": lambda: _get_month_range(today + relativedelta(months=1)),
-        "next year": lambda: _get_year_range(today + relativedelta(years=1)),
-    }
-    
-    # Check simple cases first
-    if relative_str in date_handlers:
-        return date_handlers[relative_str]()
-    
-    # Next year + specific month
-    month_mapping = {
-        'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
-        'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
-        'aug': 8, 'august': 8, 'sep': 9, 'september': 9, 'oct': 10, 'october': 10,
-        'nov': 11, 'november': 11, 'dec': 12, 'december': 12
-    }
-    
-    # Next year in specific month
-    next_year_month_pattern = r"next year.*?(jan|january|feb|february|mar|march|apr|april|may|jun|june|jul|july|aug|august|sep|september|oct|october|nov|november|dec|december)"
-    match = re.search(next_year_month_pattern, relative_str.lower())
-    if match:
-        month_name = match.group(1)
-        month_num = month_mapping[month_name]
-        next_year = today + relativedelta(years=1)
-        return _get_specific_month_range(next_year.year, month_num)
-    
-    # Last N months/years
-    last_period_pattern = r"last (\d+) (months?|years?)"
-    match = re.search(last_period_pattern, relative_str.lower())
-    if match:
-        count = int(match.group(1))
-        period = match.group(2)
-        if 'month' in period:
-            start_date = (today - relativedelta(months=count)).replace(day=1)
-            end_date = (today - relativedelta(months=1)).replace(day=1) + relativedelta(months=1) - timedelta(days=1)
-        else:  # years
-            start_date = (today - relativedelta(years=count)).replace(month=1, day=1)
-            end_date = (today - relativedelta(years=1)).replace(month=12, day=31)
-        return start_date, end_date
-    
-    # Next N months
-    next_period_pattern = r"next (\d+) months?"
-    match = re.search(next_period_pattern, relative_str.lower())
-    if match:
-        count = int(match.group(1))
-        start_date = (today + relativedelta(months=1)).replace(day=1)
-        end_date = today + relativedelta(months=count)
-        return start_date, end_date
-    
-    # Fallback
-    return None, None
-
-def _get_month_range(date):
-    """Get first and last day of month for given date"""
-    start_date = date.replace(day=1)
-    end_date = start_date + relativedelta(months=1) - timedelta(days=1)
-    return start_date, end_date
-
-def _get_year_range(date):
-    """Get first and last day of year for given date"""
-    start_date = date.replace(month=1, day=1)
-    end_date = date.replace(month=12, day=31)
-    return start_date, end_date
-
-def _get_specific_month_range(year, month):
-    """Get first and last day of specific month/year"""
-    start_date = datetime(year, month, 1).date()
-    last_day = calendar.monthrange(year, month)[1]
-    end_date = datetime(year, month, last_day).date()
-    return start_date, end_date
+    """Get date range for relative date strings, (None, None) when not recognised"""
+    return date_resolver.resolve_range(relative_str, today)
 
 def format_file_size(size_bytes):
     """Convert bytes to human readable format"""
@@ -570,16 +554,18 @@ async def create_employee_tool(params: CreateEmployeeParams, context: Dict[str,
                 
                 # Handle document uploads if provided
                 uploaded_documents = []
-                storage_service = SupabaseStorageService()
+                storage_service = get_storage_service()
                 
                 # Upload NDA document if provided
                 if params.nda_document_data and params.nda_document_filename:
                     try:
-                        # Decode base64 data
-                        import base64
-                        file_content = base64.b64decode(params.nda_document_data)
-                        file_obj = BytesIO(file_content)
-                        file_obj.name = params.nda_document_filename
+                        # Spooled chat uploads are streamed from disk; legacy base64 payloads are decoded
+                        file_obj = file_cache.get_file_handle(params.nda_document_data)
+                        if not file_obj:
+                            import base64
+                            file_content = base64.b64decode(params.nda_document_data)
+                            file_obj = BytesIO(file_content)
+                            file_obj.name = params.nda_document_filename
                         
                         # Upload to storage
                         upload_result = await storage_service.upload_employee_nda_document(file_obj, db_employee.employee_id)
@@ -596,16 +582,18 @@ async def create_employee_tool(params: CreateEmployeeParams, context: Dict[str,
                             await session.commit()
                             uploaded_documents.append("NDA document")
                     except Exception as e:
-                        print(f"Warning: Failed to upload NDA document: {str(e)}")
+                        logger.warning("Warning: Failed to upload NDA document: %s", str(e))
                 
                 # Upload contract document if provided
                 if params.contract_document_data and params.contract_document_filename:
                     try:
-                        # Decode base64 data
-                        import base64
-                        file_content = base64.b64decode(params.contract_document_data)
-                        file_obj = BytesIO(file_content)
-                        file_obj.name = params.contract_document_filename
+                        # Spooled chat uploads are streamed from disk; legacy base64 payloads are decoded
+                        file_obj = file_cache.get_file_handle(params.contract_document_data)
+                        if not file_obj:
+                            import base64
+                            file_content = base64.b64decode(params.contract_document_data)
+                            file_obj = BytesIO(file_content)
+                            file_obj.name = params.contract_document_filename
                         
                         # Upload to storage
                         upload_result = await storage_service.upload_employee_contract_document(file_obj, db_employee.employee_id)
@@ -622,7 +610,9 @@ async def create_employee_tool(params: CreateEmployeeParams, context: Dict[str,
                             await session.commit()
                             uploaded_documents.append("Contract document")
                     except Exception as e:
-                        print(f"Warning: Failed to upload contract document: {str(e)}")
+                        logger.warning("Warning: Failed to upload contract document: %s", str(e))
+                
+                await _employee_changed(db_employee, CREATED)
                 
                 # Build success message with document info
                 success_message = f"✅ Employee record created successfully for {employee_name} (Employee ID: {db_employee.employee_id})"
@@ -632,7 +622,7 @@ async def create_employee_tool(params: CreateEmployeeParams, context: Dict[str,
                     
                     # Add NDA document info if uploaded
                     if db_employee.nda_document_file_path:
-                        nda_download_url = storage_service.get_employee_nda_document_url(db_employee.nda_document_file_path)
+                        nda_download_url = await storage_service.create_signed_url(EMPLOYEE_NDA_BUCKET, db_employee.nda_document_file_path)
                         nda_file_size = format_file_size(db_employee.nda_document_file_size) if db_employee.nda_document_file_size else "Unknown size"
                         success_message += f"\n- **Document Type:** NDA"
                         success_message += f"\n- **Filename:** [{db_employee.nda_document_filename}]({nda_download_url})"
@@ -641,7 +631,7 @@ async def create_employee_tool(params: CreateEmployeeParams, context: Dict[str,
                     
                     # Add contract document info if uploaded
                     if db_employee.contract_document_file_path:
-                        contract_download_url = storage_service.get_employee_contract_document_url(db_employee.contract_document_file_path)
+                        contract_download_url = await storage_service.create_signed_url(EMPLOYEE_CONTRACT_BUCKET, db_employee.contract_document_file_path)
                         contract_file_size = format_file_size(db_employee.contract_document_file_size) if db_employee.contract_document_file_size else "Unknown size"
                         success_message += f"\n- **Document Type:** Contract"
                         success_message += f"\n- **Filename:** [{db_employee.contract_document_filename}]({contract_download_url})"
@@ -826,6 +816,7 @@ async def update_employee_tool(params: UpdateEmployeeParams, context: Dict[str,
             
             # Update fields
             update_fields = []
+            previous_employee_number = employee.employee_number
             
             if params.employee_number is not None:
                 employee.employee_number = params.employee_number
@@ -909,6 +900,7 @@ async def update_employee_tool(params: UpdateEmployeeParams, context: Dict[str,
                 # Commit changes - database will raise IntegrityError if constraints violated
                 await session.commit()
                 await session.refresh(employee)
+                await _employee_changed(employee, UPDATED, update_fields, previous_employee_number=previous_employee_number)
                 
                 # TODO: OPTIMIZATION - Minimal profile lookup for name only
                 # We only need the name for formatting, not all profile data
@@ -1102,33 +1094,34 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
         async with get_ai_db() as session:
             # First check if this is a salary query
             salary_params = parse_salary_query(search_term)
-            print(f"🔎 EMP-SEARCH DEBUG | salary_query_detected={salary_params['is_salary_query']} | term='{search_term}' | params={ {k:v for k,v in salary_params.items() if k!='is_salary_query'} }")
+            logger.debug("🔎 EMP-SEARCH DEBUG | salary_query_detected=%s | term='%s' | params=%s", salary_params['is_salary_query'], search_term, {k:v for k,v in salary_params.items() if k!='is_salary_query'})
             
             if salary_params['is_salary_query']:
-                # Build query with salary filtering
-                query = select(Employee).join(User, Employee.profile_id == User.user_id)
+                # Employees and profiles in one query, bounded in SQL
+                loader = EmployeeProjectionLoader(session, "search_employees")
+                filters = []
                 
                 # Apply rate type filter if specified
                 if salary_params['rate_type']:
-                    query = query.where(Employee.rate_type == salary_params['rate_type'])
+                    filters.append(Employee.rate_type == salary_params['rate_type'])
                 
                 # Apply rate range filters
                 if salary_params['min_rate'] is not None:
-                    query = query.where(Employee.rate >= salary_params['min_rate'])
+                    filters.append(Employee.rate >= salary_params['min_rate'])
                 
                 if salary_params['max_rate'] is not None:
-                    query = query.where(Employee.rate <= salary_params['max_rate'])
+                    filters.append(Employee.rate <= salary_params['max_rate'])
                 
                 # Apply currency filter
                 if salary_params['currency']:
-                    query = query.where(Employee.currency == salary_params['currency'])
+                    filters.append(Employee.currency == salary_params['currency'])
                 
                 # Execute query
-                result = await session.execute(query)
-                employees = result.scalars().all()
-                print(f"🔎 EMP-SEARCH DEBUG | salary_query_results count={len(employees)}")
+                projections = await loader.load(*filters, order_by=Employee.employee_id, limit=limit)
+                loader.record_metrics()
+                logger.debug("🔎 EMP-SEARCH DEBUG | salary_query_results count=%s", len(projections))
                 
-                if not employees:
+                if not projections:
                     return EmployeeToolResult(
                         success=True,
                         message=f"No employees found matching the salary criteria: {search_term}",
@@ -1137,15 +1130,8 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
                 
                 # Format results
                 employee_data = []
-                for emp in employees[:limit]:
-                    # Get profile information
-                    profile_query = select(User).where(User.user_id == emp.profile_id)
-                    profile_result = await session.execute(profile_query)
-                    profile = profile_result.scalar_one_or_none()
-                    if not profile:
-                        print(f"⚠️ EMP-SEARCH DEBUG | profile_missing for employee_id={emp.employee_id} profile_id={emp.profile_id}")
-                    else:
-                        print(f"🔎 EMP-SEARCH DEBUG | profile_found employee_id={emp.employee_id} name='{(profile.first_name or '')} {(profile.last_name or '')}'.strip()")
+                for projection in projections:
+                    emp, profile = projection.employee, projection.profile
                     # Always include normalized name fields for renderer
                     employee_data.append({
                         "employee_id": emp.employee_id,
@@ -1189,7 +1175,7 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
                     formatted_message += f"   - Rate: {emp_data.get('rate', 'N/A')} {emp_data.get('rate_type', '')} {emp_data.get('currency', '')}\n"
                     formatted_message += f"   - Email: {profile.get('email', 'N/A')}\n\n"
                 
-                print(f"🔎 EMP-SEARCH DEBUG | salary_query_response count={len(employee_data)} include_profile_keys={all('profile' in e for e in employee_data)} include_employee_name_keys={all('employee_name' in e for e in employee_data)}")
+                logger.debug("🔎 EMP-SEARCH DEBUG | salary_query_response count=%s include_profile_keys=%s include_employee_name_keys=%s", len(employee_data), all('profile' in e for e in employee_data), all('employee_name' in e for e in employee_data))
                 return EmployeeToolResult(
                     success=True,
                     message=formatted_message,
@@ -1249,7 +1235,9 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
                         }]
                         
                         # Get complete employee details including documents
-                        storage_service = SupabaseStorageService()
+                        storage_service = get_storage_service()
+                        nda_download_url = await storage_service.create_signed_url(EMPLOYEE_NDA_BUCKET, employee.nda_document_file_path) if employee.nda_document_file_path else None
+                        contract_download_url = await storage_service.create_signed_url(EMPLOYEE_CONTRACT_BUCKET, employee.contract_document_file_path) if employee.contract_document_file_path else None
                         
                         # Format the employee details as a readable message
                         details_message = f"""📋 Employee Details for {profile.full_name}
@@ -1276,8 +1264,8 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
 - Email: {profile.email}
 
 **Documents:**
-- NDA Document: {'[Download NDA Document](' + storage_service.get_employee_nda_document_url(employee.nda_document_file_path) + ')' if employee.nda_document_file_path else 'Not uploaded'} {f'({employee.nda_document_filename})' if employee.nda_document_filename else ''}
-- Contract Document: {'[Download Contract Document](' + storage_service.get_employee_contract_document_url(employee.contract_document_file_path) + ')' if employee.contract_document_file_path else 'Not uploaded'} {f'({employee.contract_document_filename})' if employee.contract_document_filename else ''}"""
+- NDA Document: {'[Download NDA Document](' + nda_download_url + ')' if employee.nda_document_file_path else 'Not uploaded'} {f'({employee.nda_document_filename})' if employee.nda_document_filename else ''}
+- Contract Document: {'[Download Contract Document](' + contract_download_url + ')' if employee.contract_document_file_path else 'Not uploaded'} {f'({employee.contract_document_filename})' if employee.contract_document_filename else ''}"""
 
                         return EmployeeToolResult(
                             success=True,
@@ -1301,12 +1289,12 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
                                 "nda_document": {
                                     "filename": employee.nda_document_filename,
                                     "has_document": employee.nda_document_file_path is not None,
-                                    "download_url": storage_service.get_employee_nda_document_url(employee.nda_document_file_path) if employee.nda_document_file_path else None
+                                    "download_url": nda_download_url
                                 },
                                 "contract_document": {
                                     "filename": employee.contract_document_filename,
                                     "has_document": employee.contract_document_file_path is not None,
-                                    "download_url": storage_service.get_employee_contract_document_url(employee.contract_document_file_path) if employee.contract_document_file_path else None
+                                    "download_url": contract_download_url
                                 }
                             }
                         )
@@ -1339,6 +1327,7 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
             # Build search filter with variations
             # TODO: If employee queries become incomplete, revert this rate_type field addition
             search_conditions = []
+            employee_search = None
             
             # Handle date-based searches
             if search_term.startswith("start_date:"):
@@ -1377,7 +1366,7 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
                         # Fallback to text search if date parsing fails
                         search_filter = Employee.hire_date.ilike(f"%{date_str}%")
                 except Exception as e:
-                    print(f"Date parsing error: {e}")
+                    logger.error("Date parsing error: %s", e)
                     # Fallback to text search
                     search_filter = Employee.hire_date.ilike(f"%{date_str}%")
             elif search_term.startswith("start_relative:"):
@@ -1391,37 +1380,40 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
                         search_filter = Employee.hire_date.ilike(f"%{relative_str}%")    
 
                 except Exception as e:
-                    print(f"Relative date parsing error: {e}")
+                    logger.error("Relative date parsing error: %s", e)
                     # Fallback to text search
                     search_filter = Employee.hire_date.ilike(f"%{relative_str}%")
             else:
-                # Regular text-based search
-                for term in search_term_variations:
-                    search_conditions.extend([
-                        User.first_name.ilike(f"%{term}%"),
-                        User.last_name.ilike(f"%{term}%"),
-                        Employee.job_title.ilike(f"%{term}%"),
-                        Employee.department.ilike(f"%{term}%"),
-                        Employee.employee_number.ilike(f"%{term}%"),
-                        Employee.employment_type.ilike(f"%{term}%"),
-                        Employee.full_time_part_time.ilike(f"%{term}%"),
-                        Employee.rate_type.ilike(f"%{term}%")  # 🚀 FIX: Add rate_type search for hourly/salary queries
-                    ])
-                
-                search_filter = or_(*search_conditions)
+                # Regular text-based search: ranked, indexed search documents
+                employee_search = EmployeeSearch.parse(search_term) if FULLTEXT_SEARCH_ENABLED else None
+                if employee_search is None:
+                    for term in search_term_variations:
+                        search_conditions.extend([
+                            User.first_name.ilike(f"%{term}%"),
+                            User.last_name.ilike(f"%{term}%"),
+                            Employee.job_title.ilike(f"%{term}%"),
+                            Employee.department.ilike(f"%{term}%"),
+                            Employee.employee_number.ilike(f"%{term}%"),
+                            Employee.employment_type.ilike(f"%{term}%"),
+                            Employee.full_time_part_time.ilike(f"%{term}%"),
+                            Employee.rate_type.ilike(f"%{term}%")  # 🚀 FIX: Add rate_type search for hourly/salary queries
+                        ])
+                    
+                    search_filter = or_(*search_conditions)
         
             # Step 1: Get employees with their profiles in a single query with filters
-            final_join_query = select(Employee, User).join(User, Employee.profile_id == User.user_id, isouter=True).filter(search_filter).limit(limit)
-            employees_with_profiles = await session.execute(final_join_query)
-            # Convert to list to get actual count
-            employees_list = list(employees_with_profiles)
+            loader = EmployeeProjectionLoader(session, "search_employees")
+            if employee_search is not None:
+                projections = await loader.load(require_profile=False, search=employee_search, limit=limit)
+            else:
+                projections = await loader.load(search_filter, require_profile=False, limit=limit)
+            # Step 2: Sign every document link of the page in one request per bucket
+            await loader.resolve_document_links(projections)
+            loader.record_metrics()
 
-            # Replace the entire employee processing section with this:
             employee_list = []
-            for emp, profile in employees_list:
-                # Initialize storage service for document URLs
-                storage_service = SupabaseStorageService()
-                
+            for projection in projections:
+                emp, profile = projection.employee, projection.profile
                 # Build employee data with profile information
                 employee_data = {
                 "employee_id": emp.employee_id,
@@ -1445,12 +1437,12 @@ async def search_employees_tool(search_term: str, limit: int = 50) -> EmployeeTo
                 "nda_document": {
                     "filename": emp.nda_document_filename,
                     "has_document": emp.nda_document_file_path is not None,
-                    "download_url": storage_service.get_employee_nda_document_url(emp.nda_document_file_path) if emp.nda_document_file_path else None
+                    "download_url": projection.nda_document_url
                 },
                 "contract_document": {
                     "filename": emp.contract_document_filename,
                     "has_document": emp.contract_document_file_path is not None,
-                    "download_url": storage_service.get_employee_contract_document_url(emp.contract_document_file_path) if emp.contract_document_file_path else None
+                    "download_url": projection.contract_document_url
                 }
                 }
                 # Add to employee list without any additional filtering
@@ -1520,29 +1512,28 @@ async def get_employee_details_tool(employee_id: int) -> EmployeeToolResult:
         # Always create a fresh database session to avoid session closure issues
         async with get_ai_db() as session:
         
-        # Find employee by ID
-            check_employee = await session.execute(select(Employee).filter(Employee.employee_id == employee_id))
-            employee = check_employee.scalar_one_or_none()
+        # Find employee by ID, with its profile
+            loader = EmployeeProjectionLoader(session, "get_employee_details")
+            projections = await loader.load(Employee.employee_id == employee_id, require_profile=False)
             
-            if not employee:
+            if not projections:
+                loader.record_metrics()
                 return EmployeeToolResult(
                 success=False,
                 message=f"❌ Employee with ID {employee_id} not found."
             )
         
-        # Get profile information
-            check_profile = await session.execute(select(User).filter(User.user_id == employee.profile_id))
-            profile = check_profile.scalar_one_or_none()
-            
-            # Initialize storage service for document URLs
-            storage_service = SupabaseStorageService()
+            projection = projections[0]
+            employee, profile = projection.employee, projection.profile
+            await loader.resolve_document_links(projections)
+            loader.record_metrics()
             
             # Debug: Check if employee has document fields
-            print(f"🔍 DEBUG: Employee document fields:")
-            print(f"  - nda_document_file_path: {employee.nda_document_file_path}")
-            print(f"  - contract_document_file_path: {employee.contract_document_file_path}")
-            print(f"  - nda_document_filename: {employee.nda_document_filename}")
-            print(f"  - contract_document_filename: {employee.contract_document_filename}")
+            logger.debug("🔍 DEBUG: Employee document fields:")
+            logger.debug("  - nda_document_file_path: %s", employee.nda_document_file_path)
+            logger.debug("  - contract_document_file_path: %s", employee.contract_document_file_path)
+            logger.debug("  - nda_document_filename: %s", employee.nda_document_filename)
+            logger.debug("  - contract_document_filename: %s", employee.contract_document_filename)
         
             return EmployeeToolResult(
                 success=True,
@@ -1562,33 +1553,9 @@ async def get_employee_details_tool(employee_id: int) -> EmployeeToolResult:
                 "currency": employee.currency,
                 "nda_document_file_path": employee.nda_document_file_path,
                 "contract_document_file_path": employee.contract_document_file_path,
-                "nda_document": {
-                    "filename": employee.nda_document_filename,
-                    "file_size": employee.nda_document_file_size,
-                    "mime_type": employee.nda_document_mime_type,
-                    "uploaded_at": employee.nda_document_uploaded_at.isoformat() if employee.nda_document_uploaded_at else None,
-                    "download_url": storage_service.get_employee_nda_document_url(employee.nda_document_file_path) if employee.nda_document_file_path else None,
-                    "has_document": employee.nda_document_file_path is not None
-                },
-                "contract_document": {
-                    "filename": employee.contract_document_filename,
-                    "file_size": employee.contract_document_file_size,
-                    "mime_type": employee.contract_document_mime_type,
-                    "uploaded_at": employee.contract_document_uploaded_at.isoformat() if employee.contract_document_uploaded_at else None,
-                    "download_url": storage_service.get_employee_contract_document_url(employee.contract_document_file_path) if employee.contract_document_file_path else None,
-                    "has_document": employee.contract_document_file_path is not None
-                },
-                "profile": {
-                    "first_name": profile.first_name if profile else None,
-                    "last_name": profile.last_name if profile else None,
-                    "email": profile.email if profile else None,
-                    "full_name": profile.full_name if profile else "Unknown"
-                } if profile else {
-                    "first_name": None,
-                    "last_name": None,
-                    "email": None,
-                    "full_name": "Unknown"
-                },
+                "nda_document": projection.document_data("nda"),
+                "contract_document": projection.document_data("contract"),
+                "profile": projection.profile_data(),
                 "created_at": str(employee.created_at) if employee.created_at else None,
                 "updated_at": str(employee.updated_at) if employee.updated_at else None
             }
@@ -1601,59 +1568,31 @@ async def get_employee_details_tool(employee_id: int) -> EmployeeToolResult:
         )
 
 
-@cached_search_operation(cache_ttl=30, track_performance=True)  # Reduced TTL to 30 seconds
+@cached_search_operation(track_performance=True)  # Search TTL; employee change events evict it on writes
 async def get_employees_by_committed_hours_tool(min_hours: int) -> EmployeeToolResult:
     """Tool for getting employees with committed hours greater than or equal to min_hours"""
     try:
         # Always create a fresh database session to avoid session closure issues
         async with get_ai_db() as session:
-            # Get employees with committed hours >= min_hours
-            check_employees = await session.execute(
-                select(Employee)
-                .join(User, Employee.profile_id == User.user_id)
-                .filter(Employee.committed_hours >= min_hours)
-            )
-            employees = check_employees.scalars().all()
-            
-            # Step 1: Get all profile IDs that we need
-            profile_ids = [emp.profile_id for emp in employees if emp.profile_id]
+            # Step 1: Employees with committed hours >= min_hours and their profiles in one query
+            loader = EmployeeProjectionLoader(session, "get_employees_by_committed_hours")
+            projections = await loader.load(Employee.committed_hours >= min_hours)
 
-            # Step 2: Fetch all profiles in one query
-            profiles_result = await session.execute(
-                select(User).filter(User.user_id.in_(profile_ids))
-            )
-            profiles_dict = {profile.user_id: profile for profile in profiles_result.scalars().all()}
+            # Step 2: Sign every document link in one request per bucket
+            await loader.resolve_document_links(projections)
+            loader.record_metrics()
 
-            # Step 3: Build employee list using the profiles dictionary
+            # Step 3: Build employee list from the projections
             employee_list = []
-            for emp in employees:
-                profile = profiles_dict.get(emp.profile_id)
-                
-                # Get document information with download URLs
-                storage_service = SupabaseStorageService()
-                
-                nda_doc = {
-                    "filename": emp.nda_document_filename,
-                    "file_size": emp.nda_document_file_size,
-                    "mime_type": emp.nda_document_mime_type,
-                    "uploaded_at": emp.nda_document_uploaded_at.isoformat() if emp.nda_document_uploaded_at else None,
-                    "has_document": emp.nda_document_file_path is not None,
-                    "download_url": storage_service.get_employee_nda_document_url(emp.nda_document_file_path) if emp.nda_document_file_path else None
-                }
-                
-                contract_doc = {
-                    "filename": emp.contract_document_filename,
-                    "file_size": emp.contract_document_file_size,
-                    "mime_type": emp.contract_document_mime_type,
-                    "uploaded_at": emp.contract_document_uploaded_at.isoformat() if emp.contract_document_uploaded_at else None,
-                    "has_document": emp.contract_document_file_path is not None,
-                    "download_url": storage_service.get_employee_contract_document_url(emp.contract_document_file_path) if emp.contract_document_file_path else None
-                }
+            for projection in projections:
+                emp = projection.employee
+                nda_doc = projection.document_data("nda")
+                contract_doc = projection.document_data("contract")
                 
                 employee_list.append({
                     "employee_id": emp.employee_id,
                     "profile_id": str(emp.profile_id),
-                    "employee_name": profile.full_name if profile else "Unknown",
+                    "employee_name": projection.full_name,
                     "employee_number": emp.employee_number,
                     "job_title": emp.job_title,
                     "department": emp.department,
@@ -1667,17 +1606,7 @@ async def get_employees_by_committed_hours_tool(min_hours: int) -> EmployeeToolR
                     "currency": emp.currency,
                     "nda_document": nda_doc,
                     "contract_document": contract_doc,
-                    "profile": {
-                        "first_name": profile.first_name if profile else None,
-                        "last_name": profile.last_name if profile else None,
-                        "email": profile.email if profile else None,
-                        "full_name": profile.full_name if profile else "Unknown"
-                    } if profile else {
-                        "first_name": None,
-                        "last_name": None,
-                        "email": None,
-                        "full_name": "Unknown"
-                    }
+                    "profile": projection.profile_data()
                 })
             
             return EmployeeToolResult(
@@ -1702,49 +1631,25 @@ async def get_all_employees_tool() -> EmployeeToolResult:
     try:
         # Always create a fresh database session to avoid session closure issues
         async with get_ai_db() as session:
-            # Get all employees with profile information
-            check_employees = await session.execute(select(Employee).join(User, Employee.profile_id == User.user_id))
-            employees = check_employees.scalars().all()
-            
-            # Step 1: Get all profile IDs that we need
-            profile_ids = [emp.profile_id for emp in employees if emp.profile_id]
+            # Step 1: All employees and their profiles in one query
+            loader = EmployeeProjectionLoader(session, "get_all_employees")
+            projections = await loader.load(order_by=Employee.employee_id, limit=RESULT_SNAPSHOT_LIMIT)
 
-            # Step 2: Fetch all profiles in one query
-            profiles_result = await session.execute(
-                select(User).filter(User.user_id.in_(profile_ids))
-            )
-            profiles_dict = {profile.user_id: profile for profile in profiles_result.scalars().all()}
+            # Step 2: Sign every document link in one request per bucket
+            await loader.resolve_document_links(projections)
+            loader.record_metrics()
 
-            # Step 3: Build employee list using the profiles dictionary
+            # Step 3: Build employee list from the projections
             employee_list = []
-            for emp in employees:
-                profile = profiles_dict.get(emp.profile_id)
-                
-                # Get document information with download URLs
-                storage_service = SupabaseStorageService()
-                
-                nda_doc = {
-                    "filename": emp.nda_document_filename,
-                    "file_size": emp.nda_document_file_size,
-                    "mime_type": emp.nda_document_mime_type,
-                    "uploaded_at": emp.nda_document_uploaded_at.isoformat() if emp.nda_document_uploaded_at else None,
-                    "has_document": emp.nda_document_file_path is not None,
-                    "download_url": storage_service.get_employee_nda_document_url(emp.nda_document_file_path) if emp.nda_document_file_path else None
-                }
-                
-                contract_doc = {
-                    "filename": emp.contract_document_filename,
-                    "file_size": emp.contract_document_file_size,
-                    "mime_type": emp.contract_document_mime_type,
-                    "uploaded_at": emp.contract_document_uploaded_at.isoformat() if emp.contract_document_uploaded_at else None,
-                    "has_document": emp.contract_document_file_path is not None,
-                    "download_url": storage_service.get_employee_contract_document_url(emp.contract_document_file_path) if emp.contract_document_file_path else None
-                }
+            for projection in projections:
+                emp = projection.employee
+                nda_doc = projection.document_data("nda")
+                contract_doc = projection.document_data("contract")
                 
                 employee_list.append({
                     "employee_id": emp.employee_id,
                     "profile_id": str(emp.profile_id),  # Keep for internal operations
-                    "employee_name": profile.full_name if profile else "Unknown",  # Add employee_name field
+                    "employee_name": projection.full_name,  # Add employee_name field
                     "employee_number": emp.employee_number,
                     "job_title": emp.job_title,
                     "department": emp.department,
@@ -1758,27 +1663,14 @@ async def get_all_employees_tool() -> EmployeeToolResult:
                     "currency": emp.currency,
                     "nda_document": nda_doc,
                     "contract_document": contract_doc,
-                    "profile": {
-                        "first_name": profile.first_name if profile else None,
-                        "last_name": profile.last_name if profile else None,
-                        "email": profile.email if profile else None,
-                        "full_name": profile.full_name if profile else "Unknown"
-                    } if profile else {
-                        "first_name": None,
-                        "last_name": None,
-                        "email": None,
-                        "full_name": "Unknown"
-                    }
+                    "profile": projection.profile_data()
                 })
             
-            return EmployeeToolResult(
-                success=True,
-                message=f"📋 Found {len(employee_list)} employees in the system",
-                data={
-                    "employees": employee_list,
-                    "count": len(employee_list)
-                }
-            )
+        # First page; later pages are served from the cached snapshot
+        page = await result_pager.first_page(
+            "employees", employee_list, f"**Employees ({len(employee_list)} in the system):**"
+        )
+        return EmployeeToolResult(success=True, message=page.message, data=page.data())
         
     except Exception as e:
         return EmployeeToolResult(
@@ -1889,7 +1781,7 @@ async def delete_employee_tool(params: DeleteEmployeeParams, context: Dict[str,
                     employee_name = employee.profile.first_name or "Unknown"
             
             # Delete associated documents before deleting employee record
-            storage_service = SupabaseStorageService()
+            storage_service = get_storage_service()
             deleted_documents = []
             
             # Delete NDA document if it exists
@@ -1899,7 +1791,7 @@ async def delete_employee_tool(params: DeleteEmployeeParams, context: Dict[str,
                     if nda_deleted:
                         deleted_documents.append("NDA document")
                 except Exception as e:
-                    print(f"Warning: Failed to delete NDA document: {str(e)}")
+                    logger.warning("Warning: Failed to delete NDA document: %s", str(e))
             
             # Delete contract document if it exists
             if employee.contract_document_file_path:
@@ -1908,11 +1800,12 @@ async def delete_employee_tool(params: DeleteEmployeeParams, context: Dict[str,
                     if contract_deleted:
                         deleted_documents.append("Contract document")
                 except Exception as e:
-                    print(f"Warning: Failed to delete contract document: {str(e)}")
+                    logger.warning("Warning: Failed to delete contract document: %s", str(e))
             
             # Delete the employee record
             await session.delete(employee)
             await session.commit()
+            await _employee_changed(employee, DELETED)
             
             # Build success message with document deletion info
             success_message = f"✅ Employee '{employee_name}' (ID: {employee.employee_id}) has been successfully deleted."
@@ -1966,11 +1859,11 @@ class GetEmployeeDocumentParams(BaseModel):
 async def upload_employee_document_tool(params: UploadEmployeeDocumentParams, context: Dict[str, Any] = None) -> EmployeeToolResult:
     """Tool for uploading NDA or contract documents for employees with file handling"""
     try:
-        print(f"🔍 DEBUG: upload_employee_document_tool called with employee_name='{params.employee_name}', document_type='{params.document_type}'")
-        print(f"🔍 DEBUG: Tool params: {params}")
+        logger.debug("🔍 DEBUG: upload_employee_document_tool called with employee_name='%s', document_type='%s'", params.employee_name, params.document_type)
+        logger.debug("🔍 DEBUG: Tool params: %s", params)
         # Add this right after the function starts, around line 1458:
-        print(f"🔍 DEBUG: File_data type: {type(params.file_data)}")
-        print(f"🔍 DEBUG: File_data length: {len(params.file_data)}")   
+        logger.debug("🔍 DEBUG: File_data type: %s", type(params.file_data))
+        logger.debug("🔍 DEBUG: File_data length: %s", len(params.file_data))   
         
         # Validate that employee_name is not a filename (common error pattern)
         if params.employee_name and ('.' in params.employee_name and len(params.employee_name.split('.')) == 2):
@@ -2069,110 +1962,115 @@ async def upload_employee_document_tool(params: UploadEmployeeDocumentParams, co
             # Handle file upload if file_data is provided
             if params.file_data:
                 
-                storage_service = SupabaseStorageService()
+                storage_service = get_storage_service()
                 
-                # Validate and decode base64 file data
-                try:
-                    # Check if file_data is a valid base64 string
-                    if not params.file_data or len(params.file_data) < 10:
-                        return EmployeeToolResult(
-                            success=False,
-                            message="❌ File data is empty or too short. Please ensure the file was properly uploaded."
-                        )
+                # Spooled chat uploads are streamed from disk; legacy base64 payloads are decoded
+                spooled_file = file_cache.get_file_handle(params.file_data)
+                if spooled_file:
+                    file_obj = spooled_file
+                else:
+                    # Validate and decode base64 file data
+                    try:
+                        # Check if file_data is a valid base64 string
+                        if not params.file_data or len(params.file_data) < 10:
+                            return EmployeeToolResult(
+                                success=False,
+                                message="❌ File data is empty or too short. Please ensure the file was properly uploaded."
+                            )
                     
-                    # Remove any data URL prefix if present (e.g., "data:application/pdf;base64,")
-                    file_data_clean = params.file_data
-                    if file_data_clean.startswith('data:'):
-                        # Split on comma and take the base64 part
-                        parts = file_data_clean.split(',', 1)
-                        if len(parts) == 2:
-                            file_data_clean = parts[1]
-                        else:
+                        # Remove any data URL prefix if present (e.g., "data:application/pdf;base64,")
+                        file_data_clean = params.file_data
+                        if file_data_clean.startswith('data:'):
+                            # Split on comma and take the base64 part
+                            parts = file_data_clean.split(',', 1)
+                            if len(parts) == 2:
+                                file_data_clean = parts[1]
+                            else:
+                                return EmployeeToolResult(
+                                    success=False,
+                                    message="❌ Invalid data URL format in file data."
+                                )
+                    
+                        # Clean up base64 string - remove all whitespace and newlines
+                        file_data_clean = ''.join(file_data_clean.split())
+                    
+                        # Enhanced validation and debugging
+                        logger.debug("🔍 DEBUG: File data length: %s", len(file_data_clean))
+                        logger.debug("🔍 DEBUG: Expected file size: %s", params.file_size)
+                    
+                        # Validate base64 string length and characters
+                        if len(file_data_clean) < 4:
                             return EmployeeToolResult(
                                 success=False,
-                                message="❌ Invalid data URL format in file data."
+                                message="❌ Base64 data too short. Please ensure the complete file data is provided."
                             )
                     
-                    # Clean up base64 string - remove all whitespace and newlines
-                    file_data_clean = ''.join(file_data_clean.split())
+                        # Check for valid base64 characters
                     
-                    # Enhanced validation and debugging
-                    print(f"🔍 DEBUG: File data length: {len(file_data_clean)}")
-                    print(f"🔍 DEBUG: Expected file size: {params.file_size}")
+                        valid_chars = string.ascii_letters + string.digits + '+/='
+                        invalid_chars = [c for c in file_data_clean if c not in valid_chars]
+                        if invalid_chars:
+                            logger.debug("🔍 DEBUG: Invalid base64 characters found: %s", set(invalid_chars))
+                            # Try to clean the string
+                            file_data_clean = ''.join(c for c in file_data_clean if c in valid_chars)
+                            logger.debug("🔍 DEBUG: Cleaned data length: %s", len(file_data_clean))
                     
-                    # Validate base64 string length and characters
-                    if len(file_data_clean) < 4:
-                        return EmployeeToolResult(
-                            success=False,
-                            message="❌ Base64 data too short. Please ensure the complete file data is provided."
-                        )
+                        # Add proper padding if missing
+                        missing_padding = len(file_data_clean) % 4
+                        if missing_padding:
+                            file_data_clean += '=' * (4 - missing_padding)
+                            logger.debug("🔍 DEBUG: Added %s padding characters", 4 - missing_padding)
                     
-                    # Check for valid base64 characters
+                        # Try multiple decoding approaches
+                        file_content = None
+                        decode_attempts = [
+                            ("Standard base64 without validation", lambda: base64.b64decode(file_data_clean, validate=False)),
+                            ("URL-safe base64", lambda: base64.urlsafe_b64decode(file_data_clean)),
+                            ("Standard base64 with validation", lambda: base64.b64decode(file_data_clean, validate=True)),
+                        ]
                     
-                    valid_chars = string.ascii_letters + string.digits + '+/='
-                    invalid_chars = [c for c in file_data_clean if c not in valid_chars]
-                    if invalid_chars:
-                        print(f"🔍 DEBUG: Invalid base64 characters found: {set(invalid_chars)}")
-                        # Try to clean the string
-                        file_data_clean = ''.join(c for c in file_data_clean if c in valid_chars)
-                        print(f"🔍 DEBUG: Cleaned data length: {len(file_data_clean)}")
+                        for attempt_name, decode_func in decode_attempts:
+                            try:
+                                logger.debug("🔍 DEBUG: Trying %s decoding...", attempt_name)
+                                file_content = decode_func()
+                                logger.debug("🔍 DEBUG: %s decoding successful! Decoded %s bytes", attempt_name, len(file_content))
+                                break
+                            except Exception as e:
+                                logger.debug("🔍 DEBUG: %s failed: %s", attempt_name, str(e))
+                                continue
                     
-                    # Add proper padding if missing
-                    missing_padding = len(file_data_clean) % 4
-                    if missing_padding:
-                        file_data_clean += '=' * (4 - missing_padding)
-                        print(f"🔍 DEBUG: Added {4 - missing_padding} padding characters")
+                        if file_content is None:
+                            return EmployeeToolResult(
+                                success=False,
+                                message="❌ Failed to decode base64 data with all attempted methods. Please ensure the file data is properly base64 encoded."
+                            )
                     
-                    # Try multiple decoding approaches
-                    file_content = None
-                    decode_attempts = [
-                        ("Standard base64 without validation", lambda: base64.b64decode(file_data_clean, validate=False)),
-                        ("URL-safe base64", lambda: base64.urlsafe_b64decode(file_data_clean)),
-                        ("Standard base64 with validation", lambda: base64.b64decode(file_data_clean, validate=True)),
-                    ]
+                        # Validate file size matches
+                        if len(file_content) != params.file_size:
+                            logger.debug("🔍 DEBUG: File size mismatch - decoded: %s, expected: %s", len(file_content), params.file_size)
+                            # Don't fail on size mismatch, just log it as the frontend might calculate differently
                     
-                    for attempt_name, decode_func in decode_attempts:
-                        try:
-                            print(f"🔍 DEBUG: Trying {attempt_name} decoding...")
-                            file_content = decode_func()
-                            print(f"🔍 DEBUG: {attempt_name} decoding successful! Decoded {len(file_content)} bytes")
-                            break
-                        except Exception as e:
-                            print(f"🔍 DEBUG: {attempt_name} failed: {str(e)}")
-                            continue
+                        logger.debug("🔍 DEBUG: Successfully decoded %s bytes of file data", len(file_content))
                     
-                    if file_content is None:
+                    except Exception as e:
                         return EmployeeToolResult(
                             success=False,
-                            message="❌ Failed to decode base64 data with all attempted methods. Please ensure the file data is properly base64 encoded."
+                            message=f"❌ Failed to decode file data: {str(e)}. Please ensure the file is properly base64 encoded."
                         )
-                    
-                    # Validate file size matches
-                    if len(file_content) != params.file_size:
-                        print(f"🔍 DEBUG: File size mismatch - decoded: {len(file_content)}, expected: {params.file_size}")
-                        # Don't fail on size mismatch, just log it as the frontend might calculate differently
-                    
-                    print(f"🔍 DEBUG: Successfully decoded {len(file_content)} bytes of file data")
-                    
-                except Exception as e:
-                    return EmployeeToolResult(
-                        success=False,
-                        message=f"❌ Failed to decode file data: {str(e)}. Please ensure the file is properly base64 encoded."
-                    )
                 
-                # Create a temporary file-like object
-                file_obj = BytesIO(file_content)
-                file_obj.name = params.filename
+                    # Create a temporary file-like object
+                    file_obj = BytesIO(file_content)
+                    file_obj.name = params.filename
                 
                 # Upload to storage
                 if params.document_type == "nda":
                     upload_result = await storage_service.upload_employee_nda_document(file_obj, employee.employee_id)
                 elif params.document_type == "contract":
-                    print(f"🔍 DEBUG: Starting contract upload for employee {employee.employee_id}")
-                    print(f"🔍 DEBUG: Contract file size: {params.file_size} bytes")
-                    print(f"🔍 DEBUG: Contract filename: {params.filename}")
+                    logger.debug("🔍 DEBUG: Starting contract upload for employee %s", employee.employee_id)
+                    logger.debug("🔍 DEBUG: Contract file size: %s bytes", params.file_size)
+                    logger.debug("🔍 DEBUG: Contract filename: %s", params.filename)
                     upload_result = await storage_service.upload_employee_contract_document(file_obj, employee.employee_id)
-                    print(f"🔍 DEBUG: Contract upload result: {upload_result}")
+                    logger.debug("🔍 DEBUG: Contract upload result: %s", upload_result)
                 else:
                     return EmployeeToolResult(
                         success=False,
@@ -2220,6 +2118,7 @@ async def upload_employee_document_tool(params: UploadEmployeeDocumentParams, co
             
             await session.commit()
             await session.refresh(employee)
+            await _employee_changed(employee, UPDATED, employee_document_fields(params.document_type))
             
             # Get employee name for response
             profile_result = await session.execute(select(User).filter(User.user_id == employee.profile_id))
@@ -2235,9 +2134,9 @@ async def upload_employee_document_tool(params: UploadEmployeeDocumentParams, co
             # Get download URL
             download_url = ""
             if params.document_type == "nda":
-                download_url = storage_service.get_employee_nda_document_url(file_path)
+                download_url = await storage_service.create_signed_url(EMPLOYEE_NDA_BUCKET, file_path)
             elif params.document_type == "contract":
-                download_url = storage_service.get_employee_contract_document_url(file_path)
+                download_url = await storage_service.create_signed_url(EMPLOYEE_CONTRACT_BUCKET, file_path)
             
             return EmployeeToolResult(
                 success=True,
@@ -2356,7 +2255,7 @@ async def delete_employee_document_tool(params: DeleteEmployeeDocumentParams, co
                 )
             
             # Delete from storage
-            storage_service = SupabaseStorageService()
+            storage_service = get_storage_service()
             
             file_path = employee.nda_document_file_path if params.document_type == "nda" else employee.contract_document_file_path
             delete_success = False
@@ -2398,6 +2297,7 @@ async def delete_employee_document_tool(params: DeleteEmployeeDocumentParams, co
             employee.updated_at = datetime.utcnow()
             
             await session.commit()
+            await _employee_changed(employee, UPDATED, employee_document_fields(params.document_type) + (f"{params.document_type}_ocr_extracted_data",))
             
             # Get employee name for response
             profile_result = await session.execute(select(User).filter(User.user_id == employee.profile_id))
@@ -2512,7 +2412,7 @@ async def get_employee_document_tool(params: GetEmployeeDocumentParams, context:
                 employee_name = "Unknown"
             
             # Check if document exists and build response
-            storage_service = SupabaseStorageService()
+            storage_service = get_storage_service()
             if params.document_type == "nda":
                 if not employee.nda_document_file_path:
                     return EmployeeToolResult(
@@ -2526,7 +2426,7 @@ async def get_employee_document_tool(params: GetEmployeeDocumentParams, context:
                         }
                     )
                 
-                download_url = storage_service.get_employee_nda_document_url(employee.nda_document_file_path)
+                download_url = await storage_service.create_signed_url(EMPLOYEE_NDA_BUCKET, employee.nda_document_file_path)
                 
                 return EmployeeToolResult(
                     success=True,
@@ -2559,7 +2459,7 @@ async def get_employee_document_tool(params: GetEmployeeDocumentParams, context:
                         }
                     )
                 
-                download_url = storage_service.get_employee_contract_document_url(employee.contract_document_file_path)
+                download_url = await storage_service.create_signed_url(EMPLOYEE_CONTRACT_BUCKET, employee.contract_document_file_path)
                 
                 return EmployeeToolResult(
                     success=True,
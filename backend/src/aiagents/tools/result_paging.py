@@ -0,0 +1,234 @@
+"""
+Cursor paging for large tool results inside the conversation.
+
+The listing tools (all contracts, contract search, all clients, all employees)
+used to render every matching row into one markdown message, which went into
+the LLM context and the stored conversation state. They now answer with a page:
+- One bounded query per listing (RESULT_SNAPSHOT_LIMIT rows); the rows are kept
+  in the "result_pages" cache so later pages need no database work
+- The first page plus an opaque cursor; the tool executor stores the cursor in
+  state['data'] and "show more" / "next page" resumes from it
+- ListRenderer joins pre-rendered items and stops at an item cap and a
+  character cap, so a page never outgrows the context budget
+- Expired or unknown cursors are reported instead of silently restarting
+"""
+
+import os
+import re
+import base64
+import binascii
+import secrets
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from src.aiagents.performance.intelligent_cache import CacheLevel, cache_manager
+from src.aiagents.performance.metrics_collector import metrics_collector
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+RESULT_PAGE_SIZE = int(os.getenv("AGENT_RESULT_PAGE_SIZE", "20"))
+RESULT_MAX_CHARS = int(os.getenv("AGENT_RESULT_MAX_CHARS", "8000"))
+# Rows a listing query loads at most; anything past it is summarized as "N more"
+RESULT_SNAPSHOT_LIMIT = int(os.getenv("AGENT_RESULT_SNAPSHOT_LIMIT", "1000"))
+RESULT_CURSOR_TTL_SECONDS = int(os.getenv("AGENT_RESULT_CURSOR_TTL_SECONDS", "1800"))
+
+RESULT_PAGES_CACHE = "result_pages"
+
+# Messages that ask for the next page of the previous listing. Bare "more" and
+# "continue" are left out: they also answer confirmations and follow-up questions.
+SHOW_MORE_PATTERN = (
+    r"(?:(?:please )?(?:show|see|load|get|give|list|display)(?: me)?(?: the| some)? "
+    r"(?:more|next(?: page)?|rest)(?: (?:results|items|rows|ones|page|clients|contracts|employees|of (?:them|the list|the results)))?"
+    r"|next page|more results|load more|keep going)"
+)
+_SHOW_MORE_RE = re.compile(SHOW_MORE_PATTERN)
+
+
+def is_show_more_request(message: str) -> bool:
+    """Whether ``message`` asks for the next page of the previous listing"""
+    normalized = re.sub(r"\s+", " ", (message or "").lower()).strip().rstrip("?.!").strip()
+    return bool(_SHOW_MORE_RE.fullmatch(normalized))
+
+
+@dataclass
+class RenderedList:
+    text: str
+    rendered: int
+
+
+class ListRenderer:
+    """Renders list items into one markdown string within item and character caps"""
+
+    def __init__(self, max_items: Optional[int] = None, max_chars: Optional[int] = None, separator: str = "\n"):
+        self.max_items = max_items or RESULT_PAGE_SIZE
+        self.max_chars = max_chars or RESULT_MAX_CHARS
+        self.separator = separator
+
+    def render(self, items: List[Any], render_item: Callable[[int, Any], str], start: int = 1) -> RenderedList:
+        """
+        Render ``items`` numbered from ``start``.
+
+        Stops before the item that would pass the character cap; the first
+        item is always rendered so a page always makes progress.
+        """
+        parts: List[str] = []
+        size = 0
+        for number, item in enumerate(items[:self.max_items], start):
+            text = render_item(number, item)
+            if parts and size + len(text) + len(self.separator) > self.max_chars:
+                break
+            parts.append(text)
+            size += len(text) + len(self.separator)
+        return RenderedList(self.separator.join(parts), len(parts))
+
+
+@dataclass
+class PagedListing:
+    """How a paged tool result is keyed and rendered"""
+    name: str
+    # Key of the item list in the tool result data
+    key: str
+    noun: str
+    render_item: Callable[[int, Dict[str, Any]], str]
+    separator: str = "\n"
+
+
+@dataclass
+class ResultPage:
+    listing: PagedListing
+    heading: str
+    items: List[Dict[str, Any]]
+    offset: int
+    # Rows held by the snapshot / rows matching the query
+    snapshot_size: int
+    total: int
+    next_cursor: Optional[str]
+    body: str
+
+    @property
+    def message(self) -> str:
+        parts = [self.heading, self.body] if self.heading else [self.body]
+        parts.append(self.footer())
+        return "\n\n".join(part for part in parts if part)
+
+    def footer(self) -> str:
+        lines = []
+        first, last = self.offset + 1, self.offset + len(self.items)
+        if self.next_cursor or self.offset:
+            lines.append(f"_Showing {first}–{last} of {self.total} {self.listing.noun}._")
+        if self.next_cursor:
+            lines.append('_Say "show more" for the next page._')
+        elif self.total > self.snapshot_size:
+            lines.append(
+                f"_...and {self.total - self.snapshot_size} more {self.listing.noun} not shown; "
+                f"narrow the request to see them._"
+            )
+        return "\n".join(lines)
+
+    def data(self) -> Dict[str, Any]:
+        return {
+            self.listing.key: self.items,
+            "count": len(self.items),
+            "total": self.total,
+            "cursor": self.next_cursor,
+            "page": {
+                "listing": self.listing.name,
+                "offset": self.offset,
+                "shown": len(self.items),
+                "has_more": self.next_cursor is not None,
+            },
+        }
+
+
+def encode_cursor(token: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{token}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[tuple]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        token, offset = base64.urlsafe_b64decode(padded.encode()).decode().rsplit(":", 1)
+        return token, int(offset)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+class ResultPager:
+    """Pages listing results out of a cached snapshot"""
+
+    def __init__(self, page_size: Optional[int] = None, max_chars: Optional[int] = None):
+        self.page_size = page_size
+        self.max_chars = max_chars
+        self.listings: Dict[str, PagedListing] = {}
+        self._stats = {"first_pages": 0, "resumed_pages": 0, "expired_cursors": 0, "snapshots": 0}
+
+    @property
+    def _cache(self):
+        return cache_manager.get_cache(RESULT_PAGES_CACHE)
+
+    def register(self, listing: PagedListing) -> PagedListing:
+        self.listings[listing.name] = listing
+        return listing
+
+    def _render(self, listing: PagedListing, heading: str, rows: List[Dict[str, Any]], offset: int,
+                total: int, token: Optional[str]) -> ResultPage:
+        renderer = ListRenderer(self.page_size or RESULT_PAGE_SIZE, self.max_chars or RESULT_MAX_CHARS, listing.separator)
+        rendered = renderer.render(rows[offset:], listing.render_item, start=offset + 1)
+        end = offset + rendered.rendered
+        next_cursor = encode_cursor(token, end) if token and end < len(rows) else None
+        return ResultPage(
+            listing=listing, heading=heading, items=rows[offset:end], offset=offset,
+            snapshot_size=len(rows), total=max(total, len(rows)), next_cursor=next_cursor, body=rendered.text,
+        )
+
+    async def first_page(self, listing: str, rows: List[Dict[str, Any]], heading: str = "",
+                         total: Optional[int] = None) -> ResultPage:
+        """The first page of ``rows``; the snapshot is cached only when there is more to show."""
+        spec = self.listings[listing]
+        total = len(rows) if total is None else total
+        token = secrets.token_urlsafe(12)
+        page = self._render(spec, heading, rows, 0, total, token)
+        self._stats["first_pages"] += 1
+        if page.next_cursor:
+            snapshot = {"listing": listing, "heading": heading, "rows": rows, "total": total}
+            await self._cache.set(token, snapshot, RESULT_CURSOR_TTL_SECONDS, CacheLevel.L2_REDIS)
+            self._stats["snapshots"] += 1
+            metrics_collector.increment_counter("result_paging_snapshots")
+        return page
+
+    async def resume(self, cursor: str) -> Optional[ResultPage]:
+        """The page ``cursor`` points at, or None when it is unknown or has expired."""
+        decoded = decode_cursor(cursor or "")
+        snapshot = await self._cache.get(decoded[0]) if decoded else None
+        if not snapshot or snapshot.get("listing") not in self.listings:
+            self._stats["expired_cursors"] += 1
+            return None
+        token, offset = decoded
+        self._stats["resumed_pages"] += 1
+        metrics_collector.increment_counter("result_paging_resumed_pages")
+        rows = snapshot["rows"]
+        return self._render(
+            self.listings[snapshot["listing"]], snapshot["heading"], rows, min(offset, len(rows)),
+            snapshot["total"], token
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+
+async def show_more_results(cursor: Optional[str]) -> Dict[str, Any]:
+    """Next page of the listing ``cursor`` was issued for."""
+    page = await result_pager.resume(cursor) if cursor else None
+    if page is None:
+        return {
+            "success": False,
+            "message": "❌ That list is no longer available. Please ask for it again.",
+            "data": {"cursor": None},
+        }
+    logger.debug("📄 Resumed %s at row %s", page.listing.name, page.offset)
+    return {"success": True, "message": page.message, "data": page.data()}
+
+
+# Global result pager
+result_pager = ResultPager()
@@ -1,15 +1,19 @@
 from datetime import date, datetime
 from decimal import Decimal
-from src.database.core.models import TimeEntry
-from src.database.core.schemas import TimeEntryCreate
-from src.database.core.database import get_db
-from src.database.api.time_entries import create_time_entry
-from src.database.api.deliverables import get_deliverable_by_name, search_deliverables_with_client_info
-from src.database.api.clients import get_client_by_name
+from src.database.core.models import TimeEntry, Client, Contract, Deliverable
 from pydantic import BaseModel
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import select, insert, or_, case, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from  src.aiagents.tools.contract_tools import ContractToolResult
+from src.aiagents.tools.deliverable_tools import search_deliverables_with_client_info, use_session
+from src.aiagents.tools.date_expressions import DateRange, date_resolver
+
+# Hours above which a single entry needs manager approval
+MAX_HOURS_PER_ENTRY = 16
+# Clients listed when a project name only matches client names
+CLIENT_SUGGESTION_LIMIT = 5
+PROJECT_SUGGESTION_LIMIT = 3
 
 
 class CreateTimeEntryParams(BaseModel):
@@ -23,28 +27,65 @@ class CreateTimeEntryParams(BaseModel):
     billable: bool = True
     billing_rate: Optional[Decimal] = None
 
-def create_time_entry_tool(params: CreateTimeEntryParams, db: Session = None) -> ContractToolResult:
+
+def _hours_need_approval(hours_worked: Decimal) -> Optional[ContractToolResult]:
+    if hours_worked > MAX_HOURS_PER_ENTRY:
+        return ContractToolResult(
+            success=False,
+            message=f"⚠️ Hours worked exceeds {MAX_HOURS_PER_ENTRY} hours. Manager approval required.",
+            requires_confirmation=True
+        )
+    return None
+
+
+async def _insert_time_entry(session: AsyncSession, params: CreateTimeEntryParams, user_id: Optional[str] = None,
+                             **denormalized) -> int:
+    """Insert one time entry and return its id in the same round trip"""
+    time_entry_id = (await session.execute(
+        insert(TimeEntry)
+        .values(
+            **params.model_dump(),
+            **denormalized,
+            entered_by="system",
+            entry_timestamp=func.now(),
+            created_by=user_id,
+            updated_by=user_id,
+        )
+        .returning(TimeEntry.time_entry_id)
+    )).scalar_one()
+    await session.commit()
+    return time_entry_id
+
+
+async def create_time_entry_tool(params: CreateTimeEntryParams, context: Dict[str, Any] = None,
+                                 session: AsyncSession = None) -> ContractToolResult:
     """Tool for creating time entries"""
     try:
         # Validate hours worked
-        if params.hours_worked > 16:
-            return ContractToolResult(
-                success=False,
-                message="⚠️ Hours worked exceeds 16 hours. Manager approval required.",
-                requires_confirmation=True
+        approval = _hours_need_approval(params.hours_worked)
+        if approval:
+            return approval
+
+        async with use_session(session) as session:
+            # Contract and client verified together
+            contract_id, client_name = (await session.execute(select(
+                select(Contract.contract_id).where(Contract.contract_id == params.contract_id).scalar_subquery(),
+                select(Client.client_name).where(Client.client_id == params.client_id).scalar_subquery(),
+            ))).one()
+            if contract_id is None:
+                return ContractToolResult(success=False, message="❌ Failed to log time: Contract not found")
+            if client_name is None:
+                return ContractToolResult(success=False, message="❌ Failed to log time: Client not found")
+
+            time_entry_id = await _insert_time_entry(
+                session, params, (context or {}).get('user_id'), client_name=client_name
             )
-        
-        if db is None:
-            db = next(get_db())
-        
-        time_entry_data = TimeEntryCreate(**params.model_dump())
-        result = create_time_entry(time_entry_data, db)
-        
+
         return ContractToolResult(
             success=True,
             message=f"✅ Time entry logged: {params.hours_worked} hours",
             data={
-                "time_entry_id": result.time_entry_id,
+                "time_entry_id": time_entry_id,
                 "hours": float(params.hours_worked),
                 "date": str(params.date),
                 "billable": params.billable
@@ -56,26 +97,58 @@ def create_time_entry_tool(params: CreateTimeEntryParams, db: Session = None) ->
             message=f"❌ Failed to log time: {str(e)}"
         )
 
-def get_timesheet_tool(employee_id: int, start_date: date, end_date: date, db: Session = None) -> ContractToolResult:
+def timesheet_period(start_date: Optional[Any] = None, end_date: Optional[Any] = None, period: Optional[str] = None,
+                     today: Optional[date] = None) -> Tuple[date, date]:
+    """
+    Timesheet bounds from dates or date expressions ("2025-03-01", "last monday").
+
+    A missing bound comes from ``period`` ("last month"), else the current week.
+    """
+    if isinstance(start_date, str):
+        start_date = _resolve_date(start_date, today).start
+    if isinstance(end_date, str):
+        end_date = _resolve_date(end_date, today).end
+    if start_date is None or end_date is None:
+        default = _resolve_date(period or "this week", today)
+        start_date = start_date or default.start
+        end_date = end_date or default.end
+    return start_date, end_date
+
+
+def requested_period(period: Optional[str] = None, context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """The period a tool call names, else the date range extracted from the user's message"""
+    return period or ((context or {}).get('date_range') or {}).get('expression')
+
+
+def _resolve_date(expression: str, today: Optional[date] = None) -> DateRange:
+    resolved = date_resolver.resolve(expression, today)
+    if resolved is None:
+        raise ValueError(f"Unrecognised date: '{expression}'")
+    return resolved
+
+async def get_timesheet_tool(employee_id: int, start_date: date, end_date: date,
+                             session: AsyncSession = None) -> ContractToolResult:
     """Tool for retrieving timesheet data"""
     try:
-        if db is None:
-            db = next(get_db())
-        
-        time_entries = db.query(TimeEntry).filter(
-            TimeEntry.employee_id == employee_id,
-            TimeEntry.date >= start_date,
-            TimeEntry.date <= end_date
-        ).all()
-        
-        total_hours = sum(entry.hours_worked or 0 for entry in time_entries)
-        billable_hours = sum(entry.hours_worked or 0 for entry in time_entries if entry.billable)
-        
+        async with use_session(session) as session:
+            # Totals are aggregated in the database rather than over loaded entries
+            entries, total_hours, billable_hours = (await session.execute(
+                select(
+                    func.count(TimeEntry.time_entry_id),
+                    func.coalesce(func.sum(TimeEntry.hours_worked), 0),
+                    func.coalesce(func.sum(TimeEntry.hours_worked).filter(TimeEntry.billable.is_(True)), 0),
+                ).where(
+                    TimeEntry.employee_id == employee_id,
+                    TimeEntry.date >= start_date,
+                    TimeEntry.date <= end_date
+                )
+            )).one()
+
         return ContractToolResult(
             success=True,
-            message=f"📊 Timesheet retrieved: {len(time_entries)} entries",
+            message=f"📊 Timesheet retrieved: {entries} entries",
             data={
-                "entries": len(time_entries),
+                "entries": entries,
                 "total_hours": float(total_hours),
                 "billable_hours": float(billable_hours),
                 "period": f"{start_date} to {end_date}"
@@ -87,15 +160,16 @@ def get_timesheet_tool(employee_id: int, start_date: date, end_date: date, db: S
             message=f"❌ Failed to retrieve timesheet: {str(e)}"
         )
 
-def search_projects_tool(search_term: str, db: Session = None) -> ContractToolResult:
+async def search_projects_tool(search_term: str, session: AsyncSession = None) -> ContractToolResult:
     """Tool for searching projects/deliverables by name"""
     try:
-        if db is None:
-            db = next(get_db())
-        
-        # Use the API function to search deliverables with client info
-        projects = search_deliverables_with_client_info(search_term, db)
-        
+        async with use_session(session) as session:
+            projects = await search_deliverables_with_client_info(session, search_term)
+
+        for project in projects:
+            if project.get('due_date') and hasattr(project['due_date'], 'isoformat'):
+                project['due_date'] = project['due_date'].isoformat()
+
         return ContractToolResult(
             success=True,
             message=f"🔍 Found {len(projects)} projects matching '{search_term}'",
@@ -118,144 +192,157 @@ class SmartTimeEntryParams(BaseModel):
     date: Optional[str] = None  # Will default to today
     billable: bool = True
 
-def smart_create_time_entry_tool(params: SmartTimeEntryParams, db: Session = None) -> ContractToolResult:
-    """Smart tool for creating time entries by project name instead of technical IDs"""
-    try:
-        if db is None:
-            db = next(get_db())
-        
-        # Validate hours worked
-        if params.hours_worked > 16:
+
+async def _find_project(session: AsyncSession, project_name: str):
+    """
+    The deliverable a project name refers to, with its contract and client, in one query.
+
+    A deliverable whose name contains the whole project name wins; otherwise any
+    word of it may match the deliverable or client name (e.g. "Solana project"
+    finds a deliverable of "Solana Inc").
+    """
+    name_match = Deliverable.name.ilike(f"%{project_name}%")
+    words = project_name.lower().split()
+    return (await session.execute(
+        select(Deliverable, Contract.client_id, Contract.contract_type, Client.client_name)
+        .join(Contract, Deliverable.contract_id == Contract.contract_id)
+        .join(Client, Contract.client_id == Client.client_id)
+        .where(or_(
+            name_match,
+            *(Client.client_name.ilike(f"%{word}%") for word in words),
+            *(Deliverable.name.ilike(f"%{word}%") for word in words),
+        ))
+        .order_by(case((name_match, 0), else_=1), Deliverable.deliverable_id)
+        .limit(1)
+    )).first()
+
+
+async def _clients_matching_project(session: AsyncSession, project_name: str) -> List[Any]:
+    """Clients whose name contains a word of ``project_name``, with their project names, in one query"""
+    words = project_name.lower().split()
+    return (await session.execute(
+        select(
+            Client.client_name,
+            Client.industry,
+            func.count(Deliverable.deliverable_id).label("project_count"),
+            func.array_agg(Deliverable.name).filter(Deliverable.name.isnot(None)).label("project_names"),
+        )
+        .outerjoin(Contract, Contract.client_id == Client.client_id)
+        .outerjoin(Deliverable, Deliverable.contract_id == Contract.contract_id)
+        .where(or_(*(Client.client_name.ilike(f"%{word}%") for word in words)))
+        .group_by(Client.client_id)
+        .order_by(Client.client_id)
+        .limit(CLIENT_SUGGESTION_LIMIT)
+    )).all()
+
+
+async def _project_not_found(session: AsyncSession, params: SmartTimeEntryParams) -> ContractToolResult:
+    """Explain a missed project name: the matching client's projects, a client choice, or similar projects"""
+    # Search for multiple clients that might match (e.g., "Solana" → "Solana Inc", "Solana Corp")
+    matching_clients = await _clients_matching_project(session, params.project_name)
+
+    if len(matching_clients) == 1:
+        client = matching_clients[0]
+        if client.project_count:
+            # Client has projects - list them
+            project_names = client.project_names or []
             return ContractToolResult(
                 success=False,
-                message="⚠️ Hours worked exceeds 16 hours. Manager approval required.",
-                requires_confirmation=True
+                message=f"✅ Found client '{client.client_name}' but no project named '{params.project_name}'. Available projects for {client.client_name}: {', '.join(project_names)}. Please specify which project you'd like to log time for."
             )
-        
-        # Use the API function to find the project/deliverable by name
-        deliverable = get_deliverable_by_name(params.project_name, db)
-        
-        if not deliverable:
-            # Smart search: Check if we can find clients that match the project name
-            from  src.database.core.models import Contract, Deliverable as DeliverableModel, Client
-            
-            # Search for multiple clients that might match (e.g., "Solana" → "Solana Inc", "Solana Corp")
-            search_words = params.project_name.lower().split()
-            matching_clients = []
-            
-            # Optimized search - use database LIKE query instead of loading all clients
-            for word in search_words:
-                search_pattern = f"%{word}%"
-                word_clients = db.query(Client).filter(
-                    Client.client_name.ilike(search_pattern)
-                ).limit(5).all()
-                matching_clients.extend(word_clients)
-            
-            if len(matching_clients) == 1:
-                # Single client found - proceed with existing logic
-                client = matching_clients[0]
-                client_deliverables = db.query(DeliverableModel).join(Contract).filter(
-                    Contract.client_id == client.client_id
-                ).all()
-                
-                if client_deliverables:
-                    # Client has projects - list them
-                    project_names = [d.name for d in client_deliverables if d.name]
-                    return ContractToolResult(
-                        success=False,
-                        message=f"✅ Found client '{client.client_name}' but no project named '{params.project_name}'. Available projects for {client.client_name}: {', '.join(project_names)}. Please specify which project you'd like to log time for."
-                    )
-                else:
-                    # Client exists but has no projects
-                    return ContractToolResult(
-                        success=False,
-                        message=f"✅ Found client '{client.client_name}' but they don't have any active projects/deliverables yet. Please create a project for this client first, or contact your project manager to set up deliverables for {client.client_name}."
-                    )
-            
-            elif len(matching_clients) > 1:
-                # Multiple clients found - ask user to clarify
-                client_options = []
-                for i, client in enumerate(matching_clients, 1):
-                    # Check if client has projects
-                    client_deliverables = db.query(DeliverableModel).join(Contract).filter(
-                        Contract.client_id == client.client_id
-                    ).all()
-                    project_count = len(client_deliverables)
-                    
-                    client_info = f"{i}. **{client.client_name}**"
-                    if client.industry:
-                        client_info += f" (Industry: {client.industry})"
-                    if project_count > 0:
-                        client_info += f" - {project_count} active project(s)"
-                    else:
-                        client_info += " - No active projects"
-                    
-                    client_options.append(client_info)
-                
-                return ContractToolResult(
-                    success=False,
-                    message=f"🔍 Found multiple clients matching '{params.project_name}'. Please specify which client you meant:\n\n" + 
-                           "\n".join(client_options) + 
-                           f"\n\nPlease rephrase your request with the full client name (e.g., 'Log {params.hours_worked} hours for [Full Client Name] project')."
-                )
-            
-            # No client match either - try to find similar projects
-            similar_projects = search_deliverables_with_client_info(params.project_name.split()[0], db)
-            
-            if similar_projects:
-                suggestions = []
-                for p in similar_projects[:3]:  # Limit to 3 suggestions
-                    suggestions.append(f"'{p['name']}' (Client: {p['client_name']})")
-                
-                return ContractToolResult(
-                    success=False,
-                    message=f"❌ Project '{params.project_name}' not found. Did you mean one of these: {', '.join(suggestions)}?"
-                )
+        # Client exists but has no projects
+        return ContractToolResult(
+            success=False,
+            message=f"✅ Found client '{client.client_name}' but they don't have any active projects/deliverables yet. Please create a project for this client first, or contact your project manager to set up deliverables for {client.client_name}."
+        )
+
+    if len(matching_clients) > 1:
+        # Multiple clients found - ask user to clarify
+        client_options = []
+        for i, client in enumerate(matching_clients, 1):
+            client_info = f"{i}. **{client.client_name}**"
+            if client.industry:
+                client_info += f" (Industry: {client.industry})"
+            if client.project_count > 0:
+                client_info += f" - {client.project_count} active project(s)"
             else:
-                return ContractToolResult(
-                    success=False,
-                    message=f"❌ Project '{params.project_name}' not found. Please check the project name, verify the client exists, or create a new deliverable first."
-                )
-        
-        # Parse date or use today
-        entry_date = date.today()
-        if params.date:
-            try:
-                entry_date = date.fromisoformat(params.date)
-            except ValueError:
-                entry_date = date.today()
-        
-        # Create time entry with resolved IDs using the existing API
-        time_entry_params = CreateTimeEntryParams(
-            employee_id=params.employee_id,
-            contract_id=deliverable.contract_id,
-            client_id=deliverable.contract.client_id,
-            deliverable_id=deliverable.deliverable_id,
-            date=entry_date,
-            hours_worked=params.hours_worked,
-            description_of_work=params.description_of_work,
-            billable=params.billable
+                client_info += " - No active projects"
+            client_options.append(client_info)
+
+        return ContractToolResult(
+            success=False,
+            message=f"🔍 Found multiple clients matching '{params.project_name}'. Please specify which client you meant:\n\n" +
+                   "\n".join(client_options) +
+                   f"\n\nPlease rephrase your request with the full client name (e.g., 'Log {params.hours_worked} hours for [Full Client Name] project')."
         )
-        
-        result = create_time_entry_tool(time_entry_params, db)
-        
-        if result.success:
-            # Enhance the response with project context
-            enhanced_data = result.data.copy()
-            enhanced_data.update({
-                "project_name": deliverable.name,
-                "client_name": deliverable.contract.client.client_name,
-                "contract_type": deliverable.contract.contract_type
-            })
-            
-            return ContractToolResult(
-                success=True,
-                message=f"✅ Time logged successfully for project '{deliverable.name}' (Client: {deliverable.contract.client.client_name})",
-                data=enhanced_data
+
+    # No client match either - try to find similar projects
+    similar_projects = await search_deliverables_with_client_info(
+        session, params.project_name.split()[0], limit=PROJECT_SUGGESTION_LIMIT
+    )
+    if similar_projects:
+        suggestions = [f"'{p['name']}' (Client: {p['client_name']})" for p in similar_projects]
+        return ContractToolResult(
+            success=False,
+            message=f"❌ Project '{params.project_name}' not found. Did you mean one of these: {', '.join(suggestions)}?"
+        )
+    return ContractToolResult(
+        success=False,
+        message=f"❌ Project '{params.project_name}' not found. Please check the project name, verify the client exists, or create a new deliverable first."
+    )
+
+
+async def smart_create_time_entry_tool(params: SmartTimeEntryParams, context: Dict[str, Any] = None,
+                                       session: AsyncSession = None) -> ContractToolResult:
+    """Smart tool for creating time entries by project name instead of technical IDs"""
+    try:
+        # Validate hours worked
+        approval = _hours_need_approval(params.hours_worked)
+        if approval:
+            return approval
+
+        async with use_session(session) as session:
+            project = await _find_project(session, params.project_name)
+            if not project:
+                return await _project_not_found(session, params)
+            deliverable, client_id, contract_type, client_name = project
+
+            # Parse date ("2025-03-04", "yesterday", "last friday") or use today
+            entry_date = date_resolver.today()
+            resolved = date_resolver.resolve(params.date) if params.date else None
+            if resolved and resolved.start == resolved.end:
+                entry_date = resolved.start
+
+            # The lookup already resolved contract and client, so the entry is inserted directly
+            time_entry_params = CreateTimeEntryParams(
+                employee_id=params.employee_id,
+                contract_id=deliverable.contract_id,
+                client_id=client_id,
+                deliverable_id=deliverable.deliverable_id,
+                date=entry_date,
+                hours_worked=params.hours_worked,
+                description_of_work=params.description_of_work,
+                billable=params.billable
             )
-        else:
-            return result
-            
+            time_entry_id = await _insert_time_entry(
+                session, time_entry_params, (context or {}).get('user_id'),
+                client_name=client_name, deliverable_name=deliverable.name
+            )
+
+        return ContractToolResult(
+            success=True,
+            message=f"✅ Time logged successfully for project '{deliverable.name}' (Client: {client_name})",
+            data={
+                "time_entry_id": time_entry_id,
+                "hours": float(params.hours_worked),
+                "date": str(entry_date),
+                "billable": params.billable,
+                "project_name": deliverable.name,
+                "client_name": client_name,
+                "contract_type": contract_type
+            }
+        )
+
     except Exception as e:
         return ContractToolResult(
             success=False,
@@ -1,9 +1,35 @@
 import redis
 import json
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import os
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+# Compare-and-set of a conversation's committed checkpoint: KEYS = [head_key, version_key],
+# ARGV = [expected_version, checkpoint_id, ttl_seconds]. Returns the new version or -1 on conflict.
+CHAT_HEAD_CAS_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+if current ~= tonumber(ARGV[1]) then
+    return -1
+end
+local next_version = current + 1
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('SET', KEYS[2], next_version, 'EX', ARGV[3])
+return next_version
+"""
+
+# Release a lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
 
 class SessionManager:
     _instance = None
@@ -23,7 +49,7 @@ class SessionManager:
         self.redis_client = None
         
         if not redis_url:
-            print("Warning: REDIS_URL not found. Using in-memory session manager.")
+            logger.warning("Warning: REDIS_URL not found. Using in-memory session manager.")
         else:
             try:
                 # Optimize Redis connection for better performance
@@ -39,9 +65,9 @@ class SessionManager:
                 # Test connection
                 self.redis_client.ping()
                 self.redis_available = True
-                print("Redis session manager initialized successfully.")
+                logger.debug("Redis session manager initialized successfully.")
             except Exception as e:
-                print(f"Warning: Failed to connect to Redis: {e}. Using in-memory session manager.")
+                logger.warning("Warning: Failed to connect to Redis: %s. Using in-memory session manager.", e)
                 self.redis_client = None
                 self.redis_available = False
                 
@@ -50,6 +76,12 @@ class SessionManager:
         # In-memory storage for fallback
         self._mock_sessions = {}
         self._mock_chats = {}
+        self._mock_chat_summaries = {}
+        self._mock_chat_locks = {}
+        self._mock_chat_heads = {}
+        
+        self._chat_head_cas_script = self.redis_client.register_script(CHAT_HEAD_CAS_SCRIPT) if self.redis_client else None
+        self._release_lock_script = self.redis_client.register_script(RELEASE_LOCK_SCRIPT) if self.redis_client else None
         
         # Mark as initialized
         self._initialized = True
@@ -116,7 +148,7 @@ class SessionManager:
             return session_id
             
         except Exception as e:
-            print(f"Redis error, falling back to in-memory: {e}")
+            logger.warning("Redis error, falling back to in-memory: %s", e)
             # Fallback to in-memory storage
             self.redis_available = False
             return await self.get_or_create_session(user_id, auth_user_id, email, role)
@@ -146,7 +178,7 @@ class SessionManager:
             return None
             
         except Exception as e:
-            print(f"Redis error in get_session, falling back to in-memory: {e}")
+            logger.warning("Redis error in get_session, falling back to in-memory: %s", e)
             self.redis_available = False
             data = self._mock_sessions.get(session_id)
             if data and data['user_id'] == user_id:
@@ -190,66 +222,172 @@ class SessionManager:
     
     async def save_session(self, session_id: str, session_data: Dict[str, Any]):
         """Save session data (alias for store_chat_session for backward compatibility)"""
-        print(f"🔍 DEBUG: save_session called with session_id={session_id}")
+        logger.debug("🔍 DEBUG: save_session called with session_id=%s", session_id)
         # For now, just store as chat session with empty user_id
         await self.store_chat_session(session_id, "", session_data)
 
     async def store_chat_session(self, session_id: str, user_id: str, chat_data: Dict[str, Any]):
         """Store chat session data"""
-        print(f"🔍 DEBUG: store_chat_session called with session_id={session_id}, user_id={user_id}")
-        print(f"🔍 DEBUG: Redis available: {self.redis_available}, Redis client: {self.redis_client is not None}")
-        print(f"🔍 DEBUG: Chat data keys: {list(chat_data.keys()) if isinstance(chat_data, dict) else type(chat_data)}")
+        logger.debug("🔍 DEBUG: store_chat_session called with session_id=%s, user_id=%s", session_id, user_id)
+        logger.debug("🔍 DEBUG: Redis available: %s, Redis client: %s", self.redis_available, self.redis_client is not None)
+        logger.debug("🔍 DEBUG: Chat data keys: %s", list(chat_data.keys()) if isinstance(chat_data, dict) else type(chat_data))
 
         if not self.redis_client:
             # Mock implementation
             chat_key = f"chat:{session_id}:user:{user_id}"
-            print(f"🔍 DEBUG: Using mock implementation, chat_key: {chat_key}")
+            logger.debug("🔍 DEBUG: Using mock implementation, chat_key: %s", chat_key)
             self._mock_chats[chat_key] = chat_data
-            print(f"🔍 DEBUG: Mock storage complete")
+            logger.debug("🔍 DEBUG: Mock storage complete")
             return
 
         # Redis implementation
         chat_key = f"chat:{session_id}:user:{user_id}"
-        print(f"🔍 DEBUG: Redis implementation, chat_key: {chat_key}")
+        logger.debug("🔍 DEBUG: Redis implementation, chat_key: %s", chat_key)
         try:
             # Convert to JSON-serializable format to avoid unhashable type errors
             serializable_data = self._make_serializable(chat_data)
             self.redis_client.setex(chat_key, self.session_ttl, json.dumps(serializable_data))
-            print(f"🔍 DEBUG: Redis storage complete")
+            logger.debug("🔍 DEBUG: Redis storage complete")
         except Exception as e:
-            print(f"🔍 DEBUG: Redis error in store_chat_session: {e}")
-            print(f"🔍 DEBUG: Error type: {type(e)}")
+            logger.debug("🔍 DEBUG: Redis error in store_chat_session: %s", e)
+            logger.debug("🔍 DEBUG: Error type: %s", type(e))
             import traceback
-            print(f"🔍 DEBUG: Full traceback: {traceback.format_exc()}")
+            logger.debug("🔍 DEBUG: Full traceback:", exc_info=True)
     
     async def get_chat_session(self, session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get chat session data"""
-        print(f"🔍 DEBUG: get_chat_session called with session_id={session_id}, user_id={user_id}")
-        print(f"🔍 DEBUG: Redis available: {self.redis_available}, Redis client: {self.redis_client is not None}")
+        logger.debug("🔍 DEBUG: get_chat_session called with session_id=%s, user_id=%s", session_id, user_id)
+        logger.debug("🔍 DEBUG: Redis available: %s, Redis client: %s", self.redis_available, self.redis_client is not None)
         
         if not self.redis_client:
             # Mock implementation
             chat_key = f"chat:{session_id}:user:{user_id}"
-            print(f"🔍 DEBUG: Using mock implementation, chat_key: {chat_key}")
+            logger.debug("🔍 DEBUG: Using mock implementation, chat_key: %s", chat_key)
             result = self._mock_chats.get(chat_key)
-            print(f"🔍 DEBUG: Mock result: {result}")
+            logger.debug("🔍 DEBUG: Mock result: %s", result)
             return result
         
         # Redis implementation
         chat_key = f"chat:{session_id}:user:{user_id}"
-        print(f"🔍 DEBUG: Redis implementation, chat_key: {chat_key}")
+        logger.debug("🔍 DEBUG: Redis implementation, chat_key: %s", chat_key)
         try:
             chat_data = self.redis_client.get(chat_key)
-            print(f"🔍 DEBUG: Raw Redis data: {chat_data}")
+            logger.debug("🔍 DEBUG: Raw Redis data: %s", chat_data)
             if chat_data:
                 data = json.loads(chat_data)
-                print(f"🔍 DEBUG: Parsed Redis data: {data}")
+                logger.debug("🔍 DEBUG: Parsed Redis data: %s", data)
                 return data
             else:
-                print(f"🔍 DEBUG: No data found in Redis for key: {chat_key}")
+                logger.debug("🔍 DEBUG: No data found in Redis for key: %s", chat_key)
                 return None
         except Exception as e:
-            print(f"🔍 DEBUG: Redis error in get_chat_session: {e}")
+            logger.debug("🔍 DEBUG: Redis error in get_chat_session: %s", e)
+            return None
+
+    async def acquire_chat_lock(self, session_id: str, user_id: str, token: str, ttl_ms: int) -> bool:
+        """Try to take the per-session in-flight lock (expires after ttl_ms if never released)"""
+        lock_key = f"chat_lock:{session_id}:user:{user_id}"
+        if not self.redis_client:
+            holder = self._mock_chat_locks.get(lock_key)
+            now = time.monotonic()
+            if holder and holder[1] > now:
+                return False
+            self._mock_chat_locks[lock_key] = (token, now + ttl_ms / 1000)
+            return True
+
+        try:
+            return bool(self.redis_client.set(lock_key, token, nx=True, px=ttl_ms))
+        except Exception as e:
+            # Fail closed: the caller keeps retrying until its wait timeout
+            logger.warning("⚠️ Redis error in acquire_chat_lock: %s", e)
+            return False
+
+    async def release_chat_lock(self, session_id: str, user_id: str, token: str):
+        """Release the per-session in-flight lock if it is still held by token"""
+        lock_key = f"chat_lock:{session_id}:user:{user_id}"
+        if not self.redis_client:
+            holder = self._mock_chat_locks.get(lock_key)
+            if holder and holder[0] == token:
+                del self._mock_chat_locks[lock_key]
+            return
+
+        try:
+            self._release_lock_script(keys=[lock_key], args=[token])
+        except Exception as e:
+            logger.warning("⚠️ Redis error in release_chat_lock: %s", e)
+
+    async def get_chat_head(self, session_id: str, user_id: str) -> Tuple[Optional[str], int]:
+        """
+        The conversation's committed checkpoint id and its version (None, 0 if never committed).
+
+        Redis errors are raised: a turn must not start from an unknown version.
+        """
+        head_key = f"chat_head:{session_id}:user:{user_id}"
+        if not self.redis_client:
+            return self._mock_chat_heads.get(head_key, (None, 0))
+
+        checkpoint_id, version = self.redis_client.mget(head_key, f"{head_key}:version")
+        return checkpoint_id, int(version or 0)
+
+    async def set_chat_head_if_version(
+        self,
+        session_id: str,
+        user_id: str,
+        checkpoint_id: str,
+        expected_version: int
+    ) -> Optional[int]:
+        """
+        Commit ``checkpoint_id`` as the conversation's head if its version still equals expected_version.
+
+        Returns the new version on success or None if another turn committed first.
+        Redis errors are raised so an unchecked write never happens.
+        """
+        head_key = f"chat_head:{session_id}:user:{user_id}"
+        if not self.redis_client:
+            # Check and set happen without an await in between, so this is atomic on the event loop
+            _, current_version = self._mock_chat_heads.get(head_key, (None, 0))
+            if current_version != expected_version:
+                return None
+            self._mock_chat_heads[head_key] = (checkpoint_id, current_version + 1)
+            return current_version + 1
+
+        new_version = int(self._chat_head_cas_script(
+            keys=[head_key, f"{head_key}:version"],
+            args=[expected_version, checkpoint_id, self.session_ttl]
+        ))
+        return new_version if new_version >= 0 else None
+
+    async def delete_chat_head(self, session_id: str, user_id: str):
+        """Forget the conversation's committed checkpoint"""
+        head_key = f"chat_head:{session_id}:user:{user_id}"
+        if not self.redis_client:
+            self._mock_chat_heads.pop(head_key, None)
+            return
+        self.redis_client.delete(head_key, f"{head_key}:version")
+
+    async def store_chat_summary(self, session_id: str, user_id: str, summary_data: Dict[str, Any]):
+        """Store the rolling conversation summary for a chat session"""
+        summary_key = f"chat_summary:{session_id}:user:{user_id}"
+        if not self.redis_client:
+            self._mock_chat_summaries[summary_key] = summary_data
+            return
+
+        try:
+            self.redis_client.setex(summary_key, self.session_ttl, json.dumps(summary_data))
+        except Exception as e:
+            logger.warning("⚠️ Redis error in store_chat_summary: %s", e)
+
+    async def get_chat_summary(self, session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get the rolling conversation summary for a chat session"""
+        summary_key = f"chat_summary:{session_id}:user:{user_id}"
+        if not self.redis_client:
+            return self._mock_chat_summaries.get(summary_key)
+
+        try:
+            summary_data = self.redis_client.get(summary_key)
+            return json.loads(summary_data) if summary_data else None
+        except Exception as e:
+            logger.warning("⚠️ Redis error in get_chat_summary: %s", e)
             return None
 
     def _make_serializable(self, obj, max_depth=10, current_depth=0):
@@ -0,0 +1,46 @@
+-- Agent graph checkpoints (GRAPH_CHECKPOINTER=postgres)
+-- Used by PostgresCheckpointStorage in src/aiagents/memory/checkpointer.py
+
+-- One row per graph step; blob_refs maps each channel to its blob key
+CREATE TABLE IF NOT EXISTS agent_checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BYTEA NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BYTEA NOT NULL,
+    blob_refs TEXT NOT NULL DEFAULT '{}',
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+
+-- Channel values, written once per (channel, blob key) and shared by later steps
+CREATE TABLE IF NOT EXISTS agent_checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    blob_key TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, blob_key)
+);
+
+-- Pending writes of the tasks in a step (what a resumed run skips)
+CREATE TABLE IF NOT EXISTS agent_checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BYTEA NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+
+-- For retention jobs that prune old threads
+CREATE INDEX IF NOT EXISTS idx_agent_checkpoints_created_at ON agent_checkpoints (created_at);
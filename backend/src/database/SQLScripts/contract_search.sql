@@ -0,0 +1,20 @@
+-- Contract search indexes
+-- Used by the planned searches in src/aiagents/tools/contract_search.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Enum-like fields are matched exactly on lower(column)
+CREATE INDEX IF NOT EXISTS idx_contracts_client_status ON contracts (client_id, lower(status));
+CREATE INDEX IF NOT EXISTS idx_contracts_status_billing_date ON contracts (lower(status), billing_prompt_next_date);
+CREATE INDEX IF NOT EXISTS idx_contracts_billing_date ON contracts (billing_prompt_next_date);
+CREATE INDEX IF NOT EXISTS idx_contracts_billing_frequency ON contracts (lower(billing_frequency));
+CREATE INDEX IF NOT EXISTS idx_contracts_contract_type ON contracts (lower(contract_type));
+
+-- Unfiltered searches list the newest contracts first
+CREATE INDEX IF NOT EXISTS idx_contracts_created_at ON contracts (created_at DESC);
+
+-- Free-text client name matching (ILIKE '%name%')
+CREATE INDEX IF NOT EXISTS idx_clients_name_trgm ON clients USING GIN (client_name gin_trgm_ops);
+
+ANALYZE contracts;
+ANALYZE clients;
@@ -0,0 +1,76 @@
+-- Employee search documents (EMPLOYEE_FULLTEXT_SEARCH=true)
+-- Used by EmployeeSearch in src/aiagents/tools/employee_search.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- One row per employee: weighted tsvector for ranked/prefix matching and
+-- flattened lower-case text for typo-tolerant trigram matching
+CREATE TABLE IF NOT EXISTS employee_search_documents (
+    employee_id INTEGER PRIMARY KEY REFERENCES employees(employee_id) ON DELETE CASCADE,
+    search_vector TSVECTOR NOT NULL,
+    search_text TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_employee_search_vector ON employee_search_documents USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_employee_search_text_trgm ON employee_search_documents USING GIN (search_text gin_trgm_ops);
+
+-- Names weigh most, then role and department, then the remaining fields
+CREATE OR REPLACE FUNCTION refresh_employee_search_document(target_employee_id INTEGER)
+RETURNS VOID AS $$
+    INSERT INTO employee_search_documents (employee_id, search_vector, search_text, updated_at)
+    SELECT
+        e.employee_id,
+        setweight(to_tsvector('simple', coalesce(p.first_name, '') || ' ' || coalesce(p.last_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(e.job_title, '') || ' ' || coalesce(e.department, '')), 'B') ||
+        setweight(to_tsvector('simple',
+            coalesce(e.employee_number, '') || ' ' || coalesce(p.email, '') || ' ' ||
+            coalesce(e.employment_type, '') || ' ' || coalesce(e.full_time_part_time, '') || ' ' ||
+            coalesce(e.rate_type, '')), 'C'),
+        lower(concat_ws(' ', p.first_name, p.last_name, e.job_title, e.department, e.employee_number,
+            p.email, e.employment_type, e.full_time_part_time, e.rate_type)),
+        NOW()
+    FROM employees e
+    LEFT JOIN profiles p ON p.profile_id = e.profile_id
+    WHERE e.employee_id = target_employee_id
+    ON CONFLICT (employee_id) DO UPDATE
+        SET search_vector = EXCLUDED.search_vector,
+            search_text = EXCLUDED.search_text,
+            updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION employees_search_document_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_employee_search_document(NEW.employee_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION profiles_search_document_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_employee_search_document(e.employee_id)
+    FROM employees e
+    WHERE e.profile_id = NEW.profile_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_employees_search_document ON employees;
+CREATE TRIGGER trg_employees_search_document
+    AFTER INSERT OR UPDATE OF profile_id, employee_number, job_title, department,
+        employment_type, full_time_part_time, rate_type
+    ON employees
+    FOR EACH ROW EXECUTE FUNCTION employees_search_document_trigger();
+
+DROP TRIGGER IF EXISTS trg_profiles_search_document ON profiles;
+CREATE TRIGGER trg_profiles_search_document
+    AFTER UPDATE OF first_name, last_name, email
+    ON profiles
+    FOR EACH ROW EXECUTE FUNCTION profiles_search_document_trigger();
+
+-- Backfill existing employees
+SELECT refresh_employee_search_document(employee_id) FROM employees;
+
+ANALYZE employee_search_documents;
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File, Form
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
+import os
+import asyncio
 import traceback
 from src.database.core.database import get_ai_db
 import base64
@@ -14,15 +16,103 @@ from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 # --- New Imports for LangGraph Integration ---
-from src.aiagents.graph.hybrid_workflow import app as agent_app
+# Chat turns run on the checkpointed graph; streaming stays stateless
+from src.aiagents.graph.hybrid_workflow import persistent_app as agent_app, app as stateless_agent_app
 from fastapi.responses import StreamingResponse
 from langchain_core.messages import HumanMessage
 from src.aiagents.graph.state import create_initial_state
-from src.auth.session_manager import SessionManager
+from src.aiagents.memory.context_window import context_window_manager
+from src.aiagents.memory.state_store import conversation_state_store, ConversationTurn, SessionBusyError
 from src.database.core.models import Client
+from src.services.logging_service import get_logger, bind_session
+from src.aiagents.services.llm_client import start_request_budget
+from src.aiagents.graph.context_extractor import context_extractor
+from src.aiagents.graph.prefetch import context_prefetcher
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Total time one chat turn may spend in LLM calls; each call's timeout is cut to what's left
+CHAT_REQUEST_BUDGET_SECONDS = float(os.getenv("CHAT_REQUEST_BUDGET_SECONDS", "60"))
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+class ClientDisconnected(asyncio.CancelledError):
+    """The HTTP client went away mid-turn; the turn is abandoned (no retry, no save)."""
+
+
+async def _invoke_agent(
+    request: Request,
+    state: Optional[Dict[str, Any]],
+    recursion_limit: int,
+    thread_config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Run the agent graph within the request's LLM budget, cancelling it (and
+    any in-flight LLM call) if the client disconnects.
+
+    With a ``thread_config`` every step is checkpointed on the conversation
+    thread; ``state=None`` resumes the thread from its last checkpoint.
+    """
+    start_request_budget(CHAT_REQUEST_BUDGET_SECONDS)
+    turn_stats = context_extractor.start_turn()
+    config = {**(thread_config or {}), "recursion_limit": recursion_limit}
+    task = asyncio.create_task(agent_app.ainvoke(state, config=config))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                logger.debug("🧠 CHAT API: Context extraction this turn: %s", turn_stats)
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("🔌 CHAT API: Client disconnected, cancelling agent run")
+                task.cancel()
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
+async def _load_conversation_state(turn: ConversationTurn):
+    """
+    Return (state, checkpointed) for the conversation: its committed head
+    checkpoint (the latest one for threads from before heads were committed),
+    or the ``conversation_state`` stored before the graph was checkpointed
+    (loaded once, then the thread takes over).
+    """
+    snapshot = await agent_app.aget_state(turn.config())
+    if snapshot and snapshot.values and turn.branch_from(snapshot):
+        return dict(snapshot.values), True
+    return await conversation_state_store.load(turn.session_id, turn.user_id), False
+
+
+def _turn_input(state: Dict[str, Any], checkpointed: bool) -> Dict[str, Any]:
+    """
+    Graph input for a turn: only the channels the endpoint changed if the
+    thread already holds the rest (memory carries a newly applied summary).
+    """
+    if not checkpointed:
+        return state
+    return {key: state[key] for key in ("messages", "context", "memory", "status") if key in state}
+
+
+async def _run_turn(request: Request, turn_input: Dict[str, Any], turn: ConversationTurn) -> Dict[str, Any]:
+    """
+    Run a chat turn on its branch of the conversation thread; if a node fails,
+    resume once from the turn's last completed step. The result is then
+    committed as the conversation's head.
+    """
+    try:
+        result = await _invoke_agent(request, turn_input, recursion_limit=20, thread_config=turn.config())
+    except Exception as e:
+        logger.error("❌ LangGraph invocation failed, resuming from last checkpoint: %s", e)
+        resume_from = await conversation_state_store.turn_tip(turn)
+        result = await _invoke_agent(request, None, recursion_limit=20, thread_config=turn.config(resume_from))
+
+    if await conversation_state_store.commit(turn, result) is None:
+        logger.warning("⚠️ CHAT API: Turn on session %s was not committed", turn.session_id)
+    return result
+
 # 🚀 REMOVED: is_employee_fast_path_query function to align with agentic AI principles
 # TODO: If employee queries become too slow, consider re-implementing this function
 # All employee queries now go through the regular agent graph like clients and contracts
@@ -49,7 +139,7 @@ def _normalize_message_roles(messages):
             # Normalize role from 'human' to 'user'
             if normalized_msg.get('role') == 'human':
                 normalized_msg['role'] = 'user'
-                print(f"🔧 Normalized message role from 'human' to 'user' for message: {normalized_msg.get('content', '')[:50]}...")
+                logger.debug("🔧 Normalized message role from 'human' to 'user' for message: %s...", normalized_msg.get('content', '')[:50])
 
             # Also normalize type if it exists
             if normalized_msg.get('type') == 'human':
@@ -149,7 +239,7 @@ def _make_serializable_state(state):
 
             serializable_state[hashable_key] = serializable_value
         except Exception as e:
-            print(f"Warning: Could not serialize state key '{key}': {e}")
+            logger.warning("Warning: Could not serialize state key '%s': %s", key, e)
             # Use string representation as fallback
             serializable_state[str(key)] = str(value)
 
@@ -244,7 +334,7 @@ async def fast_greeting(chat_request: ChatRequest, request: Request):
     start_time = time.perf_counter()
     
     try:
-        print(f"FAST GREETING ENDPOINT: Request received at {datetime.now()}")
+        logger.debug("FAST GREETING ENDPOINT: Request received at %s", datetime.now())
         
         message_content = chat_request.message
         
@@ -270,11 +360,11 @@ async def fast_greeting(chat_request: ChatRequest, request: Request):
                         greeting_response = f"Hello {first_name}! How can I help you today?"
                     
                     session_id = current_user.session_id
-                    print(f"FAST GREETING: Personalized for {first_name}")
+                    logger.debug("FAST GREETING: Personalized for %s", first_name)
                 
         except Exception as auth_error:
             # Auth failure doesn't break the endpoint
-            print(f"FAST GREETING: Auth failed, using generic greeting: {auth_error}")
+            logger.warning("FAST GREETING: Auth failed, using generic greeting: %s", auth_error)
         
         # Return response
         response = ChatResponse(
@@ -291,13 +381,13 @@ async def fast_greeting(chat_request: ChatRequest, request: Request):
         )
         
         end_time = time.perf_counter()
-        print(f"FAST GREETING ENDPOINT: Completed in {(end_time - start_time) * 1000:.2f}ms")
+        logger.debug("FAST GREETING ENDPOINT: Completed in %.2fms", (end_time - start_time) * 1000)
         
         return response
         
     except Exception as e:
         end_time = time.perf_counter()
-        print(f"Fast greeting failed after {(end_time - start_time) * 1000:.2f}ms: {e}")
+        logger.error("Fast greeting failed after %.2fms: %s", (end_time - start_time) * 1000, e)
         
         return ChatResponse(
             response="Hello! How can I help you today?",
@@ -320,7 +410,7 @@ async def fast_clients(chat_request: ChatRequest, request: Request):
     start_time = time.perf_counter()
     
     try:
-        print(f"FAST CLIENTS ENDPOINT: Request received at {datetime.now()}")
+        logger.debug("FAST CLIENTS ENDPOINT: Request received at %s", datetime.now())
         
         message_content = chat_request.message
         
@@ -398,12 +488,12 @@ async def fast_clients(chat_request: ChatRequest, request: Request):
                 }
             )
             
-            print(f"FAST CLIENTS ENDPOINT: Completed in {processing_time:.2f}ms")
+            logger.debug("FAST CLIENTS ENDPOINT: Completed in %.2fms", processing_time)
             return response
             
     except Exception as e:
         end_time = time.perf_counter()
-        print(f"Fast clients failed after {(end_time - start_time) * 1000:.2f}ms: {e}")
+        logger.error("Fast clients failed after %.2fms: %s", (end_time - start_time) * 1000, e)
         return ChatResponse(
             response=f"I encountered an error retrieving clients: {str(e)}",
             agent="Core",
@@ -427,15 +517,15 @@ async def send_chat_message_with_file(
     """
     Enhanced chat endpoint that handles file uploads with messages for agentic document management.
     """
-    print(f"🚀 CHAT API: message-with-file endpoint called with message: {message}")
+    logger.debug("🚀 CHAT API: message-with-file endpoint called with message: %s", message)
     try:
         if not message:
             raise HTTPException(status_code=400, detail="Message content is required.")
         
         # Authentication
-        print(f"🔍 DEBUG: Received message: {message[:100]}...")
-        print(f"🔍 DEBUG: Session ID: {session_id}")
-        print(f"🔍 DEBUG: File provided: {file.filename if file else 'None'}")
+        logger.debug("🔍 DEBUG: Received message: %s...", message[:100])
+        logger.debug("🔍 DEBUG: Session ID: %s", session_id)
+        logger.debug("🔍 DEBUG: File provided: %s", file.filename if file else 'None')
         
         # Get authenticated user
         auth_header = request.headers.get("authorization")
@@ -446,42 +536,37 @@ async def send_chat_message_with_file(
         credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
         
         # Use a separate database session for authentication
-        print(f"🔍 DEBUG: Starting authentication process")
+        logger.debug("🔍 DEBUG: Starting authentication process")
         async with get_ai_db() as auth_db:
-            print(f"🔍 DEBUG: Got auth database session")
+            logger.debug("🔍 DEBUG: Got auth database session")
             current_user = await get_current_user(credentials, auth_db)
-            print(f"🔍 DEBUG: Authentication successful for user: {current_user.user_id}")
+            logger.debug("🔍 DEBUG: Authentication successful for user: %s", current_user.user_id)
         
         # Now use the main database session for the rest of the function
         async with get_ai_db() as db:
             # Handle file upload if provided
             file_info = None
             if file and file.filename:
-                # Read file content
-                file_content = await file.read()
-                print(f"🔍 DEBUG: Raw file content length: {len(file_content)} bytes")
-                
-                # Encode to base64 for storage
-                file_data = base64.b64encode(file_content).decode('utf-8')
-                print(f"🔍 DEBUG: Base64 encoded length: {len(file_data)}")
+                # Stream the upload to a spool file on disk (hashed and size-limited while reading)
+                # instead of reading it into memory and base64-encoding it
+                from src.aiagents.services.file_cache import file_cache, FileTooLargeError
+                try:
+                    file_ref_id = await file_cache.spool_upload(file)
+                except FileTooLargeError as e:
+                    raise HTTPException(status_code=413, detail=str(e))
+                finally:
+                    await file.close()
                 
-                # Store file in cache and get reference
-                from src.aiagents.services.file_cache import file_cache
-                file_ref_id = file_cache.store_file(
-                    file_data=file_data,
-                    filename=file.filename,
-                    file_size=len(file_content),
-                    mime_type=file.content_type or "application/octet-stream"
-                )
+                cached_file = file_cache.get_file(file_ref_id)
                 
                 # Create file info with reference instead of full data
                 file_info = {
                     "filename": file.filename,
-                    "mime_type": file.content_type or "application/octet-stream",
+                    "mime_type": cached_file["mime_type"],
                     "file_ref_id": file_ref_id,  # Reference instead of full data
-                    "file_size": len(file_content)
+                    "file_size": cached_file["file_size"]
                 }
-                print(f"🔍 DEBUG: File processed - {file.filename} ({len(file_content)} bytes), ref_id: {file_ref_id}")
+                logger.debug("🔍 DEBUG: File processed - %s (%s bytes), ref_id: %s", file.filename, cached_file['file_size'], file_ref_id)
                 
                 # Add file context to the message
                 message = f"{message}\n\n[File attached: {file.filename} ({file_info['file_size']} bytes)]"
@@ -523,137 +608,127 @@ async def send_chat_message_with_file(
                     "data": {"status": "greeting_detected"}
                 }
 
-            # Get or create session
-            session_manager = SessionManager()
-            existing_state = None
-            user_id = str(current_user.user_id)
-            try:
-                print(f"🔍 DEBUG: Attempting to retrieve conversation state for session {session_id}, user {user_id}")
-                existing_state = await session_manager.get_chat_session(session_id, user_id)
-                print(f"🔍 DEBUG: Raw session data retrieved: {existing_state}")
-                print(f"🔍 DEBUG: Type of retrieved data: {type(existing_state)}")
+            bind_session(session_id)
+            # Only one turn per session at a time - overlapping requests queue behind this one
+            async with conversation_state_store.session_turn(session_id, str(current_user.user_id)):
+                existing_state = None
+                checkpointed = False
+                user_id = str(current_user.user_id)
+                turn = await conversation_state_store.begin_turn(session_id, user_id)
+                try:
+                    logger.debug("🔍 DEBUG: Attempting to retrieve conversation state for session %s, user %s", session_id, user_id)
+                    existing_state, checkpointed = await _load_conversation_state(turn)
+                    logger.debug("🔍 DEBUG: Conversation state retrieved (checkpointed=%s): %s", checkpointed, existing_state)
                 
-                if existing_state and "conversation_state" in existing_state:
-                    existing_state = existing_state["conversation_state"]
-                    print(f"🔄 CHAT API: Found existing conversation state for session {session_id}")
-                    print(f"🔍 DEBUG: Conversation state data: {existing_state.get('data', {})}")
-                else:
-                    existing_state = None
-                    print(f"🔄 CHAT API: No existing conversation state found")
-                    print(f"🔍 DEBUG: existing_state is None: {existing_state is None}")
                     if existing_state:
-                        print(f"🔍 DEBUG: existing_state keys: {list(existing_state.keys()) if isinstance(existing_state, dict) else 'Not a dict'}")
-            except Exception as e:
-                print(f"🔄 CHAT API: Exception during session retrieval: {e}")
-                print(f"🔍 DEBUG: Exception type: {type(e)}")
-                import traceback
-                print(f"🔍 DEBUG: Full traceback: {traceback.format_exc()}")
-                existing_state = None
+                        # Drop turns already folded into the rolling summary
+                        folded = await context_window_manager.apply_cached_summary(session_id, user_id, existing_state)
+                        if folded:
+                            logger.debug("🪟 CHAT API (FILE): Folded %s older messages into conversation summary", folded)
+                        logger.debug("🔄 CHAT API: Found existing conversation state for session %s", session_id)
+                        logger.debug("🔍 DEBUG: Conversation state data: %s", existing_state.get('data', {}))
+                    else:
+                        logger.debug("🔄 CHAT API: No existing conversation state found")
+                except Exception as e:
+                    logger.error("🔄 CHAT API: Exception during session retrieval: %s", e)
+                    logger.debug("🔍 DEBUG: Full traceback:", exc_info=True)
+                    existing_state = None
+                    checkpointed = False
             
-            # Create or update state
-            if existing_state:
-                # Add new message to existing conversation - use dict format with 'user' type
-                new_message = {
-                    "type": "user",
-                    "content": message_content,
-                    "role": "user"
-                }
-                existing_state["messages"].append(new_message)
+                # Create or update state
+                if existing_state:
+                    # Add new message to existing conversation - use dict format with 'user' type
+                    new_message = {
+                        "type": "user",
+                        "content": message_content,
+                        "role": "user"
+                    }
+                    # Messages from here on are this turn's own (merged on a commit conflict)
+                    turn.base_message_count = len(existing_state["messages"])
+                    existing_state["messages"].append(new_message)
                 
-                # Update context
-                existing_state["context"]["last_interaction"] = datetime.now().isoformat()
-                existing_state["context"]["interaction_count"] = existing_state["context"].get("interaction_count", 0) + 1
-                existing_state["status"] = "processing"
+                    # Update context
+                    existing_state["context"]["last_interaction"] = datetime.now().isoformat()
+                    existing_state["context"]["interaction_count"] = existing_state["context"].get("interaction_count", 0) + 1
+                    existing_state["status"] = "processing"
                 
-                initial_state = existing_state
-                print(f"🔄 CHAT API: Updated existing state, now has {len(initial_state['messages'])} messages")
-            else:
-                # Create new conversation state
-                initial_message = HumanMessage(content=message_content)
-                initial_state = create_initial_state(
-                    user_id=user_id,
-                    session_id=session_id,
-                    user_name=current_user.user.full_name or current_user.user.email,
-                    user_role=current_user.role,
-                    initial_message=initial_message
-                )
+                    initial_state = existing_state
+                    logger.debug("🔄 CHAT API: Updated existing state, now has %s messages", len(initial_state['messages']))
+                else:
+                    # Create new conversation state
+                    initial_message = HumanMessage(content=message_content)
+                    initial_state = create_initial_state(
+                        user_id=user_id,
+                        session_id=session_id,
+                        user_name=current_user.user.full_name or current_user.user.email,
+                        user_role=current_user.role,
+                        initial_message=initial_message
+                    )
                 
-                print(f"🔄 CHAT API: Created new conversation state")
+                    logger.debug("🔄 CHAT API: Created new conversation state")
             
-            # Add file_info to context if provided
-            if hasattr(enhanced_request, 'file_info') and enhanced_request.file_info:
-                print(f"🔍 DEBUG: Adding file_info to context - file_data length: {len(enhanced_request.file_info.get('file_data', ''))}")
-                print(f"🔍 DEBUG: File_info keys: {list(enhanced_request.file_info.keys())}")
-                initial_state["context"]["file_info"] = enhanced_request.file_info
-
-            # Process through agent graph
-            print(f"🔍 DEBUG: File upload - Invoking agent with recursion_limit=20")
-            print(f"🔍 DEBUG: File upload - Initial state keys: {list(initial_state.keys())}")
-            print(f"🔍 DEBUG: File upload - Context keys: {list(initial_state.get('context', {}).keys())}")
-            result = await agent_app.ainvoke(initial_state, config={"recursion_limit": 20})
-            print(f"🔍 DEBUG: File upload - Agent invocation completed")
+                # Add file_info to context if provided
+                if hasattr(enhanced_request, 'file_info') and enhanced_request.file_info:
+                    logger.debug("🔍 DEBUG: Adding file_info to context - file_data length: %s", len(enhanced_request.file_info.get('file_data', '')))
+                    logger.debug("🔍 DEBUG: File_info keys: %s", list(enhanced_request.file_info.keys()))
+                    initial_state["context"]["file_info"] = enhanced_request.file_info
+
+                # Process through agent graph
+                logger.debug("🔍 DEBUG: File upload - Invoking agent with recursion_limit=20")
+                logger.debug("🔍 DEBUG: File upload - Initial state keys: %s", list(initial_state.keys()))
+                logger.debug("🔍 DEBUG: File upload - Context keys: %s", list(initial_state.get('context', {}).keys()))
+                # Overlap the likely agent's context loading with routing and checkpointing
+                context_prefetcher.start(initial_state)
+                result = await _run_turn(request, _turn_input(initial_state, checkpointed), turn)
+                logger.debug("🔍 DEBUG: File upload - Agent invocation completed")
             
-            # TODO: ERROR HANDLING - Extract the response from the result and check for errors
-            if result and "messages" in result and len(result["messages"]) > 0:
-                last_message = result["messages"][-1]
-                print(f"🔍 CHAT API (FILE): Last message type: {type(last_message)}")
-                print(f"🔍 CHAT API (FILE): Last message: {last_message}")
+                # TODO: ERROR HANDLING - Extract the response from the result and check for errors
+                if result and "messages" in result and len(result["messages"]) > 0:
+                    last_message = result["messages"][-1]
+                    logger.debug("🔍 CHAT API (FILE): Last message type: %s", type(last_message))
+                    logger.debug("🔍 CHAT API (FILE): Last message: %s", last_message)
                 
-                if hasattr(last_message, 'content'):
-                    response_text = last_message.content
-                    print(f"🔍 CHAT API (FILE): Extracted content from object message: {response_text[:100]}...")
-                elif isinstance(last_message, dict) and 'content' in last_message:
-                    response_text = last_message['content']
-                    print(f"🔍 CHAT API (FILE): Extracted content from dict message: {response_text[:100]}...")
-                else:
-                    response_text = str(last_message)
-                    print(f"🔍 CHAT API (FILE): Using string conversion: {response_text[:100]}...")
+                    if hasattr(last_message, 'content'):
+                        response_text = last_message.content
+                        logger.debug("🔍 CHAT API (FILE): Extracted content from object message: %s...", response_text[:100])
+                    elif isinstance(last_message, dict) and 'content' in last_message:
+                        response_text = last_message['content']
+                        logger.debug("🔍 CHAT API (FILE): Extracted content from dict message: %s...", response_text[:100])
+                    else:
+                        response_text = str(last_message)
+                        logger.debug("🔍 CHAT API (FILE): Using string conversion: %s...", response_text[:100])
                 
-                # TODO: ERROR HANDLING - Check if the response indicates an error
-                is_error = any(error_indicator in response_text for error_indicator in [
-                    "❌ No employee found",
-                    "❌ Invalid file data", 
-                    "❌ User context not available",
-                    "❌ Error",
-                    "Failed to",
-                    "Recursion limit"
-                ])
-            else:
-                response_text = "I'm sorry, I couldn't process your request. Please try again."
-                is_error = True
+                    # TODO: ERROR HANDLING - Check if the response indicates an error
+                    is_error = any(error_indicator in response_text for error_indicator in [
+                        "❌ No employee found",
+                        "❌ Invalid file data", 
+                        "❌ User context not available",
+                        "❌ Error",
+                        "Failed to",
+                        "Recursion limit"
+                    ])
+                else:
+                    response_text = "I'm sorry, I couldn't process your request. Please try again."
+                    is_error = True
             
-            # Determine the agent name
-            agent_name = "Core"
-            if "agent" in result.get("context", {}):
-                agent_name = result["context"]["agent"]
+                # Determine the agent name
+                agent_name = "Core"
+                if "agent" in result.get("context", {}):
+                    agent_name = result["context"]["agent"]
             
-            # Save the updated state
-            try:
-                # Convert result to serializable format before saving
-                serializable_result = _make_serializable(result)
-                print(f"🔍 DEBUG: Saving conversation state with data: {serializable_result.get('data', {})}")
-                print(f"🔍 DEBUG: Session ID: {session_id}, User ID: {current_user.user_id}")
-                print(f"🔍 DEBUG: Full serializable_result keys: {list(serializable_result.keys())}")
-
-                # Save conversation state to session using the same session_id as retrieval
-                await session_manager.store_chat_session(
-                    session_id,  # Use the same session_id as retrieval
-                    str(current_user.user_id),
-                    {"conversation_state": serializable_result}
-                )
-                print(f"🔍 DEBUG: Conversation state saved successfully")
-                print(f"🔄 CHAT API: Saved conversation state with {len(serializable_result.get('messages', []))} messages")
-            except Exception as e:
-                print(f"⚠️ CHAT API: Failed to save conversation state: {e}")
-                import traceback
-                print(f"🔍 DEBUG: Save error traceback: {traceback.format_exc()}")
+                # Every step is already checkpointed on the thread; fold older
+                # turns into the rolling summary off the request path
+                try:
+                    context_window_manager.schedule_summarization(session_id, user_id, result)
+                except Exception as e:
+                    logger.warning("⚠️ CHAT API: Failed to schedule conversation summarization: %s", e)
             
             # TODO: ERROR HANDLING - Return success: false for errors to trigger frontend clearing
-            print(f"🔍 CHAT API (FILE): Final response being returned:")
-            print(f"🔍 CHAT API (FILE): - response: {response_text[:100]}...")
-            print(f"🔍 CHAT API (FILE): - response type: {type(response_text)}")
-            print(f"🔍 CHAT API (FILE): - response length: {len(str(response_text))}")
-            print(f"🔍 CHAT API (FILE): - success: {not is_error}")
+            logger.debug("🔍 CHAT API (FILE): Final response being returned:")
+            logger.debug("🔍 CHAT API (FILE): - response: %s...", response_text[:100])
+            logger.debug("🔍 CHAT API (FILE): - response type: %s", type(response_text))
+            logger.debug("🔍 CHAT API (FILE): - response length: %s", len(str(response_text)))
+            logger.debug("🔍 CHAT API (FILE): - success: %s", not is_error)
             
             return ChatResponse(
                 response=response_text,
@@ -665,8 +740,18 @@ async def send_chat_message_with_file(
                 data=result.get("data", {})
             )
             
+    except SessionBusyError as e:
+        logger.debug("⏳ CHAT API: %s", e)
+        return ChatResponse(
+            response="I'm still working on your previous message in this chat. Please wait for it to finish and try again.",
+            agent="Core",
+            success=False,
+            timestamp=datetime.now().isoformat(),
+            session_id=session_id,
+            data={"error": "session_busy"}
+        )
     except Exception as e:
-        print(f"❌ Chat processing with file failed: {str(e)}")
+        logger.error("❌ Chat processing with file failed: %s", str(e))
         return ChatResponse(
             response=f"I encountered an error processing your request with file: {str(e)}",
             agent="error_handler",
@@ -681,8 +766,8 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
     """
     Sends a message to the new agentic graph and returns a JSON response.
     """
-    print(f"🔥 CHAT API: ENTRY POINT - Message received: {chat_request.message}")
-    print(f"🔥 CHAT API: Session ID: {chat_request.session_id}")
+    logger.debug("🔥 CHAT API: ENTRY POINT - Message received: %s", chat_request.message)
+    logger.debug("🔥 CHAT API: Session ID: %s", chat_request.session_id)
     
     #db = next(get_db())
     
@@ -720,8 +805,8 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
             )
             
             if is_greeting:
-                print(f"🔥 CHAT API: ULTRA-FAST GREETING PATH!")
-                print(f"🔍 DEBUG: Greeting detected - {message_content}")
+                logger.debug("🔥 CHAT API: ULTRA-FAST GREETING PATH!")
+                logger.debug("🔍 DEBUG: Greeting detected - %s", message_content)
                 
                 # Extract first name for personalized greeting
                 first_name = ''
@@ -742,7 +827,7 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
                     first_name = user_name.split()[0] if user_name else ''
                 
                 greeting_response = f"Hello{(' ' + first_name) if first_name else ''}! How can I help you today?"
-                print(f"🔥 CHAT API: Greeting response: {greeting_response}")
+                logger.debug("🔥 CHAT API: Greeting response: %s", greeting_response)
                 
                 return ChatResponse(
                     response=greeting_response,
@@ -774,7 +859,7 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
             )
             
             if is_simple_info_query:
-                print(f"🔥 CHAT API: ULTRA-FAST SIMPLE INFO PATH!")
+                logger.debug("🔥 CHAT API: ULTRA-FAST SIMPLE INFO PATH!")
                 return ChatResponse(
                     response="I'm here to help with your consulting business needs. You can ask me about clients, contracts, employees, deliverables, time tracking, or expenses. What would you like to know?",
                     agent="Core",
@@ -819,198 +904,138 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
             # Only use ultra-fast path if it's a simple client query AND not a complex query
             is_simple_client_list = any(query in message_lower for query in client_queries) and not is_complex_client_query
             
-            print(f"🔍 ULTRA-FAST DEBUG: message_lower='{message_lower}'")
-            print(f"🔍 ULTRA-FAST DEBUG: is_complex_client_query={is_complex_client_query}")
-            print(f"🔍 ULTRA-FAST DEBUG: is_simple_client_list={is_simple_client_list}")
+            logger.debug("🔍 ULTRA-FAST DEBUG: message_lower='%s'", message_lower)
+            logger.debug("🔍 ULTRA-FAST DEBUG: is_complex_client_query=%s", is_complex_client_query)
+            logger.debug("🔍 ULTRA-FAST DEBUG: is_simple_client_list=%s", is_simple_client_list)
             
             if is_simple_client_list:
-                print(f"🔥 CHAT API: ULTRA-FAST CLIENT LIST PATH!")
+                logger.debug("🔥 CHAT API: ULTRA-FAST CLIENT LIST PATH!")
                 # Call fast clients logic directly instead of redirecting
                 return await fast_clients(chat_request, request)
             
             # For non-fast-path messages, proceed with LangGraph
-            print(f"🔥 CHAT API: Processing complex query...")
-            print(f"🔍 DEBUG: Regular message - {message_content[:100]}...")
-            print(f"🔍 DEBUG: Session ID: {chat_request.session_id}")
+            logger.debug("🔥 CHAT API: Processing complex query...")
+            logger.debug("🔍 DEBUG: Regular message - %s...", message_content[:100])
+            logger.debug("🔍 DEBUG: Session ID: %s", chat_request.session_id)
             
-            print(f"🔥 CHAT API: Proceeding with LangGraph...")
-            print(f"🔥 CHAT API: Message '{message_content}' did not match any fast paths")
+            logger.debug("🔥 CHAT API: Proceeding with LangGraph...")
+            logger.debug("🔥 CHAT API: Message '%s' did not match any fast paths", message_content)
 
             # --- LangGraph Invocation for complex messages ---
             # 1. Load existing conversation context or create new one
             
-            session_manager = SessionManager()
             user_id = str(current_user.user_id)
             session_id = chat_request.session_id or current_user.session_id
+            bind_session(session_id)
             
-            # Try to load existing conversation state
-            existing_state = None
-            print(f"🔥 CHAT API: About to retrieve session data for session_id={session_id}, user_id={user_id}")
-            try:
-                chat_session_data = await session_manager.get_chat_session(
-                    session_id, 
-                    user_id
-                )
-                print(f"🔍 DEBUG: Raw chat session data: {chat_session_data}")
-                if chat_session_data and "conversation_state" in chat_session_data:
-                    existing_state = chat_session_data["conversation_state"]
+            # Only one turn per session at a time - overlapping requests queue behind this one
+            async with conversation_state_store.session_turn(session_id, user_id):
+                # Try to load existing conversation state
+                existing_state = None
+                checkpointed = False
+                turn = await conversation_state_store.begin_turn(session_id, user_id)
+                logger.debug("🔥 CHAT API: About to retrieve conversation state for session_id=%s, user_id=%s", session_id, user_id)
+                try:
+                    existing_state, checkpointed = await _load_conversation_state(turn)
+                    if existing_state:
+                        # Drop turns already folded into the rolling summary
+                        folded = await context_window_manager.apply_cached_summary(session_id, user_id, existing_state)
+                        if folded:
+                            logger.debug("🪟 CHAT API: Folded %s older messages into conversation summary", folded)
 
-                    # Normalize message roles to fix OpenAI API compatibility
-                    if existing_state.get('messages'):
-                        existing_state['messages'] = _normalize_message_roles(existing_state['messages'])
+                        # Normalize message roles to fix OpenAI API compatibility
+                        if existing_state.get('messages'):
+                            existing_state['messages'] = _normalize_message_roles(existing_state['messages'])
 
-                    print(f"🔄 CHAT API: Loaded existing conversation state with {len(existing_state.get('messages', []))} messages")
-                    print(f"🔍 DEBUG: Existing state data: {existing_state.get('data', {})}")
-                else:
-                    print(f"🔍 DEBUG: No conversation_state in chat_session_data")
-            except Exception as e:
-                print(f"🔄 CHAT API: No existing state found, creating new: {e}")
+                        logger.debug("🔄 CHAT API: Loaded existing conversation state with %s messages (checkpointed=%s)", len(existing_state.get('messages', [])), checkpointed)
+                        logger.debug("🔍 DEBUG: Existing state data: %s", existing_state.get('data', {}))
+                    else:
+                        logger.debug("🔍 DEBUG: No existing conversation state")
+                except Exception as e:
+                    logger.debug("🔄 CHAT API: No existing state found, creating new: %s", e)
+                    existing_state = None
+                    checkpointed = False
             
-            # Create or update state
-            if existing_state:
-                # Add new message to existing conversation - use dict format with 'user' type
-                new_message = {
-                    "type": "user",
-                    "content": message_content,
-                    "role": "user"
-                }
-                existing_state["messages"].append(new_message)
+                # Create or update state
+                if existing_state:
+                    # Add new message to existing conversation - use dict format with 'user' type
+                    new_message = {
+                        "type": "user",
+                        "content": message_content,
+                        "role": "user"
+                    }
+                    # Messages from here on are this turn's own (merged on a commit conflict)
+                    turn.base_message_count = len(existing_state["messages"])
+                    existing_state["messages"].append(new_message)
                 
-                # Update context
-                existing_state["context"]["last_interaction"] = datetime.now().isoformat()
-                existing_state["context"]["interaction_count"] = existing_state["context"].get("interaction_count", 0) + 1
-                existing_state["status"] = "processing"
+                    # Update context
+                    existing_state["context"]["last_interaction"] = datetime.now().isoformat()
+                    existing_state["context"]["interaction_count"] = existing_state["context"].get("interaction_count", 0) + 1
+                    existing_state["status"] = "processing"
                 
-                # Add database to context
-                #existing_state["context"]["database"] = db
+                    # Add database to context
+                    #existing_state["context"]["database"] = db
                 
-                initial_state = existing_state
-                print(f"🔄 CHAT API: Updated existing state, now has {len(initial_state['messages'])} messages")
-            else:
-                # Create new conversation state
-                initial_message = HumanMessage(content=message_content)
-                initial_state = create_initial_state(
-                    user_id=user_id,
-                    session_id=session_id,
-                    user_name=current_user.user.full_name or current_user.user.email,
-                    user_role=current_user.role,
-                    initial_message=initial_message
-                )
+                    initial_state = existing_state
+                    logger.debug("🔄 CHAT API: Updated existing state, now has %s messages", len(initial_state['messages']))
+                else:
+                    # Create new conversation state
+                    initial_message = HumanMessage(content=message_content)
+                    initial_state = create_initial_state(
+                        user_id=user_id,
+                        session_id=session_id,
+                        user_name=current_user.user.full_name or current_user.user.email,
+                        user_role=current_user.role,
+                        initial_message=initial_message
+                    )
                 
-            # Add database to context (removed to avoid unhashable type error)
-            #initial_state["context"]["database"] = db
-                print(f"🔄 CHAT API: Created new conversation state")
+                # Add database to context (removed to avoid unhashable type error)
+                #initial_state["context"]["database"] = db
+                    logger.debug("🔄 CHAT API: Created new conversation state")
             
-            # Add file_info to context if provided
-            if hasattr(chat_request, 'file_info') and chat_request.file_info:
-                initial_state["context"]["file_info"] = chat_request.file_info
-
-            # Ensure all messages are properly serializable
-            if initial_state.get("messages"):
-                serializable_messages = []
-                for msg in initial_state["messages"]:
-                    if hasattr(msg, 'type') and hasattr(msg, 'content'):
-                        # LangChain message object - convert to dict
-                        serializable_messages.append({
-                            "type": msg.type,
-                            "content": msg.content,
-                            "role": getattr(msg, 'role', msg.type)
-                        })
-                    elif isinstance(msg, dict):
-                        # Already a dict - ensure it's properly structured
-                        if 'type' not in msg:
-                            msg['type'] = msg.get('role', 'user')
-                        if 'role' not in msg:
-                            msg['role'] = msg.get('type', 'user')
-                        serializable_messages.append(msg)
-                    else:
-                        # Fallback - convert to string
-                        serializable_messages.append({
-                            "type": "unknown",
-                            "content": str(msg),
-                            "role": "unknown"
-                        })
-                initial_state["messages"] = serializable_messages
-
-            # Ensure all state values are hashable/serializable - ULTRA AGGRESSIVE APPROACH
-            print(f"🔍 DEBUG: Before serialization - state keys: {list(initial_state.keys())}")
-
-            # First, make everything serializable
-            initial_state = _make_serializable_state(initial_state)
-            print(f"🔍 DEBUG: After first serialization - state keys: {list(initial_state.keys())}")
-
-            # Second pass - ensure no dictionaries are used as keys anywhere
-            initial_state = _ensure_no_dict_keys(initial_state)
-            print(f"🔍 DEBUG: After second pass - state keys: {list(initial_state.keys())}")
-
-            # Third pass - validate hashability
-            try:
-                _validate_state_hashable(initial_state)
-                print("✅ State validation passed - all values are hashable")
-            except Exception as validation_error:
-                print(f"❌ State validation failed: {validation_error}")
-                # Create a minimal state as fallback
-                initial_state = {
-                    "messages": [{"type": "user", "content": message_content, "role": "user"}],
-                    "current_agent": "router",
-                    "data": {},
-                    "status": "routing",
-                    "context": {
-                        "user_id": user_id,
-                        "session_id": session_id,
-                        "user_name": f"{current_user.user.first_name} {current_user.user.last_name}".strip() or current_user.user.email,
-                        "user_role": current_user.role,
-                        "conversation_start": datetime.now().isoformat(),
-                        "last_interaction": datetime.now().isoformat(),
-                        "interaction_count": 1
-                    }
-                }
-                print("✅ Created minimal fallback state")
+                # Add file_info to context if provided
+                if hasattr(chat_request, 'file_info') and chat_request.file_info:
+                    initial_state["context"]["file_info"] = chat_request.file_info
+
+                # Ensure all messages are properly serializable
+                if initial_state.get("messages"):
+                    serializable_messages = []
+                    for msg in initial_state["messages"]:
+                        if hasattr(msg, 'type') and hasattr(msg, 'content'):
+                            # LangChain message object - convert to dict
+                            serializable_messages.append({
+                                "type": msg.type,
+                                "content": msg.content,
+                                "role": getattr(msg, 'role', msg.type)
+                            })
+                        elif isinstance(msg, dict):
+                            # Already a dict - ensure it's properly structured
+                            if 'type' not in msg:
+                                msg['type'] = msg.get('role', 'user')
+                            if 'role' not in msg:
+                                msg['role'] = msg.get('type', 'user')
+                            serializable_messages.append(msg)
+                        else:
+                            # Fallback - convert to string
+                            serializable_messages.append({
+                                "type": "unknown",
+                                "content": str(msg),
+                                "role": "unknown"
+                            })
+                    initial_state["messages"] = serializable_messages
+
+                # The checkpointer serializes each step's changes - no pre-serialization pass needed
+                logger.debug("🔍 DEBUG: Invoking agent with recursion_limit=20")
+                logger.debug("🔍 DEBUG: Initial state keys: %s", list(initial_state.keys()))
+                logger.debug("🔍 DEBUG: Context keys: %s", list(initial_state.get('context', {}).keys()))
 
-            # DEBUG: Add additional validation before LangGraph invocation
-            try:
-                # Validate that all state values are hashable
-                _validate_state_hashable(initial_state)
-                print("✅ State validation passed - all values are hashable")
-            except Exception as validation_error:
-                print(f"❌ State validation failed: {validation_error}")
-                # Continue anyway, but log the issue
-
-            # 🚀 PHASE 2 OPTIMIZATION: Reduced recursion limit to prevent multiple iterations
-            # TODO: If agent responses become incomplete or tools don't execute properly, revert recursion_limit to 10
-            print(f"🔍 DEBUG: Invoking agent with recursion_limit=20")
-            print(f"🔍 DEBUG: Initial state keys: {list(initial_state.keys())}")
-            print(f"🔍 DEBUG: Context keys: {list(initial_state.get('context', {}).keys())}")
-
-            # 🚀 PHASE 2 OPTIMIZATION: Reduced recursion limit to prevent multiple iterations
-            # TODO: If agent responses become incomplete or tools don't execute properly, revert recursion_limit to 10
-            try:
-                result = await agent_app.ainvoke(initial_state, config={"recursion_limit": 20})
-                print(f"🔍 DEBUG: Agent invocation completed successfully")
-            except Exception as langgraph_error:
-                print(f"❌ LangGraph invocation failed: {langgraph_error}")
-                # Try with minimal state as last resort
                 try:
-                    minimal_state = {
-                        "messages": [{"type": "user", "content": message_content, "role": "user"}],
-                        "current_agent": "router",
-                        "data": {},
-                        "status": "routing",
-                        "context": {
-                            "user_id": user_id,
-                            "session_id": session_id,
-                            "user_name": f"{current_user.user.first_name} {current_user.user.last_name}".strip() or current_user.user.email,
-                            "user_role": current_user.role,
-                            "conversation_start": datetime.now().isoformat(),
-                            "last_interaction": datetime.now().isoformat(),
-                            "interaction_count": 1
-                        }
-                    }
-                    print("🔄 Trying with minimal state...")
-                    result = await agent_app.ainvoke(minimal_state, config={"recursion_limit": 5})
-                    print(f"✅ Minimal state invocation successful")
-                except Exception as minimal_error:
-                    print(f"❌ Minimal state also failed: {minimal_error}")
+                    # Overlap the likely agent's context loading with routing and checkpointing
+                    context_prefetcher.start(initial_state)
+                    result = await _run_turn(request, _turn_input(initial_state, checkpointed), turn)
+                    logger.debug("🔍 DEBUG: Agent invocation completed successfully")
+                except Exception as langgraph_error:
+                    logger.error("❌ LangGraph invocation failed after resume: %s", langgraph_error)
                     # Create a fallback result structure
                     result = {
                         "messages": [{"content": "I'm sorry, I encountered an error processing your request. Please try again.", "role": "assistant"}],
@@ -1022,93 +1047,75 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
                         "data": {},
                         "status": "error"
                     }
-                    print("✅ Created fallback result structure")
+                    logger.warning("✅ Created fallback result structure")
 
-            print(f"🔍 DEBUG: Agent invocation completed")
+                logger.debug("🔍 DEBUG: Agent invocation completed")
             
-            # 3. Extract the response from the result
-            response_content = "I'm processing your request..."
-
-            if "messages" in result and result["messages"]:
-                last_message = result["messages"][-1]
-                print(f"🔍 DEBUG: Last message type: {type(last_message)}")
-                print(f"🔍 DEBUG: Last message: {last_message}")
-
-                if hasattr(last_message, 'content'):
-                    response_content = last_message.content
-                    print(f"🔍 DEBUG: Extracted content from LangChain message: {response_content[:100]}...")
-                elif isinstance(last_message, dict) and 'content' in last_message:
-                    # Check if this is a tool result message
-                    if last_message.get('role') == 'tool' and last_message.get('name'):
-                        print(f"🔍 CHAT API: Tool result message detected - name: {last_message.get('name')}")
-                        try:
-                            # Parse the JSON content from tool result
-                            import json
-                            tool_result = json.loads(last_message['content'])
-                            if isinstance(tool_result, dict) and 'message' in tool_result:
-                                response_content = tool_result['message']
-                                print(f"🔍 CHAT API: Extracted message from tool result: {response_content[:100]}...")
-                            else:
+                # 3. Extract the response from the result
+                response_content = "I'm processing your request..."
+
+                if "messages" in result and result["messages"]:
+                    last_message = result["messages"][-1]
+                    logger.debug("🔍 DEBUG: Last message type: %s", type(last_message))
+                    logger.debug("🔍 DEBUG: Last message: %s", last_message)
+
+                    if hasattr(last_message, 'content'):
+                        response_content = last_message.content
+                        logger.debug("🔍 DEBUG: Extracted content from LangChain message: %s...", response_content[:100])
+                    elif isinstance(last_message, dict) and 'content' in last_message:
+                        # Check if this is a tool result message
+                        if last_message.get('role') == 'tool' and last_message.get('name'):
+                            logger.debug("🔍 CHAT API: Tool result message detected - name: %s", last_message.get('name'))
+                            try:
+                                # Parse the JSON content from tool result
+                                import json
+                                tool_result = json.loads(last_message['content'])
+                                if isinstance(tool_result, dict) and 'message' in tool_result:
+                                    response_content = tool_result['message']
+                                    logger.debug("🔍 CHAT API: Extracted message from tool result: %s...", response_content[:100])
+                                else:
+                                    response_content = last_message['content']
+                                    logger.debug("🔍 CHAT API: Tool result is not dict or no message field, using raw content: %s...", response_content[:100])
+                            except (json.JSONDecodeError, TypeError) as e:
                                 response_content = last_message['content']
-                                print(f"🔍 CHAT API: Tool result is not dict or no message field, using raw content: {response_content[:100]}...")
-                        except (json.JSONDecodeError, TypeError) as e:
+                                logger.error("🔍 CHAT API: Failed to parse tool result JSON, using raw content: %s...", response_content[:100])
+                        else:
                             response_content = last_message['content']
-                            print(f"🔍 CHAT API: Failed to parse tool result JSON, using raw content: {response_content[:100]}...")
-                    else:
-                        response_content = last_message['content']
-                        print(f"🔍 CHAT API: Extracted content from dict message: {response_content[:100]}...")
+                            logger.debug("🔍 CHAT API: Extracted content from dict message: %s...", response_content[:100])
                     
-                    print(f"🔍 CHAT API: Dict message keys: {list(last_message.keys())}")
-                    if 'data' in last_message:
-                        print(f"🔍 CHAT API: Message has data field with keys: {list(last_message['data'].keys()) if isinstance(last_message['data'], dict) else 'Not a dict'}")
+                        logger.debug("🔍 CHAT API: Dict message keys: %s", list(last_message.keys()))
+                        if 'data' in last_message:
+                            logger.debug("🔍 CHAT API: Message has data field with keys: %s", list(last_message['data'].keys()) if isinstance(last_message['data'], dict) else 'Not a dict')
+                        else:
+                            logger.debug("🔍 CHAT API: Message has no data field")
                     else:
-                        print(f"🔍 CHAT API: Message has no data field")
-                else:
-                    # Fallback - convert to string and try to extract content
-                    last_message_str = str(last_message)
-                    print(f"🔍 DEBUG: Last message as string: {last_message_str[:200]}...")
-
-                    # Try to parse as JSON if it looks like a dict
-                    if last_message_str.startswith("{") and "content" in last_message_str:
-                        try:
-                            import json
-                            parsed = json.loads(last_message_str)
-                            if isinstance(parsed, dict) and 'content' in parsed:
-                                response_content = parsed['content']
-                                print(f"🔍 DEBUG: Extracted content from JSON string: {response_content[:100]}...")
-                        except:
+                        # Fallback - convert to string and try to extract content
+                        last_message_str = str(last_message)
+                        logger.debug("🔍 DEBUG: Last message as string: %s...", last_message_str[:200])
+
+                        # Try to parse as JSON if it looks like a dict
+                        if last_message_str.startswith("{") and "content" in last_message_str:
+                            try:
+                                import json
+                                parsed = json.loads(last_message_str)
+                                if isinstance(parsed, dict) and 'content' in parsed:
+                                    response_content = parsed['content']
+                                    logger.debug("🔍 DEBUG: Extracted content from JSON string: %s...", response_content[:100])
+                            except:
+                                response_content = last_message_str
+                        else:
                             response_content = last_message_str
-                    else:
-                        response_content = last_message_str
 
-            print(f"🔍 CHAT API: Final response_content: {response_content[:200]}...")
-            print(f"🔍 CHAT API: Final response_content type: {type(response_content)}")
-            print(f"🔍 CHAT API: Final response_content length: {len(str(response_content))}")
+                logger.debug("🔍 CHAT API: Final response_content: %s...", response_content[:200])
+                logger.debug("🔍 CHAT API: Final response_content type: %s", type(response_content))
+                logger.debug("🔍 CHAT API: Final response_content length: %s", len(str(response_content)))
 
-            # 4. Save updated conversation state for context persistence
-            try:
-                # Remove database from context before saving (can't serialize)
-                if "database" in result["context"]:
-                    del result["context"]["database"]
-                
-                # Convert ChatCompletionMessage objects to serializable format
-                serializable_result = _make_serializable(result)
-                
-                print(f"🔍 DEBUG: Saving conversation state with data: {serializable_result.get('data', {})}")
-                print(f"🔍 DEBUG: Session ID: {session_id}, User ID: {current_user.user_id}")
-                print(f"🔍 DEBUG: Full serializable_result keys: {list(serializable_result.keys())}")
-                
-                # Save conversation state to session using the same session_id as retrieval
-                await session_manager.store_chat_session(
-                    session_id,  # Use the same session_id as retrieval
-                    str(current_user.user_id),
-                    {"conversation_state": serializable_result}
-                )
-                print(f"🔍 DEBUG: Conversation state saved successfully")
-                print(f"🔄 CHAT API: Saved conversation state with {len(serializable_result.get('messages', []))} messages")
-            except Exception as save_error:
-                print(f"⚠️ CHAT API: Failed to save conversation state: {save_error}")
-                # Don't fail the request if saving fails
+                # 4. Every step is already checkpointed on the thread; fold older
+                # turns into the rolling summary off the request path
+                try:
+                    context_window_manager.schedule_summarization(session_id, user_id, result)
+                except Exception as summary_error:
+                    logger.warning("⚠️ CHAT API: Failed to schedule conversation summarization: %s", summary_error)
 
             # TODO: ERROR HANDLING - Check if response indicates an error
             is_error = any(error_indicator in response_content for error_indicator in [
@@ -1130,11 +1137,11 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
             if isinstance(result, dict) and "status" in result:
                 result_status = result["status"] or "completed"
 
-            print(f"🔍 CHAT API: Final ChatResponse being returned:")
-            print(f"🔍 CHAT API: - response length: {len(str(response_content))}")
-            print(f"🔍 CHAT API: - response preview: {response_content[:200]}...")
-            print(f"🔍 CHAT API: - response type: {type(response_content)}")
-            print(f"🔍 CHAT API: - success: {not is_error}")
+            logger.debug("🔍 CHAT API: Final ChatResponse being returned:")
+            logger.debug("🔍 CHAT API: - response length: %s", len(str(response_content)))
+            logger.debug("🔍 CHAT API: - response preview: %s...", response_content[:200])
+            logger.debug("🔍 CHAT API: - response type: %s", type(response_content))
+            logger.debug("🔍 CHAT API: - success: %s", not is_error)
             
             final_response = ChatResponse(
                 response=response_content,
@@ -1149,13 +1156,23 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
                 }
             )
             
-            print(f"🔍 CHAT API: ChatResponse object created successfully")
+            logger.debug("🔍 CHAT API: ChatResponse object created successfully")
             return final_response
 
+    except SessionBusyError as e:
+        logger.debug("⏳ CHAT API: %s", e)
+        return ChatResponse(
+            response="I'm still working on your previous message in this chat. Please wait for it to finish and try again.",
+            agent="Core",
+            success=False,
+            timestamp=datetime.now().isoformat(),
+            session_id=session_id,
+            data={"error": "session_busy"}
+        )
     except Exception as e:
         
         traceback.print_exc()
-        print(f"❌ Chat processing failed: {str(e)}")
+        logger.error("❌ Chat processing failed: %s", str(e))
         
         # Return error response in expected format
         return ChatResponse(
@@ -1167,7 +1184,7 @@ async def send_chat_message(chat_request: ChatRequest, request: Request):
             data={"error": str(e)}
         )
     finally:
-        print("Do not close the db session")
+        logger.debug("Do not close the db session")
 
 @router.post("/message/stream")
 async def send_chat_message_stream(
@@ -1227,15 +1244,15 @@ async def send_chat_message_stream(
         try:
             # Validate that all state values are hashable
             _validate_state_hashable(initial_state)
-            print("✅ Stream state validation passed - all values are hashable")
+            logger.debug("✅ Stream state validation passed - all values are hashable")
         except Exception as validation_error:
-            print(f"❌ Stream state validation failed: {validation_error}")
+            logger.error("❌ Stream state validation failed: %s", validation_error)
             # Continue anyway, but log the issue
 
         # 🚀 PHASE 2 OPTIMIZATION: Reduced recursion limit for streaming responses
         # TODO: If streaming responses become incomplete, revert recursion_limit to 10
         async def stream_generator():
-            async for event in agent_app.astream(initial_state, config={"recursion_limit": 4}):
+            async for event in stateless_agent_app.astream(initial_state, config={"recursion_limit": 4}):
                 yield f"data: {json.dumps(event)}"
 
         return StreamingResponse(stream_generator(), media_type="text/event-stream")
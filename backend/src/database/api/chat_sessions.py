@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from src.database.core.database import get_db
 from src.auth.dependencies import get_current_user, AuthenticatedUser
 from src.auth.session_manager import SessionManager
+from src.aiagents.memory.checkpointer import graph_checkpointer, conversation_thread_id
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -117,6 +118,10 @@ async def delete_chat_session(
             if hasattr(session_manager, "_mock_chats") and chat_key in session_manager._mock_chats:
                 del session_manager._mock_chats[chat_key]
 
+        # Drop the agent graph's checkpoints for this conversation and its committed head
+        await graph_checkpointer.adelete_thread(conversation_thread_id(session_id, user_id))
+        await session_manager.delete_chat_head(session_id, user_id)
+
         # Optionally also invalidate the session record
         await session_manager.invalidate_session(session_id, user_id)
 
@@ -6,6 +6,10 @@ from src.database.core.database import get_db
 from src.database.core.models import Client, Contract
 from src.database.core.schemas import ClientCreate, ClientResponse, ClientWithContracts, ContractResponse
 from src.auth.dependencies import get_current_user, AuthenticatedUser
+from src.aiagents.performance.change_events import CLIENT, CREATED, DELETED, change_events
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
@@ -24,6 +28,7 @@ async def create_client(
     db.add(db_client)
     await db.commit()
     await db.refresh(db_client)
+    await change_events.emit(CLIENT, db_client.client_id, CREATED, client_name=db_client.client_name)
 
 @router.get("/", response_model=List[ClientResponse])
 async def get_clients(db: AsyncSession = Depends(get_db)):
@@ -65,7 +70,7 @@ async def get_client_by_name(client_name: str, session: AsyncSession) -> Client:
         return clients[0]
     else:
         # Multiple clients found - return the most recent one
-        print(f"🔍 DEBUG: Multiple clients found for '{client_name}', returning most recent")
+        logger.debug("🔍 Multiple clients found for '%s', returning most recent", client_name)
         return max(clients, key=lambda c: c.created_at or c.updated_at)
 
 async def create_client_internal(client: ClientCreate, session: AsyncSession, user_id: str) -> Client:
@@ -82,6 +87,7 @@ async def create_client_internal(client: ClientCreate, session: AsyncSession, us
     session.add(db_client)
     await session.commit()
     await session.refresh(db_client)
+    await change_events.emit(CLIENT, db_client.client_id, CREATED, client_name=db_client.client_name)
     return db_client
 
 @router.get("/{client_id}", response_model=ClientWithContracts)
@@ -107,7 +113,8 @@ async def update_client(
         raise HTTPException(status_code=404, detail="Client not found")
     
     # Update fields
-    for field, value in client_update.model_dump(exclude_unset=True).items():
+    updated_fields = client_update.model_dump(exclude_unset=True)
+    for field, value in updated_fields.items():
         setattr(db_client, field, value)
     
     # Set updated_by to current user
@@ -115,6 +122,7 @@ async def update_client(
     
     await db.commit()
     await db.refresh(db_client)
+    await change_events.emit(CLIENT, client_id, changed_fields=updated_fields, client_name=db_client.client_name)
     return db_client
 
 @router.delete("/{client_id}")
@@ -131,4 +139,5 @@ async def delete_client(
     
     await db.delete(db_client)
     await db.commit()
+    await change_events.emit(CLIENT, client_id, DELETED)
     return {"message": "Client deleted successfully"}
\ No newline at end of file
@@ -7,8 +7,9 @@ from datetime import date, timedelta
 from src.database.core.database import get_db
 from src.database.core.models import Contract, Client
 from src.database.core.schemas import ContractCreate, ContractUpdate, ContractResponse, ContractDocumentResponse
-from src.services.storage_service import SupabaseStorageService
+from src.services.storage_service import CONTRACT_DOCUMENTS_BUCKET, get_storage_service
 from src.auth.dependencies import get_current_user, AuthenticatedUser
+from src.aiagents.performance.change_events import CONTRACT, CONTRACT_DOCUMENT_FIELDS, CREATED, DELETED, change_events
 
 router = APIRouter()
 
@@ -43,7 +44,7 @@ async def upload_contract_document(
         
         # Upload to Supabase Storage
         try:
-            storage_service = SupabaseStorageService()
+            storage_service = get_storage_service()
         except ValueError as e:
             raise HTTPException(status_code=500, detail=f"Storage service configuration error: {str(e)}")
         except Exception as e:
@@ -67,6 +68,7 @@ async def upload_contract_document(
             
             await db.commit()
             await db.refresh(contract)
+            await change_events.emit(CONTRACT, contract_id, changed_fields=CONTRACT_DOCUMENT_FIELDS, client_id=contract.client_id)
             
             return ContractDocumentResponse(
                 success=True,
@@ -101,8 +103,8 @@ async def get_contract_document(
             raise HTTPException(status_code=404, detail="No document found for this contract")
         
         # Generate signed URL for secure access
-        storage_service = SupabaseStorageService()
-        signed_url = storage_service.get_document_url(contract.document_file_path)
+        storage_service = get_storage_service()
+        signed_url = await storage_service.create_signed_url(CONTRACT_DOCUMENTS_BUCKET, contract.document_file_path)
         
         return {
             "contract_id": contract_id,
@@ -133,7 +135,7 @@ async def delete_contract_document(
             raise HTTPException(status_code=404, detail="No document found for this contract")
         
         # Delete from Supabase Storage
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         deleted = await storage_service.delete_contract_document(contract.document_file_path)
         
         if deleted:
@@ -146,6 +148,7 @@ async def delete_contract_document(
             contract.updated_by = current_user.user_id
             
             await db.commit()
+            await change_events.emit(CONTRACT, contract_id, changed_fields=CONTRACT_DOCUMENT_FIELDS, client_id=contract.client_id)
             
             return {"message": "Document deleted successfully"}
         else:
@@ -175,6 +178,7 @@ async def create_contract(
     db.add(db_contract)
     await db.commit()
     await db.refresh(db_contract)
+    await change_events.emit(CONTRACT, db_contract.contract_id, CREATED, client_id=db_contract.client_id)
     return db_contract
 
 async def create_contract_internal(contract: ContractCreate, db: AsyncSession, user_id: str) -> Contract:
@@ -197,6 +201,7 @@ async def create_contract_internal(contract: ContractCreate, db: AsyncSession, u
     db.add(db_contract)
     await db.commit()
     await db.refresh(db_contract)
+    await change_events.emit(CONTRACT, db_contract.contract_id, CREATED, client_id=db_contract.client_id)
     return db_contract
 
 @router.get("/", response_model=List[ContractResponse])
@@ -237,7 +242,8 @@ async def update_contract(
         raise HTTPException(status_code=404, detail="Contract not found")
     
     # Update fields
-    for field, value in contract_update.model_dump(exclude_unset=True).items():
+    updated_fields = contract_update.model_dump(exclude_unset=True)
+    for field, value in updated_fields.items():
         setattr(db_contract, field, value)
     
     # Set updated_by to current user
@@ -245,6 +251,7 @@ async def update_contract(
     
     await db.commit()
     await db.refresh(db_contract)
+    await change_events.emit(CONTRACT, contract_id, changed_fields=updated_fields, client_id=db_contract.client_id)
     return db_contract
 
 @router.delete("/{contract_id}")
@@ -262,8 +269,8 @@ async def delete_contract(
     # Delete associated document if it exists
     if db_contract.document_file_path:
         try:
-            from src.services.storage_service import SupabaseStorageService
-            storage_service = SupabaseStorageService()
+            from src.services.storage_service import get_storage_service
+            storage_service = get_storage_service()
             await storage_service.delete_contract_document(db_contract.document_file_path)
         except Exception as e:
             # Log the error but don't fail the contract deletion
@@ -271,6 +278,7 @@ async def delete_contract(
     
     await db.delete(db_contract)
     await db.commit()
+    await change_events.emit(CONTRACT, contract_id, DELETED, client_id=db_contract.client_id)
     return {"message": "Contract and associated document deleted successfully"}
 
 # Additional contract-specific endpoints
@@ -326,6 +334,7 @@ async def update_contract_status(
     
     await db.commit()
     await db.refresh(db_contract)
+    await change_events.emit(CONTRACT, contract_id, changed_fields=("status", "termination_date"), client_id=db_contract.client_id)
     return {"message": f"Contract status updated to {status}", "contract": db_contract}
 
 # @router.post("/{contract_id}/upload-document", response_model=ContractDocumentResponse)
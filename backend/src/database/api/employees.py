@@ -11,7 +11,7 @@ from src.database.core.schemas import (
     EmployeeDocumentInfo,
     EmployeeDocumentsResponse
 )
-from src.services.storage_service import SupabaseStorageService
+from src.services.storage_service import EMPLOYEE_CONTRACT_BUCKET, EMPLOYEE_NDA_BUCKET, get_storage_service
 from src.auth.dependencies import get_current_user, AuthenticatedUser
 from sqlalchemy import select, or_, and_
 from sqlalchemy.sql import func
@@ -61,7 +61,7 @@ async def upload_employee_nda(
         await file.seek(0)
         
         # Upload to Supabase Storage
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         upload_result = await storage_service.upload_employee_nda_document(file, employee_id)
         
         if upload_result["success"]:
@@ -131,7 +131,7 @@ async def upload_employee_contract(
         await file.seek(0)
         
         # Upload to Supabase Storage
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         upload_result = await storage_service.upload_employee_contract_document(file, employee_id)
         
         if upload_result["success"]:
@@ -180,7 +180,7 @@ async def delete_employee_nda(
             raise HTTPException(status_code=404, detail="No NDA document found for this employee")
         
         # Delete from storage
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         delete_success = await storage_service.delete_employee_nda_document(employee.nda_document_file_path)
         
         if delete_success:
@@ -221,7 +221,7 @@ async def delete_employee_contract(
             raise HTTPException(status_code=404, detail="No contract document found for this employee")
         
         # Delete from storage
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         delete_success = await storage_service.delete_employee_contract_document(employee.contract_document_file_path)
         
         if delete_success:
@@ -262,12 +262,12 @@ async def get_employee_documents(
         profile = db.query(User).filter(User.user_id == employee.profile_id).first()
         employee_name = f"{profile.first_name} {profile.last_name}" if profile else "Unknown"
         
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         
         # Build NDA document info
         nda_document = None
         if employee.nda_document_file_path:
-            download_url = storage_service.get_employee_nda_document_url(employee.nda_document_file_path)
+            download_url = await storage_service.create_signed_url(EMPLOYEE_NDA_BUCKET, employee.nda_document_file_path)
             nda_document = EmployeeDocumentInfo(
                 document_type="nda",
                 filename=employee.nda_document_mime_type.split('/')[-1] if employee.nda_document_mime_type else None,
@@ -288,7 +288,7 @@ async def get_employee_documents(
         # Build contract document info
         contract_document = None
         if employee.contract_document_file_path:
-            download_url = storage_service.get_employee_contract_document_url(employee.contract_document_file_path)
+            download_url = await storage_service.create_signed_url(EMPLOYEE_CONTRACT_BUCKET, employee.contract_document_file_path)
             contract_document = EmployeeDocumentInfo(
                 document_type="contract",
                 filename=employee.contract_document_mime_type.split('/')[-1] if employee.contract_document_mime_type else None,
@@ -334,8 +334,8 @@ async def get_employee_nda(
             raise HTTPException(status_code=404, detail="No NDA document found for this employee")
         
         # Get download URL
-        storage_service = SupabaseStorageService()
-        download_url = storage_service.get_employee_nda_document_url(employee.nda_document_file_path)
+        storage_service = get_storage_service()
+        download_url = await storage_service.create_signed_url(EMPLOYEE_NDA_BUCKET, employee.nda_document_file_path)
         
         if not download_url:
             raise HTTPException(status_code=500, detail="Failed to generate download URL")
@@ -371,8 +371,8 @@ async def get_employee_contract(
             raise HTTPException(status_code=404, detail="No contract document found for this employee")
         
         # Get download URL
-        storage_service = SupabaseStorageService()
-        download_url = storage_service.get_employee_contract_document_url(employee.contract_document_file_path)
+        storage_service = get_storage_service()
+        download_url = await storage_service.create_signed_url(EMPLOYEE_CONTRACT_BUCKET, employee.contract_document_file_path)
         
         if not download_url:
             raise HTTPException(status_code=500, detail="Failed to generate download URL")
@@ -6,7 +6,7 @@ from datetime import date
 from src.database.core.database import get_db
 from src.database.core.models import Expense, Client
 from src.database.core.schemas import ExpenseCreate, ExpenseUpdate, ExpenseResponse, ExpenseDocumentResponse
-from src.services.storage_service import SupabaseStorageService
+from src.services.storage_service import EXPENSE_DOCUMENTS_BUCKET, get_storage_service
 from src.auth.dependencies import get_current_user, AuthenticatedUser
 
 
@@ -171,7 +171,7 @@ async def upload_expense_document(
         await file.seek(0)
         
         # Upload to Supabase Storage
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         upload_result = await storage_service.upload_expense_document(file, expense_id)
         
         if upload_result["success"]:
@@ -214,8 +214,8 @@ async def get_expense_document(expense_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="No document found for this expense")
         
         # Generate signed URL for secure access
-        storage_service = SupabaseStorageService()
-        signed_url = storage_service.get_expense_document_url(expense.receipt_link)
+        storage_service = get_storage_service()
+        signed_url = await storage_service.create_signed_url(EXPENSE_DOCUMENTS_BUCKET, expense.receipt_link)
         
         return {
             "expense_id": expense_id,
@@ -248,7 +248,7 @@ async def delete_expense_document(
             raise HTTPException(status_code=404, detail="No document found for this expense")
         
         # Delete from Supabase Storage
-        storage_service = SupabaseStorageService()
+        storage_service = get_storage_service()
         deleted = await storage_service.delete_expense_document(expense.receipt_link)
         
         if deleted:
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from src.auth.dependencies import get_current_user, AuthenticatedUser
+from src.aiagents.orchestration.job_queue import job_queue, Job
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+
+async def _get_owned_job(job_id: str, current_user: AuthenticatedUser) -> Job:
+    job = await job_queue.get(job_id)
+    # Jobs without an owner are visible to nobody
+    if job is None or job.user_id is None or job.user_id != str(current_user.user_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}")
+async def get_job_status(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """Get the status of a background job"""
+    job = await _get_owned_job(job_id, current_user)
+    return {
+        "job_id": job.job_id,
+        "name": job.name,
+        "status": job.status.value,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error,
+    }
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """Get the result of a finished background job"""
+    job = await _get_owned_job(job_id, current_user)
+    if not job.status.is_final:
+        raise HTTPException(status_code=409, detail=f"Job is still {job.status.value}")
+    return jsonable_encoder({
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "result": job.result,
+        "error": job.error,
+    })
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """Cancel a queued or running background job"""
+    job = await _get_owned_job(job_id, current_user)
+    if not await job_queue.cancel(job.job_id):
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status.value}")
+    logger.info("🛑 Job %s cancelled by user %s", job_id, current_user.user_id)
+    return {"job_id": job.job_id, "cancelled": True}
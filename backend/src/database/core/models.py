@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Date, Numeric, BigInteger, JSON, Boolean, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from src.database.core.database import Base
@@ -240,6 +240,15 @@ class Employee(Base):
     created_by_user = relationship("User", foreign_keys=[created_by])
     updated_by_user = relationship("User", foreign_keys=[updated_by])
 
+class EmployeeSearchDocument(Base):
+    """Search document per employee, maintained by triggers (SQLScripts/employee_search.sql)"""
+    __tablename__ = "employee_search_documents"
+    
+    employee_id = Column(Integer, ForeignKey("employees.employee_id", ondelete="CASCADE"), primary_key=True)
+    search_vector = Column(TSVECTOR, nullable=False)  # GIN indexed, weighted names > role > other fields
+    search_text = Column(Text, nullable=False)  # GIN trigram indexed, lower-cased
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class User(Base):
     __tablename__ = "profiles"
     
@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from src.database.core.database import get_db, async_engine, Base
-from src.database.api import clients, contracts, client_contacts, deliverables, time_entries, expenses, employees, chat, chat_sessions
+from src.database.api import clients, contracts, client_contacts, deliverables, time_entries, expenses, employees, chat, chat_sessions, jobs
 from src.auth import routes as auth_routes
 from src.auth.middleware import auth_middleware
 from  src.auth.session_manager import SessionManager
@@ -12,6 +12,19 @@ from  src.auth.session_manager import SessionManager
 from src.aiagents.performance.intelligent_cache import cache_manager
 from src.aiagents.performance.optimization_engine import start_optimization_engine, stop_optimization_engine
 from src.aiagents.performance.metrics_collector import metrics_collector
+from src.aiagents.orchestration.job_queue import job_queue
+from src.aiagents.services.llm_client import llm_client
+from src.aiagents.performance.client_name_index import client_name_index
+from src.aiagents.graph.tool_selection import tool_selector
+from src.aiagents.graph.dispatch_rules import dispatch_engine
+from src.aiagents.graph.prefetch import context_prefetcher
+from src.aiagents.memory.checkpointer import graph_checkpointer
+from src.aiagents.orchestration.dynamic_prompts import dynamic_prompt_generator
+from src.services.storage_service import get_storage_stats
+from src.services.logging_service import configure_logging, shutdown_logging, request_logging_middleware
+
+# Route application logs through the background queue writer
+configure_logging()
 
 
 # Create database tables
@@ -42,6 +55,9 @@ app.add_middleware(
 #Add authentication middleware
 app.middleware("http")(auth_middleware)
 
+# Request id / per-request debug logging (outermost, so every log line is correlated)
+app.middleware("http")(request_logging_middleware)
+
 
 # Include routers
 app.include_router(auth_routes.router, prefix="/api/auth", tags=["authentication"])
@@ -54,6 +70,7 @@ app.include_router(expenses.router, prefix="/api/expenses", tags=["expenses"])
 app.include_router(employees.router, prefix="/api/employees", tags=["employees"])
 app.include_router(chat.router, prefix="/api/chat", tags=["chat"])
 app.include_router(chat_sessions.router, prefix="/api/chat", tags=["chat-sessions"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 
 @app.on_event("startup")
 async def startup():
@@ -71,6 +88,10 @@ async def startup():
         # Initialize cache manager
         cache_manager.get_cache("employee")  # Initialize employee cache
         print("✅ Intelligent cache system initialized")
+
+        # Load client names for message-to-client matching
+        if await client_name_index.ensure_fresh():
+            print(f"✅ Client name index loaded ({client_name_index.get_stats()['clients']} clients)")
         
         # Set up performance monitoring
         metrics_collector.set_alert_threshold("employee_cache_hit_rate", low_threshold=0.7)
@@ -90,11 +111,27 @@ async def shutdown():
         print("✅ Performance optimization engine stopped")
     except Exception as e:
         print(f"⚠️ Warning: Error stopping optimization engine: {e}")
+
+    try:
+        # Stop background job workers
+        await job_queue.stop()
+        print("✅ Background job queue stopped")
+    except Exception as e:
+        print(f"⚠️ Warning: Error stopping job queue: {e}")
+    
+    try:
+        # Close pooled LLM connections
+        await llm_client.aclose()
+    except Exception as e:
+        print(f"⚠️ Warning: Error closing LLM client: {e}")
     
     # Dispose database engine
     await async_engine.dispose()
     print("✅ Database engine disposed")
 
+    # Flush queued log records
+    shutdown_logging()
+
 @app.get("/")
 def root():
     return {"message": "ConsultEase API is running with authentication!"}
@@ -145,6 +182,14 @@ async def performance_metrics():
         return {
             "metrics": metrics_summary,
             "cache": cache_stats,
+            "client_name_index": client_name_index.get_stats(),
+            "tool_selection": tool_selector.get_stats(),
+            "dispatch": dispatch_engine.get_stats(),
+            "checkpointer": graph_checkpointer.get_stats(),
+            "llm": llm_client.get_stats(),
+            "prompt_layout": dynamic_prompt_generator.get_stats(),
+            "context_prefetch": context_prefetcher.get_stats(),
+            "storage": get_storage_stats(),
             "timestamp": metrics_summary.get("collection_time")
         }
     except Exception as e:
@@ -0,0 +1,171 @@
+"""
+Structured, low-overhead logging for the chat and agent hot paths.
+
+- Per-module loggers (``get_logger(__name__)``) with standard levels
+- Lazy %-style formatting: arguments are only rendered if the record is emitted
+- Non-blocking output: records go through a QueueHandler and are written to
+  stdout by a background QueueListener thread
+- Request correlation: request id and session id are attached to every record
+- Per-request debug switch: ``X-Debug-Log: true`` turns on DEBUG output for a
+  single request without lowering the global level
+
+Environment:
+- LOG_LEVEL (default INFO)
+- LOG_FORMAT: "text" (default) or "json"
+- LOG_ALLOW_REQUEST_DEBUG: honour the per-request debug header (default false;
+  debug records can contain conversation state)
+"""
+
+import os
+import sys
+import json
+import uuid
+import queue
+import logging
+import logging.handlers
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+ROOT_LOGGER_NAME = "src"
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_DEBUG_HEADER = "X-Debug-Log"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+session_id_var: ContextVar[Optional[str]] = ContextVar("session_id", default=None)
+request_debug_var: ContextVar[bool] = ContextVar("request_debug", default=False)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    Logger adapter that also emits DEBUG records when the current request
+    has debug logging switched on.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level) or (level >= logging.DEBUG and request_debug_var.get())
+
+    def log(self, level, msg, *args, **kwargs):
+        if self.isEnabledFor(level):
+            # Skip the adapter frame so records report the real caller
+            kwargs.setdefault("stacklevel", 2)
+            self.logger._log(level, msg, args, **kwargs)
+
+    @property
+    def debug_enabled(self) -> bool:
+        """Guard for log statements whose arguments are expensive to build."""
+        return self.isEnabledFor(logging.DEBUG)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """Return the structured logger for a module."""
+    return StructuredLogger(logging.getLogger(name))
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach request/session correlation ids to each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        record.session_id = session_id_var.get() or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log aggregation."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "session_id": getattr(record, "session_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, stream=None) -> logging.Logger:
+    """
+    Route application logs through a queue to a background writer.
+
+    Safe to call more than once; later calls replace the previous setup.
+    """
+    global _listener
+    shutdown_logging()
+
+    level_name = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT", "text")).lower()
+
+    output_handler = logging.StreamHandler(stream or sys.stdout)
+    output_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    app_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(app_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            app_logger.removeHandler(handler)
+    app_logger.addHandler(queue_handler)
+    app_logger.setLevel(getattr(logging, level_name, logging.INFO))
+    app_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, output_handler)
+    _listener.start()
+    return app_logger
+
+
+def shutdown_logging():
+    """Flush and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+@contextmanager
+def request_context(request_id: Optional[str] = None, session_id: Optional[str] = None, debug: bool = False):
+    """Bind correlation ids and the debug switch for the duration of a request."""
+    tokens = [
+        (request_id_var, request_id_var.set(request_id or uuid.uuid4().hex[:12])),
+        (request_debug_var, request_debug_var.set(debug)),
+    ]
+    if session_id is not None:
+        tokens.append((session_id_var, session_id_var.set(session_id)))
+    try:
+        yield request_id_var.get()
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def bind_session(session_id: Optional[str]):
+    """Attach the chat session id to the rest of the current request's logs."""
+    if session_id:
+        session_id_var.set(session_id)
+
+
+def request_debug_allowed() -> bool:
+    return os.getenv("LOG_ALLOW_REQUEST_DEBUG", "false").lower() in ("1", "true", "yes")
+
+
+async def request_logging_middleware(request, call_next):
+    """Assign a request id and honour the per-request debug header."""
+    debug = request_debug_allowed() and request.headers.get(REQUEST_DEBUG_HEADER, "").lower() in ("1", "true", "yes")
+    with request_context(request.headers.get(REQUEST_ID_HEADER), debug=debug) as request_id:
+        response = await call_next(request)
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
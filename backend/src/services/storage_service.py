@@ -1,16 +1,117 @@
+"""
+Supabase Storage access for contract, expense and employee documents.
+
+- One process-wide service (``get_storage_service``): a single Supabase client,
+  so every caller shares its HTTP connection pool
+- Blocking SDK calls (uploads, downloads, deletes, signing) run in a bounded
+  I/O thread pool instead of on the event loop
+- Signed URLs cached by bucket, path and expiry, and re-signed shortly before
+  they expire
+- Batch signing (``create_signed_urls``) for listing screens: one request for
+  every document on the page that is not cached yet
+"""
+
 import os
 import uuid
+import time
 import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from supabase import create_client, Client
 from fastapi import UploadFile, HTTPException
-import logging
-from typing import Dict, Any
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Tuple
+from src.services.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+CONTRACT_DOCUMENTS_BUCKET = "contract-documents"
+EXPENSE_DOCUMENTS_BUCKET = "expense-documents"
+EMPLOYEE_NDA_BUCKET = "employee-nda-documents"
+EMPLOYEE_CONTRACT_BUCKET = "employee-contract-documents"
+
+STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", "8"))
+SIGNED_URL_CACHE_SIZE = int(os.getenv("SIGNED_URL_CACHE_SIZE", "5000"))
+SIGNED_URL_REFRESH_MARGIN_SECONDS = float(os.getenv("SIGNED_URL_REFRESH_MARGIN_SECONDS", "300"))
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = threading.Lock()
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    global _io_executor
+    if _io_executor is None:
+        with _io_executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(max_workers=STORAGE_IO_WORKERS, thread_name_prefix="storage-io")
+    return _io_executor
+
+
+class SignedUrlCache:
+    """Signed URLs keyed by (bucket, path, expires_in), served until shortly before they expire"""
+
+    def __init__(self, max_size: int = SIGNED_URL_CACHE_SIZE, refresh_margin: float = SIGNED_URL_REFRESH_MARGIN_SECONDS):
+        self.max_size = max_size
+        self.refresh_margin = refresh_margin
+        self._entries: "OrderedDict[Tuple[str, str, int], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    def _refresh_at(self, signed_at: float, expires_in: int) -> float:
+        # Short-lived URLs are re-signed halfway through their lifetime
+        return signed_at + expires_in - min(self.refresh_margin, expires_in / 2)
+
+    def get(self, bucket: str, path: str, expires_in: int) -> Optional[str]:
+        key = (bucket, path, expires_in)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            url, refresh_at = entry
+            if time.time() >= refresh_at:
+                del self._entries[key]
+                self._stats["refreshes"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return url
+
+    def put(self, bucket: str, path: str, expires_in: int, url: str, signed_at: Optional[float] = None):
+        if not url:
+            return
+        refresh_at = self._refresh_at(signed_at if signed_at is not None else time.time(), expires_in)
+        with self._lock:
+            self._entries[(bucket, path, expires_in)] = (url, refresh_at)
+            self._entries.move_to_end((bucket, path, expires_in))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, bucket: str, path: str):
+        """Drop every cached URL of an object that was replaced or deleted."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == bucket and key[1] == path]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["refreshes"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
+
 
 class SupabaseStorageService:
-    def __init__(self):
-        logger = logging.getLogger("StorageService")
-        #logger.setLevel(logging.INFO")
+    def __init__(self, url_cache: Optional[SignedUrlCache] = None):
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
         
@@ -18,13 +119,82 @@ class SupabaseStorageService:
             raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables must be set")
         
         self.supabase: Client = create_client(supabase_url, supabase_key)
-        self.bucket_name = "contract-documents"
+        self.bucket_name = CONTRACT_DOCUMENTS_BUCKET
+        self.url_cache = url_cache or SignedUrlCache()
+        self._stats = {"sign_requests": 0, "batch_sign_requests": 0, "io_calls": 0}
+
+    async def _run_io(self, func, *args, **kwargs):
+        """Run a blocking storage SDK call in the storage I/O pool."""
+        self._stats["io_calls"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_io_executor(), partial(func, *args, **kwargs))
+
+    def _sign(self, bucket_name: str, file_path: str, expires_in: int = 3600) -> str:
+        """Signed URL for one object, from the cache when still fresh."""
+        if not file_path:
+            return ''
+        cached = self.url_cache.get(bucket_name, file_path, expires_in)
+        if cached:
+            return cached
+        try:
+            signed_at = time.time()
+            self._stats["sign_requests"] += 1
+            response = self.supabase.storage.from_(bucket_name).create_signed_url(
+                path=file_path,
+                expires_in=expires_in
+            )
+            # Check if response has get method and contains signedURL
+            if response is not None and hasattr(response, 'get'):
+                url = response.get('signedURL', '')
+            else:
+                url = getattr(response, 'signedURL', '') if response else ''
+        except Exception:
+            return ''
+        self.url_cache.put(bucket_name, file_path, expires_in, url, signed_at)
+        return url
+
+    async def create_signed_url(self, bucket_name: str, file_path: str, expires_in: int = 3600) -> str:
+        """Non-blocking ``_sign``: cached URLs return immediately, misses are signed in the I/O pool."""
+        cached = self.url_cache.get(bucket_name, file_path, expires_in) if file_path else None
+        if cached:
+            return cached
+        return await self._run_io(self._sign, bucket_name, file_path, expires_in)
+
+    async def create_signed_urls(self, bucket_name: str, file_paths: List[str], expires_in: int = 3600) -> Dict[str, str]:
+        """Non-blocking ``get_signed_urls`` for listing screens (path -> URL)."""
+        paths = [path for path in dict.fromkeys(file_paths) if path]
+        cached = {path: self.url_cache.get(bucket_name, path, expires_in) for path in paths}
+        if all(cached.values()):
+            return cached
+        return await self._run_io(self.get_signed_urls, bucket_name, paths, expires_in)
+
+    async def download_document(self, bucket_name: str, file_path: str) -> bytes:
+        """Download an object's contents without blocking the event loop"""
+        return await self._run_io(self.supabase.storage.from_(bucket_name).download, file_path)
+
+    async def _remove(self, bucket_name: str, file_path: str):
+        response = await self._run_io(self.supabase.storage.from_(bucket_name).remove, [file_path])
+        self.url_cache.invalidate(bucket_name, file_path)
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "url_cache": self.url_cache.get_stats()}
+
+    @staticmethod
+    def _spooled_source(file):
+        """Return the file if it is a spooled chat upload on disk (streamed, never read into memory)."""
+        return file if getattr(file, 'file_path', None) else None
     
     async def upload_contract_document(self, file, contract_id: int) -> Dict[str, Any]:
         """Upload contract document to Supabase Storage - handles both UploadFile and BytesIO objects"""
         try:
-            # Handle both UploadFile and BytesIO objects
-            if hasattr(file, 'filename') and file.filename:
+            # Handle spooled uploads, UploadFile and BytesIO objects
+            spooled = self._spooled_source(file)
+            if spooled:
+                filename = spooled.filename
+                file_content = None
+                content_type = spooled.content_type
+            elif hasattr(file, 'filename') and file.filename:
                 filename = file.filename
                 file_content = await file.read() if hasattr(file, 'read') and asyncio.iscoroutinefunction(file.read) else file.getvalue()
                 content_type = getattr(file, 'content_type', 'application/octet-stream')
@@ -44,17 +214,19 @@ class SupabaseStorageService:
             unique_filename = f"contract_{contract_id}_{uuid.uuid4().hex}.{file_extension}"
             file_path = f"contracts/{contract_id}/{unique_filename}"
             
-            file_size = len(file_content)
-            
-            # Upload to Supabase Storage
-            response = self.supabase.storage.from_(self.bucket_name).upload(
-                path=file_path,
-                file=file_content,
-                file_options={
-                    "content-type": content_type,
-                    "upsert": False
-                }
-            )
+            file_size = spooled.file_size if spooled else len(file_content)
+            
+            # Upload to Supabase Storage - spooled files are streamed from disk
+            with (spooled.open() if spooled else nullcontext(file_content)) as upload_body:
+                response = await self._run_io(
+                    self.supabase.storage.from_(self.bucket_name).upload,
+                    path=file_path,
+                    file=upload_body,
+                    file_options={
+                        "content-type": content_type,
+                        "upsert": False
+                    }
+                )
 
             if hasattr(response, 'path'):  # UploadResponse object has 'path' attribute
                 # Success - this is an UploadResponse object
@@ -85,7 +257,7 @@ class SupabaseStorageService:
     async def delete_contract_document(self, file_path: str) -> bool:
         """Delete contract document from Supabase Storage"""
         try:
-            response = self.supabase.storage.from_(self.bucket_name).remove([file_path])
+            response = await self._remove(self.bucket_name, file_path)
                         # Check if delete was successful - Supabase returns None on success or error dict on failure
             if response is not None and hasattr(response, 'get'):
                 return not response.get('error')
@@ -98,20 +270,7 @@ class SupabaseStorageService:
 
     def get_document_url(self, file_path: str, expires_in: int = 3600) -> str:
         """Get signed URL for private document access"""
-        try:
-            response = self.supabase.storage.from_(self.bucket_name).create_signed_url(
-                path=file_path,
-                expires_in=expires_in
-            )
-            # Check if response has get method and contains signedURL
-            if response is not None and hasattr(response, 'get'):
-                return response.get('signedURL', '')
-            else:
-                # If response doesn't have get method, try to access directly or return empty
-                return getattr(response, 'signedURL', '') if response else ''
-        except Exception:
-            return ''
-        
+        return self._sign(self.bucket_name, file_path, expires_in)
 
     async def upload_expense_document(self, file: UploadFile, expense_id: int) -> Dict[str, Any]:
         """Upload expense document (receipt/invoice) to Supabase Storage"""
@@ -130,8 +289,9 @@ class SupabaseStorageService:
             file_size = len(file_content)
             
             # Upload to Supabase Storage (using existing bucket)
-            bucket_name = "expense-documents"  # Use existing bucket
-            response = self.supabase.storage.from_(bucket_name).upload(
+            bucket_name = EXPENSE_DOCUMENTS_BUCKET  # Use existing bucket
+            response = await self._run_io(
+                self.supabase.storage.from_(bucket_name).upload,
                 path=file_path,
                 file=file_content,
                 file_options={
@@ -178,45 +338,42 @@ class SupabaseStorageService:
     async def delete_expense_document(self, file_path: str) -> bool:
         """Delete expense document from Supabase Storage"""
         try:
-            bucket_name = "expense-documents"
-            print(f"Attempting to delete: {file_path} from bucket: {bucket_name}")  # Debug
+            bucket_name = EXPENSE_DOCUMENTS_BUCKET
+            logger.debug("Attempting to delete: %s from bucket: %s", file_path, bucket_name)
             
-            response = self.supabase.storage.from_(bucket_name).remove([file_path])
-            print(f"Delete response: {response}")  # Debug
+            response = await self._remove(bucket_name, file_path)
+            logger.debug("Delete response: %s", response)
             
             # Check if deletion was successful
             if hasattr(response, 'error') and response.error:
-                print(f"Delete error: {response.error}")  # Debug
+                logger.debug("Delete error: %s", response.error)
                 return False
             elif isinstance(response, list) and len(response) > 0:
                 # Supabase typically returns a list of deleted objects
                 return True
             else:
-                print(f"Unexpected response format: {type(response)}")  # Debug
+                logger.debug("Unexpected response format: %s", type(response))
                 return False
                 
         except Exception as e:
-            print(f"Exception during delete: {str(e)}")  # Debug
+            logger.debug("Exception during delete: %s", e)
             return False
         
     def get_expense_document_url(self, file_path: str, expires_in: int = 3600) -> str:
         """Get signed URL for expense document access"""
-        try:
-            bucket_name = "expense-documents"
-            response = self.supabase.storage.from_(bucket_name).create_signed_url(
-                path=file_path,
-                expires_in=expires_in
-            )
-            return response.get('signedURL', '')
-        except Exception:
-            return ''
+        return self._sign(EXPENSE_DOCUMENTS_BUCKET, file_path, expires_in)
 
     # Employee Document Management Methods
     async def upload_employee_nda_document(self, file, employee_id: int) -> Dict[str, Any]:
         """Upload NDA document for employee to Supabase Storage"""
         try:
-            # Handle both UploadFile and BytesIO objects
-            if hasattr(file, 'filename') and file.filename:
+            # Handle spooled uploads, UploadFile and BytesIO objects
+            spooled = self._spooled_source(file)
+            if spooled:
+                filename = spooled.filename
+                file_content = None
+                content_type = spooled.content_type
+            elif hasattr(file, 'filename') and file.filename:
                 filename = file.filename
                 file_content = await file.read() if hasattr(file, 'read') else file.getvalue()
                 content_type = getattr(file, 'content_type', 'application/octet-stream')
@@ -232,18 +389,20 @@ class SupabaseStorageService:
             unique_filename = f"nda_{employee_id}_{uuid.uuid4().hex}.{file_extension}"
             file_path = f"employees/{employee_id}/nda/{unique_filename}"
             
-            file_size = len(file_content)
-            
-            # Upload to Supabase Storage
-            bucket_name = "employee-nda-documents"
-            response = self.supabase.storage.from_(bucket_name).upload(
-                path=file_path,
-                file=file_content,
-                file_options={
-                    "content-type": content_type,
-                    "upsert": "true"
-                }
-            )
+            file_size = spooled.file_size if spooled else len(file_content)
+            
+            # Upload to Supabase Storage - spooled files are streamed from disk
+            bucket_name = EMPLOYEE_NDA_BUCKET
+            with (spooled.open() if spooled else nullcontext(file_content)) as upload_body:
+                response = await self._run_io(
+                    self.supabase.storage.from_(bucket_name).upload,
+                    path=file_path,
+                    file=upload_body,
+                    file_options={
+                        "content-type": content_type,
+                        "upsert": "true"
+                    }
+                )
 
             if hasattr(response, 'path'):  # UploadResponse object has 'path' attribute
                 pass
@@ -271,8 +430,13 @@ class SupabaseStorageService:
     async def upload_employee_contract_document(self, file, employee_id: int) -> Dict[str, Any]:
         """Upload contract document for employee to Supabase Storage"""
         try:
-            # Handle both UploadFile and BytesIO objects
-            if hasattr(file, 'filename') and file.filename:
+            # Handle spooled uploads, UploadFile and BytesIO objects
+            spooled = self._spooled_source(file)
+            if spooled:
+                filename = spooled.filename
+                file_content = None
+                content_type = spooled.content_type
+            elif hasattr(file, 'filename') and file.filename:
                 filename = file.filename
                 file_content = await file.read() if hasattr(file, 'read') else file.getvalue()
                 content_type = getattr(file, 'content_type', 'application/octet-stream')
@@ -288,18 +452,20 @@ class SupabaseStorageService:
             unique_filename = f"contract_{employee_id}_{uuid.uuid4().hex}.{file_extension}"
             file_path = f"employees/{employee_id}/contract/{unique_filename}"
             
-            file_size = len(file_content)
-            
-            # Upload to Supabase Storage
-            bucket_name = "employee-contract-documents"
-            response = self.supabase.storage.from_(bucket_name).upload(
-                path=file_path,
-                file=file_content,
-                file_options={
-                    "content-type": content_type,
-                    "upsert": "true"
-                }
-            )
+            file_size = spooled.file_size if spooled else len(file_content)
+            
+            # Upload to Supabase Storage - spooled files are streamed from disk
+            bucket_name = EMPLOYEE_CONTRACT_BUCKET
+            with (spooled.open() if spooled else nullcontext(file_content)) as upload_body:
+                response = await self._run_io(
+                    self.supabase.storage.from_(bucket_name).upload,
+                    path=file_path,
+                    file=upload_body,
+                    file_options={
+                        "content-type": content_type,
+                        "upsert": "true"
+                    }
+                )
 
             if hasattr(response, 'path'):  # UploadResponse object has 'path' attribute
                 pass
@@ -327,8 +493,8 @@ class SupabaseStorageService:
     async def delete_employee_nda_document(self, file_path: str) -> bool:
         """Delete NDA document from employee-nda-documents bucket"""
         try:
-            bucket_name = "employee-nda-documents"
-            response = self.supabase.storage.from_(bucket_name).remove([file_path])
+            bucket_name = EMPLOYEE_NDA_BUCKET
+            response = await self._remove(bucket_name, file_path)
             
             if hasattr(response, 'error') and response.error:
                 return False
@@ -343,8 +509,8 @@ class SupabaseStorageService:
     async def delete_employee_contract_document(self, file_path: str) -> bool:
         """Delete contract document from employee-contract-documents bucket"""
         try:
-            bucket_name = "employee-contract-documents"
-            response = self.supabase.storage.from_(bucket_name).remove([file_path])
+            bucket_name = EMPLOYEE_CONTRACT_BUCKET
+            response = await self._remove(bucket_name, file_path)
             
             if hasattr(response, 'error') and response.error:
                 return False
@@ -356,43 +522,63 @@ class SupabaseStorageService:
         except Exception:
             return False
 
-    def get_employee_nda_document_url(self, file_path: str, expires_in: int = 3600) -> str:
-        """Get signed URL for NDA document access"""
+    def get_signed_urls(self, bucket_name: str, file_paths: List[str], expires_in: int = 3600) -> Dict[str, str]:
+        """Signed URLs for many objects of one bucket, uncached ones in a single request (path -> URL)"""
+        urls: Dict[str, str] = {}
+        missing = []
+        for path in dict.fromkeys(file_paths):
+            if not path:
+                continue
+            cached = self.url_cache.get(bucket_name, path, expires_in)
+            if cached:
+                urls[path] = cached
+            else:
+                missing.append(path)
+        if not missing:
+            return urls
         try:
-            bucket_name = "employee-nda-documents"
-            response = self.supabase.storage.from_(bucket_name).create_signed_url(
-                path=file_path,
-                expires_in=expires_in
-            )
-            return response.get('signedURL', '')
+            signed_at = time.time()
+            self._stats["batch_sign_requests"] += 1
+            response = self.supabase.storage.from_(bucket_name).create_signed_urls(missing, expires_in)
         except Exception:
-            return ''
+            return urls
+        for item in response or []:
+            if item.get('error') or not item.get('path'):
+                continue
+            url = item.get('signedURL', '')
+            urls[item['path']] = url
+            self.url_cache.put(bucket_name, item['path'], expires_in, url, signed_at)
+        return urls
+
+    def get_employee_nda_document_url(self, file_path: str, expires_in: int = 3600) -> str:
+        """Get signed URL for NDA document access"""
+        return self._sign(EMPLOYEE_NDA_BUCKET, file_path, expires_in)
 
     def get_employee_contract_document_url(self, file_path: str, expires_in: int = 3600) -> str:
         """Get signed URL for contract document access"""
-        try:
-            bucket_name = "employee-contract-documents"
-            response = self.supabase.storage.from_(bucket_name).create_signed_url(
-                path=file_path,
-                expires_in=expires_in
-            )
-            return response.get('signedURL', '')
-        except Exception:
-            return ''
+        return self._sign(EMPLOYEE_CONTRACT_BUCKET, file_path, expires_in)
     
     def get_contract_document_url(self, file_path: str, expires_in: int = 3600) -> str:
         """Get signed URL for contract document access"""
-        try:
-            bucket_name = "contract-documents"
-            
-            response = self.supabase.storage.from_(bucket_name).create_signed_url(
-                path=file_path,
-                expires_in=expires_in
-            )
-            
-            if response and hasattr(response, 'get'):
-                return response.get('signedURL', '')
-            else:
-                return ''
-        except Exception as e:
-            return ''
+        return self._sign(CONTRACT_DOCUMENTS_BUCKET, file_path, expires_in)
+
+
+_storage_service: Optional[SupabaseStorageService] = None
+_storage_service_lock = threading.Lock()
+
+
+def get_storage_service() -> SupabaseStorageService:
+    """Process-wide storage service (one Supabase client and signed-URL cache), created on first use"""
+    global _storage_service
+    if _storage_service is None:
+        with _storage_service_lock:
+            if _storage_service is None:
+                _storage_service = SupabaseStorageService()
+    return _storage_service
+
+
+def get_storage_stats() -> Dict[str, Any]:
+    """Signing/I-O counters of the shared service, without creating it"""
+    if _storage_service is None:
+        return {"initialized": False}
+    return {"initialized": True, **_storage_service.get_stats()}
@@ -0,0 +1,145 @@
+"""
+Test native async agent nodes in the hybrid workflow graph.
+"""
+
+import time
+import asyncio
+import inspect
+import pytest
+from typing import Dict, List, TypedDict
+from unittest.mock import patch, AsyncMock
+from langgraph.graph import StateGraph, END
+
+from src.aiagents.graph import nodes
+from src.aiagents.graph.hybrid_workflow import app as agent_app, async_node, enhanced_router
+from src.aiagents.graph.state import create_initial_state
+
+
+class CounterState(TypedDict):
+    count: int
+    loops: List[int]
+
+
+def _legacy_hybrid(node):
+    """The previous wrapper shape: a sync node that runs the coroutine on a fresh loop"""
+    def wrapper(state):
+        return asyncio.run(node(state))
+    return wrapper
+
+
+def _build_graph(node, steps: int):
+    workflow = StateGraph(CounterState)
+    workflow.add_node("step", node)
+    workflow.set_entry_point("step")
+    workflow.add_conditional_edges("step", lambda s: END if s["count"] >= steps else "step", {"step": "step", END: END})
+    return workflow.compile()
+
+
+class TestAsyncGraphNodes:
+    """Test suite for coroutine graph nodes"""
+
+    def test_agent_nodes_are_coroutines(self):
+        """Agent nodes and the tool executor are registered as native coroutines"""
+        for node in (nodes.contract_agent_node, nodes.employee_agent_node, nodes.client_agent_node,
+                     nodes.deliverable_agent_node, nodes.time_agent_node, nodes.user_agent_node):
+            assert inspect.iscoroutinefunction(node)
+
+        for name in ("router", "contract_agent", "employee_agent", "client_agent", "tool_executor", "hybrid_agent"):
+            runnable = agent_app.builder.nodes[name].runnable
+            assert getattr(runnable, "afunc", None) is not None
+
+    def test_router_edge_uses_the_router_node_decision(self):
+        """The edge after the router reads its decision instead of routing the message again"""
+        state = {
+            "messages": [{"role": "user", "content": "show contracts"}],
+            "current_agent": "contract_agent",
+            "data": {"routing_completed": True},
+        }
+        with patch("src.aiagents.graph.router.intelligent_router.call_llm_for_routing") as route:
+            assert enhanced_router(state) == "contract_agent"
+
+        route.assert_not_called()
+        assert state["data"] == {"routing_completed": True, "current_agent": "contract_agent"}
+
+    @pytest.mark.asyncio
+    async def test_agent_node_runs_on_caller_loop(self):
+        """Under ainvoke the agent executes on the request's event loop"""
+        caller_loop = asyncio.get_running_loop()
+        seen = {}
+
+        async def fake_invoke(state, agent, agent_name):
+            seen["loop"] = asyncio.get_running_loop()
+            return {"messages": [{"type": "ai", "content": "done", "role": "assistant"}]}
+
+        state = create_initial_state("u1", "s1", "Test User", "admin", {"type": "user", "content": "show contracts", "role": "user"})
+        with patch.object(nodes.enhanced_executor, "invoke", side_effect=fake_invoke):
+            result = await nodes.contract_agent_node(state)
+
+        assert seen["loop"] is caller_loop
+        assert result["messages"][0]["content"] == "done"
+
+    def test_sync_facade_for_scripts(self):
+        """The *_sync functions still work from plain synchronous code"""
+        with patch.object(nodes.enhanced_executor, "invoke", new=AsyncMock(return_value={"messages": []})):
+            assert nodes.employee_agent_node_sync({"messages": []}) == {"messages": []}
+
+    @pytest.mark.asyncio
+    async def test_sync_facade_refuses_running_loop(self):
+        """Calling the sync facade inside a loop fails loudly instead of nesting loops"""
+        with pytest.raises(RuntimeError, match="await it instead"):
+            nodes.contract_agent_node_sync({"messages": []})
+
+    @pytest.mark.asyncio
+    async def test_loop_bound_resources_work_only_with_native_nodes(self):
+        """Resources bound to the main loop are usable from native nodes, not from per-node loops"""
+        lock = asyncio.Lock()
+        await lock.acquire()
+        asyncio.get_running_loop().call_later(0.01, lock.release)
+
+        async def node(state: CounterState) -> Dict:
+            async with lock:  # contended, so it waits on a main-loop future
+                pass
+            return {"count": state["count"] + 1}
+
+        native = _build_graph(async_node(node, "step"), steps=1)
+        assert (await native.ainvoke({"count": 0, "loops": []}))["count"] == 1
+
+        await lock.acquire()
+        asyncio.get_running_loop().call_later(0.01, lock.release)
+        with pytest.raises(RuntimeError, match="different event loop"):
+            # How the hybrid wrappers ran: worker thread + fresh loop per node
+            await asyncio.to_thread(_legacy_hybrid(node), {"count": 0, "loops": []})
+
+    @pytest.mark.asyncio
+    async def test_per_node_overhead_benchmark(self):
+        """Native dispatch avoids the thread hop and new event loop per step"""
+        steps = 50
+        loop_ids = []
+
+        async def node(state: CounterState) -> Dict:
+            loop_ids.append(id(asyncio.get_running_loop()))
+            await asyncio.sleep(0)
+            return {"count": state["count"] + 1}
+
+        # Whole graph runs natively on this loop
+        native_graph = _build_graph(async_node(node, "step"), steps)
+        assert (await native_graph.ainvoke({"count": 0, "loops": []}, config={"recursion_limit": steps + 5}))["count"] == steps
+        assert set(loop_ids) == {id(asyncio.get_running_loop())}
+
+        state = {"count": 0, "loops": []}
+        start = time.perf_counter()
+        for _ in range(steps):
+            await node(state)
+        native_ms = (time.perf_counter() - start) * 1000 / steps
+
+        # Legacy: each step in a worker thread with its own asyncio.run loop
+        loop_ids.clear()
+        legacy_node = _legacy_hybrid(node)
+        start = time.perf_counter()
+        for _ in range(steps):
+            await asyncio.to_thread(legacy_node, state)
+        legacy_ms = (time.perf_counter() - start) * 1000 / steps
+
+        print(f"\nPer-node dispatch overhead: native {native_ms:.3f}ms vs thread+asyncio.run {legacy_ms:.3f}ms")
+        assert id(asyncio.get_running_loop()) not in loop_ids
+        assert native_ms < legacy_ms
@@ -0,0 +1,146 @@
+"""
+Test post-commit change events and the cache subscribers that evict on them.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from src.aiagents.performance.change_events import (
+    CLIENT, CONTRACT, CONTRACT_DOCUMENT_FIELDS, CREATED, DELETED, EMPLOYEE,
+    ChangeEvent, ChangeEventBus, DependentKeyIndex, change_events
+)
+from src.aiagents.performance.client_name_index import ClientNameIndex
+from src.aiagents.performance.employee_cache import EmployeeCacheKeys, EmployeeCacheManager
+from src.aiagents.performance.intelligent_cache import cache_manager
+from src.aiagents.tools import client_tools
+from src.aiagents.tools.client_tools import UpdateClientParams, update_client_tool
+from src.aiagents.tools.contract_search import ContractSearchCache, contract_search_cache
+
+
+@pytest.fixture
+def recorded():
+    events = []
+    handler = change_events.subscribe(events.append)
+    yield events
+    change_events.unsubscribe(handler)
+
+
+class TestChangeEventBus:
+    """Test suite for publishing and subscribing"""
+
+    @pytest.mark.asyncio
+    async def test_delivers_by_entity_type_and_isolates_failures(self):
+        bus = ChangeEventBus()
+        contract_events, all_events = [], []
+
+        async def record_async(event):
+            all_events.append(event)
+
+        def failing(event):
+            raise RuntimeError("cache backend down")
+
+        bus.subscribe(failing)
+        bus.subscribe(contract_events.append, (CONTRACT,))
+        bus.subscribe(record_async)
+
+        await bus.emit(CONTRACT, 7, changed_fields=["status"], client_id=3)
+        await bus.emit(EMPLOYEE, 1, DELETED)
+
+        assert [e.entity_id for e in contract_events] == [7]
+        assert contract_events[0].changed_fields == frozenset({"status"})
+        assert contract_events[0].attributes == {"client_id": 3}
+        assert [e.entity_type for e in all_events] == [CONTRACT, EMPLOYEE]
+        assert bus.get_stats() == {"published": 2, "deliveries": 3, "errors": 2, "subscribers": 3}
+
+    def test_touches(self):
+        assert ChangeEvent(CONTRACT, 1, changed_fields={"status"}).touches({"status", "end_date"})
+        assert not ChangeEvent(CONTRACT, 1, changed_fields=CONTRACT_DOCUMENT_FIELDS).touches({"status"})
+        # Unknown fields, creates and deletes affect everything
+        assert ChangeEvent(CONTRACT, 1).touches({"status"})
+        assert ChangeEvent(CONTRACT, 1, DELETED, changed_fields={"notes"}).touches({"status"})
+
+
+class TestCacheSubscribers:
+    """Test suite for precise eviction in each cache"""
+
+    def test_contract_search_invalidated_only_by_searched_fields(self):
+        cache = ContractSearchCache(ttl_seconds=60)
+        cache.on_change(ChangeEvent(CONTRACT, 1, changed_fields=CONTRACT_DOCUMENT_FIELDS))
+        cache.on_change(ChangeEvent(CLIENT, 2, CREATED, attributes={"client_name": "New Co"}))
+        cache.on_change(ChangeEvent(CLIENT, 2, changed_fields={"industry"}))
+        assert cache.version == 0
+
+        cache.on_change(ChangeEvent(CONTRACT, 1, changed_fields={"billing_prompt_next_date"}))
+        cache.on_change(ChangeEvent(CLIENT, 2, changed_fields={"client_name"}))
+        cache.on_change(ChangeEvent(CONTRACT, 1, DELETED))
+        assert cache.version == 3
+
+    def test_client_name_index_follows_client_events(self):
+        index = ClientNameIndex(refresh_interval_seconds=3600, enabled=True)
+        index.build([(1, "Acme Corp")])
+
+        index.on_change(ChangeEvent(CLIENT, 2, CREATED, attributes={"client_name": "Globex Inc"}))
+        index.on_change(ChangeEvent(CLIENT, 1, changed_fields={"client_name"}, attributes={"client_name": "Initech"}))
+        assert [c.client_id for c in index.match(["globex"])] == [2]
+        assert [c.client_id for c in index.match(["initech"])] == [1]
+        assert index.match(["acme"]) == []
+
+        index.on_change(ChangeEvent(CLIENT, 2, DELETED))
+        assert index.match(["globex"]) == []
+
+    @pytest.mark.asyncio
+    async def test_employee_change_evicts_its_keys_and_searches(self):
+        manager = EmployeeCacheManager()
+        await manager.cache_employee({"employee_id": 7, "profile_id": "p-7", "employee_number": "E-7"})
+        await manager.cache_employee({"employee_id": 8, "profile_id": "p-8", "employee_number": "E-8"})
+        await manager.cache_employee_search({"min_hours": 20}, [{"employee_id": 7}])
+
+        await manager.on_change(ChangeEvent(EMPLOYEE, 7, changed_fields={"employee_number"}, attributes={
+            "profile_id": "p-7", "employee_number": "E-70", "previous_employee_number": "E-7"}))
+
+        for key in (EmployeeCacheKeys.employee_by_id("7"), EmployeeCacheKeys.employee_by_profile_id("p-7"),
+                    EmployeeCacheKeys.employee_by_number("E-7")):
+            assert await manager.cache.get(key) is None
+        assert await manager.get_employee_search({"min_hours": 20}) is None
+        assert await manager.cache.get(EmployeeCacheKeys.employee_by_id("8")) is not None
+
+    @pytest.mark.asyncio
+    async def test_dependent_keys_evicted_by_entity_type(self):
+        cache = cache_manager.get_cache("change-events-test")
+        index = DependentKeyIndex("change-events-test")
+        await cache.set("agent_response:contracts", {"messages": []})
+        await cache.set("agent_response:employees", {"messages": []})
+        index.track("agent_response:contracts", (CONTRACT, CLIENT))
+        index.track("agent_response:employees", (EMPLOYEE,))
+
+        assert await index.evict(ChangeEvent(CLIENT, 4, changed_fields={"notes"})) == 1
+        assert await cache.get("agent_response:contracts") is None
+        assert await cache.get("agent_response:employees") is not None
+        assert index.get_stats()["keys"] == 1
+
+
+class TestToolsPublish:
+    """Test suite for tools publishing after their commit"""
+
+    @pytest.mark.asyncio
+    async def test_update_client_tool_publishes_changed_fields(self, recorded):
+        client = SimpleNamespace(client_id=5, client_name="Acme Corp", industry=None, notes=None)
+        session = SimpleNamespace(commit=AsyncMock(), refresh=AsyncMock())
+
+        @asynccontextmanager
+        async def fake_db():
+            yield session
+
+        version = contract_search_cache.version
+        with patch.object(client_tools, "get_ai_db", fake_db), \
+                patch.object(client_tools, "get_client_by_name", AsyncMock(return_value=client)):
+            result = await update_client_tool(UpdateClientParams(client_name="acme", industry="Retail"),
+                                              {"user_id": "8d1e4f7a-2b4c-4d6e-9f00-1a2b3c4d5e6f"})
+
+        assert result.success
+        assert [(e.entity_type, e.entity_id, e.changed_fields) for e in recorded] == [(CLIENT, 5, frozenset({"industry"}))]
+        assert recorded[0].attributes == {"client_name": "Acme Corp"}
+        # Industry is not part of any search result
+        assert contract_search_cache.version == version
@@ -0,0 +1,226 @@
+"""
+Test the persistent graph checkpointer: per-step deltas and resume after a node failure.
+"""
+
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from typing import Any, Dict, List, TypedDict
+from langgraph.graph import StateGraph, END
+
+from src.aiagents.memory.checkpointer import (
+    DeltaCheckpointSaver, MemoryCheckpointStorage, RedisCheckpointStorage, conversation_thread_id
+)
+from src.database.api.chat import _turn_input
+
+
+class _State(TypedDict, total=False):
+    messages: List[Dict[str, Any]]
+    data: Dict[str, Any]
+    memory: Dict[str, Any]
+    status: str
+
+
+class _Graph:
+    """router -> agent -> tool_executor, mutating state['data'] in place like the real nodes"""
+
+    def __init__(self):
+        self.calls: List[str] = []
+        self.fail_tool = False
+
+    def router(self, state):
+        self.calls.append("router")
+        state["data"]["routed"] = True
+        return {"status": "routing"}
+
+    def agent(self, state):
+        self.calls.append("agent")
+        return {"messages": state["messages"] + [{"role": "assistant", "content": "calling tool"}]}
+
+    def tool_executor(self, state):
+        self.calls.append("tool_executor")
+        if self.fail_tool:
+            raise RuntimeError("tool backend unavailable")
+        state["data"]["tool_execution_count"] = state["data"].get("tool_execution_count", 0) + 1
+        return {"messages": state["messages"] + [{"role": "tool", "content": "done"}], "status": "completed"}
+
+    def compile(self, saver):
+        workflow = StateGraph(_State)
+        workflow.add_node("router", self.router)
+        workflow.add_node("agent", self.agent)
+        workflow.add_node("tool_executor", self.tool_executor)
+        workflow.set_entry_point("router")
+        workflow.add_edge("router", "agent")
+        workflow.add_edge("agent", "tool_executor")
+        workflow.add_edge("tool_executor", END)
+        return workflow.compile(checkpointer=saver)
+
+
+def _config(thread_id: str = "s1:u1") -> Dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _turn(content: str, messages=()) -> Dict[str, Any]:
+    return {"messages": [*messages, {"role": "user", "content": content}], "data": {}, "status": "processing"}
+
+
+class TestDeltaCheckpointSaver:
+    """Test suite for checkpointed graph runs"""
+
+    @pytest.fixture
+    def storage(self):
+        return MemoryCheckpointStorage()
+
+    @pytest.fixture
+    def saver(self, storage):
+        return DeltaCheckpointSaver(storage)
+
+    @pytest.mark.asyncio
+    async def test_steps_store_only_changed_channels(self, storage, saver):
+        app = _Graph().compile(saver)
+        await app.ainvoke(_turn("show contracts"), _config())
+
+        snapshots = [snapshot async for snapshot in app.aget_state_history(_config())]
+        router_step = next(s for s in snapshots if s.metadata.get("step") == 1)
+        # The router only changed status and (in place) data; messages still point at the input blob
+        input_step = next(s for s in snapshots if s.metadata.get("step") == 0)
+        router_record = await storage.get_checkpoint("s1:u1", "", router_step.config["configurable"]["checkpoint_id"])
+        input_record = await storage.get_checkpoint("s1:u1", "", input_step.config["configurable"]["checkpoint_id"])
+        assert router_record.blob_refs["messages"] == input_record.blob_refs["messages"]
+        assert router_record.blob_refs["data"] != input_record.blob_refs["data"]
+
+        stats = saver.get_stats()
+        assert stats["channels_unchanged"] > 0
+        assert stats["blobs_written"] < stats["checkpoints"] * 3
+
+    @pytest.mark.asyncio
+    async def test_in_place_data_mutations_are_persisted(self, saver):
+        app = _Graph().compile(saver)
+        await app.ainvoke(_turn("show contracts"), _config())
+
+        state = (await app.aget_state(_config())).values
+        assert state["data"] == {"routed": True, "tool_execution_count": 1}
+        assert [m["role"] for m in state["messages"]] == ["user", "assistant", "tool"]
+
+    @pytest.mark.asyncio
+    async def test_next_turn_continues_thread_from_partial_input(self, saver):
+        app = _Graph().compile(saver)
+        await app.ainvoke(_turn("show contracts"), _config())
+
+        state = (await app.aget_state(_config())).values
+        messages = state["messages"] + [{"role": "user", "content": "and for Acme?"}]
+        result = await app.ainvoke({"messages": messages, "status": "processing"}, _config())
+
+        assert result["data"]["tool_execution_count"] == 2
+        assert len(result["messages"]) == 6
+
+    @pytest.mark.asyncio
+    async def test_turn_input_carries_applied_summary(self, saver):
+        app = _Graph().compile(saver)
+        await app.ainvoke(_turn("show contracts"), _config())
+
+        # What apply_cached_summary does to the loaded state before the next turn
+        state = dict((await app.aget_state(_config())).values)
+        state["messages"] = state["messages"][2:] + [{"role": "user", "content": "and for Acme?"}]
+        state["memory"] = {"context_summary": "User listed all contracts."}
+        await app.ainvoke(_turn_input(state, checkpointed=True), _config())
+
+        values = (await app.aget_state(_config())).values
+        assert values["memory"]["context_summary"] == "User listed all contracts."
+        assert values["messages"][0]["role"] == "tool"
+
+    @pytest.mark.asyncio
+    async def test_resume_after_node_failure_reruns_only_failed_node(self, saver):
+        graph = _Graph()
+        graph.fail_tool = True
+        app = graph.compile(saver)
+
+        with pytest.raises(RuntimeError):
+            await app.ainvoke(_turn("show contracts"), _config())
+        assert (await app.aget_state(_config())).next == ("tool_executor",)
+
+        graph.fail_tool = False
+        graph.calls.clear()
+        result = await app.ainvoke(None, _config())
+
+        assert graph.calls == ["tool_executor"]
+        assert result["status"] == "completed"
+        assert result["data"] == {"routed": True, "tool_execution_count": 1}
+
+    @pytest.mark.asyncio
+    async def test_old_checkpoints_pruned_when_a_turn_starts(self, storage):
+        saver = DeltaCheckpointSaver(storage, max_checkpoints_per_thread=2)
+        app = _Graph().compile(saver)
+        await app.ainvoke(_turn("show contracts"), _config())
+        steps_per_turn = len(await storage.list_checkpoints("s1:u1", ""))
+
+        for content in ("and for Acme?", "and for Globex?"):
+            state = (await app.aget_state(_config())).values
+            await app.ainvoke({"messages": state["messages"] + [{"role": "user", "content": content}]}, _config())
+
+        # The previous turn's last step plus every step of the turn that just ran
+        checkpoints = await storage.list_checkpoints("s1:u1", "")
+        assert len(checkpoints) == 1 + steps_per_turn
+        stats = saver.get_stats()
+        assert stats["checkpoints_pruned"] == stats["checkpoints"] - len(checkpoints)
+
+        kept_ids = {record.checkpoint_id for record in checkpoints}
+        assert all(key[2] in kept_ids for key in storage._writes)
+        referenced = {(channel, blob_key) for record in checkpoints for channel, blob_key in record.blob_refs.items()}
+        assert set(storage._blobs[("s1:u1", "")]) == referenced
+
+        state = (await app.aget_state(_config())).values
+        assert state["data"]["tool_execution_count"] == 3
+        assert state["messages"][-2]["content"] == "calling tool"
+
+    @pytest.mark.asyncio
+    async def test_threads_are_isolated_and_deletable(self, saver):
+        app = _Graph().compile(saver)
+        thread_a = conversation_thread_id("s1", "u1")
+        thread_b = conversation_thread_id("s2", "u1")
+        await app.ainvoke(_turn("first"), _config(thread_a))
+        await app.ainvoke(_turn("second"), _config(thread_b))
+
+        assert (await app.aget_state(_config(thread_a))).values["messages"][0]["content"] == "first"
+        assert (await app.aget_state(_config(thread_b))).values["messages"][0]["content"] == "second"
+
+        await saver.adelete_thread(thread_a)
+        assert not (await app.aget_state(_config(thread_a))).values
+        assert (await app.aget_state(_config(thread_b))).values
+
+    @pytest.mark.asyncio
+    async def test_memory_storage_evicts_least_recently_used_threads(self):
+        storage = MemoryCheckpointStorage(max_threads=2)
+        app = _Graph().compile(DeltaCheckpointSaver(storage))
+        for thread_id in ("a:u1", "b:u1", "c:u1"):
+            await app.ainvoke(_turn(f"hello from {thread_id}"), _config(thread_id))
+
+        assert not (await app.aget_state(_config("a:u1"))).values
+        assert (await app.aget_state(_config("b:u1"))).values
+        assert (await app.aget_state(_config("c:u1"))).values
+        for store in (storage._checkpoints, storage._blobs, storage._writes):
+            assert all(key[0] != "a:u1" for key in store)
+
+    @pytest.mark.asyncio
+    async def test_memory_storage_evicts_idle_threads(self):
+        storage = MemoryCheckpointStorage(ttl_seconds=0.05)
+        app = _Graph().compile(DeltaCheckpointSaver(storage))
+        await app.ainvoke(_turn("first"), _config("a:u1"))
+        time.sleep(0.1)
+        await app.ainvoke(_turn("second"), _config("b:u1"))
+
+        assert not (await app.aget_state(_config("a:u1"))).values
+        assert (await app.aget_state(_config("b:u1"))).values["messages"][0]["content"] == "second"
+
+    @pytest.mark.asyncio
+    async def test_redis_prune_runs_as_one_script(self):
+        client = MagicMock()
+        script = client.register_script.return_value = AsyncMock(return_value=3)
+        storage = RedisCheckpointStorage(client, ttl_seconds=60)
+
+        assert await storage.prune("s1:u1", "", 2) == 3
+        script.assert_awaited_once_with(
+            keys=["graph:ckpt:index:s1:u1:", "graph:ckpt:blobs:s1:u1:"],
+            args=[2, "graph:ckpt:checkpoint:s1:u1::", "graph:ckpt:writes:s1:u1::"]
+        )
+        client.pipeline.assert_not_called()
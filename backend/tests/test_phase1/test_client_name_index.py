@@ -0,0 +1,187 @@
+"""
+Test the in-process client name index and its use by the fuzzy client matcher.
+"""
+
+import time
+import random
+import string
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+from src.aiagents.performance.client_name_index import ClientNameIndex, normalize_name
+from src.aiagents.graph.fuzzy_client_matcher import FuzzyClientMatcher
+
+
+CLIENTS = [
+    (1, "Acme Corp"),
+    (2, "Acme Holdings"),
+    (3, "Sangard Solutions"),
+    (4, "Blake & Partners LLC"),
+    (5, "InnovateTech Solutions"),
+]
+
+
+def _index(rows=CLIENTS) -> ClientNameIndex:
+    index = ClientNameIndex(refresh_interval_seconds=3600, enabled=True)
+    index.build(rows, version=(len(rows), max(r[0] for r in rows), None))
+    return index
+
+
+def _synthetic_clients(count: int):
+    rng = random.Random(42)
+    suffixes = ["Corp", "Inc", "LLC", "Ltd", "Solutions", "Technologies", "Systems", "Group", "Partners"]
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).capitalize() for _ in range(20000)]
+    return [
+        (i, f"{rng.choice(words)} {rng.choice(words)} {rng.choice(suffixes)}")
+        for i in range(1, count + 1)
+    ]
+
+
+class _FakeResult:
+    def __init__(self, one=None, rows=None):
+        self._one = one
+        self._rows = rows or []
+
+    def one(self):
+        return self._one
+
+    def all(self):
+        return self._rows
+
+
+class _FakeClientsTable:
+    """Answers the index's version and load queries; counts them"""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.queries = 0
+
+    @asynccontextmanager
+    async def session(self):
+        table = self
+
+        class _Session:
+            async def execute(self, statement):
+                table.queries += 1
+                if "count" in str(statement).lower():
+                    return _FakeResult(one=(len(table.rows), max(r[0] for r in table.rows), None))
+                return _FakeResult(rows=table.rows)
+
+        yield _Session()
+
+
+class TestClientNameIndex:
+    """Test suite for client name matching without the database"""
+
+    def test_match_tiers(self):
+        """Exact, alias, prefix, substring and typo-tolerant matches"""
+        index = _index()
+
+        assert [c.client_id for c in index.match(["acme corp"])] == [1]
+        # Alias without the legal suffix, and '&' spelled out
+        assert [c.client_id for c in index.match(["Blake & Partners"])] == [4]
+        assert [c.client_id for c in index.match(["Blake and Partners"])] == [4]
+        # "Acme" is the alias of "Acme Corp"; a bare prefix lists both, shortest first
+        assert [c.client_id for c in index.match(["Acme"])] == [1]
+        assert [c.client_id for c in index.match(["Acm"])] == [1, 2]
+        # Substring (the old LIKE '%name%')
+        assert [c.client_id for c in index.match(["Tech Solutions"])] == [5]
+        # Typo
+        assert [c.client_id for c in index.match(["Sangrad Solutions"])] == [3]
+        assert index.match(["Globex"]) == []
+
+    def test_change_notifications(self):
+        """Local creates, renames and deletes are visible immediately"""
+        index = _index()
+
+        index.upsert(6, "Globex Inc")
+        assert [c.client_id for c in index.match(["Globex"])] == [6]
+
+        index.upsert(1, "Acme Industries")
+        assert [c.client_name for c in index.match(["Acme Corp"])] != ["Acme Corp"]
+        assert [c.client_id for c in index.match(["Acme Industries"])] == [1]
+
+        index.remove(3)
+        assert index.match(["Sangard Solutions"]) == []
+
+    def test_normalization(self):
+        assert normalize_name("  Acme,  Corp. ") == "acme corp"
+
+
+class TestFuzzyMatcherWithIndex:
+    """Test the matcher's use of the index and its freshness checks"""
+
+    @pytest.mark.asyncio
+    async def test_hit_makes_no_database_queries(self):
+        table = _FakeClientsTable(CLIENTS)
+        matcher = FuzzyClientMatcher(name_index=_index())
+
+        with patch("src.aiagents.graph.fuzzy_client_matcher.get_ai_db", table.session), \
+             patch("src.database.core.database.get_ai_db", table.session):
+            best = await matcher.find_best_client_match("show contracts for Sangard Solutions")
+
+        assert best.client_name == "Sangard Solutions"
+        assert table.queries == 0
+
+    @pytest.mark.asyncio
+    async def test_miss_checks_version_and_reloads(self):
+        """A client created by another worker is found after the forced version check"""
+        index = _index()
+        index.min_check_interval_seconds = 0
+        table = _FakeClientsTable(CLIENTS + [(6, "Globex Inc")])
+        matcher = FuzzyClientMatcher(name_index=index)
+
+        with patch("src.database.core.database.get_ai_db", table.session):
+            best = await matcher.find_best_client_match("show contracts for Globex")
+
+        assert best.client_id == 6
+        # version check + reload (version query and name query)
+        assert table.queries == 3
+        assert index.get_stats()["loads"] == 2
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sql_when_index_unavailable(self):
+        index = ClientNameIndex(enabled=False)
+        matcher = FuzzyClientMatcher(name_index=index)
+
+        with patch.object(matcher, "_find_matching_clients_sql", return_value=[]) as sql:
+            await matcher.find_matching_clients(["Acme"])
+
+        sql.assert_awaited_once_with(["Acme"])
+
+
+class TestClientNameIndexBenchmark:
+    """Lookup latency against 100k clients"""
+
+    @pytest.fixture(scope="class")
+    def large_index(self):
+        rows = _synthetic_clients(100_000)
+        start = time.perf_counter()
+        index = _index(rows)
+        build_seconds = time.perf_counter() - start
+        return index, rows, build_seconds
+
+    def test_lookup_latency_100k(self, large_index):
+        index, rows, build_seconds = large_index
+        rng = random.Random(7)
+        sample = [rows[rng.randrange(len(rows))][1] for _ in range(200)]
+
+        exact_queries = sample
+        prefix_queries = [name.split()[0] + " " + name.split()[1][:4] for name in sample]
+        typo_queries = [name[:3] + name[4] + name[3] + name[5:] for name in sample]
+
+        timings = {}
+        for label, queries in (("exact", exact_queries), ("prefix", prefix_queries), ("typo", typo_queries)):
+            start = time.perf_counter()
+            hits = sum(1 for query in queries if index.match([query]))
+            timings[label] = (time.perf_counter() - start) / len(queries)
+            assert hits >= len(queries) * 0.9, label
+
+        print(f"\n100k clients: build {build_seconds:.2f}s, "
+              + ", ".join(f"{label} {seconds * 1e6:.0f}µs" for label, seconds in timings.items()))
+
+        assert build_seconds < 30
+        assert timings["exact"] < 0.0005
+        assert timings["prefix"] < 0.005
+        assert timings["typo"] < 0.05
@@ -0,0 +1,119 @@
+"""
+Test per-turn memoization of user-message context extraction.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from src.aiagents.graph.context_extractor import ContextExtractor
+
+
+def _client(name: str):
+    return SimpleNamespace(client_name=name)
+
+
+class TestContextExtractionMemo:
+    """Test suite for memoized context extraction"""
+
+    @pytest.fixture
+    def lookup(self):
+        """Count fuzzy client lookups (one database query each)"""
+        mock = AsyncMock(return_value=_client("Acme Corp"))
+        with patch("src.aiagents.graph.context_extractor.fuzzy_matcher.find_best_client_match", mock):
+            yield mock
+
+    @pytest.mark.asyncio
+    async def test_agent_then_tool_executor_extracts_once(self, lookup):
+        """The tool executor re-reading the turn after the agent applied it is a memo hit"""
+        extractor = ContextExtractor()
+        state = {"messages": [], "data": {}}
+        message = "update contract for Acme Corp"
+
+        # Agent node
+        context = await extractor.extract_context_from_user_message(message, state["data"])
+        extractor.update_state_with_context(state, context)
+        # Tool executor, same turn
+        again = await extractor.extract_context_from_user_message(message, state["data"])
+        extractor.update_state_with_context(state, again)
+
+        stats = extractor.get_stats()
+        assert stats["extractions"] == 1
+        assert stats["memo_hits"] == 1
+        assert lookup.await_count == 1
+        assert state["data"]["current_client"] == "Acme Corp"
+        assert state["data"]["user_operation"] == "update_contract"
+
+    @pytest.mark.asyncio
+    async def test_new_state_version_reuses_client_lookup(self, lookup):
+        """A different state version recomputes the context but not the database lookup"""
+        extractor = ContextExtractor()
+        message = "show contracts for Acme Corp"
+
+        await extractor.extract_context_from_user_message(message, {})
+        await extractor.extract_context_from_user_message(message, {"user_operation": "create_client"})
+
+        stats = extractor.get_stats()
+        assert stats["extractions"] == 2
+        assert stats["client_lookups"] == 1
+        assert stats["client_lookups_saved"] == 1
+        assert lookup.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_memoized_result_matches_recomputation(self, lookup):
+        """Serving the applied state from the memo gives the same state as extracting again"""
+        message = "update contract 12 for Acme Corp"
+        base_data = {"current_client": "Beta LLC", "current_contract_id": "7", "user_operation": "get_contracts_by_client"}
+
+        memoized = ContextExtractor()
+        memo_state = {"data": dict(base_data)}
+        fresh_state = {"data": dict(base_data)}
+
+        for _ in range(2):
+            memoized.update_state_with_context(
+                memo_state, await memoized.extract_context_from_user_message(message, memo_state["data"])
+            )
+            # A new extractor each pass has no memo to serve from
+            fresh = ContextExtractor()
+            fresh.update_state_with_context(
+                fresh_state, await fresh.extract_context_from_user_message(message, fresh_state["data"])
+            )
+
+        assert memo_state["data"] == fresh_state["data"]
+        # The contract ID given alongside the client switch survives
+        assert memo_state["data"]["current_contract_id"] == "12"
+        assert memoized.get_stats()["extractions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_turn_stats_are_scoped_to_the_turn(self, lookup):
+        """Per-turn counters only see the current turn's work"""
+        extractor = ContextExtractor()
+        await extractor.extract_context_from_user_message("show contracts for Acme Corp", {})
+
+        async def turn():
+            turn_stats = extractor.start_turn()
+            await extractor.extract_context_from_user_message("show contracts for Acme Corp", {})
+            extractor._extract_contract_id("show contracts for Acme Corp")
+            return turn_stats
+
+        # The chat request runs in its own task, so the counters do not leak out
+        turn_stats = await asyncio.create_task(turn())
+
+        assert turn_stats["memo_hits"] == 1
+        assert turn_stats["extractions"] == 0
+        assert turn_stats["client_lookups"] == 0
+        assert extractor.get_turn_stats() is None
+        assert extractor.get_stats()["extractions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memo_entries_expire(self, lookup):
+        """Expired entries are recomputed so client renames are picked up"""
+        extractor = ContextExtractor()
+        extractor.memo_ttl_seconds = 0
+
+        await extractor.extract_context_from_user_message("show contracts for Acme Corp", {})
+        await extractor.extract_context_from_user_message("show contracts for Acme Corp", {})
+
+        assert extractor.get_stats()["extractions"] == 2
+        assert lookup.await_count == 2
@@ -0,0 +1,145 @@
+"""
+Test speculative prefetch of agent context while routing completes.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from src.aiagents.graph import router as router_module
+from src.aiagents.graph.context_extractor import context_extractor
+from src.aiagents.graph.nodes import EnhancedAgentNodeExecutor, contract_agent_instance
+from src.aiagents.graph.prefetch import ContextPrefetcher
+from src.aiagents.graph.hybrid_workflow import app as agent_app
+from src.aiagents.graph.router import master_router_node
+from src.aiagents.services.llm_client import LLMClient, FakeLLMBackend
+
+LOOKUP_SECONDS = 0.05
+
+
+def _state(message: str, **data):
+    return {
+        "messages": [{"role": "user", "content": message}],
+        "data": data,
+        "context": {"user_id": "u1", "session_id": "s1"},
+    }
+
+
+def _route_to(agent_name: str):
+    def responder(kwargs):
+        return {"content": "", "tool_calls": [{
+            "function": {"name": "route_to_agent", "arguments": {"agent_name": agent_name, "reasoning": "test"}},
+        }]}
+    return responder
+
+
+def _slow(value, seconds: float = LOOKUP_SECONDS):
+    async def lookup(*args, **kwargs):
+        await asyncio.sleep(seconds)
+        return value
+    return lookup
+
+
+class TestContextPrefetch:
+    """Test suite for prefetching the predicted agent's dependencies"""
+
+    @pytest.fixture
+    def prefetcher(self):
+        context_extractor.clear_memo()
+        prefetcher = ContextPrefetcher(enabled=True)
+        with patch.object(router_module, "context_prefetcher", prefetcher), \
+             patch("src.aiagents.graph.nodes.context_prefetcher", prefetcher), \
+             patch.object(router_module.intelligent_router.context_manager, "get_enhanced_context", AsyncMock(return_value={})):
+            yield prefetcher
+
+    def _router_llm(self, agent_name: str) -> LLMClient:
+        return LLMClient(backend=FakeLLMBackend(responder=_route_to(agent_name), latency_seconds=LOOKUP_SECONDS))
+
+    def test_prediction_uses_keyword_prescore(self, prefetcher):
+        assert prefetcher.predict_agent("show contracts for Acme Corp", _state("")) == "contract_agent"
+        assert prefetcher.predict_agent("update contract 17 billing date to next friday", _state("")) == "contract_agent"
+        assert prefetcher.predict_agent("hello", _state("")) is None
+
+    @pytest.mark.asyncio
+    async def test_prefetch_overlaps_routing_and_is_used_by_agent(self, prefetcher):
+        # Contract selected on an earlier turn, client not known yet
+        state = _state("update the contract billing date to next friday", current_contract_id="17")
+        executor = EnhancedAgentNodeExecutor()
+        executor.client = LLMClient(backend=FakeLLMBackend())
+        contract_client = AsyncMock(side_effect=_slow("Acme Corp"))
+        agent_lookup = AsyncMock()
+
+        with patch.object(router_module.intelligent_router, "client", self._router_llm("contract_agent")), \
+             patch("src.aiagents.graph.prefetch._contract_client_name", contract_client), \
+             patch.object(executor, "_lookup_contract_and_save_client_name", agent_lookup), \
+             patch.object(executor, "_update_memory_async", AsyncMock()), \
+             patch("src.aiagents.graph.nodes.get_cached", AsyncMock(return_value=None)), \
+             patch("src.aiagents.graph.nodes.set_cached", AsyncMock()):
+            routing = await master_router_node(state)
+            stats_before = context_extractor.get_stats()
+            await executor.invoke(state, contract_agent_instance, routing["current_agent"])
+
+        assert routing["current_agent"] == "contract_agent"
+        # The reference lookup ran once, during routing; the agent used its result
+        contract_client.assert_awaited_once_with("17")
+        agent_lookup.assert_not_awaited()
+        assert state["data"]["current_client"] == "Acme Corp"
+        # The agent's own extraction was served from the prefetched memo entry
+        assert context_extractor.get_stats()["extractions"] == stats_before["extractions"]
+
+        stats = prefetcher.get_stats()
+        assert stats["hits"] == 1
+        assert stats["pending"] == 0
+        assert stats["latency_saved_ms"] > LOOKUP_SECONDS * 1000 * 0.6
+
+    @pytest.mark.asyncio
+    async def test_misprediction_cancels_prefetch(self, prefetcher):
+        # Contract selected on an earlier turn, client not known yet
+        state = _state("update the contract billing date to next friday", current_contract_id="17")
+        # Still looking up the contract's client when routing finishes
+        contract_client = AsyncMock(side_effect=_slow("Acme Corp", seconds=10))
+
+        with patch.object(router_module.intelligent_router, "client", self._router_llm("employee_agent")), \
+             patch("src.aiagents.graph.prefetch._contract_client_name", contract_client):
+            prefetch = prefetcher.start(state)
+            routing = await master_router_node(state)
+            await asyncio.sleep(0.01)
+
+        assert prefetch.agent_name == "contract_agent"
+        assert routing["current_agent"] == "employee_agent"
+        assert prefetch.tasks["context"].cancelled()
+        assert await prefetcher.claim(state, "employee_agent") is None
+
+        stats = prefetcher.get_stats()
+        assert stats["mispredicted"] == 1
+        assert stats["hits"] == 0
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_graph_router_node_cancels_other_agent_on_the_loop(self, prefetcher):
+        state = _state("show contracts for Acme Corp")
+        with patch("src.aiagents.graph.context_extractor.fuzzy_matcher.find_best_client_match",
+                   AsyncMock(side_effect=_slow(SimpleNamespace(client_name="Acme Corp"), seconds=10))), \
+             patch.object(router_module.intelligent_router, "client", self._router_llm("contract_agent")):
+            prefetch = prefetcher.start(state, "employee_agent")
+            # The router node as registered in the graph: a coroutine on this loop, no worker thread
+            routing = await agent_app.builder.nodes["router"].runnable.ainvoke(state)
+            # Cancelled on the spot, not scheduled from another thread
+            assert prefetch.tasks["context"].cancelling() or prefetch.tasks["context"].cancelled()
+            await asyncio.sleep(0.01)
+
+        assert routing["current_agent"] == "contract_agent"
+        assert prefetch.tasks["context"].cancelled()
+        stats = prefetcher.get_stats()
+        assert stats["mispredicted"] == 1
+        assert stats["tasks_cancelled"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_or_unpredictable_turns_are_not_prefetched(self, prefetcher):
+        assert ContextPrefetcher(enabled=False).start(_state("show contracts for Acme Corp")) is None
+        assert prefetcher.start(_state("hello")) is None
+        tool_result = _state("ignored")
+        tool_result["messages"] = [{"role": "tool", "tool_call_id": "call_1", "content": "done"}]
+        assert prefetcher.start(tool_result) is None
+        assert prefetcher.get_stats()["started"] == 0
@@ -0,0 +1,167 @@
+"""
+Test token-budgeted conversation window and rolling summarization.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.aiagents.graph.state import create_initial_state
+from src.aiagents.orchestration.dynamic_prompts import PromptTemplate, get_dynamic_instructions
+from src.aiagents.graph.nodes import EnhancedAgentNodeExecutor
+from src.aiagents.memory.context_window import (
+    ContextWindowManager, count_message_tokens, count_tokens
+)
+
+
+def _conversation(turns: int, words: int = 60):
+    messages = []
+    for i in range(turns):
+        messages.append({"type": "user", "role": "user", "content": f"request {i} " + "word " * words})
+        messages.append({"type": "ai", "role": "assistant", "content": f"answer {i} " + "text " * words})
+    return messages
+
+
+class TestContextWindow:
+    """Test suite for the context window manager"""
+
+    @pytest.fixture
+    def window(self):
+        """Create a small-budget window manager with in-memory session storage"""
+        manager = ContextWindowManager(max_prompt_tokens=400, summary_max_tokens=80, max_message_tokens=150)
+        manager.session_manager.redis_client = None
+        manager.session_manager._mock_chat_summaries = {}
+        return manager
+
+    def test_count_tokens_is_local_and_cached(self):
+        """Token counting works without network access and handles empty text"""
+        assert count_tokens("") == 0
+        assert count_tokens("hello world") > 0
+        assert count_tokens("hello world") == count_tokens("hello world")
+
+    def test_fit_messages_keeps_system_and_newest_turns(self, window):
+        """Older turns are dropped first and the prompt stays within budget"""
+        prepared = [{"role": "system", "content": "You are helpful."}] + [
+            {"role": m["role"], "content": m["content"]} for m in _conversation(20)
+        ]
+
+        fitted = window.fit_messages(prepared)
+
+        assert fitted[0]["role"] == "system"
+        assert fitted[-1] == prepared[-1]
+        assert len(fitted) < len(prepared)
+        assert sum(count_message_tokens(m) for m in fitted) <= window.max_prompt_tokens
+
+    def test_fit_messages_bounded_for_any_length(self, window):
+        """Prompt size does not grow with conversation length"""
+        sizes = []
+        for turns in (50, 500):
+            prepared = [{"role": "system", "content": "sys"}] + [
+                {"role": m["role"], "content": m["content"]} for m in _conversation(turns)
+            ]
+            sizes.append(sum(count_message_tokens(m) for m in window.fit_messages(prepared)))
+
+        assert all(size <= window.max_prompt_tokens for size in sizes)
+
+    def test_fit_messages_clips_oversized_latest_message(self, window):
+        """A single huge message is clipped rather than blowing the budget"""
+        prepared = [
+            {"role": "system", "content": "sys"},
+            {"role": "user", "content": "data " * 5000},
+        ]
+
+        fitted = window.fit_messages(prepared)
+
+        assert len(fitted) == 2
+        assert sum(count_message_tokens(m) for m in fitted) <= window.max_prompt_tokens
+
+    def test_fit_messages_adds_summary(self, window):
+        """Summary is appended to the system prompt"""
+        prepared = [{"role": "system", "content": "sys"}] + [
+            {"role": m["role"], "content": m["content"]} for m in _conversation(20)
+        ]
+
+        fitted = window.fit_messages(prepared, summary="- User: asked about Acme")
+
+        assert "asked about Acme" in fitted[0]["content"]
+        assert fitted[-1] == prepared[-1]
+
+    def test_fit_messages_keeps_latest_user_message_behind_tool_results(self, window):
+        """The request being answered survives even when newer tool output fills the budget"""
+        prepared = [{"role": "system", "content": "sys"}] + [
+            {"role": m["role"], "content": m["content"]} for m in _conversation(5)
+        ] + [{"role": "user", "content": "delete contract 12 for Acme"}] + [
+            {"role": "assistant", "content": "tool output " * 300} for _ in range(3)
+        ]
+
+        fitted = window.fit_messages(prepared)
+
+        assert {"role": "user", "content": "delete contract 12 for Acme"} in fitted
+        assert fitted[-1]["role"] == "assistant"
+        assert sum(count_message_tokens(m) for m in fitted) <= window.max_prompt_tokens
+
+    def test_plan_fold_starts_at_user_turn(self, window):
+        """Folding only happens over budget and never splits a turn"""
+        assert window.plan_fold(_conversation(1)) == 0
+
+        messages = _conversation(20)
+        fold_count = window.plan_fold(messages)
+
+        assert 0 < fold_count < len(messages)
+        assert messages[fold_count]["role"] == "user"
+
+    @pytest.mark.asyncio
+    async def test_rolling_summary_round_trip(self, window):
+        """Background summary is cached in the session and applied on the next load"""
+        state = create_initial_state("user-1", "session-1", "Test User", "admin", {"type": "user", "content": "hi", "role": "user"})
+        state["messages"] = _conversation(20)
+        messages = list(state["messages"])
+        original_count = len(messages)
+
+        task = window.schedule_summarization("session-1", "user-1", state)
+        assert task is not None
+        await window.wait_for_pending()
+
+        folded = await window.apply_cached_summary("session-1", "user-1", state)
+
+        assert folded > 0
+        assert len(state["messages"]) == original_count - folded
+        last_folded = messages[folded - 1]["content"].split()[:2]
+        assert " ".join(last_folded) in state["memory"]["context_summary"]
+        assert count_tokens(state["memory"]["context_summary"]) <= window.summary_max_tokens
+
+        # Applying again is a no-op
+        assert await window.apply_cached_summary("session-1", "user-1", state) == 0
+
+    @pytest.mark.asyncio
+    async def test_prepare_messages_respects_budget(self, window):
+        """The agent executor sends a bounded prompt for long conversations"""
+        state = create_initial_state("user-1", "session-1", "Test User", "admin", {"type": "user", "content": "hi", "role": "user"})
+        state["messages"] = _conversation(200)
+
+        with patch("src.aiagents.graph.nodes.context_window_manager", window):
+            executor = EnhancedAgentNodeExecutor()
+            prepared = await executor._prepare_messages_optimized(state, "System prompt")
+
+        assert prepared[0]["role"] == "system"
+        assert sum(count_message_tokens(m) for m in prepared) <= window.max_prompt_tokens
+
+    @pytest.mark.asyncio
+    async def test_real_agent_prompt_leaves_room_for_the_conversation(self):
+        """The largest agent prompt does not crowd the user's request out of the window"""
+        state = create_initial_state("user-1", "session-1", "Test User", "admin", {"type": "user", "content": "hi", "role": "user"})
+        system_prompt = await get_dynamic_instructions(PromptTemplate.CONTRACT_AGENT, state)
+        state["messages"] = _conversation(100) + [
+            {"type": "user", "role": "user", "content": "update the billing date for Acme to 2025-07-01"}
+        ]
+
+        manager = ContextWindowManager()
+        assert count_tokens(system_prompt) > manager.max_prompt_tokens // 2
+        with patch("src.aiagents.graph.nodes.context_window_manager", manager):
+            prepared = await EnhancedAgentNodeExecutor()._prepare_messages_optimized(state, system_prompt)
+
+        roles = [m["role"] for m in prepared]
+        assert roles[0] == "system" and roles.count("user") > 1
+        assert prepared[-1]["content"] == "update the billing date for Acme to 2025-07-01"
+        history_tokens = sum(count_message_tokens(m) for m in prepared[1:])
+        assert history_tokens >= manager.min_history_tokens // 2
+        assert history_tokens <= max(manager.max_prompt_tokens - count_message_tokens(prepared[0]), manager.min_history_tokens)
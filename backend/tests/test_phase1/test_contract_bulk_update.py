@@ -0,0 +1,180 @@
+"""
+Test set-based bulk contract updates: one UPDATE ... RETURNING, server-side audit fields, diffs and dry runs.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy.dialects import postgresql
+
+from src.aiagents.graph import tools as graph_tools
+from src.aiagents.tools import contract_tools
+from src.aiagents.tools.contract_bulk_update import ContractChanges, build_bulk_update, join_field_names
+from src.aiagents.tools.contract_tools import UpdateContractParams, update_contract_tool
+
+CLIENT = SimpleNamespace(client_id=3, client_name="Acme Corp", created_at=datetime(2024, 1, 1), updated_at=None)
+CONTRACTS = {
+    11: {"status": "active", "original_amount": Decimal("1000.00"), "end_date": date(2025, 6, 30)},
+    12: {"status": "draft", "original_amount": Decimal("2500.00"), "end_date": date(2025, 12, 31)},
+}
+
+
+class _Row:
+    def __init__(self, **values):
+        self._mapping = values
+        self.__dict__.update(values)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class _FakeDatabase:
+    """Answers the client lookup, snapshot select and bulk UPDATE from CONTRACTS and records each statement"""
+
+    def __init__(self):
+        self.queries = []
+        self.params = []
+        self.commits = 0
+
+    def _answer(self, sql, params):
+        if sql.startswith("SELECT clients."):
+            return [CLIENT]
+        columns = [name for name in ("end_date", "original_amount", "status") if f"contracts.{name}" in sql]
+        if sql.startswith("UPDATE contracts"):
+            rows = []
+            for contract_id, before in CONTRACTS.items():
+                after = {name: params.get(name, before[name]) for name in columns}
+                rows.append(_Row(
+                    contract_id=contract_id, updated_at=datetime(2025, 1, 2, 9, 30),
+                    **{f"before_{name}": before[name] for name in columns}, **after,
+                ))
+            return list(reversed(rows))
+        assert sql.startswith("SELECT contracts.contract_id"), sql
+        return [_Row(contract_id=cid, **{name: values[name] for name in columns}) for cid, values in CONTRACTS.items()]
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class _Session:
+            async def execute(self, statement):
+                compiled = statement.compile(dialect=postgresql.dialect())
+                sql = " ".join(str(compiled).split())
+                database.queries.append(sql)
+                database.params.append(compiled.params)
+                return _Result(database._answer(sql, compiled.params))
+
+            async def commit(self):
+                database.commits += 1
+
+        yield _Session()
+
+
+@pytest.fixture
+def database():
+    db = _FakeDatabase()
+    with patch.object(contract_tools, "get_ai_db", db.session):
+        yield db
+
+
+def _params(**kwargs):
+    return UpdateContractParams(client_name="Acme Corp", **kwargs)
+
+
+class TestContractChanges:
+    """Test suite for turning update parameters into column values"""
+
+    def test_collects_provided_fields_in_order(self):
+        changes = ContractChanges.from_params(_params(status="completed", end_date="2025-12-31",
+                                                      original_amount=0, notes=""))
+        assert changes.values == {"end_date": date(2025, 12, 31), "original_amount": 0, "status": "completed"}
+        assert join_field_names(changes.fields) == "end date, contract amount, and status"
+
+    def test_invalid_dates_raise_user_message(self):
+        with pytest.raises(ValueError, match="Invalid billing prompt date format"):
+            ContractChanges.from_params(_params(billing_prompt_next_date="next friday"))
+
+    def test_statement_is_single_update_with_snapshot(self):
+        changes = ContractChanges.from_params(_params(status="completed"))
+        compiled = build_bulk_update(3, changes, "u1").compile(dialect=postgresql.dialect())
+        sql = " ".join(str(compiled).split())
+
+        assert sql.startswith("UPDATE contracts SET status=")
+        assert "updated_at=now()" in sql and compiled.params["updated_by"] == "u1"
+        assert "FROM (SELECT contracts.contract_id AS contract_id, contracts.status AS status FROM contracts " \
+               "WHERE contracts.client_id = " in sql
+        assert "FOR UPDATE) AS before WHERE contracts.contract_id = before.contract_id" in sql
+        assert "RETURNING contracts.contract_id, contracts.updated_at, before.status AS before_status, contracts.status" in sql
+
+
+class TestBulkContractUpdate:
+    """Test suite for update_contract with update_all"""
+
+    @pytest.mark.asyncio
+    async def test_update_all_is_one_statement_with_diff(self, database):
+        result = await update_contract_tool(_params(update_all=True, status="active", original_amount=1000.0),
+                                            {"user_id": "u1"})
+
+        assert result.success
+        assert len(database.queries) == 2
+        assert database.queries[1].startswith("UPDATE contracts")
+        # No per-contract loads or flushes
+        assert not any(q.startswith("SELECT contracts.") for q in database.queries)
+        assert database.commits == 1
+
+        data = result.data
+        assert data["contracts_updated"] == 2 and data["contracts_changed"] == 1
+        assert data["updated_fields"] == ["original_amount", "status"]
+        first, second = data["contracts"]
+        assert first["contract_id"] == 11 and first["changes"] == {}
+        assert second["changes"] == {
+            "original_amount": {"before": 2500.0, "after": 1000.0},
+            "status": {"before": "draft", "after": "active"},
+        }
+        assert second["updated_at"] == "2025-01-02T09:30:00"
+        assert "Successfully updated 2 contracts for 'Acme Corp'. Updated: contract amount and status." in result.message
+        assert "- Contract 12: contract amount $2,500.00 → $1,000.00; status draft → active" in result.message
+
+    @pytest.mark.asyncio
+    async def test_all_response_uses_bulk_path(self, database):
+        result = await update_contract_tool(_params(user_response="for both", end_date="2026-01-31"), {"user_id": "u1"})
+
+        assert result.success and result.data["update_all"]
+        assert [q.split(" ")[0] for q in database.queries] == ["SELECT", "UPDATE"]
+        assert database.params[1]["end_date"] == date(2026, 1, 31)
+
+    @pytest.mark.asyncio
+    async def test_dry_run_previews_without_writing(self, database):
+        result = await update_contract_tool(_params(update_all=True, dry_run=True, status="completed"),
+                                            {"user_id": "u1"})
+
+        assert not result.success and result.requires_confirmation
+        assert not any(q.startswith("UPDATE") for q in database.queries)
+        assert database.commits == 0
+        assert result.data["dry_run"] and result.data["contracts_updated"] == 0
+        assert result.data["contracts_changed"] == 2
+        assert "- Contract 11: status active → completed" in result.message
+        assert "**Please confirm:**" in result.message
+
+    @pytest.mark.asyncio
+    async def test_update_all_without_fields_is_rejected(self, database):
+        result = await update_contract_tool(_params(update_all=True), {"user_id": "u1"})
+
+        assert not result.success
+        assert "No contract fields to update" in result.message
+        assert len(database.queries) == 1
+
+    def test_dry_run_is_not_sent_to_job_queue(self):
+        assert graph_tools._is_long_running_tool("update_contract", {"update_all": True})
+        assert not graph_tools._is_long_running_tool("update_contract", {"update_all": True, "dry_run": True})
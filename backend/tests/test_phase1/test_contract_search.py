@@ -0,0 +1,204 @@
+"""
+Test planned contract search: exact enum matches, index choice, versioned result caching and query-plan checks.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy.dialects import postgresql
+
+from src.aiagents.tools import contract_tools
+from src.aiagents.tools.contract_search import (
+    ContractSearchCache, contract_search_cache, explain_search, plan_contract_search, summarize_plan
+)
+from src.aiagents.tools.contract_tools import SearchContractsParams, search_contracts_tool
+
+TODAY = date(2025, 5, 14)
+
+INDEXED_PLAN = [
+    "Limit  (cost=12.61..12.62 rows=3 width=520)",
+    "  ->  Sort  (cost=12.61..12.62 rows=3 width=520)",
+    "        Sort Key: contracts.created_at DESC",
+    "        ->  Nested Loop  (cost=4.30..12.59 rows=3 width=520)",
+    "              ->  Bitmap Heap Scan on clients  (cost=4.16..8.18 rows=1 width=212)",
+    "                    Recheck Cond: ((client_name)::text ~~* '%acme%'::text)",
+    "                    ->  Bitmap Index Scan on idx_clients_name_trgm  (cost=0.00..4.16 rows=1 width=0)",
+    "              ->  Index Scan using idx_contracts_client_status on contracts  (cost=0.14..4.39 rows=3 width=308)",
+    "                    Index Cond: ((client_id = clients.client_id) AND (lower((status)::text) = 'active'::text))",
+]
+SEQ_SCAN_PLAN = [
+    "Limit  (cost=3120.44..3120.45 rows=3 width=520)",
+    "  ->  Hash Join  (cost=18.10..3120.40 rows=3 width=520)",
+    "        ->  Seq Scan on contracts  (cost=0.00..3095.00 rows=610 width=308)",
+    "              Filter: ((status)::text ~~* '%active%'::text)",
+]
+
+
+def _sql(stmt):
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})).split())
+
+
+def _contract(contract_id: int):
+    return SimpleNamespace(
+        contract_id=contract_id, client=SimpleNamespace(client_name="Acme Corp"), status="Active",
+        contract_type="Fixed Price", billing_frequency="Monthly", original_amount=1000, start_date=None,
+        end_date=None, billing_prompt_next_date=date(2025, 6, 1), created_at=datetime(2025, 1, contract_id),
+    )
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+    def scalar(self):
+        return self._rows[0]
+
+
+class _FakeDatabase:
+    """Answers the search and null-billing-count statements and records each query"""
+
+    def __init__(self, count: int = 3):
+        self.contracts = [_contract(i) for i in range(1, count + 1)]
+        self.queries = []
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class _Session:
+            async def execute(self, statement):
+                sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+                database.queries.append(sql)
+                if sql.startswith("SELECT count(*)"):
+                    return _Result([2])
+                return _Result([(c, len(database.contracts)) for c in database.contracts])
+
+        yield _Session()
+
+
+@pytest.fixture
+def database():
+    db = _FakeDatabase()
+    contract_search_cache.clear()
+    with patch.object(contract_tools, "get_ai_db", db.session):
+        yield db
+    contract_search_cache.clear()
+
+
+class TestContractSearchPlan:
+    """Test suite for turning search parameters into indexable predicates"""
+
+    def test_enum_fields_are_exact_lower_matches(self):
+        plan = plan_contract_search(SearchContractsParams(
+            status="Ongoing", billing_frequency="one time", contract_type="Fixed Price"), TODAY)
+        sql = _sql(plan.statement(50))
+
+        assert "ILIKE" not in sql
+        assert "lower(contracts.status) = 'active'" in sql
+        assert "lower(contracts.billing_frequency) IN ('one-time', 'one time', 'onetime')" in sql
+        assert "lower(contracts.contract_type) IN ('fixed', 'fixed price', 'fixed-price', 'fixed fee')" in sql
+        assert plan.filters == ["status is 'ongoing'", "billing frequency is 'one-time'", "contract type is 'fixed'"]
+        assert plan.free_text == []
+
+    def test_trigram_matching_only_for_free_text(self):
+        plan = plan_contract_search(SearchContractsParams(client_name="Acme", contract_type="bespoke"), TODAY)
+        sql = _sql(plan.statement(50))
+
+        assert "clients.client_name ILIKE '%%Acme%%'" in sql
+        assert "contracts.contract_type ILIKE '%%bespoke%%'" in sql
+        assert plan.free_text == ["client_name", "contract_type"]
+
+    def test_composite_indexes_for_common_combinations(self):
+        client_status = plan_contract_search(SearchContractsParams(client_name="Acme", status="active"), TODAY)
+        assert client_status.indexes == ["idx_clients_name_trgm", "idx_contracts_client_status"]
+
+        billing = plan_contract_search(SearchContractsParams(status="active", billing_date_next_month=True), TODAY)
+        assert billing.indexes == ["idx_contracts_status_billing_date"]
+        assert "contracts.billing_prompt_next_date BETWEEN '2025-05-14' AND '2025-06-30'" in _sql(billing.statement(50))
+
+        assert plan_contract_search(SearchContractsParams(), TODAY).indexes == ["idx_contracts_created_at"]
+
+    def test_equivalent_parameters_share_a_key(self):
+        first = plan_contract_search(SearchContractsParams(status="active", client_name="Acme "), TODAY)
+        second = plan_contract_search(SearchContractsParams(status="Ongoing", client_name="acme"), TODAY)
+        other = plan_contract_search(SearchContractsParams(status="draft", client_name="acme"), TODAY)
+        assert first.key == second.key != other.key
+
+
+class TestContractSearchCache:
+    """Test suite for versioned search result caching"""
+
+    @pytest.mark.asyncio
+    async def test_identical_searches_are_served_from_cache(self, database):
+        first = await search_contracts_tool(SearchContractsParams(status="active"), {"today": TODAY})
+        second = await search_contracts_tool(SearchContractsParams(status="ongoing"), {"today": TODAY})
+
+        assert first.success and second.success
+        assert len(database.queries) == 2  # search + null-billing count, once
+        assert second.data["contracts"] == first.data["contracts"]
+        assert "Found 3 contracts where status is 'ongoing'." in second.message
+        assert "2 contracts have no billing prompt date set" in second.message
+        # One statement, the client loaded through the same join
+        assert "JOIN clients" in database.queries[0] and "lower(contracts.status) = " in database.queries[0]
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_cached_results(self, database):
+        await search_contracts_tool(SearchContractsParams(status="active"), {"today": TODAY})
+        contract_search_cache.invalidate("contract updated")
+        await search_contracts_tool(SearchContractsParams(status="active"), {"today": TODAY})
+
+        assert len(database.queries) == 4
+
+    def test_results_read_before_a_write_are_not_stored(self):
+        cache = ContractSearchCache(ttl_seconds=60)
+        version = cache.version
+        cache.invalidate("write during the query")
+        cache.put(("status", "active"), "stale", version)
+        assert cache.get(("status", "active")) is None
+
+        cache.put(("status", "active"), "fresh", cache.version)
+        assert cache.get(("status", "active")) == "fresh"
+        assert cache.get_stats()["hits"] == 1
+
+
+class TestContractSearchQueryPlans:
+    """Test suite for EXPLAIN checks of planned searches"""
+
+    def test_plan_summary_reports_index_usage(self):
+        indexed = summarize_plan(INDEXED_PLAN, ["idx_contracts_client_status"])
+        assert indexed["uses_search_indexes"]
+        assert indexed["indexes_used"] == ["idx_contracts_client_status", "idx_clients_name_trgm"]
+
+        seq_scan = summarize_plan(SEQ_SCAN_PLAN)
+        assert seq_scan["seq_scan"] and not seq_scan["uses_search_indexes"]
+
+        # An index was used, but not one the plan was built for
+        assert not summarize_plan(INDEXED_PLAN, ["idx_contracts_status_billing_date"])["uses_search_indexes"]
+
+    @pytest.mark.asyncio
+    async def test_explain_search_runs_literal_explain(self):
+        executed = []
+
+        class _Connection:
+            dialect = postgresql.dialect()
+
+            async def exec_driver_sql(self, sql):
+                executed.append(sql)
+                return _Result([(line,) for line in INDEXED_PLAN])
+
+        class _Session:
+            async def connection(self):
+                return _Connection()
+
+        plan = plan_contract_search(SearchContractsParams(client_name="acme", status="active"), TODAY)
+        summary = await explain_search(_Session(), plan.statement(50), plan.indexes)
+
+        assert summary["uses_search_indexes"]
+        assert executed[0].startswith("EXPLAIN SELECT")
+        assert "lower(contracts.status) = 'active'" in executed[0]
+        assert "LIMIT 50" in executed[0]
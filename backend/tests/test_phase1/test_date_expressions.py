@@ -0,0 +1,203 @@
+"""
+Test the shared date-expression resolver: parity with the legacy get_date_range,
+the extended grammar, caching, and how tools and the context extractor use it.
+"""
+
+import calendar
+import random
+import re
+import pytest
+from datetime import date, datetime, timedelta
+from dateutil.relativedelta import relativedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from src.aiagents.graph.context_extractor import ContextExtractor
+from src.aiagents.tools.date_expressions import DateExpressionResolver, date_resolver, fiscal_year_range
+from src.aiagents.tools.employee_tools import get_date_range
+from src.aiagents.tools.time_tools import requested_period, timesheet_period
+
+WEDNESDAY = date(2025, 5, 14)
+
+
+def _legacy_get_date_range(relative_str, today=None):
+    """get_date_range as it was before the resolver, kept as the parity reference"""
+    if today is None:
+        today = datetime.now().date()
+
+    def month_range(day):
+        start_date = day.replace(day=1)
+        return start_date, start_date + relativedelta(months=1) - timedelta(days=1)
+
+    def year_range(day):
+        return day.replace(month=1, day=1), day.replace(month=12, day=31)
+
+    date_handlers = {
+        "this month": lambda: month_range(today),
+        "this year": lambda: year_range(today),
+        "last month": lambda: month_range(today - relativedelta(months=1)),
+        "last year": lambda: year_range(today - relativedelta(years=1)),
+        "next month": lambda: month_range(today + relativedelta(months=1)),
+        "next year": lambda: year_range(today + relativedelta(years=1)),
+    }
+    if relative_str in date_handlers:
+        return date_handlers[relative_str]()
+
+    month_mapping = {
+        'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+        'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+        'aug': 8, 'august': 8, 'sep': 9, 'september': 9, 'oct': 10, 'october': 10,
+        'nov': 11, 'november': 11, 'dec': 12, 'december': 12
+    }
+    match = re.search(r"next year.*?(jan|january|feb|february|mar|march|apr|april|may|jun|june|jul|july|aug|august|sep|september|oct|october|nov|november|dec|december)", relative_str.lower())
+    if match:
+        year = (today + relativedelta(years=1)).year
+        month = month_mapping[match.group(1)]
+        return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+    match = re.search(r"last (\d+) (months?|years?)", relative_str.lower())
+    if match:
+        count = int(match.group(1))
+        if 'month' in match.group(2):
+            return ((today - relativedelta(months=count)).replace(day=1),
+                    (today - relativedelta(months=1)).replace(day=1) + relativedelta(months=1) - timedelta(days=1))
+        return (today - relativedelta(years=count)).replace(month=1, day=1), (today - relativedelta(years=1)).replace(month=12, day=31)
+
+    match = re.search(r"next (\d+) months?", relative_str.lower())
+    if match:
+        count = int(match.group(1))
+        return (today + relativedelta(months=1)).replace(day=1), today + relativedelta(months=count)
+
+    return None, None
+
+
+def _random_phrase(rng: random.Random) -> str:
+    month = rng.choice(["jan", "January", "feb", "mar", "March", "apr", "may", "jun", "July", "aug",
+                        "sep", "September", "oct", "nov", "December"])
+    core = rng.choice([
+        f"{rng.choice(['this', 'last', 'next'])} {rng.choice(['month', 'year'])}",
+        f"next year in {month}",
+        f"next year, {month}",
+        f"Next Year {month}",
+        f"last {rng.randint(0, 240)} {rng.choice(['month', 'months', 'year', 'years'])}",
+        f"next {rng.randint(0, 240)} {rng.choice(['month', 'months'])}",
+        f"Last {rng.randint(1, 36)} Months",
+        f"last {rng.randint(1, 12)} weeks",
+        rng.choice(["last quarter", "q2 2024", "between march and may", "next monday", "fy2025", "yesterday"]),
+    ])
+    prefix = rng.choice(["", "", "hired in the ", "employees from the ", "  "])
+    suffix = rng.choice(["", "", " please", "?", " and before"])
+    return prefix + core + suffix
+
+
+class TestLegacyParity:
+    """Test suite for phrases get_date_range understood before the resolver"""
+
+    def test_fuzz_matches_legacy_get_date_range(self):
+        rng = random.Random(48)
+        resolver = DateExpressionResolver(cache_size=64)
+        checked = 0
+        for _ in range(3000):
+            phrase = _random_phrase(rng)
+            # Month ends and leap days are where month arithmetic differs
+            today = date(2020, 1, 1) + timedelta(days=rng.randint(0, 3650))
+            expected = _legacy_get_date_range(phrase, today)
+            if expected == (None, None):
+                continue
+            checked += 1
+            assert resolver.resolve_range(phrase, today) == expected, (phrase, today)
+            assert get_date_range(phrase, today) == expected, (phrase, today)
+        assert checked > 1500
+
+    @pytest.mark.parametrize("today", [date(2024, 2, 29), date(2025, 1, 31), date(2025, 3, 31), date(2025, 12, 31)])
+    def test_month_edges(self, today):
+        for phrase in ["this month", "last month", "next month", "last 1 month", "next 1 month", "last 2 years"]:
+            assert get_date_range(phrase, today) == _legacy_get_date_range(phrase, today)
+
+    def test_unrecognised_is_none_pair(self):
+        assert get_date_range("whenever", WEDNESDAY) == (None, None)
+        assert get_date_range("last 99999 months", WEDNESDAY) == (None, None)
+
+
+class TestGrammar:
+    """Test suite for expressions beyond the legacy phrases"""
+
+    @pytest.mark.parametrize("expression,expected", [
+        ("this week", (date(2025, 5, 12), date(2025, 5, 18))),
+        ("last quarter", (date(2025, 1, 1), date(2025, 3, 31))),
+        ("next quarter", (date(2025, 7, 1), date(2025, 9, 30))),
+        ("Q3 2024", (date(2024, 7, 1), date(2024, 9, 30))),
+        ("third quarter of 2023", (date(2023, 7, 1), date(2023, 9, 30))),
+        ("FY2025", (date(2025, 1, 1), date(2025, 12, 31))),
+        ("next monday", (date(2025, 5, 19), date(2025, 5, 19))),
+        ("last wednesday", (date(2025, 5, 7), date(2025, 5, 7))),
+        ("next march", (date(2026, 3, 1), date(2026, 3, 31))),
+        ("past 10 days", (date(2025, 5, 4), date(2025, 5, 13))),
+        ("between March and May", (date(2025, 3, 1), date(2025, 5, 31))),
+        ("from 2025-01-15 to Q2 2025", (date(2025, 1, 15), date(2025, 6, 30))),
+    ])
+    def test_expressions(self, expression, expected):
+        assert date_resolver.resolve_range(expression, WEDNESDAY) == expected
+
+    def test_reversed_between_is_unresolved(self):
+        assert date_resolver.resolve("between may and march", WEDNESDAY) is None
+
+    def test_fiscal_year_start_month(self):
+        assert fiscal_year_range(2025, start_month=10) == (date(2024, 10, 1), date(2025, 9, 30))
+        with patch("src.aiagents.tools.date_expressions.FISCAL_YEAR_START_MONTH", 7):
+            resolver = DateExpressionResolver()
+            assert resolver.resolve_range("this fiscal year", WEDNESDAY) == (date(2024, 7, 1), date(2025, 6, 30))
+            assert resolver.resolve_range("Q1 FY26", WEDNESDAY) == (date(2025, 7, 1), date(2025, 9, 30))
+
+    def test_find_in_messages(self):
+        assert date_resolver.find("show my timesheet for last week please", WEDNESDAY).expression == "last week"
+        assert date_resolver.find("billing between March 2025 and May 2025", WEDNESDAY).as_tuple() == \
+            (date(2025, 3, 1), date(2025, 5, 31))
+        # Bare months and numbers are not dates in free text
+        assert date_resolver.find("may I update contract 2025", WEDNESDAY) is None
+
+
+class TestCachingAndToday:
+    """Test suite for result caching and the injectable today"""
+
+    def test_results_cached_per_expression_and_today(self):
+        resolver = DateExpressionResolver()
+        first = resolver.resolve("Last Quarter", WEDNESDAY)
+        assert resolver.resolve("  last quarter ", WEDNESDAY) is first
+        resolver.resolve("last quarter", WEDNESDAY + timedelta(days=60))
+
+        stats = resolver.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 2
+
+    def test_today_provider(self):
+        resolver = DateExpressionResolver(today_provider=lambda: date(2024, 12, 30))
+        assert resolver.resolve_range("next month") == (date(2025, 1, 1), date(2025, 1, 31))
+
+
+class TestConsumers:
+    """Test suite for tools and the context extractor using the resolver"""
+
+    def test_timesheet_period_from_period_and_context(self):
+        assert timesheet_period(period="last week", today=WEDNESDAY) == (date(2025, 5, 5), date(2025, 5, 11))
+        assert timesheet_period("last monday", None, today=WEDNESDAY) == (date(2025, 5, 12), date(2025, 5, 18))
+        context = {"date_range": {"expression": "last month"}}
+        assert requested_period(None, context) == "last month"
+        assert requested_period("q1", context) == "q1"
+        with pytest.raises(ValueError):
+            timesheet_period("someday", None)
+
+    @pytest.mark.asyncio
+    async def test_context_extractor_sets_and_clears_date_range(self):
+        lookup = AsyncMock(return_value=SimpleNamespace(client_name="Acme Corp"))
+        extractor = ContextExtractor()
+        state = {"messages": [], "data": {}}
+        with patch("src.aiagents.graph.context_extractor.fuzzy_matcher.find_best_client_match", lookup), \
+                patch.object(date_resolver, "today_provider", lambda: WEDNESDAY):
+            context = await extractor.extract_context_from_user_message("show contracts billing next quarter", state["data"])
+            extractor.update_state_with_context(state, context)
+            assert state["data"]["date_range"] == {"expression": "next quarter", "start_date": "2025-07-01",
+                                                   "end_date": "2025-09-30"}
+
+            context = await extractor.extract_context_from_user_message("show all employees", state["data"])
+            extractor.update_state_with_context(state, context)
+            assert "date_range" not in state["data"]
@@ -0,0 +1,171 @@
+"""
+Test deterministic dispatch of well-specified requests without LLM calls.
+"""
+
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from src.aiagents.graph import tools
+from src.aiagents.graph.dispatch_rules import DispatchEngine, DispatchMode
+from src.aiagents.graph.nodes import EnhancedAgentNodeExecutor, contract_agent_instance
+from src.aiagents.graph.router import IntelligentRouter
+from src.aiagents.graph.tools import tool_executor_node
+from src.aiagents.services.llm_client import LLMClient, FakeLLMBackend
+
+
+def _state(message: str, history=(), file_info=None, **data):
+    data.setdefault("original_user_request", message)
+    return {
+        "messages": [*history, {"role": "user", "content": message}],
+        "data": data,
+        "context": {"user_id": "u1", "session_id": "s1", **({"file_info": file_info} if file_info else {})},
+    }
+
+
+class TestDispatchRules:
+    """Test suite for rule matching"""
+
+    @pytest.fixture
+    def engine(self):
+        return DispatchEngine(enabled=True)
+
+    @pytest.mark.parametrize("message,agent,data,tool,arguments", [
+        ("Show contracts for Acme Corp", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp"},
+         "get_client_contracts", {"client_name": "Acme Corp"}),
+        ("show the contracts for the Acme Corp.", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp"},
+         "get_client_contracts", {"client_name": "Acme Corp"}),
+        ("details of employee 42", "employee_agent", {}, "get_employee_details", {"employee_id": 42}),
+        ("show contract #17", "contract_agent", {}, "get_contract_details", {"contract_id": 17}),
+        ("get client details for Acme Corp", "client_agent",
+         {"user_operation": "get_client_details", "current_client": "Acme Corp"},
+         "get_client_details", {"client_name": "Acme Corp"}),
+        ("list all clients", "client_agent", {}, "get_all_clients", {}),
+        ("show me all employees", "employee_agent", {}, "get_all_employees", {}),
+        ("show contracts with no billing date", "contract_agent",
+         {"user_operation": "get_contracts_with_null_billing"}, "get_contracts_with_null_billing", {}),
+    ])
+    def test_well_specified_reads_dispatch(self, engine, message, agent, data, tool, arguments):
+        dispatch = engine.match(_state(message, **data), agent)
+
+        assert dispatch is not None
+        assert dispatch.rule.mode is DispatchMode.TOOL_CALL
+        assert dispatch.rule.tool == tool
+        assert dispatch.arguments == arguments
+
+        tool_call = dispatch.to_message()["tool_calls"][0]
+        assert tool_call["function"]["name"] == tool
+        assert json.loads(tool_call["function"]["arguments"]) == arguments
+
+    @pytest.mark.parametrize("message,agent,data", [
+        # Extra filters the rule can't express
+        ("show active contracts for Acme Corp over 10k", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp"}),
+        # More than the resolved client in the request
+        ("show contracts for Acme Corp and Globex", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp"}),
+        ("show contracts for Acme Corp, Globex and Initech", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp"}),
+        ("show contracts for Acme Corp from last month", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp"}),
+        ("show contracts for Acme Corp over 5000", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp"}),
+        ("get client details for Acme Corp and Globex", "client_agent",
+         {"user_operation": "get_client_details", "current_client": "Acme Corp"}),
+        # No client resolved
+        ("show contracts for Globex", "contract_agent", {"user_operation": "get_contracts_by_client"}),
+        # Operation carried over from an earlier turn
+        ("show contracts for Acme Corp", "contract_agent",
+         {"user_operation": "get_contracts_by_client", "current_client": "Acme Corp", "original_user_request": "earlier"}),
+        # Wrong agent for the rule
+        ("details of employee 42", "contract_agent", {}),
+        ("update contract 17", "contract_agent", {"user_operation": "update_contract"}),
+    ])
+    def test_underspecified_requests_go_to_llm(self, engine, message, agent, data):
+        assert engine.match(_state(message, **data), agent) is None
+
+    def test_original_short_circuits_are_rules(self, engine):
+        upload = engine.match(_state(
+            "upload this to Acme", file_info={"filename": "a.pdf"},
+            user_operation="upload_contract_document", current_client="Acme Corp",
+        ), "contract_agent")
+        assert upload.rule.name == "contract_document_upload"
+        assert upload.rule.mode is DispatchMode.DIRECT
+
+        # Same conditions as the old _should_short_circuit: a bare ID reply while the
+        # state holds a contract ID from an earlier message
+        history = [{"role": "user", "content": "update the Acme contract"}, {"role": "assistant", "content": "Which contract?"}]
+        reply_state = _state(
+            "12", history=history, user_operation="update_contract", current_client="Acme Corp",
+            current_contract_id="7", original_user_request="update the Acme contract",
+        )
+        assert engine.match(reply_state, "contract_agent").rule.name == "contract_id_reply"
+        reply_state["data"]["current_contract_id"] = "12"
+        assert engine.match(reply_state, "contract_agent") is None
+
+    def test_disabled_engine_keeps_original_short_circuits(self):
+        engine = DispatchEngine(enabled=False)
+        assert engine.match(_state("list all clients"), "client_agent") is None
+        assert engine.route("list all clients") is None
+        assert engine.match(_state(
+            "upload this to Acme", file_info={"filename": "a.pdf"},
+            user_operation="upload_contract_document", current_client="Acme Corp",
+        ), "contract_agent") is not None
+
+    def test_per_rule_hit_rates(self, engine):
+        engine.match(_state("list all clients"), "client_agent")
+        engine.match(_state("list all clients"), "client_agent")
+        engine.match(_state("what should I bill Acme?"), "client_agent")
+        engine.match(_state("details of employee 7"), "employee_agent")
+
+        stats = engine.get_stats()
+        assert stats["checks"] == 4
+        assert stats["hits"] == 3
+        assert stats["hit_rate"] == 0.75
+        assert stats["rules"]["all_clients"] == {"hits": 2, "hit_rate": 0.5}
+        assert stats["rules"]["employee_details_by_id"]["hits"] == 1
+
+    def test_route_picks_agent_from_message_shape(self, engine):
+        assert engine.route("Show contracts for Acme Corp") == "contract_agent"
+        assert engine.route("details of employee 42") == "employee_agent"
+        assert engine.route("show contracts for employee Ann") is None
+        assert engine.route("how many hours did Ann log?") is None
+
+
+class TestDispatchWithoutModelCalls:
+    """A well-specified read is answered with zero LLM calls end to end"""
+
+    @pytest.fixture
+    def backend(self):
+        def fail(kwargs):
+            raise AssertionError("LLM should not be called")
+        return FakeLLMBackend(responder=fail)
+
+    @pytest.mark.asyncio
+    async def test_contracts_for_client(self, backend):
+        client = LLMClient(backend=backend)
+        router = IntelligentRouter()
+        router.client = client
+        executor = EnhancedAgentNodeExecutor()
+        executor.client = client
+        state = _state("show contracts for Acme Corp")
+        state["data"] = {}
+
+        contracts = AsyncMock(return_value={"success": True, "message": "Acme Corp has 2 contracts", "data": None})
+        with patch("src.aiagents.graph.context_extractor.fuzzy_matcher.find_best_client_match",
+                   AsyncMock(return_value=SimpleNamespace(client_name="Acme Corp"))), \
+             patch("src.aiagents.graph.nodes.get_cached", AsyncMock(return_value=None)), \
+             patch.dict(tools.TOOL_REGISTRY, {"get_client_contracts": contracts}):
+            routing = await router.call_llm_for_routing("show contracts for Acme Corp", state)
+            agent_result = await executor.invoke(state, contract_agent_instance, routing["arguments"]["agent_name"])
+            state["messages"].extend(agent_result["messages"])
+            tool_result = await tool_executor_node(state)
+
+        assert routing["arguments"]["agent_name"] == "contract_agent"
+        assert agent_result["messages"][0]["tool_calls"][0]["function"]["name"] == "get_client_contracts"
+        assert contracts.await_args.kwargs["client_name"] == "Acme Corp"
+        assert tool_result["messages"][0]["content"] == "Acme Corp has 2 contracts"
+        assert backend.calls == []
@@ -0,0 +1,186 @@
+"""
+Test batched profile and document-link loading in the employee listing tools.
+"""
+
+import os
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from src.aiagents.performance.metrics_collector import metrics_collector
+from src.aiagents.tools import employee_tools
+from src.services import storage_service
+from src.aiagents.tools.employee_tools import (
+    get_all_employees_tool,
+    get_employee_details_tool,
+    get_employees_by_committed_hours_tool,
+    search_employees_tool,
+)
+
+
+def _employee(i: int):
+    return SimpleNamespace(
+        employee_id=i, profile_id=f"p{i}", employee_number=f"E{i:04d}", job_title="Consultant",
+        department="Delivery", employment_type="permanent", full_time_part_time="full_time",
+        committed_hours=40, hire_date=None, termination_date=None, rate_type="hourly",
+        rate=Decimal("80.00"), currency="USD", created_at=datetime(2024, 1, 1), updated_at=None,
+        nda_document_filename=f"nda{i}.pdf", nda_document_file_path=f"nda/{i}.pdf",
+        nda_document_file_size=1024, nda_document_mime_type="application/pdf", nda_document_uploaded_at=None,
+        contract_document_filename=None, contract_document_file_path=f"contract/{i}.pdf" if i % 2 else None,
+        contract_document_file_size=None, contract_document_mime_type=None, contract_document_uploaded_at=None,
+    )
+
+
+def _profile(i: int):
+    return SimpleNamespace(
+        user_id=f"p{i}", first_name="Emp", last_name=f"{i:04d}", email=f"emp{i}@example.com",
+        full_name=f"Emp {i:04d}",
+    )
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+
+class _FakeDatabase:
+    """Answers employee/profile statements from in-memory rows and records each query"""
+
+    def __init__(self, count: int):
+        self.rows = [(_employee(i), _profile(i)) for i in range(1, count + 1)]
+        self.queries = []
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class _Session:
+            async def execute(self, statement):
+                compiled = statement.compile(dialect=postgresql.dialect())
+                sql = " ".join(str(compiled).split())
+                database.queries.append(sql)
+                assert sql.startswith("SELECT employees.") and "JOIN profiles" in sql, sql
+                rows = database.rows
+                if "employees.employee_id = %(" in sql:
+                    rows = [row for row in rows if row[0].employee_id == compiled.params["employee_id_1"]]
+                limit = compiled.params.get("param_1")
+                return _Result(rows[:limit] if limit else rows)
+
+        yield _Session()
+
+
+def _signed_urls(bucket):
+    return lambda paths, expires_in: [
+        {"path": path, "signedURL": f"https://signed/{bucket}/{path}", "error": None} for path in paths
+    ]
+
+
+@pytest.fixture
+def storage():
+    buckets = {}
+
+    def from_(bucket):
+        if bucket not in buckets:
+            buckets[bucket] = MagicMock()
+            buckets[bucket].create_signed_urls.side_effect = _signed_urls(bucket)
+        return buckets[bucket]
+
+    with patch.dict(os.environ, {"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_SERVICE_KEY": "key"}), \
+         patch.object(storage_service, "create_client") as factory, \
+         patch.object(storage_service, "_storage_service", None):
+        factory.return_value.storage.from_.side_effect = from_
+        yield SimpleNamespace(
+            factory=factory,
+            sign_requests=lambda: sum(bucket.create_signed_urls.call_count for bucket in buckets.values()),
+        )
+
+
+@pytest.fixture
+def database():
+    databases = []
+
+    def build(count: int):
+        db = _FakeDatabase(count)
+        patcher = patch.object(employee_tools, "get_ai_db", db.session)
+        patcher.start()
+        databases.append(patcher)
+        return db
+
+    yield build
+    for patcher in databases:
+        patcher.stop()
+
+
+class TestEmployeeProjection:
+    """Test suite for the shared employee projection loader"""
+
+    @pytest.mark.asyncio
+    async def test_all_employees_single_query_and_batched_links(self, database, storage):
+        small = database(3)
+        await get_all_employees_tool()
+        large = database(200)
+        result = await get_all_employees_tool()
+
+        assert result.success
+        assert result.data["total"] == 200
+        # The first page goes back to the conversation, the rest stays behind the cursor
+        assert result.data["count"] == len(result.data["employees"]) < 200
+        assert result.data["cursor"]
+        # Employees and profiles in one query regardless of size
+        assert len(small.queries) == len(large.queries) == 1
+        # One storage client for every call, one signing request per bucket
+        assert storage.factory.call_count == 1
+        assert storage.sign_requests() == 4
+        first, second = result.data["employees"][:2]
+        assert first["employee_name"] == "Emp 0001"
+        assert first["profile"]["email"] == "emp1@example.com"
+        assert first["nda_document"]["download_url"] == "https://signed/employee-nda-documents/nda/1.pdf"
+        assert first["contract_document"]["download_url"] == "https://signed/employee-contract-documents/contract/1.pdf"
+        assert second["contract_document"] == {
+            "filename": None, "file_size": None, "mime_type": None, "uploaded_at": None,
+            "has_document": False, "download_url": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_salary_search_has_no_per_employee_queries(self, database, storage):
+        db = database(200)
+        result = await search_employees_tool("rate > 50", limit=25)
+
+        assert result.success
+        assert len(db.queries) == 1
+        assert "LIMIT" in db.queries[0] and "employees.rate >=" in db.queries[0]
+        assert result.data["count"] == 25
+        assert result.data["employees"][0]["profile"]["full_name"] == "Emp 0001"
+        assert storage.sign_requests() == 0
+
+    @pytest.mark.asyncio
+    async def test_details_and_committed_hours_use_one_query(self, database, storage):
+        db = database(50)
+        details = await get_employee_details_tool.__wrapped__(7)
+        committed = await get_employees_by_committed_hours_tool.__wrapped__(40)
+
+        assert details.success and committed.success
+        assert len(db.queries) == 2
+        assert "LEFT OUTER JOIN profiles" in db.queries[0]
+        assert details.message == "📋 Employee details for Emp 0007"
+        assert details.data["nda_document"]["has_document"] is True
+        assert details.data["contract_document"]["download_url"].endswith("contract/7.pdf")
+        assert committed.data["count"] == 50
+        assert storage.factory.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_round_trips_recorded_in_metrics(self, database, storage):
+        database(10)
+        before = metrics_collector._counters.get("employee_projection_db_queries", 0)
+        await get_all_employees_tool()
+
+        assert metrics_collector._gauges["get_all_employees_db_queries"] == 1
+        assert metrics_collector._gauges["get_all_employees_storage_requests"] == 2
+        assert metrics_collector._counters["employee_projection_db_queries"] == before + 1
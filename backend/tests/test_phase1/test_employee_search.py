@@ -0,0 +1,158 @@
+"""
+Test indexed employee search: tsquery/trigram statements, ranking and query-plan checks.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.aiagents.tools import employee_tools
+from src.aiagents.tools.employee_search import EmployeeSearch, explain_search, summarize_plan
+from src.aiagents.tools.employee_tools import search_employees_tool
+from src.database.core.models import Employee
+
+INDEXED_PLAN = [
+    "Limit  (cost=52.31..52.33 rows=8 width=412)",
+    "  ->  Sort  (cost=52.31..52.33 rows=8 width=412)",
+    "        Sort Key: ((ts_rank_cd(employee_search_documents.search_vector, '''jon'':*'::tsquery) + word_similarity('jon'::text, employee_search_documents.search_text))) DESC",
+    "        ->  Nested Loop Left Join  (cost=24.26..52.19 rows=8 width=412)",
+    "              ->  Bitmap Heap Scan on employee_search_documents  (cost=24.12..44.83 rows=8 width=97)",
+    "                    ->  BitmapOr  (cost=24.12..24.12 rows=8 width=0)",
+    "                          ->  Bitmap Index Scan on idx_employee_search_vector  (cost=0.00..12.05 rows=4 width=0)",
+    "                          ->  Bitmap Index Scan on idx_employee_search_text_trgm  (cost=0.00..12.06 rows=4 width=0)",
+]
+SEQ_SCAN_PLAN = [
+    "Limit  (cost=4210.10..4210.12 rows=8 width=412)",
+    "  ->  Seq Scan on employee_search_documents  (cost=0.00..4209.00 rows=8 width=97)",
+]
+
+
+def _compile(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return " ".join(str(compiled).split()), compiled.params
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+
+class _FakeDatabase:
+    """Records the search tool's statements and answers with canned rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class _Session:
+            async def execute(self, statement):
+                database.queries.append(_compile(statement))
+                return _Result(database.rows)
+
+        yield _Session()
+
+
+@pytest.fixture
+def database():
+    employee = SimpleNamespace(
+        employee_id=1, profile_id="p1", employee_number="E0001", job_title="Consultant", department="Delivery",
+        employment_type="permanent", full_time_part_time="full_time", hire_date=None, termination_date=None,
+        rate_type="hourly", rate=None, currency="USD", nda_document_filename=None, nda_document_file_path=None,
+        contract_document_filename=None, contract_document_file_path=None,
+    )
+    profile = SimpleNamespace(first_name="Jon", last_name="Smith", email="jon@example.com")
+    db = _FakeDatabase([(employee, profile)])
+    with patch.object(employee_tools, "get_ai_db", db.session):
+        yield db
+
+
+class TestEmployeeSearch:
+    """Test suite for the indexed employee search"""
+
+    def test_parse_builds_prefix_tsquery(self):
+        search = EmployeeSearch.parse("  Jon O'Smtih-Ray ")
+        assert search.tokens == ("jon", "o", "smtih", "ray")
+        assert search.tsquery_text == "jon:* & o:* & smtih:* & ray:*"
+        assert not search.prefix_only
+
+        starts_with = EmployeeSearch.parse("employees whose name starts with 'Jo'")
+        assert starts_with.prefix_only
+        assert starts_with.tsquery_text == "jo:*A"
+
+        assert EmployeeSearch.parse(" ,; ") is None
+
+    def test_search_statement_uses_indexable_operators(self):
+        sql, params = _compile(EmployeeSearch.parse("jon smtih").apply(select(Employee)).limit(10))
+
+        assert "JOIN employee_search_documents" in sql
+        assert "employee_search_documents.search_vector @@ to_tsquery('simple'," in sql
+        # Trigram word similarity for typos, served by the gin_trgm_ops index
+        assert "employee_search_documents.search_text %%> " in sql
+        assert "ILIKE" not in sql
+        assert "ORDER BY ts_rank_cd(" in sql and "word_similarity(" in sql and "DESC, employees.employee_id" in sql
+        assert params["to_tsquery_1"] == "jon:* & smtih:*"
+
+        prefix_sql, _ = _compile(EmployeeSearch.parse("starting with sm").apply(select(Employee)))
+        assert "%%>" not in prefix_sql and "word_similarity" not in prefix_sql
+
+    @pytest.mark.asyncio
+    async def test_tool_runs_single_ranked_search(self, database):
+        with patch.object(employee_tools, "FULLTEXT_SEARCH_ENABLED", True):
+            result = await search_employees_tool("jon smtih", limit=10)
+
+        assert result.success
+        assert result.data["count"] == 1
+        assert result.data["employees"][0]["profile"]["full_name"] == "Jon Smith"
+        assert len(database.queries) == 1
+        sql, params = database.queries[0]
+        assert "@@ to_tsquery" in sql and "ILIKE" not in sql
+        assert "LIMIT %(param_2)s" in sql and params["param_2"] == 10
+
+    @pytest.mark.asyncio
+    async def test_tool_falls_back_to_ilike_when_disabled(self, database):
+        with patch.object(employee_tools, "FULLTEXT_SEARCH_ENABLED", False):
+            result = await search_employees_tool("consultant")
+
+        assert result.success
+        sql, _ = database.queries[0]
+        assert "ILIKE" in sql and "employee_search_documents" not in sql
+
+    def test_plan_summary_reports_index_usage(self):
+        indexed = summarize_plan(INDEXED_PLAN)
+        assert indexed["uses_search_indexes"]
+        assert indexed["indexes_used"] == ["idx_employee_search_vector", "idx_employee_search_text_trgm"]
+
+        seq_scan = summarize_plan(SEQ_SCAN_PLAN)
+        assert seq_scan["seq_scan"] and not seq_scan["uses_search_indexes"]
+
+    @pytest.mark.asyncio
+    async def test_explain_search_runs_literal_explain(self):
+        executed = []
+
+        class _Connection:
+            dialect = postgresql.dialect()
+
+            async def exec_driver_sql(self, sql):
+                executed.append(sql)
+                return _Result([(line,) for line in INDEXED_PLAN])
+
+        class _Session:
+            async def connection(self):
+                return _Connection()
+
+        summary = await explain_search(_Session(), EmployeeSearch.parse("jon").apply(select(Employee)).limit(50))
+
+        assert summary["uses_search_indexes"]
+        assert executed[0].startswith("EXPLAIN SELECT")
+        assert "to_tsquery('simple', 'jon:*')" in executed[0]
+        assert "LIMIT 50" in executed[0]
@@ -0,0 +1,121 @@
+"""
+Test streaming, disk-spooled uploads for chat file attachments.
+"""
+
+import os
+import io
+import hashlib
+import tracemalloc
+import pytest
+from unittest.mock import Mock, patch
+
+from src.aiagents.services.file_cache import (
+    FileCacheService, FileTooLargeError, CachedFileHandle, FILE_REF_PREFIX
+)
+from src.services.storage_service import SupabaseStorageService
+
+
+class ChunkedUpload:
+    """Minimal UploadFile stand-in that produces data lazily in chunks"""
+
+    def __init__(self, total_size: int, filename: str = "contract.pdf", content_type: str = "application/pdf"):
+        self.filename = filename
+        self.content_type = content_type
+        self._remaining = total_size
+        self.max_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        size = self._remaining if size < 0 else min(size, self._remaining)
+        self.max_read = max(self.max_read, size)
+        self._remaining -= size
+        return b"x" * size
+
+
+class TestFileSpooling:
+    """Test suite for spooled chat uploads"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a file cache that spools into a temporary directory"""
+        return FileCacheService(default_ttl_minutes=5, spool_dir=str(tmp_path))
+
+    @pytest.mark.asyncio
+    async def test_spool_upload_writes_to_disk_with_hash(self, cache):
+        """Upload is written to disk, hashed, and exposed to tools as a reference"""
+        payload = b"%PDF-1.4 test document" * 100
+        upload = Mock(filename="nda.pdf", content_type="application/pdf")
+        stream = io.BytesIO(payload)
+
+        async def read(size=-1):
+            return stream.read(size)
+        upload.read = read
+
+        ref_id = await cache.spool_upload(upload)
+        cached = cache.get_file(ref_id)
+
+        assert cached["file_data"] == f"{FILE_REF_PREFIX}{ref_id}"
+        assert cached["file_size"] == len(payload)
+        assert cached["sha256"] == hashlib.sha256(payload).hexdigest()
+        with open(cached["file_path"], "rb") as spooled:
+            assert spooled.read() == payload
+
+    @pytest.mark.asyncio
+    async def test_spool_upload_enforces_size_limit(self, cache, tmp_path):
+        """Oversized uploads are rejected while reading and leave nothing behind"""
+        upload = ChunkedUpload(total_size=2 * 1024 * 1024)
+
+        with pytest.raises(FileTooLargeError):
+            await cache.spool_upload(upload, max_size_bytes=1024 * 1024)
+
+        assert os.listdir(tmp_path) == []
+        assert cache.get_cache_stats()["active_files"] == 0
+
+    @pytest.mark.asyncio
+    async def test_spool_upload_peak_memory_is_bounded(self, cache):
+        """Peak memory per upload stays near one chunk regardless of file size"""
+        upload = ChunkedUpload(total_size=20 * 1024 * 1024)
+
+        tracemalloc.start()
+        ref_id = await cache.spool_upload(upload)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert cache.get_file(ref_id)["file_size"] == 20 * 1024 * 1024
+        assert upload.max_read <= 64 * 1024
+        assert peak < 1024 * 1024
+
+    @pytest.mark.asyncio
+    async def test_file_handle_resolution_and_cleanup(self, cache):
+        """References resolve to on-disk handles; removal deletes the spool file"""
+        ref_id = await cache.spool_upload(ChunkedUpload(total_size=1000))
+        handle = cache.get_file_handle(f"{FILE_REF_PREFIX}{ref_id}")
+
+        assert isinstance(handle, CachedFileHandle)
+        assert handle.file_size == 1000
+        assert cache.get_file_handle("aGVsbG8gd29ybGQ=") is None
+
+        assert cache.remove_file(ref_id)
+        assert not os.path.exists(handle.file_path)
+
+    @pytest.mark.asyncio
+    async def test_storage_streams_spooled_file(self, cache):
+        """Storage upload receives an open file stream, not the file contents"""
+        ref_id = await cache.spool_upload(ChunkedUpload(total_size=4096))
+        handle = cache.get_file_handle(ref_id)
+
+        with patch("src.services.storage_service.create_client") as mock_create:
+            bucket = mock_create.return_value.storage.from_.return_value
+            uploaded = {}
+
+            def fake_upload(path, file, file_options):
+                uploaded["is_stream"] = hasattr(file, "read") and not isinstance(file, bytes)
+                uploaded["size"] = len(file.read())
+                return Mock(path=path)
+            bucket.upload.side_effect = fake_upload
+
+            result = await SupabaseStorageService().upload_contract_document(handle, 42)
+
+        assert result["success"]
+        assert result["file_size"] == 4096
+        assert result["filename"] == "contract.pdf"
+        assert uploaded == {"is_stream": True, "size": 4096}
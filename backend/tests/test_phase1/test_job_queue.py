@@ -0,0 +1,226 @@
+"""
+Test background job queue and long-running tool handoff.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from fastapi import HTTPException
+
+from src.aiagents.orchestration.job_queue import JobQueue, JobStatus, JobPriority
+from src.aiagents.graph import tools as graph_tools
+from src.database.api import jobs as jobs_api
+
+
+class TestJobQueue:
+    """Test suite for the background job queue"""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory job queue; workers start on the test's event loop"""
+        return JobQueue(max_workers=2, retry_backoff_seconds=0.01, use_redis=False)
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_immediately_and_completes(self, queue):
+        """Submit hands back a job id before the work finishes"""
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return {"value": 42}
+
+        job = await queue.submit("slow", work, user_id="u1")
+        assert job.status == JobStatus.QUEUED
+
+        release.set()
+        finished = await queue.wait(job.job_id, timeout=1)
+
+        assert finished.status == JobStatus.SUCCEEDED
+        assert finished.result == {"value": 42}
+        assert (await queue.get(job.job_id)).to_dict()["status"] == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, queue):
+        """No more than max_workers jobs run at once"""
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        jobs = [await queue.submit(f"job-{i}", work) for i in range(6)]
+        for job in jobs:
+            await queue.wait(job.job_id, timeout=2)
+
+        assert peak == 2
+        assert queue.get_stats()["succeeded"] == 6
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Higher priority jobs are picked up first"""
+        queue = JobQueue(max_workers=1, use_redis=False)
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker():
+            await gate.wait()
+
+        def record(name):
+            async def work():
+                order.append(name)
+            return work
+
+        first = await queue.submit("blocker", blocker)
+        await asyncio.sleep(0)  # let the single worker take the blocker
+        low = await queue.submit("low", record("low"), priority=JobPriority.LOW)
+        high = await queue.submit("high", record("high"), priority=JobPriority.HIGH)
+        gate.set()
+
+        for job in (first, low, high):
+            await queue.wait(job.job_id, timeout=1)
+
+        assert order == ["high", "low"]
+
+    @pytest.mark.asyncio
+    async def test_retries_then_fails(self, queue):
+        """Failures are retried up to max_retries"""
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise RuntimeError("transient")
+            return "ok"
+
+        job = await queue.submit("flaky", flaky, max_retries=2)
+        assert (await queue.wait(job.job_id, timeout=1)).status == JobStatus.SUCCEEDED
+
+        async def broken():
+            raise RuntimeError("permanent")
+
+        job = await queue.submit("broken", broken, max_retries=1)
+        finished = await queue.wait(job.job_id, timeout=1)
+
+        assert finished.status == JobStatus.FAILED
+        assert finished.attempts == 2
+        assert finished.error == "permanent"
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_and_finished(self, queue):
+        """Running jobs can be cancelled; finished jobs cannot"""
+        started = asyncio.Event()
+
+        async def forever():
+            started.set()
+            await asyncio.sleep(60)
+
+        job = await queue.submit("forever", forever)
+        await started.wait()
+
+        assert await queue.cancel(job.job_id)
+        finished = await queue.wait(job.job_id, timeout=1)
+        assert finished.status == JobStatus.CANCELLED
+        assert not await queue.cancel(job.job_id)
+
+    @pytest.mark.asyncio
+    async def test_stop_interrupts_running_job(self, queue):
+        """Stopping the workers doesn't wait for a running job, which is marked failed"""
+        started = asyncio.Event()
+
+        async def forever():
+            started.set()
+            await asyncio.sleep(60)
+
+        job = await queue.submit("forever", forever)
+        await started.wait()
+
+        await asyncio.wait_for(queue.stop(), timeout=1)
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Interrupted: job queue stopped"
+
+    @pytest.mark.asyncio
+    async def test_job_cancelling_itself_fails(self, queue):
+        """A CancelledError raised by the job itself is a failure, not a user cancellation"""
+        async def cancelled_inside():
+            raise asyncio.CancelledError()
+
+        finished = await queue.wait((await queue.submit("inner", cancelled_inside)).job_id, timeout=1)
+        assert finished.status == JobStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_evicted_after_ttl(self):
+        """Finished jobs leave memory after the retention period; running ones stay"""
+        queue = JobQueue(max_workers=1, use_redis=False, finished_ttl_seconds=60)
+
+        async def work():
+            return "ok"
+
+        old = await queue.submit("old", work)
+        await queue.wait(old.job_id, timeout=1)
+        old.finished_at -= 120
+        recent = await queue.submit("recent", work)
+        await queue.wait(recent.job_id, timeout=1)
+
+        assert await queue.get(old.job_id) is None
+        assert old.job_id not in queue._done_events
+        assert (await queue.get(recent.job_id)).result == "ok"
+        assert queue.get_stats()["evicted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_jobs_api_only_serves_the_owner(self, queue, monkeypatch):
+        """Another user's job and a job without an owner are both not found"""
+        monkeypatch.setattr(jobs_api, "job_queue", queue)
+
+        async def work():
+            return "ok"
+
+        owned = await queue.submit("owned", work, user_id="u1")
+        unowned = await queue.submit("unowned", work)
+        owner, other = SimpleNamespace(user_id="u1"), SimpleNamespace(user_id="u2")
+
+        assert (await jobs_api._get_owned_job(owned.job_id, owner)).job_id == owned.job_id
+        for job_id, user in ((owned.job_id, other), (unowned.job_id, owner)):
+            with pytest.raises(HTTPException) as error:
+                await jobs_api._get_owned_job(job_id, user)
+            assert error.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_long_running_tool_hands_off_with_job_id(self, queue, monkeypatch):
+        """A slow tool returns an in-progress message with the job id"""
+        monkeypatch.setattr("src.aiagents.orchestration.job_queue.job_queue", queue)
+        monkeypatch.setattr(graph_tools, "INLINE_TOOL_BUDGET_SECONDS", 0.05)
+        release = asyncio.Event()
+
+        async def slow_upload(**kwargs):
+            await release.wait()
+            return {"success": True, "message": "Uploaded"}
+
+        state = {"context": {"user_id": "u1", "session_id": "s1"}, "data": {}}
+        output = await graph_tools._execute_tool("upload_contract_document", slow_upload, {}, state)
+
+        job_id = output["data"]["job_id"]
+        assert "/api/jobs/" + job_id in output["message"]
+        assert state["data"]["background_job"]["job_id"] == job_id
+
+        release.set()
+        finished = await queue.wait(job_id, timeout=1)
+        assert finished.result["message"] == "Uploaded"
+        assert finished.user_id == "u1"
+
+    @pytest.mark.asyncio
+    async def test_fast_tools_run_inline(self, queue, monkeypatch):
+        """Short tools bypass the queue and long tools that finish in budget return their result"""
+        monkeypatch.setattr("src.aiagents.orchestration.job_queue.job_queue", queue)
+
+        async def quick(**kwargs):
+            return {"message": "done"}
+
+        state = {"context": {}, "data": {}}
+        assert await graph_tools._execute_tool("get_all_contracts", quick, {}, state) == {"message": "done"}
+        assert await graph_tools._execute_tool("update_contract", quick, {"update_all": True}, state) == {"message": "done"}
+        assert queue.get_stats()["submitted"] == 1
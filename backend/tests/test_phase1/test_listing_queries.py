@@ -0,0 +1,214 @@
+"""
+Test set-based loading of the client and contract listing tools: query counts and "N more" limits.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from sqlalchemy.dialects import postgresql
+
+from src.aiagents.tools import contract_tools
+from src.aiagents.tools.contract_tools import (
+    SearchContractsParams,
+    get_all_clients_tool,
+    get_all_clients_with_contracts_tool,
+    get_contracts_by_client_tool,
+    get_contracts_with_documents_tool,
+)
+
+
+def _clients(count: int):
+    return [
+        SimpleNamespace(
+            client_id=i, client_name=f"Client {i:04d}", industry=("Tech", "Retail")[i % 2],
+            primary_contact_name=f"Contact {i}" if i % 3 else None, primary_contact_email=None,
+            company_size=None, notes=None, created_at=datetime(2024, 1, 1), updated_at=None,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _contracts(clients, per_client: int):
+    contracts = []
+    for client in clients:
+        for n in range(per_client):
+            contract_id = client.client_id * 100 + n
+            contracts.append(SimpleNamespace(
+                contract_id=contract_id, client_id=client.client_id, contract_type="Fixed", status="active",
+                original_amount=1000, current_amount=None, billing_frequency="monthly",
+                start_date=None, end_date=None, billing_prompt_next_date=None, termination_date=None,
+                notes=None, created_at=datetime(2024, 1, 1), document_filename=f"c{contract_id}.pdf",
+                document_file_path=f"contracts/c{contract_id}.pdf", document_file_size=2048, document_uploaded_at=None,
+            ))
+    return contracts
+
+
+async def _signed_urls(bucket, paths, expires_in=3600):
+    return {path: f"https://signed/{path}" for path in paths}
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+    def scalars(self):
+        return _Result([row[0] if isinstance(row, tuple) else row for row in self._rows])
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class _FakeDatabase:
+    """Answers the listing tools' statements from in-memory rows and records each query"""
+
+    def __init__(self, clients, contracts, limit: int, per_client_limit: int):
+        self.clients = clients
+        self.contracts = contracts
+        self.limit = limit
+        self.per_client_limit = per_client_limit
+        self.queries = []
+
+    def _client_contracts(self, client_id):
+        return [c for c in self.contracts if c.client_id == client_id]
+
+    def _answer(self, sql: str):
+        if "GROUP BY clients.industry" in sql:
+            groups = {}
+            for client in self.clients:
+                count = len(self._client_contracts(client.client_id))
+                group = groups.setdefault(client.industry, [0, 0, 0, 0])
+                group[0] += 1
+                group[1] += bool(client.primary_contact_name or client.primary_contact_email)
+                group[2] += bool(count)
+                group[3] += count
+            return [(industry, *values) for industry, values in groups.items()]
+        if "row_number()" in sql:
+            page_ids = {client.client_id for client in self.clients[:self.limit]}
+            rows = []
+            for client_id in sorted(page_ids):
+                contracts = self._client_contracts(client_id)
+                rows += [(c, len(contracts)) for c in contracts[:self.per_client_limit]]
+            return rows
+        if "lower(client_name) = lower" in sql:
+            return self.clients[:1]
+        if "count(*) OVER ()" in sql:
+            contracts = self._client_contracts(self.clients[0].client_id) if "contracts.client_id = %(" in sql else self.contracts
+            names = {client.client_id: client.client_name for client in self.clients}
+            if "clients.client_name" in sql:
+                return [(c, names[c.client_id], len(contracts)) for c in contracts[:self.limit]]
+            return [(c, len(contracts)) for c in contracts[:self.limit]]
+        if "FROM clients ORDER BY clients.client_name" in sql:
+            assert "LIMIT" in sql
+            return self.clients[:self.limit]
+        raise AssertionError(f"Unexpected query: {sql}")
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class _Session:
+            async def execute(self, statement):
+                sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+                database.queries.append(sql)
+                return _Result(database._answer(sql))
+
+        yield _Session()
+
+
+@pytest.fixture
+def database():
+    def build(client_count: int, per_client: int = 3, limit: int = 20, per_client_limit: int = 2):
+        clients = _clients(client_count)
+        db = _FakeDatabase(clients, _contracts(clients, per_client), limit, per_client_limit)
+        patches = [
+            patch.object(contract_tools, "get_ai_db", db.session),
+            patch.object(contract_tools, "LISTING_LIMIT", limit),
+            patch.object(contract_tools, "RESULT_SNAPSHOT_LIMIT", limit),
+            patch.object(contract_tools, "CONTRACTS_PER_CLIENT_LIMIT", per_client_limit),
+        ]
+        for p in patches:
+            p.start()
+        build.patches.extend(patches)
+        return db
+
+    build.patches = []
+    yield build
+    # Reverse order, so a test that builds twice restores the original limits
+    for p in reversed(build.patches):
+        p.stop()
+
+
+class TestListingQueries:
+    """Test suite for bounded, set-based listing queries"""
+
+    @pytest.mark.asyncio
+    async def test_clients_with_contracts_query_count_is_constant(self, database):
+        small = database(10)
+        await get_all_clients_with_contracts_tool()
+        large = database(2000)
+        result = await get_all_clients_with_contracts_tool()
+
+        assert result.success
+        # Client page, ranked contracts of those clients, summary aggregate
+        assert len(small.queries) == len(large.queries) == 3
+        summary = result.data["summary"]
+        assert summary["total_clients"] == 2000
+        assert summary["total_contracts"] == 6000
+        assert len(result.data["clients_with_contracts"]) == 20
+        first = result.data["clients_with_contracts"][0]
+        assert first["contract_count"] == 3 and len(first["contracts"]) == 2
+        assert "_...and 1 more contracts not shown._" in result.message
+        assert "_...and 1980 more clients not shown._" in result.message
+        assert "(2000 clients, 6000 total contracts)" in result.message
+
+    @pytest.mark.asyncio
+    async def test_all_clients_uses_page_and_aggregate(self, database):
+        db = database(2000)
+        result = await get_all_clients_tool()
+
+        assert result.success
+        assert len(db.queries) == 2
+        assert result.data["count"] == 20
+        assert result.data["total"] == result.data["summary"]["total_clients"] == 2000
+        assert result.data["summary"]["has_contacts"] == len([c for c in db.clients if c.primary_contact_name])
+        assert result.data["summary"]["industries"] == ["Retail", "Tech"]
+        assert "_...and 1980 more clients not shown; narrow the request to see them._" in result.message
+
+    @pytest.mark.asyncio
+    async def test_contracts_by_client_is_bounded(self, database):
+        db = database(5, per_client=30)
+        with patch.object(contract_tools, "get_storage_service") as storage:
+            storage.return_value.create_signed_urls = AsyncMock(side_effect=_signed_urls)
+            result = await get_contracts_by_client_tool("Client 0001")
+
+        assert result.success
+        # Exact-name client lookup plus one windowed contracts query
+        assert len(db.queries) == 2
+        assert len(result.data["contracts"]) == 20
+        assert result.data["total_contracts"] == 30
+        assert "Contract Details (30 contracts)" in result.message
+        assert "_...and 10 more contracts not shown._" in result.message
+        # Every document link of the page signed in one batch
+        storage.return_value.create_signed_urls.assert_awaited_once()
+        assert "[c100.pdf](https://signed/contracts/c100.pdf)" in result.message
+
+    @pytest.mark.asyncio
+    async def test_contracts_with_documents_single_query(self, database):
+        db = database(500)
+        with patch.object(contract_tools, "get_storage_service") as storage:
+            storage.return_value.create_signed_urls = AsyncMock(side_effect=_signed_urls)
+            result = await get_contracts_with_documents_tool(SearchContractsParams(), {})
+
+        assert result.success
+        assert len(db.queries) == 1
+        assert result.data["contracts_with_documents"] == 1500
+        assert len(result.data["contracts"]) == 20
+        assert result.data["contracts"][0]["client_name"] == "Client 0001"
+        assert "_...and 1480 more contracts with documents not shown._" in result.message
+        storage.return_value.create_signed_urls.assert_awaited_once()
+        assert "(https://signed/contracts/c100.pdf)" in result.message
@@ -0,0 +1,168 @@
+"""
+Test the shared async LLM client: pooling, deadlines and cancellation.
+"""
+
+import time
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.aiagents.services.llm_client import (
+    LLMClient, FakeLLMBackend, LLMDeadlineExceeded, request_deadline
+)
+from src.aiagents.graph.nodes import EnhancedAgentNodeExecutor, enhanced_executor
+from src.aiagents.graph.router import intelligent_router
+from src.aiagents.graph.hybrid_workflow import app as agent_app
+from src.database.api import chat as chat_api
+
+
+def _messages(text: str = "list contracts"):
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": text}]
+
+
+class TestLLMClient:
+    """Test suite for the shared LLM client"""
+
+    @pytest.fixture
+    def fake_backend(self):
+        """Fake backend with a small simulated latency"""
+        return FakeLLMBackend(latency_seconds=0.05)
+
+    @pytest.fixture
+    def client(self, fake_backend):
+        """LLM client running on the fake backend"""
+        return LLMClient(backend=fake_backend, min_call_seconds=0.05)
+
+    @pytest.mark.asyncio
+    async def test_fake_backend_returns_openai_types(self):
+        """Scripted replies come back as real ChatCompletion objects, tool calls included"""
+        backend = FakeLLMBackend(responder=lambda kwargs: {
+            "content": None,
+            "tool_calls": [{"function": {"name": "get_all_contracts", "arguments": {"limit": 5}}}],
+        })
+        client = LLMClient(backend=backend)
+
+        response = await client.chat_completion(model="gpt-4o-mini", messages=_messages())
+        tool_call = response.choices[0].message.tool_calls[0]
+
+        assert tool_call.function.name == "get_all_contracts"
+        assert tool_call.function.arguments == '{"limit": 5}'
+        assert backend.calls[0]["timeout"] == client.default_timeout_seconds
+
+    @pytest.mark.asyncio
+    async def test_concurrent_completions_do_not_block_loop(self, client):
+        """Twenty slow completions overlap instead of running back to back"""
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.chat_completion(model="m", messages=_messages(f"request {i}")) for i in range(20)
+        ])
+        elapsed = time.perf_counter() - start
+
+        assert responses[7].choices[0].message.content == "echo: request 7"
+        assert client.get_stats()["peak_in_flight"] == 20
+        assert elapsed < 20 * 0.05 / 2
+
+    @pytest.mark.asyncio
+    async def test_per_call_timeout_follows_request_budget(self, client, fake_backend):
+        """Call timeouts shrink to the remaining budget and overruns raise"""
+        fake_backend.latency_seconds = 1.0
+
+        with request_deadline(0.2):
+            start = time.perf_counter()
+            with pytest.raises(LLMDeadlineExceeded):
+                await client.chat_completion(model="m", messages=_messages(), timeout=15.0)
+            elapsed = time.perf_counter() - start
+
+        assert fake_backend.calls[-1]["timeout"] <= 0.2
+        assert elapsed < 0.5
+        assert client.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_rejects_without_calling(self, client, fake_backend):
+        """No call is started when the budget is already spent"""
+        with request_deadline(0.01):
+            with pytest.raises(LLMDeadlineExceeded):
+                await client.chat_completion(model="m", messages=_messages())
+
+        assert fake_backend.calls == []
+        assert client.get_stats()["deadline_rejections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancellation_reaches_in_flight_call(self, client, fake_backend):
+        """Cancelling the caller cancels the backend call"""
+        fake_backend.latency_seconds = 5.0
+        task = asyncio.create_task(client.chat_completion(model="m", messages=_messages()))
+        await asyncio.sleep(0.01)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        stats = client.get_stats()
+        assert stats["cancelled"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_executor_and_router_share_client(self):
+        """Agent executor and router use the same pooled client"""
+        assert enhanced_executor.client is intelligent_router.client
+        assert EnhancedAgentNodeExecutor().client is enhanced_executor.client
+
+    @pytest.mark.asyncio
+    async def test_graph_router_node_awaits_shared_client(self, monkeypatch):
+        """The graph's router node asks the pooled client on the request's own loop"""
+        loops = []
+
+        def route(kwargs):
+            loops.append(asyncio.get_running_loop())
+            return {
+                "content": None,
+                "tool_calls": [{"function": {"name": "route_to_agent", "arguments": {
+                    "agent_name": "time_agent", "reasoning": "test", "confidence": "high"
+                }}}],
+            }
+
+        backend = FakeLLMBackend(responder=route)
+        monkeypatch.setattr(intelligent_router.client, "backend", backend)
+        state = {"messages": [{"role": "user", "content": "how did last week go"}], "data": {}, "context": {}}
+
+        with patch.object(intelligent_router.context_manager, "get_enhanced_context", AsyncMock(return_value={})), \
+                patch("src.aiagents.graph.router.context_prefetcher.start"):
+            routing = await agent_app.builder.nodes["router"].runnable.ainvoke(state)
+
+        assert routing == {"current_agent": "time_agent"}
+        assert len(backend.calls) == 1
+        assert loops == [asyncio.get_running_loop()]
+
+    @pytest.mark.asyncio
+    async def test_executor_call_runs_on_fake_backend(self, client):
+        """The executor's monitored call goes through the async client"""
+        executor = EnhancedAgentNodeExecutor()
+        executor.client = client
+
+        response = await executor._execute_with_monitoring(_messages("hello"), [], "client_agent")
+
+        assert response.choices[0].message.content == "echo: hello"
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_agent_run(self, monkeypatch):
+        """A disconnected HTTP client cancels the running graph"""
+        cancelled = asyncio.Event()
+
+        async def slow_graph(state, config=None):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        monkeypatch.setattr(chat_api.agent_app, "ainvoke", slow_graph)
+        monkeypatch.setattr(chat_api, "DISCONNECT_POLL_SECONDS", 0.01)
+        request = Mock()
+
+        async def is_disconnected():
+            return True
+        request.is_disconnected = is_disconnected
+
+        with pytest.raises(chat_api.ClientDisconnected):
+            await chat_api._invoke_agent(request, {"messages": []}, recursion_limit=5)
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
@@ -0,0 +1,171 @@
+"""
+Test concurrent execution of read-only tool calls in the tool executor.
+"""
+
+import json
+import time
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from src.aiagents.graph import tools
+from src.aiagents.graph.tools import tool_executor_node
+
+
+def _tool_call(call_id: str, name: str, **arguments):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+def _state(*tool_calls, user_operation: str = ""):
+    return {
+        "messages": [{"role": "assistant", "content": "", "tool_calls": list(tool_calls)}],
+        "data": {"user_operation": user_operation},
+        "context": {"user_id": "u1", "session_id": "s1"},
+    }
+
+
+class _Recorder:
+    """Fake tools that log start/end events and track peak concurrency"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.events = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def tool(self, name: str, delay: float = None, data: dict = None):
+        async def run(**kwargs):
+            label = kwargs.get("contract_id") or kwargs.get("client_name") or name
+            self.events.append(("start", label))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay if delay is None else delay)
+            finally:
+                self.in_flight -= 1
+            self.events.append(("end", label))
+            result = {"success": True, "message": f"{name} {label}"}
+            if data is not None:
+                result["data"] = data
+            return result
+        return run
+
+    def index(self, event, label):
+        return self.events.index((event, label))
+
+
+class TestParallelToolExecutor:
+    """Test suite for read/write-aware tool execution"""
+
+    @pytest.fixture
+    def recorder(self):
+        recorder = _Recorder()
+        registry = {
+            "get_client_contracts": recorder.tool("get_client_contracts"),
+            "get_all_contracts": recorder.tool("get_all_contracts"),
+            "update_contract": recorder.tool("update_contract"),
+            "update_client": recorder.tool("update_client"),
+            "search_employees": recorder.tool("search_employees", delay=1.0),
+        }
+        with patch.dict(tools.TOOL_REGISTRY, registry):
+            yield recorder
+
+    @pytest.mark.asyncio
+    async def test_reads_run_concurrently_in_original_order(self, recorder):
+        state = _state(
+            _tool_call("c1", "get_client_contracts", client_name="Acme"),
+            _tool_call("c2", "get_client_contracts", client_name="Beta"),
+            _tool_call("c3", "get_client_contracts", client_name="Gamma"),
+        )
+
+        start = time.perf_counter()
+        result = await tool_executor_node(state)
+        elapsed = time.perf_counter() - start
+
+        assert [m["tool_call_id"] for m in result["messages"]] == ["c1", "c2", "c3"]
+        assert [m["content"] for m in result["messages"]] == [
+            "get_client_contracts Acme", "get_client_contracts Beta", "get_client_contracts Gamma"
+        ]
+        assert recorder.peak == 3
+        # Sequential execution would take 3 x 50ms
+        assert elapsed < 0.12
+
+    @pytest.mark.asyncio
+    async def test_writes_are_barriers(self, recorder):
+        """A write waits for earlier reads; later reads wait for the write"""
+        state = _state(
+            _tool_call("c1", "get_client_contracts", client_name="Acme"),
+            _tool_call("c2", "get_all_contracts"),
+            _tool_call("c3", "update_client", client_name="Acme Corp", notes="VIP"),
+            _tool_call("c4", "get_client_contracts", client_name="Beta"),
+        )
+
+        result = await tool_executor_node(state)
+
+        assert [m["tool_call_id"] for m in result["messages"]] == ["c1", "c2", "c3", "c4"]
+        assert recorder.index("start", "Acme Corp") > recorder.index("end", "Acme")
+        assert recorder.index("start", "Acme Corp") > recorder.index("end", "get_all_contracts")
+        assert recorder.index("start", "Beta") > recorder.index("end", "Acme Corp")
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, recorder):
+        state = _state(*[
+            _tool_call(f"c{i}", "get_client_contracts", client_name=f"Client {i}") for i in range(6)
+        ])
+
+        with patch.object(tools, "READ_TOOL_CONCURRENCY", 2):
+            result = await tool_executor_node(state)
+
+        assert len(result["messages"]) == 6
+        assert recorder.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_read_times_out_without_blocking_others(self, recorder):
+        state = _state(
+            _tool_call("c1", "search_employees", search_term="Ann"),
+            _tool_call("c2", "get_all_contracts"),
+        )
+
+        with patch.dict(tools.READ_TOOL_TIMEOUTS, {"search_employees": 0.1}):
+            result = await tool_executor_node(state)
+
+        timed_out, ok = result["messages"]
+        assert "timed out" in json.loads(timed_out["content"])["error"]
+        assert ok["content"] == "get_all_contracts get_all_contracts"
+
+    @pytest.mark.asyncio
+    async def test_update_all_dedupe_still_applies(self, recorder):
+        state = _state(
+            _tool_call("c1", "update_contract", client_name="Acme", update_all=True, updates={}),
+            _tool_call("c2", "update_contract", client_name="Acme", contract_id=7, updates={}),
+            _tool_call("c3", "update_contract", client_name="Acme", contract_id=8, updates={}),
+            user_operation="update_contract",
+        )
+
+        with patch.object(tools, "_is_long_running_tool", return_value=False):
+            result = await tool_executor_node(state)
+
+        assert [m["tool_call_id"] for m in result["messages"]] == ["c1"]
+        assert [event for event in recorder.events if event[0] == "start"] == [("start", "Acme")]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_state_updates_apply_in_call_order(self):
+        """The later call's workflow and cursor win even when the earlier call finishes last"""
+        recorder = _Recorder()
+        registry = {
+            "get_all_contracts": recorder.tool("get_all_contracts", delay=0.1,
+                                               data={"current_workflow": "contracts", "cursor": "contracts-2"}),
+            "get_all_clients": recorder.tool("get_all_clients", delay=0.01,
+                                             data={"current_workflow": "clients", "cursor": "clients-2"}),
+        }
+        state = _state(_tool_call("c1", "get_all_contracts"), _tool_call("c2", "get_all_clients"))
+        state["current_agent"] = "client_agent"
+        state["data"]["result_cursor"] = "stale"
+
+        with patch.dict(tools.TOOL_REGISTRY, registry):
+            await tool_executor_node(state)
+
+        assert recorder.index("end", "get_all_clients") < recorder.index("end", "get_all_contracts")
+        assert state["data"]["current_workflow"] == "clients"
+        assert state["data"]["result_cursor"] == "clients-2"
+        assert state["data"]["result_cursor_agent"] == "client_agent"
@@ -0,0 +1,92 @@
+"""
+Test the prefix-stable agent prompt layout and cached-token accounting.
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.aiagents.graph.nodes import EnhancedAgentNodeExecutor
+from src.aiagents.orchestration import dynamic_prompts
+from src.aiagents.orchestration.dynamic_prompts import DynamicPromptGenerator, PromptTemplate
+from src.aiagents.services.llm_client import LLMClient, FakeLLMBackend
+
+
+def _state(user_id: str, session_id: str, message: str, **data):
+    return {
+        "messages": [{"role": "user", "content": message}],
+        "data": {"original_user_request": message, **data},
+        "context": {"user_id": user_id, "session_id": session_id},
+        "memory": {"context_summary": f"Earlier {user_id} asked about invoices"},
+    }
+
+
+REQUESTS = [
+    _state("u1", "s1", "update the Acme contract", current_client="Acme Corp", user_operation="update_contract"),
+    _state("u2", "s2", "delete contract 12 for Globex", current_client="Globex", current_contract_id="12",
+           user_operation="delete_contract", tool_execution_count=1),
+]
+
+
+class TestPromptLayout:
+    """Test suite for the static prefix / dynamic suffix split"""
+
+    @pytest.fixture
+    def generator(self):
+        return DynamicPromptGenerator()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("agent_type", list(PromptTemplate))
+    async def test_prefix_is_identical_across_requests(self, generator, agent_type):
+        prefix = generator.get_static_prefix(agent_type)
+        prompts = [await generator.generate_agent_instructions(agent_type, state) for state in REQUESTS]
+
+        for prompt in prompts:
+            assert prompt.startswith(prefix + "\n\n")
+        # Nothing request-specific leaks into the prefix
+        for value in ("Acme Corp", "Globex", "u1", "u2", "invoices", datetime.now().strftime("%Y-%m-%d")):
+            assert value not in prefix
+        assert prompts[0][len(prefix):] != prompts[1][len(prefix):]
+
+    def test_prefix_is_byte_stable_across_processes_and_days(self, generator):
+        class NextYear(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2031, 1, 1, 9, 30)
+
+        with patch.object(dynamic_prompts, "datetime", NextYear):
+            later = DynamicPromptGenerator()
+
+        for agent_type in PromptTemplate:
+            assert later.get_static_prefix(agent_type).encode() == generator.get_static_prefix(agent_type).encode()
+
+    @pytest.mark.asyncio
+    async def test_system_message_keeps_prefix_with_file_and_summary(self, generator):
+        executor = EnhancedAgentNodeExecutor()
+        prefix = generator.get_static_prefix(PromptTemplate.CONTRACT_AGENT)
+        state = _state("u1", "s1", "upload this SOW for Acme", current_client="Acme Corp")
+        state["context"]["file_info"] = {"filename": "sow.pdf", "file_size": 1200, "mime_type": "application/pdf"}
+
+        prompt = await generator.generate_agent_instructions(PromptTemplate.CONTRACT_AGENT, state)
+        messages = await executor._prepare_messages_optimized(state, prompt)
+
+        assert messages[0]["role"] == "system"
+        assert messages[0]["content"].startswith(prefix)
+        assert "sow.pdf" in messages[0]["content"][len(prefix):]
+
+    @pytest.mark.asyncio
+    async def test_cached_token_ratio_from_usage(self, generator):
+        client = LLMClient(backend=FakeLLMBackend(prompt_cache=True))
+        executor = EnhancedAgentNodeExecutor()
+
+        for state in REQUESTS:
+            prompt = await generator.generate_agent_instructions(PromptTemplate.CONTRACT_AGENT, state)
+            messages = await executor._prepare_messages_optimized(state, prompt)
+            await client.chat_completion(model="fake", messages=messages, usage_tag="contract_agent")
+
+        stats = client.get_stats()
+        contract = stats["usage_by_tag"]["contract_agent"]
+        # The second request reuses the whole static prefix
+        assert contract["cached_prompt_tokens"] > 0
+        assert stats["cached_token_ratio"] == contract["cached_token_ratio"] > 0.4
+        assert generator.get_stats()["static_prefix_ratio"] > 0.8
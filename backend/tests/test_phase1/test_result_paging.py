@@ -0,0 +1,252 @@
+"""
+Test cursor paging of large listing results: capped rendering, cached snapshots and "show more".
+"""
+
+import json
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from sqlalchemy.dialects import postgresql
+
+from src.aiagents.graph.dispatch_rules import DispatchEngine
+from src.aiagents.graph.router import intelligent_router, master_router_node
+from src.aiagents.graph.tools import tool_executor_node
+from src.aiagents.tools import contract_tools
+from src.aiagents.tools.contract_tools import SearchContractsParams, get_all_contracts_tool, search_contracts_tool
+from src.aiagents.tools.result_paging import (
+    ListRenderer, decode_cursor, encode_cursor, is_show_more_request, result_pager, show_more_results
+)
+
+
+def _contracts(count: int):
+    return [
+        SimpleNamespace(
+            contract_id=i, client=SimpleNamespace(client_name=f"Client {i % 7}"), contract_type="Fixed",
+            status="active", billing_frequency="monthly", original_amount=1000 + i, start_date=None, end_date=None,
+            billing_prompt_next_date=None, document_filename=None, document_file_size=None,
+            document_uploaded_at=None, created_at=datetime(2024, 1, 1),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+    def scalar(self):
+        return self._rows[0]
+
+
+class _FakeDatabase:
+    """Answers the contract listing statements from in-memory rows and records each query"""
+
+    def __init__(self, count: int):
+        self.contracts = _contracts(count)
+        self.queries = []
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class _Session:
+            async def execute(self, statement):
+                compiled = statement.compile(dialect=postgresql.dialect())
+                sql = " ".join(str(compiled).split())
+                database.queries.append(sql)
+                if sql.startswith("SELECT count(*)"):
+                    return _Result([0])
+                assert "count(*) OVER ()" in sql and "LIMIT" in sql, sql
+                limit = compiled.params["param_1"]
+                return _Result([(c, len(database.contracts)) for c in database.contracts[:limit]])
+
+        yield _Session()
+
+
+@pytest.fixture
+def database():
+    patches = []
+
+    def build(count: int):
+        db = _FakeDatabase(count)
+        patches.append(patch.object(contract_tools, "get_ai_db", db.session))
+        patches[-1].start()
+        return db
+
+    yield build
+    for p in reversed(patches):
+        p.stop()
+
+
+class TestListRenderer:
+    """Test suite for the capped list renderer"""
+
+    def test_item_and_character_caps(self):
+        items = [f"item {i}" for i in range(100)]
+        render_item = lambda number, item: f"{number}. {item}"
+
+        by_items = ListRenderer(max_items=5, max_chars=10_000).render(items, render_item)
+        assert by_items.rendered == 5
+        assert by_items.text.splitlines()[-1] == "5. item 4"
+
+        by_chars = ListRenderer(max_items=100, max_chars=40).render(items, render_item, start=11)
+        assert by_chars.rendered == 3
+        assert by_chars.text.startswith("11. item 0")
+
+        # An item larger than the cap still makes progress
+        assert ListRenderer(max_items=10, max_chars=5).render(items, render_item).rendered == 1
+
+    def test_cursor_is_opaque_and_validated(self):
+        cursor = encode_cursor("tok_123", 40)
+        assert "tok_123" not in cursor
+        assert decode_cursor(cursor) == ("tok_123", 40)
+        assert decode_cursor("not a cursor!") is None
+
+
+class TestResultPaging:
+    """Test suite for paged listing tools"""
+
+    @pytest.mark.asyncio
+    async def test_pages_resume_from_snapshot_without_queries(self, database):
+        db = database(45)
+        first = await get_all_contracts_tool()
+
+        assert first.success
+        assert len(db.queries) == 1
+        assert first.data["count"] == 20 and first.data["total"] == 45
+        assert first.data["contracts"][0]["contract_id"] == 1
+        assert "_Showing 1–20 of 45 contracts._" in first.message
+        assert "**21." not in first.message
+
+        seen = [c["contract_id"] for c in first.data["contracts"]]
+        cursor = first.data["cursor"]
+        while cursor:
+            page = await show_more_results(cursor)
+            assert page["success"]
+            seen += [c["contract_id"] for c in page["data"]["contracts"]]
+            cursor = page["data"]["cursor"]
+
+        assert seen == list(range(1, 46))
+        assert "**41. Contract ID 41**" in page["message"]
+        assert "_Showing 41–45 of 45 contracts._" in page["message"]
+        assert "show more" not in page["message"]
+        # Later pages came from the cached snapshot
+        assert len(db.queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_search_snapshot_is_bounded(self, database):
+        db = database(300)
+        with patch.object(contract_tools, "RESULT_SNAPSHOT_LIMIT", 30):
+            result = await search_contracts_tool(SearchContractsParams(status="active"), {})
+        assert "LIMIT" in db.queries[0]
+        assert result.data["total"] == 300
+
+        last = await show_more_results(result.data["cursor"])
+        assert last["data"]["cursor"] is None
+        assert "_...and 270 more contracts not shown; narrow the request to see them._" in last["message"]
+
+    @pytest.mark.asyncio
+    async def test_small_results_have_no_cursor(self, database):
+        database(3)
+        snapshots = result_pager.get_stats()["snapshots"]
+        result = await get_all_contracts_tool()
+
+        assert result.data["cursor"] is None and result.data["count"] == 3
+        assert "Showing" not in result.message
+        assert result_pager.get_stats()["snapshots"] == snapshots
+
+    @pytest.mark.asyncio
+    async def test_unknown_cursor_is_reported(self):
+        result = await show_more_results(encode_cursor("expired", 20))
+        assert not result["success"]
+        assert "no longer available" in result["message"]
+
+
+class TestShowMoreDispatch:
+    """Test suite for resuming a listing from the conversation"""
+
+    @pytest.mark.asyncio
+    async def test_show_more_continues_previous_listing(self, database):
+        database(45)
+        state = {
+            "messages": [
+                {"role": "user", "content": "show all contracts"},
+                {"role": "assistant", "content": "", "tool_calls": [
+                    {"id": "c1", "type": "function", "function": {"name": "get_all_contracts", "arguments": "{}"}}
+                ]},
+            ],
+            "data": {"current_agent": "contract_agent"},
+            "context": {"user_id": "u1", "session_id": "s1"},
+        }
+        await tool_executor_node(state)
+        assert state["data"]["result_cursor"]
+        assert state["data"]["result_cursor_agent"] == "contract_agent"
+
+        engine = DispatchEngine(enabled=True)
+        state["messages"].append({"role": "user", "content": "Show more"})
+        assert engine.route("Show more", state["data"]) == "contract_agent"
+        dispatch = engine.match(state, "contract_agent")
+        assert dispatch.rule.name == "show_more_results"
+        assert dispatch.arguments == {"cursor": state["data"]["result_cursor"]}
+
+        state["messages"].append(dispatch.to_message())
+        result = await tool_executor_node(state)
+        content = result["messages"][0]["content"]
+        assert "**21. Contract ID 21**" in content
+        assert "_Showing 21–40 of 45 contracts._" in content
+
+        # The last page clears the cursor, so "show more" goes back to normal handling
+        state["messages"] += [*result["messages"], {"role": "user", "content": "next page"}]
+        state["messages"].append(engine.match(state, "contract_agent").to_message())
+        await tool_executor_node(state)
+        assert "result_cursor" not in state["data"]
+        assert engine.match(state, "contract_agent") is None
+
+    def test_show_more_needs_a_cursor(self):
+        engine = DispatchEngine(enabled=True)
+        state = {"messages": [{"role": "user", "content": "next page"}], "data": {}, "context": {}}
+        assert engine.match(state, "client_agent") is None
+        assert engine.route("next page", {}) is None
+        assert json.loads(json.dumps(engine.get_stats()))["rules"]["show_more_results"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_other_turns_and_tools_drop_the_cursor(self, database):
+        database(45)
+        engine = DispatchEngine(enabled=True)
+        cursor = encode_cursor("snapshot", 20)
+        state = {
+            "messages": [{"role": "user", "content": "continue"}],
+            "data": {"current_agent": "contract_agent", "result_cursor": cursor, "result_cursor_agent": "contract_agent"},
+            "context": {},
+        }
+        # "continue" answers confirmations, it never resumes a listing
+        for message in ("continue", "more", "continue with the delete"):
+            assert not is_show_more_request(message)
+            assert engine.route(message, state["data"]) is None
+        assert engine.match(state, "contract_agent") is None
+
+        routing = {"function": "route_to_agent", "arguments": {"agent_name": "contract_agent", "reasoning": "test"}}
+        with patch.object(intelligent_router, "call_llm_for_routing", AsyncMock(return_value=routing)), \
+                patch("src.aiagents.graph.router.context_prefetcher.start"):
+            await master_router_node(state)
+        assert "result_cursor" not in state["data"]
+        assert "result_cursor_agent" not in state["data"]
+
+        state["data"].update(result_cursor=cursor, result_cursor_agent="contract_agent")
+        state["messages"] = [
+            {"role": "user", "content": "show me more"},
+            {"role": "assistant", "content": "", "tool_calls": [
+                {"id": "c1", "type": "function", "function": {"name": "search_contracts", "arguments": '{"client_name": "Client 1"}'}}
+            ]},
+        ]
+        with patch.object(intelligent_router, "call_llm_for_routing", AsyncMock(return_value=routing)), \
+                patch("src.aiagents.graph.router.context_prefetcher.start"):
+            await master_router_node(state)
+        assert state["data"]["result_cursor"] == cursor
+        await tool_executor_node(state)
+        assert "result_cursor" not in state["data"]
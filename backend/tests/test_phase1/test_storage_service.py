@@ -0,0 +1,183 @@
+"""
+Test the shared storage service: signed-URL cache, batch signing and non-blocking I/O.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+from src.services import storage_service
+from src.services.storage_service import (
+    CONTRACT_DOCUMENTS_BUCKET,
+    SignedUrlCache,
+    SupabaseStorageService,
+    get_storage_service,
+)
+
+SIGN_LATENCY_SECONDS = 0.005
+
+
+class _FakeBucket:
+    """Storage bucket whose requests take SIGN_LATENCY_SECONDS each, like the blocking SDK"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.sign_calls = 0
+        self.batch_calls = 0
+        self.threads = []
+
+    def create_signed_url(self, path, expires_in):
+        self.sign_calls += 1
+        time.sleep(SIGN_LATENCY_SECONDS)
+        return {"signedURL": f"https://signed/{self.name}/{path}?v={self.sign_calls}"}
+
+    def create_signed_urls(self, paths, expires_in):
+        self.batch_calls += 1
+        self.threads.append(threading.current_thread())
+        time.sleep(SIGN_LATENCY_SECONDS)
+        return [{"path": path, "signedURL": f"https://signed/{self.name}/{path}", "error": None} for path in paths]
+
+    def remove(self, paths):
+        self.threads.append(threading.current_thread())
+        return [{"name": path} for path in paths]
+
+
+@pytest.fixture
+def service():
+    buckets = {}
+
+    def from_(name):
+        return buckets.setdefault(name, _FakeBucket(name))
+
+    with patch.dict(os.environ, {"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_SERVICE_KEY": "key"}), \
+         patch.object(storage_service, "create_client") as create_client, \
+         patch.object(storage_service, "_storage_service", None):
+        create_client.return_value.storage.from_.side_effect = from_
+        service = get_storage_service()
+        service.buckets = buckets
+        service.create_client = create_client
+        yield service
+
+
+def _paths(count: int):
+    return [f"contracts/{i}/contract_{i}.pdf" for i in range(count)]
+
+
+class TestStorageService:
+    """Test suite for the shared, cached storage service"""
+
+    def test_service_is_shared(self, service):
+        assert get_storage_service() is service
+        assert service.create_client.call_count == 1
+
+    def test_signed_url_cached_and_refreshed_before_expiry(self, service):
+        with patch.object(storage_service.time, "time", return_value=1000.0):
+            first = service.get_contract_document_url("contracts/1/a.pdf")
+            assert service.get_contract_document_url("contracts/1/a.pdf") == first
+        bucket = service.buckets[CONTRACT_DOCUMENTS_BUCKET]
+        assert bucket.sign_calls == 1
+
+        # Still valid for another 4 minutes, but inside the refresh margin
+        with patch.object(storage_service.time, "time", return_value=1000.0 + 3600 - 240):
+            refreshed = service.get_contract_document_url("contracts/1/a.pdf")
+        assert refreshed != first
+        assert bucket.sign_calls == 2
+        assert service.url_cache.get_stats()["refreshes"] == 1
+
+    def test_short_lived_urls_refresh_halfway(self):
+        cache = SignedUrlCache(refresh_margin=300)
+        cache.put("b", "p", 60, "https://signed", signed_at=1000.0)
+        with patch.object(storage_service.time, "time", return_value=1029.0):
+            assert cache.get("b", "p", 60) == "https://signed"
+        with patch.object(storage_service.time, "time", return_value=1031.0):
+            assert cache.get("b", "p", 60) is None
+
+    def test_cache_is_bounded(self):
+        cache = SignedUrlCache(max_size=2)
+        for path in ("a", "b", "c"):
+            cache.put("bucket", path, 3600, f"https://signed/{path}")
+        assert cache.get("bucket", "a", 3600) is None
+        assert cache.get("bucket", "c", 3600) == "https://signed/c"
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_signs_only_uncached_paths_off_the_loop(self, service):
+        paths = _paths(10)
+        service.get_contract_document_url(paths[0])
+        urls = await service.create_signed_urls(CONTRACT_DOCUMENTS_BUCKET, paths + [paths[1], None])
+
+        bucket = service.buckets[CONTRACT_DOCUMENTS_BUCKET]
+        assert list(urls) == paths
+        assert bucket.batch_calls == 1
+        assert bucket.threads[0] is not threading.main_thread()
+        # Fully cached pages need no request at all
+        assert await service.create_signed_urls(CONTRACT_DOCUMENTS_BUCKET, paths) == urls
+        assert bucket.batch_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_cached_url(self, service):
+        path = "contracts/7/contract_7.pdf"
+        first = await service.create_signed_url(CONTRACT_DOCUMENTS_BUCKET, path)
+        assert await service.delete_contract_document(path)
+        assert service.buckets[CONTRACT_DOCUMENTS_BUCKET].threads[-1] is not threading.main_thread()
+        assert await service.create_signed_url(CONTRACT_DOCUMENTS_BUCKET, path) != first
+
+    @pytest.mark.asyncio
+    async def test_upload_does_not_block_event_loop(self):
+        ticks = []
+
+        def slow_upload(path, file, file_options):
+            time.sleep(0.1)
+            return Mock(path=path)
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        with patch.dict(os.environ, {"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_SERVICE_KEY": "key"}), \
+             patch.object(storage_service, "create_client") as create_client:
+            create_client.return_value.storage.from_.return_value.upload.side_effect = slow_upload
+            service = SupabaseStorageService()
+            upload = MagicMock(filename="contract.pdf", file_path=None, content_type="application/pdf")
+            upload.read.return_value = b"%PDF"
+            started = time.perf_counter()
+            result, _ = await asyncio.gather(service.upload_contract_document(upload, 42), ticker())
+
+        assert result["success"]
+        # The loop kept running while the SDK call was in flight
+        assert len(ticks) == 5 and ticks[-1] - started < 0.1
+
+
+class TestStorageBenchmark:
+    """Benchmark signing the links of a 100-document listing"""
+
+    @pytest.mark.asyncio
+    async def test_hundred_document_listing(self, service):
+        paths = _paths(100)
+        bucket = service.supabase.storage.from_(CONTRACT_DOCUMENTS_BUCKET)
+
+        # Previous behaviour: one signing request per listed document
+        started = time.perf_counter()
+        for path in paths:
+            service.get_contract_document_url(f"legacy/{path}")
+        per_document = time.perf_counter() - started
+
+        started = time.perf_counter()
+        cold = await service.create_signed_urls(CONTRACT_DOCUMENTS_BUCKET, paths)
+        batch = time.perf_counter() - started
+
+        started = time.perf_counter()
+        warm = await service.create_signed_urls(CONTRACT_DOCUMENTS_BUCKET, paths)
+        cached = time.perf_counter() - started
+
+        print(f"\n100-document listing: per-document {per_document * 1000:.1f}ms "
+              f"({bucket.sign_calls} requests), batch {batch * 1000:.1f}ms ({bucket.batch_calls} request), "
+              f"cached {cached * 1000:.2f}ms (0 requests)")
+        assert len(cold) == len(warm) == 100
+        assert bucket.sign_calls == 100 and bucket.batch_calls == 1
+        assert batch < per_document / 10
+        assert cached < batch
@@ -0,0 +1,136 @@
+"""
+Test structured logging: lazy formatting, request correlation and overhead.
+"""
+
+import io
+import json
+import time
+import logging
+import pytest
+from types import SimpleNamespace
+
+from src.services.logging_service import (
+    get_logger, configure_logging, shutdown_logging, request_context, bind_session, JsonFormatter,
+    request_logging_middleware, REQUEST_DEBUG_HEADER
+)
+
+
+class ExpensiveState:
+    """Stand-in for a large conversation state that counts how often it is rendered"""
+
+    def __init__(self):
+        self.renders = 0
+
+    def __str__(self):
+        self.renders += 1
+        return "state " + "x" * 10_000
+
+
+class TestStructuredLogging:
+    """Test suite for the logging service"""
+
+    @pytest.fixture
+    def stream(self):
+        """Configure queue-backed logging at INFO into a buffer"""
+        buffer = io.StringIO()
+        configure_logging(level="INFO", fmt="text", stream=buffer)
+        yield buffer
+        shutdown_logging()
+        logging.getLogger("src").propagate = True
+
+    def test_debug_arguments_not_rendered_when_disabled(self, stream):
+        """Disabled debug calls never format their arguments"""
+        logger = get_logger("src.tests.lazy")
+        state = ExpensiveState()
+
+        logger.debug("state dump: %s", state)
+        shutdown_logging()
+
+        assert state.renders == 0
+        assert stream.getvalue() == ""
+
+    def test_records_carry_request_and_session_ids(self, stream):
+        """Every record emitted in a request is tagged with its ids"""
+        logger = get_logger("src.tests.correlation")
+
+        with request_context(request_id="req-123"):
+            bind_session("session-9")
+            logger.info("turn finished in %.1fms", 12.34)
+        shutdown_logging()
+
+        output = stream.getvalue()
+        assert "[req-123]" in output
+        assert "turn finished in 12.3ms" in output
+        assert "src.tests.correlation" in output
+
+    def test_per_request_debug_switch(self, stream):
+        """Debug output is enabled for one request without changing the global level"""
+        logger = get_logger("src.tests.switch")
+
+        with request_context(request_id="debug-req", debug=True):
+            assert logger.debug_enabled
+            logger.debug("visible %s", 1)
+        with request_context(request_id="normal-req"):
+            assert not logger.debug_enabled
+            logger.debug("hidden %s", 2)
+        shutdown_logging()
+
+        output = stream.getvalue()
+        assert "visible 1" in output
+        assert "hidden 2" not in output
+
+    @pytest.mark.asyncio
+    async def test_debug_header_ignored_unless_allowed(self, monkeypatch):
+        """Clients can only switch on debug output when the deployment allows it"""
+        logger = get_logger("src.tests.header")
+        seen = []
+
+        async def call_next(request):
+            seen.append(logger.debug_enabled)
+            return SimpleNamespace(headers={})
+
+        request = SimpleNamespace(headers={REQUEST_DEBUG_HEADER: "true"})
+        monkeypatch.delenv("LOG_ALLOW_REQUEST_DEBUG", raising=False)
+        await request_logging_middleware(request, call_next)
+        monkeypatch.setenv("LOG_ALLOW_REQUEST_DEBUG", "true")
+        await request_logging_middleware(request, call_next)
+
+        assert seen == [False, True]
+
+    def test_json_formatter(self):
+        """JSON output has one parseable object per record"""
+        record = logging.LogRecord("src.tests.json", logging.WARNING, __file__, 1, "value=%s", (5,), None)
+        record.request_id = "r1"
+        record.session_id = "s1"
+
+        payload = json.loads(JsonFormatter().format(record))
+
+        assert payload["level"] == "WARNING"
+        assert payload["message"] == "value=5"
+        assert payload["request_id"] == "r1"
+
+    def test_disabled_debug_overhead_per_request(self, stream):
+        """A request's worth of disabled debug calls costs far less than printing them"""
+        logger = get_logger("src.tests.bench")
+        state = ExpensiveState()
+        calls_per_request = 500
+        requests = 20
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            with request_context():
+                for i in range(calls_per_request):
+                    logger.debug("🔍 DEBUG: message %s state %s", i, state)
+        logging_ms = (time.perf_counter() - start) * 1000 / requests
+
+        sink = io.StringIO()
+        start = time.perf_counter()
+        for _ in range(requests):
+            for i in range(calls_per_request):
+                print(f"🔍 DEBUG: message {i} state {state}", file=sink)
+        print_ms = (time.perf_counter() - start) * 1000 / requests
+
+        print(f"\nPer-request overhead with debug off: {logging_ms:.3f}ms (f-string prints: {print_ms:.3f}ms)")
+        assert state.renders == calls_per_request * requests  # only the print loop rendered
+        assert logging_ms < 5
+        assert logging_ms * 10 < print_ms
@@ -0,0 +1,343 @@
+"""
+Test the async time and deliverable tools: set-based statements, graph registration and concurrent load.
+"""
+
+import time
+import asyncio
+import inspect
+import pytest
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy.dialects import postgresql
+
+from src.aiagents.deliverable_agent import DeliverableAgent
+from src.aiagents.graph.tools import READ_ONLY_TOOLS, TOOL_REGISTRY
+from src.aiagents.time_agent import TimeTrackerAgent
+from src.aiagents.tools import deliverable_tools
+from src.aiagents.tools.deliverable_tools import (
+    SmartDeliverableParams,
+    get_deliverables_by_client_tool,
+    get_deliverables_by_contract_tool,
+    search_deliverables_tool,
+    smart_create_deliverable_tool,
+)
+from src.aiagents.tools.time_tools import (
+    SmartTimeEntryParams,
+    get_timesheet_tool,
+    smart_create_time_entry_tool,
+    timesheet_period,
+)
+
+QUERY_LATENCY_SECONDS = 0.005
+
+ClientMatch = namedtuple("ClientMatch", "client contract_count deliverable_count")
+ClientProjects = namedtuple("ClientProjects", "client_name industry project_count project_names")
+SearchRow = namedtuple(
+    "SearchRow",
+    "deliverable_id name description contract_id client_id client_name status due_date billing_basis",
+)
+
+
+def _client(client_id: int, name: str, industry=None):
+    return SimpleNamespace(client_id=client_id, client_name=name, industry=industry)
+
+
+def _contract(contract_id: int, client_id: int, status="active"):
+    return SimpleNamespace(contract_id=contract_id, client_id=client_id, status=status, contract_type="Fixed")
+
+
+def _deliverable(deliverable_id: int, contract_id: int, name: str):
+    return SimpleNamespace(
+        deliverable_id=deliverable_id, contract_id=contract_id, name=name, description=None, status="Not Started",
+        billing_basis="Fixed", due_date=date(2025, 3, 1), assigned_employees=1, billing_amount=Decimal("500"),
+    )
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def one(self):
+        assert len(self._rows) == 1
+        return self._rows[0]
+
+    def scalar_one(self):
+        row = self.one()
+        return row[0] if isinstance(row, tuple) else row
+
+    def scalars(self):
+        return _Result([row[0] if isinstance(row, tuple) else row for row in self._rows])
+
+
+class _FakeDatabase:
+    """Answers statements through ``handler(sql, params)``, awaiting a round trip each and recording them"""
+
+    def __init__(self, handler, latency: float = 0.0):
+        self.handler = handler
+        self.latency = latency
+        self.queries = []
+        self.commits = 0
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class _Session:
+            async def execute(self, statement):
+                compiled = statement.compile(dialect=postgresql.dialect())
+                sql = " ".join(str(compiled).split())
+                database.queries.append(sql)
+                if database.latency:
+                    await asyncio.sleep(database.latency)
+                return _Result(database.handler(sql, compiled.params))
+
+            async def commit(self):
+                database.commits += 1
+
+        yield _Session()
+
+
+@pytest.fixture
+def database():
+    patches = []
+
+    def build(handler, latency: float = 0.0):
+        db = _FakeDatabase(handler, latency)
+        patches.append(patch.object(deliverable_tools, "get_ai_db", db.session))
+        patches[-1].start()
+        return db
+
+    yield build
+    for p in reversed(patches):
+        p.stop()
+
+
+def _workload_handler(sql, params):
+    """Rows for the time_agent / deliverable_agent workload used by the load benchmark"""
+    if sql.startswith("SELECT count(time_entries.time_entry_id)"):
+        return [(3, Decimal("12.5"), Decimal("10"))]
+    if sql.startswith("SELECT deliverables.deliverable_id") and "JOIN clients" in sql:
+        return [(_deliverable(7, 11, "Website"), 2, "Fixed", "Solana Inc")]
+    if sql.startswith("INSERT INTO time_entries"):
+        return [(101,)]
+    if sql.startswith("SELECT clients.client_id"):
+        return [ClientMatch(_client(2, "Solana Inc"), 1, 3)]
+    if sql.startswith("SELECT deliverables.deliverable_id"):
+        return [(_deliverable(i, 11, f"Phase {i}"), "Fixed") for i in range(1, 4)]
+    raise AssertionError(sql)
+
+
+class TestTimeTools:
+    """Test suite for the async time tools"""
+
+    @pytest.mark.asyncio
+    async def test_timesheet_is_one_aggregate(self, database):
+        db = database(_workload_handler)
+        result = await get_timesheet_tool(4, date(2025, 1, 6), date(2025, 1, 12))
+
+        assert result.success
+        assert result.data == {"entries": 3, "total_hours": 12.5, "billable_hours": 10.0,
+                               "period": "2025-01-06 to 2025-01-12"}
+        assert len(db.queries) == 1
+        assert "sum(time_entries.hours_worked) FILTER (WHERE time_entries.billable IS true)" in db.queries[0]
+
+    def test_timesheet_period_defaults_to_current_week(self):
+        start, end = timesheet_period()
+        assert start.weekday() == 0 and (end - start).days == 6
+        assert timesheet_period("2025-01-06", None)[0] == date(2025, 1, 6)
+
+    @pytest.mark.asyncio
+    async def test_log_time_resolves_project_and_inserts_in_two_statements(self, database):
+        db = database(_workload_handler)
+        params = SmartTimeEntryParams(project_name="Solana website", hours_worked=Decimal("3"),
+                                      description_of_work="Design review", date="2025-01-07")
+        result = await smart_create_time_entry_tool(params, {"user_id": "u1"})
+
+        assert result.success
+        assert result.data["time_entry_id"] == 101
+        assert result.data["client_name"] == "Solana Inc" and result.data["project_name"] == "Website"
+        assert len(db.queries) == 2
+        lookup, insert = db.queries
+        assert "JOIN clients" in lookup and "LIMIT" in lookup
+        assert insert.startswith("INSERT INTO time_entries") and "RETURNING time_entries.time_entry_id" in insert
+        assert db.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_project_lists_clients_in_one_query(self, database):
+        def handler(sql, params):
+            if sql.startswith("SELECT deliverables."):
+                return []
+            assert "GROUP BY clients.client_id" in sql and "array_agg(deliverables.name)" in sql
+            return [ClientProjects("Solana Inc", "Crypto", 2, ["Website", "Audit"]),
+                    ClientProjects("Solana Labs", None, 0, None)]
+
+        db = database(handler)
+        params = SmartTimeEntryParams(project_name="Solana", hours_worked=Decimal("2"), description_of_work="x")
+        result = await smart_create_time_entry_tool(params)
+
+        assert not result.success
+        assert "1. **Solana Inc** (Industry: Crypto) - 2 active project(s)" in result.message
+        assert "2. **Solana Labs** - No active projects" in result.message
+        # No per-client deliverable queries
+        assert len(db.queries) == 2
+
+    @pytest.mark.asyncio
+    async def test_long_entries_need_confirmation_without_queries(self, database):
+        db = database(_workload_handler)
+        params = SmartTimeEntryParams(project_name="Website", hours_worked=Decimal("17"), description_of_work="x")
+        result = await smart_create_time_entry_tool(params)
+
+        assert result.requires_confirmation
+        assert db.queries == []
+
+
+class TestDeliverableTools:
+    """Test suite for the async deliverable tools"""
+
+    @pytest.mark.asyncio
+    async def test_client_deliverables_match_and_list_in_two_queries(self, database):
+        db = database(_workload_handler)
+        result = await get_deliverables_by_client_tool("solana inc")
+
+        assert result.success
+        assert result.data["count"] == 3
+        assert result.data["deliverables"][0]["contract_type"] == "Fixed"
+        assert len(db.queries) == 2
+        match = db.queries[0]
+        assert "count(DISTINCT deliverables.deliverable_id)" in match and "GROUP BY clients.client_id" in match
+
+    @pytest.mark.asyncio
+    async def test_exact_client_name_wins_over_partial_matches(self, database):
+        def handler(sql, params):
+            if sql.startswith("SELECT clients.client_id"):
+                return [ClientMatch(_client(1, "Acme"), 2, 0), ClientMatch(_client(2, "Acme Holdings", "Retail"), 1, 4)]
+            return []
+
+        db = database(handler)
+        exact = await get_deliverables_by_client_tool("ACME")
+        assert exact.success and exact.data["client_name"] == "Acme"
+
+        partial = await get_deliverables_by_client_tool("Acme Hold")
+        assert not partial.success
+        assert "2. **Acme Holdings** (Industry: Retail) - 4 deliverable(s)" in partial.message
+        assert len(db.queries) == 3
+
+    @pytest.mark.asyncio
+    async def test_create_deliverable_uses_latest_open_contract(self, database):
+        def handler(sql, params):
+            if sql.startswith("SELECT clients.client_id"):
+                return [ClientMatch(_client(2, "Solana Inc"), 2, 0)]
+            if sql.startswith("SELECT contracts."):
+                assert "ORDER BY CASE WHEN (contracts.status IN" in sql and "LIMIT" in sql
+                return [(_contract(11, 2),)]
+            assert sql.startswith("INSERT INTO deliverables") and "RETURNING" in sql
+            assert params["client_name"] == "Solana Inc" and params["created_by"] == "u1"
+            return [(_deliverable(9, 11, params["name"]),)]
+
+        db = database(handler)
+        params = SmartDeliverableParams(client_name="Solana", deliverable_name="Audit", due_date="2025-03-01")
+        result = await smart_create_deliverable_tool(params, {"user_id": "u1"})
+
+        assert result.success
+        assert result.data["deliverable_id"] == 9 and result.data["contract_id"] == 11
+        assert len(db.queries) == 3 and db.commits == 1
+
+        closed = database(lambda sql, params: [ClientMatch(_client(2, "Solana Inc"), 1, 0)]
+                          if sql.startswith("SELECT clients.") else [(_contract(11, 2, status="terminated"),)])
+        result = await smart_create_deliverable_tool(params, {"user_id": "u1"})
+        assert "has contracts but none are active" in result.message
+        assert not any(q.startswith("INSERT") for q in closed.queries)
+
+    @pytest.mark.asyncio
+    async def test_contract_deliverables_and_search(self, database):
+        def handler(sql, params):
+            if sql.startswith("SELECT contracts."):
+                return [(_contract(11, 2), "Solana Inc")]
+            if "clients.client_name ILIKE" in sql:
+                assert "LIMIT" in sql
+                return [SearchRow(7, "Website", None, 11, 2, "Solana Inc", "Active", date(2025, 3, 1), "Fixed")]
+            return [(_deliverable(7, 11, "Website"),)]
+
+        db = database(handler)
+        by_contract = await get_deliverables_by_contract_tool("Solana")
+        search = await search_deliverables_tool("solana")
+
+        assert by_contract.success and by_contract.data["client_name"] == "Solana Inc"
+        assert search.data["deliverables"][0]["due_date"] == "2025-03-01"
+        assert len(db.queries) == 3
+
+
+class TestToolRegistration:
+    """Test suite for the graph and agent registration of the time and deliverable tools"""
+
+    def test_tools_are_registered_as_coroutines(self):
+        for name in ("log_time_for_project", "search_projects", "get_timesheet", "create_deliverable",
+                     "get_client_deliverables", "get_contract_deliverables", "search_deliverables"):
+            assert inspect.iscoroutinefunction(TOOL_REGISTRY[name]), name
+        assert {"get_timesheet", "search_deliverables"} <= READ_ONLY_TOOLS
+        assert "log_time_for_project" not in READ_ONLY_TOOLS
+
+        for wrapper in (TimeTrackerAgent._smart_create_time_entry_wrapper, TimeTrackerAgent._get_timesheet_wrapper,
+                        DeliverableAgent._smart_create_deliverable_wrapper, DeliverableAgent._search_deliverables_wrapper):
+            assert inspect.iscoroutinefunction(wrapper)
+
+    @pytest.mark.asyncio
+    async def test_graph_wrapper_runs_tool(self, database):
+        database(_workload_handler)
+        result = await TOOL_REGISTRY["get_timesheet"](employee_id=4, start_date="2025-01-06", end_date="2025-01-12",
+                                                      db=None, context={})
+        assert result["success"] and result["data"]["total_hours"] == 12.5
+
+
+# Round trips the previous sync tools made on a blocking Session for the same calls:
+# timesheet loaded every entry (1); logging time looked the deliverable up (1),
+# checked contract and client (2), inserted, refreshed and lazy-loaded the
+# contract and client (4); client deliverables loaded every client (1), the
+# deliverables (1) and their contract lazily (1)
+LEGACY_ROUND_TRIPS = {"get_timesheet": 1, "log_time_for_project": 7, "get_client_deliverables": 3}
+
+
+class TestConcurrentLoadBenchmark:
+    """Benchmark the time_agent and deliverable_agent tool paths under concurrent users"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_agent_tool_calls(self, database):
+        users = 20
+
+        async def legacy_user():
+            # The old wrappers ran the sync tools inline on the event loop, blocking it per round trip
+            for round_trips in LEGACY_ROUND_TRIPS.values():
+                for _ in range(round_trips):
+                    time.sleep(QUERY_LATENCY_SECONDS)
+
+        async def async_user():
+            await TOOL_REGISTRY["get_timesheet"](employee_id=4)
+            await TOOL_REGISTRY["log_time_for_project"](
+                project_name="Solana website", hours_worked="3", description_of_work="x", context={"user_id": "u1"}
+            )
+            await TOOL_REGISTRY["get_client_deliverables"](client_name="Solana Inc")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(legacy_user() for _ in range(users)))
+        legacy = time.perf_counter() - started
+
+        db = database(_workload_handler, latency=QUERY_LATENCY_SECONDS)
+        started = time.perf_counter()
+        await asyncio.gather(*(async_user() for _ in range(users)))
+        concurrent = time.perf_counter() - started
+
+        print(f"\n{users} concurrent users (timesheet + log time + client deliverables): "
+              f"blocking {legacy * 1000:.1f}ms ({users * sum(LEGACY_ROUND_TRIPS.values())} round trips), "
+              f"async {concurrent * 1000:.1f}ms ({len(db.queries)} round trips)")
+        assert len(db.queries) == users * 5
+        assert concurrent < legacy / 2
@@ -0,0 +1,86 @@
+"""
+Test intent-scoped tool schema selection for agent LLM calls.
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from src.aiagents.contract_agent import ContractAgent
+from src.aiagents.graph.tool_selection import ToolSelector, REQUEST_ALL_TOOLS, tool_name
+
+
+def _state(message: str, user_operation: str, original_user_request: str = None):
+    return {
+        "messages": [{"role": "user", "content": message}],
+        "data": {
+            "user_operation": user_operation,
+            "original_user_request": message if original_user_request is None else original_user_request,
+        },
+    }
+
+
+def _response(*names):
+    return SimpleNamespace(tool_calls=[SimpleNamespace(function=SimpleNamespace(name=name)) for name in names])
+
+
+class TestToolSelection:
+    """Test suite for choosing the tool schemas sent to the model"""
+
+    @pytest.fixture
+    def contract_tools(self):
+        return ContractAgent().tools
+
+    def test_scopes_to_operation_and_saves_tokens(self, contract_tools):
+        selector = ToolSelector(enabled=True)
+        selection = selector.select(contract_tools, _state("update the Acme contract", "update_contract"), "contract_agent")
+
+        assert selection.scoped
+        assert "update_contract" in selection.names
+        assert REQUEST_ALL_TOOLS in selection.names
+        assert "delete_contract" not in selection.names
+        assert len(selection.tools) < len(contract_tools)
+
+        stats = selector.get_stats()
+        assert stats["schema_tokens_saved"] == selection.full_tokens - selection.sent_tokens
+        # The scoped request carries a small fraction of the schema tokens
+        assert selection.sent_tokens < selection.full_tokens / 2
+
+    @pytest.mark.parametrize("state", [
+        _state("show me something", "unknown"),
+        _state("show me something", "show"),
+        # Operation carried over from an earlier turn
+        _state("42", "update_contract", original_user_request="update the Acme contract"),
+        # Operation belongs to a different agent's tools
+        _state("add employee Ann", "create_employee"),
+    ])
+    def test_sends_full_set_without_a_usable_intent(self, contract_tools, state):
+        selector = ToolSelector(enabled=True)
+        selection = selector.select(contract_tools, state, "contract_agent")
+
+        assert not selection.scoped
+        assert selection.tools is contract_tools
+        assert selector.get_stats()["schema_tokens_saved"] == 0
+
+    def test_disabled_selector_sends_full_set(self, contract_tools):
+        selection = ToolSelector(enabled=False).select(contract_tools, _state("update the Acme contract", "update_contract"))
+        assert selection.tools is contract_tools
+
+    def test_falls_back_when_model_needs_another_tool(self, contract_tools):
+        selector = ToolSelector(enabled=True)
+        selection = selector.select(contract_tools, _state("update the Acme contract", "update_contract"))
+
+        assert not selector.needs_full_set(selection, _response("get_client_contracts"))
+        assert not selector.needs_full_set(selection, SimpleNamespace(tool_calls=None))
+        assert selector.needs_full_set(selection, _response(REQUEST_ALL_TOOLS))
+        assert selector.needs_full_set(selection, _response("update_contract", "delete_contract"))
+        assert selector.get_stats()["fallbacks"] == 2
+
+    def test_scopes_reference_real_tools(self, contract_tools):
+        """Every scoped tool name exists on some agent"""
+        from src.aiagents.graph.tool_selection import OPERATION_TOOL_SCOPES
+        from src.aiagents.employee_agent import EmployeeAgent
+        from src.aiagents.client_agent import ClientAgent
+
+        known = {tool_name(tool) for agent_tools in (contract_tools, EmployeeAgent().tools, ClientAgent().tools) for tool in agent_tools}
+        for operation, names in OPERATION_TOOL_SCOPES.items():
+            assert names <= known, (operation, names - known)